@@ -28,6 +28,7 @@ from System.Data import *
 from System.Configuration import *
 from System.Collections.Generic import *
 clr.ImportExtensions(System.Linq)
+from cdi import DiscreteValueIndex, Evidence, evaluation_context
 from operator import le, ge, gt, lt
 
 #========================================
@@ -41,14 +42,20 @@ autoCodeText = "Autoresolved Code - "
 #  Globals
 #========================================
 db = CACDataRepository()
+#Account data is loaded once and shared by every script run for the account,
+#fetching only the discrete values of the last 7 days
+context = evaluation_context(account, db, System.DateTime.Now.AddDays(-7))
+#Script messages are only formatted when their level is enabled, and are written
+#together at the end of the run
+scriptLog = context.log(db, scriptName, scriptInstance)
 admitDate = account.AdmitDateTime.Date
 birthDate = account.Patient.BirthDate.Date
 gender = account.Patient.Gender
 #Update true = External DV collection False = On Acct Record
-accountContainer = AccountWorkflowContainer(account, True, "Category", 7)
+accountContainer = context.container(AccountWorkflowContainer, True, "Category", 7)
 useSeperateDiscreteCollection = True
 if useSeperateDiscreteCollection == True:
-    discreteValues = db.GetDiscreteValues(account._id)
+    discreteValues = context.discrete_values
 else:
     discreteV7alues = db.GetAccountField(account._id, "DiscreteValues")
 
@@ -64,215 +71,13 @@ calcSerumPotassium4 = 3.4
 #========================================
 #  Functions
 #========================================
-def datetimeFromUtcToLocal(utc_datetime):
-    if utc_datetime:
-        convertedDate = DateTime.SpecifyKind(utc_datetime, DateTimeKind.Utc)
-        return  convertedDate.ToLocalTime()
-    else:
-        return None
-
-def cleanNumbers(result):
-    result1 = re.sub("[\\<\\>]", "", str(result))
-    if result1.count('.') <= 1 and result1.replace(".", "").isnumeric():
-        return result1
-    else:
-        return None
-
-def dataConversion(datetime, linkText, Result, id, category, sequence, abstract=True, gender=None):
-    if datetime is not None:
-        date_time = datetimeFromUtcToLocal(datetime)
-        date_time = date_time.ToString("MM/dd/yyyy, HH:mm")
-        linkText = linkText.replace("[RESULTDATETIME]", date_time)
-    else: 
-        linkText = linkText.replace("(Result Date: [RESULTDATETIME])", "")
-    if Result is not None:
-        linkText = linkText.replace("[VALUE]", Result)
-    else: linkText = linkText.replace("[VALUE]", "")
-    if gender: linkText = linkText.replace("[GENDER]", gender)
-    else: linkText = linkText.replace("[GENDER]", "")
-    if abstract == True:
-        category.Links.Add(MatchedCriteriaLink(linkText, None, None, id, True, None, None, sequence))
-    elif abstract == False:
-        abstraction = MatchedCriteriaLink(linkText, None, None, id, True, None, None, sequence)
-        return abstraction
-    return
-
-def CodeCount(codes):
-    # Get list of codes on the acct based on CodeDic
-    result = set()
-    for document in account.Documents or []:
-        for codeReference in document.CodeReferences or []:
-            if codeReference.Code in codes:
-                matching_code = codeReference.Code
-                result.add(matching_code)
-    return list(result)
-
-def abstractValue(abstraction_name, link_text, calculation, sequence=0, category=None, abstract=False):
-    # Find abstraction and if abstract is true abstract it to the provided category
-    abstraction = accountContainer.GetFirstLinkMatchingAbstractionValue(abstraction_name, link_text, lambda x: calculation)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def dvValue(dv_name, link_text, calculation, sequence=0, category=None, abstract=False):
-    # Find Discrete Value and if abstract is true abstract it to the provided category
-    for dv in dv_name:
-        abstraction = accountContainer.GetFirstLinkMatchingDiscreteValue(dv, link_text, calculation)
-        if abstraction is not None:
-            break
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def dvValueMulti(dvDic, DV1, linkText, value, sign, sequence=0, category=None, abstract=False, needed=2):
-    # Find Discrete Value and if abstract is true abstract it to the provided category
-    matchedList = []
-    x = 0
-    for dv in dvDic or []:
-        dvr = cleanNumbers(dvDic[dv]['Result'])
-        if dvDic[dv]['Name'] in DV1 and dvr is not None and sign(float(dvr), float(value)):
-            matchedList.append(dataConversion(dvDic[dv]['ResultDate'], linkText, dvDic[dv]['Result'], dvDic[dv]['UniqueId'] or dvDic[dv]['_id'], category, sequence, abstract))
-            x += 1
-            if needed <= x:
-                break
-    if abstract and x > 0:
-        return True
-    elif abstract is False and len(matchedList) > 0 and needed > 0:
-        return matchedList
-    else:
-        return None
-
-def compareValuesMulti(dvDic, DV1, value, value1, linkText, sign, sign1, sequence=0, category=None, abstract=False, needed=2):
-    matchedList = []
-    x = 0
-    for dv in dvDic or []:
-        dvr = cleanNumbers(dvDic[dv]['Result'])
-        if dvDic[dv]['Name'] in DV1 and dvr is not None and sign(float(value), float(dvr)) and sign1(float(dvr), float(value1)):
-            matchedList.append(dataConversion(dvDic[dv]['ResultDate'], linkText, dvDic[dv]['Result'], dvDic[dv]['UniqueId'] or dvDic[dv]['_id'], category, sequence, abstract))
-            x += 1
-            if needed <= x:
-                break
-    if abstract and x > 0:
-        return True
-    elif abstract is False and len(matchedList) > 0 and needed > 0:
-        return matchedList
-    else:
-        return None
-
-def codeValue(code_name, link_text, sequence=0, category=None, abstract=False):
-    # Find code and if abstract is true abstract it to the provided category
-    abstraction = accountContainer.GetFirstCodeLink(code_name, link_text)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def multiCodeValue(code_list, link_text, sequence=0, category=None, abstract=False):
-    # Go through Code List and find first code and if abstract is true abstract it to the provided category
-    abstraction = None
-    for code in code_list:
-        abstraction = accountContainer.GetFirstCodeLink(code, link_text)
-        if abstraction is not None:
-            abstraction.Sequence = sequence
-            if abstract:
-                category.Links.Add(abstraction)
-                return True
-            else:
-                return abstraction
-    if abstract and abstraction is None:
-        return False
-    return abstraction
-
-def prefixCodeValue(prefix, link_text, sequence=0, category=None, abstract=False):
-    # Use prefix to find first code match based on regex search and if abstract is true abstract it to the provided category
-    abstraction = None
-    validCodes = [codes for codes in accountContainer.CodeKeys if re.match(prefix, codes) is not None]
-    for code in validCodes:
-        abstraction = accountContainer.GetFirstCodeLink(code, link_text)
-        if abstraction is not None:
-            abstraction.Sequence = sequence
-            if abstract:
-                category.Links.Add(abstraction)
-                return True
-            else:
-                return abstraction
-    if abstract and abstraction is None:
-        return False
-    return abstraction
-
-def medValue(med_name, link_text, sequence=0, category=None, abstract=False):
-    # Find Medication Value and if abstract is true abstract it to the provided category
-    abstraction = accountContainer.GetFirstMedicationLink(med_name, link_text)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def updateLinkText(value, replacement_text):
-    # Update the link text with the provided text
-    value.LinkText = replacement_text + value.LinkText
-    return value
-
-def documentLink(DocumentType, LinkText, sequence, category, abstract):
-    # Finds a document link and adds it as link so that its a quick reference for the cdi user.
-    abstraction = None
-    abstraction = accountContainer.GetFirstDocumentLink(DocumentType, LinkText)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    return None
+#The helpers every script shares are compiled once per process and bound to this
+#script's globals, see cdi.helpers; a helper defined below replaces the shared one
+context.bind_helpers(globals(), 1)
 
 #========================================
 #  Script Specific Functions
 #========================================
-def medDataConversion(datetime, linkText, med, id, dosage, route, category, sequence, abstract=True):
-    date_time = datetimeFromUtcToLocal(datetime)
-    date_time = date_time.ToString("MM/dd/yyyy, HH:mm")
-    linkText = linkText.replace("[STARTDATE]", date_time)
-    linkText = linkText.replace("[MEDICATION]", med)
-    linkText = linkText.replace("[DOSAGE]", dosage)
-    if route is not None: linkText = linkText.replace("[ROUTE]", route)
-    else: linkText = linkText.replace(", Route [ROUTE]", "")
-    if abstract == True:
-        abstraction = MatchedCriteriaLink(linkText, None, None, None, True, None, None, sequence)
-        abstraction.MedicationId = id
-        category.Links.Add(abstraction)
-    elif abstract == False:
-        abstraction = MatchedCriteriaLink(linkText, None, None, None, True, None, None, sequence)
-        abstraction.MedicationId = id
-        return abstraction
-    return
-    
 def insulinValue(medDic, med_name, link_text, sequence=0, category=None, abstract=False):
     for mv in medDic or []:
         mvr = cleanNumbers(medDic[mv]['Dosage'])
@@ -295,7 +100,7 @@ def insulinValue(medDic, med_name, link_text, sequence=0, category=None, abstrac
 #========================================
 #  Algorithm
 #========================================
-db.LogEvaluationScriptMessage("Script starting " + str(account._id), scriptName, scriptInstance, "Debug")
+scriptLog.debug("Script starting %s", account._id)
 #Standard Variable Declaration
 AlertPassed = False
 AlertConditions = False
@@ -346,70 +151,51 @@ for alert in account.MatchedCriteriaGroups or []:
 #Check if alert was autoresolved or completed.
 if validated is False:
     #Get treatment within last X days
-    mainMedDic = {}
-    unsortedMedDic = {}
-    medCount = 0
     #Combine all items into one list to search against
     medSearchList = ["Insulin"]
     #Set datelimit for how far back to 
     medDateLimit = System.DateTime.Now.AddDays(-7)
-    #Loop through all treatment finding any that match in the combined list adding to a dictionary the matches
-    if 'Medications' in account:    
-        for med in account.Medications:
-            if med.StartDate >= medDateLimit and 'Category' in med and med.Category is not None:
-                if any(item == med.Category for item in medSearchList):
-                    medCount += 1
-                    unsortedMedDic[medCount] = med
-    #Sort List by latest
-    mainMedDic = sorted(unsortedMedDic.items(), key=lambda x: x[1]['StartDate'], reverse=True)
+    #Collect matching meds, sorted by latest
+    mainMedDic = context.medications(medSearchList, medDateLimit)
         
     #Find all discrete values for custom lookups within the last X days
-    maindiscreteDic = {}
-    unsortedDicsreteDic = {}
-    dvCount = 0
     #Combine all items into one list to search against
     discreteSearchList = [i for j in [dvSerumPotassium] for i in j]
     #Set datelimit for how far back to 
     dvDateLimit = System.DateTime.Now.AddDays(-7)
-    #Loop through all dvs finding any that match in the combined list adding to a dictionary the matches
-    for dv in discreteValues or []:
-        if dv.ResultDate >= dvDateLimit:
-            if any(item == dv.Name for item in discreteSearchList):
-                dvCount += 1
-                unsortedDicsreteDic[dvCount] = dv
-    #Sort List by latest
-    maindiscreteDic = sorted(unsortedDicsreteDic.items(), key=lambda x: x[1]['ResultDate'], reverse=True)
+    #Index all dvs that match in the combined list by name, sorted by latest
+    maindiscreteDic = DiscreteValueIndex(discreteValues, discreteSearchList, dvDateLimit)
     
     #AlertTrigger
-    e875Code = codeValue("E87.5", "Hyperkalemia Fully Specified Code: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    e876Code = codeValue("E87.6", "Hypokalemia Fully Specified Code: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence = Evidence()
+    evidence.define("e875Code", codeValue, "E87.5", "Hyperkalemia Fully Specified Code: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("e876Code", codeValue, "E87.6", "Hypokalemia Fully Specified Code: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
     #Labs
-    serumPotassiumMultiDV = dvValueMulti(dict(maindiscreteDic), dvSerumPotassium, "Serum Potassium: [VALUE] (Result Date: [RESULTDATETIME])", calcSerumPotassium2, gt, 0, potassium, False, 10)
-    serumPotassiumMulti2DV = dvValueMulti(dict(maindiscreteDic), dvSerumPotassium, "Serum Potassium: [VALUE] (Result Date: [RESULTDATETIME])", calcSerumPotassium1, lt, 0, potassium, False, 10)
-    serumPotassiumMulti3DV = dvValueMulti(dict(maindiscreteDic), dvSerumPotassium, "Serum Potassium: [VALUE] (Result Date: [RESULTDATETIME])", calcSerumPotassium3, gt, 0, potassium, False, 10)
-    serumPotassiumMulti4DV = dvValueMulti(dict(maindiscreteDic), dvSerumPotassium, "Serum Potassium: [VALUE] (Result Date: [RESULTDATETIME])", calcSerumPotassium4, le, 0, potassium, False, 10)
+    serumPotassiumMultiDV, serumPotassiumMulti2DV, serumPotassiumMulti3DV, serumPotassiumMulti4DV = dvValueMultiQuery(
+        maindiscreteDic, dvSerumPotassium, "Serum Potassium: [VALUE] (Result Date: [RESULTDATETIME])",
+        [(gt, calcSerumPotassium2, 10), (lt, calcSerumPotassium1, 10), (gt, calcSerumPotassium3, 10), (le, calcSerumPotassium4, 10)], 0, potassium, False)
     #Meds
-    dextroseMed = medValue("Dextrose 5% In Water", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 1)
-    hemodialysisCodes = multiCodeValue(["5A1D70Z", "5A1D80Z", "5A1D90Z"], "Hemodialysis: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 2)
-    insulinMed = insulinValue(dict(mainMedDic), "Insulin", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 3)
-    kayexalateMed = medValue("Kayexalate", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 4)
-    potassiumReplacementMed = medValue("Potassium Replacement", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 5)
-    potChlorideAbs = abstractValue("POTASSIUM_CHLORIDE", "Potassium Chlroide '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 6)
-    potPhoshateAbs = abstractValue("POTASSIUM_PHOSPHATE", "Potassium Phosphate '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 7)
-    potBicarbonateAbs = abstractValue("POTASSIUM_BICARBONATE", "Potassium Bicarbonate '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 8)
+    evidence.define("dextroseMed", medValue, "Dextrose 5% In Water", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 1)
+    evidence.define("hemodialysisCodes", multiCodeValue, ["5A1D70Z", "5A1D80Z", "5A1D90Z"], "Hemodialysis: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 2)
+    insulinMed = insulinValue(mainMedDic, "Insulin", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 3)
+    evidence.define("kayexalateMed", medValue, "Kayexalate", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 4)
+    evidence.define("potassiumReplacementMed", medValue, "Potassium Replacement", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 5)
+    evidence.define("potChlorideAbs", abstractValue, "POTASSIUM_CHLORIDE", "Potassium Chlroide '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 6)
+    evidence.define("potPhoshateAbs", abstractValue, "POTASSIUM_PHOSPHATE", "Potassium Phosphate '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 7)
+    evidence.define("potBicarbonateAbs", abstractValue, "POTASSIUM_BICARBONATE", "Potassium Bicarbonate '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 8)
 
     #Main Algorithm
-    if e875Code is not None and subtitle == "Possible Hyperkalemia Dx":
-        if e875Code is not None: updateLinkText(e875Code, autoCodeText); dc.Links.Add(e875Code)
+    if evidence.e875Code is not None and subtitle == "Possible Hyperkalemia Dx":
+        if evidence.e875Code is not None: updateLinkText(evidence.e875Code, autoCodeText); dc.Links.Add(evidence.e875Code)
         result.Outcome = "AUTORESOLVED"
         result.Reason = "Autoresolved due to one Specified Code on the Account"
         result.Validated = True
         AlertConditions = True
 
     elif (
-        e875Code is None and
+        evidence.e875Code is None and
         len(serumPotassiumMulti3DV or noLabs) > 1 and
-        (kayexalateMed is not None or (insulinMed is not None and dextroseMed is not None) or hemodialysisCodes is not None)
+        (evidence.kayexalateMed is not None or (insulinMed is not None and evidence.dextroseMed is not None) or evidence.hemodialysisCodes is not None)
     ):
         if serumPotassiumMulti3DV:
             for entry in serumPotassiumMulti3DV:
@@ -420,18 +206,18 @@ if validated is False:
         result.Subtitle = "Possible Hyperkalemia Dx"
         AlertPassed = True
         
-    elif e876Code is not None and subtitle == "Possible Hypokalemia Dx":
-        if e876Code is not None: updateLinkText(e876Code, autoCodeText); dc.Links.Add(e876Code)
+    elif evidence.e876Code is not None and subtitle == "Possible Hypokalemia Dx":
+        if evidence.e876Code is not None: updateLinkText(evidence.e876Code, autoCodeText); dc.Links.Add(evidence.e876Code)
         result.Outcome = "AUTORESOLVED"
         result.Reason = "Autoresolved due to one Specified Code on the Account"
         result.Validated = True
         AlertConditions = True
         
     elif (
-        e876Code is None and
+        evidence.e876Code is None and
         len(serumPotassiumMulti2DV or noLabs) > 1 and
-        (potassiumReplacementMed is not None or potChlorideAbs is not None or
-        potPhoshateAbs is not None or potBicarbonateAbs is not None)
+        (evidence.potassiumReplacementMed is not None or evidence.potChlorideAbs is not None or
+        evidence.potPhoshateAbs is not None or evidence.potBicarbonateAbs is not None)
     ):
         if serumPotassiumMulti2DV:
             for entry in serumPotassiumMulti2DV:
@@ -442,10 +228,10 @@ if validated is False:
         result.Subtitle = "Possible Hypokalemia Dx"
         AlertPassed = True
         
-    elif len(serumPotassiumMultiDV or noLabs) >= 1 and e875Code is not None and subtitle == "Hyperkalemia Dx Documented Possibly Lacking Supporting Evidence":
+    elif len(serumPotassiumMultiDV or noLabs) >= 1 and evidence.e875Code is not None and subtitle == "Hyperkalemia Dx Documented Possibly Lacking Supporting Evidence":
         #This alert trigger autoresolves the alert the proceeds it if the criteria is met.
         AlertConditions = True
-        updateLinkText(e875Code, autoEvidenceText); dc.Links.Add(e875Code)
+        updateLinkText(evidence.e875Code, autoEvidenceText); dc.Links.Add(evidence.e875Code)
         for entry in serumPotassiumMultiDV:
             updateLinkText(entry, autoEvidenceText); potassium.Links.Add(entry)
         if message1: labs.Links.Add(MatchedCriteriaLink(LinkText1, None, None, None, False))
@@ -453,14 +239,14 @@ if validated is False:
         result.Reason = "Autoresolved due to clinical evidence now existing on the Account"
         result.Validated = True
 
-    elif len(serumPotassiumMultiDV or noLabs) == 0 and e875Code is not None:
+    elif len(serumPotassiumMultiDV or noLabs) == 0 and evidence.e875Code is not None:
         result.Subtitle = "Hyperkalemia Dx Documented Possibly Lacking Supporting Evidence"
-        dc.Links.Add(e875Code)
+        dc.Links.Add(evidence.e875Code)
         labs.Links.Add(MatchedCriteriaLink(LinkText1, None, None, None, True))
         AlertConditions = True
 
-    elif len(serumPotassiumMulti4DV or noLabs) >= 1 and e876Code is not None and subtitle == "Hypokalemia Dx Documented Possibly Lacking Supporting Evidence":
-        updateLinkText(e876Code, autoEvidenceText); dc.Links.Add(e876Code)
+    elif len(serumPotassiumMulti4DV or noLabs) >= 1 and evidence.e876Code is not None and subtitle == "Hypokalemia Dx Documented Possibly Lacking Supporting Evidence":
+        updateLinkText(evidence.e876Code, autoEvidenceText); dc.Links.Add(evidence.e876Code)
         for entry in serumPotassiumMulti4DV:
             updateLinkText(entry, autoEvidenceText); potassium.Links.Add(entry)
         if message2: labs.Links.Add(MatchedCriteriaLink(LinkText2, None, None, None, False))
@@ -471,22 +257,22 @@ if validated is False:
 
     elif (
         len(serumPotassiumMulti4DV or noLabs) == 0 and
-        e876Code is not None and
-        potassiumReplacementMed is None and
-        potChlorideAbs is None and
-        potPhoshateAbs is None and
-        potBicarbonateAbs is None
+        evidence.e876Code is not None and
+        evidence.potassiumReplacementMed is None and
+        evidence.potChlorideAbs is None and
+        evidence.potPhoshateAbs is None and
+        evidence.potBicarbonateAbs is None
     ):
         result.Subtitle = "Hypokalemia Dx Documented Possibly Lacking Supporting Evidence"
-        dc.Links.Add(e876Code)
+        dc.Links.Add(evidence.e876Code)
         labs.Links.Add(MatchedCriteriaLink(LinkText2, None, None, None, True))
         AlertConditions = True
 
     else:
-        db.LogEvaluationScriptMessage("Not enough data to warrent alert, Alert Failed. " + str(account._id), scriptName, scriptInstance, "Debug")
+        scriptLog.debug("Not enough data to warrent alert, Alert Failed. %s", account._id)
         result.Passed = False
 else:
-    db.LogEvaluationScriptMessage("Alert Closed; Exiting script run. Outcome: " + str(outcome) + " " + str(account._id), scriptName, scriptInstance, "Debug")
+    scriptLog.debug("Alert Closed; Exiting script run. Outcome: %s %s", outcome, account._id)
 
 #If an alert triggered abstract the following
 if AlertPassed:
@@ -504,14 +290,14 @@ if AlertPassed:
     abstractValue("WEAKNESS", "Muscle Weakness '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 11, abs, True)
     abstractValue("VOMITING", "Vomiting '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 12, abs, True)
     #Treatments
-    if dextroseMed is not None: treatment.Links.Add(dextroseMed) #1
-    if hemodialysisCodes is not None: abs.Links.Add(hemodialysisCodes) #2
+    if evidence.dextroseMed is not None: treatment.Links.Add(evidence.dextroseMed) #1
+    if evidence.hemodialysisCodes is not None: abs.Links.Add(evidence.hemodialysisCodes) #2
     if insulinMed is not None: treatment.Links.Add(insulinMed) #3
-    if kayexalateMed is not None: treatment.Links.Add(kayexalateMed) #4
-    if potassiumReplacementMed is not None: treatment.Links.Add(potassiumReplacementMed) #5
-    if potChlorideAbs is not None: treatment.Links.Add(potChlorideAbs) #6
-    if potPhoshateAbs is not None: treatment.Links.Add(potPhoshateAbs) #7
-    if potBicarbonateAbs is not None: treatment.Links.Add(potBicarbonateAbs) #8
+    if evidence.kayexalateMed is not None: treatment.Links.Add(evidence.kayexalateMed) #4
+    if evidence.potassiumReplacementMed is not None: treatment.Links.Add(evidence.potassiumReplacementMed) #5
+    if evidence.potChlorideAbs is not None: treatment.Links.Add(evidence.potChlorideAbs) #6
+    if evidence.potPhoshateAbs is not None: treatment.Links.Add(evidence.potPhoshateAbs) #7
+    if evidence.potBicarbonateAbs is not None: treatment.Links.Add(evidence.potBicarbonateAbs) #8
 
 #If alert passed or alert conditions was triggered add categories to result if they have links
 if AlertPassed or AlertConditions:
@@ -522,7 +308,9 @@ if AlertPassed or AlertConditions:
     result.Links.Add(treatment)
     if treatment.Links: treatmentLinks = True
     result.Links.Add(other)
-    db.LogEvaluationScriptMessage("Alert Passed Adding Links. Alert Triggered: " + str(result.Subtitle) + " Autoresolved: " + str(result.Outcome) + "; " +
-        str(result.Validated) + "; Links: Document Code- " + str(dcTriggerLinks) + ", Abs- " + str(absLinks) + ", labs- " + str(labsLinks) + ", treatment- "
-        + str(treatmentLinks) + "; Acct: " + str(account._id), scriptName, scriptInstance, "Debug")
+    scriptLog.debug("Alert Passed Adding Links. Alert Triggered: %s Autoresolved: %s; %s; Links: Document Code- %s, Abs- %s, labs- %s, treatment- %s; Acct: %s",
+        result.Subtitle, result.Outcome, result.Validated, dcTriggerLinks, absLinks, labsLinks, treatmentLinks, account._id)
     result.Passed = True
+
+#Write out this run's script messages
+scriptLog.flush()
@@ -28,6 +28,7 @@ from System.Data import *
 from System.Configuration import *
 from System.Collections.Generic import *
 clr.ImportExtensions(System.Linq)
+from cdi import DiscreteValueIndex, Evidence, evaluation_context
 from operator import le, ge, gt, lt
 
 #========================================
@@ -41,14 +42,20 @@ autoCodeText = "Autoresolved Code - "
 #  Globals
 #========================================
 db = CACDataRepository()
+#Account data is loaded once and shared by every script run for the account,
+#fetching only the discrete values of the last 7 days
+context = evaluation_context(account, db, System.DateTime.Now.AddDays(-7))
+#Script messages are only formatted when their level is enabled, and are written
+#together at the end of the run
+scriptLog = context.log(db, scriptName, scriptInstance)
 admitDate = account.AdmitDateTime.Date
 birthDate = account.Patient.BirthDate.Date
 gender = account.Patient.Gender
 #Update true = External DV collection False = On Acct Record
-accountContainer = AccountWorkflowContainer(account, True, "Category", 7)
+accountContainer = context.container(AccountWorkflowContainer, True, "Category", 7)
 useSeperateDiscreteCollection = True
 if useSeperateDiscreteCollection == True:
-    discreteValues = db.GetDiscreteValues(account._id)
+    discreteValues = context.discrete_values
 else:
     discreteValues = db.GetAccountField(account._id, "DiscreteValues")
 #========================================
@@ -69,193 +76,9 @@ calcSerumSodium4 = 144
 #========================================
 #  Functions
 #========================================
-def datetimeFromUtcToLocal(utc_datetime):
-    if utc_datetime:
-        convertedDate = DateTime.SpecifyKind(utc_datetime, DateTimeKind.Utc)
-        return  convertedDate.ToLocalTime()
-    else:
-        return None
-
-def cleanNumbers(result):
-    result1 = re.sub("[\\<\\>]", "", str(result))
-    if result1.count('.') <= 1 and result1.replace(".", "").isnumeric():
-        return result1
-    else:
-        return None
-
-def dataConversion(datetime, linkText, Result, id, category, sequence, abstract=True, gender=None):
-    if datetime is not None:
-        date_time = datetimeFromUtcToLocal(datetime)
-        date_time = date_time.ToString("MM/dd/yyyy, HH:mm")
-        linkText = linkText.replace("[RESULTDATETIME]", date_time)
-    else: 
-        linkText = linkText.replace("(Result Date: [RESULTDATETIME])", "")
-    if Result is not None:
-        linkText = linkText.replace("[VALUE]", Result)
-    else: linkText = linkText.replace("[VALUE]", "")
-    if gender: linkText = linkText.replace("[GENDER]", gender)
-    else: linkText = linkText.replace("[GENDER]", "")
-    if abstract == True:
-        category.Links.Add(MatchedCriteriaLink(linkText, None, None, id, True, None, None, sequence))
-    elif abstract == False:
-        abstraction = MatchedCriteriaLink(linkText, None, None, id, True, None, None, sequence)
-        return abstraction
-    return
-
-def CodeCount(codes):
-    # Get list of codes on the acct based on CodeDic
-    result = set()
-    for document in account.Documents or []:
-        for codeReference in document.CodeReferences or []:
-            if codeReference.Code in codes:
-                matching_code = codeReference.Code
-                result.add(matching_code)
-    return list(result)
-
-def abstractValue(abstraction_name, link_text, calculation, sequence=0, category=None, abstract=False):
-    # Find abstraction and if abstract is true abstract it to the provided category
-    abstraction = accountContainer.GetFirstLinkMatchingAbstractionValue(abstraction_name, link_text, lambda x: calculation)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def dvValue(dv_name, link_text, calculation, sequence=0, category=None, abstract=False):
-    # Find Discrete Value and if abstract is true abstract it to the provided category
-    for dv in dv_name:
-        abstraction = accountContainer.GetFirstLinkMatchingDiscreteValue(dv, link_text, calculation)
-        if abstraction is not None:
-            break
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def dvValueMulti(dvDic, DV1, linkText, value, sign, sequence=0, category=None, abstract=False, needed=2):
-    # Find Discrete Value and if abstract is true abstract it to the provided category
-    matchedList = []
-    x = 0
-    for dv in dvDic or []:
-        dvr = cleanNumbers(dvDic[dv]['Result'])
-        if dvDic[dv]['Name'] in DV1 and dvr is not None and sign(float(dvr), float(value)):
-            matchedList.append(dataConversion(dvDic[dv]['ResultDate'], linkText, dvDic[dv]['Result'], dvDic[dv]['UniqueId'] or dvDic[dv]['_id'], category, sequence, abstract))
-            x += 1
-            if needed <= x:
-                break
-    if abstract and x > 0:
-        return True
-    elif abstract is False and len(matchedList) > 0 and needed > 0:
-        return matchedList
-    else:
-        return None
-
-def compareValuesMulti(dvDic, DV1, value, value1, linkText, sign, sign1, sequence=0, category=None, abstract=False, needed=2):
-    matchedList = []
-    x = 0
-    for dv in dvDic or []:
-        dvr = cleanNumbers(dvDic[dv]['Result'])
-        if dvDic[dv]['Name'] in DV1 and dvr is not None and sign(float(value), float(dvr)) and sign1(float(dvr), float(value1)):
-            matchedList.append(dataConversion(dvDic[dv]['ResultDate'], linkText, dvDic[dv]['Result'], dvDic[dv]['UniqueId'] or dvDic[dv]['_id'], category, sequence, abstract))
-            x += 1
-            if needed <= x:
-                break
-    if abstract and x > 0:
-        return True
-    elif abstract is False and len(matchedList) > 0 and needed > 0:
-        return matchedList
-    else:
-        return None
-
-def codeValue(code_name, link_text, sequence=0, category=None, abstract=False):
-    # Find code and if abstract is true abstract it to the provided category
-    abstraction = accountContainer.GetFirstCodeLink(code_name, link_text)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def multiCodeValue(code_list, link_text, sequence=0, category=None, abstract=False):
-    # Go through Code List and find first code and if abstract is true abstract it to the provided category
-    abstraction = None
-    for code in code_list:
-        abstraction = accountContainer.GetFirstCodeLink(code, link_text)
-        if abstraction is not None:
-            abstraction.Sequence = sequence
-            if abstract:
-                category.Links.Add(abstraction)
-                return True
-            else:
-                return abstraction
-    if abstract and abstraction is None:
-        return False
-    return abstraction
-
-def prefixCodeValue(prefix, link_text, sequence=0, category=None, abstract=False):
-    # Use prefix to find first code match based on regex search and if abstract is true abstract it to the provided category
-    abstraction = None
-    validCodes = [codes for codes in accountContainer.CodeKeys if re.match(prefix, codes) is not None]
-    for code in validCodes:
-        abstraction = accountContainer.GetFirstCodeLink(code, link_text)
-        if abstraction is not None:
-            abstraction.Sequence = sequence
-            if abstract:
-                category.Links.Add(abstraction)
-                return True
-            else:
-                return abstraction
-    if abstract and abstraction is None:
-        return False
-    return abstraction
-
-def medValue(med_name, link_text, sequence=0, category=None, abstract=False):
-    # Find Medication Value and if abstract is true abstract it to the provided category
-    abstraction = accountContainer.GetFirstMedicationLink(med_name, link_text)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def updateLinkText(value, replacement_text):
-    # Update the link text with the provided text
-    value.LinkText = replacement_text + value.LinkText
-    return value
-
-def documentLink(DocumentType, LinkText, sequence, category, abstract):
-    # Finds a document link and adds it as link so that its a quick reference for the cdi user.
-    abstraction = None
-    abstraction = accountContainer.GetFirstDocumentLink(DocumentType, LinkText)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    return None
+#The helpers every script shares are compiled once per process and bound to this
+#script's globals, see cdi.helpers; a helper defined below replaces the shared one
+context.bind_helpers(globals(), 1)
 
 #========================================
 #  Script Specific Functions
@@ -275,7 +98,7 @@ def assignedCode(code):
 #========================================
 #  Algorithm
 #========================================
-db.LogEvaluationScriptMessage("Script starting " + str(account._id), scriptName, scriptInstance, "Debug")
+scriptLog.debug("Script starting %s", account._id)
 #Determine if if and how many fully spec codes are on the acct
 codes = []
 codes = codeDic.keys()
@@ -331,39 +154,30 @@ for alert in account.MatchedCriteriaGroups or []:
 #Check if alert was autoresolved or completed.
 if validated is False:
     #Find all discrete values for custom lookups within the last X days
-    maindiscreteDic = {}
-    unsortedDicsreteDic = {}
-    dvCount = 0
     #Combine all items into one list to search against
     discreteSearchList = [i for j in [dvSerumSodium] for i in j]
     #Set datelimit for how far back to 
     dvDateLimit = System.DateTime.Now.AddDays(-7)
-    #Loop through all dvs finding any that match in the combined list adding to a dictionary the matches
-    for dv in discreteValues or []:
-        if dv.ResultDate >= dvDateLimit:
-            if any(item == dv.Name for item in discreteSearchList):
-                dvCount += 1
-                unsortedDicsreteDic[dvCount] = dv
-    #Sort List by latest
-    maindiscreteDic = sorted(unsortedDicsreteDic.items(), key=lambda x: x[1]['ResultDate'], reverse=True)
+    #Index all dvs that match in the combined list by name, sorted by latest
+    maindiscreteDic = DiscreteValueIndex(discreteValues, discreteSearchList, dvDateLimit)
     
     #Abs
-    e870Code = codeValue("E87.0", "Hyperosmolality and Hypernatremia: E87.0 '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 12)
-    e871Code = codeValue("E87.1", "Hypoosmolality and Hyponatremia: E87.1 '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 14)
-    e222Code = codeValue("E22.2", "SIADH: E22.2'[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 20)
+    evidence = Evidence()
+    evidence.define("e870Code", codeValue, "E87.0", "Hyperosmolality and Hypernatremia: E87.0 '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 12)
+    evidence.define("e871Code", codeValue, "E87.1", "Hypoosmolality and Hyponatremia: E87.1 '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 14)
+    evidence.define("e222Code", codeValue, "E22.2", "SIADH: E22.2'[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 20)
     #labs Subheadings
-    serumSodiumMultiDV = dvValueMulti(dict(maindiscreteDic), dvSerumSodium, "Serum Sodium: [VALUE] (Result Date: [RESULTDATETIME])", calcSerumSodium1, lt, 0, sodium, False, 10) #132
-    serumSodiumMulti2DV = dvValueMulti(dict(maindiscreteDic), dvSerumSodium, "Serum Sodium: [VALUE] (Result Date: [RESULTDATETIME])",calcSerumSodium2, gt, 0, sodium, False, 10) #144
-    serumSodiumMulti3DV = dvValueMulti(dict(maindiscreteDic), dvSerumSodium, "Serum Sodium: [VALUE] (Result Date: [RESULTDATETIME])", calcSerumSodium3, lt, 0, sodium, False, 10) #131
-    serumSodiumMulti4DV = dvValueMulti(dict(maindiscreteDic), dvSerumSodium, "Serum Sodium: [VALUE] (Result Date: [RESULTDATETIME])",calcSerumSodium4, gt, 0, sodium, False, 10) #145
+    evidence.define_many(["serumSodiumMultiDV", "serumSodiumMulti2DV", "serumSodiumMulti3DV", "serumSodiumMulti4DV"], dvValueMultiQuery,
+        maindiscreteDic, dvSerumSodium, "Serum Sodium: [VALUE] (Result Date: [RESULTDATETIME])",
+        [(lt, calcSerumSodium1, 10), (gt, calcSerumSodium2, 10), (lt, calcSerumSodium3, 10), (gt, calcSerumSodium4, 10)], 0, sodium, False) #132, 144, 131, 145
     #Treatment
-    dextroseMed = medValue("Dextrose 5% in Water", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 1)
-    dextroseAbs = abstractValue("DEXTROSE_5_IN_WATER", "Dextrose 5% in Water '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 2)
-    fluidRestrAbs = abstractValue("FLUID_RESTRICTION", "Fluid Restriction '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 3)
-    hypertonicSalMed = medValue("Hypertonic Saline", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 4)
-    hypertonicSalAbs = abstractValue("HYPERTONIC_SALINE", "Hypertonic Saline '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 5)
-    hypotonicSolMed = medValue("Hypotonic Solution", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 6)
-    hypotonicSolAbs = abstractValue("HYPOTONIC_SOLUTION", "Hypotonic Solution '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 7)
+    evidence.define("dextroseMed", medValue, "Dextrose 5% in Water", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 1)
+    evidence.define("dextroseAbs", abstractValue, "DEXTROSE_5_IN_WATER", "Dextrose 5% in Water '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 2)
+    evidence.define("fluidRestrAbs", abstractValue, "FLUID_RESTRICTION", "Fluid Restriction '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 3)
+    evidence.define("hypertonicSalMed", medValue, "Hypertonic Saline", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 4)
+    evidence.define("hypertonicSalAbs", abstractValue, "HYPERTONIC_SALINE", "Hypertonic Saline '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 5)
+    evidence.define("hypotonicSolMed", medValue, "Hypotonic Solution", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 6)
+    evidence.define("hypotonicSolAbs", abstractValue, "HYPOTONIC_SOLUTION", "Hypotonic Solution '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 7)
 
     #Main Algorithm
     if subtitle == "SIADH and Hyponatremia Both Assigned Seek Clarification" and assignedCode("E22.2") is False and assignedCode("E87.1") is False: 
@@ -373,49 +187,49 @@ if validated is False:
         AlertConditions = True
         
     elif assignedCode("E22.2") and assignedCode("E87.1"):
-        abs.Links.Add(e871Code)
-        abs.Links.Add(e222Code)
+        abs.Links.Add(evidence.e871Code)
+        abs.Links.Add(evidence.e222Code)
         result.Subtitle = "SIADH and Hyponatremia Both Assigned Seek Clarification"
         AlertPassed = True
     
-    elif e870Code is not None and subtitle == "Possible Hypernatremia Dx":
-        if e870Code is not None: updateLinkText(e870Code, autoCodeText); abs.Links.Add(e870Code)
+    elif evidence.e870Code is not None and subtitle == "Possible Hypernatremia Dx":
+        if evidence.e870Code is not None: updateLinkText(evidence.e870Code, autoCodeText); abs.Links.Add(evidence.e870Code)
         result.Outcome = "AUTORESOLVED"
         result.Reason = "Autoresolved due to one Specified Code on the Account"
         result.Validated = True
         AlertConditions = True
 
-    elif e870Code is None and len(serumSodiumMulti2DV or noLabs) > 1 and (dextroseMed is not None or dextroseAbs is not None or hypotonicSolMed is not None or hypotonicSolAbs is not None):
-        if serumSodiumMulti2DV:
-            for entry in serumSodiumMulti2DV:
+    elif evidence.e870Code is None and len(evidence.serumSodiumMulti2DV or noLabs) > 1 and (evidence.dextroseMed is not None or evidence.dextroseAbs is not None or evidence.hypotonicSolMed is not None or evidence.hypotonicSolAbs is not None):
+        if evidence.serumSodiumMulti2DV:
+            for entry in evidence.serumSodiumMulti2DV:
                 sodium.Links.Add(entry)
-        if dextroseMed is not None: treatment.Links.Add(dextroseMed)
-        if dextroseAbs is not None: treatment.Links.Add(dextroseAbs)
-        if hypotonicSolMed is not None: treatment.Links.Add(hypotonicSolMed)
-        if hypotonicSolAbs is not None: treatment.Links.Add(hypotonicSolAbs)
+        if evidence.dextroseMed is not None: treatment.Links.Add(evidence.dextroseMed)
+        if evidence.dextroseAbs is not None: treatment.Links.Add(evidence.dextroseAbs)
+        if evidence.hypotonicSolMed is not None: treatment.Links.Add(evidence.hypotonicSolMed)
+        if evidence.hypotonicSolAbs is not None: treatment.Links.Add(evidence.hypotonicSolAbs)
         result.Subtitle = "Possible Hypernatremia Dx"
         AlertPassed = True
     
-    elif e871Code is not None and subtitle == "Possible Hyponatremia Dx":
-        if e871Code is not None: updateLinkText(e871Code, autoCodeText); abs.Links.Add(e871Code)
+    elif evidence.e871Code is not None and subtitle == "Possible Hyponatremia Dx":
+        if evidence.e871Code is not None: updateLinkText(evidence.e871Code, autoCodeText); abs.Links.Add(evidence.e871Code)
         result.Outcome = "AUTORESOLVED"
         result.Reason = "Autoresolved due to one Specified Code on the Account"
         result.Validated = True
         AlertConditions = True
         
-    elif e871Code is None and len(serumSodiumMultiDV or noLabs) > 1 and (fluidRestrAbs is not None or hypertonicSalMed is not None or hypertonicSalAbs is not None):
-        if serumSodiumMultiDV:
-            for entry in serumSodiumMultiDV:
+    elif evidence.e871Code is None and len(evidence.serumSodiumMultiDV or noLabs) > 1 and (evidence.fluidRestrAbs is not None or evidence.hypertonicSalMed is not None or evidence.hypertonicSalAbs is not None):
+        if evidence.serumSodiumMultiDV:
+            for entry in evidence.serumSodiumMultiDV:
                 sodium.Links.Add(entry)
-        if fluidRestrAbs is not None: treatment.Links.Add(fluidRestrAbs)
-        if hypertonicSalMed is not None: treatment.Links.Add(hypertonicSalMed)
-        if hypertonicSalAbs is not None: treatment.Links.Add(hypertonicSalAbs)
+        if evidence.fluidRestrAbs is not None: treatment.Links.Add(evidence.fluidRestrAbs)
+        if evidence.hypertonicSalMed is not None: treatment.Links.Add(evidence.hypertonicSalMed)
+        if evidence.hypertonicSalAbs is not None: treatment.Links.Add(evidence.hypertonicSalAbs)
         result.Subtitle = "Possible Hyponatremia Dx"
         AlertPassed = True
 
-    elif len(serumSodiumMulti4DV or noLabs) > 0 and e870Code is not None and subtitle == "Hypernatremia Dx Documented Possibly Lacking Supporting Evidence":
-        updateLinkText(e870Code, autoEvidenceText); abs.Links.Add(e870Code)
-        for entry in serumSodiumMulti4DV:
+    elif len(evidence.serumSodiumMulti4DV or noLabs) > 0 and evidence.e870Code is not None and subtitle == "Hypernatremia Dx Documented Possibly Lacking Supporting Evidence":
+        updateLinkText(evidence.e870Code, autoEvidenceText); abs.Links.Add(evidence.e870Code)
+        for entry in evidence.serumSodiumMulti4DV:
             updateLinkText(entry, autoEvidenceText); sodium.Links.Add(entry)
         if message1: labs.Links.Add(MatchedCriteriaLink(LinkText1, None, None, None, False))
         result.Outcome = "AUTORESOLVED"
@@ -423,15 +237,15 @@ if validated is False:
         result.Validated = True
         AlertConditions = True
 
-    elif len(serumSodiumMulti4DV or noLabs) == 0 and e870Code is not None:
-        abs.Links.Add(e870Code)
+    elif len(evidence.serumSodiumMulti4DV or noLabs) == 0 and evidence.e870Code is not None:
+        abs.Links.Add(evidence.e870Code)
         labs.Links.Add(MatchedCriteriaLink(LinkText1, None, None, None))
         result.Subtitle = "Hypernatremia Dx Documented Possibly Lacking Supporting Evidence"
         AlertConditions = True
 
-    elif len(serumSodiumMulti3DV or noLabs) > 0 and e871Code is not None and subtitle == "Hyponatremia Dx Documented Possibly Lacking Supporting Evidence":
-        updateLinkText(e871Code, autoEvidenceText); abs.Links.Add(e871Code)
-        for entry in serumSodiumMulti3DV:
+    elif len(evidence.serumSodiumMulti3DV or noLabs) > 0 and evidence.e871Code is not None and subtitle == "Hyponatremia Dx Documented Possibly Lacking Supporting Evidence":
+        updateLinkText(evidence.e871Code, autoEvidenceText); abs.Links.Add(evidence.e871Code)
+        for entry in evidence.serumSodiumMulti3DV:
             updateLinkText(entry, autoEvidenceText); sodium.Links.Add(entry)
         if message2: labs.Links.Add(MatchedCriteriaLink(LinkText2, None, None, None, False))
         result.Outcome = "AUTORESOLVED"
@@ -440,20 +254,20 @@ if validated is False:
         AlertConditions = True
 
     elif (
-        len(serumSodiumMulti3DV or noLabs) == 0 and
-        e871Code is not None
+        len(evidence.serumSodiumMulti3DV or noLabs) == 0 and
+        evidence.e871Code is not None
     ):
-        abs.Links.Add(e871Code)
+        abs.Links.Add(evidence.e871Code)
         labs.Links.Add(MatchedCriteriaLink(LinkText2, None, None, None))
         result.Subtitle = "Hyponatremia Dx Documented Possibly Lacking Supporting Evidence"
         AlertConditions = True
 
     else:
-        db.LogEvaluationScriptMessage("Not enough data to warrent alert, Alert Failed. " + str(account._id), scriptName, scriptInstance, "Debug")
+        scriptLog.debug("Not enough data to warrent alert, Alert Failed. %s", account._id)
         result.Passed = False
 
 else:
-    db.LogEvaluationScriptMessage("Alert Closed; Exiting script run. Outcome: " + str(outcome) + " " + str(account._id), scriptName, scriptInstance, "Debug")
+    scriptLog.debug("Alert Closed; Exiting script run. Outcome: %s %s", outcome, account._id)
 
 #If an alert triggered abstract the following
 if AlertPassed:
@@ -505,7 +319,9 @@ if AlertPassed or AlertConditions:
     result.Links.Add(treatment)
     result.Links.Add(other)
     if treatment.Links: treatmentLinks = True
-    db.LogEvaluationScriptMessage("Alert Passed Adding Links. Alert Triggered: " + str(result.Subtitle) + " Autoresolved: " + str(result.Outcome) + "; " +
-        str(result.Validated) + "; Links: " + "Abs- " + str(absLinks) + ", labs- " + str(labsLinks) 
-        + ", Treatment- " + str(treatmentLinks) + "; Acct: " + str(account._id), scriptName, scriptInstance, "Debug")
+    scriptLog.debug("Alert Passed Adding Links. Alert Triggered: %s Autoresolved: %s; %s; Links: Abs- %s, labs- %s, Treatment- %s; Acct: %s",
+        result.Subtitle, result.Outcome, result.Validated, absLinks, labsLinks, treatmentLinks, account._id)
     result.Passed = True
+
+#Write out this run's script messages
+scriptLog.flush()
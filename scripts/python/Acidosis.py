@@ -28,6 +28,7 @@ from System.Data import *
 from System.Configuration import *
 from System.Collections.Generic import *
 clr.ImportExtensions(System.Linq)
+from cdi import DiscreteValueIndex, Evidence, evaluation_context
 from operator import le, ge, gt, lt
 
 #========================================
@@ -67,14 +68,20 @@ autoCodeText = "Autoresolved Code - "
 #  Globals
 #========================================
 db = CACDataRepository()
+#Account data is loaded once and shared by every script run for the account,
+#fetching only the discrete values of the last 7 days
+context = evaluation_context(account, db, System.DateTime.Now.AddDays(-7))
+#Script messages are only formatted when their level is enabled, and are written
+#together at the end of the run
+scriptLog = context.log(db, scriptName, scriptInstance)
 admitDate = account.AdmitDateTime.Date
 birthDate = account.Patient.BirthDate.Date
 gender = account.Patient.Gender
 #Update true = External DV collection False = On Acct Record
-accountContainer = AccountWorkflowContainer(account, True, "Category", 7)
+accountContainer = context.container(AccountWorkflowContainer, True, "Category", 7)
 useSeperateDiscreteCollection = True
 if useSeperateDiscreteCollection == True:
-    discreteValues = db.GetDiscreteValues(account._id)
+    discreteValues = context.discrete_values
 else:
     discreteValues = db.GetAccountField(account._id, "DiscreteValues")
 
@@ -145,214 +152,13 @@ dvUrineKetones = ["UR KETONES (mg/dL)", "KETONES (mg/dL)"]
 #========================================
 #  Functions
 #========================================
-def datetimeFromUtcToLocal(utc_datetime):
-    if utc_datetime:
-        convertedDate = DateTime.SpecifyKind(utc_datetime, DateTimeKind.Utc)
-        return  convertedDate.ToLocalTime()
-    else:
-        return None
-
-def cleanNumbers(result):
-    result1 = re.sub("[\\<\\>]", "", str(result))
-    if result1.count('.') <= 1 and result1.replace(".", "").isnumeric():
-        return result1
-    else:
-        return None
-
-def dataConversion(datetime, linkText, Result, id, category, sequence, abstract=True, gender=None):
-    if datetime is not None:
-        date_time = datetimeFromUtcToLocal(datetime)
-        date_time = date_time.ToString("MM/dd/yyyy, HH:mm")
-        linkText = linkText.replace("[RESULTDATETIME]", date_time)
-    else: 
-        linkText = linkText.replace("(Result Date: [RESULTDATETIME])", "")
-    if Result is not None:
-        linkText = linkText.replace("[VALUE]", Result)
-    else: linkText = linkText.replace("[VALUE]", "")
-    if gender: linkText = linkText.replace("[GENDER]", gender)
-    else: linkText = linkText.replace("[GENDER]", "")
-    if abstract == True:
-        category.Links.Add(MatchedCriteriaLink(linkText, None, None, id, True, None, None, sequence))
-    elif abstract == False:
-        abstraction = MatchedCriteriaLink(linkText, None, None, id, True, None, None, sequence)
-        return abstraction
-    return
-
-def CodeCount(codes):
-    # Get list of codes on the acct based on CodeDic
-    result = set()
-    for document in account.Documents or []:
-        for codeReference in document.CodeReferences or []:
-            if codeReference.Code in codes:
-                matching_code = codeReference.Code
-                result.add(matching_code)
-    return list(result)
-
-def abstractValue(abstraction_name, link_text, calculation, sequence=0, category=None, abstract=False):
-    # Find abstraction and if abstract is true abstract it to the provided category
-    abstraction = accountContainer.GetFirstLinkMatchingAbstractionValue(abstraction_name, link_text, lambda x: calculation)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def dvValue(dv_name, link_text, calculation, sequence=0, category=None, abstract=False):
-    # Find Discrete Value and if abstract is true abstract it to the provided category
-    for dv in dv_name:
-        abstraction = accountContainer.GetFirstLinkMatchingDiscreteValue(dv, link_text, calculation)
-        if abstraction is not None:
-            break
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def dvValueMulti(dvDic, DV1, linkText, value, sign, sequence=0, category=None, abstract=False, needed=2):
-    # Find Discrete Value and if abstract is true abstract it to the provided category
-    matchedList = []
-    x = 0
-    for dv in dvDic or []:
-        dvr = cleanNumbers(dvDic[dv]['Result'])
-        if dvDic[dv]['Name'] in DV1 and dvr is not None and sign(float(dvr), float(value)):
-            matchedList.append(dataConversion(dvDic[dv]['ResultDate'], linkText, dvDic[dv]['Result'], dvDic[dv]['UniqueId'] or dvDic[dv]['_id'], category, sequence, abstract))
-            x += 1
-            if needed <= x:
-                break
-    if abstract and x > 0:
-        return True
-    elif abstract is False and len(matchedList) > 0 and needed > 0:
-        return matchedList
-    else:
-        return None
-
-def compareValuesMulti(dvDic, DV1, value, value1, linkText, sign, sign1, sequence=0, category=None, abstract=False, needed=2):
-    matchedList = []
-    x = 0
-    for dv in dvDic or []:
-        dvr = cleanNumbers(dvDic[dv]['Result'])
-        if dvDic[dv]['Name'] in DV1 and dvr is not None and sign(float(value), float(dvr)) and sign1(float(dvr), float(value1)):
-            matchedList.append(dataConversion(dvDic[dv]['ResultDate'], linkText, dvDic[dv]['Result'], dvDic[dv]['UniqueId'] or dvDic[dv]['_id'], category, sequence, abstract))
-            x += 1
-            if needed <= x:
-                break
-    if abstract and x > 0:
-        return True
-    elif abstract is False and len(matchedList) > 0 and needed > 0:
-        return matchedList
-    else:
-        return None
-
-def codeValue(code_name, link_text, sequence=0, category=None, abstract=False):
-    # Find code and if abstract is true abstract it to the provided category
-    abstraction = accountContainer.GetFirstCodeLink(code_name, link_text)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def multiCodeValue(code_list, link_text, sequence=0, category=None, abstract=False):
-    # Go through Code List and find first code and if abstract is true abstract it to the provided category
-    abstraction = None
-    for code in code_list:
-        abstraction = accountContainer.GetFirstCodeLink(code, link_text)
-        if abstraction is not None:
-            abstraction.Sequence = sequence
-            if abstract:
-                category.Links.Add(abstraction)
-                return True
-            else:
-                return abstraction
-    if abstract and abstraction is None:
-        return False
-    return abstraction
+#The helpers every script shares are compiled once per process and bound to this
+#script's globals, see cdi.helpers; a helper defined below replaces the shared one
+context.bind_helpers(globals(), 1)
 
-def prefixCodeValue(prefix, link_text, sequence=0, category=None, abstract=False):
-    # Use prefix to find first code match based on regex search and if abstract is true abstract it to the provided category
-    abstraction = None
-    validCodes = [codes for codes in accountContainer.CodeKeys if re.match(prefix, codes) is not None]
-    for code in validCodes:
-        abstraction = accountContainer.GetFirstCodeLink(code, link_text)
-        if abstraction is not None:
-            abstraction.Sequence = sequence
-            if abstract:
-                category.Links.Add(abstraction)
-                return True
-            else:
-                return abstraction
-    if abstract and abstraction is None:
-        return False
-    return abstraction
-
-def medValue(med_name, link_text, sequence=0, category=None, abstract=False):
-    # Find Medication Value and if abstract is true abstract it to the provided category
-    abstraction = accountContainer.GetFirstMedicationLink(med_name, link_text)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def updateLinkText(value, replacement_text):
-    # Update the link text with the provided text
-    value.LinkText = replacement_text + value.LinkText
-    return value
-
-def documentLink(DocumentType, LinkText, sequence, category, abstract):
-    # Finds a document link and adds it as link so that its a quick reference for the cdi user.
-    abstraction = None
-    abstraction = accountContainer.GetFirstDocumentLink(DocumentType, LinkText)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    return None
-    
 #========================================
 #  Script Specific Functions
 #========================================
-def dvPositiveCheck(dvDic, discreteValueName, linkText, sequence=0, category=None, abstract=False):
-    abstraction = None
-    for dv in dvDic or []:
-        if (
-            dvDic[dv]['Name'] in discreteValueName and
-            dvDic[dv]['Result'] is not None and
-            (re.search(r'\bpositive\b', dvDic[dv]['Result'], re.IGNORECASE) is not None or
-            re.search(r'\bDetected\b', dvDic[dv]['Result'], re.IGNORECASE) is not None)
-        ):
-            if abstract:
-                dataConversion(dvDic[dv]['ResultDate'], linkText, dvDic[dv]['Result'], dvDic[dv]['UniqueId'] or dvDic[dv]['_id'], category, sequence, True)
-                return True
-            else:
-                abstraction = dataConversion(dvDic[dv]['ResultDate'], linkText, dvDic[dv]['Result'], dvDic[dv]['UniqueId'] or dvDic[dv]['_id'], category, sequence, False)
-                return abstraction
-    return abstraction
-
 def limitedMedValue(medDic, dvDic, med_name, value1, value2, value3, link_text, sequence=0, category=None, abstract=False):
     dvDic = {}
     dateList = []
@@ -428,7 +234,7 @@ def medDataConversion(datetime, linkText, med, id, dosage, route, category, sequ
 #========================================
 #  Algorithm
 #========================================
-db.LogEvaluationScriptMessage("Starting Script " + str(account._id), scriptName, scriptInstance, "Debug")
+scriptLog.debug("Starting Script %s", account._id)
 #Determine if if and how many fully spec codes are on the acct
 codes = []
 codes = codeDic.keys()
@@ -485,88 +291,70 @@ for alert in account.MatchedCriteriaGroups or []:
 
 #Pulling needed items for unresolving an alert
 #Documented Dx
-chronicRespAcidosisAbs = abstractValue("CHRONIC_RESPIRATORY_ACIDOSIS", "Chronic Respiratory Acidosis '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True)
-metaAcidosisAbs = abstractValue("METABOLIC_ACIDOSIS", "Metabolic Acidosis '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True)
-acuteAcidosisAbs = abstractValue("ACUTE_ACIDOSIS", "Acute Acidosis '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True)
-chronicAcidosisAbs = abstractValue("CHRONIC_ACIDOSIS", "Chronic Acidosis '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True)
-LacticAcidosisAbs = abstractValue("LACTIC_ACIDOSIS", "Lactic Acidosis '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True)
-e8720Code = codeValue("E87.20", "Acidosis Unspecified: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-e8729Code = codeValue("E87.29", "Other Acidosis: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+evidence = Evidence()
+evidence.define("chronicRespAcidosisAbs", abstractValue, "CHRONIC_RESPIRATORY_ACIDOSIS", "Chronic Respiratory Acidosis '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True)
+evidence.define("metaAcidosisAbs", abstractValue, "METABOLIC_ACIDOSIS", "Metabolic Acidosis '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True)
+evidence.define("acuteAcidosisAbs", abstractValue, "ACUTE_ACIDOSIS", "Acute Acidosis '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True)
+evidence.define("chronicAcidosisAbs", abstractValue, "CHRONIC_ACIDOSIS", "Chronic Acidosis '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True)
+evidence.define("LacticAcidosisAbs", abstractValue, "LACTIC_ACIDOSIS", "Lactic Acidosis '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True)
+evidence.define("e8720Code", codeValue, "E87.20", "Acidosis Unspecified: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+evidence.define("e8729Code", codeValue, "E87.29", "Other Acidosis: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
 
 #Check if alert was autoresolved or completed.
 if validated is False:
     #Find all discrete values for custom lookups within the last X days
-    maindiscreteDic = {}
-    unsortedDicsreteDic = {}
-    dvCount = 0
     #Set datelimit for how far back to 
     dvDateLimit = System.DateTime.Now.AddDays(-7)
     #Combine all items into one list to search against
     discreteSearchList = [i for j in [dvBloodCO2, dvSerumLactate, dvArterialBloodPH, dvPH, dvPCO2, dvSerumBicarbonate, dvVenousBloodCO2, dvUrineKetones] for i in j]
-    #Loop through all dvs finding any that match in the combined list adding to a dictionary the matches
-    for dv in discreteValues or []:
-        if dv.ResultDate >= dvDateLimit:
-            if any(item == dv.Name for item in discreteSearchList):
-                dvCount += 1
-                unsortedDicsreteDic[dvCount] = dv
-    #Sort List by latest
-    maindiscreteDic = sorted(unsortedDicsreteDic.items(), key=lambda x: x[1]['ResultDate'], reverse=True)
+    #Index all dvs that match in the combined list by name, sorted by latest
+    maindiscreteDic = DiscreteValueIndex(discreteValues, discreteSearchList, dvDateLimit)
     
     #Get meds within last X days
-    mainMedDic = {}
-    unsortedMedDic = {} 
-    medCount = 0
     #Combine all items into one list to search against
     medSearchList = ["Albumin", "Fluid Bolus", "Sodium Bicarbonate"]
     #Set datelimit for how far back to 
     medDateLimit = System.DateTime.Now.AddDays(-7)
-    #Loop through all meds finding any that match in the combined list adding to a dictionary the matches
-    if 'Medications' in account:    
-        for med in account.Medications:
-            if med.StartDate >= medDateLimit and 'CDIAlertCategory' in med and med.CDIAlertCategory is not None:
-                if any(item == med.CDIAlertCategory for item in medSearchList):
-                    medCount += 1
-                    unsortedMedDic[medCount] = med
-    #Sort List by latest
-    mainMedDic = sorted(unsortedMedDic.items(), key=lambda x: x[1]['StartDate'], reverse=True)
+    #Collect matching meds, sorted by latest
+    mainMedDic = context.medications(medSearchList, medDateLimit, "CDIAlertCategory")
     
     #Documented Dx
     acuteRespAcidosisAbs = abstractValue("ACUTE_RESPIRATORY_ACIDOSIS", "Acute Respiratory Acidosis '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True)
     j9602Code = codeValue("J96.02", "Acute Respiratory Failure with Hypercapnia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
     #Labs Subheading
-    bloodCO2MultiDV = dvValueMulti(dict(maindiscreteDic), dvBloodCO2, "Blood CO2: [VALUE] (Result Date: [RESULTDATETIME])", calcBloodCO21, lt, 0, blood, False, 10)
-    highSerumLactateDV = dvValueMulti(dict(maindiscreteDic), dvSerumLactate, "Serum Lactate: [VALUE] (Result Date: [RESULTDATETIME])", calcSerumLactate1, ge, 0, lactate, False, 10)
+    bloodCO2MultiDV = dvValueMulti(maindiscreteDic, dvBloodCO2, "Blood CO2: [VALUE] (Result Date: [RESULTDATETIME])", calcBloodCO21, lt, 0, blood, False, 10)
+    highSerumLactateDV = dvValueMulti(maindiscreteDic, dvSerumLactate, "Serum Lactate: [VALUE] (Result Date: [RESULTDATETIME])", calcSerumLactate1, ge, 0, lactate, False, 10)
 
     #abg Subheading
-    lowArterialBloodPHMultiDV = dvValueMulti(dict(maindiscreteDic), dvArterialBloodPH, "PH: [VALUE] (Result Date: [RESULTDATETIME])", calcArterialBloodPH2, lt, 0, ph, False, 10)
-    paco2Dv = dvValueMulti(dict(maindiscreteDic), dvPCO2, "paC02: [VALUE] (Result Date: [RESULTDATETIME])", calcPCO21, gt, 0, pac02, False, 10)
-    highSerumBicarbonateDV = dvValueMulti(dict(maindiscreteDic), dvSerumBicarbonate, "HC03: [VALUE] (Result Date: [RESULTDATETIME])", calcSerumBicarbonate1, gt, 0, abghc02, False, 10)
+    lowArterialBloodPHMultiDV = dvValueMulti(maindiscreteDic, dvArterialBloodPH, "PH: [VALUE] (Result Date: [RESULTDATETIME])", calcArterialBloodPH2, lt, 0, ph, False, 10)
+    paco2Dv = dvValueMulti(maindiscreteDic, dvPCO2, "paC02: [VALUE] (Result Date: [RESULTDATETIME])", calcPCO21, gt, 0, pac02, False, 10)
+    highSerumBicarbonateDV = dvValueMulti(maindiscreteDic, dvSerumBicarbonate, "HC03: [VALUE] (Result Date: [RESULTDATETIME])", calcSerumBicarbonate1, gt, 0, abghc02, False, 10)
     #vbg Subheading
-    phMultiDV = dvValueMulti(dict(maindiscreteDic), dvPH, "PH: [VALUE] (Result Date: [RESULTDATETIME])", calcPH2, lt, 0, ph, False, 10)
-    venousCO2Dv = dvValueMulti(dict(maindiscreteDic), dvVenousBloodCO2, "pC02: [VALUE] (Result Date: [RESULTDATETIME])", calcVenousBloodCO2, gt, 0, venousCO2, False, 10)
+    phMultiDV = dvValueMulti(maindiscreteDic, dvPH, "PH: [VALUE] (Result Date: [RESULTDATETIME])", calcPH2, lt, 0, ph, False, 10)
+    venousCO2Dv = dvValueMulti(maindiscreteDic, dvVenousBloodCO2, "pC02: [VALUE] (Result Date: [RESULTDATETIME])", calcVenousBloodCO2, gt, 0, venousCO2, False, 10)
     #Meds
-    albuminMed = limitedMedValue(dict(mainMedDic), dict(maindiscreteDic), "Albumin", lowArterialBloodPHMultiDV, phMultiDV, bloodCO2MultiDV, "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 1)
-    fluidBolusMed = limitedMedValue(dict(mainMedDic), dict(maindiscreteDic), "Fluid Bolus", lowArterialBloodPHMultiDV, phMultiDV, bloodCO2MultiDV, "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 2)
+    albuminMed = limitedMedValue(mainMedDic, maindiscreteDic, "Albumin", lowArterialBloodPHMultiDV, phMultiDV, bloodCO2MultiDV, "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 1)
+    fluidBolusMed = limitedMedValue(mainMedDic, maindiscreteDic, "Fluid Bolus", lowArterialBloodPHMultiDV, phMultiDV, bloodCO2MultiDV, "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 2)
     fluidBolusAbs = abstractValue("FLUID_BOLUS", "Fluid Bolus: [ABSTRACTVALUE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 3)
     fluidResucAbs = abstractValue("FLUID_RESUSCITATION", "Fluid Resuscitation: [ABSTRACTVALUE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 4)
-    sodiumBicarMed = limitedMedValue(dict(mainMedDic), dict(maindiscreteDic), "Sodium Bicarbonate", lowArterialBloodPHMultiDV, phMultiDV, bloodCO2MultiDV, "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 5)
+    sodiumBicarMed = limitedMedValue(mainMedDic, maindiscreteDic, "Sodium Bicarbonate", lowArterialBloodPHMultiDV, phMultiDV, bloodCO2MultiDV, "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 5)
     sodiumBicarbonateAbs = abstractValue("SODIUM_BICARBONATE", "Sodium Bicarbonate: [ABSTRACTVALUE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 6)
     
     #Fully Specified exist
     if (
         codesExist >= 1 or 
-        chronicRespAcidosisAbs is not None or 
-        LacticAcidosisAbs is not None or 
-        metaAcidosisAbs is not None
+        evidence.chronicRespAcidosisAbs is not None or 
+        evidence.LacticAcidosisAbs is not None or 
+        evidence.metaAcidosisAbs is not None
     ):
         fullSpec = True
     
     #Unspecified exist
     if (
-        e8720Code is not None or
-        e8729Code is not None or
-        acuteAcidosisAbs is not None or
-        chronicAcidosisAbs is not None
+        evidence.e8720Code is not None or
+        evidence.e8729Code is not None or
+        evidence.acuteAcidosisAbs is not None or
+        evidence.chronicAcidosisAbs is not None
     ):
         unSpec = True
 
@@ -594,10 +382,10 @@ if validated is False:
         (venousCO2Dv is not None or paco2Dv is not None) and 
         (len(lowArterialBloodPHMultiDV or noLabs) >= 1 or len(phMultiDV or noLabs) >= 1)
     ):
-        if e8720Code is not None: documentedDx.Links.Add(e8720Code)
-        if e8729Code is not None: documentedDx.Links.Add(e8729Code)
-        if acuteAcidosisAbs is not None: documentedDx.Links.Add(acuteAcidosisAbs)
-        if chronicAcidosisAbs is not None: documentedDx.Links.Add(chronicAcidosisAbs)
+        if evidence.e8720Code is not None: documentedDx.Links.Add(evidence.e8720Code)
+        if evidence.e8729Code is not None: documentedDx.Links.Add(evidence.e8729Code)
+        if evidence.acuteAcidosisAbs is not None: documentedDx.Links.Add(evidence.acuteAcidosisAbs)
+        if evidence.chronicAcidosisAbs is not None: documentedDx.Links.Add(evidence.chronicAcidosisAbs)
         result.Subtitle = "Possible Acute Respiratory Acidosis"
         AlertPassed = True
     #2.1    
@@ -631,13 +419,13 @@ if validated is False:
                 if tempCode is not None:
                     documentedDx.Links.Add(tempCode)
                     break
-        if LacticAcidosisAbs is not None: updateLinkText(LacticAcidosisAbs, autoEvidenceText); documentedDx.Links.Add(LacticAcidosisAbs)
-        if chronicRespAcidosisAbs is not None: updateLinkText(chronicRespAcidosisAbs, autoEvidenceText); documentedDx.Links.Add(chronicRespAcidosisAbs)
-        if metaAcidosisAbs is not None: updateLinkText(metaAcidosisAbs, autoEvidenceText); documentedDx.Links.Add(metaAcidosisAbs)
-        if e8720Code is not None: updateLinkText(e8720Code, autoEvidenceText); documentedDx.Links.Add(e8720Code)
-        if e8729Code is not None: updateLinkText(e8729Code, autoEvidenceText); documentedDx.Links.Add(e8729Code)
-        if acuteAcidosisAbs is not None: updateLinkText(acuteAcidosisAbs, autoEvidenceText); documentedDx.Links.Add(acuteAcidosisAbs)
-        if chronicAcidosisAbs is not None: updateLinkText(chronicAcidosisAbs, autoEvidenceText); documentedDx.Links.Add(chronicAcidosisAbs)
+        if evidence.LacticAcidosisAbs is not None: updateLinkText(evidence.LacticAcidosisAbs, autoEvidenceText); documentedDx.Links.Add(evidence.LacticAcidosisAbs)
+        if evidence.chronicRespAcidosisAbs is not None: updateLinkText(evidence.chronicRespAcidosisAbs, autoEvidenceText); documentedDx.Links.Add(evidence.chronicRespAcidosisAbs)
+        if evidence.metaAcidosisAbs is not None: updateLinkText(evidence.metaAcidosisAbs, autoEvidenceText); documentedDx.Links.Add(evidence.metaAcidosisAbs)
+        if evidence.e8720Code is not None: updateLinkText(evidence.e8720Code, autoEvidenceText); documentedDx.Links.Add(evidence.e8720Code)
+        if evidence.e8729Code is not None: updateLinkText(evidence.e8729Code, autoEvidenceText); documentedDx.Links.Add(evidence.e8729Code)
+        if evidence.acuteAcidosisAbs is not None: updateLinkText(evidence.acuteAcidosisAbs, autoEvidenceText); documentedDx.Links.Add(evidence.acuteAcidosisAbs)
+        if evidence.chronicAcidosisAbs is not None: updateLinkText(evidence.chronicAcidosisAbs, autoEvidenceText); documentedDx.Links.Add(evidence.chronicAcidosisAbs)
         result.Outcome = "AUTORESOLVED"
         result.Reason = "Autoresolved due to one Specified Code on the Account"
         result.Validated = True
@@ -671,11 +459,11 @@ if validated is False:
         AlertPassed = True
 
     else:
-        db.LogEvaluationScriptMessage("Not enough data to warrent alert, Alert Failed. " + str(account._id), scriptName, scriptInstance, "Debug")
+        scriptLog.debug("Not enough data to warrent alert, Alert Failed. %s", account._id)
         result.Passed = False
 
 else:
-    db.LogEvaluationScriptMessage("Alert Closed; Exiting script run. Outcome: " + str(outcome) + " " + str(account._id), scriptName, scriptInstance, "Debug")
+    scriptLog.debug("Alert Closed; Exiting script run. Outcome: %s %s", outcome, account._id)
 
 #If an alert triggered abstract the following
 if AlertPassed:
@@ -709,7 +497,7 @@ if AlertPassed:
     dvValue(dvSerumChloride, "Serum Chloride: [VALUE] (Result Date: [RESULTDATETIME])", calcSerumChloride1, 6, labs, True)
     dvValue(dvSerumCreatinine, "Serum Creatinine: [VALUE] (Result Date: [RESULTDATETIME])", calcSerumCreatinine1, 7, labs, True)
     dvValue(dvSerumKetone, "Serum Ketones: [VALUE] (Result Date: [RESULTDATETIME])", calcSerumKetone1, 8, labs, True)
-    dvPositiveCheck(dict(maindiscreteDic), dvUrineKetones, "Urine Ketones: '[VALUE]' (Result Date: [RESULTDATETIME])", 9, labs, True)
+    dvPositiveCheck(maindiscreteDic, dvUrineKetones, "Urine Ketones: '[VALUE]' (Result Date: [RESULTDATETIME])", 9, labs, True)
     #Lab Subheading
     dvValue(dvSerumLactate, "Serum Lactate: [VALUE] (Result Date: [RESULTDATETIME])", calcSerumLactate2, 0, lactate, True)
     if highSerumLactateDV is not None:
@@ -748,10 +536,10 @@ if AlertPassed:
     elif highSerumBicarbonateDV is None:
         dvValue(dvSerumBicarbonate, "HC03: [VALUE] (Result Date: [RESULTDATETIME])", calcSerumBicarbonate3, 0, abghc02, True)
     #ABG Subheadings
-    dvValueMulti(dict(maindiscreteDic), dvPaO2, "PaO2: [VALUE] (Result Date: [RESULTDATETIME])", calcPAO21, lt, 0, pao2, True, 10)
+    dvValueMulti(maindiscreteDic, dvPaO2, "PaO2: [VALUE] (Result Date: [RESULTDATETIME])", calcPAO21, lt, 0, pao2, True, 10)
     #VBG Subheadings
-    dvValueMulti(dict(maindiscreteDic), dvHCO3, "HC03: [VALUE] (Result Date: [RESULTDATETIME])", calcHCO31, lt, 0, vbghc02, True, 10)
-    dvValueMulti(dict(maindiscreteDic), dvHCO3, "HC03: [VALUE] (Result Date: [RESULTDATETIME])", calcHCO32, gt, 0, vbghc02, True, 10)
+    dvValueMulti(maindiscreteDic, dvHCO3, "HC03: [VALUE] (Result Date: [RESULTDATETIME])", calcHCO31, lt, 0, vbghc02, True, 10)
+    dvValueMulti(maindiscreteDic, dvHCO3, "HC03: [VALUE] (Result Date: [RESULTDATETIME])", calcHCO32, gt, 0, vbghc02, True, 10)
     if venousCO2Dv is not None:
         for entry in venousCO2Dv:
             venousCO2.Links.Add(entry) #0
@@ -776,7 +564,10 @@ if AlertPassed or AlertConditions:
     result.Links.Add(meds)
     result.Links.Add(other)
     if meds.Links: medsLinks = True
-    db.LogEvaluationScriptMessage("Alert Passed Adding Links. Alert Triggered: " + str(result.Subtitle) + " Autoresolved: " + str(result.Outcome) + "; " +
-        str(result.Validated) + "; Links: documentedDx- " + str(documentedDxTriggerLinks) + ", Abs- " + str(absLinks) + ", labs- " + str(labsLinks) + ", vitals- " + str(vitalsLinks)
-        + ", meds- " + str(medsLinks) + ", abg- " + str(abgLinks) + ", vbg- " + str(vbgLinks) + "; Acct: " + str(account._id), scriptName, scriptInstance, "Debug")
+    scriptLog.debug("Alert Passed Adding Links. Alert Triggered: %s Autoresolved: %s; %s; Links: documentedDx- %s, Abs- %s, labs- %s, vitals- %s, meds- %s, abg- %s, vbg- %s; Acct: %s",
+        result.Subtitle, result.Outcome, result.Validated, documentedDxTriggerLinks, absLinks, labsLinks, vitalsLinks, medsLinks, abgLinks, vbgLinks,
+        account._id)
     result.Passed = True
+
+#Write out this run's script messages
+scriptLog.flush()
@@ -28,6 +28,7 @@ from System.Data import *
 from System.Configuration import *
 from System.Collections.Generic import *
 clr.ImportExtensions(System.Linq)
+from cdi import DiscreteValueIndex, Evidence, evaluation_context
 from operator import le, ge, gt, lt
 
 #========================================
@@ -56,14 +57,20 @@ autoCodeText = "Autoresolved Code - "
 #  Globals
 #========================================
 db = CACDataRepository()
+#Account data is loaded once and shared by every script run for the account,
+#fetching only the discrete values of the last 7 days
+context = evaluation_context(account, db, System.DateTime.Now.AddDays(-7))
+#Script messages are only formatted when their level is enabled, and are written
+#together at the end of the run
+scriptLog = context.log(db, scriptName, scriptInstance)
 admitDate = account.AdmitDateTime.Date
 birthDate = account.Patient.BirthDate.Date
 gender = account.Patient.Gender
 #Update true = External DV collection False = On Acct Record
-accountContainer = AccountWorkflowContainer(account, True, "Category", 7)
+accountContainer = context.container(AccountWorkflowContainer, True, "Category", 7)
 useSeperateDiscreteCollection = True
 if useSeperateDiscreteCollection == True:
-    discreteValues = db.GetDiscreteValues(account._id)
+    discreteValues = context.discrete_values
 else:
     discreteValues = db.GetAccountField(account._id, "DiscreteValues")
 
@@ -95,214 +102,13 @@ calcTroponinT1 = 59
 #========================================
 #  Functions
 #========================================
-def datetimeFromUtcToLocal(utc_datetime):
-    if utc_datetime:
-        convertedDate = DateTime.SpecifyKind(utc_datetime, DateTimeKind.Utc)
-        return  convertedDate.ToLocalTime()
-    else:
-        return None
-
-def cleanNumbers(result):
-    result1 = re.sub("[\\<\\>]", "", str(result))
-    if result1.count('.') <= 1 and result1.replace(".", "").isnumeric():
-        return result1
-    else:
-        return None
-
-def dataConversion(datetime, linkText, Result, id, category, sequence, abstract=True, gender=None):
-    if datetime is not None:
-        date_time = datetimeFromUtcToLocal(datetime)
-        date_time = date_time.ToString("MM/dd/yyyy, HH:mm")
-        linkText = linkText.replace("[RESULTDATETIME]", date_time)
-    else: 
-        linkText = linkText.replace("(Result Date: [RESULTDATETIME])", "")
-    if Result is not None:
-        linkText = linkText.replace("[VALUE]", Result)
-    else: linkText = linkText.replace("[VALUE]", "")
-    if gender: linkText = linkText.replace("[GENDER]", gender)
-    else: linkText = linkText.replace("[GENDER]", "")
-    if abstract == True:
-        category.Links.Add(MatchedCriteriaLink(linkText, None, None, id, True, None, None, sequence))
-    elif abstract == False:
-        abstraction = MatchedCriteriaLink(linkText, None, None, id, True, None, None, sequence)
-        return abstraction
-    return
-
-def CodeCount(codes):
-    # Get list of codes on the acct based on CodeDic
-    result = set()
-    for document in account.Documents or []:
-        for codeReference in document.CodeReferences or []:
-            if codeReference.Code in codes:
-                matching_code = codeReference.Code
-                result.add(matching_code)
-    return list(result)
-
-def abstractValue(abstraction_name, link_text, calculation, sequence=0, category=None, abstract=False):
-    # Find abstraction and if abstract is true abstract it to the provided category
-    abstraction = accountContainer.GetFirstLinkMatchingAbstractionValue(abstraction_name, link_text, lambda x: calculation)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def dvValue(dv_name, link_text, calculation, sequence=0, category=None, abstract=False):
-    # Find Discrete Value and if abstract is true abstract it to the provided category
-    for dv in dv_name:
-        abstraction = accountContainer.GetFirstLinkMatchingDiscreteValue(dv, link_text, calculation)
-        if abstraction is not None:
-            break
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def dvValueMulti(dvDic, DV1, linkText, value, sign, sequence=0, category=None, abstract=False, needed=2):
-    # Find Discrete Value and if abstract is true abstract it to the provided category
-    matchedList = []
-    x = 0
-    for dv in dvDic or []:
-        dvr = cleanNumbers(dvDic[dv]['Result'])
-        if dvDic[dv]['Name'] in DV1 and dvr is not None and sign(float(dvr), float(value)):
-            matchedList.append(dataConversion(dvDic[dv]['ResultDate'], linkText, dvDic[dv]['Result'], dvDic[dv]['UniqueId'] or dvDic[dv]['_id'], category, sequence, abstract))
-            x += 1
-            if needed <= x:
-                break
-    if abstract and x > 0:
-        return True
-    elif abstract is False and len(matchedList) > 0 and needed > 0:
-        return matchedList
-    else:
-        return None
-
-def compareValuesMulti(dvDic, DV1, value, value1, linkText, sign, sign1, sequence=0, category=None, abstract=False, needed=2):
-    matchedList = []
-    x = 0
-    for dv in dvDic or []:
-        dvr = cleanNumbers(dvDic[dv]['Result'])
-        if dvDic[dv]['Name'] in DV1 and dvr is not None and sign(float(value), float(dvr)) and sign1(float(dvr), float(value1)):
-            matchedList.append(dataConversion(dvDic[dv]['ResultDate'], linkText, dvDic[dv]['Result'], dvDic[dv]['UniqueId'] or dvDic[dv]['_id'], category, sequence, abstract))
-            x += 1
-            if needed <= x:
-                break
-    if abstract and x > 0:
-        return True
-    elif abstract is False and len(matchedList) > 0 and needed > 0:
-        return matchedList
-    else:
-        return None
-
-def codeValue(code_name, link_text, sequence=0, category=None, abstract=False):
-    # Find code and if abstract is true abstract it to the provided category
-    abstraction = accountContainer.GetFirstCodeLink(code_name, link_text)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def multiCodeValue(code_list, link_text, sequence=0, category=None, abstract=False):
-    # Go through Code List and find first code and if abstract is true abstract it to the provided category
-    abstraction = None
-    for code in code_list:
-        abstraction = accountContainer.GetFirstCodeLink(code, link_text)
-        if abstraction is not None:
-            abstraction.Sequence = sequence
-            if abstract:
-                category.Links.Add(abstraction)
-                return True
-            else:
-                return abstraction
-    if abstract and abstraction is None:
-        return False
-    return abstraction
-
-def prefixCodeValue(prefix, link_text, sequence=0, category=None, abstract=False):
-    # Use prefix to find first code match based on regex search and if abstract is true abstract it to the provided category
-    abstraction = None
-    validCodes = [codes for codes in accountContainer.CodeKeys if re.match(prefix, codes) is not None]
-    for code in validCodes:
-        abstraction = accountContainer.GetFirstCodeLink(code, link_text)
-        if abstraction is not None:
-            abstraction.Sequence = sequence
-            if abstract:
-                category.Links.Add(abstraction)
-                return True
-            else:
-                return abstraction
-    if abstract and abstraction is None:
-        return False
-    return abstraction
-
-def medValue(med_name, link_text, sequence=0, category=None, abstract=False):
-    # Find Medication Value and if abstract is true abstract it to the provided category
-    abstraction = accountContainer.GetFirstMedicationLink(med_name, link_text)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def updateLinkText(value, replacement_text):
-    # Update the link text with the provided text
-    value.LinkText = replacement_text + value.LinkText
-    return value
-
-def documentLink(DocumentType, LinkText, sequence, category, abstract):
-    # Finds a document link and adds it as link so that its a quick reference for the cdi user.
-    abstraction = None
-    abstraction = accountContainer.GetFirstDocumentLink(DocumentType, LinkText)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    return None
+#The helpers every script shares are compiled once per process and bound to this
+#script's globals, see cdi.helpers; a helper defined below replaces the shared one
+context.bind_helpers(globals(), 1)
 
 #========================================
 #  Script Specific Functions
 #========================================
-def dvOxygenCheck(dvDic, discreteValueName, linkText, sequence=0, category=None, abstract=False):
-    abstraction = None
-    for dv in dvDic or []:
-        if (
-            dvDic[dv]['Name'] in discreteValueName and
-            dvDic[dv]['Result'] is not None and
-            not re.search(r'\bRoom Air\b', dvDic[dv]['Result'], re.IGNORECASE) and
-            not re.search(r'\bRA\b', dvDic[dv]['Result'], re.IGNORECASE)
-        ):
-            if abstract:
-                dataConversion(dvDic[dv]['ResultDate'], linkText, dvDic[dv]['Result'], dvDic[dv]['UniqueId'] or dvDic[dv]['_id'], category, sequence, True)
-                return True
-            else:
-                abstraction = dataConversion(dvDic[dv]['ResultDate'], linkText, dvDic[dv]['Result'], dvDic[dv]['UniqueId'] or dvDic[dv]['_id'], category, sequence, False)
-                return abstraction
-    return abstraction
-
 def dvAnythingCheck(dvDic, discreteValueName, linkText, sequence=0, category=None, abstract=False):
     abstraction = None
     for dv in dvDic or []:
@@ -346,16 +152,15 @@ def dvLookUpAllValuesSingleLine(dvDic, DV1, sequence, category, linkText):
 #========================================
 #  Algorithm
 #========================================
-db.LogEvaluationScriptMessage("Starting Script " + str(account._id), scriptName, scriptInstance, "Debug")
+scriptLog.debug("Starting Script %s", account._id)
 #Determine if if and how many fully spec codes are on the acct
 stemiCodes = []
 stemiCodes = stemicodeDic.keys()
-stemiCodeList = CodeCount(stemiCodes)
-stemiCodesExist = len(stemiCodeList)
-stemiStr1 = ', '.join([str(elem) for elem in stemiCodeList])
 otherCodes = []
 otherCodes = othercodeDic.keys()
-otherCodeList = CodeCount(otherCodes)
+stemiCodeList, otherCodeList = CodeCounts(stemiCodes, otherCodes)
+stemiCodesExist = len(stemiCodeList)
+stemiStr1 = ', '.join([str(elem) for elem in stemiCodeList])
 otherCodesExist = len(otherCodeList)
 otherStr1 = ', '.join([str(elem) for elem in otherCodeList])
 
@@ -421,43 +226,35 @@ if (
     (outcome == "AUTORESOLVED" and validated and codeCount > 1)
 ):
     #Find all discrete values for custom lookups within the last 7 days
-    maindiscreteDic = {}
-    unsortedDicsreteDic = {}
-    dvCount = 0
     #Combine all items into one list to search against
     discreteSearchList = [i for j in [dvTroponinT, dvOxygenTherapy] for i in j]
     #Set datelimit for how far back to 
     dvDateLimit = System.DateTime.Now.AddDays(-7)
-    #Loop through all dvs finding any that match in the combined list adding to a dictionary the matches
-    for dv in discreteValues or []:
-        if dv.ResultDate >= dvDateLimit:
-            if any(item == dv.Name for item in discreteSearchList):
-                dvCount += 1
-                unsortedDicsreteDic[dvCount] = dv
-    #Sort List by latest
-    maindiscreteDic = sorted(unsortedDicsreteDic.items(), key=lambda x: x[1]['ResultDate'], reverse=True)
+    #Index all dvs that match in the combined list by name, sorted by latest
+    maindiscreteDic = DiscreteValueIndex(discreteValues, discreteSearchList, dvDateLimit)
     
     #Documented Dx
-    i219Code = codeValue("I21.9", "Acute Myocardial Infarction Unspecified: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    r778Code = codeValue("R77.8", "Other Specified Abnormalities of Plasma Proteins: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    i21A1Code = codeValue("I21.A1", "Myocardial Infarction Type 2: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence = Evidence()
+    evidence.define("i219Code", codeValue, "I21.9", "Acute Myocardial Infarction Unspecified: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("r778Code", codeValue, "R77.8", "Other Specified Abnormalities of Plasma Proteins: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("i21A1Code", codeValue, "I21.A1", "Myocardial Infarction Type 2: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
     #Abs
-    r07Codes = multiCodeValue(["R07.89", "R07.9"], "Chest Pain: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 14)
-    i2489Code = codeValue("I24.89", "Demand Ischemia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 23)
-    irregularEKGFindingsAbs = abstractValue("IRREGULAR_EKG_FINDINGS_MI", "Irregular EKG Finding: '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 43)
+    evidence.define("r07Codes", multiCodeValue, ["R07.89", "R07.9"], "Chest Pain: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 14)
+    evidence.define("i2489Code", codeValue, "I24.89", "Demand Ischemia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 23)
+    evidence.define("irregularEKGFindingsAbs", abstractValue, "IRREGULAR_EKG_FINDINGS_MI", "Irregular EKG Finding: '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 43)
     #Meds
-    antiplatlet2Med = medValue("Antiplatelet2", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 7)
-    aspirinMed = medValue("Aspirin", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 9)
-    heparinMed = medValue("Heparin", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 15)
-    morphineMed = medValue("Morphine", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 17)
-    nitroglycerinMed = medValue("Nitroglycerin", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 18)
+    evidence.define("antiplatlet2Med", medValue, "Antiplatelet2", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 7)
+    evidence.define("aspirinMed", medValue, "Aspirin", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 9)
+    evidence.define("heparinMed", medValue, "Heparin", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 15)
+    evidence.define("morphineMed", medValue, "Morphine", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 17)
+    evidence.define("nitroglycerinMed", medValue, "Nitroglycerin", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 18)
     #Labs
-    dvLookUpAllValuesSingleLine(dict(maindiscreteDic), dvTroponinT, 0, troponin, "Troponin T High Sensitivity: (DATE1 - DATE2) - ")
-    troponinTDV = dvValueMulti(dict(maindiscreteDic), dvTroponinT, "Troponin T High Sensitivity: [VALUE] (Result Date: [RESULTDATETIME])", calcTroponinT1, gt, 1, troponin, False, 10)
+    dvLookUpAllValuesSingleLine(maindiscreteDic, dvTroponinT, 0, troponin, "Troponin T High Sensitivity: (DATE1 - DATE2) - ")
+    troponinTDV = dvValueMulti(maindiscreteDic, dvTroponinT, "Troponin T High Sensitivity: [VALUE] (Result Date: [RESULTDATETIME])", calcTroponinT1, gt, 1, troponin, False, 10)
 
     #Starting Main Algorithm
-    if codeCount == 1 and i2489Code is None:
-        db.LogEvaluationScriptMessage("One specific code was on the chart, alert failed. " + str(account._id), scriptName, scriptInstance, "Debug")
+    if codeCount == 1 and evidence.i2489Code is None:
+        scriptLog.debug("One specific code was on the chart, alert failed. %s", account._id)
         if alertTriggered:
             if stemiCodesExist > 0:
                 for code in stemiCodeList:
@@ -503,20 +300,20 @@ if (
         result.Subtitle = "Acute MI Conflicting Dx"
         AlertPassed = True
         
-    elif triggerAlert and i21A1Code is not None and i2489Code is not None:
-        if i21A1Code is not None: documentedDx.Links.Add(i21A1Code)
-        if i2489Code is not None: documentedDx.Links.Add(i2489Code)
+    elif triggerAlert and evidence.i21A1Code is not None and evidence.i2489Code is not None:
+        if evidence.i21A1Code is not None: documentedDx.Links.Add(evidence.i21A1Code)
+        if evidence.i2489Code is not None: documentedDx.Links.Add(evidence.i2489Code)
         result.Subtitle = "Acute MI Type 2 and Demand Ischemia Documented Seek Clarification."
         AlertPassed = True
                 
-    elif triggerAlert and codeCount == 0 and (troponinTDV is not None or i219Code is not None) and i2489Code is not None :
-        if i2489Code is not None: abs.Links.Add(i2489Code)
-        if i219Code is not None: abs.Links.Add(i219Code)
+    elif triggerAlert and codeCount == 0 and (troponinTDV is not None or evidence.i219Code is not None) and evidence.i2489Code is not None :
+        if evidence.i2489Code is not None: abs.Links.Add(evidence.i2489Code)
+        if evidence.i219Code is not None: abs.Links.Add(evidence.i219Code)
         result.Subtitle = "Possible Acute MI Type 2"
         AlertPassed = True
             
-    elif triggerAlert and codeCount > 0 and i2489Code is not None:
-        if i2489Code is not None: documentedDx.Links.Add(i2489Code)
+    elif triggerAlert and codeCount > 0 and evidence.i2489Code is not None:
+        if evidence.i2489Code is not None: documentedDx.Links.Add(evidence.i2489Code)
         if stemiCodesExist > 0:
             for code in stemiCodeList:
                 desc = stemicodeDic[code]
@@ -535,23 +332,23 @@ if (
         result.Subtitle = "Acute MI Type Needs Claification"
         AlertPassed = True
     
-    elif triggerAlert and i219Code is not None:
-        documentedDx.Links.Add(i219Code)
+    elif triggerAlert and evidence.i219Code is not None:
+        documentedDx.Links.Add(evidence.i219Code)
         result.Subtitle = "Acute MI Unspecified Present Confirm if Further Specification of Type Needed"
         AlertPassed = True
     #5
-    elif triggerAlert and troponinTDV is not None and irregularEKGFindingsAbs is not None:
+    elif triggerAlert and troponinTDV is not None and evidence.irregularEKGFindingsAbs is not None:
         result.Subtitle = "Possible Acute MI"
         AlertPassed = True
     #6
     elif (
         triggerAlert and
-        (r07Codes is not None or troponinTDV is not None) and
-        heparinMed is not None and
-        (morphineMed is not None or nitroglycerinMed is not None) and
-        aspirinMed is not None and antiplatlet2Med is not None
+        (evidence.r07Codes is not None or troponinTDV is not None) and
+        evidence.heparinMed is not None and
+        (evidence.morphineMed is not None or evidence.nitroglycerinMed is not None) and
+        evidence.aspirinMed is not None and evidence.antiplatlet2Med is not None
     ):
-        if heparinMed is not None: meds.Links.Add(heparinMed)
+        if evidence.heparinMed is not None: meds.Links.Add(evidence.heparinMed)
         result.Subtitle = "Possible Acute MI"
         AlertPassed = True
     #7
@@ -560,11 +357,11 @@ if (
         AlertPassed = True
 
     else:
-        db.LogEvaluationScriptMessage("Not enough data to warrent alert, Alert Failed. " + str(account._id), scriptName, scriptInstance, "Debug")
+        scriptLog.debug("Not enough data to warrent alert, Alert Failed. %s", account._id)
         result.Passed = False
 
 else:
-    db.LogEvaluationScriptMessage("Alert Closed; Exiting script run. Outcome: " + str(outcome) + " " + str(account._id), scriptName, scriptInstance, "Debug")
+    scriptLog.debug("Alert Closed; Exiting script run. Outcome: %s %s", outcome, account._id)
 
 #If an alert triggered abstract the following
 if AlertPassed:
@@ -582,7 +379,7 @@ if AlertPassed:
     codeValue("I46.2", "Cardiac Arrest due to Underlying Cardiac Condition: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 11, abs, True)
     prefixCodeValue("^I42\.", "Cardiomyopathy Dx: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 12, abs, True)
     prefixCodeValue("^I43\.", "Cardiomyopathy Dx: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 13, abs, True)
-    if r07Codes is not None: abs.Links.Add(r07Codes) #14
+    if evidence.r07Codes is not None: abs.Links.Add(evidence.r07Codes) #14
     codeValue("I25.85", "Chronic Coronary Microvascular Dysfunction: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 15, abs, True)
     multiCodeValue(["N18.1", "N18.2", "N18.30", "N18.31", "N18.32", "N18.4", "N18.5"], "Chronic Kidney Failure: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 16, abs, True)
     codeValue("I44.2", "Complete Heart Block: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 17, abs, True)
@@ -618,7 +415,7 @@ if AlertPassed:
     codeValue("I47.11", "Inappropriate Sinus Tachycardia, So Stated: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 40, abs, True)
     abstractValue("IRREGULAR_ECHO_FINDING", "Irregular Echo Finding '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 41, abs, True)
     codeValue("R94.31", "Irregular Echo Finding: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 42, abs, True)
-    if irregularEKGFindingsAbs is not None: abs.Links.Add(irregularEKGFindingsAbs) #43
+    if evidence.irregularEKGFindingsAbs is not None: abs.Links.Add(evidence.irregularEKGFindingsAbs) #43
     multiCodeValue(["4A023N7", "4A023N8"], "Left Heart Cath: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 44)
     prefixCodeValue("^I40\.", "Myocarditis Dx: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 45, abs, True)
     codeValue("I35.0", "Non-Rheumatic Aortic Valve Stenosis: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 46, abs, True)
@@ -700,21 +497,21 @@ if AlertPassed:
     medValue("Anticoagulant", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 4, meds, True)
     abstractValue("ANTICOAGULANT", "Anticoagulant '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 5, meds, True)
     medValue("Antiplatelet", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 6, meds, True)
-    if antiplatlet2Med is not None: meds.Links.Add(antiplatlet2Med) #7
+    if evidence.antiplatlet2Med is not None: meds.Links.Add(evidence.antiplatlet2Med) #7
     abstractValue("ANTIPLATELET", "Antiplatelet '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 8, meds, True)
-    if aspirinMed is not None: meds.Links.Add(aspirinMed) #9
+    if evidence.aspirinMed is not None: meds.Links.Add(evidence.aspirinMed) #9
     medValue("Beta Blocker", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 10, meds, True)
     abstractValue("BETA_BLOCKER", "Beta Blocker '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 11, meds, True)
     medValue("Calcium Channel Blockers", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 12, meds, True)
     abstractValue("CALCIUM_CHANNEL_BLOCKER", "Calcium Channel Blocker '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 13, meds, True)
     #15
-    if morphineMed is not None: meds.Links.Add(morphineMed) #17
-    if nitroglycerinMed is not None: meds.Links.Add(nitroglycerinMed) #18
+    if evidence.morphineMed is not None: meds.Links.Add(evidence.morphineMed) #17
+    if evidence.nitroglycerinMed is not None: meds.Links.Add(evidence.nitroglycerinMed) #18
     abstractValue("NITROGLYCERIN", "Nitroglycerin '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 19, meds, True)
     medValue("Statin", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 20, meds, True)
     abstractValue("STATIN", "Statin '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 21, meds, True)
     #Oxygen
-    dvOxygenCheck(dict(maindiscreteDic), dvOxygenTherapy, "Oxygen Therapy '[VALUE]' (Result Date: [RESULTDATETIME])", 1, oxygen, True)
+    dvOxygenCheck(maindiscreteDic, dvOxygenTherapy, "Oxygen Therapy '[VALUE]' (Result Date: [RESULTDATETIME])", 1, oxygen, True)
     abstractValue("OXYGEN_THERAPY", "Oxygen Therapy '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 2, oxygen, True)
     #Vitals
     dvValue(dvPaO2, "Arterial P02: [VALUE] (Result Date: [RESULTDATETIME])", calcPAO21, 1, labs, True)
@@ -740,7 +537,10 @@ if AlertPassed or AlertConditions:
     if ctLinks.Links: result.Links.Add(ctLinks); docLinksLinks = True
     if heartCathLinks.Links: result.Links.Add(heartCathLinks); docLinksLinks = True
     result.Links.Add(other)
-    db.LogEvaluationScriptMessage("Alert Passed Adding Links. Alert Triggered: " + str(result.Subtitle) + " Autoresolved: " + str(result.Outcome) + "; " +
-        str(result.Validated) + "; Links: AlertTrigger- " + str(documentedDxTriggerLinks) + ", Abs- " + str(absLinks) + ", labs- " + str(labsLinks) + ", vitals- " + str(vitalsLinks) + ", meds- " + str(medsLinks) + ", oxygen- " + str(oxygenLinks) +
-        ", docs- " + str(docLinksLinks) + "; Acct: " + str(account._id), scriptName, scriptInstance, "Debug")
+    scriptLog.debug("Alert Passed Adding Links. Alert Triggered: %s Autoresolved: %s; %s; Links: AlertTrigger- %s, Abs- %s, labs- %s, vitals- %s, meds- %s, oxygen- %s, docs- %s; Acct: %s",
+        result.Subtitle, result.Outcome, result.Validated, documentedDxTriggerLinks, absLinks, labsLinks, vitalsLinks, medsLinks, oxygenLinks,
+        docLinksLinks, account._id)
     result.Passed = True
+
+#Write out this run's script messages
+scriptLog.flush()
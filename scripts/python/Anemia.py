@@ -28,6 +28,7 @@ from System.Data import *
 from System.Configuration import *
 from System.Collections.Generic import *
 clr.ImportExtensions(System.Linq)
+from cdi import DiscreteValueIndex, Evidence, ResultDateJoin, evaluation_context
 from operator import le, ge, gt, lt
 from datetime import datetime
 
@@ -122,14 +123,20 @@ autoEvidenceText = "Autoresolved Evidence - "
 #  Globals
 #========================================
 db = CACDataRepository()
+#Account data is loaded once and shared by every script run for the account,
+#fetching only the discrete values of the last 7 days
+context = evaluation_context(account, db, System.DateTime.Now.AddDays(-7))
+#Script messages are only formatted when their level is enabled, and are written
+#together at the end of the run
+scriptLog = context.log(db, scriptName, scriptInstance)
 admitDate = account.AdmitDateTime.Date
 birthDate = account.Patient.BirthDate.Date
 gender = account.Patient.Gender
 #Update true = External DV collection False = On Acct Record
-accountContainer = AccountWorkflowContainer(account, True, "Category", 7)
+accountContainer = context.container(AccountWorkflowContainer, True, "Category", 7)
 useSeperateDiscreteCollection = True
 if useSeperateDiscreteCollection == True:
-    discreteValues = db.GetDiscreteValues(account._id)
+    discreteValues = context.discrete_values
 else:
     discreteValues = db.GetAccountField(account._id, "DiscreteValues")
 
@@ -184,193 +191,9 @@ calcAny1 = lambda x: x > 0
 #========================================
 #  Functions
 #========================================
-def datetimeFromUtcToLocal(utc_datetime):
-    if utc_datetime:
-        convertedDate = DateTime.SpecifyKind(utc_datetime, DateTimeKind.Utc)
-        return  convertedDate.ToLocalTime()
-    else:
-        return None
-
-def cleanNumbers(result):
-    result1 = re.sub("[\\<\\>]", "", str(result))
-    if result1.count('.') <= 1 and result1.replace(".", "").isnumeric():
-        return result1
-    else:
-        return None
-
-def dataConversion(datetime, linkText, Result, id, category, sequence, abstract=True, gender=None):
-    if datetime is not None:
-        date_time = datetimeFromUtcToLocal(datetime)
-        date_time = date_time.ToString("MM/dd/yyyy, HH:mm")
-        linkText = linkText.replace("[RESULTDATETIME]", date_time)
-    else: 
-        linkText = linkText.replace("(Result Date: [RESULTDATETIME])", "")
-    if Result is not None:
-        linkText = linkText.replace("[VALUE]", Result)
-    else: linkText = linkText.replace("[VALUE]", "")
-    if gender: linkText = linkText.replace("[GENDER]", gender)
-    else: linkText = linkText.replace("[GENDER]", "")
-    if abstract == True:
-        category.Links.Add(MatchedCriteriaLink(linkText, None, None, id, True, None, None, sequence))
-    elif abstract == False:
-        abstraction = MatchedCriteriaLink(linkText, None, None, id, True, None, None, sequence)
-        return abstraction
-    return
-
-def CodeCount(codes):
-    # Get list of codes on the acct based on CodeDic
-    result = set()
-    for document in account.Documents or []:
-        for codeReference in document.CodeReferences or []:
-            if codeReference.Code in codes:
-                matching_code = codeReference.Code
-                result.add(matching_code)
-    return list(result)
-
-def abstractValue(abstraction_name, link_text, calculation, sequence=0, category=None, abstract=False):
-    # Find abstraction and if abstract is true abstract it to the provided category
-    abstraction = accountContainer.GetFirstLinkMatchingAbstractionValue(abstraction_name, link_text, lambda x: calculation)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def dvValue(dv_name, link_text, calculation, sequence=0, category=None, abstract=False):
-    # Find Discrete Value and if abstract is true abstract it to the provided category
-    for dv in dv_name:
-        abstraction = accountContainer.GetFirstLinkMatchingDiscreteValue(dv, link_text, calculation)
-        if abstraction is not None:
-            break
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def dvValueMulti(dvDic, DV1, linkText, value, sign, sequence=0, category=None, abstract=False, needed=2):
-    # Find Discrete Value and if abstract is true abstract it to the provided category
-    matchedList = []
-    x = 0
-    for dv in dvDic or []:
-        dvr = cleanNumbers(dvDic[dv]['Result'])
-        if dvDic[dv]['Name'] in DV1 and dvr is not None and sign(float(dvr), float(value)):
-            matchedList.append(dataConversion(dvDic[dv]['ResultDate'], linkText, dvDic[dv]['Result'], dvDic[dv]['UniqueId'] or dvDic[dv]['_id'], category, sequence, abstract))
-            x += 1
-            if needed <= x:
-                break
-    if abstract and x > 0:
-        return True
-    elif abstract is False and len(matchedList) > 0 and needed > 0:
-        return matchedList
-    else:
-        return None
-
-def compareValuesMulti(dvDic, DV1, value, value1, linkText, sign, sign1, sequence=0, category=None, abstract=False, needed=2):
-    matchedList = []
-    x = 0
-    for dv in dvDic or []:
-        dvr = cleanNumbers(dvDic[dv]['Result'])
-        if dvDic[dv]['Name'] in DV1 and dvr is not None and sign(float(value), float(dvr)) and sign1(float(dvr), float(value1)):
-            matchedList.append(dataConversion(dvDic[dv]['ResultDate'], linkText, dvDic[dv]['Result'], dvDic[dv]['UniqueId'] or dvDic[dv]['_id'], category, sequence, abstract))
-            x += 1
-            if needed <= x:
-                break
-    if abstract and x > 0:
-        return True
-    elif abstract is False and len(matchedList) > 0 and needed > 0:
-        return matchedList
-    else:
-        return None
-
-def codeValue(code_name, link_text, sequence=0, category=None, abstract=False):
-    # Find code and if abstract is true abstract it to the provided category
-    abstraction = accountContainer.GetFirstCodeLink(code_name, link_text)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def multiCodeValue(code_list, link_text, sequence=0, category=None, abstract=False):
-    # Go through Code List and find first code and if abstract is true abstract it to the provided category
-    abstraction = None
-    for code in code_list:
-        abstraction = accountContainer.GetFirstCodeLink(code, link_text)
-        if abstraction is not None:
-            abstraction.Sequence = sequence
-            if abstract:
-                category.Links.Add(abstraction)
-                return True
-            else:
-                return abstraction
-    if abstract and abstraction is None:
-        return False
-    return abstraction
-
-def prefixCodeValue(prefix, link_text, sequence=0, category=None, abstract=False):
-    # Use prefix to find first code match based on regex search and if abstract is true abstract it to the provided category
-    abstraction = None
-    validCodes = [codes for codes in accountContainer.CodeKeys if re.match(prefix, codes) is not None]
-    for code in validCodes:
-        abstraction = accountContainer.GetFirstCodeLink(code, link_text)
-        if abstraction is not None:
-            abstraction.Sequence = sequence
-            if abstract:
-                category.Links.Add(abstraction)
-                return True
-            else:
-                return abstraction
-    if abstract and abstraction is None:
-        return False
-    return abstraction
-
-def medValue(med_name, link_text, sequence=0, category=None, abstract=False):
-    # Find Medication Value and if abstract is true abstract it to the provided category
-    abstraction = accountContainer.GetFirstMedicationLink(med_name, link_text)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def updateLinkText(value, replacement_text):
-    # Update the link text with the provided text
-    value.LinkText = replacement_text + value.LinkText
-    return value
-
-def documentLink(DocumentType, LinkText, sequence, category, abstract):
-    # Finds a document link and adds it as link so that its a quick reference for the cdi user.
-    abstraction = None
-    abstraction = accountContainer.GetFirstDocumentLink(DocumentType, LinkText)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    return None
+#The helpers every script shares are compiled once per process and bound to this
+#script's globals, see cdi.helpers; a helper defined below replaces the shared one
+context.bind_helpers(globals(), 1)
 
 #========================================
 #  Script Specific Functions
@@ -385,14 +208,16 @@ def HemoglobinHematocritValues(dvDic, gender, value, value1, Needed):
     z = 0
     hemoglobinList = []
     hematocritList = []
-    for dv in dvDic or []:
-        dvr = cleanNumbers(dvDic[dv]['Result'])
-        if dvDic[dv]['Name'] in dvHemoglobin and dvr is not None:
+    for dv in dvDic.lookup(dvHemoglobin + dvHematocrit):
+        dvr = cleanNumbers(dv['Result'])
+        if dv['Name'] in dvHemoglobin and dvr is not None:
             x += 1
-            discreteDic[x] = dvDic[dv]
-        elif dvDic[dv]['Name'] in dvHematocrit and dvr is not None:
+            discreteDic[x] = dv
+        elif dv['Name'] in dvHematocrit and dvr is not None:
             a += 1
-            discreteDic1[a] = dvDic[dv]
+            discreteDic1[a] = dv
+    #Hemoglobin and hematocrit values taken at the same time, for when the two lists are out of step
+    labRows = ResultDateJoin(dvDic, {'hgb': dvHemoglobin, 'hct': dvHematocrit}, lambda dv: cleanNumbers(dv['Result']) is not None)
 
     if x > 0:
         for item in discreteDic:
@@ -403,20 +228,18 @@ def HemoglobinHematocritValues(dvDic, gender, value, value1, Needed):
                 if a > 0 and discreteDic[x].ResultDate == discreteDic1[a].ResultDate:
                     hematocritList.append(dataConversion(discreteDic1[a].ResultDate, linkText2, discreteDic1[a].Result, discreteDic1[a].UniqueId or discreteDic1[a]._id, hematocrit, 0, False, gender))
                 else:
-                    for item in discreteDic1:
-                        if discreteDic[x].ResultDate == discreteDic1[item].ResultDate:
-                            hematocritList.append(dataConversion(discreteDic1[item].ResultDate, linkText2, discreteDic1[item].Result, discreteDic1[item].UniqueId or discreteDic1[item]._id, hematocrit, 0, False, gender))
-                            break
+                    sameTime = labRows.get(discreteDic[x].ResultDate).first('hct')
+                    if sameTime is not None:
+                        hematocritList.append(dataConversion(sameTime.ResultDate, linkText2, sameTime.Result, sameTime.UniqueId or sameTime._id, hematocrit, 0, False, gender))
                 z += 1; a = a - 1; x = x - 1
             elif a > 0 and float(cleanNumbers(discreteDic1[a].Result)) < float(value1):
                 hematocritList.append(dataConversion(discreteDic1[a].ResultDate, linkText2, discreteDic1[a].Result, discreteDic1[a].UniqueId or discreteDic1[a]._id, hematocrit, 0, False, gender))
                 if x > 0 and discreteDic[x].ResultDate == discreteDic1[a].ResultDate:
                     hemoglobinList.append(dataConversion(discreteDic[x].ResultDate, linkText1, discreteDic[x].Result, discreteDic[x].UniqueId or discreteDic[x]._id, hemoglobin, 0, False, gender))
                 else:
-                    for item in discreteDic:
-                        if discreteDic1[a].ResultDate == discreteDic[item].ResultDate:
-                            hemoglobinList.append(dataConversion(discreteDic[item].ResultDate, linkText1, discreteDic[item].Result, discreteDic[item].UniqueId or discreteDic[item]._id, hematocrit, 0, False, gender))
-                            break
+                    sameTime = labRows.get(discreteDic1[a].ResultDate).first('hgb')
+                    if sameTime is not None:
+                        hemoglobinList.append(dataConversion(sameTime.ResultDate, linkText1, sameTime.Result, sameTime.UniqueId or sameTime._id, hematocrit, 0, False, gender))
                 z += 1; a = a - 1; x = x - 1
             else:
                 a = a - 1
@@ -570,7 +393,7 @@ def dvLookUpAllLinkedValuesSingleLine(dvDic, DV1, DV2, sequence, category, linkT
 #========================================
 #  Algorithm
 #========================================
-db.LogEvaluationScriptMessage("Script starting " + str(account._id), scriptName, scriptInstance, "Debug")
+scriptLog.debug("Script starting %s", account._id)
 #Determine if if and how many fully spec codes are on the acct
 codes = []
 codes = codeDic.keys()
@@ -644,178 +467,170 @@ for alert in account.MatchedCriteriaGroups or []:
 #Check if alert was autoresolved or completed.
 if validated is False:
     #Find all discrete values for custom lookups within the last X days
-    maindiscreteDic = {}
-    unsortedDicsreteDic = {}
-    dvCount = 0
     #Combine all items into one list to search against
     discreteSearchList = [i for j in [dvHemoglobin, dvHematocrit, dvBloodLoss] for i in j]
     #Set datelimit for how far back to 
     dvDateLimit = System.DateTime.Now.AddDays(-7)
-    #Loop through all dvs finding any that match in the combined list adding to a dictionary the matches
-    for dv in discreteValues or []:
-        if dv.ResultDate >= dvDateLimit:
-            if any(item == dv.Name for item in discreteSearchList):
-                dvCount += 1
-                unsortedDicsreteDic[dvCount] = dv
-    #Sort List by latest
-    maindiscreteDic = sorted(unsortedDicsreteDic.items(), key=lambda x: x[1]['ResultDate'], reverse=True)
+    #Index all dvs that match in the combined list by name, sorted by latest
+    maindiscreteDic = DiscreteValueIndex(discreteValues, discreteSearchList, dvDateLimit)
                            
     #Documented Dx
-    d649Code = codeValue("D64.9", "Unspecified Anemia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 0)
-    d500Code = codeValue("D50.0", "Iron deficiency anemia secondary to blood loss (chronic): [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 0)
-    d62Code = codeValue("D62", "Acute Posthemorrhagic Anemia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 0)
-    bloodLossDV = dvValueMulti(dict(maindiscreteDic), dvBloodLoss, "Blood Loss: [VALUE] (Result Date: [RESULTDATETIME])", calcBloodLoss1, gt, 0, bloodLoss, False, 10)
+    evidence = Evidence()
+    evidence.define("d649Code", codeValue, "D64.9", "Unspecified Anemia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 0)
+    evidence.define("d500Code", codeValue, "D50.0", "Iron deficiency anemia secondary to blood loss (chronic): [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 0)
+    evidence.define("d62Code", codeValue, "D62", "Acute Posthemorrhagic Anemia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 0)
+    bloodLossDV = dvValueMulti(maindiscreteDic, dvBloodLoss, "Blood Loss: [VALUE] (Result Date: [RESULTDATETIME])", calcBloodLoss1, gt, 0, bloodLoss, False, 10)
     #Signs of Bleeding
-    i975Codes = multiCodeValue(["I97.51", "I97.52"], "Accidental Puncture/Laceration of Circulatory System Organ During Procedure: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 1)
-    k917Codes = multiCodeValue(["K91.71", "K91.72"], "Accidental Puncture/Laceration of Digestive System Organ During Procedure: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 2)
-    j957Codes = multiCodeValue(["J95.71", "J95.72"], "Accidental Puncture/Laceration of Respiratory System Organ During Procedure: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 3)
-    k260Code = codeValue("K26.0", "Acute Duodenal Ulcer with Hemorrhage: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 4)
-    k262Code = codeValue("K26.2", "Acute Duodenal Ulcer with Hemorrhage and Perforation: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 5)
-    k250Code = codeValue("K25.0", "Acute Gastric Ulcer with Hemorrhage: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 6)
-    k252Code = codeValue("K25.2", "Acute Gastric Ulcer with Hemorrhage and Perforation: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 7)
-    k270Code = codeValue("K27.0", "Acute Peptic Ulcer with Hemorrhage: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 8)
-    k272Code = codeValue("K27.2", "Acute Peptic Ulcer with Hemorrhage and Perforation: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 9)
-    bleedingAbs = abstractValue("BLEEDING", "Bleeding '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 10)
-    r319Code = codeValue("R31.9", "Bloody Urine: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 11)
-    k264Code = codeValue("K26.4", "Chronic Duodenal Ulcer with Hemorrhage: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 12)
-    k266Code = codeValue("K26.6", "Chronic Duodenal Ulcer with Hemorrhage and Perforation: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 13)
-    k254Code = codeValue("K25.4", "Chronic Gastric Ulcer with Hemorrhage: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 14)
-    k256Code = codeValue("K25.6", "Chronic Gastric Ulcer with Hemorrhage and Perforation: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 15)
-    k276Code = codeValue("K27.6", "Chronic Peptic Ulcer with Hemorrhage and Perforation: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 16)
-    n99510Code = codeValue("N99.510", "Cystostomy Hemorrhage: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 17)
-    r040Code = codeValue("R04.0", "Epistaxis: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 18)
-    i8501Code = codeValue("I85.01", "Esophageal Varices with Bleeding: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 19)
-    eblAbs = abstractValue("ESTIMATED_BLOOD_LOSS", "Estimated Blood Loss '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 20)
-    k922Code = codeValue("K92.2", "GI Hemorrhage: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 21)
-    hematomaAbs = abstractValue("HEMATOMA", "Hematoma '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 22)
-    k920Code = codeValue("K92.0", "Hematemesis: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 23)
-    r310Code = prefixCodeValue("^R31\.", "Hematuria: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 24)
-    r195Code = codeValue("R19.5", "Heme-Positive Stool: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 25)
-    k661Code = codeValue("K66.1", "Hemoperitoneum: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 26)
-    hemorrhageAbs = abstractValue("HEMORRHAGE", "Hemorrhage '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 27)
-    n3091Code = codeValue("N30.91", "Hemorrhagic Cystitis: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 28)
-    j9501Code = codeValue("J95.01", "Hemorrhage from Tracheostomy Stoma: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 29)
-    r042Code = codeValue("R04.2", "Hemoptysis: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 30)
-    i974Codes = multiCodeValue(["I97.410", "I97.411", "I97.418", "I97.42"], "Intraoperative Hemorrhage/Hematoma of Circulatory System Organ: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 31)
-    k916Codes = multiCodeValue(["K91.61", "K91.62"], "Intraoperative Hemorrhage/Hematoma of Digestive System Organ: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 32)
-    n99Codes = multiCodeValue(["N99.61", "N99.62"], "Intraoperative Hemorrhage/Hematoma of Genitourinary System: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 33)
-    g9732Code = codeValue("G97.32", "Intraoperative Hemorrhage/Hematoma of Nervous System Organ: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 34)
-    g9731Code = codeValue("G97.31", "Intraoperative Hemorrhage/Hematoma of Nervous System Procedure: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 35)
-    j956Codes = multiCodeValue(["J95.61", "J95.62"], "Intraoperative Hemorrhage/Hematoma of Respiratory System: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 36)
-    k921Code = codeValue("K92.1", "Melena: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 37)
-    i61Codes = prefixCodeValue("^I61\.", "Nontraumatic Intracerebral Hemorrhage: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 38)
-    i62Codes = prefixCodeValue("^I62\.", "Nontraumatic Intracerebral Hemorrhage: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 39)
-    i60Codes = prefixCodeValue("^I60\.", "Nontraumatic Subarachnoid Hemorrhage: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 40)
-    l7632Code = codeValue("L76.32", "Postoperative Hematoma: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 41)
-    k918Codes = multiCodeValue(["K91.840", "K91.841", "K91.870", "K91.871"], "Postoperative Hemorrhage/Hematoma of Digestive System Organ: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 42)
-    i976Codes = multiCodeValue(["I97.610", "I97.611", "I97.618", "I97.620"], "Postoperative Hemorrhage/Hematoma of Circulatory System Organ: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 43)
-    n991Codes = multiCodeValue(["N99.820", "N99.821", "N99.840", "N99.841"], "Postoperative Hemorrhage/Hematoma of Genitourinary System: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 44)
-    g9752Code = codeValue("G97.52", "Postoperative Hemorrhage/Hematoma of Nervous System Organ: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 45)
-    g9751Code = codeValue("G97.51", "Postoperative Hemorrhage/Hematoma of Nervous System Procedure: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 46)
-    j958Codes = multiCodeValue(["J95.830", "J95.831", "J95.860", "J95.861"], "Postoperative Hemorrhage/Hematoma of Respiratory System: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 47)
-    k625Code = codeValue("K62.5", "Rectal Bleeding: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 48)
+    evidence.define("i975Codes", multiCodeValue, ["I97.51", "I97.52"], "Accidental Puncture/Laceration of Circulatory System Organ During Procedure: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 1)
+    evidence.define("k917Codes", multiCodeValue, ["K91.71", "K91.72"], "Accidental Puncture/Laceration of Digestive System Organ During Procedure: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 2)
+    evidence.define("j957Codes", multiCodeValue, ["J95.71", "J95.72"], "Accidental Puncture/Laceration of Respiratory System Organ During Procedure: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 3)
+    evidence.define("k260Code", codeValue, "K26.0", "Acute Duodenal Ulcer with Hemorrhage: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 4)
+    evidence.define("k262Code", codeValue, "K26.2", "Acute Duodenal Ulcer with Hemorrhage and Perforation: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 5)
+    evidence.define("k250Code", codeValue, "K25.0", "Acute Gastric Ulcer with Hemorrhage: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 6)
+    evidence.define("k252Code", codeValue, "K25.2", "Acute Gastric Ulcer with Hemorrhage and Perforation: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 7)
+    evidence.define("k270Code", codeValue, "K27.0", "Acute Peptic Ulcer with Hemorrhage: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 8)
+    evidence.define("k272Code", codeValue, "K27.2", "Acute Peptic Ulcer with Hemorrhage and Perforation: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 9)
+    evidence.define("bleedingAbs", abstractValue, "BLEEDING", "Bleeding '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 10)
+    evidence.define("r319Code", codeValue, "R31.9", "Bloody Urine: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 11)
+    evidence.define("k264Code", codeValue, "K26.4", "Chronic Duodenal Ulcer with Hemorrhage: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 12)
+    evidence.define("k266Code", codeValue, "K26.6", "Chronic Duodenal Ulcer with Hemorrhage and Perforation: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 13)
+    evidence.define("k254Code", codeValue, "K25.4", "Chronic Gastric Ulcer with Hemorrhage: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 14)
+    evidence.define("k256Code", codeValue, "K25.6", "Chronic Gastric Ulcer with Hemorrhage and Perforation: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 15)
+    evidence.define("k276Code", codeValue, "K27.6", "Chronic Peptic Ulcer with Hemorrhage and Perforation: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 16)
+    evidence.define("n99510Code", codeValue, "N99.510", "Cystostomy Hemorrhage: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 17)
+    evidence.define("r040Code", codeValue, "R04.0", "Epistaxis: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 18)
+    evidence.define("i8501Code", codeValue, "I85.01", "Esophageal Varices with Bleeding: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 19)
+    evidence.define("eblAbs", abstractValue, "ESTIMATED_BLOOD_LOSS", "Estimated Blood Loss '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 20)
+    evidence.define("k922Code", codeValue, "K92.2", "GI Hemorrhage: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 21)
+    evidence.define("hematomaAbs", abstractValue, "HEMATOMA", "Hematoma '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 22)
+    evidence.define("k920Code", codeValue, "K92.0", "Hematemesis: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 23)
+    evidence.define("r310Code", prefixCodeValue, "^R31\.", "Hematuria: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 24)
+    evidence.define("r195Code", codeValue, "R19.5", "Heme-Positive Stool: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 25)
+    evidence.define("k661Code", codeValue, "K66.1", "Hemoperitoneum: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 26)
+    evidence.define("hemorrhageAbs", abstractValue, "HEMORRHAGE", "Hemorrhage '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 27)
+    evidence.define("n3091Code", codeValue, "N30.91", "Hemorrhagic Cystitis: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 28)
+    evidence.define("j9501Code", codeValue, "J95.01", "Hemorrhage from Tracheostomy Stoma: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 29)
+    evidence.define("r042Code", codeValue, "R04.2", "Hemoptysis: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 30)
+    evidence.define("i974Codes", multiCodeValue, ["I97.410", "I97.411", "I97.418", "I97.42"], "Intraoperative Hemorrhage/Hematoma of Circulatory System Organ: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 31)
+    evidence.define("k916Codes", multiCodeValue, ["K91.61", "K91.62"], "Intraoperative Hemorrhage/Hematoma of Digestive System Organ: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 32)
+    evidence.define("n99Codes", multiCodeValue, ["N99.61", "N99.62"], "Intraoperative Hemorrhage/Hematoma of Genitourinary System: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 33)
+    evidence.define("g9732Code", codeValue, "G97.32", "Intraoperative Hemorrhage/Hematoma of Nervous System Organ: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 34)
+    evidence.define("g9731Code", codeValue, "G97.31", "Intraoperative Hemorrhage/Hematoma of Nervous System Procedure: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 35)
+    evidence.define("j956Codes", multiCodeValue, ["J95.61", "J95.62"], "Intraoperative Hemorrhage/Hematoma of Respiratory System: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 36)
+    evidence.define("k921Code", codeValue, "K92.1", "Melena: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 37)
+    evidence.define("i61Codes", prefixCodeValue, "^I61\.", "Nontraumatic Intracerebral Hemorrhage: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 38)
+    evidence.define("i62Codes", prefixCodeValue, "^I62\.", "Nontraumatic Intracerebral Hemorrhage: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 39)
+    evidence.define("i60Codes", prefixCodeValue, "^I60\.", "Nontraumatic Subarachnoid Hemorrhage: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 40)
+    evidence.define("l7632Code", codeValue, "L76.32", "Postoperative Hematoma: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 41)
+    evidence.define("k918Codes", multiCodeValue, ["K91.840", "K91.841", "K91.870", "K91.871"], "Postoperative Hemorrhage/Hematoma of Digestive System Organ: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 42)
+    evidence.define("i976Codes", multiCodeValue, ["I97.610", "I97.611", "I97.618", "I97.620"], "Postoperative Hemorrhage/Hematoma of Circulatory System Organ: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 43)
+    evidence.define("n991Codes", multiCodeValue, ["N99.820", "N99.821", "N99.840", "N99.841"], "Postoperative Hemorrhage/Hematoma of Genitourinary System: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 44)
+    evidence.define("g9752Code", codeValue, "G97.52", "Postoperative Hemorrhage/Hematoma of Nervous System Organ: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 45)
+    evidence.define("g9751Code", codeValue, "G97.51", "Postoperative Hemorrhage/Hematoma of Nervous System Procedure: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 46)
+    evidence.define("j958Codes", multiCodeValue, ["J95.830", "J95.831", "J95.860", "J95.861"], "Postoperative Hemorrhage/Hematoma of Respiratory System: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 47)
+    evidence.define("k625Code", codeValue, "K62.5", "Rectal Bleeding: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 48)
     #Labs
     hemoHemaConsecutDropDV = [[False], [False]]
     lowHemoglobinMultiDV = [[False], [False]]
-    dvLookUpAllLinkedValuesSingleLine(dict(maindiscreteDic), dvHemoglobin, dvHematocrit, 0, labs, "Hemoglobin/Hematocrit: (DATE1 - DATE2) - ")
+    dvLookUpAllLinkedValuesSingleLine(maindiscreteDic, dvHemoglobin, dvHematocrit, 0, labs, "Hemoglobin/Hematocrit: (DATE1 - DATE2) - ")
     if gender == 'F':
         lowHemoglobinDV = dvValue(dvHemoglobin, "Hemoglobin: [VALUE] (Result Date: [RESULTDATETIME])", calcHemoglobin2, 0)
-        lowHemoglobinMultiDV = HemoglobinHematocritValues(dict(maindiscreteDic), "Female", 12.5, 34, 10)
-        hemoHemaConsecutDropDV = percentageDropDVValues(dict(maindiscreteDic), dvHemoglobin, dvHematocrit, 11, 34,
+        lowHemoglobinMultiDV = HemoglobinHematocritValues(maindiscreteDic, "Female", 12.5, 34, 10)
+        hemoHemaConsecutDropDV = percentageDropDVValues(maindiscreteDic, dvHemoglobin, dvHematocrit, 11, 34,
             "Hemoglobin: [VALUE] (Result Date: [RESULTDATETIME])", "Hematocrit: [VALUE] (Result Date: [RESULTDATETIME])",
             hemoglobin, hematocrit)
     if gender == 'M':
         lowHemoglobinDV = dvValue(dvHemoglobin, "Hemoglobin: [VALUE] (Result Date: [RESULTDATETIME])", calcHemoglobin1, 0)
-        lowHemoglobinMultiDV = HemoglobinHematocritValues(dict(maindiscreteDic), "Male", 13.5, 40, 10)
-        hemoHemaConsecutDropDV = percentageDropDVValues(dict(maindiscreteDic), dvHemoglobin, dvHematocrit, 12, 38,
+        lowHemoglobinMultiDV = HemoglobinHematocritValues(maindiscreteDic, "Male", 13.5, 40, 10)
+        hemoHemaConsecutDropDV = percentageDropDVValues(maindiscreteDic, dvHemoglobin, dvHematocrit, 12, 38,
             "Hemoglobin: [VALUE] (Result Date: [RESULTDATETIME])", "Hematocrit: [VALUE] (Result Date: [RESULTDATETIME])",
             hemoglobin, hematocrit)
-    lowHemoglobin10DV = dvValue(dvHemoglobin, "Hemoglobin: [VALUE] (Result Date: [RESULTDATETIME])", calcHemoglobin3, 0)
-    lowHematocrit30DV = dvValue(dvHematocrit, "Hematocrit: [VALUE] (Result Date: [RESULTDATETIME])", calcHematocrit3, 0)
+    evidence.define("lowHemoglobin10DV", dvValue, dvHemoglobin, "Hemoglobin: [VALUE] (Result Date: [RESULTDATETIME])", calcHemoglobin3, 0)
+    evidence.define("lowHematocrit30DV", dvValue, dvHematocrit, "Hematocrit: [VALUE] (Result Date: [RESULTDATETIME])", calcHematocrit3, 0)
     #Meds
-    anemiaMedsAbs = abstractValue("ANEMIA_MEDICATION", "Anemia Medication '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 1)
-    anemiaMeds = medValue("Anemia Supplement", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 2)
-    cellSaverAbs = abstractValue("CELL_SAVER", "Cell Saver '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 3)
-    hematopoeticMed = medValue("Hemopoietic Agent", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 4)
-    hemtopoeticAbs = abstractValue("HEMATOPOIETIC_AGENT", "Hematopoietic Agent '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 5)
-    rBloTransfusionCodes = multiCodeValue(["30233N1", "30243N1"], "Red Blood Cell Transfusion: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 6)
-    redBloodCellDV = dvValue(dvRedBloodCellTransfusion, "Red Blood Cell Transfusion: [VALUE] (Result Date: [RESULTDATETIME])", calcAny1, 7)
+    evidence.define("anemiaMedsAbs", abstractValue, "ANEMIA_MEDICATION", "Anemia Medication '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 1)
+    evidence.define("anemiaMeds", medValue, "Anemia Supplement", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 2)
+    evidence.define("cellSaverAbs", abstractValue, "CELL_SAVER", "Cell Saver '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 3)
+    evidence.define("hematopoeticMed", medValue, "Hemopoietic Agent", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 4)
+    evidence.define("hemtopoeticAbs", abstractValue, "HEMATOPOIETIC_AGENT", "Hematopoietic Agent '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 5)
+    evidence.define("rBloTransfusionCodes", multiCodeValue, ["30233N1", "30243N1"], "Red Blood Cell Transfusion: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 6)
+    evidence.define("redBloodCellDV", dvValue, dvRedBloodCellTransfusion, "Red Blood Cell Transfusion: [VALUE] (Result Date: [RESULTDATETIME])", calcAny1, 7)
     
     #Signs of Bleeding
     if (
-        i975Codes is not None or
-        k917Codes is not None or
-        j957Codes is not None or
-        k260Code is not None or
-        k262Code is not None or
-        k250Code is not None or
-        k252Code is not None or
-        k270Code is not None or
-        k272Code is not None or
-        k264Code is not None or
-        k266Code is not None or
-        k254Code is not None or
-        k256Code is not None or
-        k276Code is not None or
-        n99510Code is not None or
-        i8501Code is not None or
-        k922Code is not None or
-        hematomaAbs is not None or
-        k920Code is not None or
-        r310Code is not None or
-        k661Code is not None or
-        n3091Code is not None or
-        j9501Code is not None or
-        r042Code is not None or
-        i974Codes is not None or
-        k916Codes is not None or
-        n99Codes is not None or
-        g9732Code is not None or
-        g9731Code is not None or
-        j956Codes is not None or
-        k921Code is not None or
-        l7632Code is not None or
-        k918Codes is not None or
-        i976Codes is not None or
-        n991Codes is not None or
-        g9752Code is not None or
-        g9751Code is not None or
-        j958Codes is not None or
-        k625Code is not None or
-        r319Code is not None or
-        r040Code is not None or
-        r195Code is not None or
-        i61Codes is not None or
-        i62Codes is not None or
-        i60Codes is not None or 
+        evidence.i975Codes is not None or
+        evidence.k917Codes is not None or
+        evidence.j957Codes is not None or
+        evidence.k260Code is not None or
+        evidence.k262Code is not None or
+        evidence.k250Code is not None or
+        evidence.k252Code is not None or
+        evidence.k270Code is not None or
+        evidence.k272Code is not None or
+        evidence.k264Code is not None or
+        evidence.k266Code is not None or
+        evidence.k254Code is not None or
+        evidence.k256Code is not None or
+        evidence.k276Code is not None or
+        evidence.n99510Code is not None or
+        evidence.i8501Code is not None or
+        evidence.k922Code is not None or
+        evidence.hematomaAbs is not None or
+        evidence.k920Code is not None or
+        evidence.r310Code is not None or
+        evidence.k661Code is not None or
+        evidence.n3091Code is not None or
+        evidence.j9501Code is not None or
+        evidence.r042Code is not None or
+        evidence.i974Codes is not None or
+        evidence.k916Codes is not None or
+        evidence.n99Codes is not None or
+        evidence.g9732Code is not None or
+        evidence.g9731Code is not None or
+        evidence.j956Codes is not None or
+        evidence.k921Code is not None or
+        evidence.l7632Code is not None or
+        evidence.k918Codes is not None or
+        evidence.i976Codes is not None or
+        evidence.n991Codes is not None or
+        evidence.g9752Code is not None or
+        evidence.g9751Code is not None or
+        evidence.j958Codes is not None or
+        evidence.k625Code is not None or
+        evidence.r319Code is not None or
+        evidence.r040Code is not None or
+        evidence.r195Code is not None or
+        evidence.i61Codes is not None or
+        evidence.i62Codes is not None or
+        evidence.i60Codes is not None or 
         len(bloodLossDV or noLabs) > 0 or
-        eblAbs is not None or
-        bleedingAbs is not None or
-        hemorrhageAbs is not None
+        evidence.eblAbs is not None or
+        evidence.bleedingAbs is not None or
+        evidence.hemorrhageAbs is not None
     ):
         SOB = True
 
     #Anemia Treatment
     if (
-        anemiaMedsAbs is not None or
-        anemiaMeds is not None or
-        hematopoeticMed is not None or
-        hemtopoeticAbs is not None or
-        rBloTransfusionCodes is not None or
-        cellSaverAbs is not None
+        evidence.anemiaMedsAbs is not None or
+        evidence.anemiaMeds is not None or
+        evidence.hematopoeticMed is not None or
+        evidence.hemtopoeticAbs is not None or
+        evidence.rBloTransfusionCodes is not None or
+        evidence.cellSaverAbs is not None
     ):
         AT = True
         
     #Algorithm
     #1.1
-    if codesExist > 0 and (lowHemoglobinDV is not None or AT or lowHematocrit30DV is not None) and subtitle == "Anemia Dx Possibly Lacking Supporting Evidence":
+    if codesExist > 0 and (lowHemoglobinDV is not None or AT or evidence.lowHematocrit30DV is not None) and subtitle == "Anemia Dx Possibly Lacking Supporting Evidence":
         AlertConditions = True
         if message1: dc.Links.Add(MatchedCriteriaLink(LinkText1, None, None, None, False))
         result.Outcome = "AUTORESOLVED"
         result.Reason = "Autoresolved due to clinical evidence now existing on the Account"
         result.Validated = True
     #1
-    elif codesExist > 0 and lowHemoglobinDV is None and lowHematocrit30DV is None and AT is False:
+    elif codesExist > 0 and lowHemoglobinDV is None and evidence.lowHematocrit30DV is None and AT is False:
         if lowHemoglobinDV is None or AT is False: dc.Links.Add(MatchedCriteriaLink(LinkText1, None, None, None))
         for code in codeList:
             desc = codeDic[code]
@@ -825,7 +640,7 @@ if validated is False:
         AlertPassed = True
     #2.1    
     elif(
-        d62Code is not None and
+        evidence.d62Code is not None and
         ((message2 is False or (message2 is True and SOB)) and
         (message3 is False or (message3 is True and lowHemoglobinDV is not None)) and
         (message4 is False or (message4 is True and AT))) and
@@ -840,8 +655,8 @@ if validated is False:
         result.Validated = True
         AlertPassed = True
     #2
-    elif d62Code is not None and (SOB is False or lowHemoglobinDV is None or AT is False):
-        dc.Links.Add(d62Code)
+    elif evidence.d62Code is not None and (SOB is False or lowHemoglobinDV is None or AT is False):
+        dc.Links.Add(evidence.d62Code)
         if SOB is False: dc.Links.Add(MatchedCriteriaLink(LinkText2, None, None, None))
         elif SOB and message2: dc.Links.Add(MatchedCriteriaLink(LinkText2, None, None, None, False))
         if lowHemoglobinDV is None: dc.Links.Add(MatchedCriteriaLink(LinkText3, None, None, None))
@@ -851,14 +666,14 @@ if validated is False:
         result.Subtitle = "Acute Blood Loss Anemia Dx Possibly Lacking Clinical Evidence"
         AlertPassed = True
     #3.1/4.1/5.1/6.1
-    elif d62Code is not None and subtitle == "Possible Acute Blood Loss Anemia":
-        dc.Links.Add(d62Code)
+    elif evidence.d62Code is not None and subtitle == "Possible Acute Blood Loss Anemia":
+        dc.Links.Add(evidence.d62Code)
         result.Outcome = "AUTORESOLVED"
         result.Reason = "Autoresolved due to one Specified Code on the Account"
         result.Validated = True
         AlertConditions = True
     #3
-    elif d62Code is None and (hemoHemaConsecutDropDV[0][0] is not False or hemoHemaConsecutDropDV[1][0] is not False) and SOB:
+    elif evidence.d62Code is None and (hemoHemaConsecutDropDV[0][0] is not False or hemoHemaConsecutDropDV[1][0] is not False) and SOB:
         if hemoHemaConsecutDropDV[0][0] is not False:
             for entry in hemoHemaConsecutDropDV[0]:
                 hemoglobin.Links.Add(entry)
@@ -866,34 +681,34 @@ if validated is False:
             for entry in hemoHemaConsecutDropDV[1]:
                 hematocrit.Links.Add(entry)
         alertTrigger.Links.Add(MatchedCriteriaLink("Possible Hemoglobin levels decreased by 2 or more or possible Hematocrit levels decreased by 6 or more, along with a possible presence of Bleeding. Please review Clinical Evidence.", None, None, None, True))
-        db.LogEvaluationScriptMessage("Possible Acute Blood Loss Anemia Number 4 Triggered. " + str(account._id), scriptName, scriptInstance, "Debug")
+        scriptLog.debug("Possible Acute Blood Loss Anemia Number 4 Triggered. %s", account._id)
         result.Subtitle = "Possible Acute Blood Loss Anemia"
         AlertPassed = True
     #4
-    elif d62Code is None and lowHemoglobinDV is not None and SOB and AT:
+    elif evidence.d62Code is None and lowHemoglobinDV is not None and SOB and AT:
         if lowHemoglobinDV is not None: hemoglobin.Links.Add(lowHemoglobinDV)
         alertTrigger.Links.Add(MatchedCriteriaLink("Possible Low Hgb or Hct, possible sign of Bleeding and Anemia Treatment present.", None, None, None, True))
-        db.LogEvaluationScriptMessage("Possible Acute Blood Loss Anemia Number 2 Triggered. " + str(account._id), scriptName, scriptInstance, "Debug")
+        scriptLog.debug("Possible Acute Blood Loss Anemia Number 2 Triggered. %s", account._id)
         result.Subtitle = "Possible Acute Blood Loss Anemia"
         AlertPassed = True
     #5   
-    elif d62Code is None and (lowHemoglobin10DV is not None or lowHematocrit30DV is not None) and SOB:
-        if lowHemoglobin10DV is not None: hemoglobin.Links.Add(lowHemoglobin10DV)
-        if lowHematocrit30DV is not None: hematocrit.Links.Add(lowHematocrit30DV)
+    elif evidence.d62Code is None and (evidence.lowHemoglobin10DV is not None or evidence.lowHematocrit30DV is not None) and SOB:
+        if evidence.lowHemoglobin10DV is not None: hemoglobin.Links.Add(evidence.lowHemoglobin10DV)
+        if evidence.lowHematocrit30DV is not None: hematocrit.Links.Add(evidence.lowHematocrit30DV)
         alertTrigger.Links.Add(MatchedCriteriaLink("Possible Hgb <10 or Hct <30 and possible sign of Bleeding present.", None, None, None, True))
-        db.LogEvaluationScriptMessage("Possible Acute Blood Loss Anemia Number 3 Triggered. " + str(account._id), scriptName, scriptInstance, "Debug")
+        scriptLog.debug("Possible Acute Blood Loss Anemia Number 3 Triggered. %s", account._id)
         result.Subtitle = "Possible Acute Blood Loss Anemia"
         AlertPassed = True
     #6
     elif (
-        d62Code is None and 
-        (d649Code is not None or d500Code is not None) and
+        evidence.d62Code is None and 
+        (evidence.d649Code is not None or evidence.d500Code is not None) and
         SOB and AT
     ):
         alertTrigger.Links.Add(MatchedCriteriaLink("Anemia Dx documented, possible sign of bleeding and Anemia Treatment present.", None, None, None, True))
-        if d500Code is not None: dc.Links.Add(d500Code)
-        if d649Code is not None: dc.Links.Add(d649Code)
-        db.LogEvaluationScriptMessage("Possible Acute Blood Loss Anemia Number 1 Triggered. " + str(account._id), scriptName, scriptInstance, "Debug")
+        if evidence.d500Code is not None: dc.Links.Add(evidence.d500Code)
+        if evidence.d649Code is not None: dc.Links.Add(evidence.d649Code)
+        scriptLog.debug("Possible Acute Blood Loss Anemia Number 1 Triggered. %s", account._id)
         result.Subtitle = "Possible Acute Blood Loss Anemia"
         AlertPassed = True
     #7.1
@@ -911,7 +726,7 @@ if validated is False:
     #7
     elif (
         codesExist == 0 and
-        d649Code is None and 
+        evidence.d649Code is None and 
         (((lowHemoglobinMultiDV[0][0] is not False and len(lowHemoglobinMultiDV[0] or noLabs) > 1 ) or 
             (lowHemoglobinMultiDV[1][0] is not False and len(lowHemoglobinMultiDV[1] or noLabs) > 1 )) or
         (((lowHemoglobinMultiDV[0][0] is not False and len(lowHemoglobinMultiDV[0] or noLabs) == 1) or 
@@ -921,11 +736,11 @@ if validated is False:
         AlertPassed = True  
 
     else:
-        db.LogEvaluationScriptMessage("Not enough data to warrent alert, Alert Failed. " + str(account._id), scriptName, scriptInstance, "Debug")
+        scriptLog.debug("Not enough data to warrent alert, Alert Failed. %s", account._id)
         result.Passed = False
 
 else:
-    db.LogEvaluationScriptMessage("Alert Closed; Exiting script run. Outcome: " + str(outcome) + " " + str(account._id), scriptName, scriptInstance, "Debug")
+    scriptLog.debug("Alert Closed; Exiting script run. Outcome: %s %s", outcome, account._id)
 
 #Alert Passed Abstractions
 if AlertPassed:
@@ -990,62 +805,62 @@ if AlertPassed:
     dvValue(dvVitaminB12, "Vitamin B12: [VALUE] (Result Date: [RESULTDATETIME])", calcVitB121, 15, labs, True)
     dvValue(dvWBC, "WBC: [VALUE] (Result Date: [RESULTDATETIME])", calcWBC1, 16, labs, True)
     #Meds
-    if anemiaMedsAbs is not None: meds.Links.Add(anemiaMedsAbs) #1
-    if anemiaMeds is not None: meds.Links.Add(anemiaMeds) #2
-    if cellSaverAbs is not None: meds.Links.Add(cellSaverAbs) #3
-    if hematopoeticMed is not None: meds.Links.Add(hematopoeticMed) #4
-    if hemtopoeticAbs is not None: meds.Links.Add(hemtopoeticAbs) #5
-    if rBloTransfusionCodes is not None: meds.Links.Add(rBloTransfusionCodes) #6
-    if redBloodCellDV is not None: meds.Links.Add(redBloodCellDV) #7
+    if evidence.anemiaMedsAbs is not None: meds.Links.Add(evidence.anemiaMedsAbs) #1
+    if evidence.anemiaMeds is not None: meds.Links.Add(evidence.anemiaMeds) #2
+    if evidence.cellSaverAbs is not None: meds.Links.Add(evidence.cellSaverAbs) #3
+    if evidence.hematopoeticMed is not None: meds.Links.Add(evidence.hematopoeticMed) #4
+    if evidence.hemtopoeticAbs is not None: meds.Links.Add(evidence.hemtopoeticAbs) #5
+    if evidence.rBloTransfusionCodes is not None: meds.Links.Add(evidence.rBloTransfusionCodes) #6
+    if evidence.redBloodCellDV is not None: meds.Links.Add(evidence.redBloodCellDV) #7
     #Signs of Bleeding
-    if i975Codes is not None: soBleeding.Links.Add(i975Codes) #1
-    if k917Codes is not None: soBleeding.Links.Add(k917Codes) #2
-    if j957Codes is not None: soBleeding.Links.Add(j957Codes) #3
-    if k260Code is not None: soBleeding.Links.Add(k260Code) #4
-    if k262Code is not None: soBleeding.Links.Add(k262Code) #5
-    if k250Code is not None: soBleeding.Links.Add(k250Code) #6
-    if k252Code is not None: soBleeding.Links.Add(k252Code) #7
-    if k270Code is not None: soBleeding.Links.Add(k270Code) #8
-    if k272Code is not None: soBleeding.Links.Add(k272Code) #9
-    if bleedingAbs is not None: soBleeding.Links.Add(bleedingAbs) #10
-    if r319Code is not None: soBleeding.Links.Add(r319Code) #11
-    if k264Code is not None: soBleeding.Links.Add(k264Code) #12
-    if k266Code is not None: soBleeding.Links.Add(k266Code) #13
-    if k254Code is not None: soBleeding.Links.Add(k254Code) #14
-    if k256Code is not None: soBleeding.Links.Add(k256Code) #15
-    if k276Code is not None: soBleeding.Links.Add(k276Code) #16
-    if n99510Code is not None: soBleeding.Links.Add(n99510Code) #17
-    if r040Code is not None: soBleeding.Links.Add(r040Code) #18
-    if i8501Code is not None: soBleeding.Links.Add(i8501Code) #19
-    if eblAbs is not None: soBleeding.Links.Add(eblAbs) #20
-    if k922Code is not None: soBleeding.Links.Add(k922Code) #21
-    if hematomaAbs is not None: soBleeding.Links.Add(hematomaAbs) #22
-    if k920Code is not None: soBleeding.Links.Add(k920Code) #23
-    if r310Code is not None: soBleeding.Links.Add(r310Code) #24
-    if r195Code is not None: soBleeding.Links.Add(r195Code) #25
-    if k661Code is not None: soBleeding.Links.Add(k661Code) #26
-    if n3091Code is not None: soBleeding.Links.Add(n3091Code) #27
-    if j9501Code is not None: soBleeding.Links.Add(j9501Code) #28
-    if hemorrhageAbs is not None: soBleeding.Links.Add(hemorrhageAbs) #29
-    if r042Code is not None: soBleeding.Links.Add(r042Code) #30
-    if i974Codes is not None: soBleeding.Links.Add(i974Codes) #31
-    if k916Codes is not None: soBleeding.Links.Add(k916Codes) #32
-    if n99Codes is not None: soBleeding.Links.Add(n99Codes) #33
-    if g9732Code is not None: soBleeding.Links.Add(g9732Code) #34
-    if g9731Code is not None: soBleeding.Links.Add(g9731Code) #35
-    if j956Codes is not None: soBleeding.Links.Add(j956Codes) #36
-    if k921Code is not None: soBleeding.Links.Add(k921Code) #37
-    if i61Codes is not None: soBleeding.Links.Add(i61Codes) #38
-    if i62Codes is not None: soBleeding.Links.Add(i62Codes) #39
-    if i60Codes is not None: soBleeding.Links.Add(i60Codes) #40
-    if l7632Code is not None: soBleeding.Links.Add(l7632Code) #41
-    if k918Codes is not None: soBleeding.Links.Add(k918Codes) #42
-    if i976Codes is not None: soBleeding.Links.Add(i976Codes) #43
-    if n991Codes is not None: soBleeding.Links.Add(n991Codes) #44
-    if g9752Code is not None: soBleeding.Links.Add(g9752Code) #45
-    if g9751Code is not None: soBleeding.Links.Add(g9751Code) #46
-    if j958Codes is not None: soBleeding.Links.Add(j958Codes) #47
-    if k625Code is not None: soBleeding.Links.Add(k625Code) #48
+    if evidence.i975Codes is not None: soBleeding.Links.Add(evidence.i975Codes) #1
+    if evidence.k917Codes is not None: soBleeding.Links.Add(evidence.k917Codes) #2
+    if evidence.j957Codes is not None: soBleeding.Links.Add(evidence.j957Codes) #3
+    if evidence.k260Code is not None: soBleeding.Links.Add(evidence.k260Code) #4
+    if evidence.k262Code is not None: soBleeding.Links.Add(evidence.k262Code) #5
+    if evidence.k250Code is not None: soBleeding.Links.Add(evidence.k250Code) #6
+    if evidence.k252Code is not None: soBleeding.Links.Add(evidence.k252Code) #7
+    if evidence.k270Code is not None: soBleeding.Links.Add(evidence.k270Code) #8
+    if evidence.k272Code is not None: soBleeding.Links.Add(evidence.k272Code) #9
+    if evidence.bleedingAbs is not None: soBleeding.Links.Add(evidence.bleedingAbs) #10
+    if evidence.r319Code is not None: soBleeding.Links.Add(evidence.r319Code) #11
+    if evidence.k264Code is not None: soBleeding.Links.Add(evidence.k264Code) #12
+    if evidence.k266Code is not None: soBleeding.Links.Add(evidence.k266Code) #13
+    if evidence.k254Code is not None: soBleeding.Links.Add(evidence.k254Code) #14
+    if evidence.k256Code is not None: soBleeding.Links.Add(evidence.k256Code) #15
+    if evidence.k276Code is not None: soBleeding.Links.Add(evidence.k276Code) #16
+    if evidence.n99510Code is not None: soBleeding.Links.Add(evidence.n99510Code) #17
+    if evidence.r040Code is not None: soBleeding.Links.Add(evidence.r040Code) #18
+    if evidence.i8501Code is not None: soBleeding.Links.Add(evidence.i8501Code) #19
+    if evidence.eblAbs is not None: soBleeding.Links.Add(evidence.eblAbs) #20
+    if evidence.k922Code is not None: soBleeding.Links.Add(evidence.k922Code) #21
+    if evidence.hematomaAbs is not None: soBleeding.Links.Add(evidence.hematomaAbs) #22
+    if evidence.k920Code is not None: soBleeding.Links.Add(evidence.k920Code) #23
+    if evidence.r310Code is not None: soBleeding.Links.Add(evidence.r310Code) #24
+    if evidence.r195Code is not None: soBleeding.Links.Add(evidence.r195Code) #25
+    if evidence.k661Code is not None: soBleeding.Links.Add(evidence.k661Code) #26
+    if evidence.n3091Code is not None: soBleeding.Links.Add(evidence.n3091Code) #27
+    if evidence.j9501Code is not None: soBleeding.Links.Add(evidence.j9501Code) #28
+    if evidence.hemorrhageAbs is not None: soBleeding.Links.Add(evidence.hemorrhageAbs) #29
+    if evidence.r042Code is not None: soBleeding.Links.Add(evidence.r042Code) #30
+    if evidence.i974Codes is not None: soBleeding.Links.Add(evidence.i974Codes) #31
+    if evidence.k916Codes is not None: soBleeding.Links.Add(evidence.k916Codes) #32
+    if evidence.n99Codes is not None: soBleeding.Links.Add(evidence.n99Codes) #33
+    if evidence.g9732Code is not None: soBleeding.Links.Add(evidence.g9732Code) #34
+    if evidence.g9731Code is not None: soBleeding.Links.Add(evidence.g9731Code) #35
+    if evidence.j956Codes is not None: soBleeding.Links.Add(evidence.j956Codes) #36
+    if evidence.k921Code is not None: soBleeding.Links.Add(evidence.k921Code) #37
+    if evidence.i61Codes is not None: soBleeding.Links.Add(evidence.i61Codes) #38
+    if evidence.i62Codes is not None: soBleeding.Links.Add(evidence.i62Codes) #39
+    if evidence.i60Codes is not None: soBleeding.Links.Add(evidence.i60Codes) #40
+    if evidence.l7632Code is not None: soBleeding.Links.Add(evidence.l7632Code) #41
+    if evidence.k918Codes is not None: soBleeding.Links.Add(evidence.k918Codes) #42
+    if evidence.i976Codes is not None: soBleeding.Links.Add(evidence.i976Codes) #43
+    if evidence.n991Codes is not None: soBleeding.Links.Add(evidence.n991Codes) #44
+    if evidence.g9752Code is not None: soBleeding.Links.Add(evidence.g9752Code) #45
+    if evidence.g9751Code is not None: soBleeding.Links.Add(evidence.g9751Code) #46
+    if evidence.j958Codes is not None: soBleeding.Links.Add(evidence.j958Codes) #47
+    if evidence.k625Code is not None: soBleeding.Links.Add(evidence.k625Code) #48
     if bloodLossDV is not None:             
         for entry in bloodLossDV:
             bloodLoss.Links.Add(entry)
@@ -1075,8 +890,10 @@ if AlertPassed or AlertConditions:
     if meds.Links: medsLinks = True
     if soBleeding.Links: result.Links.Add(soBleeding); soBleedingLinks = True
     result.Links.Add(other)
-    db.LogEvaluationScriptMessage("Alert Passed Adding Links. Alert Triggered: " + str(result.Subtitle) + " Autoresolved: " + str(result.Outcome) + "; " +
-        str(result.Validated) + "; Links: Documented Dx- " + str(dcLinks) + ", Abs- " + str(absLinks) + ", labs- " + str(labsLinks) + ", vitals- "
-        + str(vitalsLinks) + ", meds- " + str(medsLinks) + ", Hemoglobin- " + str(hemoglobinLinks) + ", hematocrit- " + str(hematocritLinks) +
-        ", sign of bleeding- " + str(soBleedingLinks) + "; Acct: " + str(account._id), scriptName, scriptInstance, "Debug")
+    scriptLog.debug("Alert Passed Adding Links. Alert Triggered: %s Autoresolved: %s; %s; Links: Documented Dx- %s, Abs- %s, labs- %s, vitals- %s, meds- %s, Hemoglobin- %s, hematocrit- %s, sign of bleeding- %s; Acct: %s",
+        result.Subtitle, result.Outcome, result.Validated, dcLinks, absLinks, labsLinks, vitalsLinks, medsLinks, hemoglobinLinks, hematocritLinks,
+        soBleedingLinks, account._id)
     result.Passed = True
+
+#Write out this run's script messages
+scriptLog.flush()
@@ -28,6 +28,7 @@ from System.Data import *
 from System.Configuration import *
 from System.Collections.Generic import *
 clr.ImportExtensions(System.Linq)
+from cdi import Evidence, evaluation_context
 from operator import le, ge, gt, lt
 
 #========================================
@@ -47,14 +48,20 @@ autoCodeText = "Autoresolved Code - "
 #  Globals
 #========================================
 db = CACDataRepository()
+#Account data is loaded once and shared by every script run for the account,
+#fetching only the discrete values of the last 7 days
+context = evaluation_context(account, db, System.DateTime.Now.AddDays(-7))
+#Script messages are only formatted when their level is enabled, and are written
+#together at the end of the run
+scriptLog = context.log(db, scriptName, scriptInstance)
 admitDate = account.AdmitDateTime.Date
 birthDate = account.Patient.BirthDate.Date
 gender = account.Patient.Gender
 #Update true = External DV collection False = On Acct Record
-accountContainer = AccountWorkflowContainer(account, True, "Category", 7)
+accountContainer = context.container(AccountWorkflowContainer, True, "Category", 7)
 useSeperateDiscreteCollection = True
 if useSeperateDiscreteCollection == True:
-    discreteValues = db.GetDiscreteValues(account._id)
+    discreteValues = context.discrete_values
 else:
     discreteValues = db.GetAccountField(account._id, "DiscreteValues")
 
@@ -71,198 +78,14 @@ calcSBP1 = lambda x: x < 90
 #========================================
 #  Functions
 #========================================
-def datetimeFromUtcToLocal(utc_datetime):
-    if utc_datetime:
-        convertedDate = DateTime.SpecifyKind(utc_datetime, DateTimeKind.Utc)
-        return  convertedDate.ToLocalTime()
-    else:
-        return None
-
-def cleanNumbers(result):
-    result1 = re.sub("[\\<\\>]", "", str(result))
-    if result1.count('.') <= 1 and result1.replace(".", "").isnumeric():
-        return result1
-    else:
-        return None
-
-def dataConversion(datetime, linkText, Result, id, category, sequence, abstract=True, gender=None):
-    if datetime is not None:
-        date_time = datetimeFromUtcToLocal(datetime)
-        date_time = date_time.ToString("MM/dd/yyyy, HH:mm")
-        linkText = linkText.replace("[RESULTDATETIME]", date_time)
-    else: 
-        linkText = linkText.replace("(Result Date: [RESULTDATETIME])", "")
-    if Result is not None:
-        linkText = linkText.replace("[VALUE]", Result)
-    else: linkText = linkText.replace("[VALUE]", "")
-    if gender: linkText = linkText.replace("[GENDER]", gender)
-    else: linkText = linkText.replace("[GENDER]", "")
-    if abstract == True:
-        category.Links.Add(MatchedCriteriaLink(linkText, None, None, id, True, None, None, sequence))
-    elif abstract == False:
-        abstraction = MatchedCriteriaLink(linkText, None, None, id, True, None, None, sequence)
-        return abstraction
-    return
-
-def CodeCount(codes):
-    # Get list of codes on the acct based on CodeDic
-    result = set()
-    for document in account.Documents or []:
-        for codeReference in document.CodeReferences or []:
-            if codeReference.Code in codes:
-                matching_code = codeReference.Code
-                result.add(matching_code)
-    return list(result)
-
-def abstractValue(abstraction_name, link_text, calculation, sequence=0, category=None, abstract=False):
-    # Find abstraction and if abstract is true abstract it to the provided category
-    abstraction = accountContainer.GetFirstLinkMatchingAbstractionValue(abstraction_name, link_text, lambda x: calculation)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def dvValue(dv_name, link_text, calculation, sequence=0, category=None, abstract=False):
-    # Find Discrete Value and if abstract is true abstract it to the provided category
-    for dv in dv_name:
-        abstraction = accountContainer.GetFirstLinkMatchingDiscreteValue(dv, link_text, calculation)
-        if abstraction is not None:
-            break
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def dvValueMulti(dvDic, DV1, linkText, value, sign, sequence=0, category=None, abstract=False, needed=2):
-    # Find Discrete Value and if abstract is true abstract it to the provided category
-    matchedList = []
-    x = 0
-    for dv in dvDic or []:
-        dvr = cleanNumbers(dvDic[dv]['Result'])
-        if dvDic[dv]['Name'] in DV1 and dvr is not None and sign(float(dvr), float(value)):
-            matchedList.append(dataConversion(dvDic[dv]['ResultDate'], linkText, dvDic[dv]['Result'], dvDic[dv]['UniqueId'] or dvDic[dv]['_id'], category, sequence, abstract))
-            x += 1
-            if needed <= x:
-                break
-    if abstract and x > 0:
-        return True
-    elif abstract is False and len(matchedList) > 0 and needed > 0:
-        return matchedList
-    else:
-        return None
-
-def compareValuesMulti(dvDic, DV1, value, value1, linkText, sign, sign1, sequence=0, category=None, abstract=False, needed=2):
-    matchedList = []
-    x = 0
-    for dv in dvDic or []:
-        dvr = cleanNumbers(dvDic[dv]['Result'])
-        if dvDic[dv]['Name'] in DV1 and dvr is not None and sign(float(value), float(dvr)) and sign1(float(dvr), float(value1)):
-            matchedList.append(dataConversion(dvDic[dv]['ResultDate'], linkText, dvDic[dv]['Result'], dvDic[dv]['UniqueId'] or dvDic[dv]['_id'], category, sequence, abstract))
-            x += 1
-            if needed <= x:
-                break
-    if abstract and x > 0:
-        return True
-    elif abstract is False and len(matchedList) > 0 and needed > 0:
-        return matchedList
-    else:
-        return None
-
-def codeValue(code_name, link_text, sequence=0, category=None, abstract=False):
-    # Find code and if abstract is true abstract it to the provided category
-    abstraction = accountContainer.GetFirstCodeLink(code_name, link_text)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def multiCodeValue(code_list, link_text, sequence=0, category=None, abstract=False):
-    # Go through Code List and find first code and if abstract is true abstract it to the provided category
-    abstraction = None
-    for code in code_list:
-        abstraction = accountContainer.GetFirstCodeLink(code, link_text)
-        if abstraction is not None:
-            abstraction.Sequence = sequence
-            if abstract:
-                category.Links.Add(abstraction)
-                return True
-            else:
-                return abstraction
-    if abstract and abstraction is None:
-        return False
-    return abstraction
-
-def prefixCodeValue(prefix, link_text, sequence=0, category=None, abstract=False):
-    # Use prefix to find first code match based on regex search and if abstract is true abstract it to the provided category
-    abstraction = None
-    validCodes = [codes for codes in accountContainer.CodeKeys if re.match(prefix, codes) is not None]
-    for code in validCodes:
-        abstraction = accountContainer.GetFirstCodeLink(code, link_text)
-        if abstraction is not None:
-            abstraction.Sequence = sequence
-            if abstract:
-                category.Links.Add(abstraction)
-                return True
-            else:
-                return abstraction
-    if abstract and abstraction is None:
-        return False
-    return abstraction
-
-def medValue(med_name, link_text, sequence=0, category=None, abstract=False):
-    # Find Medication Value and if abstract is true abstract it to the provided category
-    abstraction = accountContainer.GetFirstMedicationLink(med_name, link_text)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def updateLinkText(value, replacement_text):
-    # Update the link text with the provided text
-    value.LinkText = replacement_text + value.LinkText
-    return value
-
-def documentLink(DocumentType, LinkText, sequence, category, abstract):
-    # Finds a document link and adds it as link so that its a quick reference for the cdi user.
-    abstraction = None
-    abstraction = accountContainer.GetFirstDocumentLink(DocumentType, LinkText)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    return None
+#The helpers every script shares are compiled once per process and bound to this
+#script's globals, see cdi.helpers; a helper defined below replaces the shared one
+context.bind_helpers(globals(), 1)
 
 #========================================
 #  Algorithm
 #========================================
-db.LogEvaluationScriptMessage("Script starting " + str(account._id), scriptName, scriptInstance, "Debug")
+scriptLog.debug("Script starting %s", account._id)
 #Determine if if and how many fully spec codes are on the acct
 codes = []
 codes = codeDic.keys()
@@ -304,22 +127,23 @@ for alert in account.MatchedCriteriaGroups or []:
 #Check if alert was autoresolved or completed.
 if validated is False:
     #Alert Triggers
-    i4891Code = codeValue("I48.91", "Unspecified Atrial Fibrillation Dx Present: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    artialFibAbs = abstractValue("ATRIAL_FIBRILLATION", "Atrial Fibrillation '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True)
-    i480Code = codeValue("I48.0", "Paroxysmal Atrial Fibrillation: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    i4811Code = codeValue("I48.11", "Longstanding Persistent Atrial Fibrillation: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    i4819Code = codeValue("I48.19", "Other Persistent Atrial Fibrillation: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    i4820Code = codeValue("I48.20", "Chronic Atrial Fibrillation: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    i4821Code = codeValue("I48.21", "Permanent Atrial Fibrillation: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence = Evidence()
+    evidence.define("i4891Code", codeValue, "I48.91", "Unspecified Atrial Fibrillation Dx Present: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("artialFibAbs", abstractValue, "ATRIAL_FIBRILLATION", "Atrial Fibrillation '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True)
+    evidence.define("i480Code", codeValue, "I48.0", "Paroxysmal Atrial Fibrillation: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("i4811Code", codeValue, "I48.11", "Longstanding Persistent Atrial Fibrillation: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("i4819Code", codeValue, "I48.19", "Other Persistent Atrial Fibrillation: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("i4820Code", codeValue, "I48.20", "Chronic Atrial Fibrillation: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("i4821Code", codeValue, "I48.21", "Permanent Atrial Fibrillation: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
 
     #Main Algorithm
     if (
-        i480Code is not None and (i4819Code is not None or i4820Code is not None or i4821Code is not None)
+        evidence.i480Code is not None and (evidence.i4819Code is not None or evidence.i4820Code is not None or evidence.i4821Code is not None)
     ):
-        if i480Code is not None: documentedDx.Links.Add(i480Code)
-        if i4819Code is not None: documentedDx.Links.Add(i4819Code)
-        if i4820Code is not None: documentedDx.Links.Add(i4820Code)
-        if i4821Code is not None: documentedDx.Links.Add(i4821Code)
+        if evidence.i480Code is not None: documentedDx.Links.Add(evidence.i480Code)
+        if evidence.i4819Code is not None: documentedDx.Links.Add(evidence.i4819Code)
+        if evidence.i4820Code is not None: documentedDx.Links.Add(evidence.i4820Code)
+        if evidence.i4821Code is not None: documentedDx.Links.Add(evidence.i4821Code)
         result.Subtitle = "Conflicting Atrial Fibrillation Dx"
         AlertPassed = True
         if validated:
@@ -339,8 +163,8 @@ if validated is False:
         result.Reason = "Autoresolved due to one Specified Code on the Account"
         AlertConditions = True
 
-    elif i4891Code is not None and codesExist == 0:
-        documentedDx.Links.Add(i4891Code)
+    elif evidence.i4891Code is not None and codesExist == 0:
+        documentedDx.Links.Add(evidence.i4891Code)
         result.Subtitle = "Unspecified Atrial Fibrillation Dx"
         AlertPassed = True
 
@@ -362,11 +186,11 @@ if validated is False:
 #        AlertPassed = True
 
     else:
-        db.LogEvaluationScriptMessage("Not enough data to warrent alert, Alert Failed. " + str(account._id), scriptName, scriptInstance, "Debug")
+        scriptLog.debug("Not enough data to warrent alert, Alert Failed. %s", account._id)
         result.Passed = False
 
 else:
-    db.LogEvaluationScriptMessage("Alert Closed; Exiting script run. Outcome: " + str(outcome) + " " + str(account._id), scriptName, scriptInstance, "Debug")
+    scriptLog.debug("Alert Closed; Exiting script run. Outcome: %s %s", outcome, account._id)
 
 #If an alert triggered abstract the following
 if AlertPassed:
@@ -428,7 +252,9 @@ if AlertPassed or AlertConditions:
     if meds.Links: medsLinks = True
     if ekgLinks.Links: result.Links.Add(ekgLinks); docLinksLinks = True
     result.Links.Add(other)
-    db.LogEvaluationScriptMessage("Alert Passed Adding Links. Alert Triggered: " + str(result.Subtitle) + " Autoresolved: " + str(result.Outcome) + "; " +
-        str(result.Validated) + "; Links: AlertTrigger- " + str(documentedDxTriggerLinks) + ", Abs- " + str(absLinks) + ", docs- " + str(docLinksLinks) + ", vitals- " + str(vitalsLinks) + ", meds- " + str(medsLinks)
-        + "; Acct: " + str(account._id), scriptName, scriptInstance, "Debug")
+    scriptLog.debug("Alert Passed Adding Links. Alert Triggered: %s Autoresolved: %s; %s; Links: AlertTrigger- %s, Abs- %s, docs- %s, vitals- %s, meds- %s; Acct: %s",
+        result.Subtitle, result.Outcome, result.Validated, documentedDxTriggerLinks, absLinks, docLinksLinks, vitalsLinks, medsLinks, account._id)
     result.Passed = True
+
+#Write out this run's script messages
+scriptLog.flush()
@@ -28,6 +28,7 @@ from System.Data import *
 from System.Configuration import *
 from System.Collections.Generic import *
 clr.ImportExtensions(System.Linq)
+from cdi import AsOfJoin, DiscreteValueIndex, Evidence, ResultDateJoin, evaluation_context
 from operator import le, ge, gt, lt
 
 # ========================================
@@ -41,14 +42,20 @@ autoCodeText = "Autoresolved Specified Code - "
 #  Globals
 #========================================
 db = CACDataRepository()
+#Account data is loaded once and shared by every script run for the account,
+#fetching only the discrete values of the last 7 days
+context = evaluation_context(account, db, System.DateTime.Now.AddDays(-7))
+#Script messages are only formatted when their level is enabled, and are written
+#together at the end of the run
+scriptLog = context.log(db, scriptName, scriptInstance)
 admitDate = account.AdmitDateTime.Date
 birthDate = account.Patient.BirthDate.Date
 gender = account.Patient.Gender
 #Update true = External DV collection False = On Acct Record
-accountContainer = AccountWorkflowContainer(account, True, "Category", 7)
+accountContainer = context.container(AccountWorkflowContainer, True, "Category", 7)
 useSeperateDiscreteCollection = True
 if useSeperateDiscreteCollection == True:
-    discreteValues = db.GetDiscreteValues(account._id)
+    discreteValues = context.discrete_values
 else:
     discreteValues = db.GetAccountField(account._id, "DiscreteValues")
 
@@ -87,193 +94,9 @@ dvSputumCulture = [""]
 #========================================
 #  Functions
 #========================================
-def datetimeFromUtcToLocal(utc_datetime):
-    if utc_datetime:
-        convertedDate = DateTime.SpecifyKind(utc_datetime, DateTimeKind.Utc)
-        return  convertedDate.ToLocalTime()
-    else:
-        return None
-
-def cleanNumbers(result):
-    result1 = re.sub("[\\<\\>]", "", str(result))
-    if result1.count('.') <= 1 and result1.replace(".", "").isnumeric():
-        return result1
-    else:
-        return None
-
-def dataConversion(datetime, linkText, Result, id, category, sequence, abstract=True, gender=None):
-    if datetime is not None:
-        date_time = datetimeFromUtcToLocal(datetime)
-        date_time = date_time.ToString("MM/dd/yyyy, HH:mm")
-        linkText = linkText.replace("[RESULTDATETIME]", date_time)
-    else: 
-        linkText = linkText.replace("(Result Date: [RESULTDATETIME])", "")
-    if Result is not None:
-        linkText = linkText.replace("[VALUE]", Result)
-    else: linkText = linkText.replace("[VALUE]", "")
-    if gender: linkText = linkText.replace("[GENDER]", gender)
-    else: linkText = linkText.replace("[GENDER]", "")
-    if abstract == True:
-        category.Links.Add(MatchedCriteriaLink(linkText, None, None, id, True, None, None, sequence))
-    elif abstract == False:
-        abstraction = MatchedCriteriaLink(linkText, None, None, id, True, None, None, sequence)
-        return abstraction
-    return
-
-def CodeCount(codes):
-    # Get list of codes on the acct based on CodeDic
-    result = set()
-    for document in account.Documents or []:
-        for codeReference in document.CodeReferences or []:
-            if codeReference.Code in codes:
-                matching_code = codeReference.Code
-                result.add(matching_code)
-    return list(result)
-
-def abstractValue(abstraction_name, link_text, calculation, sequence=0, category=None, abstract=False):
-    # Find abstraction and if abstract is true abstract it to the provided category
-    abstraction = accountContainer.GetFirstLinkMatchingAbstractionValue(abstraction_name, link_text, lambda x: calculation)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def dvValue(dv_name, link_text, calculation, sequence=0, category=None, abstract=False):
-    # Find Discrete Value and if abstract is true abstract it to the provided category
-    for dv in dv_name:
-        abstraction = accountContainer.GetFirstLinkMatchingDiscreteValue(dv, link_text, calculation)
-        if abstraction is not None:
-            break
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def dvValueMulti(dvDic, DV1, linkText, value, sign, sequence=0, category=None, abstract=False, needed=2):
-    # Find Discrete Value and if abstract is true abstract it to the provided category
-    matchedList = []
-    x = 0
-    for dv in dvDic or []:
-        dvr = cleanNumbers(dvDic[dv]['Result'])
-        if dvDic[dv]['Name'] in DV1 and dvr is not None and sign(float(dvr), float(value)):
-            matchedList.append(dataConversion(dvDic[dv]['ResultDate'], linkText, dvDic[dv]['Result'], dvDic[dv]['UniqueId'] or dvDic[dv]['_id'], category, sequence, abstract))
-            x += 1
-            if needed <= x:
-                break
-    if abstract and x > 0:
-        return True
-    elif abstract is False and len(matchedList) > 0 and needed > 0:
-        return matchedList
-    else:
-        return None
-
-def compareValuesMulti(dvDic, DV1, value, value1, linkText, sign, sign1, sequence=0, category=None, abstract=False, needed=2):
-    matchedList = []
-    x = 0
-    for dv in dvDic or []:
-        dvr = cleanNumbers(dvDic[dv]['Result'])
-        if dvDic[dv]['Name'] in DV1 and dvr is not None and sign(float(value), float(dvr)) and sign1(float(dvr), float(value1)):
-            matchedList.append(dataConversion(dvDic[dv]['ResultDate'], linkText, dvDic[dv]['Result'], dvDic[dv]['UniqueId'] or dvDic[dv]['_id'], category, sequence, abstract))
-            x += 1
-            if needed <= x:
-                break
-    if abstract and x > 0:
-        return True
-    elif abstract is False and len(matchedList) > 0 and needed > 0:
-        return matchedList
-    else:
-        return None
-
-def codeValue(code_name, link_text, sequence=0, category=None, abstract=False):
-    # Find code and if abstract is true abstract it to the provided category
-    abstraction = accountContainer.GetFirstCodeLink(code_name, link_text)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def multiCodeValue(code_list, link_text, sequence=0, category=None, abstract=False):
-    # Go through Code List and find first code and if abstract is true abstract it to the provided category
-    abstraction = None
-    for code in code_list:
-        abstraction = accountContainer.GetFirstCodeLink(code, link_text)
-        if abstraction is not None:
-            abstraction.Sequence = sequence
-            if abstract:
-                category.Links.Add(abstraction)
-                return True
-            else:
-                return abstraction
-    if abstract and abstraction is None:
-        return False
-    return abstraction
-
-def prefixCodeValue(prefix, link_text, sequence=0, category=None, abstract=False):
-    # Use prefix to find first code match based on regex search and if abstract is true abstract it to the provided category
-    abstraction = None
-    validCodes = [codes for codes in accountContainer.CodeKeys if re.match(prefix, codes) is not None]
-    for code in validCodes:
-        abstraction = accountContainer.GetFirstCodeLink(code, link_text)
-        if abstraction is not None:
-            abstraction.Sequence = sequence
-            if abstract:
-                category.Links.Add(abstraction)
-                return True
-            else:
-                return abstraction
-    if abstract and abstraction is None:
-        return False
-    return abstraction
-
-def medValue(med_name, link_text, sequence=0, category=None, abstract=False):
-    # Find Medication Value and if abstract is true abstract it to the provided category
-    abstraction = accountContainer.GetFirstMedicationLink(med_name, link_text)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def updateLinkText(value, replacement_text):
-    # Update the link text with the provided text
-    value.LinkText = replacement_text + value.LinkText
-    return value
-
-def documentLink(DocumentType, LinkText, sequence, category, abstract):
-    # Finds a document link and adds it as link so that its a quick reference for the cdi user.
-    abstraction = None
-    abstraction = accountContainer.GetFirstDocumentLink(DocumentType, LinkText)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    return None
+#The helpers every script shares are compiled once per process and bound to this
+#script's globals, see cdi.helpers; a helper defined below replaces the shared one
+context.bind_helpers(globals(), 1)
 
 #========================================
 #  Script Specific Functions
@@ -313,23 +136,6 @@ def dvBloodCheck(dvDic, discreteValueName, linkText, sequence=0, category=None,
                 return abstraction
     return abstraction
 
-def dvPositiveCheck(dvDic, discreteValueName, linkText, sequence=0, category=None, abstract=False):
-    abstraction = None
-    for dv in dvDic or []:
-        if (
-            dvDic[dv]['Name'] in discreteValueName and
-            dvDic[dv]['Result'] is not None and
-            (re.search(r'\bpositive\b', dvDic[dv]['Result'], re.IGNORECASE) is not None or
-            re.search(r'\bDetected\b', dvDic[dv]['Result'], re.IGNORECASE) is not None)  
-        ):
-            if abstract:
-                dataConversion(dvDic[dv]['ResultDate'], linkText, dvDic[dv]['Result'], dvDic[dv]['UniqueId'] or dvDic[dv]['_id'], category, sequence, True)
-                return True
-            else:
-                abstraction = dataConversion(dvDic[dv]['ResultDate'], linkText, dvDic[dv]['Result'], dvDic[dv]['UniqueId'] or dvDic[dv]['_id'], category, sequence, False)
-                return abstraction
-    return abstraction
-
 def dvOxygenCheck(dvDic, discreteValueName, linkText, sequence=0, category=None, abstract=False):
     abstraction = None
     for dv in dvDic or []:
@@ -457,6 +263,14 @@ def fi02Convert(value):
     value1 = float(value) / float(100)
     return value1
 
+def pfRatio(pao2, percentage):
+    #Estimated PF ratio, None when either reading could not be converted
+    if pao2 is None or pao2 == 'Invalid' or percentage is None or percentage == 'Invalid':
+        return None
+    if float(pao2) <= 0 or float(percentage) <= 0:
+        return None
+    return float(pao2) / float(percentage)
+
 def pao2fio2Calculation(dvDic, DV1, DV2, DV3, DV4, DV5, DV6, DV7, value1, sequence1):
     dateNow = System.DateTime.Now
     date_time = dateNow.ToString("MM/dd/yyyy, HH:mm")
@@ -476,7 +290,6 @@ def pao2fio2Calculation(dvDic, DV1, DV2, DV3, DV4, DV5, DV6, DV7, value1, sequen
     linkText7 = "Respiratory Rate: [VALUE] (Result Date: [RESULTDATETIME])"
     #Default should be set to -1 day back.
     dateLimit = System.DateTime.Now.AddDays(-1)
-    percentage = None
     w = 0
     x = 0
     y = 0
@@ -484,7 +297,6 @@ def pao2fio2Calculation(dvDic, DV1, DV2, DV3, DV4, DV5, DV6, DV7, value1, sequen
     a = 0
     b = 0
     c = 0
-    rrDV = None
     matchedList = []
     #Pull all values for discrete values we need
     for dv in dvDic or []:
@@ -525,95 +337,48 @@ def pao2fio2Calculation(dvDic, DV1, DV2, DV3, DV4, DV5, DV6, DV7, value1, sequen
         matchedList.append(dataConversion(discreteDic[w].ResultDate, linkText1, discreteDic[w].Result, discreteDic[w].UniqueId or discreteDic[w]._id, "abg", sequence1, False))
         return matchedList
 
-    #Determine percentage based on oxygen therapy (dv5/discreteDic4) and oxygen flow rate(dv4/discreteDic3)
-    if z > 0 and a > 0 and b == 0:
-        if discreteDic3[z].ResultDate == discreteDic4[a].ResultDate:
-            percentage = fio2Percentage(cleanNumbers(discreteDic3[z].Result), discreteDic4[a].Result)
-            if percentage == 'Invalid':
-                return None
-
-    #Determine ratio from PaO2 attempted first or SpO2 values will be converted to PaO2.
-    if y >= 1 and percentage is None and b > 0:
-        for item in discreteDic2:
-            if y == 0 or b == 0:
-                break
-            percentage = float(fi02Convert(cleanNumbers(discreteDic5[b].Result)))
-            if percentage is not None and percentage > 0:
-                calculation = float(cleanNumbers(discreteDic2[y].Result)) / float(percentage)
-                if float(calculation) <= float(300):
-                    for item in discreteDic6:
-                        if discreteDic6[item].ResultDate == discreteDic2[y].ResultDate:
-                            rrDV = item
-                            break
-                    if rrDV is not None:
-                        respRateDV = discreteDic6[rrDV].Result
-                    else:
-                        respRateDV = "XX"
-                    matchedList.append(dataConversion(None, date_time + " Respiratory Rate: " + str(respRateDV) + ", Pa02: " + str(discreteDic2[y].Result) + ", FIO2: " + str(discreteDic5[b].Result) + ", Calculated/Estimated PF Ratio- [VALUE]" , str(round(calculation)), discreteDic2[y].UniqueId or discreteDic2[y]._id, calcpo2fio2, 8, False))
-                    return matchedList
-                elif float(calculation) > float(300):
-                    y = y - 1; b = b - 1
-    elif x >= 1 and percentage is None and b > 0:
-        for item in discreteDic1:
-            if x == 0 or b == 0:
-                break
-            percentage = float(fi02Convert(cleanNumbers(discreteDic5[b].Result)))
-            pO2Converted = pO2Conversion(cleanNumbers(discreteDic1[x].Result))
-            if pO2Converted is not None and pO2Converted > 0 and percentage is not None and percentage > 0:
-                calculation = float(pO2Converted) / float(percentage)
-                if float(calculation) <= float(300):
-                    for item in discreteDic6:
-                        if discreteDic6[item].ResultDate == discreteDic1[x].ResultDate:
-                            rrDV = item
-                            break
-                    if rrDV is not None:
-                        respRateDV = discreteDic6[rrDV].Result
-                    else:
-                        respRateDV = "XX"
-                    matchedList.append(dataConversion(None, date_time + " Respiratory Rate: " + str(respRateDV) + ", Sp02: " + str(discreteDic1[x].Result) + ", FIO2: " + str(discreteDic5[b].Result) + ", Calculated/Estimated PF Ratio- [VALUE]" , str(round(calculation)), discreteDic1[x].UniqueId or discreteDic1[x]._id, calcpo2fio2, 8, False))
-                    return matchedList
-                elif float(calculation) > float(300):
-                    x = x - 1; b = b - 1
-    elif y >= 1 and percentage is not None and percentage > 0 and b == 0:
-        for item in discreteDic2:
-            if x == 0:
-                break
-            calculation = float(cleanNumbers(discreteDic2[y].Result)) / float(percentage)
-            if float(calculation) <= float(300):
-                for item in discreteDic6:
-                    if discreteDic6[item].ResultDate == discreteDic2[y].ResultDate:
-                        rrDV = item
-                        break
-                if rrDV is not None:
-                    respRateDV = discreteDic6[rrDV].Result
-                else:
-                    respRateDV = "XX"
-                matchedList.append(dataConversion(None, date_time + " Respiratory Rate: " + str(respRateDV) + ", Pa02: " + str(discreteDic2[y].Result) + ", Oxygen Flow Rate: " + str(discreteDic3[z].Result) + ", Oxygen Therapy: " + str(discreteDic4[a].Result) + ", Calculated/Estimated PF Ratio- [VALUE]" , str(round(calculation)), discreteDic2[y].UniqueId or discreteDic2[y]._id, calcpo2fio2, 8, False))
-                return matchedList
-            elif float(calculation) > float(300):
-                y = y - 1
-    elif x >= 1 and percentage is not None and percentage > 0 and b == 0:
-        for item in discreteDic1:
-            if x == 0:
-                break
-            pO2Converted = pO2Conversion(cleanNumbers(discreteDic1[x].Result))
-            if pO2Converted is not None and pO2Converted > 0:
-                calculation = float(pO2Converted) / float(percentage)
-                if float(calculation) <= float(300):
-                    for item in discreteDic6:
-                        if discreteDic6[item].ResultDate == discreteDic1[x].ResultDate:
-                            rrDV = item
-                            break
-                    if rrDV is not None:
-                        respRateDV = discreteDic6[rrDV].Result
-                    else:
-                        respRateDV = "XX"
-                    matchedList.append(dataConversion(None, date_time + " Respiratory Rate: " + str(respRateDV) + ", Sp02: " + str(discreteDic1[x].Result) + ", Oxygen Flow Rate: " + str(discreteDic3[z].Result) + ", Oxygen Therapy: " + str(discreteDic4[a].Result) + ", Calculated/Estimated PF Ratio- [VALUE]" , str(round(calculation)), discreteDic1[x].UniqueId or discreteDic1[x]._id, calcpo2fio2, 8, False))
-                    return matchedList
-                elif float(calculation) > float(300):
-                    x = x - 1
-    else:
-        return None
+    #Line up every PaO2 and SpO2 reading with the FiO2, oxygen flow rate and oxygen therapy readings
+    # charted within 5 minutes of it, and the respiratory rate charted at the same time.
+    pao2Readings = AsOfJoin(discreteDic2, {'fio2': discreteDic5, 'flow': discreteDic3, 'therapy': discreteDic4}, 5)
+    spo2Readings = AsOfJoin(discreteDic1, {'fio2': discreteDic5, 'flow': discreteDic3, 'therapy': discreteDic4}, 5)
+    respRateRows = ResultDateJoin(discreteDic6, {'rr': DV7})
+
+    #Estimate the PF ratio for every pair, newest reading first, in the order the sources are preferred
+    ratios = []
+    #Pa02/Fi02 Ratio Calculation
+    ratios += [
+        (pfRatio(cleanNumbers(pao2.Result), fi02Convert(cleanNumbers(fio2.Result))), pao2, "Pa02: " + str(pao2.Result) + ", FIO2: " + str(fio2.Result))
+        for pao2, fio2 in pao2Readings.pairs('fio2')
+    ]
+    #sp02/Fi02 Ratio Calculation
+    ratios += [
+        (pfRatio(pO2Conversion(cleanNumbers(spo2.Result)), fi02Convert(cleanNumbers(fio2.Result))), spo2, "Sp02: " + str(spo2.Result) + ", FIO2: " + str(fio2.Result))
+        for spo2, fio2 in spo2Readings.pairs('fio2')
+    ]
+    #Oxygen therapy and oxygen flow rate are only used when there is no FiO2 reading
+    if b == 0:
+        #Pa02/Oxygen Therapy/Oxygen Flow Rate Ratio Calculation
+        ratios += [
+            (pfRatio(cleanNumbers(pao2.Result), fio2Percentage(cleanNumbers(flow.Result), therapy.Result)), pao2, "Pa02: " + str(pao2.Result) + ", Oxygen Flow Rate: " + str(flow.Result) + ", Oxygen Therapy: " + str(therapy.Result))
+            for pao2, flow, therapy in pao2Readings.pairs('flow', 'therapy')
+        ]
+        #sp02/Oxygen Therapy/Oxygen Flow Rate Ratio Calculation
+        ratios += [
+            (pfRatio(pO2Conversion(cleanNumbers(spo2.Result)), fio2Percentage(cleanNumbers(flow.Result), therapy.Result)), spo2, "Sp02: " + str(spo2.Result) + ", Oxygen Flow Rate: " + str(flow.Result) + ", Oxygen Therapy: " + str(therapy.Result))
+            for spo2, flow, therapy in spo2Readings.pairs('flow', 'therapy')
+        ]
+
+    matches = [ratio for ratio in ratios if ratio[0] is not None and float(ratio[0]) <= float(300)]
+    if len(matches) > 0:
+        calculation, reading, readingText = matches[0]
+        respRate = respRateRows.get(reading.ResultDate).first('rr')
+        if respRate is not None:
+            respRateDV = respRate.Result
+        else:
+            respRateDV = "XX"
+        matchedList.append(dataConversion(None, date_time + " Respiratory Rate: " + str(respRateDV) + ", " + readingText + ", Calculated/Estimated PF Ratio- [VALUE]" , str(round(calculation)), reading.UniqueId or reading._id, calcpo2fio2, 8, False))
+        return matchedList
+    return None
     
 def sp02pa02Lookup(dvDic, DV1, DV2, DV3, DV4):
     discreteDic1 = {}
@@ -686,9 +451,8 @@ def sp02pa02Lookup(dvDic, DV1, DV2, DV3, DV4):
                 matchedList.append(dataConversion(discreteDic3[otDv].ResultDate, linkText3, discreteDic3[otDv].Result, discreteDic3[otDv].UniqueId or discreteDic3[otDv]._id, oxygenTherapy, 3, False))
             if rrDV is not None:
                 matchedList.append(dataConversion(discreteDic4[rrDV].ResultDate, linkText4, discreteDic4[rrDV].Result, discreteDic4[rrDV].UniqueId or discreteDic4[rrDV]._id, rr, 4, False))
-        db.LogEvaluationScriptMessage("SPO2 log message: SPO2 Found matches" + str(w) + ", PAO2 Found Matches: " + str(x)
-            + ", Oxygen Therapy Found Matches: " + str(y) + ", Respiratory Found Matchs: " + str(z) + ", Matching Date: " + str(matchingDate) + " " 
-            + str(account._id), scriptName, scriptInstance, "Debug")
+        scriptLog.debug("SPO2 log message: SPO2 Found matches%s, PAO2 Found Matches: %s, Oxygen Therapy Found Matches: %s, Respiratory Found Matchs: %s, Matching Date: %s %s",
+            w, x, y, z, matchingDate, account._id)
         return matchedList
     elif w > 0:
         for item in discreteDic1:
@@ -718,20 +482,18 @@ def sp02pa02Lookup(dvDic, DV1, DV2, DV3, DV4):
                 matchedList.append(dataConversion(discreteDic3[otDv].ResultDate, linkText3, discreteDic3[otDv].Result, discreteDic3[otDv].UniqueId or discreteDic3[otDv]._id, oxygenTherapy, 5, False))
             if rrDV is not None:
                 matchedList.append(dataConversion(discreteDic4[rrDV].ResultDate, linkText4, discreteDic4[rrDV].Result, discreteDic4[rrDV].UniqueId or discreteDic4[rrDV]._id, rr, 7, False))
-        db.LogEvaluationScriptMessage("SPO2 log message: SPO2 Found matches" + str(w) + ", PAO2 Found Matches: " + str(x)
-            + ", Oxygen Therapy Found Matches: " + str(y) + ", Respiratory Found Matchs: " + str(z) + ", Matching Date: " + str(matchingDate) + " " 
-            + str(account._id), scriptName, scriptInstance, "Debug")
+        scriptLog.debug("SPO2 log message: SPO2 Found matches%s, PAO2 Found Matches: %s, Oxygen Therapy Found Matches: %s, Respiratory Found Matchs: %s, Matching Date: %s %s",
+            w, x, y, z, matchingDate, account._id)
         return matchedList
     else:
-        db.LogEvaluationScriptMessage("SPO2 log message: SPO2 Found matches" + str(w) + ", PAO2 Found Matches: " + str(x)
-            + ", Oxygen Therapy Found Matches: " + str(y) + ", Respiratory Found Matchs: " + str(z) + ", Matching Date: " + str(matchingDate) + " " 
-            + str(account._id), scriptName, scriptInstance, "Debug")
+        scriptLog.debug("SPO2 log message: SPO2 Found matches%s, PAO2 Found Matches: %s, Oxygen Therapy Found Matches: %s, Respiratory Found Matchs: %s, Matching Date: %s %s",
+            w, x, y, z, matchingDate, account._id)
         return None
     
 #========================================
 #  Algorithm
 #========================================
-db.LogEvaluationScriptMessage("Script starting " + str(account._id), scriptName, scriptInstance, "Debug")
+scriptLog.debug("Script starting %s", account._id)
 #Determine if if and how many fully spec codes are on the acct
 codes = []
 codes = codeDic.keys()
@@ -807,205 +569,197 @@ for alert in account.MatchedCriteriaGroups or []:
 #Check if alert was autoresolved or completed.
 if validated is False:
     #Find all discrete values for custom lookups within the last 7 days
-    maindiscreteDic = {}
-    unsortedDicsreteDic = {}
-    dvCount = 0
     #Combine all items into one list to search against
     discreteSearchList = [i for j in [dvPa02Fi02, dvSPO2, dvPaO2, dvOxygenFlowRate, dvOxygenTherapy, dvFIO2, 
         dvRespiratoryPattern, dvBreathSounds, dvSARSCOVID, dvSARSCOVIDAntigen, dvPneumococcalAntigen, 
         dvInfluenzeScreenA, dvInfluenzeScreenB, dvMRSASCreen, dvRespiratoryRate, dvPleuralFluidCulture, dvSputumCulture] for i in j]
     #Set datelimit for how far back to 
     dvDateLimit = System.DateTime.Now.AddDays(-7)
-    #Loop through all dvs finding any that match in the combined list adding to a dictionary the matches
-    for dv in discreteValues or []:
-        if dv.ResultDate >= dvDateLimit:
-            if any(item == dv.Name for item in discreteSearchList):
-                dvCount += 1
-                unsortedDicsreteDic[dvCount] = dv
-    #Sort List by latest
-    maindiscreteDic = sorted(unsortedDicsreteDic.items(), key=lambda x: x[1]['ResultDate'], reverse=True)
+    #Index all dvs that match in the combined list by name, sorted by latest
+    maindiscreteDic = DiscreteValueIndex(discreteValues, discreteSearchList, dvDateLimit)
     
     #Negations
-    opioidOverdoseAbs = abstractValue("OPIOID_OVERDOSE", "Opioid Overdose '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True)
-    HeartFailureCodeCheck = multiCodeValue(["I50.21", "I50.23", "I50.31",
+    evidence = Evidence()
+    evidence.define("opioidOverdoseAbs", abstractValue, "OPIOID_OVERDOSE", "Opioid Overdose '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True)
+    evidence.define("HeartFailureCodeCheck", multiCodeValue, ["I50.21", "I50.23", "I50.31",
         "I50.33", "I50.41", "I50.43"], "Acute Heart Failure Codes present : [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    j440Code = codeValue("J44.0", "Chronic Obstructive Pulmonary Disease With (Acute) Lower Respiratory Infection: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    j441Code = codeValue("J44.1", "Chronic Obstructive Pulmonary Disease With (Acute) Exacerbation: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    pulmonaryEmbolismNeg =  prefixCodeValue("^I26\.", "Pulmonary Embolism: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    j810Code = codeValue("J81.0", "Acute Pulmonary Edema: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    sepsis40Neg =  prefixCodeValue("^A40\.", "Sepsis: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    sepsis41Neg =  prefixCodeValue("^A41\.", "Sepsis: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    sepsisNeg = multiCodeValue(["A42.7", "A22.7", "B37.7", "A26.7", "A54.86", "B00.7", "A32.7", "A24.1", "A20.7", "T81.44XA", "T81.44XD"],
+    evidence.define("j440Code", codeValue, "J44.0", "Chronic Obstructive Pulmonary Disease With (Acute) Lower Respiratory Infection: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("j441Code", codeValue, "J44.1", "Chronic Obstructive Pulmonary Disease With (Acute) Exacerbation: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("pulmonaryEmbolismNeg", prefixCodeValue, "^I26\.", "Pulmonary Embolism: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("j810Code", codeValue, "J81.0", "Acute Pulmonary Edema: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("sepsis40Neg", prefixCodeValue, "^A40\.", "Sepsis: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("sepsis41Neg", prefixCodeValue, "^A41\.", "Sepsis: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("sepsisNeg", multiCodeValue, ["A42.7", "A22.7", "B37.7", "A26.7", "A54.86", "B00.7", "A32.7", "A24.1", "A20.7", "T81.44XA", "T81.44XD"],
             "Sepsis: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    f410Code = codeValue("F41.0", "Panic Attack: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    pneumonthroaxNeg =  prefixCodeValue("^J93\.", "Pneumothroax: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    acuteMINeg =  prefixCodeValue("^I21\.", "Acute MI: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    copdWithoutExacerbationAbs = abstractValue("COPD_WITHOUT_EXACERBATION", "COPD without Exacerbation abstraction '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True)
+    evidence.define("f410Code", codeValue, "F41.0", "Panic Attack: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("pneumonthroaxNeg", prefixCodeValue, "^J93\.", "Pneumothroax: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("acuteMINeg", prefixCodeValue, "^I21\.", "Acute MI: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("copdWithoutExacerbationAbs", abstractValue, "COPD_WITHOUT_EXACERBATION", "COPD without Exacerbation abstraction '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True)
     #Documented Dx
-    RespiratoryCodeCheck = multiCodeValue(["J96.00", "J96.01", "J96.02"], "Acute Respiratory Failure Codes present : [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    j449Code = codeValue("J44.9", "Chronic Obstructive Pulmonary Disease, Unspecified: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    j20Codes =  prefixCodeValue("^J20\.", "Acute Bronchitis: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    j22Codes =  prefixCodeValue("^J22\.", "Unspecified Acute Lower Respiratory Infection: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    pneumoniaJ12 =  prefixCodeValue("^J12\.", "Pneumonia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    pneumoniaJ13 =  prefixCodeValue("^J13\.", "Pneumonia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    pneumoniaJ14 =  prefixCodeValue("^J14\.", "Pneumonia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    pneumoniaJ15 =  prefixCodeValue("^J15\.", "Pneumonia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    pneumoniaJ16 =  prefixCodeValue("^J16\.", "Pneumonia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    pneumoniaJ17 =  prefixCodeValue("^J17\.", "Pneumonia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    pneumoniaJ18 =  prefixCodeValue("^J18\.", "Pneumonia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    respiratoryTuberculosis =  prefixCodeValue("^A15\.", "Respiratory Tuberculosis: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    j21Codes =  prefixCodeValue("^J21\.", "Acute Bronchitis: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("RespiratoryCodeCheck", multiCodeValue, ["J96.00", "J96.01", "J96.02"], "Acute Respiratory Failure Codes present : [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("j449Code", codeValue, "J44.9", "Chronic Obstructive Pulmonary Disease, Unspecified: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("j20Codes", prefixCodeValue, "^J20\.", "Acute Bronchitis: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("j22Codes", prefixCodeValue, "^J22\.", "Unspecified Acute Lower Respiratory Infection: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("pneumoniaJ12", prefixCodeValue, "^J12\.", "Pneumonia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("pneumoniaJ13", prefixCodeValue, "^J13\.", "Pneumonia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("pneumoniaJ14", prefixCodeValue, "^J14\.", "Pneumonia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("pneumoniaJ15", prefixCodeValue, "^J15\.", "Pneumonia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("pneumoniaJ16", prefixCodeValue, "^J16\.", "Pneumonia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("pneumoniaJ17", prefixCodeValue, "^J17\.", "Pneumonia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("pneumoniaJ18", prefixCodeValue, "^J18\.", "Pneumonia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("respiratoryTuberculosis", prefixCodeValue, "^A15\.", "Respiratory Tuberculosis: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("j21Codes", prefixCodeValue, "^J21\.", "Acute Bronchitis: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
     #Abs
-    r0603Code = codeValue("R06.03", "Acute Respiratory Distress: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 2)
-    j9801Code = codeValue("J98.01", "Bronchospasm: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 5)
-    shortnessOfBreathAbs = abstractValue("SHORTNESS_OF_BREATH", "Shortness of Breath '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 15)
-    useOfAccessoryMusclesAbs = abstractValue("USE_OF_ACCESSORY_MUSCLES", "Use of Accessory Muscles '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 16)
-    wheezingAbs = abstractValue("WHEEZING", "Wheezing '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 17)
+    evidence.define("r0603Code", codeValue, "R06.03", "Acute Respiratory Distress: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 2)
+    evidence.define("j9801Code", codeValue, "J98.01", "Bronchospasm: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 5)
+    evidence.define("shortnessOfBreathAbs", abstractValue, "SHORTNESS_OF_BREATH", "Shortness of Breath '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 15)
+    evidence.define("useOfAccessoryMusclesAbs", abstractValue, "USE_OF_ACCESSORY_MUSCLES", "Use of Accessory Muscles '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 16)
+    evidence.define("wheezingAbs", abstractValue, "WHEEZING", "Wheezing '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 17)
     #Meds
-    bronchodilatorMed = medValue("Bronchodilator", "Bronchodilator: [MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 3)
-    inhaledCorticosteriodMed = medValue("Inhaled Corticosteroid", "Inhaled Corticosteroid: [MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 5)
-    inhaledCorticosteriodTreatmeantsAbs = abstractValue("INHALED_CORTICOSTERIOD_TREATMENTS", "Inhaled Corticosteriod Treatmeants '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 6)
-    respiratoryTreatmentMedicationMed = medValue("Respiratory Treatment Medication", "Respiratory Treatment Medication: [MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 8)
-    respiratoryTreatmentMedicationAbs = abstractValue("RESPIRATORY_TREATMENT_MEDICATION", "Respiratory Treatment Medication '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 9)
+    evidence.define("bronchodilatorMed", medValue, "Bronchodilator", "Bronchodilator: [MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 3)
+    evidence.define("inhaledCorticosteriodMed", medValue, "Inhaled Corticosteroid", "Inhaled Corticosteroid: [MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 5)
+    evidence.define("inhaledCorticosteriodTreatmeantsAbs", abstractValue, "INHALED_CORTICOSTERIOD_TREATMENTS", "Inhaled Corticosteriod Treatmeants '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 6)
+    evidence.define("respiratoryTreatmentMedicationMed", medValue, "Respiratory Treatment Medication", "Respiratory Treatment Medication: [MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 8)
+    evidence.define("respiratoryTreatmentMedicationAbs", abstractValue, "RESPIRATORY_TREATMENT_MEDICATION", "Respiratory Treatment Medication '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 9)
     #Oxygen
-    highFlowNasalCodes = multiCodeValue(["5A0935A", "5A0945A", "5A0955A"], "High Flow Nasal Oxygen: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 2)
-    invasiveMechVentCodes = multiCodeValue(["5A1935Z", "5A1945Z", "5A1955Z"], "Invasive Mechanical Ventilation: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 3)
-    nonInvasiveVentAbs = abstractValue("NON_INVASIVE_VENTILATION", "Non-Invasive Ventilation '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 4)
-    oxygenFlowRateDV = dvValue(dvOxygenFlowRate, "Oxygen Flow Rate: [VALUE] (Result Date: [RESULTDATETIME])", calcOxygenFlowRate1, 6)
-    oxygenTherapyAbs = abstractValue("OXYGEN_THERAPY", "Oxygen Therapy '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 8)
+    evidence.define("highFlowNasalCodes", multiCodeValue, ["5A0935A", "5A0945A", "5A0955A"], "High Flow Nasal Oxygen: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 2)
+    evidence.define("invasiveMechVentCodes", multiCodeValue, ["5A1935Z", "5A1945Z", "5A1955Z"], "Invasive Mechanical Ventilation: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 3)
+    evidence.define("nonInvasiveVentAbs", abstractValue, "NON_INVASIVE_VENTILATION", "Non-Invasive Ventilation '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 4)
+    evidence.define("oxygenFlowRateDV", dvValue, dvOxygenFlowRate, "Oxygen Flow Rate: [VALUE] (Result Date: [RESULTDATETIME])", calcOxygenFlowRate1, 6)
+    evidence.define("oxygenTherapyAbs", abstractValue, "OXYGEN_THERAPY", "Oxygen Therapy '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 8)
     #Vitals
-    r0902Code = codeValue("R09.02", "Hypoxemia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 2)
-    lowPaO2DV = dvValue(dvPaO2, "pa02: [VALUE] (Result Date: [RESULTDATETIME])", calcPAO21, 3)
-    lowPulseOximetryDV = dvValue(dvSPO2, "Sp02: [VALUE] (Result Date: [RESULTDATETIME])", calcSPO21, 4)
-    highRespiratoryRateDV = dvValue(dvRespiratoryRate, "Respiratory Rate: [VALUE] (Result Date: [RESULTDATETIME])", calcRespiratoryRate1, 5)
+    evidence.define("r0902Code", codeValue, "R09.02", "Hypoxemia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 2)
+    evidence.define("lowPaO2DV", dvValue, dvPaO2, "pa02: [VALUE] (Result Date: [RESULTDATETIME])", calcPAO21, 3)
+    evidence.define("lowPulseOximetryDV", dvValue, dvSPO2, "Sp02: [VALUE] (Result Date: [RESULTDATETIME])", calcSPO21, 4)
+    evidence.define("highRespiratoryRateDV", dvValue, dvRespiratoryRate, "Respiratory Rate: [VALUE] (Result Date: [RESULTDATETIME])", calcRespiratoryRate1, 5)
     #Calculated Po2/Fio2
-    z9981Code = codeValue("Z99.81", "Dependence On Supplemental Oxygen: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("z9981Code", codeValue, "Z99.81", "Dependence On Supplemental Oxygen: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
     pao2Calc = None
     sp02pao2Dvs = None
-    if z9981Code is None:
-        pao2Calc = pao2fio2Calculation(dict(maindiscreteDic), dvPa02Fi02, dvSPO2, dvPaO2, dvOxygenFlowRate, dvOxygenTherapy, dvFIO2, dvRespiratoryRate, calcPa02Fi021, 2)
+    if evidence.z9981Code is None:
+        pao2Calc = pao2fio2Calculation(maindiscreteDic, dvPa02Fi02, dvSPO2, dvPaO2, dvOxygenFlowRate, dvOxygenTherapy, dvFIO2, dvRespiratoryRate, calcPa02Fi021, 2)
     if pao2Calc is None:
-        sp02pao2Dvs = sp02pa02Lookup(dict(maindiscreteDic), dvSPO2, dvPaO2, dvOxygenTherapy, dvRespiratoryRate)
+        sp02pao2Dvs = sp02pa02Lookup(maindiscreteDic, dvSPO2, dvPaO2, dvOxygenTherapy, dvRespiratoryRate)
 
     #Copd Exacerbation Treatment Medication
-    if respiratoryTreatmentMedicationAbs is not None: meds.Links.Add(respiratoryTreatmentMedicationAbs); RTMA += 1
-    if inhaledCorticosteriodTreatmeantsAbs is not None: RTMA += 1
-    if respiratoryTreatmentMedicationMed is not None: RTMA += 1
-    if bronchodilatorMed is not None: RTMA += 1
-    if inhaledCorticosteriodMed is not None: RTMA += 1
+    if evidence.respiratoryTreatmentMedicationAbs is not None: meds.Links.Add(evidence.respiratoryTreatmentMedicationAbs); RTMA += 1
+    if evidence.inhaledCorticosteriodTreatmeantsAbs is not None: RTMA += 1
+    if evidence.respiratoryTreatmentMedicationMed is not None: RTMA += 1
+    if evidence.bronchodilatorMed is not None: RTMA += 1
+    if evidence.inhaledCorticosteriodMed is not None: RTMA += 1
     #Signs of Low Oxygen
     if pao2Calc is not None: SLO += 1
-    if lowPaO2DV is not None: labs.Links.Add(lowPaO2DV); SLO += 1
-    if r0902Code is not None: vitals.Links.Add(r0902Code); SLO += 1
-    if lowPulseOximetryDV is not None: vitals.Links.Add(lowPulseOximetryDV); SLO += 1
+    if evidence.lowPaO2DV is not None: labs.Links.Add(evidence.lowPaO2DV); SLO += 1
+    if evidence.r0902Code is not None: vitals.Links.Add(evidence.r0902Code); SLO += 1
+    if evidence.lowPulseOximetryDV is not None: vitals.Links.Add(evidence.lowPulseOximetryDV); SLO += 1
     #Signs of Resp Distress
-    if wheezingAbs is not None: abs.Links.Add(wheezingAbs); SRD += 1
-    if useOfAccessoryMusclesAbs is not None: abs.Links.Add(useOfAccessoryMusclesAbs); SRD += 1
-    if shortnessOfBreathAbs is not None: abs.Links.Add(shortnessOfBreathAbs); SRD += 1
-    if r0603Code is not None: abs.Links.Add(r0603Code); SRD += 1
-    if highRespiratoryRateDV is not None: vitals.Links.Add(highRespiratoryRateDV); SRD += 1
-    if j9801Code is not None: abs.Links.Add(j9801Code); SRD += 1
+    if evidence.wheezingAbs is not None: abs.Links.Add(evidence.wheezingAbs); SRD += 1
+    if evidence.useOfAccessoryMusclesAbs is not None: abs.Links.Add(evidence.useOfAccessoryMusclesAbs); SRD += 1
+    if evidence.shortnessOfBreathAbs is not None: abs.Links.Add(evidence.shortnessOfBreathAbs); SRD += 1
+    if evidence.r0603Code is not None: abs.Links.Add(evidence.r0603Code); SRD += 1
+    if evidence.highRespiratoryRateDV is not None: vitals.Links.Add(evidence.highRespiratoryRateDV); SRD += 1
+    if evidence.j9801Code is not None: abs.Links.Add(evidence.j9801Code); SRD += 1
     #Oxygen Delievery Check
-    if highFlowNasalCodes is not None: ODC += 1
-    if invasiveMechVentCodes is not None: ODC += 1
-    if nonInvasiveVentAbs is not None: ODC += 1
-    if oxygenFlowRateDV is not None: ODC += 1
-    if oxygenTherapyAbs is not None: ODC += 1
+    if evidence.highFlowNasalCodes is not None: ODC += 1
+    if evidence.invasiveMechVentCodes is not None: ODC += 1
+    if evidence.nonInvasiveVentAbs is not None: ODC += 1
+    if evidence.oxygenFlowRateDV is not None: ODC += 1
+    if evidence.oxygenTherapyAbs is not None: ODC += 1
     
-    db.LogEvaluationScriptMessage("Clinical Counts: RTMA " + str(RTMA) + ", SLO " + str(SLO) + ", SRD " + str(SRD) + ", ODC " + str(ODC) + " " + str(account._id), scriptName, scriptInstance, "Debug")
+    scriptLog.debug("Clinical Counts: RTMA %s, SLO %s, SRD %s, ODC %s %s", RTMA, SLO, SRD, ODC, account._id)
 
     #Starting Main Algorithm
-    if subtitle == "Possible Chronic Obstructive Pulmonary Disease with Acute Lower Respiratory Infection" and j440Code is not None:
-        if j440Code is not None: updateLinkText(j440Code, autoCodeText); dc.Links.Add(j440Code)
+    if subtitle == "Possible Chronic Obstructive Pulmonary Disease with Acute Lower Respiratory Infection" and evidence.j440Code is not None:
+        if evidence.j440Code is not None: updateLinkText(evidence.j440Code, autoCodeText); dc.Links.Add(evidence.j440Code)
         result.Outcome = "AUTORESOLVED"
         result.Reason = "Autoresolved due to one Specified Code on the Account"
         result.Validated = True
         AlertConditions = True
         
     elif (
-        j449Code is not None and
-        (j20Codes is not None or
-        j22Codes is not None or
-        pneumoniaJ12 is not None or
-        pneumoniaJ13 is not None or
-        pneumoniaJ14 is not None or
-        pneumoniaJ15 is not None or
-        pneumoniaJ16 is not None or
-        pneumoniaJ17 is not None or
-        pneumoniaJ18 is not None or 
-        j21Codes is not None) and
-        j440Code is None
+        evidence.j449Code is not None and
+        (evidence.j20Codes is not None or
+        evidence.j22Codes is not None or
+        evidence.pneumoniaJ12 is not None or
+        evidence.pneumoniaJ13 is not None or
+        evidence.pneumoniaJ14 is not None or
+        evidence.pneumoniaJ15 is not None or
+        evidence.pneumoniaJ16 is not None or
+        evidence.pneumoniaJ17 is not None or
+        evidence.pneumoniaJ18 is not None or 
+        evidence.j21Codes is not None) and
+        evidence.j440Code is None
         ):
         result.Subtitle = "Possible Chronic Obstructive Pulmonary Disease with Acute Lower Respiratory Infection"
         AlertPassed = True
-        dc.Links.Add(j449Code)
-        if j20Codes is not None: dc.Links.Add(j20Codes)
-        if j22Codes is not None: dc.Links.Add(j22Codes)
-        if j21Codes is not None: dc.Links.Add(j21Codes)
-        if pneumoniaJ12 is not None: dc.Links.Add(pneumoniaJ12)
-        if pneumoniaJ13 is not None: dc.Links.Add(pneumoniaJ13)
-        if pneumoniaJ14 is not None: dc.Links.Add(pneumoniaJ14)
-        if pneumoniaJ15 is not None: dc.Links.Add(pneumoniaJ15)
-        if pneumoniaJ16 is not None: dc.Links.Add(pneumoniaJ16)
-        if pneumoniaJ17 is not None: dc.Links.Add(pneumoniaJ17)
-        if pneumoniaJ18 is not None: dc.Links.Add(pneumoniaJ18)
-        if respiratoryTuberculosis is not None: dc.Links.Add(respiratoryTuberculosis)
+        dc.Links.Add(evidence.j449Code)
+        if evidence.j20Codes is not None: dc.Links.Add(evidence.j20Codes)
+        if evidence.j22Codes is not None: dc.Links.Add(evidence.j22Codes)
+        if evidence.j21Codes is not None: dc.Links.Add(evidence.j21Codes)
+        if evidence.pneumoniaJ12 is not None: dc.Links.Add(evidence.pneumoniaJ12)
+        if evidence.pneumoniaJ13 is not None: dc.Links.Add(evidence.pneumoniaJ13)
+        if evidence.pneumoniaJ14 is not None: dc.Links.Add(evidence.pneumoniaJ14)
+        if evidence.pneumoniaJ15 is not None: dc.Links.Add(evidence.pneumoniaJ15)
+        if evidence.pneumoniaJ16 is not None: dc.Links.Add(evidence.pneumoniaJ16)
+        if evidence.pneumoniaJ17 is not None: dc.Links.Add(evidence.pneumoniaJ17)
+        if evidence.pneumoniaJ18 is not None: dc.Links.Add(evidence.pneumoniaJ18)
+        if evidence.respiratoryTuberculosis is not None: dc.Links.Add(evidence.respiratoryTuberculosis)
     
-    elif subtitle == "Possible Chronic Obstructive Pulmonary Disease with Acute Exacerbation" and j441Code is not None:
-        if j441Code is not None: updateLinkText(j441Code, autoCodeText); dc.Links.Add(j441Code)
+    elif subtitle == "Possible Chronic Obstructive Pulmonary Disease with Acute Exacerbation" and evidence.j441Code is not None:
+        if evidence.j441Code is not None: updateLinkText(evidence.j441Code, autoCodeText); dc.Links.Add(evidence.j441Code)
         result.Outcome = "AUTORESOLVED"
         result.Reason = "Autoresolved due to one Specified Code on the Account"
         result.Validated = True
         AlertConditions = True
     
     elif (
-        j449Code is not None and
-        RespiratoryCodeCheck is not None and
-        opioidOverdoseAbs is None and
-        j441Code is None and
-        pulmonaryEmbolismNeg is None and
-        j810Code is None and
-        sepsis40Neg is None and
-        sepsis41Neg is None and
-        sepsisNeg is None and
-        f410Code is None and
-        pneumonthroaxNeg is None and
-        HeartFailureCodeCheck is None and
-        acuteMINeg is None and
-        copdWithoutExacerbationAbs is None and
-        (bronchodilatorMed is not None or
-        respiratoryTreatmentMedicationMed is not None or
-        respiratoryTreatmentMedicationAbs is not None or
-        inhaledCorticosteriodMed is not None or
-        inhaledCorticosteriodTreatmeantsAbs is not None)
+        evidence.j449Code is not None and
+        evidence.RespiratoryCodeCheck is not None and
+        evidence.opioidOverdoseAbs is None and
+        evidence.j441Code is None and
+        evidence.pulmonaryEmbolismNeg is None and
+        evidence.j810Code is None and
+        evidence.sepsis40Neg is None and
+        evidence.sepsis41Neg is None and
+        evidence.sepsisNeg is None and
+        evidence.f410Code is None and
+        evidence.pneumonthroaxNeg is None and
+        evidence.HeartFailureCodeCheck is None and
+        evidence.acuteMINeg is None and
+        evidence.copdWithoutExacerbationAbs is None and
+        (evidence.bronchodilatorMed is not None or
+        evidence.respiratoryTreatmentMedicationMed is not None or
+        evidence.respiratoryTreatmentMedicationAbs is not None or
+        evidence.inhaledCorticosteriodMed is not None or
+        evidence.inhaledCorticosteriodTreatmeantsAbs is not None)
         ):
         result.Subtitle = "Possible Chronic Obstructive Pulmonary Disease with Acute Exacerbation"
         AlertPassed = True
-        dc.Links.Add(j449Code)
-        dc.Links.Add(RespiratoryCodeCheck)    
+        dc.Links.Add(evidence.j449Code)
+        dc.Links.Add(evidence.RespiratoryCodeCheck)    
     
     elif (
-        j449Code is not None and
+        evidence.j449Code is not None and
         SLO > 0 and
         SRD > 0 and
         RTMA > 0 and
         ODC > 0 and
-        opioidOverdoseAbs is None and
-        pulmonaryEmbolismNeg is None and
-        j810Code is None and
-        sepsis40Neg is None and
-        sepsis41Neg is None and
-        sepsisNeg is None and
-        f410Code is None and
-        pneumonthroaxNeg is None and
-        HeartFailureCodeCheck is None and
-        acuteMINeg is None and
-        copdWithoutExacerbationAbs is None and
-        j441Code is None
+        evidence.opioidOverdoseAbs is None and
+        evidence.pulmonaryEmbolismNeg is None and
+        evidence.j810Code is None and
+        evidence.sepsis40Neg is None and
+        evidence.sepsis41Neg is None and
+        evidence.sepsisNeg is None and
+        evidence.f410Code is None and
+        evidence.pneumonthroaxNeg is None and
+        evidence.HeartFailureCodeCheck is None and
+        evidence.acuteMINeg is None and
+        evidence.copdWithoutExacerbationAbs is None and
+        evidence.j441Code is None
     ):
         result.Subtitle = "Possible Chronic Obstructive Pulmonary Disease with Acute Exacerbation"
         AlertPassed = True
-        dc.Links.Add(j449Code)
+        dc.Links.Add(evidence.j449Code)
         
     elif subtitle == "COPD with Acute Exacerbation Possibly Lacking Supporting Evidence" and SLO > 0 and SRD > 0 and RTMA > 0:
         if message1 and SLO > 0:
@@ -1018,7 +772,7 @@ if validated is False:
         AlertPassed = True
         
     elif (
-        j441Code is not None and
+        evidence.j441Code is not None and
         SLO == 0 and
         SRD == 0 and
         RTMA > 0
@@ -1033,20 +787,20 @@ if validated is False:
         AlertPassed = True
 
     else:
-        db.LogEvaluationScriptMessage("Not enough data to warrent alert, Alert Failed. " + str(account._id), scriptName, scriptInstance, "Debug")
+        scriptLog.debug("Not enough data to warrent alert, Alert Failed. %s", account._id)
         result.Passed = False
 
 else:
-    db.LogEvaluationScriptMessage("Alert Closed; Exiting script run. Outcome: " + str(outcome) + " " + str(account._id), scriptName, scriptInstance, "Debug")
+    scriptLog.debug("Alert Closed; Exiting script run. Outcome: %s %s", outcome, account._id)
 
 #If an alert triggered abstract the following
 if AlertPassed:
     #Abs
     abstractValue("ABNORMAL_SPUTUM", "Abnormal Sputum '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 1, abs, True)
     #2
-    dvBreathCheck(dict(maindiscreteDic), dvBreathSounds, "Breath Sounds '[VALUE]' (Result Date: [RESULTDATETIME])", 3, abs, True)
+    dvBreathCheck(maindiscreteDic, dvBreathSounds, "Breath Sounds '[VALUE]' (Result Date: [RESULTDATETIME])", 3, abs, True)
     multiCodeValue(["J96.01", "J96.2", "J96.21", "J96.22"], "Acute Respiratory Failure: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 4, abs, True)
-    if j9801Code is not None: abs.Links.Add(j9801Code) #5
+    if evidence.j9801Code is not None: abs.Links.Add(evidence.j9801Code) #5
     abstractValue("BRONCHOSPASM", "Bronchospasm '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 9, abs, True)
     codeValue("R05.9", "Cough: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 6, abs, True)
     codeValue("U07.1", "Covid-19: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 7, abs, True)
@@ -1055,7 +809,7 @@ if AlertPassed:
     abstractValue("BACTERIAL_PNEUMONIA_ORGANISM", "Possible Bacterial Pneumonia Organism '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 10, abs, True)
     abstractValue("FUNGAL_PNEUMONIA_ORGANISM", "Possible Fungal Pneumonia Organism '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 11, abs, True)
     abstractValue("VIRAL_PNEUMONIA_ORGANISM", "Possible Viral Pneumonia Organism '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 12, abs, True)
-    dvRespPatCheck(dict(maindiscreteDic), dvRespiratoryPattern, "Respiratory Pattern '[VALUE]' (Result Date: [RESULTDATETIME])", 13, abs, True)
+    dvRespPatCheck(maindiscreteDic, dvRespiratoryPattern, "Respiratory Pattern '[VALUE]' (Result Date: [RESULTDATETIME])", 13, abs, True)
     #14-17
     #Document Links
     documentLink("Chest  3 View", "Chest  3 View", 0, chestXRayLinks, True)
@@ -1064,37 +818,37 @@ if AlertPassed:
     documentLink("Chest PA and Lateral", "Chest PA and Lateral", 0, chestXRayLinks, True)
     documentLink("Chest  1 View", "Chest  1 View", 0, chestXRayLinks, True)
     #Labs
-    dvPositiveCheck(dict(maindiscreteDic), dvSARSCOVID, "Covid 19 Screen: '[VALUE]' (Result Date: [RESULTDATETIME])", 2, labs, True)
-    dvPositiveCheck(dict(maindiscreteDic), dvSARSCOVIDAntigen, "Covid 19 Screen: '[VALUE]' (Result Date: [RESULTDATETIME])", 3, labs, True)
-    dvBloodCheck(dict(maindiscreteDic), dvInfluenzeScreenA, "Influenza A Screen: '[VALUE]' (Result Date: [RESULTDATETIME])", 4, labs, True)
-    dvBloodCheck(dict(maindiscreteDic), dvInfluenzeScreenB, "Influenza B Screen: '[VALUE]' (Result Date: [RESULTDATETIME])", 5, labs, True)
-    dvmrsaCheck(dict(maindiscreteDic), dvMRSASCreen, "Final Report", "MRSA Screen: '[VALUE]' (Result Date: [RESULTDATETIME])", 6, labs, True)
-    dvPositiveCheck(dict(maindiscreteDic), dvPleuralFluidCulture, "Positive Pleural Fluid Culture: '[VALUE]' (Result Date: [RESULTDATETIME])", 7)
+    dvPositiveCheck(maindiscreteDic, dvSARSCOVID, "Covid 19 Screen: '[VALUE]' (Result Date: [RESULTDATETIME])", 2, labs, True)
+    dvPositiveCheck(maindiscreteDic, dvSARSCOVIDAntigen, "Covid 19 Screen: '[VALUE]' (Result Date: [RESULTDATETIME])", 3, labs, True)
+    dvBloodCheck(maindiscreteDic, dvInfluenzeScreenA, "Influenza A Screen: '[VALUE]' (Result Date: [RESULTDATETIME])", 4, labs, True)
+    dvBloodCheck(maindiscreteDic, dvInfluenzeScreenB, "Influenza B Screen: '[VALUE]' (Result Date: [RESULTDATETIME])", 5, labs, True)
+    dvmrsaCheck(maindiscreteDic, dvMRSASCreen, "Final Report", "MRSA Screen: '[VALUE]' (Result Date: [RESULTDATETIME])", 6, labs, True)
+    dvPositiveCheck(maindiscreteDic, dvPleuralFluidCulture, "Positive Pleural Fluid Culture: '[VALUE]' (Result Date: [RESULTDATETIME])", 7)
     abstractValue("POSITIVE_SPUTUM_CULTURE", "Positive Sputum Culture '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 8, labs, True)
-    dvPositiveCheck(dict(maindiscreteDic), dvPneumococcalAntigen, "Strept Pneumonia Screen: '[VALUE]' (Result Date: [RESULTDATETIME])", 9, labs, True)
+    dvPositiveCheck(maindiscreteDic, dvPneumococcalAntigen, "Strept Pneumonia Screen: '[VALUE]' (Result Date: [RESULTDATETIME])", 9, labs, True)
     #Meds
     medValue("Antibiotic", "Antibiotic: [MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 1, meds, True)
     abstractValue("ANTIBIOTIC", "Antibiotic '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 2, meds, True)
-    if bronchodilatorMed is not None: meds.Links.Add(bronchodilatorMed) #3
+    if evidence.bronchodilatorMed is not None: meds.Links.Add(evidence.bronchodilatorMed) #3
     medValue("Dexamethasone", "Dexamethasone: [MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 4, meds, True)
-    if inhaledCorticosteriodMed is not None: meds.Links.Add(inhaledCorticosteriodMed) #5
-    if inhaledCorticosteriodTreatmeantsAbs is not None: meds.Links.Add(inhaledCorticosteriodTreatmeantsAbs) #6
+    if evidence.inhaledCorticosteriodMed is not None: meds.Links.Add(evidence.inhaledCorticosteriodMed) #5
+    if evidence.inhaledCorticosteriodTreatmeantsAbs is not None: meds.Links.Add(evidence.inhaledCorticosteriodTreatmeantsAbs) #6
     medValue("Methylprednisolone", "Methylprednisolone: [MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 7, meds, True)
-    if respiratoryTreatmentMedicationAbs is not None: meds.Links.Add(respiratoryTreatmentMedicationAbs) #8
-    if respiratoryTreatmentMedicationMed is not None: meds.Links.Add(respiratoryTreatmentMedicationMed) #9
+    if evidence.respiratoryTreatmentMedicationAbs is not None: meds.Links.Add(evidence.respiratoryTreatmentMedicationAbs) #8
+    if evidence.respiratoryTreatmentMedicationMed is not None: meds.Links.Add(evidence.respiratoryTreatmentMedicationMed) #9
     #10
     medValue("Steroid", "Steroid: [MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 11, meds, True)
     abstractValue("STEROIDS", "Steroid '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 12, meds, True)
     medValue("Vasodilator", "Vasodilator: [MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 13, meds, True)
     #Oxygen
     codeValue("Z99.81", "Dependence On Supplemental Oxygen: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 1, oxygen, True)
-    if z9981Code is not None: oxygen.Links.Add(z9981Code) #2
-    if highFlowNasalCodes is not None: oxygen.Links.Add(highFlowNasalCodes) #3
-    if invasiveMechVentCodes is not None: oxygen.Links.Add(invasiveMechVentCodes) #4
-    if nonInvasiveVentAbs is not None: oxygen.Links.Add(nonInvasiveVentAbs) #5
-    if oxygenFlowRateDV is not None: oxygen.Links.Add(oxygenFlowRateDV) #6
-    dvOxygenCheck(dict(maindiscreteDic), dvOxygenTherapy, "Oxygen Therapy '[VALUE]' (Result Date: [RESULTDATETIME])", 7, oxygen, True)
-    if oxygenTherapyAbs is not None: oxygen.Links.Add(oxygenTherapyAbs) #8
+    if evidence.z9981Code is not None: oxygen.Links.Add(evidence.z9981Code) #2
+    if evidence.highFlowNasalCodes is not None: oxygen.Links.Add(evidence.highFlowNasalCodes) #3
+    if evidence.invasiveMechVentCodes is not None: oxygen.Links.Add(evidence.invasiveMechVentCodes) #4
+    if evidence.nonInvasiveVentAbs is not None: oxygen.Links.Add(evidence.nonInvasiveVentAbs) #5
+    if evidence.oxygenFlowRateDV is not None: oxygen.Links.Add(evidence.oxygenFlowRateDV) #6
+    dvOxygenCheck(maindiscreteDic, dvOxygenTherapy, "Oxygen Therapy '[VALUE]' (Result Date: [RESULTDATETIME])", 7, oxygen, True)
+    if evidence.oxygenTherapyAbs is not None: oxygen.Links.Add(evidence.oxygenTherapyAbs) #8
     #Vitals
     dvValue(dvHeartRate, "HR: [VALUE] (Result Date: [RESULTDATETIME])", calcHeartRate1, 1, vitals, True)
     #2-5
@@ -1136,7 +890,10 @@ if AlertPassed or AlertConditions:
     if labs.Links: result.Links.Add(labs); labsLinks = True
     if chestXRayLinks.Links: result.Links.Add(chestXRayLinks); docLinksLinks = True
     result.Links.Add(other)
-    db.LogEvaluationScriptMessage("Alert Passed Adding Links. Alert Triggered: " + str(result.Subtitle) + " Autoresolved: " + str(result.Outcome) + "; " +
-        str(result.Validated) + "; Links: Documentation Includes- " + str(dcLinks) + ", Abs- " + str(absLinks) + ", labs- " + str(labsLinks) + ", vitals- " + str(vitalsLinks) +
-        ", meds- " + str(medsLinks) + ", oxygen- " + str(oxygenLinks) + ", docs- " + str(docLinksLinks) + ", calcp02Fio2- " + str(calcpo2fio2Links) + "; Acct: " + str(account._id), scriptName, scriptInstance, "Debug")
+    scriptLog.debug("Alert Passed Adding Links. Alert Triggered: %s Autoresolved: %s; %s; Links: Documentation Includes- %s, Abs- %s, labs- %s, vitals- %s, meds- %s, oxygen- %s, docs- %s, calcp02Fio2- %s; Acct: %s",
+        result.Subtitle, result.Outcome, result.Validated, dcLinks, absLinks, labsLinks, vitalsLinks, medsLinks, oxygenLinks, docLinksLinks,
+        calcpo2fio2Links, account._id)
     result.Passed = True
+
+#Write out this run's script messages
+scriptLog.flush()
@@ -28,6 +28,7 @@ from System.Data import *
 from System.Configuration import *
 from System.Collections.Generic import *
 clr.ImportExtensions(System.Linq)
+from cdi import Evidence, evaluation_context
 from operator import le, ge, gt, lt
 
 #========================================
@@ -63,14 +64,20 @@ autoEvidenceText = "Autoresolved Evidence - "
 #  Globals
 #========================================
 db = CACDataRepository()
+#Account data is loaded once and shared by every script run for the account,
+#fetching only the discrete values of the last 7 days
+context = evaluation_context(account, db, System.DateTime.Now.AddDays(-7))
+#Script messages are only formatted when their level is enabled, and are written
+#together at the end of the run
+scriptLog = context.log(db, scriptName, scriptInstance)
 admitDate = account.AdmitDateTime.Date
 birthDate = account.Patient.BirthDate.Date
 gender = account.Patient.Gender
 #Update true = External DV collection False = On Acct Record
-accountContainer = AccountWorkflowContainer(account, True, "Category", 7)
+accountContainer = context.container(AccountWorkflowContainer, True, "Category", 7)
 useSeperateDiscreteCollection = True
 if useSeperateDiscreteCollection == True:
-    discreteValues = db.GetDiscreteValues(account._id)
+    discreteValues = context.discrete_values
 else:
     discreteValues = db.GetAccountField(account._id, "DiscreteValues")
 
@@ -91,215 +98,13 @@ calcRespiratoryRate1 = lambda x: x < 12
 #========================================
 #  Functions
 #========================================
-def datetimeFromUtcToLocal(utc_datetime):
-    if utc_datetime:
-        convertedDate = DateTime.SpecifyKind(utc_datetime, DateTimeKind.Utc)
-        return  convertedDate.ToLocalTime()
-    else:
-        return None
-
-def cleanNumbers(result):
-    result1 = re.sub("[\\<\\>]", "", str(result))
-    if result1.count('.') <= 1 and result1.replace(".", "").isnumeric():
-        return result1
-    else:
-        return None
-
-def dataConversion(datetime, linkText, Result, id, category, sequence, abstract=True, gender=None):
-    if datetime is not None:
-        date_time = datetimeFromUtcToLocal(datetime)
-        date_time = date_time.ToString("MM/dd/yyyy, HH:mm")
-        linkText = linkText.replace("[RESULTDATETIME]", date_time)
-    else: 
-        linkText = linkText.replace("(Result Date: [RESULTDATETIME])", "")
-    if Result is not None:
-        linkText = linkText.replace("[VALUE]", Result)
-    else: linkText = linkText.replace("[VALUE]", "")
-    if gender: linkText = linkText.replace("[GENDER]", gender)
-    else: linkText = linkText.replace("[GENDER]", "")
-    if abstract == True:
-        category.Links.Add(MatchedCriteriaLink(linkText, None, None, id, True, None, None, sequence))
-    elif abstract == False:
-        abstraction = MatchedCriteriaLink(linkText, None, None, id, True, None, None, sequence)
-        return abstraction
-    return
-
-def CodeCount(codes):
-    # Get list of codes on the acct based on CodeDic
-    result = set()
-    for document in account.Documents or []:
-        for codeReference in document.CodeReferences or []:
-            if codeReference.Code in codes:
-                matching_code = codeReference.Code
-                result.add(matching_code)
-    return list(result)
-
-def abstractValue(abstraction_name, link_text, calculation, sequence=0, category=None, abstract=False):
-    # Find abstraction and if abstract is true abstract it to the provided category
-    abstraction = accountContainer.GetFirstLinkMatchingAbstractionValue(abstraction_name, link_text, lambda x: calculation)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def dvValue(dv_name, link_text, calculation, sequence=0, category=None, abstract=False):
-    # Find Discrete Value and if abstract is true abstract it to the provided category
-    for dv in dv_name:
-        abstraction = accountContainer.GetFirstLinkMatchingDiscreteValue(dv, link_text, calculation)
-        if abstraction is not None:
-            break
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def dvValueMulti(dvDic, DV1, linkText, value, sign, sequence=0, category=None, abstract=False, needed=2):
-    # Find Discrete Value and if abstract is true abstract it to the provided category
-    matchedList = []
-    x = 0
-    for dv in dvDic or []:
-        dvr = cleanNumbers(dvDic[dv]['Result'])
-        if dvDic[dv]['Name'] in DV1 and dvr is not None and sign(float(dvr), float(value)):
-            matchedList.append(dataConversion(dvDic[dv]['ResultDate'], linkText, dvDic[dv]['Result'], dvDic[dv]['UniqueId'] or dvDic[dv]['_id'], category, sequence, abstract))
-            x += 1
-            if needed <= x:
-                break
-    if abstract and x > 0:
-        return True
-    elif abstract is False and len(matchedList) > 0 and needed > 0:
-        return matchedList
-    else:
-        return None
-
-def compareValuesMulti(dvDic, DV1, value, value1, linkText, sign, sign1, sequence=0, category=None, abstract=False, needed=2):
-    matchedList = []
-    x = 0
-    for dv in dvDic or []:
-        dvr = cleanNumbers(dvDic[dv]['Result'])
-        if dvDic[dv]['Name'] in DV1 and dvr is not None and sign(float(value), float(dvr)) and sign1(float(dvr), float(value1)):
-            matchedList.append(dataConversion(dvDic[dv]['ResultDate'], linkText, dvDic[dv]['Result'], dvDic[dv]['UniqueId'] or dvDic[dv]['_id'], category, sequence, abstract))
-            x += 1
-            if needed <= x:
-                break
-    if abstract and x > 0:
-        return True
-    elif abstract is False and len(matchedList) > 0 and needed > 0:
-        return matchedList
-    else:
-        return None
-
-def codeValue(code_name, link_text, sequence=0, category=None, abstract=False):
-    # Find code and if abstract is true abstract it to the provided category
-    abstraction = accountContainer.GetFirstCodeLink(code_name, link_text)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def multiCodeValue(code_list, link_text, sequence=0, category=None, abstract=False):
-    # Go through Code List and find first code and if abstract is true abstract it to the provided category
-    abstraction = None
-    for code in code_list:
-        abstraction = accountContainer.GetFirstCodeLink(code, link_text)
-        if abstraction is not None:
-            abstraction.Sequence = sequence
-            if abstract:
-                category.Links.Add(abstraction)
-                return True
-            else:
-                return abstraction
-    if abstract and abstraction is None:
-        return False
-    return abstraction
-
-def prefixCodeValue(prefix, link_text, sequence=0, category=None, abstract=False):
-    # Use prefix to find first code match based on regex search and if abstract is true abstract it to the provided category
-    abstraction = None
-    validCodes = [codes for codes in accountContainer.CodeKeys if re.match(prefix, codes) is not None]
-    for code in validCodes:
-        abstraction = accountContainer.GetFirstCodeLink(code, link_text)
-        if abstraction is not None:
-            abstraction.Sequence = sequence
-            if abstract:
-                category.Links.Add(abstraction)
-                return True
-            else:
-                return abstraction
-    if abstract and abstraction is None:
-        return False
-    return abstraction
-
-def medValue(med_name, link_text, sequence=0, category=None, abstract=False):
-    # Find Medication Value and if abstract is true abstract it to the provided category
-    abstraction = accountContainer.GetFirstMedicationLink(med_name, link_text)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def updateLinkText(value, replacement_text):
-    # Update the link text with the provided text
-    value.LinkText = replacement_text + value.LinkText
-    return value
-
-def documentLink(DocumentType, LinkText, sequence, category, abstract):
-    # Finds a document link and adds it as link so that its a quick reference for the cdi user.
-    abstraction = None
-    abstraction = accountContainer.GetFirstDocumentLink(DocumentType, LinkText)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    return None
+#The helpers every script shares are compiled once per process and bound to this
+#script's globals, see cdi.helpers; a helper defined below replaces the shared one
+context.bind_helpers(globals(), 1)
 
 #========================================
 #  Script Specific Functions
 #========================================
-def medDataConversion(datetime, linkText, med, id, dosage, route, category, sequence, abstract=True):
-    date_time = datetimeFromUtcToLocal(datetime)
-    date_time = date_time.ToString("MM/dd/yyyy, HH:mm")
-    linkText = linkText.replace("[STARTDATE]", date_time)
-    linkText = linkText.replace("[MEDICATION]", med)
-    linkText = linkText.replace("[DOSAGE]", dosage)
-    if route is not None: linkText = linkText.replace("[ROUTE]", route)
-    else: linkText = linkText.replace(", Route [ROUTE]", "")
-    if abstract == True:
-        abstraction = MatchedCriteriaLink(linkText, None, None, None, True, None, None, sequence)
-        abstraction.MedicationId = id
-        category.Links.Add(abstraction)
-    elif abstract == False:
-        abstraction = MatchedCriteriaLink(linkText, None, None, None, True, None, None, sequence)
-        abstraction.MedicationId = id
-        return abstraction
-    return
-
 def documentDataConversion(DocumentType, id, sequence, category, abstract):
     if abstract == True:
         category.Links.Add(MatchedCriteriaLink(DocumentType, id,None, None, True, None, None, sequence))
@@ -360,16 +165,15 @@ def aerosolMedValue(medDic, med_name, link_text, sequence=0, category=None, abst
 #========================================
 #  Algorithm
 #========================================
-db.LogEvaluationScriptMessage("Script starting " + str(account._id), scriptName, scriptInstance, "Debug")
+scriptLog.debug("Script starting %s", account._id)
 #Determine if if and how many fully spec codes are on the acct
 edmaCodes = []
 edmaCodes = edmaCodeDic.keys()
-edmaCodeList = CodeCount(edmaCodes)
-edmaCodesExist = len(edmaCodeList)
-str1 = ', '.join([str(elem) for elem in edmaCodeList])
 compressionCodes = []
 compressionCodes = compressionCodeDic.keys()
-compressionCodeList = CodeCount(compressionCodes)
+edmaCodeList, compressionCodeList = CodeCounts(edmaCodes, compressionCodes)
+edmaCodesExist = len(edmaCodeList)
+str1 = ', '.join([str(elem) for elem in edmaCodeList])
 compressionCodesExist = len(compressionCodeList)
 str2 = ', '.join([str(elem) for elem in compressionCodeList])
 
@@ -410,64 +214,55 @@ for alert in account.MatchedCriteriaGroups or []:
 #Check if alert was autoresolved or completed.
 if validated is False:
     #Get meds within last X days
-    mainMedDic = {}
-    unsortedMedDic = {}
-    medCount = 0
     #Combine all items into one list to search against
     medSearchList = ["Mannitol", "Dexamethasone", "Methylprednisolone", "Hypertonic Saline"]
     #Set datelimit for how far back to 
     medDateLimit = System.DateTime.Now.AddDays(-7)
-    #Loop through all meds finding any that match in the combined list adding to a dictionary the matches
-    if 'Medications' in account:    
-        for med in account.Medications:
-            if med.StartDate >= medDateLimit and 'Category' in med and med.Category is not None:
-                if any(item == med.Category for item in medSearchList):
-                    medCount += 1
-                    unsortedMedDic[medCount] = med
-    #Sort List by latest
-    mainMedDic = sorted(unsortedMedDic.items(), key=lambda x: x[1]['StartDate'], reverse=True)
+    #Collect matching meds, sorted by latest
+    mainMedDic = context.medications(medSearchList, medDateLimit)
     
     #Negations
-    cervicalDecompressionAbs = abstractValue("CERVICAL_DECOMPRESSION", "Cervical Decompression '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 0)
-    cervicalFusionAbs = abstractValue("CERVICAL_FUSION", "Cervical Fusion '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 0)
-    lumbarDecompressionAbs = abstractValue("LUMBAR_DECOMPRESSION", "Lumbar Decompression '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 0)
-    lumbarFusionAbs = abstractValue("LUMBAR_FUSION", "Lumbar Fusion '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 0)
-    sacralDecompressionAbs = abstractValue("SACRAL_DECOMPRESSION", "Sacral Decompression '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 0)
-    sacralFusionAbs = abstractValue("SACRAL_FUSION", "Sacral Fusion '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 0)
-    thoracicDecompressionAbs = abstractValue("THORACIC_DECOMPRESSION", "Thoracic Decompression '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 0)
-    thoracicFusionAbs = abstractValue("THORACIC_FUSION", "Thoracic Fusion '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 0)
+    evidence = Evidence()
+    evidence.define("cervicalDecompressionAbs", abstractValue, "CERVICAL_DECOMPRESSION", "Cervical Decompression '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 0)
+    evidence.define("cervicalFusionAbs", abstractValue, "CERVICAL_FUSION", "Cervical Fusion '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 0)
+    evidence.define("lumbarDecompressionAbs", abstractValue, "LUMBAR_DECOMPRESSION", "Lumbar Decompression '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 0)
+    evidence.define("lumbarFusionAbs", abstractValue, "LUMBAR_FUSION", "Lumbar Fusion '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 0)
+    evidence.define("sacralDecompressionAbs", abstractValue, "SACRAL_DECOMPRESSION", "Sacral Decompression '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 0)
+    evidence.define("sacralFusionAbs", abstractValue, "SACRAL_FUSION", "Sacral Fusion '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 0)
+    evidence.define("thoracicDecompressionAbs", abstractValue, "THORACIC_DECOMPRESSION", "Thoracic Decompression '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 0)
+    evidence.define("thoracicFusionAbs", abstractValue, "THORACIC_FUSION", "Thoracic Fusion '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 0)
     #Alert Trigger
-    mannitolMedDoc = docMedValue(dict(mainMedDic), documentList, "Mannitol", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", dc, 1, False)
-    dexamethasoneMedDoc = docMedValue(dict(mainMedDic), documentList, "Dexamethasone", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", dc, 1, False)
+    mannitolMedDoc = docMedValue(mainMedDic, documentList, "Mannitol", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", dc, 1, False)
+    dexamethasoneMedDoc = docMedValue(mainMedDic, documentList, "Dexamethasone", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", dc, 1, False)
     #Abs
-    brainCompressionAbs = abstractValue("BRAIN_COMPRESSION", "Brain Compression '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 3)
-    brainHerniationAbs = abstractValue("BRAIN_HERNIATION", "Brain Herniation '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 5)
-    brainPressureAbs = abstractValue("BRAIN_PRESSURE", "Brain Pressure '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 6)
-    cerebralEdemaAbs = abstractValue("CEREBRAL_EDEMA", "Cerebral Edema '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 8)
-    cerebralVentriEffacAbs = abstractValue("CEREBRAL_VENTRICLE_EFFACEMENT", "Cerebral Ventricle Effacement '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 10)
-    massEffectAbs = abstractValue("MASS_EFFECT", "Mass Effect '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 24)
-    sulcalEffacementAbs = abstractValue("SULCAL_EFFACEMENT", "Sulcal Effacement '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 30)
+    evidence.define("brainCompressionAbs", abstractValue, "BRAIN_COMPRESSION", "Brain Compression '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 3)
+    evidence.define("brainHerniationAbs", abstractValue, "BRAIN_HERNIATION", "Brain Herniation '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 5)
+    evidence.define("brainPressureAbs", abstractValue, "BRAIN_PRESSURE", "Brain Pressure '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 6)
+    evidence.define("cerebralEdemaAbs", abstractValue, "CEREBRAL_EDEMA", "Cerebral Edema '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 8)
+    evidence.define("cerebralVentriEffacAbs", abstractValue, "CEREBRAL_VENTRICLE_EFFACEMENT", "Cerebral Ventricle Effacement '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 10)
+    evidence.define("massEffectAbs", abstractValue, "MASS_EFFECT", "Mass Effect '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 24)
+    evidence.define("sulcalEffacementAbs", abstractValue, "SULCAL_EFFACEMENT", "Sulcal Effacement '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 30)
     #Treatment
-    burrHolesCodes = multiCodeValue(["00943ZZ", "00C40ZZ"], "Burr Holes: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 7)
-    decomCraniectomyCode = codeValue("00N00ZZ", "Decompressive Craniectomy: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 12)
-    hyperTonicSalMed = aerosolMedValue(dict(mainMedDic), "Hypertonic Saline", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 18)
-    hyperVentTherapyAbs = abstractValue("HYPERVENTILATION_THERAPY", "Hyperventilation Therapy '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 20)
-    subarchoidBoltCode = codeValue("00H032Z", "Subarchnoid/Epidural Bolt: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 27)
-    ventriculostomyCodes = multiCodeValue(["009600Z", "009630Z", "009640Z"], "Ventriculostomy: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 28)
+    evidence.define("burrHolesCodes", multiCodeValue, ["00943ZZ", "00C40ZZ"], "Burr Holes: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 7)
+    evidence.define("decomCraniectomyCode", codeValue, "00N00ZZ", "Decompressive Craniectomy: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 12)
+    hyperTonicSalMed = aerosolMedValue(mainMedDic, "Hypertonic Saline", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 18)
+    evidence.define("hyperVentTherapyAbs", abstractValue, "HYPERVENTILATION_THERAPY", "Hyperventilation Therapy '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 20)
+    evidence.define("subarchoidBoltCode", codeValue, "00H032Z", "Subarchnoid/Epidural Bolt: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 27)
+    evidence.define("ventriculostomyCodes", multiCodeValue, ["009600Z", "009630Z", "009640Z"], "Ventriculostomy: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 28)
     #Vitals
-    intraPressureDV = dvValue(dvIntracranialPressure, "Intracranial Pressure: [VALUE] (Result Date: [RESULTDATETIME])", calcIntracranialPressure1, 3)
-    intraPressureAbs = abstractValue("ELEVATED_INTRACRANIAL_PRESSURE", "Intracranial Pressure: [ABSTRACTVALUE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 4)
+    evidence.define("intraPressureDV", dvValue, dvIntracranialPressure, "Intracranial Pressure: [VALUE] (Result Date: [RESULTDATETIME])", calcIntracranialPressure1, 3)
+    evidence.define("intraPressureAbs", abstractValue, "ELEVATED_INTRACRANIAL_PRESSURE", "Intracranial Pressure: [ABSTRACTVALUE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 4)
     
     #Negations Check
     if ( 
-        cervicalDecompressionAbs is not None or
-        cervicalFusionAbs is not None or
-        lumbarDecompressionAbs is not None or
-        lumbarFusionAbs is not None or
-        sacralDecompressionAbs is not None or
-        sacralFusionAbs is not None or
-        thoracicDecompressionAbs is not None or
-        thoracicFusionAbs is not None
+        evidence.cervicalDecompressionAbs is not None or
+        evidence.cervicalFusionAbs is not None or
+        evidence.lumbarDecompressionAbs is not None or
+        evidence.lumbarFusionAbs is not None or
+        evidence.sacralDecompressionAbs is not None or
+        evidence.sacralFusionAbs is not None or
+        evidence.thoracicDecompressionAbs is not None or
+        evidence.thoracicFusionAbs is not None
     ):
         negationCheck = True
 
@@ -495,40 +290,40 @@ if validated is False:
             result.Reason = "Previously Autoresolved"
         AlertPassed = True
     #3
-    elif brainCompressionAbs is not None and compressionCodesExist == 0 and cerebralEdemaAbs is not None and edmaCodesExist == 0:
-        if brainCompressionAbs is not None: dc.Links.Add(brainCompressionAbs)
-        if cerebralEdemaAbs is not None: dc.Links.Add(cerebralEdemaAbs)
+    elif evidence.brainCompressionAbs is not None and compressionCodesExist == 0 and evidence.cerebralEdemaAbs is not None and edmaCodesExist == 0:
+        if evidence.brainCompressionAbs is not None: dc.Links.Add(evidence.brainCompressionAbs)
+        if evidence.cerebralEdemaAbs is not None: dc.Links.Add(evidence.cerebralEdemaAbs)
         result.Subtitle = "Brain Compression and Cerebral Edema Dx Possibly only present on Radiology Reports."
         AlertPassed = True
     #4
-    elif cerebralEdemaAbs is not None and edmaCodesExist == 0:
-        dc.Links.Add(cerebralEdemaAbs)
+    elif evidence.cerebralEdemaAbs is not None and edmaCodesExist == 0:
+        dc.Links.Add(evidence.cerebralEdemaAbs)
         result.Subtitle = "Cerebral Edema Dx Possibly Only Present On Radiology Reports"
         AlertPassed = True
     #5
-    elif brainCompressionAbs is not None and compressionCodesExist == 0:
-        dc.Links.Add(brainCompressionAbs)
+    elif evidence.brainCompressionAbs is not None and compressionCodesExist == 0:
+        dc.Links.Add(evidence.brainCompressionAbs)
         result.Subtitle = "Brain Compression Dx Possibly Only Present On Radiology Reports"
         AlertPassed = True
     #6
-    elif brainHerniationAbs is not None and compressionCodesExist == 0:
-        dc.Links.Add(brainHerniationAbs)
+    elif evidence.brainHerniationAbs is not None and compressionCodesExist == 0:
+        dc.Links.Add(evidence.brainHerniationAbs)
         result.Subtitle = "Brain Compression Dx Possibly only present on Radiology Reports"
         AlertPassed = True
     #7
     elif (
         compressionCodesExist == 0 and
-        (massEffectAbs is not None or
-        sulcalEffacementAbs is not None or
-        cerebralVentriEffacAbs is not None or
-        brainPressureAbs is not None or
-        intraPressureDV is not None or
-        intraPressureAbs is not None or
-        burrHolesCodes is not None or
-        decomCraniectomyCode is not None or
-        hyperVentTherapyAbs is not None or
-        subarchoidBoltCode is not None or
-        ventriculostomyCodes is not None)
+        (evidence.massEffectAbs is not None or
+        evidence.sulcalEffacementAbs is not None or
+        evidence.cerebralVentriEffacAbs is not None or
+        evidence.brainPressureAbs is not None or
+        evidence.intraPressureDV is not None or
+        evidence.intraPressureAbs is not None or
+        evidence.burrHolesCodes is not None or
+        evidence.decomCraniectomyCode is not None or
+        evidence.hyperVentTherapyAbs is not None or
+        evidence.subarchoidBoltCode is not None or
+        evidence.ventriculostomyCodes is not None)
     ):
         result.Subtitle = "Possible Brain Compression Dx"
         AlertPassed = True
@@ -544,11 +339,11 @@ if validated is False:
         AlertPassed = True
 
     else:
-        db.LogEvaluationScriptMessage("Not enough data to warrent alert, Alert Failed. " + str(account._id), scriptName, scriptInstance, "Debug")
+        scriptLog.debug("Not enough data to warrent alert, Alert Failed. %s", account._id)
         result.Passed = False
 
 else:
-    db.LogEvaluationScriptMessage("Alert Closed; Exiting script run. Outcome: " + str(outcome) + " " + str(account._id), scriptName, scriptInstance, "Debug")
+    scriptLog.debug("Alert Closed; Exiting script run. Outcome: %s %s", outcome, account._id)
 
 #If an alert triggered abstract the following
 if AlertPassed:
@@ -560,18 +355,18 @@ if AlertPassed:
         if alteredAbs is not None: alteredAbs.Hidden = True; abs.Links.Add(alteredAbs)
     elif r4182Code is None and alteredAbs is not None:
         abs.Links.Add(alteredAbs)
-    if brainCompressionAbs is not None: abs.Links.Add(brainCompressionAbs) #3
+    if evidence.brainCompressionAbs is not None: abs.Links.Add(evidence.brainCompressionAbs) #3
     multiCodeValue(["I60.0", "I60.00", "I60.01", "I60.02", "I60.1", "I60.10", "I60.11", "I60.12", "I60.2", "I60.3", "I60.30",
                    "I60.31", "I60.32", "I60.4", "I60.5", "I60.50", "I60.51", "I60.52", "I60.6", "I60.7", "I60.8", "I60.9",
                    "I61.0", "I61.1", "I61.2", "I61.3", "I61.4", "I61.5", "I61.6", "I61.8", "I61.9", "I62", "I62.0", "I62.00",
                    "I62.01", "I62.02", "I62.03", "I62.1", "I62.9"],
                     "Brain Hemorrhage - Ruptured Aneurysm: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 4, abs, True)
-    if brainHerniationAbs is not None: abs.Links.Add(brainHerniationAbs) #5
-    if brainPressureAbs is not None: abs.Links.Add(brainPressureAbs) #6
+    if evidence.brainHerniationAbs is not None: abs.Links.Add(evidence.brainHerniationAbs) #5
+    if evidence.brainPressureAbs is not None: abs.Links.Add(evidence.brainPressureAbs) #6
     codeValue("G93.0", "Cerebral Cysts: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 7, abs, True)
-    if cerebralEdemaAbs is not None: abs.Links.Add(cerebralEdemaAbs) #8
+    if evidence.cerebralEdemaAbs is not None: abs.Links.Add(evidence.cerebralEdemaAbs) #8
     codeValue("I67.82", "Cerebral Ischemia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 9, abs, True)
-    if cerebralVentriEffacAbs is not None: abs.Links.Add(cerebralVentriEffacAbs) #10
+    if evidence.cerebralVentriEffacAbs is not None: abs.Links.Add(evidence.cerebralVentriEffacAbs) #10
     codeValue("G31.9", "Cerebral Volume loss: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 11, abs, True)
     codeValue("Z98.2", "Cerebrospinal Fluid Drainage Device: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 12, abs, True)
     abstractValue("COMA", "Coma '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 13, abs, True)
@@ -587,7 +382,7 @@ if AlertPassed:
     prefixCodeValue("^S06\.", "Intracranial Injury: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 22, abs, True)
     abstractValue("IRREGULAR_RADIOLOGY_FINDINGS_BRAIN", "Radiology Findings '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 23, abs, True)
     multiCodeValue(["5A1935Z", "5A1945Z", "5A1955Z"], "Intubation: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 20, abs, True)
-    if massEffectAbs is not None: abs.Links.Add(massEffectAbs) #24
+    if evidence.massEffectAbs is not None: abs.Links.Add(evidence.massEffectAbs) #24
     abstractValue("MIDLINE_SHIFT", "Midline Shift '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 25, abs, True)
     abstractValue("MUSCLE_CRAMPS", "Muscle Cramps '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 26, abs, True)
     multiCodeValue(["I63.0", "I63.00", "I63.01", "I63.011", "I63.012", "I63.013", "I63.019", "I63.02", "I63.03", "I63.031",
@@ -604,7 +399,7 @@ if AlertPassed:
                     "Cerebral Infarction: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 27, abs, True)
     abstractValue("OBTUNDED", "Obtunded '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 28, abs, True)
     abstractValue("SEIZURE", "Seizure '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 29, abs, True)
-    if sulcalEffacementAbs is not None: abs.Links.Add(sulcalEffacementAbs) #30
+    if evidence.sulcalEffacementAbs is not None: abs.Links.Add(evidence.sulcalEffacementAbs) #30
     codeValue("S09.8XXA", "Traumatic Brain Injury - Closed Head Injury: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 31, abs, True)
     codeValue("S09.90XA", "Traumatic Brain Injury - Open Head Injury: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 32, abs, True)
     codeValue("R11.10", "Vomiting: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 33, abs, True)
@@ -630,12 +425,12 @@ if AlertPassed:
     abstractValue("ANTICONVULSANT", "Anticonvulsant '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 4, treatment, True)
     medValue("Benzodiazepine", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 5, treatment, True)
     abstractValue("BENZODIAZEPINE", "Benzodiazepine '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 6, treatment, True)
-    if burrHolesCodes is not None: treatment.Links.Add(burrHolesCodes) #7
+    if evidence.burrHolesCodes is not None: treatment.Links.Add(evidence.burrHolesCodes) #7
     medValue("Beta Blocker", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 8, treatment, True)
     medValue("Bumetanide", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 9, treatment, True)
     medValue("Calcium Channel Blockers", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 10, treatment, True)
     abstractValue("CALCIUM_CHANNEL_BLOCKER", "Calcium Channel Blocker '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 11, treatment, True)
-    if decomCraniectomyCode is not None: treatment.Links.Add(decomCraniectomyCode) #12
+    if evidence.decomCraniectomyCode is not None: treatment.Links.Add(evidence.decomCraniectomyCode) #12
     medValue("Dexamethasone", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 13, treatment, True)
     medValue("Diuretic", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 14, treatment, True)
     abstractValue("DIURETIC", "Diuretic '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 15, treatment, True)
@@ -643,20 +438,20 @@ if AlertPassed:
     medValue("Hydralazine", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 17, treatment, True)
     if hyperTonicSalMed is not None: treatment.Links.Add(hyperTonicSalMed) #18
     abstractValue("HYPERTONIC_SALINE", "Hypertonic Saline '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 19, treatment, True)
-    if hyperVentTherapyAbs is not None: treatment.Links.Add(hyperVentTherapyAbs) #20
+    if evidence.hyperVentTherapyAbs is not None: treatment.Links.Add(evidence.hyperVentTherapyAbs) #20
     medValue("Lithium", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 21, treatment, True)
     medValue("Mannitol", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 22, treatment, True)
     medValue("Methylprednisolone", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 23, treatment, True)
     medValue("Sodium Nitroprusside", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 24, treatment, True)
     medValue("Steroid", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 25, treatment, True)
     abstractValue("STEROIDS", "Steroid '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 26, treatment, True)
-    if subarchoidBoltCode is not None: treatment.Links.Add(subarchoidBoltCode) #27
-    if ventriculostomyCodes is not None: treatment.Links.Add(ventriculostomyCodes) #28
+    if evidence.subarchoidBoltCode is not None: treatment.Links.Add(evidence.subarchoidBoltCode) #27
+    if evidence.ventriculostomyCodes is not None: treatment.Links.Add(evidence.ventriculostomyCodes) #28
     #Vitals
     dvValue(dvGlasgowComaScale, "Glasgow Coma Score: [VALUE] (Result Date: [RESULTDATETIME])", calcGlasgowComaScale1, 1, vitals, True)
     dvValue(dvHeartRate, "Heart Rate: [VALUE] (Result Date: [RESULTDATETIME])", calcHeartRate1, 2, vitals, True)
-    if intraPressureDV is not None: vitals.Links.Add(intraPressureDV) #3
-    if intraPressureAbs is not None: vitals.Links.Add(intraPressureAbs) #4
+    if evidence.intraPressureDV is not None: vitals.Links.Add(evidence.intraPressureDV) #3
+    if evidence.intraPressureAbs is not None: vitals.Links.Add(evidence.intraPressureAbs) #4
     dvValue(dvRespiratoryRate, "Respiratory Rate: [VALUE] (Result Date: [RESULTDATETIME])", calcRespiratoryRate1, 5, vitals, True)
 
 #If alert passed or alert conditions was triggered add categories to result if they have links
@@ -669,7 +464,9 @@ if AlertPassed or AlertConditions:
     result.Links.Add(treatment)
     if treatment.Links: treatmentLinks = True
     result.Links.Add(other)
-    db.LogEvaluationScriptMessage("Alert Passed Adding Links. Alert Triggered: " + str(result.Subtitle) + " Autoresolved: " + str(result.Outcome) + "; " +
-        str(result.Validated) + "; Links: AlertTrigger- " + str(dcLinks) + ", Abs- " + str(absLinks) + ", vitals- " + str(vitalsLinks) + 
-        ", docs- " + str(docLinksLinks) + ", treatment- " + str(treatmentLinks) + "; Acct: " + str(account._id), scriptName, scriptInstance, "Debug")
+    scriptLog.debug("Alert Passed Adding Links. Alert Triggered: %s Autoresolved: %s; %s; Links: AlertTrigger- %s, Abs- %s, vitals- %s, docs- %s, treatment- %s; Acct: %s",
+        result.Subtitle, result.Outcome, result.Validated, dcLinks, absLinks, vitalsLinks, docLinksLinks, treatmentLinks, account._id)
     result.Passed = True
+
+#Write out this run's script messages
+scriptLog.flush()
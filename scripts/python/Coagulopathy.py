@@ -28,6 +28,7 @@ from System.Data import *
 from System.Configuration import *
 from System.Collections.Generic import *
 clr.ImportExtensions(System.Linq)
+from cdi import DiscreteValueIndex, Evidence, evaluation_context
 from operator import le, ge, gt, lt
 
 #========================================
@@ -77,14 +78,20 @@ autoCodeText = "Autoresolved Code - "
 #  Globals
 #========================================
 db = CACDataRepository()
+#Account data is loaded once and shared by every script run for the account,
+#fetching only the discrete values of the last 7 days
+context = evaluation_context(account, db, System.DateTime.Now.AddDays(-7))
+#Script messages are only formatted when their level is enabled, and are written
+#together at the end of the run
+scriptLog = context.log(db, scriptName, scriptInstance)
 admitDate = account.AdmitDateTime.Date
 birthDate = account.Patient.BirthDate.Date
 gender = account.Patient.Gender
 #Update true = External DV collection False = On Acct Record
-accountContainer = AccountWorkflowContainer(account, True, "Category", 7)
+accountContainer = context.container(AccountWorkflowContainer, True, "Category", 7)
 useSeperateDiscreteCollection = True
 if useSeperateDiscreteCollection == True:
-    discreteValues = db.GetDiscreteValues(account._id)
+    discreteValues = context.discrete_values
 else:
     discreteValues = db.GetAccountField(account._id, "DiscreteValues")
 
@@ -124,193 +131,9 @@ calcAny1 = lambda x: x > 0
 #========================================
 #  Functions
 #========================================
-def datetimeFromUtcToLocal(utc_datetime):
-    if utc_datetime:
-        convertedDate = DateTime.SpecifyKind(utc_datetime, DateTimeKind.Utc)
-        return  convertedDate.ToLocalTime()
-    else:
-        return None
-
-def cleanNumbers(result):
-    result1 = re.sub("[\\<\\>]", "", str(result))
-    if result1.count('.') <= 1 and result1.replace(".", "").isnumeric():
-        return result1
-    else:
-        return None
-
-def dataConversion(datetime, linkText, Result, id, category, sequence, abstract=True, gender=None):
-    if datetime is not None:
-        date_time = datetimeFromUtcToLocal(datetime)
-        date_time = date_time.ToString("MM/dd/yyyy, HH:mm")
-        linkText = linkText.replace("[RESULTDATETIME]", date_time)
-    else: 
-        linkText = linkText.replace("(Result Date: [RESULTDATETIME])", "")
-    if Result is not None:
-        linkText = linkText.replace("[VALUE]", Result)
-    else: linkText = linkText.replace("[VALUE]", "")
-    if gender: linkText = linkText.replace("[GENDER]", gender)
-    else: linkText = linkText.replace("[GENDER]", "")
-    if abstract == True:
-        category.Links.Add(MatchedCriteriaLink(linkText, None, None, id, True, None, None, sequence))
-    elif abstract == False:
-        abstraction = MatchedCriteriaLink(linkText, None, None, id, True, None, None, sequence)
-        return abstraction
-    return
-
-def CodeCount(codes):
-    # Get list of codes on the acct based on CodeDic
-    result = set()
-    for document in account.Documents or []:
-        for codeReference in document.CodeReferences or []:
-            if codeReference.Code in codes:
-                matching_code = codeReference.Code
-                result.add(matching_code)
-    return list(result)
-
-def abstractValue(abstraction_name, link_text, calculation, sequence=0, category=None, abstract=False):
-    # Find abstraction and if abstract is true abstract it to the provided category
-    abstraction = accountContainer.GetFirstLinkMatchingAbstractionValue(abstraction_name, link_text, lambda x: calculation)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def dvValue(dv_name, link_text, calculation, sequence=0, category=None, abstract=False):
-    # Find Discrete Value and if abstract is true abstract it to the provided category
-    for dv in dv_name:
-        abstraction = accountContainer.GetFirstLinkMatchingDiscreteValue(dv, link_text, calculation)
-        if abstraction is not None:
-            break
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def dvValueMulti(dvDic, DV1, linkText, value, sign, sequence=0, category=None, abstract=False, needed=2):
-    # Find Discrete Value and if abstract is true abstract it to the provided category
-    matchedList = []
-    x = 0
-    for dv in dvDic or []:
-        dvr = cleanNumbers(dvDic[dv]['Result'])
-        if dvDic[dv]['Name'] in DV1 and dvr is not None and sign(float(dvr), float(value)):
-            matchedList.append(dataConversion(dvDic[dv]['ResultDate'], linkText, dvDic[dv]['Result'], dvDic[dv]['UniqueId'] or dvDic[dv]['_id'], category, sequence, abstract))
-            x += 1
-            if needed <= x:
-                break
-    if abstract and x > 0:
-        return True
-    elif abstract is False and len(matchedList) > 0 and needed > 0:
-        return matchedList
-    else:
-        return None
-
-def compareValuesMulti(dvDic, DV1, value, value1, linkText, sign, sign1, sequence=0, category=None, abstract=False, needed=2):
-    matchedList = []
-    x = 0
-    for dv in dvDic or []:
-        dvr = cleanNumbers(dvDic[dv]['Result'])
-        if dvDic[dv]['Name'] in DV1 and dvr is not None and sign(float(value), float(dvr)) and sign1(float(dvr), float(value1)):
-            matchedList.append(dataConversion(dvDic[dv]['ResultDate'], linkText, dvDic[dv]['Result'], dvDic[dv]['UniqueId'] or dvDic[dv]['_id'], category, sequence, abstract))
-            x += 1
-            if needed <= x:
-                break
-    if abstract and x > 0:
-        return True
-    elif abstract is False and len(matchedList) > 0 and needed > 0:
-        return matchedList
-    else:
-        return None
-
-def codeValue(code_name, link_text, sequence=0, category=None, abstract=False):
-    # Find code and if abstract is true abstract it to the provided category
-    abstraction = accountContainer.GetFirstCodeLink(code_name, link_text)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def multiCodeValue(code_list, link_text, sequence=0, category=None, abstract=False):
-    # Go through Code List and find first code and if abstract is true abstract it to the provided category
-    abstraction = None
-    for code in code_list:
-        abstraction = accountContainer.GetFirstCodeLink(code, link_text)
-        if abstraction is not None:
-            abstraction.Sequence = sequence
-            if abstract:
-                category.Links.Add(abstraction)
-                return True
-            else:
-                return abstraction
-    if abstract and abstraction is None:
-        return False
-    return abstraction
-
-def prefixCodeValue(prefix, link_text, sequence=0, category=None, abstract=False):
-    # Use prefix to find first code match based on regex search and if abstract is true abstract it to the provided category
-    abstraction = None
-    validCodes = [codes for codes in accountContainer.CodeKeys if re.match(prefix, codes) is not None]
-    for code in validCodes:
-        abstraction = accountContainer.GetFirstCodeLink(code, link_text)
-        if abstraction is not None:
-            abstraction.Sequence = sequence
-            if abstract:
-                category.Links.Add(abstraction)
-                return True
-            else:
-                return abstraction
-    if abstract and abstraction is None:
-        return False
-    return abstraction
-
-def medValue(med_name, link_text, sequence=0, category=None, abstract=False):
-    # Find Medication Value and if abstract is true abstract it to the provided category
-    abstraction = accountContainer.GetFirstMedicationLink(med_name, link_text)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def updateLinkText(value, replacement_text):
-    # Update the link text with the provided text
-    value.LinkText = replacement_text + value.LinkText
-    return value
-
-def documentLink(DocumentType, LinkText, sequence, category, abstract):
-    # Finds a document link and adds it as link so that its a quick reference for the cdi user.
-    abstraction = None
-    abstraction = accountContainer.GetFirstDocumentLink(DocumentType, LinkText)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    return None
+#The helpers every script shares are compiled once per process and bound to this
+#script's globals, see cdi.helpers; a helper defined below replaces the shared one
+context.bind_helpers(globals(), 1)
 
 #========================================
 #  Script Specific Functions
@@ -352,7 +175,7 @@ def dvActionCheck(dvDic, discreteValueName, linkText, sequence=0, category=None,
 #========================================
 #  Algorithm
 #========================================
-db.LogEvaluationScriptMessage("Script starting " + str(account._id), scriptName, scriptInstance, "Debug")
+scriptLog.debug("Script starting %s", account._id)
 #Determine if if and how many fully spec codes are on the acct
 codes = []
 codes = codeDic.keys()
@@ -403,21 +226,12 @@ for alert in account.MatchedCriteriaGroups or []:
 #Check if alert was autoresolved or completed.
 if validated is False:    
     #Find all discrete values for custom lookups within the last X days
-    maindiscreteDic = {}
-    unsortedDicsreteDic = {}
-    dvCount = 0
     #Combine all items into one list to search against
     discreteSearchList = [i for j in [dvInr, dvPartialThromboplastinTime, dvPlateletCount, dvProthrombinTime] for i in j]
     #Set datelimit for how far back to 
     dvDateLimit = System.DateTime.Now.AddDays(-7)
-    #Loop through all dvs finding any that match in the combined list adding to a dictionary the matches
-    for dv in discreteValues or []:
-        if dv.ResultDate >= dvDateLimit:
-            if any(item == dv.Name for item in discreteSearchList):
-                dvCount += 1
-                unsortedDicsreteDic[dvCount] = dv
-    #Sort List by latest
-    maindiscreteDic = sorted(unsortedDicsreteDic.items(), key=lambda x: x[1]['ResultDate'], reverse=True)
+    #Index all dvs that match in the combined list by name, sorted by latest
+    maindiscreteDic = DiscreteValueIndex(discreteValues, discreteSearchList, dvDateLimit)
     
     #Negation
     anticoagulantAbs = abstractValue("ANTICOAGULANT", "Anticoagulant '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 0)
@@ -429,32 +243,33 @@ if validated is False:
     #AlertTrigger
 #    massiveTransfuionAbs = abstractValue("MASSIVE_TRANSFUSION_PROTOCOL", "Massive Transfusion Protocol '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 0)
     #Abs
-    giBleedCodes = multiCodeValue(["K25.0", "K25.2", "K25.4", "K25.6", "K26.0","K26.2", "K26.4. K26.6", "K27.0", "K27.2", "K27.4", "K27.6", "K28.0", "K28.2", "K28.4", "K28.6",
+    evidence = Evidence()
+    evidence.define("giBleedCodes", multiCodeValue, ["K25.0", "K25.2", "K25.4", "K25.6", "K26.0","K26.2", "K26.4. K26.6", "K27.0", "K27.2", "K27.4", "K27.6", "K28.0", "K28.2", "K28.4", "K28.6",
         "K29.01", "K29.21", "K29.31", "K29.41", "K29.51", "K29.61", "K29.71", "K29.81", "K29.91", "K31.811", "K31.82", "K55.21", "K57.01", "K57.11",
         "K57.13", "K57.21", "K57.31", "K57.33", "K57.41", "K57.51", "K57.53", "K57.81", "K57.91", "K57.93", "K62.5", "K92.0", "K92.1", "K92.2"],
         "GI Bleed: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 14)
-    hemorrhageAbs = abstractValue("HEMORRHAGE","Hemorrhage: [ABSTRACTVALUE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 17)
+    evidence.define("hemorrhageAbs", abstractValue, "HEMORRHAGE","Hemorrhage: [ABSTRACTVALUE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 17)
     #Labs
-    ddimer4DV = dvValue(dvDDimer, "D Dimer: [VALUE] (Result Date: [RESULTDATETIME])", calcDDimer1, 2)
-    ddimer0484DV = dvValue(dvDDimer, "D Dimer: [VALUE] (Result Date: [RESULTDATETIME])", calcDDimer2, 3)
-    fibrinogenDV = dvValue(dvFibrinogen, "Fibrinogen: [VALUE] (Result Date: [RESULTDATETIME])", calcFibrinogen1, 4)
+    evidence.define("ddimer4DV", dvValue, dvDDimer, "D Dimer: [VALUE] (Result Date: [RESULTDATETIME])", calcDDimer1, 2)
+    evidence.define("ddimer0484DV", dvValue, dvDDimer, "D Dimer: [VALUE] (Result Date: [RESULTDATETIME])", calcDDimer2, 3)
+    evidence.define("fibrinogenDV", dvValue, dvFibrinogen, "Fibrinogen: [VALUE] (Result Date: [RESULTDATETIME])", calcFibrinogen1, 4)
     #Labs Subheadings
-    inr13DV = dvValueMulti(dict(maindiscreteDic), dvInr, "INR: [VALUE] (Result Date: [RESULTDATETIME])", calcInr3, gt, 0, inr, False, 10)
-    pttDV = dvValueMulti(dict(maindiscreteDic), dvPartialThromboplastinTime, "Partial Thromboplastin Time: [VALUE] (Result Date: [RESULTDATETIME])", calcPartialThromboplastinTime1, gt, 0, ptt, False, 10)
-    plateletCount150DV = dvValueMulti(dict(maindiscreteDic), dvPlateletCount, "Platelet Count: [VALUE] (Result Date: [RESULTDATETIME])", calcPlateletCount1, lt, 0, platelet, False, 10)
-    ptDV = dvValueMulti(dict(maindiscreteDic), dvProthrombinTime, "Prothrombin Time: [VALUE] (Result Date: [RESULTDATETIME])", calcProthrombinTime1, gt, 0, pt, False, 10)
+    inr13DV = dvValueMulti(maindiscreteDic, dvInr, "INR: [VALUE] (Result Date: [RESULTDATETIME])", calcInr3, gt, 0, inr, False, 10)
+    pttDV = dvValueMulti(maindiscreteDic, dvPartialThromboplastinTime, "Partial Thromboplastin Time: [VALUE] (Result Date: [RESULTDATETIME])", calcPartialThromboplastinTime1, gt, 0, ptt, False, 10)
+    plateletCount150DV = dvValueMulti(maindiscreteDic, dvPlateletCount, "Platelet Count: [VALUE] (Result Date: [RESULTDATETIME])", calcPlateletCount1, lt, 0, platelet, False, 10)
+    ptDV = dvValueMulti(maindiscreteDic, dvProthrombinTime, "Prothrombin Time: [VALUE] (Result Date: [RESULTDATETIME])", calcProthrombinTime1, gt, 0, pt, False, 10)
     #Meds
-    anticoagulantDV = medValue("Anticoagulant", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 1)
+    evidence.define("anticoagulantDV", medValue, "Anticoagulant", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 1)
     anticoagulantAbs = abstractValue("ANTICOAGULANT", "Anticoagulant '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 2)
-    antiplateletDV = medValue("Antiplatelet", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 3)
-    antiplateletAbs = abstractValue("ANTIPLATELET", "Antiplatelet '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 4)
-    aspirinDV = medValue("Aspirin", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 6)
-    aspirinAbs = abstractValue("ASPIRIN", "Aspirin '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 7)
-    heparinDV = medValue("Heparin", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 10)
-    heparinAbs = abstractValue("HEPARIN", "Heparin '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 11)
-    z7901Code = codeValue("Z79.01", "Long Term Anticoagulants: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 12)
-    z7902Code = codeValue("Z79.02", "Long Term use of Antithrombotics/Antiplatelets: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 13)
-    z7982Code = codeValue("Z79.82", "Long Term Aspirin: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 14)
+    evidence.define("antiplateletDV", medValue, "Antiplatelet", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 3)
+    evidence.define("antiplateletAbs", abstractValue, "ANTIPLATELET", "Antiplatelet '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 4)
+    evidence.define("aspirinDV", medValue, "Aspirin", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 6)
+    evidence.define("aspirinAbs", abstractValue, "ASPIRIN", "Aspirin '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 7)
+    evidence.define("heparinDV", medValue, "Heparin", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 10)
+    evidence.define("heparinAbs", abstractValue, "HEPARIN", "Heparin '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 11)
+    evidence.define("z7901Code", codeValue, "Z79.01", "Long Term Anticoagulants: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 12)
+    evidence.define("z7902Code", codeValue, "Z79.02", "Long Term use of Antithrombotics/Antiplatelets: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 13)
+    evidence.define("z7982Code", codeValue, "Z79.82", "Long Term Aspirin: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 14)
     #DIC Score Only Items
 #    inr17DV = dvValue(dvInr, "INR: [VALUE] (Result Date: [RESULTDATETIME])", calcInr1, 0)
 #    inr1317DV = dvValue(dvInr, "INR: [VALUE] (Result Date: [RESULTDATETIME])", calcInr2, 0)
@@ -487,17 +302,17 @@ if validated is False:
         
     #Med not taken Check
     if (
-        z7901Code is None and 
-        z7902Code is None and
-        z7982Code is None and
+        evidence.z7901Code is None and 
+        evidence.z7902Code is None and
+        evidence.z7982Code is None and
         anticoagulantAbs is None and
-        antiplateletAbs is None and 
-        anticoagulantDV is None and
-        antiplateletDV is None and  
-        aspirinDV is None and
-        aspirinAbs is None and
-        heparinDV is None and
-        heparinAbs is None  
+        evidence.antiplateletAbs is None and 
+        evidence.anticoagulantDV is None and
+        evidence.antiplateletDV is None and  
+        evidence.aspirinDV is None and
+        evidence.aspirinAbs is None and
+        evidence.heparinDV is None and
+        evidence.heparinAbs is None  
     ):
         medCheck = True
 
@@ -527,7 +342,7 @@ if validated is False:
 #        AlertPassed = True
 
     if codesExist >= 1 or medCheck is False:
-        db.LogEvaluationScriptMessage("One specific code was on the chart, alert failed. " + str(account._id), scriptName, scriptInstance, "Debug")
+        scriptLog.debug("One specific code was on the chart, alert failed. %s", account._id)
         if alertTriggered:
             for code in codeList:
                 desc = codeDic[code]
@@ -541,20 +356,20 @@ if validated is False:
             AlertPassed = True
         else: result.Passed = False
 
-    elif hemorrhageAbs is None and giBleedCodes is None and medCheck and multiDvValues > 1:
+    elif evidence.hemorrhageAbs is None and evidence.giBleedCodes is None and medCheck and multiDvValues > 1:
         result.Subtitle = "Possible Coagulopathy Dx"
         AlertPassed = True
 
-    elif (hemorrhageAbs is not None or giBleedCodes is not None) and medCheck and multiDvValues > 1:
+    elif (evidence.hemorrhageAbs is not None or evidence.giBleedCodes is not None) and medCheck and multiDvValues > 1:
         result.Subtitle = "Possible Coagulopathy Dx"
         AlertPassed = True
 
     else:
-        db.LogEvaluationScriptMessage("Not enough data to warrent alert, Alert Failed. " + str(account._id), scriptName, scriptInstance, "Debug")
+        scriptLog.debug("Not enough data to warrent alert, Alert Failed. %s", account._id)
         result.Passed = False
 
 else:
-    db.LogEvaluationScriptMessage("Alert Closed; Exiting script run. Outcome: " + str(outcome) + " " + str(account._id), scriptName, scriptInstance, "Debug")
+    scriptLog.debug("Alert Closed; Exiting script run. Outcome: %s %s", outcome, account._id)
 
 #If an alert triggered abstract the following
 if AlertPassed:
@@ -572,10 +387,10 @@ if AlertPassed:
     if not throm: codeValue("K72.91", "Hepatic Failure Unspecified with Coma: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 11, abs, True)
     if throm: prefixCodeValue("^C82\.", "Follicular Lymphoma: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 12, abs, True)
     if throm: codeValue("E75.22", "Gauchers Disease: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 13, abs, True)
-    if giBleedCodes is not None: abs.Links.Add(giBleedCodes) #14
+    if evidence.giBleedCodes is not None: abs.Links.Add(evidence.giBleedCodes) #14
     if throm: codeValue("D76.1", "Hemophagocytic Lymphohistiocytosis: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 15, abs, True)
     if throm: codeValue("D76.2", "Hemophagocytic Syndrome: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 16, abs, True)
-    if hemorrhageAbs is not None: abs.Links.Add(hemorrhageAbs) #17
+    if evidence.hemorrhageAbs is not None: abs.Links.Add(evidence.hemorrhageAbs) #17
     if throm: prefixCodeValue("^C81\.", "Hodgkin Lymphoma: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 18, abs, True)
     if throm: prefixCodeValue("^C95\.", "Leukemia of Unspecified Cell Type: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 19, abs, True)
     if throm: prefixCodeValue("^C91\.", "Lymphoid Leukemia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 20, abs, True)
@@ -603,9 +418,9 @@ if AlertPassed:
     if throm: multiCodeValue(["30233R1", "30243R1"], "Platelet Transfusion: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 7, blood, True)
     #Labs
     if not throm: dvValue(dvActivatedClottingTime, "Activated Clotting Time: [VALUE] (Result Date: [RESULTDATETIME])", calcActivatedClottingTime1, 1, labs, True)
-    if not throm and ddimer4DV is not None: labs.Links.Add(ddimer4DV) #2
-    if not throm and ddimer0484DV is not None and ddimer4DV is None: labs.Links.Add(ddimer0484DV) #3
-    if fibrinogenDV is not None: labs.Links.Add(fibrinogenDV) #4
+    if not throm and evidence.ddimer4DV is not None: labs.Links.Add(evidence.ddimer4DV) #2
+    if not throm and evidence.ddimer0484DV is not None and evidence.ddimer4DV is None: labs.Links.Add(evidence.ddimer0484DV) #3
+    if evidence.fibrinogenDV is not None: labs.Links.Add(evidence.fibrinogenDV) #4
     if not throm: dvValue(dvHomocysteineLevels, "Homocysteine Levels: [VALUE] (Result Date: [RESULTDATETIME])", calcHomocysteineLevels1, 5, labs, True)
     if not throm: dvValue(dvProteinCResistance, "Protein C Resistance: [VALUE] (Result Date: [RESULTDATETIME])", calcProteinCResistance1, 6, labs, True)
     if not throm: dvValue(dvThrombinTime, "Thrombin Time: [VALUE] (Result Date: [RESULTDATETIME])", calcThrombinTime1, 7, labs, True)
@@ -624,20 +439,20 @@ if AlertPassed:
         for entry in ptDV:
             pt.Links.Add(entry)
     #Meds
-    if anticoagulantDV is not None: meds.Links.Add(anticoagulantDV) #1
+    if evidence.anticoagulantDV is not None: meds.Links.Add(evidence.anticoagulantDV) #1
     if anticoagulantAbs is not None: meds.Links.Add(anticoagulantAbs) #2
-    if antiplateletDV is not None: meds.Links.Add(antiplateletDV) #3
-    if antiplateletAbs is not None: meds.Links.Add(antiplateletAbs) #4
+    if evidence.antiplateletDV is not None: meds.Links.Add(evidence.antiplateletDV) #3
+    if evidence.antiplateletAbs is not None: meds.Links.Add(evidence.antiplateletAbs) #4
     medValue("Antiplatelet2", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 5, meds, True)
-    if aspirinDV is not None: meds.Links.Add(aspirinDV) #6
-    if aspirinAbs is not None: meds.Links.Add(aspirinAbs) #7
+    if evidence.aspirinDV is not None: meds.Links.Add(evidence.aspirinDV) #6
+    if evidence.aspirinAbs is not None: meds.Links.Add(evidence.aspirinAbs) #7
     if not throm: abstractValue("ANTIFIBRINOLYTIC_MEDICATION", "Antifibrinolytic Medication '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 8, meds, True)
     if not throm: abstractValue("DESMOPRESSIN_ACETATE", "Desmopressin Acetate '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 9, meds, True)
-    if heparinDV is not None: meds.Links.Add(heparinDV) #10
-    if heparinAbs is not None: meds.Links.Add(heparinAbs) #11
-    if z7901Code is not None: meds.Links.Add(z7901Code) #12
-    if z7902Code is not None: meds.Links.Add(z7902Code) #13
-    if z7982Code is not None: meds.Links.Add(z7982Code) #14
+    if evidence.heparinDV is not None: meds.Links.Add(evidence.heparinDV) #10
+    if evidence.heparinAbs is not None: meds.Links.Add(evidence.heparinAbs) #11
+    if evidence.z7901Code is not None: meds.Links.Add(evidence.z7901Code) #12
+    if evidence.z7902Code is not None: meds.Links.Add(evidence.z7902Code) #13
+    if evidence.z7982Code is not None: meds.Links.Add(evidence.z7982Code) #14
     if not throm: abstractValue("PLASMA_DERIVED_FACTOR_CONCENTRATE", "Plasma Derived Factor Concentrate '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 15, meds, True)
     if not throm: abstractValue("RECOMBINANT_FACTOR_CONCENTRATE", "Recombinant Factor Concentrate '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 16, meds, True)
     
@@ -655,7 +470,9 @@ if AlertPassed or AlertConditions:
     if meds.Links: medsLinks = True
     result.Links.Add(treatment)
     result.Links.Add(other)
-    db.LogEvaluationScriptMessage("Alert Passed Adding Links. Alert Triggered: " + str(result.Subtitle) + " Autoresolved: " + str(result.Outcome) + "; " +
-        str(result.Validated) + "; Links: Document Code- " + str(dcLinks) + ", Abs- " + str(absLinks) + ", labs- " + str(labsLinks)
-        + ", meds- " + str(medsLinks) + "; Acct: " + str(account._id), scriptName, scriptInstance, "Debug")
+    scriptLog.debug("Alert Passed Adding Links. Alert Triggered: %s Autoresolved: %s; %s; Links: Document Code- %s, Abs- %s, labs- %s, meds- %s; Acct: %s",
+        result.Subtitle, result.Outcome, result.Validated, dcLinks, absLinks, labsLinks, medsLinks, account._id)
     result.Passed = True
+
+#Write out this run's script messages
+scriptLog.flush()
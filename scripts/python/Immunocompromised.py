@@ -28,6 +28,7 @@ from System.Data import *
 from System.Configuration import *
 from System.Collections.Generic import *
 clr.ImportExtensions(System.Linq)
+from cdi import DiscreteValueIndex, Evidence, evaluation_context
 from operator import le, ge, gt, lt
 
 #========================================
@@ -41,14 +42,20 @@ autoCodeText = "Autoresolved Specified Code - "
 #  Globals
 #========================================
 db = CACDataRepository()
+#Account data is loaded once and shared by every script run for the account,
+#fetching only the discrete values of the last 7 days
+context = evaluation_context(account, db, System.DateTime.Now.AddDays(-7))
+#Script messages are only formatted when their level is enabled, and are written
+#together at the end of the run
+scriptLog = context.log(db, scriptName, scriptInstance)
 admitDate = account.AdmitDateTime.Date
 birthDate = account.Patient.BirthDate.Date
 gender = account.Patient.Gender
 #Update true = External DV collection False = On Acct Record
-accountContainer = AccountWorkflowContainer(account, True, "Category", 7)
+accountContainer = context.container(AccountWorkflowContainer, True, "Category", 7)
 useSeperateDiscreteCollection = True
 if useSeperateDiscreteCollection == True:
-    discreteValues = db.GetDiscreteValues(account._id)
+    discreteValues = context.discrete_values
 else:
     discreteValues = db.GetAccountField(account._id, "DiscreteValues")
 
@@ -82,193 +89,9 @@ dvPneumococcalAntigen = [""]
 #========================================
 #  Functions
 #========================================
-def datetimeFromUtcToLocal(utc_datetime):
-    if utc_datetime:
-        convertedDate = DateTime.SpecifyKind(utc_datetime, DateTimeKind.Utc)
-        return  convertedDate.ToLocalTime()
-    else:
-        return None
-
-def cleanNumbers(result):
-    result1 = re.sub("[\\<\\>]", "", str(result))
-    if result1.count('.') <= 1 and result1.replace(".", "").isnumeric():
-        return result1
-    else:
-        return None
-
-def dataConversion(datetime, linkText, Result, id, category, sequence, abstract=True, gender=None):
-    if datetime is not None:
-        date_time = datetimeFromUtcToLocal(datetime)
-        date_time = date_time.ToString("MM/dd/yyyy, HH:mm")
-        linkText = linkText.replace("[RESULTDATETIME]", date_time)
-    else: 
-        linkText = linkText.replace("(Result Date: [RESULTDATETIME])", "")
-    if Result is not None:
-        linkText = linkText.replace("[VALUE]", Result)
-    else: linkText = linkText.replace("[VALUE]", "")
-    if gender: linkText = linkText.replace("[GENDER]", gender)
-    else: linkText = linkText.replace("[GENDER]", "")
-    if abstract == True:
-        category.Links.Add(MatchedCriteriaLink(linkText, None, None, id, True, None, None, sequence))
-    elif abstract == False:
-        abstraction = MatchedCriteriaLink(linkText, None, None, id, True, None, None, sequence)
-        return abstraction
-    return
-
-def CodeCount(codes):
-    # Get list of codes on the acct based on CodeDic
-    result = set()
-    for document in account.Documents or []:
-        for codeReference in document.CodeReferences or []:
-            if codeReference.Code in codes:
-                matching_code = codeReference.Code
-                result.add(matching_code)
-    return list(result)
-
-def abstractValue(abstraction_name, link_text, calculation, sequence=0, category=None, abstract=False):
-    # Find abstraction and if abstract is true abstract it to the provided category
-    abstraction = accountContainer.GetFirstLinkMatchingAbstractionValue(abstraction_name, link_text, lambda x: calculation)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def dvValue(dv_name, link_text, calculation, sequence=0, category=None, abstract=False):
-    # Find Discrete Value and if abstract is true abstract it to the provided category
-    for dv in dv_name:
-        abstraction = accountContainer.GetFirstLinkMatchingDiscreteValue(dv, link_text, calculation)
-        if abstraction is not None:
-            break
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def dvValueMulti(dvDic, DV1, linkText, value, sign, sequence=0, category=None, abstract=False, needed=2):
-    # Find Discrete Value and if abstract is true abstract it to the provided category
-    matchedList = []
-    x = 0
-    for dv in dvDic or []:
-        dvr = cleanNumbers(dvDic[dv]['Result'])
-        if dvDic[dv]['Name'] in DV1 and dvr is not None and sign(float(dvr), float(value)):
-            matchedList.append(dataConversion(dvDic[dv]['ResultDate'], linkText, dvDic[dv]['Result'], dvDic[dv]['UniqueId'] or dvDic[dv]['_id'], category, sequence, abstract))
-            x += 1
-            if needed <= x:
-                break
-    if abstract and x > 0:
-        return True
-    elif abstract is False and len(matchedList) > 0 and needed > 0:
-        return matchedList
-    else:
-        return None
-
-def compareValuesMulti(dvDic, DV1, value, value1, linkText, sign, sign1, sequence=0, category=None, abstract=False, needed=2):
-    matchedList = []
-    x = 0
-    for dv in dvDic or []:
-        dvr = cleanNumbers(dvDic[dv]['Result'])
-        if dvDic[dv]['Name'] in DV1 and dvr is not None and sign(float(value), float(dvr)) and sign1(float(dvr), float(value1)):
-            matchedList.append(dataConversion(dvDic[dv]['ResultDate'], linkText, dvDic[dv]['Result'], dvDic[dv]['UniqueId'] or dvDic[dv]['_id'], category, sequence, abstract))
-            x += 1
-            if needed <= x:
-                break
-    if abstract and x > 0:
-        return True
-    elif abstract is False and len(matchedList) > 0 and needed > 0:
-        return matchedList
-    else:
-        return None
-
-def codeValue(code_name, link_text, sequence=0, category=None, abstract=False):
-    # Find code and if abstract is true abstract it to the provided category
-    abstraction = accountContainer.GetFirstCodeLink(code_name, link_text)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def multiCodeValue(code_list, link_text, sequence=0, category=None, abstract=False):
-    # Go through Code List and find first code and if abstract is true abstract it to the provided category
-    abstraction = None
-    for code in code_list:
-        abstraction = accountContainer.GetFirstCodeLink(code, link_text)
-        if abstraction is not None:
-            abstraction.Sequence = sequence
-            if abstract:
-                category.Links.Add(abstraction)
-                return True
-            else:
-                return abstraction
-    if abstract and abstraction is None:
-        return False
-    return abstraction
-
-def prefixCodeValue(prefix, link_text, sequence=0, category=None, abstract=False):
-    # Use prefix to find first code match based on regex search and if abstract is true abstract it to the provided category
-    abstraction = None
-    validCodes = [codes for codes in accountContainer.CodeKeys if re.match(prefix, codes) is not None]
-    for code in validCodes:
-        abstraction = accountContainer.GetFirstCodeLink(code, link_text)
-        if abstraction is not None:
-            abstraction.Sequence = sequence
-            if abstract:
-                category.Links.Add(abstraction)
-                return True
-            else:
-                return abstraction
-    if abstract and abstraction is None:
-        return False
-    return abstraction
-
-def medValue(med_name, link_text, sequence=0, category=None, abstract=False):
-    # Find Medication Value and if abstract is true abstract it to the provided category
-    abstraction = accountContainer.GetFirstMedicationLink(med_name, link_text)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def updateLinkText(value, replacement_text):
-    # Update the link text with the provided text
-    value.LinkText = replacement_text + value.LinkText
-    return value
-
-def documentLink(DocumentType, LinkText, sequence, category, abstract):
-    # Finds a document link and adds it as link so that its a quick reference for the cdi user.
-    abstraction = None
-    abstraction = accountContainer.GetFirstDocumentLink(DocumentType, LinkText)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    return None
+#The helpers every script shares are compiled once per process and bound to this
+#script's globals, see cdi.helpers; a helper defined below replaces the shared one
+context.bind_helpers(globals(), 1)
 
 #========================================
 #  Script Specific Functions
@@ -292,60 +115,23 @@ def dvmrsaCheck(dvDic, discreteValueCategory, discreteValueName, linkText, seque
 
 def dvPositiveCheck(dvDic, discreteValueName, linkText, sequence=0, category=None, abstract=False):
     abstraction = None
-    for dv in dvDic or []:
+    for dv in dvDic.lookup(discreteValueName):
         if (
-            dvDic[dv]['Name'] in discreteValueName and
-            dvDic[dv]['Result'] is not None and 
-            re.search(r'\bpositive\b', dvDic[dv]['Result'], re.IGNORECASE) is not None
+            dv['Result'] is not None and 
+            re.search(r'\bpositive\b', dv['Result'], re.IGNORECASE) is not None
         ):
             if abstract:
-                dataConversion(dvDic[dv]['ResultDate'], linkText, dvDic[dv]['Result'], dvDic[dv]['UniqueId'] or dvDic[dv]['_id'], category, sequence, abstract)
+                dataConversion(dv['ResultDate'], linkText, dv['Result'], dv['UniqueId'] or dv['_id'], category, sequence, abstract)
                 return True
             else:
-                abstraction = dataConversion(dvDic[dv]['ResultDate'], linkText, dvDic[dv]['Result'], dvDic[dv]['UniqueId'] or dvDic[dv]['_id'], category, sequence, abstract)
+                abstraction = dataConversion(dv['ResultDate'], linkText, dv['Result'], dv['UniqueId'] or dv['_id'], category, sequence, abstract)
                 return abstraction
     return abstraction
 
-def antiboticMedValue(medDic, med_name, link_text, sequence=0, category=None, abstract=False):
-    for mv in medDic or []:
-        if (
-            medDic[mv]['Route'] is not None and
-            medDic[mv]['Category'] == med_name and
-            (re.search(r'\bEye\b', medDic[mv]['Route'], re.IGNORECASE) is None and 
-            re.search(r'\btopical\b', medDic[mv]['Route'], re.IGNORECASE) is None and 
-            re.search(r'\bocular\b', medDic[mv]['Route'], re.IGNORECASE) is None and 
-            re.search(r'\bophthalmic\b', medDic[mv]['Route'], re.IGNORECASE) is None)
-        ):
-            if abstract == True:
-                medDataConversion(medDic[mv]['StartDate'], link_text, medDic[mv]['Medication'], medDic[mv]['ExternalId'], medDic[mv]['Dosage'], medDic[mv]['Route'], category, sequence)
-                return True
-            elif abstract == False:
-                abstraction = medDataConversion(medDic[mv]['StartDate'], link_text, medDic[mv]['Medication'], medDic[mv]['ExternalId'], medDic[mv]['Dosage'], medDic[mv]['Route'], category, sequence, abstract)
-                return abstraction
-    return None
-
-def medDataConversion(datetime, linkText, med, id, dosage, route, category, sequence, abstract=True):
-    date_time = datetimeFromUtcToLocal(datetime)
-    date_time = date_time.ToString("MM/dd/yyyy, HH:mm")
-    linkText = linkText.replace("[STARTDATE]", date_time)
-    linkText = linkText.replace("[MEDICATION]", med)
-    linkText = linkText.replace("[DOSAGE]", dosage)
-    if route is not None: linkText = linkText.replace("[ROUTE]", route)
-    else: linkText = linkText.replace(", Route [ROUTE]", "")
-    if abstract == True:
-        abstraction = MatchedCriteriaLink(linkText, None, None, None, True, None, None, sequence)
-        abstraction.MedicationId = id
-        category.Links.Add(abstraction)
-    elif abstract == False:
-        abstraction = MatchedCriteriaLink(linkText, None, None, None, True, None, None, sequence)
-        abstraction.MedicationId = id
-        return abstraction
-    return
-
 #========================================
 #  Algorithm
 #========================================
-db.LogEvaluationScriptMessage("Script starting " + str(account._id), scriptName, scriptInstance, "Debug")
+scriptLog.debug("Script starting %s", account._id)
 #Standard Variable Declaration
 AlertPassed = False
 alertTriggered = False
@@ -387,172 +173,154 @@ for alert in account.MatchedCriteriaGroups or []:
 #Check if alert was autoresolved or completed.
 if validated is False:
     #Get meds within last X days
-    mainMedDic = {}
-    unsortedMedDic = {}
-    medCount = 0
     #Combine all items into one list to search against
     medSearchList = ["Antibiotic2", "Antibiotic"]
     #Set datelimit for how far back to 
     medDateLimit = System.DateTime.Now.AddDays(-7)
-    #Loop through all meds finding any that match in the combined list adding to a dictionary the matches
-    if 'Medications' in account:    
-        for med in account.Medications:
-            if med.StartDate >= medDateLimit and 'Category' in med and med.Category is not None:
-                if any(item == med.Category for item in medSearchList):
-                    medCount += 1
-                    unsortedMedDic[medCount] = med
-    #Sort List by latest
-    mainMedDic = sorted(unsortedMedDic.items(), key=lambda x: x[1]['StartDate'], reverse=True)
+    #Collect matching meds, sorted by latest
+    mainMedDic = context.medications(medSearchList, medDateLimit)
     
     #Find all discrete values for custom lookups within the last 7 days
-    maindiscreteDic = {}
-    unsortedDicsreteDic = {}
-    dvCount = 0
     #Combine all items into one list to search against
     discreteSearchList = [i for j in [dvCBlood, dvSARSCOVID, dvSARSCOVIDAntigen, dvInfluenzeScreenA, 
                         dvInfluenzeScreenB, dvCResp, dvPneumococcalAntigen] for i in j]
     #Set datelimit for how far back to 
     dvDateLimit = System.DateTime.Now.AddDays(-7)
-    #Loop through all dvs finding any that match in the combined list adding to a dictionary the matches
-    for dv in discreteValues or []:
-        if dv.ResultDate >= dvDateLimit:
-            if any(item == dv.Name for item in discreteSearchList):
-                dvCount += 1
-                unsortedDicsreteDic[dvCount] = dv
-    #Sort List by latest
-    maindiscreteDic = sorted(unsortedDicsreteDic.items(), key=lambda x: x[1]['ResultDate'], reverse=True)
+    #Index all dvs that match in the combined list by name, sorted by latest
+    maindiscreteDic = DiscreteValueIndex(discreteValues, discreteSearchList, dvDateLimit)
     #Full Spec Codes
-    d80Codes = prefixCodeValue("^D80\.", "Immunodeficiency with Predominantly Antibody Defects: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 6)
-    d81Codes = prefixCodeValue("^D81\.", "Combined Immunodeficiencies: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 6)
-    d82Codes = prefixCodeValue("^D82\.", "Immunodeficiency Associated with other Major Defects: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 6)
-    d83Codes = prefixCodeValue("^D83\.", "Common Variable Immunodeficiency: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 6)
-    d84Codes = prefixCodeValue("^D84\.", "Other Immunodeficiencies: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 6)
+    evidence = Evidence()
+    evidence.define("d80Codes", prefixCodeValue, "^D80\.", "Immunodeficiency with Predominantly Antibody Defects: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 6)
+    evidence.define("d81Codes", prefixCodeValue, "^D81\.", "Combined Immunodeficiencies: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 6)
+    evidence.define("d82Codes", prefixCodeValue, "^D82\.", "Immunodeficiency Associated with other Major Defects: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 6)
+    evidence.define("d83Codes", prefixCodeValue, "^D83\.", "Common Variable Immunodeficiency: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 6)
+    evidence.define("d84Codes", prefixCodeValue, "^D84\.", "Other Immunodeficiencies: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 6)
     #Infection
-    b44Codes = prefixCodeValue("^B44\.", "Aspergillosis Infection: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 1)
-    r7881Code = codeValue("R78.81", "Bacteremia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 2)
-    b40Codes = prefixCodeValue("^B40\.", "Blastomycosis Infection: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 3)
-    cBloodDV = dvPositiveCheck(dict(maindiscreteDic), dvCBlood, "Blood Culture Result: '[VALUE]' (Result Date: [RESULTDATETIME])", 4)
-    b43Codes = prefixCodeValue("^B43\.", "Chromomycosis And Pheomycotic Abscess Infection: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 5)
-    covidDV = dvPositiveCheck(dict(maindiscreteDic), dvSARSCOVID, "Covid 19 Screen: '[VALUE]' (Result Date: [RESULTDATETIME])", 6)
-    covidAntiDV = dvPositiveCheck(dict(maindiscreteDic), dvSARSCOVIDAntigen, "Covid 19 Screen: '[VALUE]' (Result Date: [RESULTDATETIME])", 7)
-    b45Codes = prefixCodeValue("^B45\.", "Cryptococcosis Infection: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 8)
-    b25Codes = prefixCodeValue("^B25\.", "Cytomegaloviral Disease Code: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 9)
-    infectionAbs = abstractValue("INFECTION", "Infection '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 10)
-    influenzeADV = dvPositiveCheck(dict(maindiscreteDic), dvInfluenzeScreenA, "Influenza A Screen: '[VALUE]' (Result Date: [RESULTDATETIME])", 11)
-    influenzeBDV = dvPositiveCheck(dict(maindiscreteDic), dvInfluenzeScreenB, "Influenza B Screen: '[VALUE]' (Result Date: [RESULTDATETIME])", 12)
-    b49Codes = prefixCodeValue("^B49\.", "Mycosis Infection: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 13)
-    b96Codes = prefixCodeValue("^B96\.", "Other Bacterial Agents As The Cause Of Diseases Infection: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 14)
-    b41Codes = prefixCodeValue("^B41\.", "Paracoccidioidomycosis Infection: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 15)
-    r835Code = codeValue("R83.5", "Positive Cerebrospinal Fluid Culture: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 16)
-    r845Code = codeValue("R84.5", "Positive Respiratory Culture: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 17)
-    posWoundCultAbs = abstractValue("POSITIVE_WOUND_CULTURE", "Positive Wound Culture '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 18)
-    cRespDV = dvmrsaCheck(dict(maindiscreteDic), dvCResp, "Final Report", "Respiratory Blood Culture Result: '[VALUE]' (Result Date: [RESULTDATETIME])", 19)
-    b42Codes = prefixCodeValue("^B42\.", "Sporotrichosis Infection: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 20)
-    pneumococcalAntiDV = dvPositiveCheck(dict(maindiscreteDic), dvPneumococcalAntigen, "Strept Pneumonia Screen: '[VALUE]' (Result Date: [RESULTDATETIME])", 21)
-    b95Codes = prefixCodeValue("^B95\.", "Streptococcus, Staphylococcus, and Enterococcus Infection: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 22)
-    b46Codes = prefixCodeValue("^B46\.", "Zygomycosis Infection: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 23)
+    evidence.define("b44Codes", prefixCodeValue, "^B44\.", "Aspergillosis Infection: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 1)
+    evidence.define("r7881Code", codeValue, "R78.81", "Bacteremia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 2)
+    evidence.define("b40Codes", prefixCodeValue, "^B40\.", "Blastomycosis Infection: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 3)
+    cBloodDV = dvPositiveCheck(maindiscreteDic, dvCBlood, "Blood Culture Result: '[VALUE]' (Result Date: [RESULTDATETIME])", 4)
+    evidence.define("b43Codes", prefixCodeValue, "^B43\.", "Chromomycosis And Pheomycotic Abscess Infection: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 5)
+    covidDV = dvPositiveCheck(maindiscreteDic, dvSARSCOVID, "Covid 19 Screen: '[VALUE]' (Result Date: [RESULTDATETIME])", 6)
+    covidAntiDV = dvPositiveCheck(maindiscreteDic, dvSARSCOVIDAntigen, "Covid 19 Screen: '[VALUE]' (Result Date: [RESULTDATETIME])", 7)
+    evidence.define("b45Codes", prefixCodeValue, "^B45\.", "Cryptococcosis Infection: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 8)
+    evidence.define("b25Codes", prefixCodeValue, "^B25\.", "Cytomegaloviral Disease Code: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 9)
+    evidence.define("infectionAbs", abstractValue, "INFECTION", "Infection '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 10)
+    influenzeADV = dvPositiveCheck(maindiscreteDic, dvInfluenzeScreenA, "Influenza A Screen: '[VALUE]' (Result Date: [RESULTDATETIME])", 11)
+    influenzeBDV = dvPositiveCheck(maindiscreteDic, dvInfluenzeScreenB, "Influenza B Screen: '[VALUE]' (Result Date: [RESULTDATETIME])", 12)
+    evidence.define("b49Codes", prefixCodeValue, "^B49\.", "Mycosis Infection: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 13)
+    evidence.define("b96Codes", prefixCodeValue, "^B96\.", "Other Bacterial Agents As The Cause Of Diseases Infection: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 14)
+    evidence.define("b41Codes", prefixCodeValue, "^B41\.", "Paracoccidioidomycosis Infection: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 15)
+    evidence.define("r835Code", codeValue, "R83.5", "Positive Cerebrospinal Fluid Culture: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 16)
+    evidence.define("r845Code", codeValue, "R84.5", "Positive Respiratory Culture: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 17)
+    evidence.define("posWoundCultAbs", abstractValue, "POSITIVE_WOUND_CULTURE", "Positive Wound Culture '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 18)
+    cRespDV = dvmrsaCheck(maindiscreteDic, dvCResp, "Final Report", "Respiratory Blood Culture Result: '[VALUE]' (Result Date: [RESULTDATETIME])", 19)
+    evidence.define("b42Codes", prefixCodeValue, "^B42\.", "Sporotrichosis Infection: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 20)
+    pneumococcalAntiDV = dvPositiveCheck(maindiscreteDic, dvPneumococcalAntigen, "Strept Pneumonia Screen: '[VALUE]' (Result Date: [RESULTDATETIME])", 21)
+    evidence.define("b95Codes", prefixCodeValue, "^B95\.", "Streptococcus, Staphylococcus, and Enterococcus Infection: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 22)
+    evidence.define("b46Codes", prefixCodeValue, "^B46\.", "Zygomycosis Infection: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 23)
     #Medication That Can Suppress The Immune System
-    antimetabolitesMed = medValue("Antimetabolite", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 1)
-    antimetabolitesAbs = abstractValue("ANTIMETABOLITE", "Antimetabolites '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 2)
-    z5111Code = codeValue("Z51.11", "Antineoplastic Chemotherapy: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 3)
-    z5112Code = codeValue("Z51.12", "Antineoplastic Immunotherapy: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 4)
-    antirejectionMed = medValue("Antirejection Medication", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 5)
-    antirejectionMedAbs = abstractValue("ANTIREJECTION_MEDICATION", "Anti-Rejection Medication '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 6)
-    a3E04305Code = codeValue("3E04305", "Chemotherapy Administration: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 7)
-    interferonsMed = medValue("Interferon", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 8)
-    interferonsAbs = abstractValue("INTERFERON", "Interferon '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 9)
-    z796Codes = prefixCodeValue("^Z79\.6", "Long term Immunomodulators and Immunosuppressants: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 10)
-    z7952Code = codeValue("Z79.52", "Long term Systemic Sterioids: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 11)
-    monoclonalAntibodiesMed = medValue("Monoclonal Antibodies", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 12)
-    monoclonalAntibodiesAbs = abstractValue("MONOCLONAL_ANTIBODIES", "Monoclonal Antibodies '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 13)
-    tumorNecrosisMed = medValue("Tumor Necrosis Factor Alpha Inhibitor", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 14)
-    tumorNecrosisAbs = abstractValue("TUMOR_NECROSIS_FACTOR_ALPHA_INHIBITOR", "Tumor Necrosis Factor Alpha Inhibitor '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 15)
+    evidence.define("antimetabolitesMed", medValue, "Antimetabolite", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 1)
+    evidence.define("antimetabolitesAbs", abstractValue, "ANTIMETABOLITE", "Antimetabolites '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 2)
+    evidence.define("z5111Code", codeValue, "Z51.11", "Antineoplastic Chemotherapy: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 3)
+    evidence.define("z5112Code", codeValue, "Z51.12", "Antineoplastic Immunotherapy: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 4)
+    evidence.define("antirejectionMed", medValue, "Antirejection Medication", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 5)
+    evidence.define("antirejectionMedAbs", abstractValue, "ANTIREJECTION_MEDICATION", "Anti-Rejection Medication '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 6)
+    evidence.define("a3E04305Code", codeValue, "3E04305", "Chemotherapy Administration: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 7)
+    evidence.define("interferonsMed", medValue, "Interferon", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 8)
+    evidence.define("interferonsAbs", abstractValue, "INTERFERON", "Interferon '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 9)
+    evidence.define("z796Codes", prefixCodeValue, "^Z79\.6", "Long term Immunomodulators and Immunosuppressants: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 10)
+    evidence.define("z7952Code", codeValue, "Z79.52", "Long term Systemic Sterioids: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 11)
+    evidence.define("monoclonalAntibodiesMed", medValue, "Monoclonal Antibodies", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 12)
+    evidence.define("monoclonalAntibodiesAbs", abstractValue, "MONOCLONAL_ANTIBODIES", "Monoclonal Antibodies '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 13)
+    evidence.define("tumorNecrosisMed", medValue, "Tumor Necrosis Factor Alpha Inhibitor", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 14)
+    evidence.define("tumorNecrosisAbs", abstractValue, "TUMOR_NECROSIS_FACTOR_ALPHA_INHIBITOR", "Tumor Necrosis Factor Alpha Inhibitor '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 15)
     #Chronic Conditions
-    alcoholismCodes = multiCodeValue(["F10.20", "F10.220", "F10.2221", "F10.2229", "F10.230",
+    evidence.define("alcoholismCodes", multiCodeValue, ["F10.20", "F10.220", "F10.2221", "F10.2229", "F10.230",
         "F10.20", "F10.231", "F10.232", "F10.239", "F10.24", "F10.250", "F10.251", "F10.259", "F10.26",
         "F10.27", "F10.280", "F10.281", "F10.282", "F10.288", "F10.29"],
         "Alcoholism: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 1)
-    q8901Code = codeValue("Q89.01", "Asplenia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 2)
-    z9481Code = codeValue("Z94.81", "Bone Marrow Transplant: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 3)
-    e84Codes = prefixCodeValue("^E84\.", "Cystic Fibrosis: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 4)
-    k721Codes = prefixCodeValue("^K72\.1", "End Stage Liver Disease: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 5)
-    n186Code = codeValue("N18.6", "ESRD: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 6)
-    c82Codes = prefixCodeValue("^C82\.", "Follicular Lymphoma: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 7)
-    z941Code = codeValue("Z94.1", "Heart Transplant: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 8)
-    z943Code = codeValue("Z94.3", "Heart and Lung Transplant: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 9)
-    b20Code = codeValue("B20", "HIV/AIDS: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 10)
-    c81Codes = prefixCodeValue("^C81\.", "Hodgkin Lymphoma: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 11)
-    c88Codes = prefixCodeValue("^C88\.", "Immunoproliferative Disease: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 12)
-    z9482Code = codeValue("Z94.82", "Intestine Transplant: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 13)
-    z940Code = codeValue("Z94.0", "Kidney Transplant: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 14)
-    c95Codes = prefixCodeValue("^C95\.", "Leukemia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 15)
-    c94Codes = prefixCodeValue("^C94\.", "Leukemia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 16)
-    c93Codes = prefixCodeValue("^C93\.", "Leukemia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 17)
-    c92Codes = prefixCodeValue("^C92\.", "Leukemia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 18)
-    d72819Code = codeValue("D72.819", "Leukopenia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 19)
-    z944Code = codeValue("Z94.4", "Liver Transplant: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 20)
-    z942Code = codeValue("Z94.2", "Lung Transplant: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 21)
-    c91Codes = prefixCodeValue("^C91\.", "Lymphoid Leukemia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 22)
-    c85Codes = prefixCodeValue("^C85\.", "Lymphoma: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 23)
-    c86Codes = prefixCodeValue("^C86\.", "Lymphoma: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 24)
-    m32Codes = prefixCodeValue("^M32\.", "Lupus: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 25)
-    c96Codes = prefixCodeValue("^C96\.", "Malignant Neoplasms: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 26)
-    c84Codes = prefixCodeValue("^C84\.", "Mature T/NK-Cell  Lymphoma: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 27)
-    c90Codes = prefixCodeValue("^C90\.", "Multiple Myeloma: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 28)
-    d46Codes = prefixCodeValue("^D46\.", "Myelodysplastic Syndrome: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 29)
-    c83Codes = prefixCodeValue("^C83\.", "Non-Follicular Lymphoma: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 30)
-    z9483Code = codeValue("Z94.83", "Pancreas Transplant: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 31)
-    pancytopeniaCodes = multiCodeValue(["D61.810", "D61.811", "D61.818"], "Pancytopenia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 32)
-    hba1cDV = dvValue(dvhba1c, "Poorly controlled HbA1c: [VALUE] (Result Date: [RESULTDATETIME])", calchba1c101, 33)
-    m05Codes = prefixCodeValue("^M05\.", "RA: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 34)
-    m06Codes = prefixCodeValue("^M06\.", "RA: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 35)
-    severeMalnutritionCodes = multiCodeValue(["E40", "E41", "E42", "E43"], "Severe Malnutrition: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 36)
-    r161Code = codeValue("R16.1", "Splenomegaly: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 37)
+    evidence.define("q8901Code", codeValue, "Q89.01", "Asplenia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 2)
+    evidence.define("z9481Code", codeValue, "Z94.81", "Bone Marrow Transplant: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 3)
+    evidence.define("e84Codes", prefixCodeValue, "^E84\.", "Cystic Fibrosis: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 4)
+    evidence.define("k721Codes", prefixCodeValue, "^K72\.1", "End Stage Liver Disease: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 5)
+    evidence.define("n186Code", codeValue, "N18.6", "ESRD: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 6)
+    evidence.define("c82Codes", prefixCodeValue, "^C82\.", "Follicular Lymphoma: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 7)
+    evidence.define("z941Code", codeValue, "Z94.1", "Heart Transplant: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 8)
+    evidence.define("z943Code", codeValue, "Z94.3", "Heart and Lung Transplant: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 9)
+    evidence.define("b20Code", codeValue, "B20", "HIV/AIDS: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 10)
+    evidence.define("c81Codes", prefixCodeValue, "^C81\.", "Hodgkin Lymphoma: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 11)
+    evidence.define("c88Codes", prefixCodeValue, "^C88\.", "Immunoproliferative Disease: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 12)
+    evidence.define("z9482Code", codeValue, "Z94.82", "Intestine Transplant: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 13)
+    evidence.define("z940Code", codeValue, "Z94.0", "Kidney Transplant: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 14)
+    evidence.define("c95Codes", prefixCodeValue, "^C95\.", "Leukemia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 15)
+    evidence.define("c94Codes", prefixCodeValue, "^C94\.", "Leukemia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 16)
+    evidence.define("c93Codes", prefixCodeValue, "^C93\.", "Leukemia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 17)
+    evidence.define("c92Codes", prefixCodeValue, "^C92\.", "Leukemia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 18)
+    evidence.define("d72819Code", codeValue, "D72.819", "Leukopenia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 19)
+    evidence.define("z944Code", codeValue, "Z94.4", "Liver Transplant: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 20)
+    evidence.define("z942Code", codeValue, "Z94.2", "Lung Transplant: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 21)
+    evidence.define("c91Codes", prefixCodeValue, "^C91\.", "Lymphoid Leukemia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 22)
+    evidence.define("c85Codes", prefixCodeValue, "^C85\.", "Lymphoma: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 23)
+    evidence.define("c86Codes", prefixCodeValue, "^C86\.", "Lymphoma: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 24)
+    evidence.define("m32Codes", prefixCodeValue, "^M32\.", "Lupus: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 25)
+    evidence.define("c96Codes", prefixCodeValue, "^C96\.", "Malignant Neoplasms: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 26)
+    evidence.define("c84Codes", prefixCodeValue, "^C84\.", "Mature T/NK-Cell  Lymphoma: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 27)
+    evidence.define("c90Codes", prefixCodeValue, "^C90\.", "Multiple Myeloma: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 28)
+    evidence.define("d46Codes", prefixCodeValue, "^D46\.", "Myelodysplastic Syndrome: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 29)
+    evidence.define("c83Codes", prefixCodeValue, "^C83\.", "Non-Follicular Lymphoma: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 30)
+    evidence.define("z9483Code", codeValue, "Z94.83", "Pancreas Transplant: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 31)
+    evidence.define("pancytopeniaCodes", multiCodeValue, ["D61.810", "D61.811", "D61.818"], "Pancytopenia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 32)
+    evidence.define("hba1cDV", dvValue, dvhba1c, "Poorly controlled HbA1c: [VALUE] (Result Date: [RESULTDATETIME])", calchba1c101, 33)
+    evidence.define("m05Codes", prefixCodeValue, "^M05\.", "RA: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 34)
+    evidence.define("m06Codes", prefixCodeValue, "^M06\.", "RA: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 35)
+    evidence.define("severeMalnutritionCodes", multiCodeValue, ["E40", "E41", "E42", "E43"], "Severe Malnutrition: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 36)
+    evidence.define("r161Code", codeValue, "R16.1", "Splenomegaly: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 37)
     #Labs
-    wbcDV = dvValue(dvWBC, "WBC: [VALUE] (Result Date: [RESULTDATETIME])", calcWBC1, 2)
+    evidence.define("wbcDV", dvValue, dvWBC, "WBC: [VALUE] (Result Date: [RESULTDATETIME])", calcWBC1, 2)
     
     #Spec Code Count
-    if d80Codes is not None or d81Codes is not None or d82Codes is not None or d83Codes is not None or d84Codes is not None:
+    if evidence.d80Codes is not None or evidence.d81Codes is not None or evidence.d82Codes is not None or evidence.d83Codes is not None or evidence.d84Codes is not None:
         codesTrigger = True
     #Infection Count
     if (
-        b44Codes is not None or r7881Code is not None or  b40Codes is not None or cBloodDV is not None or b43Codes is not None or
-        covidDV is not None or covidAntiDV is not None or b45Codes is not None or b25Codes is not None or infectionAbs is not None or
-        influenzeADV is not None or influenzeBDV is not None or b49Codes is not None or b96Codes is not None or b41Codes is not None or
-        r835Code is not None or r845Code is not None or posWoundCultAbs is not None or cRespDV is not None or b42Codes is not None or
-        pneumococcalAntiDV is not None or b95Codes is not None or b46Codes is not None
+        evidence.b44Codes is not None or evidence.r7881Code is not None or  evidence.b40Codes is not None or cBloodDV is not None or evidence.b43Codes is not None or
+        covidDV is not None or covidAntiDV is not None or evidence.b45Codes is not None or evidence.b25Codes is not None or evidence.infectionAbs is not None or
+        influenzeADV is not None or influenzeBDV is not None or evidence.b49Codes is not None or evidence.b96Codes is not None or evidence.b41Codes is not None or
+        evidence.r835Code is not None or evidence.r845Code is not None or evidence.posWoundCultAbs is not None or cRespDV is not None or evidence.b42Codes is not None or
+        pneumococcalAntiDV is not None or evidence.b95Codes is not None or evidence.b46Codes is not None
     ):
         infectionTrigger = True
     #Meds Count
     if (
-        antimetabolitesMed is not None or antimetabolitesAbs is not None or z5111Code is not None or z5112Code is not None or antirejectionMed is not None or
-        antirejectionMedAbs is not None or a3E04305Code is not None or interferonsMed is not None or interferonsAbs is not None or z796Codes is not None or
-        z7952Code is not None or monoclonalAntibodiesMed is not None or monoclonalAntibodiesAbs is not None or
-        tumorNecrosisMed is not None or tumorNecrosisAbs is not None
+        evidence.antimetabolitesMed is not None or evidence.antimetabolitesAbs is not None or evidence.z5111Code is not None or evidence.z5112Code is not None or evidence.antirejectionMed is not None or
+        evidence.antirejectionMedAbs is not None or evidence.a3E04305Code is not None or evidence.interferonsMed is not None or evidence.interferonsAbs is not None or evidence.z796Codes is not None or
+        evidence.z7952Code is not None or evidence.monoclonalAntibodiesMed is not None or evidence.monoclonalAntibodiesAbs is not None or
+        evidence.tumorNecrosisMed is not None or evidence.tumorNecrosisAbs is not None
     ):
         medicationTrigger = True
     #Chronic Count
     if (
-        alcoholismCodes is not None or q8901Code is not None or z9481Code is not None or
-        e84Codes is not None or k721Codes is not None or n186Code is not None or c82Codes is not None or z941Code is not None or
-        z943Code is not None or b20Code is not None or c81Codes is not None or c88Codes is not None or z9482Code is not None or
-        z940Code is not None or c95Codes is not None or c94Codes is not None or c93Codes is not None or
-        c92Codes is not None or z944Code is not None or z942Code is not None or c91Codes is not None or c85Codes is not None or
-        c86Codes is not None or m32Codes is not None or c96Codes is not None or c84Codes is not None or c90Codes is not None or
-        d46Codes is not None or c83Codes is not None or z9483Code is not None or r161Code is not None or
-        hba1cDV is not None or m05Codes is not None or m06Codes is not None or severeMalnutritionCodes is not None
+        evidence.alcoholismCodes is not None or evidence.q8901Code is not None or evidence.z9481Code is not None or
+        evidence.e84Codes is not None or evidence.k721Codes is not None or evidence.n186Code is not None or evidence.c82Codes is not None or evidence.z941Code is not None or
+        evidence.z943Code is not None or evidence.b20Code is not None or evidence.c81Codes is not None or evidence.c88Codes is not None or evidence.z9482Code is not None or
+        evidence.z940Code is not None or evidence.c95Codes is not None or evidence.c94Codes is not None or evidence.c93Codes is not None or
+        evidence.c92Codes is not None or evidence.z944Code is not None or evidence.z942Code is not None or evidence.c91Codes is not None or evidence.c85Codes is not None or
+        evidence.c86Codes is not None or evidence.m32Codes is not None or evidence.c96Codes is not None or evidence.c84Codes is not None or evidence.c90Codes is not None or
+        evidence.d46Codes is not None or evidence.c83Codes is not None or evidence.z9483Code is not None or evidence.r161Code is not None or
+        evidence.hba1cDV is not None or evidence.m05Codes is not None or evidence.m06Codes is not None or evidence.severeMalnutritionCodes is not None
     ):
         chronicTrigger = True
         
     #Algorithm
     if codesTrigger:
-        db.LogEvaluationScriptMessage("One or more specific code(s) were on the chart, alert failed" + str(account._id), scriptName, scriptInstance, "Debug")
+        scriptLog.debug("One or more specific code(s) were on the chart, alert failed%s", account._id)
         if alertTriggered:
-            if d80Codes is not None: updateLinkText(d80Codes, autoCodeText); dc.Links.Add(d80Codes)
-            if d81Codes is not None: updateLinkText(d81Codes, autoCodeText); dc.Links.Add(d81Codes)
-            if d82Codes is not None: updateLinkText(d82Codes, autoCodeText); dc.Links.Add(d82Codes)
-            if d83Codes is not None: updateLinkText(d83Codes, autoCodeText); dc.Links.Add(d83Codes)
-            if d84Codes is not None: updateLinkText(d84Codes, autoCodeText); dc.Links.Add(d84Codes)
+            if evidence.d80Codes is not None: updateLinkText(evidence.d80Codes, autoCodeText); dc.Links.Add(evidence.d80Codes)
+            if evidence.d81Codes is not None: updateLinkText(evidence.d81Codes, autoCodeText); dc.Links.Add(evidence.d81Codes)
+            if evidence.d82Codes is not None: updateLinkText(evidence.d82Codes, autoCodeText); dc.Links.Add(evidence.d82Codes)
+            if evidence.d83Codes is not None: updateLinkText(evidence.d83Codes, autoCodeText); dc.Links.Add(evidence.d83Codes)
+            if evidence.d84Codes is not None: updateLinkText(evidence.d84Codes, autoCodeText); dc.Links.Add(evidence.d84Codes)
             result.Outcome = "AUTORESOLVED"
             result.Reason = "Autoresolved due to one or more specified code(s) on the Account"
             result.Validated = True
@@ -571,65 +339,65 @@ if validated is False:
         result.Subtitle = "Infection Present with Possible Link to Immunocompromised State Due to Chronic Condition"
         AlertPassed = True        
 
-    elif codesTrigger is False and (pancytopeniaCodes is not None or d72819Code is not None or wbcDV is not None) and (medicationTrigger or chronicTrigger):
-        if d72819Code is not None: chronic.Links.Add(d72819Code)
-        if pancytopeniaCodes is not None: chronic.Links.Add(pancytopeniaCodes)
+    elif codesTrigger is False and (evidence.pancytopeniaCodes is not None or evidence.d72819Code is not None or evidence.wbcDV is not None) and (medicationTrigger or chronicTrigger):
+        if evidence.d72819Code is not None: chronic.Links.Add(evidence.d72819Code)
+        if evidence.pancytopeniaCodes is not None: chronic.Links.Add(evidence.pancytopeniaCodes)
         result.Subtitle = "Possible Immunocompromised State"
         AlertPassed = True
 
     else:
-        db.LogEvaluationScriptMessage("Not enough data to warrent alert, Alert Failed. " + str(account._id), scriptName, scriptInstance, "Debug")
+        scriptLog.debug("Not enough data to warrent alert, Alert Failed. %s", account._id)
         AlertPassed = False
         result.Passed = False
 
 else:
-    db.LogEvaluationScriptMessage("Alert Closed; Exiting script run. Outcome: " + str(outcome) + " " + str(account._id), scriptName, scriptInstance, "Debug")
+    scriptLog.debug("Alert Closed; Exiting script run. Outcome: %s %s", outcome, account._id)
 
 #Alert Passed Abstractions
 if AlertPassed:
     #Infection
-    if b44Codes is not None: infectonProcess.Links.Add(b44Codes)
-    if r7881Code is not None: infectonProcess.Links.Add(r7881Code)
-    if b40Codes is not None: infectonProcess.Links.Add(b40Codes)
+    if evidence.b44Codes is not None: infectonProcess.Links.Add(evidence.b44Codes)
+    if evidence.r7881Code is not None: infectonProcess.Links.Add(evidence.r7881Code)
+    if evidence.b40Codes is not None: infectonProcess.Links.Add(evidence.b40Codes)
     if cBloodDV is not None: infectonProcess.Links.Add(cBloodDV)
-    if b43Codes is not None: infectonProcess.Links.Add(b43Codes)
+    if evidence.b43Codes is not None: infectonProcess.Links.Add(evidence.b43Codes)
     if covidDV is not None: infectonProcess.Links.Add(covidDV)
     if covidAntiDV is not None: infectonProcess.Links.Add(covidAntiDV)
-    if b45Codes is not None: infectonProcess.Links.Add(b45Codes)
-    if b25Codes is not None: infectonProcess.Links.Add(b25Codes)
-    if infectionAbs is not None: infectonProcess.Links.Add(infectionAbs)
+    if evidence.b45Codes is not None: infectonProcess.Links.Add(evidence.b45Codes)
+    if evidence.b25Codes is not None: infectonProcess.Links.Add(evidence.b25Codes)
+    if evidence.infectionAbs is not None: infectonProcess.Links.Add(evidence.infectionAbs)
     if influenzeADV is not None: infectonProcess.Links.Add(influenzeADV)
     if influenzeBDV is not None: infectonProcess.Links.Add(influenzeBDV)
-    if b49Codes is not None: infectonProcess.Links.Add(b49Codes)
-    if b96Codes is not None: infectonProcess.Links.Add(b96Codes)
-    if b41Codes is not None: infectonProcess.Links.Add(b41Codes)
-    if r835Code is not None: infectonProcess.Links.Add(r835Code)
-    if r845Code is not None: infectonProcess.Links.Add(r845Code)
-    if posWoundCultAbs is not None: infectonProcess.Links.Add(posWoundCultAbs)
+    if evidence.b49Codes is not None: infectonProcess.Links.Add(evidence.b49Codes)
+    if evidence.b96Codes is not None: infectonProcess.Links.Add(evidence.b96Codes)
+    if evidence.b41Codes is not None: infectonProcess.Links.Add(evidence.b41Codes)
+    if evidence.r835Code is not None: infectonProcess.Links.Add(evidence.r835Code)
+    if evidence.r845Code is not None: infectonProcess.Links.Add(evidence.r845Code)
+    if evidence.posWoundCultAbs is not None: infectonProcess.Links.Add(evidence.posWoundCultAbs)
     if cRespDV is not None: infectonProcess.Links.Add(cRespDV)
-    if b42Codes is not None: infectonProcess.Links.Add(b42Codes)
+    if evidence.b42Codes is not None: infectonProcess.Links.Add(evidence.b42Codes)
     if pneumococcalAntiDV is not None: infectonProcess.Links.Add(pneumococcalAntiDV)
-    if b95Codes is not None: infectonProcess.Links.Add(b95Codes)
-    if b46Codes is not None: infectonProcess.Links.Add(b46Codes)
+    if evidence.b95Codes is not None: infectonProcess.Links.Add(evidence.b95Codes)
+    if evidence.b46Codes is not None: infectonProcess.Links.Add(evidence.b46Codes)
     #Meds
-    if antimetabolitesMed is not None: medIS.Links.Add(antimetabolitesMed)
-    if antimetabolitesAbs is not None: medIS.Links.Add(antimetabolitesAbs)
-    if z5111Code is not None: medIS.Links.Add(z5111Code)
-    if z5112Code is not None: medIS.Links.Add(z5112Code)
-    if antirejectionMed is not None: medIS.Links.Add(antirejectionMed)
-    if antirejectionMedAbs is not None: medIS.Links.Add(antirejectionMedAbs)
-    if a3E04305Code is not None: medIS.Links.Add(a3E04305Code)
-    if interferonsMed is not None: medIS.Links.Add(interferonsMed)
-    if interferonsAbs is not None: medIS.Links.Add(interferonsAbs)
-    if z796Codes is not None: medIS.Links.Add(z796Codes)
-    if z7952Code is not None: medIS.Links.Add(z7952Code)
-    if monoclonalAntibodiesMed is not None: medIS.Links.Add(monoclonalAntibodiesMed)
-    if monoclonalAntibodiesAbs is not None: medIS.Links.Add(monoclonalAntibodiesAbs)
-    if tumorNecrosisMed is not None: medIS.Links.Add(tumorNecrosisMed)
-    if tumorNecrosisAbs is not None: medIS.Links.Add(tumorNecrosisAbs)
+    if evidence.antimetabolitesMed is not None: medIS.Links.Add(evidence.antimetabolitesMed)
+    if evidence.antimetabolitesAbs is not None: medIS.Links.Add(evidence.antimetabolitesAbs)
+    if evidence.z5111Code is not None: medIS.Links.Add(evidence.z5111Code)
+    if evidence.z5112Code is not None: medIS.Links.Add(evidence.z5112Code)
+    if evidence.antirejectionMed is not None: medIS.Links.Add(evidence.antirejectionMed)
+    if evidence.antirejectionMedAbs is not None: medIS.Links.Add(evidence.antirejectionMedAbs)
+    if evidence.a3E04305Code is not None: medIS.Links.Add(evidence.a3E04305Code)
+    if evidence.interferonsMed is not None: medIS.Links.Add(evidence.interferonsMed)
+    if evidence.interferonsAbs is not None: medIS.Links.Add(evidence.interferonsAbs)
+    if evidence.z796Codes is not None: medIS.Links.Add(evidence.z796Codes)
+    if evidence.z7952Code is not None: medIS.Links.Add(evidence.z7952Code)
+    if evidence.monoclonalAntibodiesMed is not None: medIS.Links.Add(evidence.monoclonalAntibodiesMed)
+    if evidence.monoclonalAntibodiesAbs is not None: medIS.Links.Add(evidence.monoclonalAntibodiesAbs)
+    if evidence.tumorNecrosisMed is not None: medIS.Links.Add(evidence.tumorNecrosisMed)
+    if evidence.tumorNecrosisAbs is not None: medIS.Links.Add(evidence.tumorNecrosisAbs)
     #Infection Treatment
-    antiboticMedValue(dict(mainMedDic), "Antibiotic", "Antibiotic: [MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 1, treatment, True)
-    antiboticMedValue(dict(mainMedDic), "Antibiotic2", "Antibiotic: [MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 2, treatment, True)
+    antiboticMedValue(mainMedDic, "Antibiotic", "Antibiotic: [MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 1, treatment, True)
+    antiboticMedValue(mainMedDic, "Antibiotic2", "Antibiotic: [MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 2, treatment, True)
     abstractValue("ANTIBIOTIC", "Antibiotic '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 3, treatment, True)
     abstractValue("ANTIBIOTIC_2", "Antibiotic '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 4, treatment, True)
     medValue("Antifungal", "Antifungal: [MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 5, treatment, True)
@@ -637,44 +405,44 @@ if AlertPassed:
     medValue("Antiviral", "Antiviral: [MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 7, treatment, True)
     abstractValue("ANTIVIRAL", "Antiviral '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 8, treatment, True)
     #Chronic
-    if alcoholismCodes is not None: chronic.Links.Add(alcoholismCodes)
-    if q8901Code is not None: chronic.Links.Add(q8901Code)
-    if z9481Code is not None: chronic.Links.Add(z9481Code)
-    if e84Codes is not None: chronic.Links.Add(e84Codes)
-    if k721Codes is not None: chronic.Links.Add(k721Codes)
-    if n186Code is not None: chronic.Links.Add(n186Code)
-    if c82Codes is not None: chronic.Links.Add(c82Codes)
-    if z941Code is not None: chronic.Links.Add(z941Code)
-    if z943Code is not None: chronic.Links.Add(z943Code)
-    if b20Code is not None: chronic.Links.Add(b20Code)
-    if c81Codes is not None: chronic.Links.Add(c81Codes)
-    if c88Codes is not None: chronic.Links.Add(c88Codes)
-    if z9482Code is not None: chronic.Links.Add(z9482Code)
-    if z940Code is not None: chronic.Links.Add(z940Code)
-    if c95Codes is not None: chronic.Links.Add(c95Codes)
-    if c94Codes is not None: chronic.Links.Add(c94Codes)
-    if c93Codes is not None: chronic.Links.Add(c93Codes)
-    if c92Codes is not None: chronic.Links.Add(c92Codes)
-    if z944Code is not None: chronic.Links.Add(z944Code)
-    if z942Code is not None: chronic.Links.Add(z942Code)
-    if c91Codes is not None: chronic.Links.Add(c91Codes)
-    if c85Codes is not None: chronic.Links.Add(c85Codes)
-    if c86Codes is not None: chronic.Links.Add(c86Codes)
-    if m32Codes is not None: chronic.Links.Add(m32Codes)
-    if c96Codes is not None: chronic.Links.Add(c96Codes)
-    if c84Codes is not None: chronic.Links.Add(c84Codes)
-    if c90Codes is not None: chronic.Links.Add(c90Codes)
-    if d46Codes is not None: chronic.Links.Add(d46Codes)
-    if c83Codes is not None: chronic.Links.Add(c83Codes)
-    if z9483Code is not None: chronic.Links.Add(z9483Code)
-    if hba1cDV is not None: chronic.Links.Add(hba1cDV)
-    if m05Codes is not None: chronic.Links.Add(m05Codes)
-    if m06Codes is not None: chronic.Links.Add(m06Codes)
-    if severeMalnutritionCodes is not None: chronic.Links.Add(severeMalnutritionCodes)
-    if r161Code is not None: chronic.Links.Add(r161Code)
+    if evidence.alcoholismCodes is not None: chronic.Links.Add(evidence.alcoholismCodes)
+    if evidence.q8901Code is not None: chronic.Links.Add(evidence.q8901Code)
+    if evidence.z9481Code is not None: chronic.Links.Add(evidence.z9481Code)
+    if evidence.e84Codes is not None: chronic.Links.Add(evidence.e84Codes)
+    if evidence.k721Codes is not None: chronic.Links.Add(evidence.k721Codes)
+    if evidence.n186Code is not None: chronic.Links.Add(evidence.n186Code)
+    if evidence.c82Codes is not None: chronic.Links.Add(evidence.c82Codes)
+    if evidence.z941Code is not None: chronic.Links.Add(evidence.z941Code)
+    if evidence.z943Code is not None: chronic.Links.Add(evidence.z943Code)
+    if evidence.b20Code is not None: chronic.Links.Add(evidence.b20Code)
+    if evidence.c81Codes is not None: chronic.Links.Add(evidence.c81Codes)
+    if evidence.c88Codes is not None: chronic.Links.Add(evidence.c88Codes)
+    if evidence.z9482Code is not None: chronic.Links.Add(evidence.z9482Code)
+    if evidence.z940Code is not None: chronic.Links.Add(evidence.z940Code)
+    if evidence.c95Codes is not None: chronic.Links.Add(evidence.c95Codes)
+    if evidence.c94Codes is not None: chronic.Links.Add(evidence.c94Codes)
+    if evidence.c93Codes is not None: chronic.Links.Add(evidence.c93Codes)
+    if evidence.c92Codes is not None: chronic.Links.Add(evidence.c92Codes)
+    if evidence.z944Code is not None: chronic.Links.Add(evidence.z944Code)
+    if evidence.z942Code is not None: chronic.Links.Add(evidence.z942Code)
+    if evidence.c91Codes is not None: chronic.Links.Add(evidence.c91Codes)
+    if evidence.c85Codes is not None: chronic.Links.Add(evidence.c85Codes)
+    if evidence.c86Codes is not None: chronic.Links.Add(evidence.c86Codes)
+    if evidence.m32Codes is not None: chronic.Links.Add(evidence.m32Codes)
+    if evidence.c96Codes is not None: chronic.Links.Add(evidence.c96Codes)
+    if evidence.c84Codes is not None: chronic.Links.Add(evidence.c84Codes)
+    if evidence.c90Codes is not None: chronic.Links.Add(evidence.c90Codes)
+    if evidence.d46Codes is not None: chronic.Links.Add(evidence.d46Codes)
+    if evidence.c83Codes is not None: chronic.Links.Add(evidence.c83Codes)
+    if evidence.z9483Code is not None: chronic.Links.Add(evidence.z9483Code)
+    if evidence.hba1cDV is not None: chronic.Links.Add(evidence.hba1cDV)
+    if evidence.m05Codes is not None: chronic.Links.Add(evidence.m05Codes)
+    if evidence.m06Codes is not None: chronic.Links.Add(evidence.m06Codes)
+    if evidence.severeMalnutritionCodes is not None: chronic.Links.Add(evidence.severeMalnutritionCodes)
+    if evidence.r161Code is not None: chronic.Links.Add(evidence.r161Code)
     #Labs
     dvValue(dvAbsoluteNeutrophil, "Absolute Neutropils: [VALUE] (Result Date: [RESULTDATETIME])", calcAbsoluteNeutrophil1, 1, labs, True)
-    if wbcDV is not None: labs.Links.Add(wbcDV) #2
+    if evidence.wbcDV is not None: labs.Links.Add(evidence.wbcDV) #2
     
 #If alert passed or alert conditions was triggered add categories to result if they have links
 if AlertPassed or AlertConditions:
@@ -686,8 +454,10 @@ if AlertPassed or AlertConditions:
     result.Links.Add(treatment)
     if treatment.Links: treatmentLinks = True
     result.Links.Add(other)
-    db.LogEvaluationScriptMessage("Alert Passed Adding Links. Alert Triggered: " + str(result.Subtitle) + " Autoresolved: " + str(result.Outcome) + "; " +
-        str(result.Validated) + "; Links: Infection Process- " + str(infectionProcessLinks) + ", Med IS- " + str(medISLinks) +
-        ", Chronic- " + str(chronicLinks) + "Documented Dx- " + str(dcLinks) + "Labs- " + str(labsLinks) + 
-        ", Treatment- " + str(treatmentLinks) + "; Acct: " + str(account._id), scriptName, scriptInstance, "Debug")
+    scriptLog.debug("Alert Passed Adding Links. Alert Triggered: %s Autoresolved: %s; %s; Links: Infection Process- %s, Med IS- %s, Chronic- %sDocumented Dx- %sLabs- %s, Treatment- %s; Acct: %s",
+        result.Subtitle, result.Outcome, result.Validated, infectionProcessLinks, medISLinks, chronicLinks, dcLinks, labsLinks, treatmentLinks,
+        account._id)
     result.Passed = True
+
+#Write out this run's script messages
+scriptLog.flush()
@@ -28,6 +28,7 @@ from System.Data import *
 from System.Configuration import *
 from System.Collections.Generic import *
 clr.ImportExtensions(System.Linq)
+from cdi import DiscreteValueIndex, Evidence, evaluation_context
 from operator import le, ge, gt, lt
 
 #========================================
@@ -57,14 +58,20 @@ autoCodeText = "Autoresolved Specified Code - "
 #  Globals
 #========================================
 db = CACDataRepository()
+#Account data is loaded once and shared by every script run for the account,
+#fetching only the discrete values of the last 7 days
+context = evaluation_context(account, db, System.DateTime.Now.AddDays(-7))
+#Script messages are only formatted when their level is enabled, and are written
+#together at the end of the run
+scriptLog = context.log(db, scriptName, scriptInstance)
 admitDate = account.AdmitDateTime.Date
 birthDate = account.Patient.BirthDate.Date
 gender = account.Patient.Gender
 #Update true = External DV collection False = On Acct Record
-accountContainer = AccountWorkflowContainer(account, True, "Category", 7)
+accountContainer = context.container(AccountWorkflowContainer, True, "Category", 7)
 useSeperateDiscreteCollection = True
 if useSeperateDiscreteCollection == True:
-    discreteValues = db.GetDiscreteValues(account._id)
+    discreteValues = context.discrete_values
 else:
     discreteValues = db.GetAccountField(account._id, "DiscreteValues")
 
@@ -95,193 +102,9 @@ dvHeight = [""]
 #========================================
 #  Functions
 #========================================
-def datetimeFromUtcToLocal(utc_datetime):
-    if utc_datetime:
-        convertedDate = DateTime.SpecifyKind(utc_datetime, DateTimeKind.Utc)
-        return  convertedDate.ToLocalTime()
-    else:
-        return None
-
-def cleanNumbers(result):
-    result1 = re.sub("[\\<\\>]", "", str(result))
-    if result1.count('.') <= 1 and result1.replace(".", "").isnumeric():
-        return result1
-    else:
-        return None
-
-def dataConversion(datetime, linkText, Result, id, category, sequence, abstract=True, gender=None):
-    if datetime is not None:
-        date_time = datetimeFromUtcToLocal(datetime)
-        date_time = date_time.ToString("MM/dd/yyyy, HH:mm")
-        linkText = linkText.replace("[RESULTDATETIME]", date_time)
-    else: 
-        linkText = linkText.replace("(Result Date: [RESULTDATETIME])", "")
-    if Result is not None:
-        linkText = linkText.replace("[VALUE]", Result)
-    else: linkText = linkText.replace("[VALUE]", "")
-    if gender: linkText = linkText.replace("[GENDER]", gender)
-    else: linkText = linkText.replace("[GENDER]", "")
-    if abstract == True:
-        category.Links.Add(MatchedCriteriaLink(linkText, None, None, id, True, None, None, sequence))
-    elif abstract == False:
-        abstraction = MatchedCriteriaLink(linkText, None, None, id, True, None, None, sequence)
-        return abstraction
-    return
-
-def CodeCount(codes):
-    # Get list of codes on the acct based on CodeDic
-    result = set()
-    for document in account.Documents or []:
-        for codeReference in document.CodeReferences or []:
-            if codeReference.Code in codes:
-                matching_code = codeReference.Code
-                result.add(matching_code)
-    return list(result)
-
-def abstractValue(abstraction_name, link_text, calculation, sequence=0, category=None, abstract=False):
-    # Find abstraction and if abstract is true abstract it to the provided category
-    abstraction = accountContainer.GetFirstLinkMatchingAbstractionValue(abstraction_name, link_text, lambda x: calculation)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def dvValue(dv_name, link_text, calculation, sequence=0, category=None, abstract=False):
-    # Find Discrete Value and if abstract is true abstract it to the provided category
-    for dv in dv_name:
-        abstraction = accountContainer.GetFirstLinkMatchingDiscreteValue(dv, link_text, calculation)
-        if abstraction is not None:
-            break
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def dvValueMulti(dvDic, DV1, linkText, value, sign, sequence=0, category=None, abstract=False, needed=2):
-    # Find Discrete Value and if abstract is true abstract it to the provided category
-    matchedList = []
-    x = 0
-    for dv in dvDic or []:
-        dvr = cleanNumbers(dvDic[dv]['Result'])
-        if dvDic[dv]['Name'] in DV1 and dvr is not None and sign(float(dvr), float(value)):
-            matchedList.append(dataConversion(dvDic[dv]['ResultDate'], linkText, dvDic[dv]['Result'], dvDic[dv]['UniqueId'] or dvDic[dv]['_id'], category, sequence, abstract))
-            x += 1
-            if needed <= x:
-                break
-    if abstract and x > 0:
-        return True
-    elif abstract is False and len(matchedList) > 0 and needed > 0:
-        return matchedList
-    else:
-        return None
-
-def compareValuesMulti(dvDic, DV1, value, value1, linkText, sign, sign1, sequence=0, category=None, abstract=False, needed=2):
-    matchedList = []
-    x = 0
-    for dv in dvDic or []:
-        dvr = cleanNumbers(dvDic[dv]['Result'])
-        if dvDic[dv]['Name'] in DV1 and dvr is not None and sign(float(value), float(dvr)) and sign1(float(dvr), float(value1)):
-            matchedList.append(dataConversion(dvDic[dv]['ResultDate'], linkText, dvDic[dv]['Result'], dvDic[dv]['UniqueId'] or dvDic[dv]['_id'], category, sequence, abstract))
-            x += 1
-            if needed <= x:
-                break
-    if abstract and x > 0:
-        return True
-    elif abstract is False and len(matchedList) > 0 and needed > 0:
-        return matchedList
-    else:
-        return None
-
-def codeValue(code_name, link_text, sequence=0, category=None, abstract=False):
-    # Find code and if abstract is true abstract it to the provided category
-    abstraction = accountContainer.GetFirstCodeLink(code_name, link_text)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def multiCodeValue(code_list, link_text, sequence=0, category=None, abstract=False):
-    # Go through Code List and find first code and if abstract is true abstract it to the provided category
-    abstraction = None
-    for code in code_list:
-        abstraction = accountContainer.GetFirstCodeLink(code, link_text)
-        if abstraction is not None:
-            abstraction.Sequence = sequence
-            if abstract:
-                category.Links.Add(abstraction)
-                return True
-            else:
-                return abstraction
-    if abstract and abstraction is None:
-        return False
-    return abstraction
-
-def prefixCodeValue(prefix, link_text, sequence=0, category=None, abstract=False):
-    # Use prefix to find first code match based on regex search and if abstract is true abstract it to the provided category
-    abstraction = None
-    validCodes = [codes for codes in accountContainer.CodeKeys if re.match(prefix, codes) is not None]
-    for code in validCodes:
-        abstraction = accountContainer.GetFirstCodeLink(code, link_text)
-        if abstraction is not None:
-            abstraction.Sequence = sequence
-            if abstract:
-                category.Links.Add(abstraction)
-                return True
-            else:
-                return abstraction
-    if abstract and abstraction is None:
-        return False
-    return abstraction
-
-def medValue(med_name, link_text, sequence=0, category=None, abstract=False):
-    # Find Medication Value and if abstract is true abstract it to the provided category
-    abstraction = accountContainer.GetFirstMedicationLink(med_name, link_text)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def updateLinkText(value, replacement_text):
-    # Update the link text with the provided text
-    value.LinkText = replacement_text + value.LinkText
-    return value
-
-def documentLink(DocumentType, LinkText, sequence, category, abstract):
-    # Finds a document link and adds it as link so that its a quick reference for the cdi user.
-    abstraction = None
-    abstraction = accountContainer.GetFirstDocumentLink(DocumentType, LinkText)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    return None
+#The helpers every script shares are compiled once per process and bound to this
+#script's globals, see cdi.helpers; a helper defined below replaces the shared one
+context.bind_helpers(globals(), 1)
 
 #========================================
 #  Script Specific Functions
@@ -323,7 +146,7 @@ def creatinineCheck(dvDic, discreteValueName, absValueName, linkText, category,
             if ValueComparison(cleanNumbers(discreteDic[item].Result), None, absValue):
                 abstraction.append(dataConversion(discreteDic[item].ResultDate, linkText, discreteDic[item].Result, discreteDic[item]._id or discreteDic[item].UniqueId, category, sequence, False))
         if len(abstraction) > 0:
-            db.LogEvaluationScriptMessage("Creatinine Check 1 Passed " + str(account._id), scriptName, scriptInstance, "Debug")
+            scriptLog.debug("Creatinine Check 1 Passed %s", account._id)
             return abstraction
     #Check 2
     if x > 1:
@@ -336,7 +159,7 @@ def creatinineCheck(dvDic, discreteValueName, absValueName, linkText, category,
                         if ValueComparison(cleanNumbers(discreteDic[item].Result), cleanNumbers(discreteDic[item2].Result), absValue, 1):
                             abstraction.append(dataConversion(discreteDic[item2].ResultDate, linkText, discreteDic[item2].Result, discreteDic[item2]._id or discreteDic[item2].UniqueId, category, sequence, False))
                             abstraction.append(dataConversion(discreteDic[item].ResultDate, linkText, discreteDic[item].Result, discreteDic[item]._id or discreteDic[item].UniqueId, category, sequence, False))
-                            db.LogEvaluationScriptMessage("Creatinine Check 2 Passed " + str(account._id), scriptName, scriptInstance, "Debug")
+                            scriptLog.debug("Creatinine Check 2 Passed %s", account._id)
                             return abstraction
     #Check 4
     if x > 1:
@@ -348,13 +171,13 @@ def creatinineCheck(dvDic, discreteValueName, absValueName, linkText, category,
                     if ValueComparison(cleanNumbers(discreteDic[item].Result), cleanNumbers(discreteDic[item2].Result), absValue, 2):
                         abstraction.append(dataConversion(discreteDic[item2].ResultDate, linkText, discreteDic[item2].Result, discreteDic[item2]._id or discreteDic[item2].UniqueId, category, sequence, False))
                         abstraction.append(dataConversion(discreteDic[item].ResultDate, linkText, discreteDic[item].Result, discreteDic[item]._id or discreteDic[item].UniqueId, category, sequence, False))
-                        db.LogEvaluationScriptMessage("Creatinine Check 4 Passed " + str(account._id), scriptName, scriptInstance, "Debug")
+                        scriptLog.debug("Creatinine Check 4 Passed %s", account._id)
                         return abstraction
     #Check 3
     if x > 1:
-        abstraction = dvValueMulti(dict(maindiscreteDic), dvSerumCreatinine, "Serum Creatinine: [VALUE] (Result Date: [RESULTDATETIME])", calcSerumCreatinine2, gt, 2, creatinine, False, 10)
+        abstraction = dvValueMulti(maindiscreteDic, dvSerumCreatinine, "Serum Creatinine: [VALUE] (Result Date: [RESULTDATETIME])", calcSerumCreatinine2, gt, 2, creatinine, False, 10)
         if len(abstraction or noLabs) > 1:
-            db.LogEvaluationScriptMessage("Creatinine Check 3 Passed " + str(account._id), scriptName, scriptInstance, "Debug")
+            scriptLog.debug("Creatinine Check 3 Passed %s", account._id)
             return abstraction
 
     return None
@@ -402,53 +225,53 @@ def IsValuesGreaterThanThreeDays(dvDic, discreteValueName, value, linkText, cate
 
 def dvUrineCheck(dvDic, discreteValueName, linkText, sequence=0, category=None, abstract=False):
     abstraction = None
-    for dv in dvDic or []:
-        if dvDic[dv]['Name'] in discreteValueName and dvDic[dv]['Result'] is not None and re.search(r'\d\+', dvDic[dv]['Result']) is not None:
+    for dv in dvDic.lookup(discreteValueName):
+        if dv['Result'] is not None and re.search(r'\d\+', dv['Result']) is not None:
             if abstract:
-                dataConversion(dvDic[dv]['ResultDate'], linkText, dvDic[dv]['Result'], dvDic[dv]['UniqueId'] or dvDic[dv]['_id'], category, sequence, abstract)
+                dataConversion(dv['ResultDate'], linkText, dv['Result'], dv['UniqueId'] or dv['_id'], category, sequence, abstract)
                 return True
             else:
-                abstraction = dataConversion(dvDic[dv]['ResultDate'], linkText, dvDic[dv]['Result'], dvDic[dv]['UniqueId'] or dvDic[dv]['_id'], category, sequence, abstract)
+                abstraction = dataConversion(dv['ResultDate'], linkText, dv['Result'], dv['UniqueId'] or dv['_id'], category, sequence, abstract)
                 return abstraction
     return abstraction
 
 def dvUrineCheckTwo(dvDic, discreteValueName, linkText, sequence=0, category=None, abstract=False):
     abstraction = None
-    for dv in dvDic or []:
-        if dvDic[dv]['Name'] in discreteValueName and dvDic[dv]['Result'] is not None and re.search(r'\b0-5\b', dvDic[dv]['Result'], re.IGNORECASE) is None:
+    for dv in dvDic.lookup(discreteValueName):
+        if dv['Result'] is not None and re.search(r'\b0-5\b', dv['Result'], re.IGNORECASE) is None:
             if abstract:
-                dataConversion(dvDic[dv]['ResultDate'], linkText, dvDic[dv]['Result'], dvDic[dv]['UniqueId'] or dvDic[dv]['_id'], category, sequence, abstract)
+                dataConversion(dv['ResultDate'], linkText, dv['Result'], dv['UniqueId'] or dv['_id'], category, sequence, abstract)
                 return True
             else:
-                abstraction = dataConversion(dvDic[dv]['ResultDate'], linkText, dvDic[dv]['Result'], dvDic[dv]['UniqueId'] or dvDic[dv]['_id'], category, sequence, abstract)
+                abstraction = dataConversion(dv['ResultDate'], linkText, dv['Result'], dv['UniqueId'] or dv['_id'], category, sequence, abstract)
                 return abstraction
     return abstraction
 
 def dvUrineCheckThree(dvDic, discreteValueName, linkText, sequence=0, category=None, abstract=False):
     abstraction = None
-    for dv in dvDic or []:
-        if dvDic[dv]['Name'] in discreteValueName and dvDic[dv]['Result'] is not None and re.search(r'\b0-4\b', dvDic[dv]['Result'], re.IGNORECASE) is None:
+    for dv in dvDic.lookup(discreteValueName):
+        if dv['Result'] is not None and re.search(r'\b0-4\b', dv['Result'], re.IGNORECASE) is None:
             if abstract:
-                dataConversion(dvDic[dv]['ResultDate'], linkText, dvDic[dv]['Result'], dvDic[dv]['UniqueId'] or dvDic[dv]['_id'], category, sequence, abstract)
+                dataConversion(dv['ResultDate'], linkText, dv['Result'], dv['UniqueId'] or dv['_id'], category, sequence, abstract)
                 return True
             else:
-                abstraction = dataConversion(dvDic[dv]['ResultDate'], linkText, dvDic[dv]['Result'], dvDic[dv]['UniqueId'] or dvDic[dv]['_id'], category, sequence, abstract)
+                abstraction = dataConversion(dv['ResultDate'], linkText, dv['Result'], dv['UniqueId'] or dv['_id'], category, sequence, abstract)
                 return abstraction
     return abstraction
 
 def dvUrineCheckFour(dvDic, discreteValueName, linkText, sequence=0, category=None, abstract=False):
     abstraction = None
-    for dv in dvDic or []:
-        if dvDic[dv]['Name'] in discreteValueName and dvDic[dv]['Result'] is not None:
+    for dv in dvDic.lookup(discreteValueName):
+        if dv['Result'] is not None:
             list = []
-            list = dvDic[dv]['Result'].split('-')
+            list = dv['Result'].split('-')
             list[0]
             if list[0] > 20 or list[1] > 20:
                 if abstract:
-                    dataConversion(dvDic[dv]['ResultDate'], linkText, dvDic[dv]['Result'], dvDic[dv]['UniqueId'] or dvDic[dv]['_id'], category, sequence, abstract)
+                    dataConversion(dv['ResultDate'], linkText, dv['Result'], dv['UniqueId'] or dv['_id'], category, sequence, abstract)
                     return True
                 else:
-                    abstraction = dataConversion(dvDic[dv]['ResultDate'], linkText, dvDic[dv]['Result'], dvDic[dv]['UniqueId'] or dvDic[dv]['_id'], category, sequence, abstract)
+                    abstraction = dataConversion(dv['ResultDate'], linkText, dv['Result'], dv['UniqueId'] or dv['_id'], category, sequence, abstract)
                     return abstraction
     return abstraction
 
@@ -517,17 +340,17 @@ def dvLookUpAllValuesSingleLine(dvDic, DV1, sequence, category, linkText):
 #========================================
 #  Algorithm
 #========================================
-db.LogEvaluationScriptMessage("Script starting " + str(account._id), scriptName, scriptInstance, "Debug")
+scriptLog.debug("Script starting %s", account._id)
 #Determine if if and how many fully spec codes are on the acct
 chroCodes = []
 chroCodes = chroCodeDic.keys()
-chroCodeList = CodeCount(chroCodes)
-chroCodesExist = len(chroCodeList)
-str1 = ', '.join([str(elem) for elem in chroCodeList])
 
 specCodes = []
 specCodes = specCodeDic.keys()
-specCodeList = CodeCount(specCodes)
+chroCodeList, specCodeList = CodeCounts(chroCodes, specCodes)
+chroCodesExist = len(chroCodeList)
+str1 = ', '.join([str(elem) for elem in chroCodeList])
+
 specCodesExist = len(specCodeList)
 str2 = ', '.join([str(elem) for elem in specCodeList])
 
@@ -578,26 +401,17 @@ for alert in account.MatchedCriteriaGroups or []:
         break
 
 #Abstractions or DV values that if true could retrigger the alert.
-maindiscreteDic = {}
-unsortedDicsreteDic = {}
-dvCount = 0
 #Combine all items into one list to search against
 discreteSearchList = [i for j in [dvGlomerularFiltrationRate, dvSerumCreatinine, dvHeight, dvUrinary, dvSerumBloodUreaNitrogen] for i in j]
 #Set datelimit for how far back to 
 dvDateLimit = System.DateTime.Now.AddDays(-7)
-#Loop through all dvs finding any that match in the combined list adding to a dictionary the matches
-for dv in discreteValues or []:
-    if dv.ResultDate >= dvDateLimit:
-        if any(item == dv.Name for item in discreteSearchList):
-            dvCount += 1
-            unsortedDicsreteDic[dvCount] = dv
-#Sort List by latest
-maindiscreteDic = sorted(unsortedDicsreteDic.items(), key=lambda x: x[1]['ResultDate'], reverse=True)
+#Index all dvs that match in the combined list by name, sorted by latest
+maindiscreteDic = DiscreteValueIndex(discreteValues, discreteSearchList, dvDateLimit)
 
 #Alert Triggers
 n179Code = codeValue("N17.9", "Acute Kidney Failure, Unspecified: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
 #Labs
-highSerumCreatinineMultiDayDV = IsValuesGreaterThanThreeDays(dict(maindiscreteDic), dvSerumCreatinine, 1.2, "Serum Creatinine Multiple Days: [VALUE] (Result Date: [RESULTDATETIME])", creatinine)
+highSerumCreatinineMultiDayDV = IsValuesGreaterThanThreeDays(maindiscreteDic, dvSerumCreatinine, 1.2, "Serum Creatinine Multiple Days: [VALUE] (Result Date: [RESULTDATETIME])", creatinine)
 
 #Check if alert was autoresolved or completed.
 if (
@@ -605,31 +419,35 @@ if (
     (outcome == "AUTORESOLVED" and validated and (specCodesExist > 1 or chroCodesExist > 1 or (n179Code is not None and highSerumCreatinineMultiDayDV is not None and specCodesExist == 0)))
 ):    
     #Negations
-    negationKidneyFailure = multiCodeValue(["N17.0", "N17.1", "N17.2", "N18.1", "N18.2 ", "N18.30", "N18.31", "N18.32", "N18.4", "N18.5", "N18.6", "N18.9"], "Kidney Failure Codes: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    n181Code = codeValue("N18.1", "Chronic Kidney Disease, Stage 1: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    n182Code = codeValue("N18.2", "Chronic Kidney Disease, Stage 2 (Mild): [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    n1830Code = codeValue("N18.30", "Chronic Kidney Disease, Stage 3 Unspecified: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    n1831Code = codeValue("N18.31", "Chronic Kidney Disease, Stage 3a: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    n1832Code = codeValue("N18.32", "Chronic Kidney Disease, Stage 3b: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    n184Code = codeValue("N18.4", "Chronic Kidney Disease, Stage 4 (Severe): [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    n185Code = codeValue("N18.5", "Chronic Kidney Disease, Stage 5: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    n186Code = codeValue("N18.6", "End stage renal disease: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence = Evidence()
+    evidence.define("negationKidneyFailure", multiCodeValue, ["N17.0", "N17.1", "N17.2", "N18.1", "N18.2 ", "N18.30", "N18.31", "N18.32", "N18.4", "N18.5", "N18.6", "N18.9"], "Kidney Failure Codes: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("n181Code", codeValue, "N18.1", "Chronic Kidney Disease, Stage 1: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("n182Code", codeValue, "N18.2", "Chronic Kidney Disease, Stage 2 (Mild): [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("n1830Code", codeValue, "N18.30", "Chronic Kidney Disease, Stage 3 Unspecified: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("n1831Code", codeValue, "N18.31", "Chronic Kidney Disease, Stage 3a: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("n1832Code", codeValue, "N18.32", "Chronic Kidney Disease, Stage 3b: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("n184Code", codeValue, "N18.4", "Chronic Kidney Disease, Stage 4 (Severe): [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("n185Code", codeValue, "N18.5", "Chronic Kidney Disease, Stage 5: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("n186Code", codeValue, "N18.6", "End stage renal disease: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
     #Alert Triggers
-    n19Code = codeValue("N19", "Unspecified Kidney Failure: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    n17Codes = multiCodeValue(["N17.0", "N17.1", "N17.2"], "Kidney Failure Code: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    n189Code = codeValue("N18.9", "Chronic Kidney Disease, Unspecified: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    creatinineCheckDV = creatinineCheck(dict(maindiscreteDic), dvSerumCreatinine, "BASELINE_CREATININE", "Serum Creatinine: [VALUE] (Result Date: [RESULTDATETIME])", creatinine, 1)
-    creatininieMultiDV = dvValueMulti(dict(maindiscreteDic), dvSerumCreatinine, "Serum Creatinine: [VALUE] (Result Date: [RESULTDATETIME])", calcSerumCreatinine1, ge, 0, creatinine, False, 10)
-    acutChroUnspecKFAbs = abstractValue("ACUTE_ON_CHRONIC_KIDNEY_FAILURE", "Acute and Chronic Unspecified Kidney Failure Present '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True)
-    baselineCreatinineAbs = abstractValue("BASELINE_CREATININE", "Baseline Creatinine: [ABSTRACTVALUE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True)
-    acuteKidneyInjuryAbs = abstractValue("ACUTE_KIDNEY_INJURY", "Acute Kidney Injury: [ABSTRACTVALUE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True)
-    acuteRenalInsufficiencyAbs = abstractValue("ACUTE_RENAL_INSUFFICIENCY", "Acute Renal Insufficiency: [ABSTRACTVALUE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True)
+    evidence.define("n19Code", codeValue, "N19", "Unspecified Kidney Failure: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("n17Codes", multiCodeValue, ["N17.0", "N17.1", "N17.2"], "Kidney Failure Code: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("n189Code", codeValue, "N18.9", "Chronic Kidney Disease, Unspecified: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    creatinineCheckDV = creatinineCheck(maindiscreteDic, dvSerumCreatinine, "BASELINE_CREATININE", "Serum Creatinine: [VALUE] (Result Date: [RESULTDATETIME])", creatinine, 1)
+    #Creatinine and GFR thresholds used further down are collected in the same pass
+    creatinineMatches = maindiscreteDic.query(dvSerumCreatinine, [(ge, calcSerumCreatinine1, 10), (gt, calcSerumCreatinine1, 10)])
+    creatininieMultiDV = dvValueMultiLinks(creatinineMatches[0], "Serum Creatinine: [VALUE] (Result Date: [RESULTDATETIME])", 0, creatinine, False, 10)
+    evidence.define("acutChroUnspecKFAbs", abstractValue, "ACUTE_ON_CHRONIC_KIDNEY_FAILURE", "Acute and Chronic Unspecified Kidney Failure Present '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True)
+    evidence.define("baselineCreatinineAbs", abstractValue, "BASELINE_CREATININE", "Baseline Creatinine: [ABSTRACTVALUE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True)
+    evidence.define("acuteKidneyInjuryAbs", abstractValue, "ACUTE_KIDNEY_INJURY", "Acute Kidney Injury: [ABSTRACTVALUE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True)
+    evidence.define("acuteRenalInsufficiencyAbs", abstractValue, "ACUTE_RENAL_INSUFFICIENCY", "Acute Renal Insufficiency: [ABSTRACTVALUE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True)
     #Abs
-    dialysisDependentAbs = abstractValue("DIALYSIS_DEPENDENT", "Dialysis Dependent '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 17)
+    evidence.define("dialysisDependentAbs", abstractValue, "DIALYSIS_DEPENDENT", "Dialysis Dependent '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 17)
     #Labs
-    gfrDV = dvValueMulti(dict(maindiscreteDic), dvGlomerularFiltrationRate, "Glomerular Filtration: [VALUE] (Result Date: [RESULTDATETIME])", calcGlomerularFiltrationRate1, le, 1, gfr, False, 10)
+    gfrMatches = maindiscreteDic.query(dvGlomerularFiltrationRate, [(le, calcGlomerularFiltrationRate1, 10), (gt, calcGlomerularFiltrationRate1, 5)])
+    gfrDV = dvValueMultiLinks(gfrMatches[0], "Glomerular Filtration: [VALUE] (Result Date: [RESULTDATETIME])", 1, gfr, False, 10)
     #Vitals
-    urineCalc = idealUrineCalc(dict(maindiscreteDic), dvHeight, dvUrinary, gender, vitals)
+    urineCalc = idealUrineCalc(maindiscreteDic, dvHeight, dvUrinary, gender, vitals)
 
     #Check for creatinine Check check 3
     if creatinineCheckDV is not None:
@@ -641,7 +459,7 @@ if (
                 
     #Main Algorithm Starting
     #1
-    if chroCodesExist > 1 and (n184Code is not None or n185Code is not None or n186Code is not None):
+    if chroCodesExist > 1 and (evidence.n184Code is not None or evidence.n185Code is not None or evidence.n186Code is not None):
         for code in chroCodeList:
             desc = chroCodeDic[code]
             tempCode = accountContainer.GetFirstCodeLink(code, desc + ": [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
@@ -655,7 +473,7 @@ if (
     #2
     elif specCodesExist > 1:
         if gfrDV is None:
-            dvValueMulti(dict(maindiscreteDic), dvGlomerularFiltrationRate, "Glomerular Filtration: [VALUE] (Result Date: [RESULTDATETIME])", calcGlomerularFiltrationRate1, gt, 3, gfr, True, 5)
+            dvValueMultiLinks(gfrMatches[1], "Glomerular Filtration: [VALUE] (Result Date: [RESULTDATETIME])", 3, gfr, True, 5)
         for code in specCodeList:
             desc = specCodeDic[code]
             tempCode = accountContainer.GetFirstCodeLink(code, desc + ": [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
@@ -667,8 +485,8 @@ if (
         result.Subtitle = "Conflicting Acute Kidney Failure Dx Codes " + str1
         AlertPassed = True
     #3.1
-    elif subtitle == "Possible End-Stage Renal Disease" and n186Code is not None:
-        if n186Code is not None: updateLinkText(n186Code, autoCodeText); dc.Links.Add(n186Code)
+    elif subtitle == "Possible End-Stage Renal Disease" and evidence.n186Code is not None:
+        if evidence.n186Code is not None: updateLinkText(evidence.n186Code, autoCodeText); dc.Links.Add(evidence.n186Code)
         result.Outcome = "AUTORESOLVED"
         result.Reason = "Autoresolved due to one Specified Code on the Account"
         result.Validated = True
@@ -676,21 +494,21 @@ if (
     #3
     elif (
         triggerAlert and 
-        (n189Code is not None or n181Code is not None or n182Code is not None or 
-         n1830Code is not None or n1831Code is not None or n1832Code is not None or 
-         n184Code is not None or n185Code is not None) and 
-        dialysisDependentAbs is not None and 
+        (evidence.n189Code is not None or evidence.n181Code is not None or evidence.n182Code is not None or 
+         evidence.n1830Code is not None or evidence.n1831Code is not None or evidence.n1832Code is not None or 
+         evidence.n184Code is not None or evidence.n185Code is not None) and 
+        evidence.dialysisDependentAbs is not None and 
         chroCodesExist < 2 and 
-        n186Code is None
+        evidence.n186Code is None
     ):
-        if n189Code is not None: dc.Links.Add(n189Code)
-        if n181Code is not None: dc.Links.Add(n181Code)
-        if n182Code is not None: dc.Links.Add(n182Code)
-        if n1830Code is not None: dc.Links.Add(n1830Code)
-        if n1831Code is not None: dc.Links.Add(n1831Code)
-        if n1832Code is not None: dc.Links.Add(n1832Code)
-        if n184Code is not None: dc.Links.Add(n184Code)
-        if n185Code is not None: dc.Links.Add(n185Code)
+        if evidence.n189Code is not None: dc.Links.Add(evidence.n189Code)
+        if evidence.n181Code is not None: dc.Links.Add(evidence.n181Code)
+        if evidence.n182Code is not None: dc.Links.Add(evidence.n182Code)
+        if evidence.n1830Code is not None: dc.Links.Add(evidence.n1830Code)
+        if evidence.n1831Code is not None: dc.Links.Add(evidence.n1831Code)
+        if evidence.n1832Code is not None: dc.Links.Add(evidence.n1832Code)
+        if evidence.n184Code is not None: dc.Links.Add(evidence.n184Code)
+        if evidence.n185Code is not None: dc.Links.Add(evidence.n185Code)
         result.Subtitle = "Possible End-Stage Renal Disease"
         AlertPassed = True
     #4.1
@@ -719,7 +537,7 @@ if (
             for entry in highSerumCreatinineMultiDayDV:
                 creatinine.Links.Add(entry)
         dc.Links.Add(n179Code)
-        if baselineCreatinineAbs is not None: dc.Links.Add(baselineCreatinineAbs)
+        if evidence.baselineCreatinineAbs is not None: dc.Links.Add(evidence.baselineCreatinineAbs)
         if validated:
             result.Outcome = ""
             result.Reason = "Previously Autoresolved"
@@ -740,12 +558,12 @@ if (
         AlertConditions = True
     #5
     elif (
-        (n179Code is not None or n17Codes is not None) and 
-        n181Code is None and n182Code is None and n1830Code is None and n1831Code is None and n1832Code is None and n184Code is None and n185Code is None and n186Code is None and n189Code is None and
+        (n179Code is not None or evidence.n17Codes is not None) and 
+        evidence.n181Code is None and evidence.n182Code is None and evidence.n1830Code is None and evidence.n1831Code is None and evidence.n1832Code is None and evidence.n184Code is None and evidence.n185Code is None and evidence.n186Code is None and evidence.n189Code is None and
         creatininieMultiDV is None
     ):
         if n179Code is not None: dc.Links.Add(n179Code)
-        if n17Codes is not None: dc.Links.Add(n17Codes)
+        if evidence.n17Codes is not None: dc.Links.Add(evidence.n17Codes)
         result.Subtitle = "Acute Kidney Failure/AKI Present Possible Lacking Clinical Evidence"
         AlertPassed = True   
     #6.1
@@ -762,11 +580,11 @@ if (
         AlertConditions = True
     #6
     elif (
-        (n179Code is not None or n17Codes is not None) and 
+        (n179Code is not None or evidence.n17Codes is not None) and 
         highSerumCreatinineMultiDayDV is None and creatinineCheckDV is None
     ):
         if n179Code is not None: dc.Links.Add(n179Code)
-        if n17Codes is not None: dc.Links.Add(n17Codes)
+        if evidence.n17Codes is not None: dc.Links.Add(evidence.n17Codes)
         result.Subtitle = "Acute Kidney Failure/AKI Present Possible Lacking Clinical Evidence"
         AlertPassed = True
     #7.1
@@ -782,8 +600,8 @@ if (
         result.Validated = True
         AlertConditions = True
     #7
-    elif n189Code is not None and chroCodesExist == 0 and gfrDV is not None:
-        dc.Links.Add(n189Code)
+    elif evidence.n189Code is not None and chroCodesExist == 0 and gfrDV is not None:
+        dc.Links.Add(evidence.n189Code)
         result.Subtitle = "CKD No Stage Documented"
         AlertPassed = True    
     #8.1
@@ -808,8 +626,8 @@ if (
         result.Validated = True
         AlertConditions = True
     #8
-    elif n19Code is not None and chroCodesExist == 0 and specCodesExist == 0:
-        dc.Links.Add(n19Code)
+    elif evidence.n19Code is not None and chroCodesExist == 0 and specCodesExist == 0:
+        dc.Links.Add(evidence.n19Code)
         result.Subtitle = "Kidney Failure Dx Missing Acuity"
         AlertPassed = True
     #9.1    
@@ -834,7 +652,7 @@ if (
         result.Validated = True
         AlertConditions = True  
     #9    
-    elif n19Code is None and chroCodesExist == 0 and specCodesExist == 0 and n179Code is None and n189Code is None and creatinineCheckDV is not None:
+    elif evidence.n19Code is None and chroCodesExist == 0 and specCodesExist == 0 and n179Code is None and evidence.n189Code is None and creatinineCheckDV is not None:
         if creatinineCheckDV is not None:
             for entry in creatinineCheckDV:
                 creatinine.Links.Add(entry)
@@ -855,8 +673,8 @@ if (
         result.Validated = True
         AlertConditions = True
     #10
-    elif chroCodesExist == 1 and n186Code is None and specCodesExist == 0 and n179Code is None and creatinineCheckDV is not None and (check3 is False or otherChecks is True) and baselineCreatinineAbs is not None:
-        if baselineCreatinineAbs is not None: dc.Links.Add(baselineCreatinineAbs)
+    elif chroCodesExist == 1 and evidence.n186Code is None and specCodesExist == 0 and n179Code is None and creatinineCheckDV is not None and (check3 is False or otherChecks is True) and evidence.baselineCreatinineAbs is not None:
+        if evidence.baselineCreatinineAbs is not None: dc.Links.Add(evidence.baselineCreatinineAbs)
         for code in chroCodeList:
             desc = chroCodeDic[code]
             tempCode = accountContainer.GetFirstCodeLink(code, desc + ": [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
@@ -881,19 +699,19 @@ if (
         result.Validated = True
         AlertConditions = True
     #11
-    elif acuteKidneyInjuryAbs is not None and acuteRenalInsufficiencyAbs is not None and specCodesExist == 0:
-        if acuteKidneyInjuryAbs is not None: dc.Links.Add(acuteKidneyInjuryAbs)
-        if acuteRenalInsufficiencyAbs is not None: dc.Links.Add(acuteRenalInsufficiencyAbs)
+    elif evidence.acuteKidneyInjuryAbs is not None and evidence.acuteRenalInsufficiencyAbs is not None and specCodesExist == 0:
+        if evidence.acuteKidneyInjuryAbs is not None: dc.Links.Add(evidence.acuteKidneyInjuryAbs)
+        if evidence.acuteRenalInsufficiencyAbs is not None: dc.Links.Add(evidence.acuteRenalInsufficiencyAbs)
         AlertPassed = True
         result.Subtitle = "Conflicting AKI and Renal Insufficiency Dx, Clarification Needed"
 
     else:
-        db.LogEvaluationScriptMessage("Not enough data to warrent alert, Alert Failed. " + str(account._id), scriptName, scriptInstance, "Debug")
+        scriptLog.debug("Not enough data to warrent alert, Alert Failed. %s", account._id)
         AlertPassed = False
         result.Passed = False
 
 else:
-    db.LogEvaluationScriptMessage("Alert Closed; Exiting script run. Outcome: " + str(outcome) + " " + str(account._id), scriptName, scriptInstance, "Debug")
+    scriptLog.debug("Alert Closed; Exiting script run. Outcome: %s %s", outcome, account._id)
 
 #If an alert triggered abstract the following
 if AlertPassed:
@@ -972,15 +790,15 @@ if AlertPassed:
     dvValue(dvUrineSodium, "Urine Sodium Concentration: [VALUE] (Result Date: [RESULTDATETIME])", calcUrineSodium2, 3, labs, True)
     dvValue(dvUrineSodium, "Urine Sodium Concentration: [VALUE] (Result Date: [RESULTDATETIME])", calcUrineSodium1, 4, labs, True)
     #Lab Sub Categorys
-    dvLookUpAllValuesSingleLine(dict(maindiscreteDic), dvSerumCreatinine, 0, creatinine, "Serum Creatinine: (DATE1 - DATE2) - ")
+    dvLookUpAllValuesSingleLine(maindiscreteDic, dvSerumCreatinine, 0, creatinine, "Serum Creatinine: (DATE1 - DATE2) - ")
     if creatinineSpecCheck is False:
-        dvValueMulti(dict(maindiscreteDic), dvSerumCreatinine, "Serum Creatinine: [VALUE] (Result Date: [RESULTDATETIME])", calcSerumCreatinine1, gt, 1, creatinine, True, 10)
-    dvLookUpAllValuesSingleLine(dict(maindiscreteDic), dvGlomerularFiltrationRate, 0, gfr, "Glomerular Filtration: (DATE1 - DATE2) - ")
+        dvValueMultiLinks(creatinineMatches[1], "Serum Creatinine: [VALUE] (Result Date: [RESULTDATETIME])", 1, creatinine, True, 10)
+    dvLookUpAllValuesSingleLine(maindiscreteDic, dvGlomerularFiltrationRate, 0, gfr, "Glomerular Filtration: (DATE1 - DATE2) - ")
     if gfrDV is not None:
         for entry in gfrDV:
             gfr.Links.Add(entry) #1
-    dvLookUpAllValuesSingleLine(dict(maindiscreteDic), dvSerumBloodUreaNitrogen, 0, bun, "Serum Blood Urea Nitrogen: (DATE1 - DATE2) - ")
-    dvValueMulti(dict(maindiscreteDic), dvSerumBloodUreaNitrogen, "Serum Blood Urea Nitrogen: [VALUE] (Result Date: [RESULTDATETIME])", calcSerumBloodUreaNitrogen1, gt, 1, bun, True, 10)
+    dvLookUpAllValuesSingleLine(maindiscreteDic, dvSerumBloodUreaNitrogen, 0, bun, "Serum Blood Urea Nitrogen: (DATE1 - DATE2) - ")
+    dvValueMulti(maindiscreteDic, dvSerumBloodUreaNitrogen, "Serum Blood Urea Nitrogen: [VALUE] (Result Date: [RESULTDATETIME])", calcSerumBloodUreaNitrogen1, gt, 1, bun, True, 10)
     #Meds
     medValue("Albumin", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 1, treatment, True)
     abstractValue("AVOID_NEPHROTOXIC_AGENT", "Avoid Nephrotoxic Agent: [ABSTRACTVALUE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 2, treatment, True)
@@ -1010,7 +828,9 @@ if AlertPassed or AlertConditions:
     if treatment.Links: treatmentLinks = True
     if vitals.Links: result.Links.Add(vitals); vitalsLinks = True
     result.Links.Add(other)
-    db.LogEvaluationScriptMessage("Alert Passed Adding Links. Alert Triggered: " + str(result.Subtitle) + " Autoresolved: " + str(result.Outcome) + "; " +
-        str(result.Validated) + "; Links: Documented Dx- " + str(dcLinks) + ", Abs- " + str(absLinks) + ", labs- " + str(labsLinks) + ", vitals- " + str(vitalsLinks) +
-        ", Treatment- " + str(treatmentLinks) + "; Acct: " + str(account._id), scriptName, scriptInstance, "Debug")
+    scriptLog.debug("Alert Passed Adding Links. Alert Triggered: %s Autoresolved: %s; %s; Links: Documented Dx- %s, Abs- %s, labs- %s, vitals- %s, Treatment- %s; Acct: %s",
+        result.Subtitle, result.Outcome, result.Validated, dcLinks, absLinks, labsLinks, vitalsLinks, treatmentLinks, account._id)
     result.Passed = True
+
+#Write out this run's script messages
+scriptLog.flush()
@@ -28,6 +28,7 @@ from System.Data import *
 from System.Configuration import *
 from System.Collections.Generic import *
 clr.ImportExtensions(System.Linq)
+from cdi import Evidence, evaluation_context
 from operator import le, ge, gt, lt
 
 #========================================
@@ -58,14 +59,20 @@ cautionCodeDoc = [
 #  Globals
 #========================================
 db = CACDataRepository()
+#Account data is loaded once and shared by every script run for the account,
+#fetching only the discrete values of the last 7 days
+context = evaluation_context(account, db, System.DateTime.Now.AddDays(-7))
+#Script messages are only formatted when their level is enabled, and are written
+#together at the end of the run
+scriptLog = context.log(db, scriptName, scriptInstance)
 admitDate = account.AdmitDateTime.Date
 birthDate = account.Patient.BirthDate.Date
 gender = account.Patient.Gender
 #Update true = External DV collection False = On Acct Record
-accountContainer = AccountWorkflowContainer(account, True, "Category", 7)
+accountContainer = context.container(AccountWorkflowContainer, True, "Category", 7)
 useSeperateDiscreteCollection = True
 if useSeperateDiscreteCollection == True:
-    discreteValues = db.GetDiscreteValues(account._id)
+    discreteValues = context.discrete_values
 else:
     discreteValues = db.GetAccountField(account._id, "DiscreteValues")
 
@@ -105,193 +112,9 @@ dvWeightLbs = ["Weight lbs 3.5 (lb)"]
 #========================================
 #  Functions
 #========================================
-def datetimeFromUtcToLocal(utc_datetime):
-    if utc_datetime:
-        convertedDate = DateTime.SpecifyKind(utc_datetime, DateTimeKind.Utc)
-        return  convertedDate.ToLocalTime()
-    else:
-        return None
-
-def cleanNumbers(result):
-    result1 = re.sub("[\\<\\>]", "", str(result))
-    if result1.count('.') <= 1 and result1.replace(".", "").isnumeric():
-        return result1
-    else:
-        return None
-
-def dataConversion(datetime, linkText, Result, id, category, sequence, abstract=True, gender=None):
-    if datetime is not None:
-        date_time = datetimeFromUtcToLocal(datetime)
-        date_time = date_time.ToString("MM/dd/yyyy, HH:mm")
-        linkText = linkText.replace("[RESULTDATETIME]", date_time)
-    else: 
-        linkText = linkText.replace("(Result Date: [RESULTDATETIME])", "")
-    if Result is not None:
-        linkText = linkText.replace("[VALUE]", Result)
-    else: linkText = linkText.replace("[VALUE]", "")
-    if gender: linkText = linkText.replace("[GENDER]", gender)
-    else: linkText = linkText.replace("[GENDER]", "")
-    if abstract == True:
-        category.Links.Add(MatchedCriteriaLink(linkText, None, None, id, True, None, None, sequence))
-    elif abstract == False:
-        abstraction = MatchedCriteriaLink(linkText, None, None, id, True, None, None, sequence)
-        return abstraction
-    return
-
-def CodeCount(codes):
-    # Get list of codes on the acct based on CodeDic
-    result = set()
-    for document in account.Documents or []:
-        for codeReference in document.CodeReferences or []:
-            if codeReference.Code in codes:
-                matching_code = codeReference.Code
-                result.add(matching_code)
-    return list(result)
-
-def abstractValue(abstraction_name, link_text, calculation, sequence=0, category=None, abstract=False):
-    # Find abstraction and if abstract is true abstract it to the provided category
-    abstraction = accountContainer.GetFirstLinkMatchingAbstractionValue(abstraction_name, link_text, lambda x: calculation)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def dvValue(dv_name, link_text, calculation, sequence=0, category=None, abstract=False):
-    # Find Discrete Value and if abstract is true abstract it to the provided category
-    for dv in dv_name:
-        abstraction = accountContainer.GetFirstLinkMatchingDiscreteValue(dv, link_text, calculation)
-        if abstraction is not None:
-            break
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def dvValueMulti(dvDic, DV1, linkText, value, sign, sequence=0, category=None, abstract=False, needed=2):
-    # Find Discrete Value and if abstract is true abstract it to the provided category
-    matchedList = []
-    x = 0
-    for dv in dvDic or []:
-        dvr = cleanNumbers(dvDic[dv]['Result'])
-        if dvDic[dv]['Name'] in DV1 and dvr is not None and sign(float(dvr), float(value)):
-            matchedList.append(dataConversion(dvDic[dv]['ResultDate'], linkText, dvDic[dv]['Result'], dvDic[dv]['UniqueId'] or dvDic[dv]['_id'], category, sequence, abstract))
-            x += 1
-            if needed <= x:
-                break
-    if abstract and x > 0:
-        return True
-    elif abstract is False and len(matchedList) > 0 and needed > 0:
-        return matchedList
-    else:
-        return None
-
-def compareValuesMulti(dvDic, DV1, value, value1, linkText, sign, sign1, sequence=0, category=None, abstract=False, needed=2):
-    matchedList = []
-    x = 0
-    for dv in dvDic or []:
-        dvr = cleanNumbers(dvDic[dv]['Result'])
-        if dvDic[dv]['Name'] in DV1 and dvr is not None and sign(float(value), float(dvr)) and sign1(float(dvr), float(value1)):
-            matchedList.append(dataConversion(dvDic[dv]['ResultDate'], linkText, dvDic[dv]['Result'], dvDic[dv]['UniqueId'] or dvDic[dv]['_id'], category, sequence, abstract))
-            x += 1
-            if needed <= x:
-                break
-    if abstract and x > 0:
-        return True
-    elif abstract is False and len(matchedList) > 0 and needed > 0:
-        return matchedList
-    else:
-        return None
-
-def codeValue(code_name, link_text, sequence=0, category=None, abstract=False):
-    # Find code and if abstract is true abstract it to the provided category
-    abstraction = accountContainer.GetFirstCodeLink(code_name, link_text)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def multiCodeValue(code_list, link_text, sequence=0, category=None, abstract=False):
-    # Go through Code List and find first code and if abstract is true abstract it to the provided category
-    abstraction = None
-    for code in code_list:
-        abstraction = accountContainer.GetFirstCodeLink(code, link_text)
-        if abstraction is not None:
-            abstraction.Sequence = sequence
-            if abstract:
-                category.Links.Add(abstraction)
-                return True
-            else:
-                return abstraction
-    if abstract and abstraction is None:
-        return False
-    return abstraction
-
-def prefixCodeValue(prefix, link_text, sequence=0, category=None, abstract=False):
-    # Use prefix to find first code match based on regex search and if abstract is true abstract it to the provided category
-    abstraction = None
-    validCodes = [codes for codes in accountContainer.CodeKeys if re.match(prefix, codes) is not None]
-    for code in validCodes:
-        abstraction = accountContainer.GetFirstCodeLink(code, link_text)
-        if abstraction is not None:
-            abstraction.Sequence = sequence
-            if abstract:
-                category.Links.Add(abstraction)
-                return True
-            else:
-                return abstraction
-    if abstract and abstraction is None:
-        return False
-    return abstraction
-
-def medValue(med_name, link_text, sequence=0, category=None, abstract=False):
-    # Find Medication Value and if abstract is true abstract it to the provided category
-    abstraction = accountContainer.GetFirstMedicationLink(med_name, link_text)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def updateLinkText(value, replacement_text):
-    # Update the link text with the provided text
-    value.LinkText = replacement_text + value.LinkText
-    return value
-
-def documentLink(DocumentType, LinkText, sequence, category, abstract):
-    # Finds a document link and adds it as link so that its a quick reference for the cdi user.
-    abstraction = None
-    abstraction = accountContainer.GetFirstDocumentLink(DocumentType, LinkText)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    return None
+#The helpers every script shares are compiled once per process and bound to this
+#script's globals, see cdi.helpers; a helper defined below replaces the shared one
+context.bind_helpers(globals(), 1)
 
 #========================================
 #  Script Specific
@@ -330,7 +153,7 @@ def cautionCode(code_name, link_text, document, sequence):
 #========================================
 #  Algorithm
 #========================================
-db.LogEvaluationScriptMessage("Script starting " + str(account._id), scriptName, scriptInstance, "Debug")
+scriptLog.debug("Script starting %s", account._id)
 #Calaculate Age
 age = math.floor((admitDate - birthDate).TotalDays/ 365.2425)
 
@@ -425,33 +248,34 @@ if (
     (outcome == "AUTORESOLVED" and validated and codesExist > 1)
 ):
     #Alert Trigger
-    e46Code = codeValue("E46", "Unspecified Protein-Calorie Malnutrition: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    r636Code = codeValue("R63.6", "Underweight: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    t730xxxaCode = codeValue("T73.0XXA", "Starvation: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    malnutritionCodes = multiCodeValue(["E40", "E41", "E42", "E43", "E44.0", "E44.1", "E45"], "Malnutrition: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence = Evidence()
+    evidence.define("e46Code", codeValue, "E46", "Unspecified Protein-Calorie Malnutrition: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("r636Code", codeValue, "R63.6", "Underweight: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("t730xxxaCode", codeValue, "T73.0XXA", "Starvation: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("malnutritionCodes", multiCodeValue, ["E40", "E41", "E42", "E43", "E44.0", "E44.1", "E45"], "Malnutrition: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
     #Abs
-    r634Code = codeValue("R63.4", "Abnormal Weight Loss: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 1)
-    r627Code = codeValue("R62.7", "Adult Failure to Thrive: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 2)
-    lowBMIAbs = abstractValue("LOW_BMI", "BMI: [ABSTRACTVALUE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 4)
-    lowBMIDV = dvValue(dvBMI, "BMI: [VALUE] (Result Date: [RESULTDATETIME])", calcBMI1, 5)
-    r64Code = codeValue("R64", "Cachexia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 6)
-    r601Code = codeValue("R60.1", "Generalized Edema: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 18)
-    gripStrengthAbs = abstractValue("GRIP_STRENGTH_REDUCED", "Reduceded Grip Strength '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 19)
-    lossofMuscleMassMildAbs = abstractValue("LOSS_OF_MUSCLE_MASS_MILD", "Loss of Muscle Mass Mild '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 21)
-    lossofMuscleMassModAbs = abstractValue("LOSS_OF_MUSCLE_MASS_MODERATE", "Loss of Muscle Mass Moderate '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 22)
-    lossofMuscleMassSevereAbs = abstractValue("LOSS_OF_MUSCLE_MASS_SEVERE", "Loss of Muscle Mass Severe '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 23)
-    lossofSubcutaneousFatMildAbs = abstractValue("LOSS_OF_SUBCUTANEOUS_FAT_MILD", "Loss of Subcutaneous Fat Mild '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 24)
-    lossofSubcutaneousFatModAbs = abstractValue("LOSS_OF_SUBCUTANEOUS_FAT_MODERATE", "Loss of Subcutaneous Fat Moderate '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 25)
-    lossofSubcutaneousFatSevereAbs = abstractValue("LOSS_OF_SUBCUTANEOUS_FAT_SEVERE", "Loss of Subcutaneous Fat Severe '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 26)
-    modFluidAccumulationAbs = abstractValue("MODERATE_FLUID_ACCUMULATION", "Moderate Fluid Accumulation '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 30)
-    nonHealingWoundAbs = abstractValue("NON_HEALING_WOUND", "Non Healing Wound '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 33)
-    reducedEnergyIntakeAbs = abstractValue("REDUCED_ENERGY_INTAKE", "Reduced Energy Intake '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 36)
-    reducedEnergyIntakeSevereAbs = abstractValue("REDUCED_ENERGY_INTAKE_SEVERE", "Reduced Energy Intake Severe '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 37)
-    reducedEnergyIntakeModAbs = abstractValue("REDUCED_ENERGY_INTAKE_MODERATE", "Reduced Energy Intake Moderate '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 38)
-    severeFluidAccumulationAbs = abstractValue("SEVERE_FLUID_ACCUMULATION", "Severe Fluid Accumulation '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 39)
-    unintentionalWeightLossMildAbs = abstractValue("UNINTENTIONAL_WEIGHT_LOSS_MILD", "Unintentional Weight Loss Mild '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 43)
-    unintentionalWeightLossSevereAbs = abstractValue("UNINTENTIONAL_WEIGHT_LOSS_SEVERE", "Unintentional Weight Loss Severe '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 44)
-    unintentionalWeightLossAbs = abstractValue("UNINTENTIONAL_WEIGHT_LOSS", "Unintentional Weight Loss '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 45)
+    evidence.define("r634Code", codeValue, "R63.4", "Abnormal Weight Loss: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 1)
+    evidence.define("r627Code", codeValue, "R62.7", "Adult Failure to Thrive: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 2)
+    evidence.define("lowBMIAbs", abstractValue, "LOW_BMI", "BMI: [ABSTRACTVALUE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 4)
+    evidence.define("lowBMIDV", dvValue, dvBMI, "BMI: [VALUE] (Result Date: [RESULTDATETIME])", calcBMI1, 5)
+    evidence.define("r64Code", codeValue, "R64", "Cachexia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 6)
+    evidence.define("r601Code", codeValue, "R60.1", "Generalized Edema: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 18)
+    evidence.define("gripStrengthAbs", abstractValue, "GRIP_STRENGTH_REDUCED", "Reduceded Grip Strength '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 19)
+    evidence.define("lossofMuscleMassMildAbs", abstractValue, "LOSS_OF_MUSCLE_MASS_MILD", "Loss of Muscle Mass Mild '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 21)
+    evidence.define("lossofMuscleMassModAbs", abstractValue, "LOSS_OF_MUSCLE_MASS_MODERATE", "Loss of Muscle Mass Moderate '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 22)
+    evidence.define("lossofMuscleMassSevereAbs", abstractValue, "LOSS_OF_MUSCLE_MASS_SEVERE", "Loss of Muscle Mass Severe '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 23)
+    evidence.define("lossofSubcutaneousFatMildAbs", abstractValue, "LOSS_OF_SUBCUTANEOUS_FAT_MILD", "Loss of Subcutaneous Fat Mild '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 24)
+    evidence.define("lossofSubcutaneousFatModAbs", abstractValue, "LOSS_OF_SUBCUTANEOUS_FAT_MODERATE", "Loss of Subcutaneous Fat Moderate '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 25)
+    evidence.define("lossofSubcutaneousFatSevereAbs", abstractValue, "LOSS_OF_SUBCUTANEOUS_FAT_SEVERE", "Loss of Subcutaneous Fat Severe '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 26)
+    evidence.define("modFluidAccumulationAbs", abstractValue, "MODERATE_FLUID_ACCUMULATION", "Moderate Fluid Accumulation '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 30)
+    evidence.define("nonHealingWoundAbs", abstractValue, "NON_HEALING_WOUND", "Non Healing Wound '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 33)
+    evidence.define("reducedEnergyIntakeAbs", abstractValue, "REDUCED_ENERGY_INTAKE", "Reduced Energy Intake '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 36)
+    evidence.define("reducedEnergyIntakeSevereAbs", abstractValue, "REDUCED_ENERGY_INTAKE_SEVERE", "Reduced Energy Intake Severe '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 37)
+    evidence.define("reducedEnergyIntakeModAbs", abstractValue, "REDUCED_ENERGY_INTAKE_MODERATE", "Reduced Energy Intake Moderate '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 38)
+    evidence.define("severeFluidAccumulationAbs", abstractValue, "SEVERE_FLUID_ACCUMULATION", "Severe Fluid Accumulation '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 39)
+    evidence.define("unintentionalWeightLossMildAbs", abstractValue, "UNINTENTIONAL_WEIGHT_LOSS_MILD", "Unintentional Weight Loss Mild '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 43)
+    evidence.define("unintentionalWeightLossSevereAbs", abstractValue, "UNINTENTIONAL_WEIGHT_LOSS_SEVERE", "Unintentional Weight Loss Severe '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 44)
+    evidence.define("unintentionalWeightLossAbs", abstractValue, "UNINTENTIONAL_WEIGHT_LOSS", "Unintentional Weight Loss '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 45)
     #Doc Links
     documentLink("Dietitian Progress Notes", "Dietitian Progress Notes", 0, nutritionNoteLinks, True)
     documentLink("Nutrition MNT Follow-Up ADIME Note", "Nutrition MNT Follow-Up ADIME Note", 0, nutritionNoteLinks, True)
@@ -470,34 +294,34 @@ if (
     e46CC = cautionCode("E46", "Caution Code - Unspecified Protein-Calorie Malnutrition: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", cautionCodeDoc, 0)
 
     #Clinical Indicator count and abstraction.
-    if lossofSubcutaneousFatMildAbs is not None or lossofSubcutaneousFatModAbs is not None or lossofSubcutaneousFatSevereAbs is not None:
-        if lossofSubcutaneousFatMildAbs is not None: abs.Links.Add(lossofSubcutaneousFatMildAbs)
-        if lossofSubcutaneousFatModAbs is not None: abs.Links.Add(lossofSubcutaneousFatModAbs)
-        if lossofSubcutaneousFatSevereAbs is not None: abs.Links.Add(lossofSubcutaneousFatSevereAbs)
+    if evidence.lossofSubcutaneousFatMildAbs is not None or evidence.lossofSubcutaneousFatModAbs is not None or evidence.lossofSubcutaneousFatSevereAbs is not None:
+        if evidence.lossofSubcutaneousFatMildAbs is not None: abs.Links.Add(evidence.lossofSubcutaneousFatMildAbs)
+        if evidence.lossofSubcutaneousFatModAbs is not None: abs.Links.Add(evidence.lossofSubcutaneousFatModAbs)
+        if evidence.lossofSubcutaneousFatSevereAbs is not None: abs.Links.Add(evidence.lossofSubcutaneousFatSevereAbs)
         CI += 1
-    if lossofMuscleMassMildAbs is not None or lossofMuscleMassModAbs is not None or lossofMuscleMassSevereAbs is not None:
-        if lossofMuscleMassMildAbs is not None: abs.Links.Add(lossofMuscleMassMildAbs)
-        if lossofMuscleMassModAbs is not None: abs.Links.Add(lossofMuscleMassModAbs)
-        if lossofMuscleMassSevereAbs is not None: abs.Links.Add(lossofMuscleMassSevereAbs)
+    if evidence.lossofMuscleMassMildAbs is not None or evidence.lossofMuscleMassModAbs is not None or evidence.lossofMuscleMassSevereAbs is not None:
+        if evidence.lossofMuscleMassMildAbs is not None: abs.Links.Add(evidence.lossofMuscleMassMildAbs)
+        if evidence.lossofMuscleMassModAbs is not None: abs.Links.Add(evidence.lossofMuscleMassModAbs)
+        if evidence.lossofMuscleMassSevereAbs is not None: abs.Links.Add(evidence.lossofMuscleMassSevereAbs)
         CI += 1
-    if unintentionalWeightLossMildAbs is not None or unintentionalWeightLossAbs is not None or unintentionalWeightLossSevereAbs is not None:
-        if unintentionalWeightLossMildAbs is not None: abs.Links.Add(unintentionalWeightLossMildAbs)
-        if unintentionalWeightLossAbs is not None: abs.Links.Add(unintentionalWeightLossAbs)
-        if unintentionalWeightLossSevereAbs is not None: abs.Links.Add(unintentionalWeightLossSevereAbs)
+    if evidence.unintentionalWeightLossMildAbs is not None or evidence.unintentionalWeightLossAbs is not None or evidence.unintentionalWeightLossSevereAbs is not None:
+        if evidence.unintentionalWeightLossMildAbs is not None: abs.Links.Add(evidence.unintentionalWeightLossMildAbs)
+        if evidence.unintentionalWeightLossAbs is not None: abs.Links.Add(evidence.unintentionalWeightLossAbs)
+        if evidence.unintentionalWeightLossSevereAbs is not None: abs.Links.Add(evidence.unintentionalWeightLossSevereAbs)
         CI += 1
-    if reducedEnergyIntakeAbs is not None or reducedEnergyIntakeModAbs is not None or reducedEnergyIntakeSevereAbs is not None:
-        if unintentionalWeightLossMildAbs is not None: abs.Links.Add(unintentionalWeightLossMildAbs)
-        if reducedEnergyIntakeModAbs is not None: abs.Links.Add(reducedEnergyIntakeModAbs)
-        if reducedEnergyIntakeSevereAbs is not None: abs.Links.Add(reducedEnergyIntakeSevereAbs)
+    if evidence.reducedEnergyIntakeAbs is not None or evidence.reducedEnergyIntakeModAbs is not None or evidence.reducedEnergyIntakeSevereAbs is not None:
+        if evidence.unintentionalWeightLossMildAbs is not None: abs.Links.Add(evidence.unintentionalWeightLossMildAbs)
+        if evidence.reducedEnergyIntakeModAbs is not None: abs.Links.Add(evidence.reducedEnergyIntakeModAbs)
+        if evidence.reducedEnergyIntakeSevereAbs is not None: abs.Links.Add(evidence.reducedEnergyIntakeSevereAbs)
         CI += 1
-    if r634Code is not None: abs.Links.Add(r634Code); CI += 1
-    if gripStrengthAbs is not None: abs.Links.Add(gripStrengthAbs); CI += 1
-    if nonHealingWoundAbs is not None: abs.Links.Add(nonHealingWoundAbs); CI += 1
-    if r627Code is not None: abs.Links.Add(r627Code); CI += 1
-    if r64Code is not None: abs.Links.Add(r64Code); CI += 1
-    if r601Code is not None: abs.Links.Add(r601Code); CI += 1
-    if severeFluidAccumulationAbs is not None: abs.Links.Add(severeFluidAccumulationAbs); CI += 1
-    if modFluidAccumulationAbs is not None: abs.Links.Add(modFluidAccumulationAbs); CI += 1   
+    if evidence.r634Code is not None: abs.Links.Add(evidence.r634Code); CI += 1
+    if evidence.gripStrengthAbs is not None: abs.Links.Add(evidence.gripStrengthAbs); CI += 1
+    if evidence.nonHealingWoundAbs is not None: abs.Links.Add(evidence.nonHealingWoundAbs); CI += 1
+    if evidence.r627Code is not None: abs.Links.Add(evidence.r627Code); CI += 1
+    if evidence.r64Code is not None: abs.Links.Add(evidence.r64Code); CI += 1
+    if evidence.r601Code is not None: abs.Links.Add(evidence.r601Code); CI += 1
+    if evidence.severeFluidAccumulationAbs is not None: abs.Links.Add(evidence.severeFluidAccumulationAbs); CI += 1
+    if evidence.modFluidAccumulationAbs is not None: abs.Links.Add(evidence.modFluidAccumulationAbs); CI += 1   
     
     #Determine Conflicting Malnutrition Severity
     if e40CC[0] is not None and e40CC[1] and (e41CC[1] is False or e42CC[1] is False or e43CC[1] is False or e440CC[1] is False or e441CC[1] is False or e45CC[1] is False):
@@ -549,11 +373,9 @@ if (
     if e46CC[1] is False and e46Triggered:
         autoCC = False
 
-    db.LogEvaluationScriptMessage("AutoCC " + str(autoCC) + ", e40CC[1] " + str(e40CC[1]) + ", e40CC[1] " + str(e40CC[1]) + ", e41CC[1] " + str(e41CC[1]) +
-        ", e42CC[1] " + str(e42CC[1]) + ", e43CC[1] " + str(e43CC[1]) + ", e440CC[1] " + str(e440CC[1]) + ", e441CC[1] " + str(e441CC[1]) + 
-        ", e45CC[1] " + str(e45CC[1]) + ", e46CC[1] " + str(e45CC[1]) + ", e40Triggered " + str(e40Triggered) + ", e41Triggered " + str(e41Triggered) + 
-        ", e42Triggered " + str(e42Triggered) + ", e43Triggered " + str(e43Triggered) + ", e440Triggered " + str(e440Triggered) + ", e441Triggered " + str(e441Triggered) + 
-        ", e45Triggered " + str(e45Triggered) + ", e46Triggered " + str(e46Triggered) + " " + str(account._id), scriptName, scriptInstance, "Debug")
+    scriptLog.debug("AutoCC %s, e40CC[1] %s, e40CC[1] %s, e41CC[1] %s, e42CC[1] %s, e43CC[1] %s, e440CC[1] %s, e441CC[1] %s, e45CC[1] %s, e46CC[1] %s, e40Triggered %s, e41Triggered %s, e42Triggered %s, e43Triggered %s, e440Triggered %s, e441Triggered %s, e45Triggered %s, e46Triggered %s %s",
+        autoCC, e40CC[1], e40CC[1], e41CC[1], e42CC[1], e43CC[1], e440CC[1], e441CC[1], e45CC[1], e45CC[1], e40Triggered, e41Triggered, e42Triggered,
+        e43Triggered, e440Triggered, e441Triggered, e45Triggered, e46Triggered, account._id)
     
     #Main Algorithm
     #1
@@ -599,15 +421,15 @@ if (
         result.Validated = True
         AlertConditions = True
     #3
-    elif triggerAlert and codesExist == 0 and e46Code is not None:
-        if e46Code is not None: dc.Links.Add(e46Code)
+    elif triggerAlert and codesExist == 0 and evidence.e46Code is not None:
+        if evidence.e46Code is not None: dc.Links.Add(evidence.e46Code)
         result.Subtitle = "Malnutrition Missing Acuity"
         AlertPassed = True
     #4.1
     elif (
         subtitle == "Possible Malnutrition" and
         autoCC == True and 
-        (codesExist > 0 or e46Code is not None)
+        (codesExist > 0 or evidence.e46Code is not None)
     ):
         result.Outcome = "AUTORESOLVED"
         result.Reason = "Autoresolved due to one Specified Code on the Account"
@@ -638,31 +460,31 @@ if (
     #5.1
     elif (
         subtitle == "Possible Low BMI" and
-        ((r627Code is not None or r634Code is not None or r64Code is not None or r636Code is not None or t730xxxaCode is not None or e46Code is not None) or
-        (malnutritionCodes is not None and autoCC))
+        ((evidence.r627Code is not None or evidence.r634Code is not None or evidence.r64Code is not None or evidence.r636Code is not None or evidence.t730xxxaCode is not None or evidence.e46Code is not None) or
+        (evidence.malnutritionCodes is not None and autoCC))
     ):
-        if r627Code is not None: updateLinkText(r627Code, "Autoresolved Specified Code - "); dc.Links.Add(r627Code)
-        if r634Code is not None: updateLinkText(r634Code, "Autoresolved Specified Code - "); dc.Links.Add(r634Code)
-        if r64Code is not None: updateLinkText(r64Code, "Autoresolved Specified Code - "); dc.Links.Add(r64Code)
-        if r636Code is not None: updateLinkText(r636Code, "Autoresolved Specified Code - "); dc.Links.Add(r636Code)
-        if t730xxxaCode is not None: updateLinkText(t730xxxaCode, "Autoresolved Specified Code - "); dc.Links.Add(t730xxxaCode)
-        if malnutritionCodes is not None: updateLinkText(malnutritionCodes, "Autoresolved Specified Code - "); dc.Links.Add(malnutritionCodes)
-        if e46Code is not None: updateLinkText(e46Code, "Autoresolved Specified Code - "); dc.Links.Add(e46Code)
+        if evidence.r627Code is not None: updateLinkText(evidence.r627Code, "Autoresolved Specified Code - "); dc.Links.Add(evidence.r627Code)
+        if evidence.r634Code is not None: updateLinkText(evidence.r634Code, "Autoresolved Specified Code - "); dc.Links.Add(evidence.r634Code)
+        if evidence.r64Code is not None: updateLinkText(evidence.r64Code, "Autoresolved Specified Code - "); dc.Links.Add(evidence.r64Code)
+        if evidence.r636Code is not None: updateLinkText(evidence.r636Code, "Autoresolved Specified Code - "); dc.Links.Add(evidence.r636Code)
+        if evidence.t730xxxaCode is not None: updateLinkText(evidence.t730xxxaCode, "Autoresolved Specified Code - "); dc.Links.Add(evidence.t730xxxaCode)
+        if evidence.malnutritionCodes is not None: updateLinkText(evidence.malnutritionCodes, "Autoresolved Specified Code - "); dc.Links.Add(evidence.malnutritionCodes)
+        if evidence.e46Code is not None: updateLinkText(evidence.e46Code, "Autoresolved Specified Code - "); dc.Links.Add(evidence.e46Code)
         result.Outcome = "AUTORESOLVED"
         result.Reason = "Autoresolved due to one or more Specified Code on the Account"
         result.Validated = True
         AlertConditions = True
     #5
-    elif triggerAlert and (lowBMIDV is not None or lowBMIAbs is not None) and r627Code is None and e46Code is None and r634Code is None and r64Code is None and r636Code is None and t730xxxaCode is None and malnutritionCodes is None:
+    elif triggerAlert and (evidence.lowBMIDV is not None or evidence.lowBMIAbs is not None) and evidence.r627Code is None and evidence.e46Code is None and evidence.r634Code is None and evidence.r64Code is None and evidence.r636Code is None and evidence.t730xxxaCode is None and evidence.malnutritionCodes is None:
         result.Subtitle = "Possible Low BMI"
         AlertPassed = True
 
     else:
-        db.LogEvaluationScriptMessage("Not enough data to warrent alert, Alert Failed. " + str(account._id), scriptName, scriptInstance, "Debug")
+        scriptLog.debug("Not enough data to warrent alert, Alert Failed. %s", account._id)
         result.Passed = False
 
 else:
-    db.LogEvaluationScriptMessage("Alert Closed; Exiting script run. Outcome: " + str(outcome) + " " + str(account._id), scriptName, scriptInstance, "Debug")
+    scriptLog.debug("Alert Closed; Exiting script run. Outcome: %s %s", outcome, account._id)
 
 #If an alert triggered abstract the following
 if AlertPassed:
@@ -680,9 +502,9 @@ if AlertPassed:
     #1-2
     prefixCodeValue("^E54\.", "Ascorbic Acid Deficiency: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 3, abs, True)
     #4
-    if lowBMIDV is not None: abs.Links.Add(lowBMIDV) #5
+    if evidence.lowBMIDV is not None: abs.Links.Add(evidence.lowBMIDV) #5
     else: dvValue(dvBMI, "BMI: [VALUE] (Result Date: [RESULTDATETIME])", calcBMI2, 5)
-    if lowBMIAbs is not None: abs.Links.Add(lowBMIAbs) #6
+    if evidence.lowBMIAbs is not None: abs.Links.Add(evidence.lowBMIAbs) #6
     abstractValue("DECREASED_FUNCTIONAL_CAPACITY", "Decreased Functional Capacity '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 7, abs, True)
     prefixCodeValue("^E53\.", "Deficiency of other B group Vitamins: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 8, abs, True)
     prefixCodeValue("^E61\.", "Deficiency of other Nutrient Elements: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 9, abs, True)
@@ -781,7 +603,9 @@ if AlertPassed or AlertConditions:
     if risk.Links: result.Links.Add(risk); riskLinks = True
     if nutritionNoteLinks.Links: result.Links.Add(nutritionNoteLinks); docLinksLinks = True
     result.Links.Add(other)
-    db.LogEvaluationScriptMessage("Alert Passed Adding Links. Alert Triggered: " + str(result.Subtitle) + " Autoresolved: " + str(result.Outcome) + "; " +
-        str(result.Validated) + "; Links: Documented Dx- " + str(dcLinks) + ", Abs- " + str(absLinks) + ", labs- " + str(labsLinks) + ", risk- " +
-        str(riskLinks) + ", docs- " + str(docLinksLinks) + ", treatment- " + str(treatmentLinks) + "; Acct: " + str(account._id), scriptName, scriptInstance, "Debug")
+    scriptLog.debug("Alert Passed Adding Links. Alert Triggered: %s Autoresolved: %s; %s; Links: Documented Dx- %s, Abs- %s, labs- %s, risk- %s, docs- %s, treatment- %s; Acct: %s",
+        result.Subtitle, result.Outcome, result.Validated, dcLinks, absLinks, labsLinks, riskLinks, docLinksLinks, treatmentLinks, account._id)
     result.Passed = True
+
+#Write out this run's script messages
+scriptLog.flush()
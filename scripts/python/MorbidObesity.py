@@ -28,6 +28,7 @@ from System.Data import *
 from System.Configuration import *
 from System.Collections.Generic import *
 clr.ImportExtensions(System.Linq)
+from cdi import Evidence, evaluation_context
 from operator import le, ge, gt, lt
 
 #========================================
@@ -41,14 +42,20 @@ autoCodeText = "Autoresolved Code - "
 #  Globals
 #========================================
 db = CACDataRepository()
+#Account data is loaded once and shared by every script run for the account,
+#fetching only the discrete values of the last 7 days
+context = evaluation_context(account, db, System.DateTime.Now.AddDays(-7))
+#Script messages are only formatted when their level is enabled, and are written
+#together at the end of the run
+scriptLog = context.log(db, scriptName, scriptInstance)
 admitDate = account.AdmitDateTime.Date
 birthDate = account.Patient.BirthDate.Date
 gender = account.Patient.Gender
 #Update true = External DV collection False = On Acct Record
-accountContainer = AccountWorkflowContainer(account, True, "Category", 7)
+accountContainer = context.container(AccountWorkflowContainer, True, "Category", 7)
 useSeperateDiscreteCollection = True
 if useSeperateDiscreteCollection == True:
-    discreteValues = db.GetDiscreteValues(account._id)
+    discreteValues = context.discrete_values
 else:
     discreteValues = db.GetAccountField(account._id, "DiscreteValues")
 
@@ -83,198 +90,14 @@ dvWeightLbs = ["Weight lbs 3.5 (lb)"]
 #========================================
 #  Functions
 #========================================
-def datetimeFromUtcToLocal(utc_datetime):
-    if utc_datetime:
-        convertedDate = DateTime.SpecifyKind(utc_datetime, DateTimeKind.Utc)
-        return  convertedDate.ToLocalTime()
-    else:
-        return None
-
-def cleanNumbers(result):
-    result1 = re.sub("[\\<\\>]", "", str(result))
-    if result1.count('.') <= 1 and result1.replace(".", "").isnumeric():
-        return result1
-    else:
-        return None
-
-def dataConversion(datetime, linkText, Result, id, category, sequence, abstract=True, gender=None):
-    if datetime is not None:
-        date_time = datetimeFromUtcToLocal(datetime)
-        date_time = date_time.ToString("MM/dd/yyyy, HH:mm")
-        linkText = linkText.replace("[RESULTDATETIME]", date_time)
-    else: 
-        linkText = linkText.replace("(Result Date: [RESULTDATETIME])", "")
-    if Result is not None:
-        linkText = linkText.replace("[VALUE]", Result)
-    else: linkText = linkText.replace("[VALUE]", "")
-    if gender: linkText = linkText.replace("[GENDER]", gender)
-    else: linkText = linkText.replace("[GENDER]", "")
-    if abstract == True:
-        category.Links.Add(MatchedCriteriaLink(linkText, None, None, id, True, None, None, sequence))
-    elif abstract == False:
-        abstraction = MatchedCriteriaLink(linkText, None, None, id, True, None, None, sequence)
-        return abstraction
-    return
-
-def CodeCount(codes):
-    # Get list of codes on the acct based on CodeDic
-    result = set()
-    for document in account.Documents or []:
-        for codeReference in document.CodeReferences or []:
-            if codeReference.Code in codes:
-                matching_code = codeReference.Code
-                result.add(matching_code)
-    return list(result)
-
-def abstractValue(abstraction_name, link_text, calculation, sequence=0, category=None, abstract=False):
-    # Find abstraction and if abstract is true abstract it to the provided category
-    abstraction = accountContainer.GetFirstLinkMatchingAbstractionValue(abstraction_name, link_text, lambda x: calculation)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def dvValue(dv_name, link_text, calculation, sequence=0, category=None, abstract=False):
-    # Find Discrete Value and if abstract is true abstract it to the provided category
-    for dv in dv_name:
-        abstraction = accountContainer.GetFirstLinkMatchingDiscreteValue(dv, link_text, calculation)
-        if abstraction is not None:
-            break
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def dvValueMulti(dvDic, DV1, linkText, value, sign, sequence=0, category=None, abstract=False, needed=2):
-    # Find Discrete Value and if abstract is true abstract it to the provided category
-    matchedList = []
-    x = 0
-    for dv in dvDic or []:
-        dvr = cleanNumbers(dvDic[dv]['Result'])
-        if dvDic[dv]['Name'] in DV1 and dvr is not None and sign(float(dvr), float(value)):
-            matchedList.append(dataConversion(dvDic[dv]['ResultDate'], linkText, dvDic[dv]['Result'], dvDic[dv]['UniqueId'] or dvDic[dv]['_id'], category, sequence, abstract))
-            x += 1
-            if needed <= x:
-                break
-    if abstract and x > 0:
-        return True
-    elif abstract is False and len(matchedList) > 0 and needed > 0:
-        return matchedList
-    else:
-        return None
-
-def compareValuesMulti(dvDic, DV1, value, value1, linkText, sign, sign1, sequence=0, category=None, abstract=False, needed=2):
-    matchedList = []
-    x = 0
-    for dv in dvDic or []:
-        dvr = cleanNumbers(dvDic[dv]['Result'])
-        if dvDic[dv]['Name'] in DV1 and dvr is not None and sign(float(value), float(dvr)) and sign1(float(dvr), float(value1)):
-            matchedList.append(dataConversion(dvDic[dv]['ResultDate'], linkText, dvDic[dv]['Result'], dvDic[dv]['UniqueId'] or dvDic[dv]['_id'], category, sequence, abstract))
-            x += 1
-            if needed <= x:
-                break
-    if abstract and x > 0:
-        return True
-    elif abstract is False and len(matchedList) > 0 and needed > 0:
-        return matchedList
-    else:
-        return None
-    
-def codeValue(code_name, link_text, sequence=0, category=None, abstract=False):
-    # Find code and if abstract is true abstract it to the provided category
-    abstraction = accountContainer.GetFirstCodeLink(code_name, link_text)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def multiCodeValue(code_list, link_text, sequence=0, category=None, abstract=False):
-    # Go through Code List and find first code and if abstract is true abstract it to the provided category
-    abstraction = None
-    for code in code_list:
-        abstraction = accountContainer.GetFirstCodeLink(code, link_text)
-        if abstraction is not None:
-            abstraction.Sequence = sequence
-            if abstract:
-                category.Links.Add(abstraction)
-                return True
-            else:
-                return abstraction
-    if abstract and abstraction is None:
-        return False
-    return abstraction
-
-def prefixCodeValue(prefix, link_text, sequence=0, category=None, abstract=False):
-    # Use prefix to find first code match based on regex search and if abstract is true abstract it to the provided category
-    abstraction = None
-    validCodes = [codes for codes in accountContainer.CodeKeys if re.match(prefix, codes) is not None]
-    for code in validCodes:
-        abstraction = accountContainer.GetFirstCodeLink(code, link_text)
-        if abstraction is not None:
-            abstraction.Sequence = sequence
-            if abstract:
-                category.Links.Add(abstraction)
-                return True
-            else:
-                return abstraction
-    if abstract and abstraction is None:
-        return False
-    return abstraction
-
-def medValue(med_name, link_text, sequence=0, category=None, abstract=False):
-    # Find Medication Value and if abstract is true abstract it to the provided category
-    abstraction = accountContainer.GetFirstMedicationLink(med_name, link_text)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def updateLinkText(value, replacement_text):
-    # Update the link text with the provided text
-    value.LinkText = replacement_text + value.LinkText
-    return value
-
-def documentLink(DocumentType, LinkText, sequence, category, abstract):
-    # Finds a document link and adds it as link so that its a quick reference for the cdi user.
-    abstraction = None
-    abstraction = accountContainer.GetFirstDocumentLink(DocumentType, LinkText)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    return None
+#The helpers every script shares are compiled once per process and bound to this
+#script's globals, see cdi.helpers; a helper defined below replaces the shared one
+context.bind_helpers(globals(), 1)
 
 #========================================
 #  Algorithm
 #========================================
-db.LogEvaluationScriptMessage("Script starting " + str(account._id), scriptName, scriptInstance, "Debug")
+scriptLog.debug("Script starting %s", account._id)
 #Standard Variable Declaration
 AlertPassed = False
 alertTriggered = False
@@ -322,135 +145,136 @@ for alert in account.MatchedCriteriaGroups or []:
 #Check if alert was autoresolved or completed.
 if validated is False:
     #Negations
-    pregenancyNegation =  prefixCodeValue("^O", "Pregenacy Negation: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    pregenancyNegation2 =  prefixCodeValue("^Z3A", "Pregenacy Negation: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    pneumoniaNegations1 = multiCodeValue(["A01.03", "A02.22", "A21.2", "A22.1", "A42.0", "A43.0", "A54.84", "B01.2", "B05.2",
+    evidence = Evidence()
+    evidence.define("pregenancyNegation", prefixCodeValue, "^O", "Pregenacy Negation: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("pregenancyNegation2", prefixCodeValue, "^Z3A", "Pregenacy Negation: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("pneumoniaNegations1", multiCodeValue, ["A01.03", "A02.22", "A21.2", "A22.1", "A42.0", "A43.0", "A54.84", "B01.2", "B05.2",
                         "B06.81", "B25.0", "B37.1", "B38.0", "B39.0", "B44.0", "B44.1", "B58.3", "B59", "B77.81"],
                         "Pneumonia Dx: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    pneumoniaNegations2 = prefixCodeValue("^J12\.", "Pneumonia Dx: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    pneumoniaNegations3 = prefixCodeValue("^J14\.", "Pneumonia Dx: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    pneumoniaNegations4 = prefixCodeValue("^J15\.", "Pneumonia Dx: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    pneumoniaNegations5 = codeValue("J16.0", "Pneumonia Dx: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    pneumoniaNegations6 = prefixCodeValue("^J69\.", "Pneumonia Dx: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    pulmonaryEdemaNegation = multiCodeValue(["J81.0", "J81.1"], "Pulmonary Edema Dx: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    pulmonaryEmbolismNegation = prefixCodeValue("^I26\.", "Pulmonary Embolism Dx: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    heartFailureNegation = multiCodeValue(["I50.21", "I50.23", "I50.31", "I50.33", "I50.41", "I50.43"], "Acute Heart Failure Dx: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    cardiacArrestNegations = prefixCodeValue("^I46\.", "Cardiac Arrest Dx: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    r6521Negations = codeValue("R65.21", "Septic Shock Dx: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    shockNegations = prefixCodeValue("^R57\.", "Shock Dx: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    sepsisNegations1 = prefixCodeValue("^A40\.", "Sepsis Dx: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    sepsisNegations2 = prefixCodeValue("^A41\.", "Sepsis Dx: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    asthmaAttackNegation = multiCodeValue(["J45.901", "J45.902"], "Asthma Attack Dx: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    j441Negation = codeValue("J44.1", "COPD Exacerbation Dx: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    opioidOverdoseNegation = abstractValue("OPIOID_OVERDOSE", "Opioid Overdose: [ABSTRACTVALUE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True)
-    glascowComaNegation = dvValue(dvGlasgowComaScale, "Arterial Blood CO2: [VALUE] (Result Date: [RESULTDATETIME])", calcGlasgowComaScale1)
-    encephalopathyNegation = multiCodeValue(["E51.2", "G31.2", "G92.8", "G93.41", "I67.4", "G92.9", "G93.41"], "Encephalopathy Dx: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    e669Negation = codeValue("E66.9", "Obesity: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("pneumoniaNegations2", prefixCodeValue, "^J12\.", "Pneumonia Dx: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("pneumoniaNegations3", prefixCodeValue, "^J14\.", "Pneumonia Dx: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("pneumoniaNegations4", prefixCodeValue, "^J15\.", "Pneumonia Dx: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("pneumoniaNegations5", codeValue, "J16.0", "Pneumonia Dx: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("pneumoniaNegations6", prefixCodeValue, "^J69\.", "Pneumonia Dx: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("pulmonaryEdemaNegation", multiCodeValue, ["J81.0", "J81.1"], "Pulmonary Edema Dx: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("pulmonaryEmbolismNegation", prefixCodeValue, "^I26\.", "Pulmonary Embolism Dx: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("heartFailureNegation", multiCodeValue, ["I50.21", "I50.23", "I50.31", "I50.33", "I50.41", "I50.43"], "Acute Heart Failure Dx: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("cardiacArrestNegations", prefixCodeValue, "^I46\.", "Cardiac Arrest Dx: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("r6521Negations", codeValue, "R65.21", "Septic Shock Dx: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("shockNegations", prefixCodeValue, "^R57\.", "Shock Dx: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("sepsisNegations1", prefixCodeValue, "^A40\.", "Sepsis Dx: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("sepsisNegations2", prefixCodeValue, "^A41\.", "Sepsis Dx: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("asthmaAttackNegation", multiCodeValue, ["J45.901", "J45.902"], "Asthma Attack Dx: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("j441Negation", codeValue, "J44.1", "COPD Exacerbation Dx: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("opioidOverdoseNegation", abstractValue, "OPIOID_OVERDOSE", "Opioid Overdose: [ABSTRACTVALUE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True)
+    evidence.define("glascowComaNegation", dvValue, dvGlasgowComaScale, "Arterial Blood CO2: [VALUE] (Result Date: [RESULTDATETIME])", calcGlasgowComaScale1)
+    evidence.define("encephalopathyNegation", multiCodeValue, ["E51.2", "G31.2", "G92.8", "G93.41", "I67.4", "G92.9", "G93.41"], "Encephalopathy Dx: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("e669Negation", codeValue, "E66.9", "Obesity: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
     #Alert Trigger
-    r0689Code = codeValue("R06.89", "Hypoventilation: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 6)
-    e662Code = codeValue("E66.2", "Morbid (Severe) Obesity With Alveolar Hypoventilation: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    e6601Code = codeValue("E66.01", "Morbid (Severe) Obesity Due To Excess Calories: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    e66811Code = codeValue("E66.811", "Obesity, Class 1: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    e66812Code = codeValue("E66.812", "Obesity, Class 2: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    e66813Code = codeValue("E66.812", "Obesity, Class 3: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    obesityCodes = multiCodeValue(["E66.8", "E66.9"], "Obesity Dx: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    bmiGTE40Codes = multiCodeValue(["Z68.41", "Z68.42", "Z68.43","Z68.44", "Z68.45"], "BMI >or= 40: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    bmiGTE35Codes = multiCodeValue(["Z68.35", "Z68.36", "Z68.37", "Z68.38", "Z68.39"], "BMI: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    bMILT35DV = dvValue(dvBMI, "BMI: [VALUE] (Result Date: [RESULTDATETIME])", calcBMI3)
-    bMIGTE40DV = dvValue(dvBMI, "BMI: [VALUE] (Result Date: [RESULTDATETIME])", calcBMI1)
-    bMILT40GE35DV = dvValue(dvBMI, "BMI: [VALUE] (Result Date: [RESULTDATETIME])", calcBMI2)
-    bmiLT40Codes = multiCodeValue(["Z68.1", "Z68.20", "Z68.21", "Z68.22", "Z68.23", "Z68.24", "Z68.25",
+    evidence.define("r0689Code", codeValue, "R06.89", "Hypoventilation: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 6)
+    evidence.define("e662Code", codeValue, "E66.2", "Morbid (Severe) Obesity With Alveolar Hypoventilation: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("e6601Code", codeValue, "E66.01", "Morbid (Severe) Obesity Due To Excess Calories: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("e66811Code", codeValue, "E66.811", "Obesity, Class 1: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("e66812Code", codeValue, "E66.812", "Obesity, Class 2: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("e66813Code", codeValue, "E66.812", "Obesity, Class 3: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("obesityCodes", multiCodeValue, ["E66.8", "E66.9"], "Obesity Dx: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("bmiGTE40Codes", multiCodeValue, ["Z68.41", "Z68.42", "Z68.43","Z68.44", "Z68.45"], "BMI >or= 40: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("bmiGTE35Codes", multiCodeValue, ["Z68.35", "Z68.36", "Z68.37", "Z68.38", "Z68.39"], "BMI: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("bMILT35DV", dvValue, dvBMI, "BMI: [VALUE] (Result Date: [RESULTDATETIME])", calcBMI3)
+    evidence.define("bMIGTE40DV", dvValue, dvBMI, "BMI: [VALUE] (Result Date: [RESULTDATETIME])", calcBMI1)
+    evidence.define("bMILT40GE35DV", dvValue, dvBMI, "BMI: [VALUE] (Result Date: [RESULTDATETIME])", calcBMI2)
+    evidence.define("bmiLT40Codes", multiCodeValue, ["Z68.1", "Z68.20", "Z68.21", "Z68.22", "Z68.23", "Z68.24", "Z68.25",
         "Z68.26", "Z68.27", "Z68.28", "Z68.29", "Z68.3", "Z68.30", "Z68.31", "Z68.32", "Z68.33","Z68.34", 
         "Z68.35", "Z68.36", "Z68.37", "Z68.38", "Z68.39"], "BMI: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    bmiLT35Codes = multiCodeValue(["Z68.1", "Z68.20", "Z68.21", "Z68.22", "Z68.23", "Z68.24", "Z68.25", "Z68.26", "Z68.27",
+    evidence.define("bmiLT35Codes", multiCodeValue, ["Z68.1", "Z68.20", "Z68.21", "Z68.22", "Z68.23", "Z68.24", "Z68.25", "Z68.26", "Z68.27",
         "Z68.28", "Z68.29", "Z68.30", "Z68.31", "Z68.32", "Z68.33", "Z68.34"], 
         "BMI: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    j9612Code = codeValue("J96.12", "Chronic Respiratory Failure with Hypercarbia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    pilmonaryHypertensionAbs = abstractValue("PULMONARY_HYPERTENSION_DUE_TO_HYPOVENTILATION", "Pulmonary Hypertension '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 0)
-    bmiGE35L40Abs = abstractValue("HIGH_BMI_1", "BMI: [ABSTRACTVALUE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 0)
-    bmiGE40Abs = abstractValue("HIGH_BMI_2", "BMI: [ABSTRACTVALUE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 0)
-    bmiGE185L35Abs = abstractValue("MID_BMI", "BMI: [ABSTRACTVALUE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 0)
-    bmiL185Abs = abstractValue("LOW_BMI", "BMI: [ABSTRACTVALUE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 0)
+    evidence.define("j9612Code", codeValue, "J96.12", "Chronic Respiratory Failure with Hypercarbia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("pilmonaryHypertensionAbs", abstractValue, "PULMONARY_HYPERTENSION_DUE_TO_HYPOVENTILATION", "Pulmonary Hypertension '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 0)
+    evidence.define("bmiGE35L40Abs", abstractValue, "HIGH_BMI_1", "BMI: [ABSTRACTVALUE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 0)
+    evidence.define("bmiGE40Abs", abstractValue, "HIGH_BMI_2", "BMI: [ABSTRACTVALUE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 0)
+    evidence.define("bmiGE185L35Abs", abstractValue, "MID_BMI", "BMI: [ABSTRACTVALUE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 0)
+    evidence.define("bmiL185Abs", abstractValue, "LOW_BMI", "BMI: [ABSTRACTVALUE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 0)
     #Co-Morbidities
-    coronaryArteryAngina = multiCodeValue(["I25.110", "I25.111", "I25.112", "I25.118", "I25.119"], "Coronary Artery Disease with Angina: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 1)
-    i2510Code = codeValue("I25.10", "Coronary Artery Disease without Angina: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 2)
-    e785Code = codeValue("E78.5", "Hyperlipidemia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 3)
-    i10Code = codeValue("I10", "Hypertension: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 4)
-    hypertensiveChronicKidney = multiCodeValue(["I12.0", "I12.9"], "Hypertensive Chronic Kidney Disease: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 5)
-    hypertensiveHeartChronicKidney = multiCodeValue(["I13.0", "I13.10", "I13.11", "I13.2"], "Hypertensive Heart and Chronic Kidney Disease: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 6)
-    hypertensiveHeart = multiCodeValue(["E11.0", "E11.9"], "Hypertensive Heart Disease: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 7)
-    k760Code = codeValue("K76.0", "Non-Alcoholic Fatty Liver Disease (NAFLD): [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 8)
-    g4733Code = codeValue("G47.33", "Obstructive Sleep Apnea (OSA): [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 9)
-    osteoarthritis = multiCodeValue(["M19.90", "M19.93"], "Osteoarthritis: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 10)
-    osteoarthritisHip = multiCodeValue(["M16.6", "M16.7", "M16.9"], "Osteoarthritis of Hip: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 11)
-    osteoarthritisKnee = multiCodeValue(["M17.4", "M17.5", "M17.9"], "Osteoarthritis of Knee: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 12)
-    a4730Code = codeValue("A47.30", "Sleep Apnea: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 16)
-    type2DiabetesAbs = abstractValue("DIABETES_TYPE_2", "Type 2 Diabetes: [ABSTRACTVALUE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 14)
+    evidence.define("coronaryArteryAngina", multiCodeValue, ["I25.110", "I25.111", "I25.112", "I25.118", "I25.119"], "Coronary Artery Disease with Angina: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 1)
+    evidence.define("i2510Code", codeValue, "I25.10", "Coronary Artery Disease without Angina: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 2)
+    evidence.define("e785Code", codeValue, "E78.5", "Hyperlipidemia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 3)
+    evidence.define("i10Code", codeValue, "I10", "Hypertension: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 4)
+    evidence.define("hypertensiveChronicKidney", multiCodeValue, ["I12.0", "I12.9"], "Hypertensive Chronic Kidney Disease: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 5)
+    evidence.define("hypertensiveHeartChronicKidney", multiCodeValue, ["I13.0", "I13.10", "I13.11", "I13.2"], "Hypertensive Heart and Chronic Kidney Disease: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 6)
+    evidence.define("hypertensiveHeart", multiCodeValue, ["E11.0", "E11.9"], "Hypertensive Heart Disease: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 7)
+    evidence.define("k760Code", codeValue, "K76.0", "Non-Alcoholic Fatty Liver Disease (NAFLD): [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 8)
+    evidence.define("g4733Code", codeValue, "G47.33", "Obstructive Sleep Apnea (OSA): [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 9)
+    evidence.define("osteoarthritis", multiCodeValue, ["M19.90", "M19.93"], "Osteoarthritis: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 10)
+    evidence.define("osteoarthritisHip", multiCodeValue, ["M16.6", "M16.7", "M16.9"], "Osteoarthritis of Hip: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 11)
+    evidence.define("osteoarthritisKnee", multiCodeValue, ["M17.4", "M17.5", "M17.9"], "Osteoarthritis of Knee: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 12)
+    evidence.define("a4730Code", codeValue, "A47.30", "Sleep Apnea: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 16)
+    evidence.define("type2DiabetesAbs", abstractValue, "DIABETES_TYPE_2", "Type 2 Diabetes: [ABSTRACTVALUE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 14)
     #Labs
-    arterialBloodCO2DV = dvValue(dvArterialBloodC02, "PaCO2: [VALUE] (Result Date: [RESULTDATETIME])", calcArterialBloodC021, 1)
-    venousBloodCO2DV = dvValue(dvVenousBloodCO2, "Venous Blood C02: [VALUE] (Result Date: [RESULTDATETIME])", calcVenousBloodCO2, 8)
+    evidence.define("arterialBloodCO2DV", dvValue, dvArterialBloodC02, "PaCO2: [VALUE] (Result Date: [RESULTDATETIME])", calcArterialBloodC021, 1)
+    evidence.define("venousBloodCO2DV", dvValue, dvVenousBloodCO2, "Venous Blood C02: [VALUE] (Result Date: [RESULTDATETIME])", calcVenousBloodCO2, 8)
     #Oxygen
-    nonInvasiveMechanicalVentilation = abstractValue("NON_INVASIVE_VENTILATION", "Non-Invasive Ventilation '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 2)
-    invasiveMechanicalVentilation = multiCodeValue(["5A1935Z", "5A1945Z", "5A1955Z"], "Invasive Mechanical Ventilation: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 4)
+    evidence.define("nonInvasiveMechanicalVentilation", abstractValue, "NON_INVASIVE_VENTILATION", "Non-Invasive Ventilation '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 2)
+    evidence.define("invasiveMechanicalVentilation", multiCodeValue, ["5A1935Z", "5A1945Z", "5A1955Z"], "Invasive Mechanical Ventilation: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 4)
 
     #Alert Checks
-    if (pneumoniaNegations1 is not None or
-        pneumoniaNegations2 is not None or
-        pneumoniaNegations3 is not None or
-        pneumoniaNegations4 is not None or
-        pneumoniaNegations5 is not None or
-        pneumoniaNegations6 is not None or
-        pulmonaryEdemaNegation is not None or
-        pulmonaryEmbolismNegation is not None or
-        heartFailureNegation is not None or
-        cardiacArrestNegations is not None or
-        r6521Negations is not None or
-        shockNegations is not None or
-        sepsisNegations1 is not None or
-        sepsisNegations2 is not None or
-        asthmaAttackNegation is not None or
-        j441Negation is not None or
-        opioidOverdoseNegation is not None or
-        glascowComaNegation is not None or
-        encephalopathyNegation is not None
+    if (evidence.pneumoniaNegations1 is not None or
+        evidence.pneumoniaNegations2 is not None or
+        evidence.pneumoniaNegations3 is not None or
+        evidence.pneumoniaNegations4 is not None or
+        evidence.pneumoniaNegations5 is not None or
+        evidence.pneumoniaNegations6 is not None or
+        evidence.pulmonaryEdemaNegation is not None or
+        evidence.pulmonaryEmbolismNegation is not None or
+        evidence.heartFailureNegation is not None or
+        evidence.cardiacArrestNegations is not None or
+        evidence.r6521Negations is not None or
+        evidence.shockNegations is not None or
+        evidence.sepsisNegations1 is not None or
+        evidence.sepsisNegations2 is not None or
+        evidence.asthmaAttackNegation is not None or
+        evidence.j441Negation is not None or
+        evidence.opioidOverdoseNegation is not None or
+        evidence.glascowComaNegation is not None or
+        evidence.encephalopathyNegation is not None
     ):
         negation = True
 
     #Co-Morbitities Count and Abstraction
-    if coronaryArteryAngina is not None: morbidity.Links.Add(coronaryArteryAngina); coMorbidity += 1
-    if i2510Code is not None: morbidity.Links.Add(i2510Code); coMorbidity += 1
-    if e785Code is not None: morbidity.Links.Add(e785Code); coMorbidity += 1
-    if i10Code is not None: morbidity.Links.Add(i10Code); coMorbidity += 1
-    if hypertensiveChronicKidney is not None: morbidity.Links.Add(hypertensiveChronicKidney); coMorbidity += 1
-    if hypertensiveHeartChronicKidney is not None: morbidity.Links.Add(hypertensiveHeartChronicKidney); coMorbidity += 1
-    if hypertensiveHeart is not None: morbidity.Links.Add(hypertensiveHeart); coMorbidity += 1
-    if k760Code is not None: morbidity.Links.Add(k760Code); coMorbidity += 1
-    if g4733Code is not None: morbidity.Links.Add(g4733Code); coMorbidity += 1
-    if osteoarthritis is not None: morbidity.Links.Add(osteoarthritis); coMorbidity += 1
-    if osteoarthritisHip is not None: morbidity.Links.Add(osteoarthritisHip); coMorbidity += 1
-    if osteoarthritisKnee is not None: morbidity.Links.Add(osteoarthritisKnee); coMorbidity += 1
-    if a4730Code is not None: morbidity.Links.Add(a4730Code); coMorbidity += 1
-    if type2DiabetesAbs is not None: morbidity.Links.Add(type2DiabetesAbs); coMorbidity += 1
+    if evidence.coronaryArteryAngina is not None: morbidity.Links.Add(evidence.coronaryArteryAngina); coMorbidity += 1
+    if evidence.i2510Code is not None: morbidity.Links.Add(evidence.i2510Code); coMorbidity += 1
+    if evidence.e785Code is not None: morbidity.Links.Add(evidence.e785Code); coMorbidity += 1
+    if evidence.i10Code is not None: morbidity.Links.Add(evidence.i10Code); coMorbidity += 1
+    if evidence.hypertensiveChronicKidney is not None: morbidity.Links.Add(evidence.hypertensiveChronicKidney); coMorbidity += 1
+    if evidence.hypertensiveHeartChronicKidney is not None: morbidity.Links.Add(evidence.hypertensiveHeartChronicKidney); coMorbidity += 1
+    if evidence.hypertensiveHeart is not None: morbidity.Links.Add(evidence.hypertensiveHeart); coMorbidity += 1
+    if evidence.k760Code is not None: morbidity.Links.Add(evidence.k760Code); coMorbidity += 1
+    if evidence.g4733Code is not None: morbidity.Links.Add(evidence.g4733Code); coMorbidity += 1
+    if evidence.osteoarthritis is not None: morbidity.Links.Add(evidence.osteoarthritis); coMorbidity += 1
+    if evidence.osteoarthritisHip is not None: morbidity.Links.Add(evidence.osteoarthritisHip); coMorbidity += 1
+    if evidence.osteoarthritisKnee is not None: morbidity.Links.Add(evidence.osteoarthritisKnee); coMorbidity += 1
+    if evidence.a4730Code is not None: morbidity.Links.Add(evidence.a4730Code); coMorbidity += 1
+    if evidence.type2DiabetesAbs is not None: morbidity.Links.Add(evidence.type2DiabetesAbs); coMorbidity += 1
     
     #Main Algorithm
-    if pregenancyNegation is not None or pregenancyNegation2 is not None:
-        db.LogEvaluationScriptMessage("Pregnancy Codes detected on chart, alert failed. " + str(account._id), scriptName, scriptInstance, "Debug")
+    if evidence.pregenancyNegation is not None or evidence.pregenancyNegation2 is not None:
+        scriptLog.debug("Pregnancy Codes detected on chart, alert failed. %s", account._id)
         result.Passed = False
     #1.1
     elif (
         subtitle == "Morbid Obesity with Alveolar Hypoventilation Dx Lacking Supporting Evidence" and 
-        ((bmiGTE40Codes is not None or bMIGTE40DV is not None or bmiGE40Abs is not None or
-        ((bmiGTE35Codes is not None or bMILT40GE35DV is not None or bmiGE35L40Abs is not None) and coMorbidity > 0) and message1) or 
-         ((nonInvasiveMechanicalVentilation is not None or invasiveMechanicalVentilation is not None or 
-         r0689Code is not None or arterialBloodCO2DV is not None or venousBloodCO2DV is not None) and message2))
+        ((evidence.bmiGTE40Codes is not None or evidence.bMIGTE40DV is not None or evidence.bmiGE40Abs is not None or
+        ((evidence.bmiGTE35Codes is not None or evidence.bMILT40GE35DV is not None or evidence.bmiGE35L40Abs is not None) and coMorbidity > 0) and message1) or 
+         ((evidence.nonInvasiveMechanicalVentilation is not None or evidence.invasiveMechanicalVentilation is not None or 
+         evidence.r0689Code is not None or evidence.arterialBloodCO2DV is not None or evidence.venousBloodCO2DV is not None) and message2))
     ):
         if message1:
-            if bmiGTE40Codes is not None: updateLinkText(bmiGTE40Codes, autoCodeText); dc.Links.Add(bmiGTE40Codes)
-            if bmiGE40Abs is not None: updateLinkText(bmiGE40Abs, autoEvidenceText); dc.Links.Add(bmiGE40Abs)
-            if bMIGTE40DV is not None: updateLinkText(bMIGTE40DV, autoEvidenceText); dc.Links.Add(bMIGTE40DV)
-            if bmiGTE35Codes is not None: updateLinkText(bmiGTE35Codes, autoCodeText); dc.Links.Add(bmiGTE35Codes)
-            if bmiGE35L40Abs is not None: updateLinkText(bmiGE35L40Abs, autoEvidenceText); dc.Links.Add(bmiGE35L40Abs)
-            if bMILT40GE35DV is not None: updateLinkText(bMILT40GE35DV, autoEvidenceText); dc.Links.Add(bMILT40GE35DV)
+            if evidence.bmiGTE40Codes is not None: updateLinkText(evidence.bmiGTE40Codes, autoCodeText); dc.Links.Add(evidence.bmiGTE40Codes)
+            if evidence.bmiGE40Abs is not None: updateLinkText(evidence.bmiGE40Abs, autoEvidenceText); dc.Links.Add(evidence.bmiGE40Abs)
+            if evidence.bMIGTE40DV is not None: updateLinkText(evidence.bMIGTE40DV, autoEvidenceText); dc.Links.Add(evidence.bMIGTE40DV)
+            if evidence.bmiGTE35Codes is not None: updateLinkText(evidence.bmiGTE35Codes, autoCodeText); dc.Links.Add(evidence.bmiGTE35Codes)
+            if evidence.bmiGE35L40Abs is not None: updateLinkText(evidence.bmiGE35L40Abs, autoEvidenceText); dc.Links.Add(evidence.bmiGE35L40Abs)
+            if evidence.bMILT40GE35DV is not None: updateLinkText(evidence.bMILT40GE35DV, autoEvidenceText); dc.Links.Add(evidence.bMILT40GE35DV)
             dc.Links.Add(MatchedCriteriaLink(LinkText1, None, None, None, False))
         if message2:
             dc.Links.Add(MatchedCriteriaLink(LinkText2, None, None, None, False))
@@ -460,20 +284,20 @@ if validated is False:
         AlertConditions = True  
     #1
     elif (
-        e662Code is not None and
-        ((bmiGTE40Codes is None and bMIGTE40DV is None and bmiGE40Abs is None) or (bmiGTE35Codes is None and bMILT40GE35DV is None and bmiGE35L40Abs is None and coMorbidity == 0)) and
-        (nonInvasiveMechanicalVentilation is None and invasiveMechanicalVentilation is None and 
-        r0689Code is not None and arterialBloodCO2DV is None and venousBloodCO2DV is None)
+        evidence.e662Code is not None and
+        ((evidence.bmiGTE40Codes is None and evidence.bMIGTE40DV is None and evidence.bmiGE40Abs is None) or (evidence.bmiGTE35Codes is None and evidence.bMILT40GE35DV is None and evidence.bmiGE35L40Abs is None and coMorbidity == 0)) and
+        (evidence.nonInvasiveMechanicalVentilation is None and evidence.invasiveMechanicalVentilation is None and 
+        evidence.r0689Code is not None and evidence.arterialBloodCO2DV is None and evidence.venousBloodCO2DV is None)
     ):
-        if e662Code is not None: dc.Links.Add(e662Code)
-        if ((bmiGTE40Codes is None and bMIGTE40DV is None and bmiGE40Abs is None) or (bmiGTE35Codes is None and bMILT40GE35DV is None and bmiGE35L40Abs is None and coMorbidity == 0)):
+        if evidence.e662Code is not None: dc.Links.Add(evidence.e662Code)
+        if ((evidence.bmiGTE40Codes is None and evidence.bMIGTE40DV is None and evidence.bmiGE40Abs is None) or (evidence.bmiGTE35Codes is None and evidence.bMILT40GE35DV is None and evidence.bmiGE35L40Abs is None and coMorbidity == 0)):
             dc.Links.Add(MatchedCriteriaLink(LinkText1, None, None, None))
         if (
-            (nonInvasiveMechanicalVentilation is None and 
-            invasiveMechanicalVentilation is None and 
-            r0689Code is not None and 
-            arterialBloodCO2DV is None and 
-            venousBloodCO2DV is None)
+            (evidence.nonInvasiveMechanicalVentilation is None and 
+            evidence.invasiveMechanicalVentilation is None and 
+            evidence.r0689Code is not None and 
+            evidence.arterialBloodCO2DV is None and 
+            evidence.venousBloodCO2DV is None)
         ):
             dc.Links.Add(MatchedCriteriaLink(LinkText2, None, None, None))
         result.Subtitle = "Morbid Obesity with Alveolar Hypoventilation Dx Lacking Supporting Evidence"
@@ -481,90 +305,90 @@ if validated is False:
     #2.1
     elif (
         subtitle == "Morbid (Severe) Obesity Documented, but BMI Criteria Not Met" and 
-        (bmiGTE40Codes is not None or bMIGTE40DV is not None or bmiGE40Abs is not None or 
-        ((bmiGTE35Codes is not None or bMILT40GE35DV is not None or bmiGE35L40Abs is not None) and coMorbidity > 0))
+        (evidence.bmiGTE40Codes is not None or evidence.bMIGTE40DV is not None or evidence.bmiGE40Abs is not None or 
+        ((evidence.bmiGTE35Codes is not None or evidence.bMILT40GE35DV is not None or evidence.bmiGE35L40Abs is not None) and coMorbidity > 0))
     ):
-        if bmiGTE40Codes is not None: updateLinkText(bmiGTE40Codes, autoCodeText); dc.Links.Add(bmiGTE40Codes)
-        if bmiGE40Abs is not None: updateLinkText(bmiGE40Abs, autoEvidenceText); dc.Links.Add(bmiGE40Abs)
-        if bMIGTE40DV is not None: updateLinkText(bMIGTE40DV, autoEvidenceText); dc.Links.Add(bMIGTE40DV)
-        if bmiGTE35Codes is not None: updateLinkText(bmiGTE35Codes, autoCodeText); dc.Links.Add(bmiGTE35Codes)
-        if bmiGE35L40Abs is not None: updateLinkText(bmiGE35L40Abs, autoEvidenceText); dc.Links.Add(bmiGE35L40Abs)
-        if bMILT40GE35DV is not None: updateLinkText(bMILT40GE35DV, autoEvidenceText); dc.Links.Add(bMILT40GE35DV)
+        if evidence.bmiGTE40Codes is not None: updateLinkText(evidence.bmiGTE40Codes, autoCodeText); dc.Links.Add(evidence.bmiGTE40Codes)
+        if evidence.bmiGE40Abs is not None: updateLinkText(evidence.bmiGE40Abs, autoEvidenceText); dc.Links.Add(evidence.bmiGE40Abs)
+        if evidence.bMIGTE40DV is not None: updateLinkText(evidence.bMIGTE40DV, autoEvidenceText); dc.Links.Add(evidence.bMIGTE40DV)
+        if evidence.bmiGTE35Codes is not None: updateLinkText(evidence.bmiGTE35Codes, autoCodeText); dc.Links.Add(evidence.bmiGTE35Codes)
+        if evidence.bmiGE35L40Abs is not None: updateLinkText(evidence.bmiGE35L40Abs, autoEvidenceText); dc.Links.Add(evidence.bmiGE35L40Abs)
+        if evidence.bMILT40GE35DV is not None: updateLinkText(evidence.bMILT40GE35DV, autoEvidenceText); dc.Links.Add(evidence.bMILT40GE35DV)
         result.Outcome = "AUTORESOLVED"
         result.Reason = "Autoresolved due to one Specified Code on the Account"
         result.Validated = True
         AlertConditions = True   
     #2
     elif (
-        (e662Code is not None or e6601Code is not None) and 
-        (((bmiGTE35Codes is not None or bMILT40GE35DV is not None or bmiGE35L40Abs is not None) and coMorbidity == 0) or
-        (bmiLT35Codes is not None or bMILT35DV is not None) or
-        (bmiLT40Codes is None and bmiGTE35Codes is None and bmiLT35Codes is None and bMILT40GE35DV is None and bMILT35DV is None)) and 
-        bMIGTE40DV is None and 
-        bmiGTE40Codes is None and bmiGE40Abs is None
+        (evidence.e662Code is not None or evidence.e6601Code is not None) and 
+        (((evidence.bmiGTE35Codes is not None or evidence.bMILT40GE35DV is not None or evidence.bmiGE35L40Abs is not None) and coMorbidity == 0) or
+        (evidence.bmiLT35Codes is not None or evidence.bMILT35DV is not None) or
+        (evidence.bmiLT40Codes is None and evidence.bmiGTE35Codes is None and evidence.bmiLT35Codes is None and evidence.bMILT40GE35DV is None and evidence.bMILT35DV is None)) and 
+        evidence.bMIGTE40DV is None and 
+        evidence.bmiGTE40Codes is None and evidence.bmiGE40Abs is None
     ):
-        if e662Code is not None: dc.Links.Add(e662Code)
-        if e6601Code is not None: dc.Links.Add(e6601Code)
-        if bmiGTE40Codes is not None: dc.Links.Add(bmiGTE40Codes)
-        if bmiLT35Codes is not None: dc.Links.Add(bmiLT35Codes)
-        if bMILT35DV is not None: dc.Links.Add(bMILT35DV)
-        if bmiGTE35Codes is not None: dc.Links.Add(bmiGTE35Codes)
-        if bmiGE35L40Abs is not None: dc.Links.Add(bmiGE35L40Abs)
-        if bMILT40GE35DV is not None: dc.Links.Add(bMILT40GE35DV)
-        if bmiL185Abs is not None: dc.Links.Add(bmiL185Abs)
-        if bmiGE185L35Abs is not None: dc.Links.Add(bmiGE185L35Abs)
-        if bmiGE35L40Abs is not None: dc.Links.Add(bmiGE35L40Abs)
+        if evidence.e662Code is not None: dc.Links.Add(evidence.e662Code)
+        if evidence.e6601Code is not None: dc.Links.Add(evidence.e6601Code)
+        if evidence.bmiGTE40Codes is not None: dc.Links.Add(evidence.bmiGTE40Codes)
+        if evidence.bmiLT35Codes is not None: dc.Links.Add(evidence.bmiLT35Codes)
+        if evidence.bMILT35DV is not None: dc.Links.Add(evidence.bMILT35DV)
+        if evidence.bmiGTE35Codes is not None: dc.Links.Add(evidence.bmiGTE35Codes)
+        if evidence.bmiGE35L40Abs is not None: dc.Links.Add(evidence.bmiGE35L40Abs)
+        if evidence.bMILT40GE35DV is not None: dc.Links.Add(evidence.bMILT40GE35DV)
+        if evidence.bmiL185Abs is not None: dc.Links.Add(evidence.bmiL185Abs)
+        if evidence.bmiGE185L35Abs is not None: dc.Links.Add(evidence.bmiGE185L35Abs)
+        if evidence.bmiGE35L40Abs is not None: dc.Links.Add(evidence.bmiGE35L40Abs)
         result.Subtitle = "Morbid (Severe) Obesity Documented, but BMI Criteria Not Met"
         AlertPassed = True
     #3.1
-    elif subtitle == "Possible Morbid (Severe) Obesity with Hypoventilation" and e662Code is not None:
-        if e662Code is not None: updateLinkText(e662Code, autoCodeText); dc.Links.Add(e662Code)
+    elif subtitle == "Possible Morbid (Severe) Obesity with Hypoventilation" and evidence.e662Code is not None:
+        if evidence.e662Code is not None: updateLinkText(evidence.e662Code, autoCodeText); dc.Links.Add(evidence.e662Code)
         result.Outcome = "AUTORESOLVED"
         result.Reason = "Autoresolved due to one Specified Code on the Account"
         result.Validated = True
         AlertConditions = True
     #3
     elif (
-        e662Code is None and 
-        (bmiGTE40Codes is not None or bMIGTE40DV is not None or bmiGE40Abs is not None or 
-         ((bmiGTE35Codes is not None or bMILT40GE35DV is not None or bmiGE35L40Abs is not None) and coMorbidity > 0)) and
-        (nonInvasiveMechanicalVentilation is not None or invasiveMechanicalVentilation is not None or 
-         r0689Code is not None or arterialBloodCO2DV is not None or venousBloodCO2DV is not None) and
+        evidence.e662Code is None and 
+        (evidence.bmiGTE40Codes is not None or evidence.bMIGTE40DV is not None or evidence.bmiGE40Abs is not None or 
+         ((evidence.bmiGTE35Codes is not None or evidence.bMILT40GE35DV is not None or evidence.bmiGE35L40Abs is not None) and coMorbidity > 0)) and
+        (evidence.nonInvasiveMechanicalVentilation is not None or evidence.invasiveMechanicalVentilation is not None or 
+         evidence.r0689Code is not None or evidence.arterialBloodCO2DV is not None or evidence.venousBloodCO2DV is not None) and
         negation is False
     ):
-        if bmiGTE40Codes is not None: dc.Links.Add(bmiGTE40Codes)
-        if bmiGE40Abs is not None: dc.Links.Add(bmiGE40Abs)
-        if bMIGTE40DV is not None: dc.Links.Add(bMIGTE40DV)
-        if bmiGTE35Codes is not None: dc.Links.Add(bmiGTE35Codes)
-        if bmiGE35L40Abs is not None: dc.Links.Add(bmiGE35L40Abs)
-        if bMILT40GE35DV is not None: dc.Links.Add(bMILT40GE35DV)
+        if evidence.bmiGTE40Codes is not None: dc.Links.Add(evidence.bmiGTE40Codes)
+        if evidence.bmiGE40Abs is not None: dc.Links.Add(evidence.bmiGE40Abs)
+        if evidence.bMIGTE40DV is not None: dc.Links.Add(evidence.bMIGTE40DV)
+        if evidence.bmiGTE35Codes is not None: dc.Links.Add(evidence.bmiGTE35Codes)
+        if evidence.bmiGE35L40Abs is not None: dc.Links.Add(evidence.bmiGE35L40Abs)
+        if evidence.bMILT40GE35DV is not None: dc.Links.Add(evidence.bMILT40GE35DV)
         result.Subtitle = "Possible Morbid (Severe) Obesity with Hypoventilation"
         AlertPassed = True
     #4
-    elif (e6601Code is not None or e662Code is not None or e669Negation is not None or e66811Code is not None or e66812Code is not None or e66813Code is not None) and subtitle == "Possible Morbid (Severe) Obesity":
+    elif (evidence.e6601Code is not None or evidence.e662Code is not None or evidence.e669Negation is not None or evidence.e66811Code is not None or evidence.e66812Code is not None or evidence.e66813Code is not None) and subtitle == "Possible Morbid (Severe) Obesity":
         AlertConditions = True
-        if e6601Code is not None: updateLinkText(e6601Code, autoCodeText); dc.Links.Add(e6601Code)
-        if e662Code is not None: updateLinkText(e662Code, autoCodeText); dc.Links.Add(e662Code)
-        if e669Negation is not None: updateLinkText(e669Negation, autoCodeText); dc.Links.Add(e669Negation)
-        if e66811Code is not None: updateLinkText(e66811Code, autoCodeText); dc.Links.Add(e66811Code)
-        if e66812Code is not None: updateLinkText(e66812Code, autoCodeText); dc.Links.Add(e66812Code)
-        if e66813Code is not None: updateLinkText(e66813Code, autoCodeText); dc.Links.Add(e66813Code)
+        if evidence.e6601Code is not None: updateLinkText(evidence.e6601Code, autoCodeText); dc.Links.Add(evidence.e6601Code)
+        if evidence.e662Code is not None: updateLinkText(evidence.e662Code, autoCodeText); dc.Links.Add(evidence.e662Code)
+        if evidence.e669Negation is not None: updateLinkText(evidence.e669Negation, autoCodeText); dc.Links.Add(evidence.e669Negation)
+        if evidence.e66811Code is not None: updateLinkText(evidence.e66811Code, autoCodeText); dc.Links.Add(evidence.e66811Code)
+        if evidence.e66812Code is not None: updateLinkText(evidence.e66812Code, autoCodeText); dc.Links.Add(evidence.e66812Code)
+        if evidence.e66813Code is not None: updateLinkText(evidence.e66813Code, autoCodeText); dc.Links.Add(evidence.e66813Code)
         result.Outcome = "AUTORESOLVED"
         result.Reason = "Autoresolved due to a fully specified code now existing on the Account"
         result.Validated = True
 
-    elif e669Negation is None and e6601Code is None and e662Code is None and e66811Code is None and e66812Code is None and e66813Code is None and (bmiGTE40Codes is not None or bMIGTE40DV is not None or bmiGE40Abs is not None):
-        if bmiGTE40Codes is not None: dc.Links.Add(bmiGTE40Codes)
-        if bmiGE40Abs is not None: dc.Links.Add(bmiGE40Abs)
-        if bMIGTE40DV is not None: dc.Links.Add(bMIGTE40DV)
+    elif evidence.e669Negation is None and evidence.e6601Code is None and evidence.e662Code is None and evidence.e66811Code is None and evidence.e66812Code is None and evidence.e66813Code is None and (evidence.bmiGTE40Codes is not None or evidence.bMIGTE40DV is not None or evidence.bmiGE40Abs is not None):
+        if evidence.bmiGTE40Codes is not None: dc.Links.Add(evidence.bmiGTE40Codes)
+        if evidence.bmiGE40Abs is not None: dc.Links.Add(evidence.bmiGE40Abs)
+        if evidence.bMIGTE40DV is not None: dc.Links.Add(evidence.bMIGTE40DV)
         result.Subtitle = "Possible Morbid (Severe) Obesity"
         AlertPassed = True
     else:
-        db.LogEvaluationScriptMessage("Not enough data to warrent alert, Alert Failed. " + str(account._id), scriptName, scriptInstance, "Debug")
+        scriptLog.debug("Not enough data to warrent alert, Alert Failed. %s", account._id)
         result.Passed = False
 
 else:
-    db.LogEvaluationScriptMessage("Alert Closed; Exiting script run. Outcome: " + str(outcome) + " " + str(account._id), scriptName, scriptInstance, "Debug")
+    scriptLog.debug("Alert Closed; Exiting script run. Outcome: %s %s", outcome, account._id)
 
 #If an alert triggered abstract the following
 if AlertPassed:
@@ -581,19 +405,19 @@ if AlertPassed:
     codeValue("G47.30", "Sleep Apnea: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 10, abs, True)
     abstractValue("WEIGHT", "Weight: [ABSTRACTVALUE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 11, abs, True)
     #Labs
-    if arterialBloodCO2DV is not None: labs.Links.Add(arterialBloodCO2DV) #1
+    if evidence.arterialBloodCO2DV is not None: labs.Links.Add(evidence.arterialBloodCO2DV) #1
     dvValue(dvPaO2, "Pa02: [VALUE] (Result Date: [RESULTDATETIME])", calcPAO21, 2, labs, True)
     if dvValue(dvArterialBloodPH, "Blood PH: [VALUE] (Result Date: [RESULTDATETIME])", calcArterialBloodPH1, 3, labs, True) is False:
         dvValue(dvPH, "PH: [VALUE] (Result Date: [RESULTDATETIME])", calcPH1, 4, labs, True)
     codeValue("R09.02", "Hypoxemia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 5, labs, True)
     dvValue(dvSPO2, "Sp02: [VALUE] (Result Date: [RESULTDATETIME])", calcSPO21, 6, labs, True)
     dvValue(dvSerumBicarbonate, "Serum Bicarbonate: [VALUE] (Result Date: [RESULTDATETIME])", calcSerumBicarbonate1, 7, labs, True)
-    if venousBloodCO2DV is not None: labs.Links.Add(venousBloodCO2DV) #8
+    if evidence.venousBloodCO2DV is not None: labs.Links.Add(evidence.venousBloodCO2DV) #8
     #Oxygen
     codeValue("Z99.81", "Home Oxygen Use: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 1, oxygen, True)
-    if invasiveMechanicalVentilation is not None: oxygen.Links.Add(invasiveMechanicalVentilation) #2
+    if evidence.invasiveMechanicalVentilation is not None: oxygen.Links.Add(evidence.invasiveMechanicalVentilation) #2
     codeValue("3E0F7SF", "Nasal Cannula: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 3, oxygen, True)
-    if nonInvasiveMechanicalVentilation is not None: oxygen.Links.Add(nonInvasiveMechanicalVentilation) #4
+    if evidence.nonInvasiveMechanicalVentilation is not None: oxygen.Links.Add(evidence.nonInvasiveMechanicalVentilation) #4
 
 #If alert passed or alert conditions was triggered add categories to result if they have links
 if AlertPassed or AlertConditions:
@@ -604,7 +428,9 @@ if AlertPassed or AlertConditions:
     if morbidity.Links: result.Links.Add(morbidity); morbidityLinks = True
     result.Links.Add(treatment)
     result.Links.Add(other)
-    db.LogEvaluationScriptMessage("Alert Passed Adding Links. Alert Triggered: " + str(result.Subtitle) + " Autoresolved: " + str(result.Outcome) + "; " +
-        str(result.Validated) + "; Links: Documented Dx- " + str(dcLinks) + ", Abs- " + str(absLinks) + ", labs- " + str(labsLinks) + ", Morbidity- "
-        + str(morbidityLinks) + ", oxygen- " + str(oxygenLinks) + "; Acct: " + str(account._id), scriptName, scriptInstance, "Debug")
+    scriptLog.debug("Alert Passed Adding Links. Alert Triggered: %s Autoresolved: %s; %s; Links: Documented Dx- %s, Abs- %s, labs- %s, Morbidity- %s, oxygen- %s; Acct: %s",
+        result.Subtitle, result.Outcome, result.Validated, dcLinks, absLinks, labsLinks, morbidityLinks, oxygenLinks, account._id)
     result.Passed = True
+
+#Write out this run's script messages
+scriptLog.flush()
@@ -28,6 +28,7 @@ from System.Data import *
 from System.Configuration import *
 from System.Collections.Generic import *
 clr.ImportExtensions(System.Linq)
+from cdi import Evidence, evaluation_context
 from operator import le, ge, gt, lt
 
 #========================================
@@ -45,14 +46,20 @@ autoEvidenceText = "Autoresolved Evidence - "
 #  Globals
 #========================================
 db = CACDataRepository()
+#Account data is loaded once and shared by every script run for the account,
+#fetching only the discrete values of the last 7 days
+context = evaluation_context(account, db, System.DateTime.Now.AddDays(-7))
+#Script messages are only formatted when their level is enabled, and are written
+#together at the end of the run
+scriptLog = context.log(db, scriptName, scriptInstance)
 admitDate = account.AdmitDateTime.Date
 birthDate = account.Patient.BirthDate.Date
 gender = account.Patient.Gender
 #Update true = External DV collection False = On Acct Record
-accountContainer = AccountWorkflowContainer(account, False, "Category", 7)
+accountContainer = context.container(AccountWorkflowContainer, False, "Category", 7)
 useSeperateDiscreteCollection = False
 if useSeperateDiscreteCollection == True:
-    discreteValues = db.GetDiscreteValues(account._id)
+    discreteValues = context.discrete_values
 else:
     discreteValues = db.GetAccountField(account._id, "DiscreteValues")
 
@@ -65,19 +72,9 @@ else:
 #========================================
 #  Functions
 #========================================
-def datetimeFromUtcToLocal(utc_datetime):
-    if utc_datetime:
-        convertedDate = DateTime.SpecifyKind(utc_datetime, DateTimeKind.Utc)
-        return  convertedDate.ToLocalTime()
-    else:
-        return None
-
-def cleanNumbers(result):
-    result1 = re.sub("[\\<\\>]", "", str(result))
-    if result1.count('.') <= 1 and result1.replace(".", "").isnumeric():
-        return result1
-    else:
-        return None
+#The helpers every script shares are compiled once per process and bound to this
+#script's globals, see cdi.helpers; a helper defined below replaces the shared one
+context.bind_helpers(globals(), 1)
 
 def dataConversion(datetime, linkText, Result, id, category, sequence, abstract=True, gender=None):
     date_time = datetimeFromUtcToLocal(datetime)
@@ -92,165 +89,10 @@ def dataConversion(datetime, linkText, Result, id, category, sequence, abstract=
         return abstraction
     return
 
-def CodeCount(codes):
-    # Get list of codes on the acct based on CodeDic
-    result = set()
-    for document in account.Documents or []:
-        for codeReference in document.CodeReferences or []:
-            if codeReference.Code in codes:
-                matching_code = codeReference.Code
-                result.add(matching_code)
-    return list(result)
-
-def abstractValue(abstraction_name, link_text, calculation, sequence=0, category=None, abstract=False):
-    # Find abstraction and if abstract is true abstract it to the provided category
-    abstraction = accountContainer.GetFirstLinkMatchingAbstractionValue(abstraction_name, link_text, lambda x: calculation)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def dvValue(dv_name, link_text, calculation, sequence=0, category=None, abstract=False):
-    # Find Discrete Value and if abstract is true abstract it to the provided category
-    for dv in dv_name:
-        abstraction = accountContainer.GetFirstLinkMatchingDiscreteValue(dv, link_text, calculation)
-        if abstraction is not None:
-            break
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def dvValueMulti(dvDic, DV1, linkText, value, sign, sequence=0, category=None, abstract=False, needed=2):
-    # Find Discrete Value and if abstract is true abstract it to the provided category
-    matchedList = []
-    x = 0
-    for dv in dvDic or []:
-        dvr = cleanNumbers(dvDic[dv]['Result'])
-        if dvDic[dv]['Name'] in DV1 and dvr is not None and sign(float(dvr), float(value)):
-            matchedList.append(dataConversion(dvDic[dv]['ResultDate'], linkText, dvDic[dv]['Result'], dvDic[dv]['UniqueId'] or dvDic[dv]['_id'], category, sequence, abstract))
-            x += 1
-            if needed <= x:
-                break
-    if abstract and x > 0:
-        return True
-    elif abstract is False and len(matchedList) > 0 and needed > 0:
-        return matchedList
-    else:
-        return None
-
-def compareValuesMulti(dvDic, DV1, value, value1, linkText, sign, sign1, sequence=0, category=None, abstract=False, needed=2):
-    matchedList = []
-    x = 0
-    for dv in dvDic or []:
-        dvr = cleanNumbers(dvDic[dv]['Result'])
-        if dvDic[dv]['Name'] in DV1 and dvr is not None and sign(float(value), float(dvr)) and sign1(float(dvr), float(value1)):
-            matchedList.append(dataConversion(dvDic[dv]['ResultDate'], linkText, dvDic[dv]['Result'], dvDic[dv]['UniqueId'] or dvDic[dv]['_id'], category, sequence, abstract))
-            x += 1
-            if needed <= x:
-                break
-    if abstract and x > 0:
-        return True
-    elif abstract is False and len(matchedList) > 0 and needed > 0:
-        return matchedList
-    else:
-        return None
-
-def codeValue(code_name, link_text, sequence=0, category=None, abstract=False):
-    # Find code and if abstract is true abstract it to the provided category
-    abstraction = accountContainer.GetFirstCodeLink(code_name, link_text)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def multiCodeValue(code_list, link_text, sequence=0, category=None, abstract=False):
-    # Go through Code List and find first code and if abstract is true abstract it to the provided category
-    abstraction = None
-    for code in code_list:
-        abstraction = accountContainer.GetFirstCodeLink(code, link_text)
-        if abstraction is not None:
-            abstraction.Sequence = sequence
-            if abstract:
-                category.Links.Add(abstraction)
-                return True
-            else:
-                return abstraction
-    if abstract and abstraction is None:
-        return False
-    return abstraction
-
-def prefixCodeValue(prefix, link_text, sequence=0, category=None, abstract=False):
-    # Use prefix to find first code match based on regex search and if abstract is true abstract it to the provided category
-    abstraction = None
-    validCodes = [codes for codes in accountContainer.CodeKeys if re.match(prefix, codes) is not None]
-    for code in validCodes:
-        abstraction = accountContainer.GetFirstCodeLink(code, link_text)
-        if abstraction is not None:
-            abstraction.Sequence = sequence
-            if abstract:
-                category.Links.Add(abstraction)
-                return True
-            else:
-                return abstraction
-    if abstract and abstraction is None:
-        return False
-    return abstraction
-
-def medValue(med_name, link_text, sequence=0, category=None, abstract=False):
-    # Find Medication Value and if abstract is true abstract it to the provided category
-    abstraction = accountContainer.GetFirstMedicationLink(med_name, link_text)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def updateLinkText(value, replacement_text):
-    # Update the link text with the provided text
-    value.LinkText = replacement_text + value.LinkText
-    return value
-
-def documentLink(DocumentType, LinkText, sequence, category, abstract):
-    # Finds a document link and adds it as link so that its a quick reference for the cdi user.
-    abstraction = None
-    abstraction = accountContainer.GetFirstDocumentLink(DocumentType, LinkText)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    return None
-
 #========================================
 #  Algorithm
 #========================================
-db.LogEvaluationScriptMessage("Script starting " + str(account._id), scriptName, scriptInstance, "Debug")
+scriptLog.debug("Script starting %s", account._id)
 #Determine if if and how many fully spec codes are on the acct
 codes = []
 codes = codeDic.keys()
@@ -288,53 +130,54 @@ for alert in account.MatchedCriteriaGroups or []:
 #Check if alert was autoresolved or completed.
 if validated is False:
     #Alert Trigger
-    f17200Code = codeValue("F17.200", "Nicotine Dependence, Unspecified, Uncomplicated: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    f17208Code = codeValue("F17.208", "Nicotine Dependence, Unspecified, With Other Nicotine-Induced Disorders: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    f17209Code = codeValue("F17.209", "Nicotine Dependence, Unspecified, With Unspecified Nicotine-Induced Disorders: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    f1721Code = codeValue("F17.21", "Nicotine Dependence, Cigarettes: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    f17210Code = codeValue("F17.210", "Nicotine Dependence, Cigarettes, Uncomplicated: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    f17218Code = codeValue("F17.218", "Nicotine Dependence, Cigarettes, With Other Nicotine-Induced Disorders: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    f17219Code = codeValue("F17.219", "Nicotine Dependence, Cigarettes, With Unspecified Nicotine-Induced Disorders: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    f1722Code = codeValue("F17.22", "Nicotine Dependence, Chewing Tobacco: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    f17220Code = codeValue("F17.220", "Nicotine Dependence, Chewing Tobacco, Uncomplicated: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    f17228Code = codeValue("F17.228", "Nicotine Dependence, Chewing Tobacco, With Other Nicotine-Induced Disorders: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    f17229Code = codeValue("F17.229", "Nicotine Dependence, Chewing Tobacco, With Unspecified Nicotine-Induced Disorders: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    f1729Code = codeValue("F17.29", "Nicotine Dependence, Other Tobacco Product: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    f17290Code = codeValue("F17.290", "Nicotine Dependence, Other Tobacco Product, Uncomplicated: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    f17298Code = codeValue("F17.298", "Nicotine Dependence, Other Tobacco Product, With Other Nicotine-Induced Disorders: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    f17299Code = codeValue("F17.299", "Nicotine Dependence, Other Tobacco Product, Wwith Unspecified Nicotine-Induced Disorders: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence = Evidence()
+    evidence.define("f17200Code", codeValue, "F17.200", "Nicotine Dependence, Unspecified, Uncomplicated: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("f17208Code", codeValue, "F17.208", "Nicotine Dependence, Unspecified, With Other Nicotine-Induced Disorders: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("f17209Code", codeValue, "F17.209", "Nicotine Dependence, Unspecified, With Unspecified Nicotine-Induced Disorders: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("f1721Code", codeValue, "F17.21", "Nicotine Dependence, Cigarettes: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("f17210Code", codeValue, "F17.210", "Nicotine Dependence, Cigarettes, Uncomplicated: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("f17218Code", codeValue, "F17.218", "Nicotine Dependence, Cigarettes, With Other Nicotine-Induced Disorders: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("f17219Code", codeValue, "F17.219", "Nicotine Dependence, Cigarettes, With Unspecified Nicotine-Induced Disorders: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("f1722Code", codeValue, "F17.22", "Nicotine Dependence, Chewing Tobacco: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("f17220Code", codeValue, "F17.220", "Nicotine Dependence, Chewing Tobacco, Uncomplicated: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("f17228Code", codeValue, "F17.228", "Nicotine Dependence, Chewing Tobacco, With Other Nicotine-Induced Disorders: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("f17229Code", codeValue, "F17.229", "Nicotine Dependence, Chewing Tobacco, With Unspecified Nicotine-Induced Disorders: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("f1729Code", codeValue, "F17.29", "Nicotine Dependence, Other Tobacco Product: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("f17290Code", codeValue, "F17.290", "Nicotine Dependence, Other Tobacco Product, Uncomplicated: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("f17298Code", codeValue, "F17.298", "Nicotine Dependence, Other Tobacco Product, With Other Nicotine-Induced Disorders: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("f17299Code", codeValue, "F17.299", "Nicotine Dependence, Other Tobacco Product, Wwith Unspecified Nicotine-Induced Disorders: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
     #Meds
     nicotineWithdrawalMeds = medValue("Nicotine Withdrawal Medication", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 1, treatment, True)
-    nicotineWithdrawalMedsAbs = abstractValue("NICOTINE_WITHDRAWAL_MEDICATION", "Nicotine Withdrawal Medication '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 2)
+    evidence.define("nicotineWithdrawalMedsAbs", abstractValue, "NICOTINE_WITHDRAWAL_MEDICATION", "Nicotine Withdrawal Medication '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 2)
     #Withdrawal Symptoms
-    r41840Code = codeValue("R41.840", "Difficulty Concentrating: [CODE] ([DOCUMENTTYPE], [DOCUMENTDATE])", 1)
-    headacheAbs = abstractValue("HEADACHE", "Headache ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 2)
-    r454Code = codeValue("R45.4", "Irritability: [CODE] ([DOCUMENTTYPE], [DOCUMENTDATE])", 3)
-    g4700Code = codeValue("G47.00", "Insomnia: [CODE] ([DOCUMENTTYPE], [DOCUMENTDATE])", 4)
-    r450Code = codeValue("R45.0", "Nervousness/Anxious: [CODE] ([DOCUMENTTYPE], [DOCUMENTDATE])", 5)
-    nicotineCravingsAbs = abstractValue("NICOTINE_CRAVINGS", "Nicotine Cravings ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 6)
-    r451Code = codeValue("R45.1", "Restlessness and Agitated: [CODE] ([DOCUMENTTYPE], [DOCUMENTDATE])", 7)
+    evidence.define("r41840Code", codeValue, "R41.840", "Difficulty Concentrating: [CODE] ([DOCUMENTTYPE], [DOCUMENTDATE])", 1)
+    evidence.define("headacheAbs", abstractValue, "HEADACHE", "Headache ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 2)
+    evidence.define("r454Code", codeValue, "R45.4", "Irritability: [CODE] ([DOCUMENTTYPE], [DOCUMENTDATE])", 3)
+    evidence.define("g4700Code", codeValue, "G47.00", "Insomnia: [CODE] ([DOCUMENTTYPE], [DOCUMENTDATE])", 4)
+    evidence.define("r450Code", codeValue, "R45.0", "Nervousness/Anxious: [CODE] ([DOCUMENTTYPE], [DOCUMENTDATE])", 5)
+    evidence.define("nicotineCravingsAbs", abstractValue, "NICOTINE_CRAVINGS", "Nicotine Cravings ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 6)
+    evidence.define("r451Code", codeValue, "R45.1", "Restlessness and Agitated: [CODE] ([DOCUMENTTYPE], [DOCUMENTDATE])", 7)
 
     #Code Present Determination
-    if f17200Code is not None: dc.Links.Add(f17200Code); codePresent = True
-    if f17208Code is not None: dc.Links.Add(f17208Code); codePresent = True
-    if f17209Code is not None: dc.Links.Add(f17209Code); codePresent = True
-    if f1721Code is not None: dc.Links.Add(f1721Code); codePresent = True
-    if f17210Code is not None: dc.Links.Add(f17210Code); codePresent = True
-    if f17218Code is not None: dc.Links.Add(f17218Code); codePresent = True
-    if f17219Code is not None: dc.Links.Add(f17219Code); codePresent = True
-    if f1722Code is not None: dc.Links.Add(f1722Code); codePresent = True
-    if f17220Code is not None: dc.Links.Add(f17220Code); codePresent = True
-    if f17228Code is not None: dc.Links.Add(f17228Code); codePresent = True
-    if f17229Code is not None: dc.Links.Add(f17229Code); codePresent = True
-    if f1729Code is not None: dc.Links.Add(f1729Code); codePresent = True
-    if f17290Code is not None: dc.Links.Add(f17290Code); codePresent = True
-    if f17298Code is not None: dc.Links.Add(f17298Code); codePresent = True
-    if f17299Code is not None: dc.Links.Add(f17299Code); codePresent = True
+    if evidence.f17200Code is not None: dc.Links.Add(evidence.f17200Code); codePresent = True
+    if evidence.f17208Code is not None: dc.Links.Add(evidence.f17208Code); codePresent = True
+    if evidence.f17209Code is not None: dc.Links.Add(evidence.f17209Code); codePresent = True
+    if evidence.f1721Code is not None: dc.Links.Add(evidence.f1721Code); codePresent = True
+    if evidence.f17210Code is not None: dc.Links.Add(evidence.f17210Code); codePresent = True
+    if evidence.f17218Code is not None: dc.Links.Add(evidence.f17218Code); codePresent = True
+    if evidence.f17219Code is not None: dc.Links.Add(evidence.f17219Code); codePresent = True
+    if evidence.f1722Code is not None: dc.Links.Add(evidence.f1722Code); codePresent = True
+    if evidence.f17220Code is not None: dc.Links.Add(evidence.f17220Code); codePresent = True
+    if evidence.f17228Code is not None: dc.Links.Add(evidence.f17228Code); codePresent = True
+    if evidence.f17229Code is not None: dc.Links.Add(evidence.f17229Code); codePresent = True
+    if evidence.f1729Code is not None: dc.Links.Add(evidence.f1729Code); codePresent = True
+    if evidence.f17290Code is not None: dc.Links.Add(evidence.f17290Code); codePresent = True
+    if evidence.f17298Code is not None: dc.Links.Add(evidence.f17298Code); codePresent = True
+    if evidence.f17299Code is not None: dc.Links.Add(evidence.f17299Code); codePresent = True
 
     #Main Algorithm
     if codesExist >= 1:
-        db.LogEvaluationScriptMessage("Nicotine Withdrawal Code Present, alert failed. " + str(account._id), scriptName, scriptInstance, "Debug")
+        scriptLog.debug("Nicotine Withdrawal Code Present, alert failed. %s", account._id)
         if alertTriggered:
             for code in codeList:
                 desc = codeDic[code]
@@ -349,28 +192,28 @@ if validated is False:
         else: result.Passed = False
 
     elif (
-        codePresent and (nicotineWithdrawalMedsAbs is not None or nicotineWithdrawalMeds is not None) and
-        (headacheAbs is not None or r454Code is not None or g4700Code is not None or r450Code is not None or
-        nicotineCravingsAbs is not None or r451Code is not None or r41840Code is not None)
+        codePresent and (evidence.nicotineWithdrawalMedsAbs is not None or nicotineWithdrawalMeds is not None) and
+        (evidence.headacheAbs is not None or evidence.r454Code is not None or evidence.g4700Code is not None or evidence.r450Code is not None or
+        evidence.nicotineCravingsAbs is not None or evidence.r451Code is not None or evidence.r41840Code is not None)
         ):
         if nicotineWithdrawalMeds is not None: treatment.Links.Add(nicotineWithdrawalMeds)
-        if nicotineWithdrawalMedsAbs is not None: treatment.Links.Add(nicotineWithdrawalMedsAbs)
-        if headacheAbs is not None: dc.Links.Add(headacheAbs)
-        if r454Code is not None: dc.Links.Add(r454Code)
-        if g4700Code is not None: dc.Links.Add(g4700Code)
-        if r450Code is not None: dc.Links.Add(r450Code)
-        if nicotineCravingsAbs is not None: dc.Links.Add(nicotineCravingsAbs)
-        if r451Code is not None: dc.Links.Add(r451Code)
-        if r41840Code is not None: dc.Links.Add(r41840Code)
+        if evidence.nicotineWithdrawalMedsAbs is not None: treatment.Links.Add(evidence.nicotineWithdrawalMedsAbs)
+        if evidence.headacheAbs is not None: dc.Links.Add(evidence.headacheAbs)
+        if evidence.r454Code is not None: dc.Links.Add(evidence.r454Code)
+        if evidence.g4700Code is not None: dc.Links.Add(evidence.g4700Code)
+        if evidence.r450Code is not None: dc.Links.Add(evidence.r450Code)
+        if evidence.nicotineCravingsAbs is not None: dc.Links.Add(evidence.nicotineCravingsAbs)
+        if evidence.r451Code is not None: dc.Links.Add(evidence.r451Code)
+        if evidence.r41840Code is not None: dc.Links.Add(evidence.r41840Code)
         AlertPassed = True
         result.Subtitle = "Nicotine Dependence present with possible Withdrawal"
 
     else:
-        db.LogEvaluationScriptMessage("Not enough data to warrent alert, Alert Failed. " + str(account._id), scriptName, scriptInstance, "Debug")
+        scriptLog.debug("Not enough data to warrent alert, Alert Failed. %s", account._id)
         result.Passed = False
 
 else:
-    db.LogEvaluationScriptMessage("Alert Closed; Exiting script run. Outcome: " + str(outcome) + " " + str(account._id), scriptName, scriptInstance, "Debug")
+    scriptLog.debug("Alert Closed; Exiting script run. Outcome: %s %s", outcome, account._id)
 
 #If an alert triggered abstract the following
 if AlertPassed:
@@ -384,7 +227,9 @@ if AlertPassed or AlertConditions:
     if treatment.Links: treatmentLinks = True
     if withdrawal.Links: result.Links.Add(withdrawal); withdrawalLinks = True
     result.Links.Add(other)
-    db.LogEvaluationScriptMessage("Alert Passed Adding Links. Alert Triggered: " + str(result.Subtitle) + " Autoresolved: " + str(result.Outcome) + "; " +
-        str(result.Validated) + "; Links: Documented Dx- " + str(dcLinks) + ", Withdrawal- " + str(withdrawalLinks) + ", treatment- "
-        + str(treatmentLinks) + "; Acct: " + str(account._id), scriptName, scriptInstance, "Debug")
+    scriptLog.debug("Alert Passed Adding Links. Alert Triggered: %s Autoresolved: %s; %s; Links: Documented Dx- %s, Withdrawal- %s, treatment- %s; Acct: %s",
+        result.Subtitle, result.Outcome, result.Validated, dcLinks, withdrawalLinks, treatmentLinks, account._id)
     result.Passed = True
+
+#Write out this run's script messages
+scriptLog.flush()
@@ -28,6 +28,7 @@ from System.Data import *
 from System.Configuration import *
 from System.Collections.Generic import *
 clr.ImportExtensions(System.Linq)
+from cdi import DiscreteValueIndex, Evidence, evaluation_context
 from operator import le, ge, gt, lt
 
 #========================================
@@ -45,14 +46,20 @@ autoCodeText = "Autoresolved Specified Code - "
 #  Globals
 #========================================
 db = CACDataRepository()
+#Account data is loaded once and shared by every script run for the account,
+#fetching only the discrete values of the last 7 days
+context = evaluation_context(account, db, System.DateTime.Now.AddDays(-7))
+#Script messages are only formatted when their level is enabled, and are written
+#together at the end of the run
+scriptLog = context.log(db, scriptName, scriptInstance)
 admitDate = account.AdmitDateTime.Date
 birthDate = account.Patient.BirthDate.Date
 gender = account.Patient.Gender
 #Update true = External DV collection False = On Acct Record
-accountContainer = AccountWorkflowContainer(account, True, "Category", 7)
+accountContainer = context.container(AccountWorkflowContainer, True, "Category", 7)
 useSeperateDiscreteCollection = True
 if useSeperateDiscreteCollection == True:
-    discreteValues = db.GetDiscreteValues(account._id)
+    discreteValues = context.discrete_values
 else:
     discreteValues = db.GetAccountField(account._id, "DiscreteValues")
 
@@ -103,193 +110,9 @@ calcAny1 = lambda x: x > 0
 #========================================
 #  Functions
 #========================================
-def datetimeFromUtcToLocal(utc_datetime):
-    if utc_datetime:
-        convertedDate = DateTime.SpecifyKind(utc_datetime, DateTimeKind.Utc)
-        return  convertedDate.ToLocalTime()
-    else:
-        return None
-
-def cleanNumbers(result):
-    result1 = re.sub("[\\<\\>]", "", str(result))
-    if result1.count('.') <= 1 and result1.replace(".", "").isnumeric():
-        return result1
-    else:
-        return None
-
-def dataConversion(datetime, linkText, Result, id, category, sequence, abstract=True, gender=None):
-    if datetime is not None:
-        date_time = datetimeFromUtcToLocal(datetime)
-        date_time = date_time.ToString("MM/dd/yyyy, HH:mm")
-        linkText = linkText.replace("[RESULTDATETIME]", date_time)
-    else: 
-        linkText = linkText.replace("(Result Date: [RESULTDATETIME])", "")
-    if Result is not None:
-        linkText = linkText.replace("[VALUE]", Result)
-    else: linkText = linkText.replace("[VALUE]", "")
-    if gender: linkText = linkText.replace("[GENDER]", gender)
-    else: linkText = linkText.replace("[GENDER]", "")
-    if abstract == True:
-        category.Links.Add(MatchedCriteriaLink(linkText, None, None, id, True, None, None, sequence))
-    elif abstract == False:
-        abstraction = MatchedCriteriaLink(linkText, None, None, id, True, None, None, sequence)
-        return abstraction
-    return
-
-def CodeCount(codes):
-    # Get list of codes on the acct based on CodeDic
-    result = set()
-    for document in account.Documents or []:
-        for codeReference in document.CodeReferences or []:
-            if codeReference.Code in codes:
-                matching_code = codeReference.Code
-                result.add(matching_code)
-    return list(result)
-
-def abstractValue(abstraction_name, link_text, calculation, sequence=0, category=None, abstract=False):
-    # Find abstraction and if abstract is true abstract it to the provided category
-    abstraction = accountContainer.GetFirstLinkMatchingAbstractionValue(abstraction_name, link_text, lambda x: calculation)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def dvValue(dv_name, link_text, calculation, sequence=0, category=None, abstract=False):
-    # Find Discrete Value and if abstract is true abstract it to the provided category
-    for dv in dv_name:
-        abstraction = accountContainer.GetFirstLinkMatchingDiscreteValue(dv, link_text, calculation)
-        if abstraction is not None:
-            break
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def dvValueMulti(dvDic, DV1, linkText, value, sign, sequence=0, category=None, abstract=False, needed=2):
-    # Find Discrete Value and if abstract is true abstract it to the provided category
-    matchedList = []
-    x = 0
-    for dv in dvDic or []:
-        dvr = cleanNumbers(dvDic[dv]['Result'])
-        if dvDic[dv]['Name'] in DV1 and dvr is not None and sign(float(dvr), float(value)):
-            matchedList.append(dataConversion(dvDic[dv]['ResultDate'], linkText, dvDic[dv]['Result'], dvDic[dv]['UniqueId'] or dvDic[dv]['_id'], category, sequence, abstract))
-            x += 1
-            if needed <= x:
-                break
-    if abstract and x > 0:
-        return True
-    elif abstract is False and len(matchedList) > 0 and needed > 0:
-        return matchedList
-    else:
-        return None
-
-def compareValuesMulti(dvDic, DV1, value, value1, linkText, sign, sign1, sequence=0, category=None, abstract=False, needed=2):
-    matchedList = []
-    x = 0
-    for dv in dvDic or []:
-        dvr = cleanNumbers(dvDic[dv]['Result'])
-        if dvDic[dv]['Name'] in DV1 and dvr is not None and sign(float(value), float(dvr)) and sign1(float(dvr), float(value1)):
-            matchedList.append(dataConversion(dvDic[dv]['ResultDate'], linkText, dvDic[dv]['Result'], dvDic[dv]['UniqueId'] or dvDic[dv]['_id'], category, sequence, abstract))
-            x += 1
-            if needed <= x:
-                break
-    if abstract and x > 0:
-        return True
-    elif abstract is False and len(matchedList) > 0 and needed > 0:
-        return matchedList
-    else:
-        return None
-
-def codeValue(code_name, link_text, sequence=0, category=None, abstract=False):
-    # Find code and if abstract is true abstract it to the provided category
-    abstraction = accountContainer.GetFirstCodeLink(code_name, link_text)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def multiCodeValue(code_list, link_text, sequence=0, category=None, abstract=False):
-    # Go through Code List and find first code and if abstract is true abstract it to the provided category
-    abstraction = None
-    for code in code_list:
-        abstraction = accountContainer.GetFirstCodeLink(code, link_text)
-        if abstraction is not None:
-            abstraction.Sequence = sequence
-            if abstract:
-                category.Links.Add(abstraction)
-                return True
-            else:
-                return abstraction
-    if abstract and abstraction is None:
-        return False
-    return abstraction
-
-def prefixCodeValue(prefix, link_text, sequence=0, category=None, abstract=False):
-    # Use prefix to find first code match based on regex search and if abstract is true abstract it to the provided category
-    abstraction = None
-    validCodes = [codes for codes in accountContainer.CodeKeys if re.match(prefix, codes) is not None]
-    for code in validCodes:
-        abstraction = accountContainer.GetFirstCodeLink(code, link_text)
-        if abstraction is not None:
-            abstraction.Sequence = sequence
-            if abstract:
-                category.Links.Add(abstraction)
-                return True
-            else:
-                return abstraction
-    if abstract and abstraction is None:
-        return False
-    return abstraction
-
-def medValue(med_name, link_text, sequence=0, category=None, abstract=False):
-    # Find Medication Value and if abstract is true abstract it to the provided category
-    abstraction = accountContainer.GetFirstMedicationLink(med_name, link_text)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def updateLinkText(value, replacement_text):
-    # Update the link text with the provided text
-    value.LinkText = replacement_text + value.LinkText
-    return value
-
-def documentLink(DocumentType, LinkText, sequence, category, abstract):
-    # Finds a document link and adds it as link so that its a quick reference for the cdi user.
-    abstraction = None
-    abstraction = accountContainer.GetFirstDocumentLink(DocumentType, LinkText)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    return None
+#The helpers every script shares are compiled once per process and bound to this
+#script's globals, see cdi.helpers; a helper defined below replaces the shared one
+context.bind_helpers(globals(), 1)
 
 #========================================
 #  Script Specific Functions
@@ -366,7 +189,7 @@ def dvValueMultiPancytopenia(dvDic, DV1, linkText, value, sign, sequence=0, cate
 #========================================
 #  Algorithm
 #========================================
-db.LogEvaluationScriptMessage("Script starting " + str(account._id), scriptName, scriptInstance, "Debug")
+scriptLog.debug("Script starting %s", account._id)
 #Determine if if and how many fully spec codes are on the acct
 codes = []
 codes = codeDic.keys()
@@ -418,43 +241,35 @@ for alert in account.MatchedCriteriaGroups or []:
 #Check if alert was autoresolved or completed.
 if validated is False:
     #Find all discrete values for custom lookups within the last 7 days
-    maindiscreteDic = {}
-    unsortedDicsreteDic = {}
-    dvCount = 0
     #Combine all items into one list to search against
     discreteSearchList = [i for j in [dvHemoglobin, dvHematocrit, dvPlateletCount, dvWBC] for i in j]
     #Set datelimit for how far back to 
     dvDateLimit = System.DateTime.Now.AddDays(-7)
-    #Loop through all dvs finding any that match in the combined list adding to a dictionary the matches
-    for dv in discreteValues or []:
-        if dv.ResultDate >= dvDateLimit:
-            if any(item == dv.Name for item in discreteSearchList):
-                dvCount += 1
-                unsortedDicsreteDic[dvCount] = dv
-    #Sort List by latest
-    maindiscreteDic = sorted(unsortedDicsreteDic.items(), key=lambda x: x[1]['ResultDate'], reverse=True)
+    #Index all dvs that match in the combined list by name, sorted by latest
+    maindiscreteDic = DiscreteValueIndex(discreteValues, discreteSearchList, dvDateLimit)
     
     #Negations
-    d62Code = codeValue("D62", "Acute Posthemorrhagic Anemia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    hemorrhageAbs = abstractValue("HEMORRHAGE", "Hemorrhage: [ABSTRACTVALUE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True)
+    evidence = Evidence()
+    evidence.define("d62Code", codeValue, "D62", "Acute Posthemorrhagic Anemia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("hemorrhageAbs", abstractValue, "HEMORRHAGE", "Hemorrhage: [ABSTRACTVALUE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True)
     #Documented Dx
-    d61810Code = codeValue("D61.810", "Antineoplastic chemotherapy induced pancytopenia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    d61811Code = codeValue("D61.811", "Other drug-induced pancytopenia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    d61818Code = codeValue("D61.818", "Other pancytopenia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("d61810Code", codeValue, "D61.810", "Antineoplastic chemotherapy induced pancytopenia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("d61811Code", codeValue, "D61.811", "Other drug-induced pancytopenia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("d61818Code", codeValue, "D61.818", "Other pancytopenia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
     #abs
-    a3e04305Code = codeValue("3E04305", "Chemotherapy Medication Administration: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 8)
-    currentChemotherapyAbs = abstractValue("CURRENT_CHEMOTHERAPY", "Current Chemotherapy: [ABSTRACTVALUE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 11)
+    evidence.define("a3e04305Code", codeValue, "3E04305", "Chemotherapy Medication Administration: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 8)
+    evidence.define("currentChemotherapyAbs", abstractValue, "CURRENT_CHEMOTHERAPY", "Current Chemotherapy: [ABSTRACTVALUE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 11)
     #Meds
-    z5111Code = codeValue("Z51.11", "Antineoplastic Chemotherapy: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 3)
+    evidence.define("z5111Code", codeValue, "Z51.11", "Antineoplastic Chemotherapy: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 3)
     #Hemoglobin/Hematocrit
     if gender == 'F':
-        lowHemoglobinMultiDV = HemoglobinPancytopeniaValues(dict(maindiscreteDic), "Female", 11.6, 10)
+        lowHemoglobinMultiDV = HemoglobinPancytopeniaValues(maindiscreteDic, "Female", 11.6, 10)
     if gender == 'M':
-        lowHemoglobinMultiDV = HemoglobinPancytopeniaValues(dict(maindiscreteDic), "Male", 13.5, 10)
+        lowHemoglobinMultiDV = HemoglobinPancytopeniaValues(maindiscreteDic, "Male", 13.5, 10)
     #Platelet
-    lowPlateletDV = dvValueMultiPancytopenia(dict(maindiscreteDic), dvPlateletCount, "Platelet Count: [VALUE] (Result Date: [RESULTDATETIME])", calcPlateletCount1, lt, 0, platelet, False, 10)
+    lowPlateletDV = dvValueMultiPancytopenia(maindiscreteDic, dvPlateletCount, "Platelet Count: [VALUE] (Result Date: [RESULTDATETIME])", calcPlateletCount1, lt, 0, platelet, False, 10)
     #WBC
-    lowWBCDV = dvValueMultiPancytopenia(dict(maindiscreteDic), dvWBC, "White Blood Cell Count: [VALUE] (Result Date: [RESULTDATETIME])", calcWBC1, lt, 0, wbc, False, 10)
+    lowWBCDV = dvValueMultiPancytopenia(maindiscreteDic, dvWBC, "White Blood Cell Count: [VALUE] (Result Date: [RESULTDATETIME])", calcWBC1, lt, 0, wbc, False, 10)
 
     #Main Algorithm
     if subtitle == "Pancytopenia Dx Lacking Supporting Evidence" and ((lowHemoglobinMultiDV[0][0] is not False and len(lowHemoglobinMultiDV[0] or noLabs) > 0) and len(lowWBCDV or noLabs) > 0 and len(lowPlateletDV or noLabs) > 0):
@@ -489,16 +304,16 @@ if validated is False:
         result.Subtitle = "Pancytopenia Dx Lacking Supporting Evidence"
         AlertPassed = True
         
-    elif (d61810Code is not None or d61811Code is not None) and subtitle == "Pancytopenia with Possible Link to Chemotherapy":
-        if d61810Code is not None: updateLinkText(d61810Code, autoCodeText); dc.Links.Add(d61810Code)
-        if d61811Code is not None: updateLinkText(d61811Code, autoCodeText); dc.Links.Add(d61811Code)
+    elif (evidence.d61810Code is not None or evidence.d61811Code is not None) and subtitle == "Pancytopenia with Possible Link to Chemotherapy":
+        if evidence.d61810Code is not None: updateLinkText(evidence.d61810Code, autoCodeText); dc.Links.Add(evidence.d61810Code)
+        if evidence.d61811Code is not None: updateLinkText(evidence.d61811Code, autoCodeText); dc.Links.Add(evidence.d61811Code)
         result.Outcome = "AUTORESOLVED"
         result.Reason = "Autoresolved due to one Specified Code on the Account"
         result.Validated = True
         AlertConditions = True
 
-    elif d61810Code is None and d61811Code is None and d61818Code is not None and (z5111Code is not None or a3e04305Code is not None or currentChemotherapyAbs is not None):
-        dc.Links.Add(d61818Code)
+    elif evidence.d61810Code is None and evidence.d61811Code is None and evidence.d61818Code is not None and (evidence.z5111Code is not None or evidence.a3e04305Code is not None or evidence.currentChemotherapyAbs is not None):
+        dc.Links.Add(evidence.d61818Code)
         result.Subtitle = "Pancytopenia with Possible Link to Chemotherapy"
         AlertPassed = True
         
@@ -514,16 +329,16 @@ if validated is False:
         result.Validated = True
         AlertConditions = True
 
-    elif codesExist == 0 and d62Code is None and hemorrhageAbs is None and len(lowWBCDV or noLabs) > 1 and len(lowPlateletDV or noLabs) > 1 and (lowHemoglobinMultiDV[0][0] is not False and len(lowHemoglobinMultiDV[0] or noLabs) > 1) :
+    elif codesExist == 0 and evidence.d62Code is None and evidence.hemorrhageAbs is None and len(lowWBCDV or noLabs) > 1 and len(lowPlateletDV or noLabs) > 1 and (lowHemoglobinMultiDV[0][0] is not False and len(lowHemoglobinMultiDV[0] or noLabs) > 1) :
         result.Subtitle = "Possible Pancytopenia Dx"
         AlertPassed = True
 
     else:
-        db.LogEvaluationScriptMessage("Not enough data to warrent alert, Alert Failed. " + str(account._id), scriptName, scriptInstance, "Debug")
+        scriptLog.debug("Not enough data to warrent alert, Alert Failed. %s", account._id)
         result.Passed = False
 
 else:
-    db.LogEvaluationScriptMessage("Alert Closed; Exiting script run. Outcome: " + str(outcome) + " " + str(account._id), scriptName, scriptInstance, "Debug")
+    scriptLog.debug("Alert Closed; Exiting script run. Outcome: %s %s", outcome, account._id)
 
 #If an alert triggered abstract the following
 if AlertPassed:
@@ -534,10 +349,10 @@ if AlertPassed:
     codeValue("T45.1X5A", "Adverse Effect of Antineoplastic and Immunosuppressive Drug: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 4, abs, True)
     codeValue("F10.20", "Alcohol Abuse: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 5, abs, True)
     codeValue("D61.9", "Aplastic Anemia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 6, abs, True)
-    if a3e04305Code is not None: abs.Links.Add(a3e04305Code) #7
+    if evidence.a3e04305Code is not None: abs.Links.Add(evidence.a3e04305Code) #7
     prefixCodeValue("^B18\.", "Chronic Viral Hepatitis: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 8, abs, True)
     multiCodeValue(["N18.1","N18.2","N18.30","N18.31","N18.32","N18.4","N18.5", "N18.9"], "Chronic Kidney Disease: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 9, abs, True)
-    if currentChemotherapyAbs is not None: abs.Links.Add(currentChemotherapyAbs) #10
+    if evidence.currentChemotherapyAbs is not None: abs.Links.Add(evidence.currentChemotherapyAbs) #10
     codeValue("N18.6", "End-Stage Renal Disease: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 11, abs, True)
     codeValue("R53.83", "Fatigue: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 12, abs, True)
     prefixCodeValue("^C82\.", "Follicular Lymphoma: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 13, abs, True)
@@ -603,7 +418,7 @@ if AlertPassed:
     #Meds
     medValue("Antimetabolite", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 1, meds, True)
     abstractValue("ANTIMETABOLITE", "Antimetabolite '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 2, meds, True)
-    if z5111Code is not None: meds.Links.Add(z5111Code) #3
+    if evidence.z5111Code is not None: meds.Links.Add(evidence.z5111Code) #3
     codeValue("Z51.12", "Antineoplastic Immunotherapy: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 4, meds, True)
     medValue("Antirejection Medication", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 5, meds, True)
     abstractValue("ANTIREJECTION_MEDICATION", "Antirejection Medication '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 6, meds, True)
@@ -634,7 +449,9 @@ if AlertPassed or AlertConditions:
     result.Links.Add(meds)
     if meds.Links: medsLinks = True
     result.Links.Add(other)
-    db.LogEvaluationScriptMessage("Alert Passed Adding Links. Alert Triggered: " + str(result.Subtitle) + " Autoresolved: " + str(result.Outcome) + "; " +
-        str(result.Validated) + "; Links: Documented Dx- " + str(dcLinks) + ", Abs- " + str(absLinks) + ", labs- " + str(labsLinks) + ", dbc- " +
-        str(dbcLinks) + ", meds- " + str(medsLinks) + "; Acct: " + str(account._id), scriptName, scriptInstance, "Debug")
+    scriptLog.debug("Alert Passed Adding Links. Alert Triggered: %s Autoresolved: %s; %s; Links: Documented Dx- %s, Abs- %s, labs- %s, dbc- %s, meds- %s; Acct: %s",
+        result.Subtitle, result.Outcome, result.Validated, dcLinks, absLinks, labsLinks, dbcLinks, medsLinks, account._id)
     result.Passed = True
+
+#Write out this run's script messages
+scriptLog.flush()
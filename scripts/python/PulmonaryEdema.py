@@ -28,6 +28,7 @@ from System.Data import *
 from System.Configuration import *
 from System.Collections.Generic import *
 clr.ImportExtensions(System.Linq)
+from cdi import DiscreteValueIndex, Evidence, evaluation_context
 from operator import le, ge, gt, lt
 
 #========================================
@@ -40,14 +41,20 @@ autoEvidenceText = "Autoresolved Evidence - "
 #  Globals
 #========================================
 db = CACDataRepository()
+#Account data is loaded once and shared by every script run for the account,
+#fetching only the discrete values of the last 7 days
+context = evaluation_context(account, db, System.DateTime.Now.AddDays(-7))
+#Script messages are only formatted when their level is enabled, and are written
+#together at the end of the run
+scriptLog = context.log(db, scriptName, scriptInstance)
 admitDate = account.AdmitDateTime.Date
 birthDate = account.Patient.BirthDate.Date
 gender = account.Patient.Gender
 #Update true = External DV collection False = On Acct Record
-accountContainer = AccountWorkflowContainer(account, True, "Category", 7)
+accountContainer = context.container(AccountWorkflowContainer, True, "Category", 7)
 useSeperateDiscreteCollection = True
 if useSeperateDiscreteCollection == True:
-    discreteValues = db.GetDiscreteValues(account._id)
+    discreteValues = context.discrete_values
 else:
     discreteValues = db.GetAccountField(account._id, "DiscreteValues")
 
@@ -83,218 +90,17 @@ dvOxygenTherapy = ["DELIVERY"]
 #========================================
 #  Functions
 #========================================
-def datetimeFromUtcToLocal(utc_datetime):
-    if utc_datetime:
-        convertedDate = DateTime.SpecifyKind(utc_datetime, DateTimeKind.Utc)
-        return  convertedDate.ToLocalTime()
-    else:
-        return None
-
-def cleanNumbers(result):
-    result1 = re.sub("[\\<\\>]", "", str(result))
-    if result1.count('.') <= 1 and result1.replace(".", "").isnumeric():
-        return result1
-    else:
-        return None
-
-def dataConversion(datetime, linkText, Result, id, category, sequence, abstract=True, gender=None):
-    if datetime is not None:
-        date_time = datetimeFromUtcToLocal(datetime)
-        date_time = date_time.ToString("MM/dd/yyyy, HH:mm")
-        linkText = linkText.replace("[RESULTDATETIME]", date_time)
-    else: 
-        linkText = linkText.replace("(Result Date: [RESULTDATETIME])", "")
-    if Result is not None:
-        linkText = linkText.replace("[VALUE]", Result)
-    else: linkText = linkText.replace("[VALUE]", "")
-    if gender: linkText = linkText.replace("[GENDER]", gender)
-    else: linkText = linkText.replace("[GENDER]", "")
-    if abstract == True:
-        category.Links.Add(MatchedCriteriaLink(linkText, None, None, id, True, None, None, sequence))
-    elif abstract == False:
-        abstraction = MatchedCriteriaLink(linkText, None, None, id, True, None, None, sequence)
-        return abstraction
-    return
-
-def CodeCount(codes):
-    # Get list of codes on the acct based on CodeDic
-    result = set()
-    for document in account.Documents or []:
-        for codeReference in document.CodeReferences or []:
-            if codeReference.Code in codes:
-                matching_code = codeReference.Code
-                result.add(matching_code)
-    return list(result)
-
-def abstractValue(abstraction_name, link_text, calculation, sequence=0, category=None, abstract=False):
-    # Find abstraction and if abstract is true abstract it to the provided category
-    abstraction = accountContainer.GetFirstLinkMatchingAbstractionValue(abstraction_name, link_text, lambda x: calculation)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def dvValue(dv_name, link_text, calculation, sequence=0, category=None, abstract=False):
-    # Find Discrete Value and if abstract is true abstract it to the provided category
-    for dv in dv_name:
-        abstraction = accountContainer.GetFirstLinkMatchingDiscreteValue(dv, link_text, calculation)
-        if abstraction is not None:
-            break
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def dvValueMulti(dvDic, DV1, linkText, value, sign, sequence=0, category=None, abstract=False, needed=2):
-    # Find Discrete Value and if abstract is true abstract it to the provided category
-    matchedList = []
-    x = 0
-    for dv in dvDic or []:
-        dvr = cleanNumbers(dvDic[dv]['Result'])
-        if dvDic[dv]['Name'] in DV1 and dvr is not None and sign(float(dvr), float(value)):
-            matchedList.append(dataConversion(dvDic[dv]['ResultDate'], linkText, dvDic[dv]['Result'], dvDic[dv]['UniqueId'] or dvDic[dv]['_id'], category, sequence, abstract))
-            x += 1
-            if needed <= x:
-                break
-    if abstract and x > 0:
-        return True
-    elif abstract is False and len(matchedList) > 0 and needed > 0:
-        return matchedList
-    else:
-        return None
-
-def compareValuesMulti(dvDic, DV1, value, value1, linkText, sign, sign1, sequence=0, category=None, abstract=False, needed=2):
-    matchedList = []
-    x = 0
-    for dv in dvDic or []:
-        dvr = cleanNumbers(dvDic[dv]['Result'])
-        if dvDic[dv]['Name'] in DV1 and dvr is not None and sign(float(value), float(dvr)) and sign1(float(dvr), float(value1)):
-            matchedList.append(dataConversion(dvDic[dv]['ResultDate'], linkText, dvDic[dv]['Result'], dvDic[dv]['UniqueId'] or dvDic[dv]['_id'], category, sequence, abstract))
-            x += 1
-            if needed <= x:
-                break
-    if abstract and x > 0:
-        return True
-    elif abstract is False and len(matchedList) > 0 and needed > 0:
-        return matchedList
-    else:
-        return None
-
-def codeValue(code_name, link_text, sequence=0, category=None, abstract=False):
-    # Find code and if abstract is true abstract it to the provided category
-    abstraction = accountContainer.GetFirstCodeLink(code_name, link_text)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def multiCodeValue(code_list, link_text, sequence=0, category=None, abstract=False):
-    # Go through Code List and find first code and if abstract is true abstract it to the provided category
-    abstraction = None
-    for code in code_list:
-        abstraction = accountContainer.GetFirstCodeLink(code, link_text)
-        if abstraction is not None:
-            abstraction.Sequence = sequence
-            if abstract:
-                category.Links.Add(abstraction)
-                return True
-            else:
-                return abstraction
-    if abstract and abstraction is None:
-        return False
-    return abstraction
-
-def prefixCodeValue(prefix, link_text, sequence=0, category=None, abstract=False):
-    # Use prefix to find first code match based on regex search and if abstract is true abstract it to the provided category
-    abstraction = None
-    validCodes = [codes for codes in accountContainer.CodeKeys if re.match(prefix, codes) is not None]
-    for code in validCodes:
-        abstraction = accountContainer.GetFirstCodeLink(code, link_text)
-        if abstraction is not None:
-            abstraction.Sequence = sequence
-            if abstract:
-                category.Links.Add(abstraction)
-                return True
-            else:
-                return abstraction
-    if abstract and abstraction is None:
-        return False
-    return abstraction
-
-def medValue(med_name, link_text, sequence=0, category=None, abstract=False):
-    # Find Medication Value and if abstract is true abstract it to the provided category
-    abstraction = accountContainer.GetFirstMedicationLink(med_name, link_text)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def updateLinkText(value, replacement_text):
-    # Update the link text with the provided text
-    value.LinkText = replacement_text + value.LinkText
-    return value
-
-def documentLink(DocumentType, LinkText, sequence, category, abstract):
-    # Finds a document link and adds it as link so that its a quick reference for the cdi user.
-    abstraction = None
-    abstraction = accountContainer.GetFirstDocumentLink(DocumentType, LinkText)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    return None
+#The helpers every script shares are compiled once per process and bound to this
+#script's globals, see cdi.helpers; a helper defined below replaces the shared one
+context.bind_helpers(globals(), 1)
 
 #========================================
 #  Script Specific Functions
 #========================================
-def dvOxygenCheck(dvDic, discreteValueName, linkText, sequence=0, category=None, abstract=False):
-    abstraction = None
-    for dv in dvDic or []:
-        if (
-            dvDic[dv]['Name'] in discreteValueName and
-            dvDic[dv]['Result'] is not None and
-            not re.search(r'\bRoom Air\b', dvDic[dv]['Result'], re.IGNORECASE) and
-            not re.search(r'\bRA\b', dvDic[dv]['Result'], re.IGNORECASE)
-        ):
-            if abstract:
-                dataConversion(dvDic[dv]['ResultDate'], linkText, dvDic[dv]['Result'], dvDic[dv]['UniqueId'] or dvDic[dv]['_id'], category, sequence, True)
-                return True
-            else:
-                abstraction = dataConversion(dvDic[dv]['ResultDate'], linkText, dvDic[dv]['Result'], dvDic[dv]['UniqueId'] or dvDic[dv]['_id'], category, sequence, False)
-                return abstraction
-    return abstraction
-
 #========================================
 #  Algorithm
 #========================================
-db.LogEvaluationScriptMessage("Script starting " + str(account._id), scriptName, scriptInstance, "Debug")
+scriptLog.debug("Script starting %s", account._id)
 #Calaculate Age
 age = math.floor((admitDate - birthDate).TotalDays / 365.2425)
 
@@ -349,65 +155,57 @@ for alert in account.MatchedCriteriaGroups or []:
 #Check if alert was autoresolved or completed.
 if validated is False:    
     #Find all discrete values for custom lookups within the last X days
-    maindiscreteDic = {}
-    unsortedDicsreteDic = {}
-    dvCount = 0
     #Combine all items into one list to search against
     discreteSearchList = [i for j in [dvOxygenTherapy] for i in j]
     #Set datelimit for how far back to 
     dvDateLimit = System.DateTime.Now.AddDays(-7)
-    #Loop through all dvs finding any that match in the combined list adding to a dictionary the matches
-    for dv in discreteValues or []:
-        if dv.ResultDate >= dvDateLimit:
-            if any(item == dv.Name for item in discreteSearchList):
-                dvCount += 1
-                unsortedDicsreteDic[dvCount] = dv
-    #Sort List by latest
-    maindiscreteDic = sorted(unsortedDicsreteDic.items(), key=lambda x: x[1]['ResultDate'], reverse=True)
+    #Index all dvs that match in the combined list by name, sorted by latest
+    maindiscreteDic = DiscreteValueIndex(discreteValues, discreteSearchList, dvDateLimit)
     
     #Negations
-    j690Code = codeValue("J69.0", "Aspiration Pneumonia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    j681Code = codeValue("J68.1", "Pulmonary Edema due to Chemicals, Gases, Fumes and Vapors: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    i501Code = codeValue("I50.1", "Pulmonary Edema with Heart Failure/Heart Failure: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    acuteHFCodes = multiCodeValue(["I50.21", "I50.23", "I50.31", "I50.33", "I50.41", "I50.43", "I50.811", "I50.813"], "Acute Heart Failure: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 1)
-    acuteHFAbs = abstractValue("ACUTE_HEART_FAILURE", "Acute Heart Failure '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True)
-    acuteChronicHFAbs = abstractValue("ACUTE_ON_CHRONIC_HEART_FAILURE", "Acute on Chronic Heart Failure '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True)
+    evidence = Evidence()
+    evidence.define("j690Code", codeValue, "J69.0", "Aspiration Pneumonia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("j681Code", codeValue, "J68.1", "Pulmonary Edema due to Chemicals, Gases, Fumes and Vapors: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("i501Code", codeValue, "I50.1", "Pulmonary Edema with Heart Failure/Heart Failure: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("acuteHFCodes", multiCodeValue, ["I50.21", "I50.23", "I50.31", "I50.33", "I50.41", "I50.43", "I50.811", "I50.813"], "Acute Heart Failure: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 1)
+    evidence.define("acuteHFAbs", abstractValue, "ACUTE_HEART_FAILURE", "Acute Heart Failure '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True)
+    evidence.define("acuteChronicHFAbs", abstractValue, "ACUTE_ON_CHRONIC_HEART_FAILURE", "Acute on Chronic Heart Failure '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True)
     #Alert Trigger
-    chronicPulmonaryEdemaAbs = abstractValue("CHRONIC_PULMONARY_EDEMA", "Chronic Pulmonary Edema '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True)
-    j810Code = codeValue("J81.0", "Acute Pulmonary Edema: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    j960Code = codeValue("J96.0", "Aspiration Pneumonia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    pulmonaryEdemaAbs = abstractValue("PULMONARY_EDEMA", "Pulmonary Edema '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True)
+    evidence.define("chronicPulmonaryEdemaAbs", abstractValue, "CHRONIC_PULMONARY_EDEMA", "Chronic Pulmonary Edema '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True)
+    evidence.define("j810Code", codeValue, "J81.0", "Acute Pulmonary Edema: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("j960Code", codeValue, "J96.0", "Aspiration Pneumonia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("pulmonaryEdemaAbs", abstractValue, "PULMONARY_EDEMA", "Pulmonary Edema '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True)
     #Abs
-    acuteRespFailure = multiCodeValue(["J96.00", "J96.01", "J96.02"], "Acute Respiratory Failure: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 1)
-    j80Code = codeValue("J80", "Acute Respiratory Distress Syndrome: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 2)
-    r079Code = codeValue("R07.9", "Chest Pain: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 3)
-    chestTightnessAbs = abstractValue("CHEST_TIGHTNESS", "Chest Tightness '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 4)
-    cracklesAbs = abstractValue("CRACKLES", "Crankles '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 7)
-    r0600Code = codeValue("R06.00", "Dyspnea: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 8)
-    e8740Code = codeValue("E87.40", "Fluid Overloaded: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 12)
-    r042Code = codeValue("R04.2", "Hemoptysis: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 14)
-    pinkFrothySputumAbs = abstractValue("PINK_FROTHY_SPUTUM", "Pink Frothy Sputum '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 18)
-    r062Code = codeValue("R06.2", "Wheezing: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 23)
+    evidence.define("acuteRespFailure", multiCodeValue, ["J96.00", "J96.01", "J96.02"], "Acute Respiratory Failure: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 1)
+    evidence.define("j80Code", codeValue, "J80", "Acute Respiratory Distress Syndrome: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 2)
+    evidence.define("r079Code", codeValue, "R07.9", "Chest Pain: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 3)
+    evidence.define("chestTightnessAbs", abstractValue, "CHEST_TIGHTNESS", "Chest Tightness '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 4)
+    evidence.define("cracklesAbs", abstractValue, "CRACKLES", "Crankles '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 7)
+    evidence.define("r0600Code", codeValue, "R06.00", "Dyspnea: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 8)
+    evidence.define("e8740Code", codeValue, "E87.40", "Fluid Overloaded: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 12)
+    evidence.define("r042Code", codeValue, "R04.2", "Hemoptysis: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 14)
+    evidence.define("pinkFrothySputumAbs", abstractValue, "PINK_FROTHY_SPUTUM", "Pink Frothy Sputum '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 18)
+    evidence.define("r062Code", codeValue, "R06.2", "Wheezing: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 23)
     #Labs
-    r0902Code = codeValue("R09.02", "Hypoxemia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 3)
-    pAO2Dv = dvValue(dvPaO2, "pa02: [VALUE] (Result Date: [RESULTDATETIME])", calcPAO21, 4)
+    evidence.define("r0902Code", codeValue, "R09.02", "Hypoxemia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 3)
+    evidence.define("pAO2Dv", dvValue, dvPaO2, "pa02: [VALUE] (Result Date: [RESULTDATETIME])", calcPAO21, 4)
     #Meds
-    diureticMed = abstractValue("DIURETIC", "Diuretic '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 4)
-    sodiumNitroMed = medValue("Sodium Nitroprusside", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 6)
-    vasodilatorMed = medValue("Vasodilator", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 7)
+    evidence.define("diureticMed", abstractValue, "DIURETIC", "Diuretic '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 4)
+    evidence.define("sodiumNitroMed", medValue, "Sodium Nitroprusside", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 6)
+    evidence.define("vasodilatorMed", medValue, "Vasodilator", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 7)
     #Oxygen
-    flowNasalOxygen = multiCodeValue(["5A0935A", "5A0945A", "5A0955A"], "Flow Nasal Oxygen: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 1)
-    a5a1945zCode = codeValue("5A1945Z", "Mechanical Ventilation 24 to 96 hours: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 2)
-    a5a1955zCode = codeValue("5A1955Z", "Mechanical Ventilation Greater than 96 hours: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 3)
-    a5a1935zCode = codeValue("5A1935Z", "Mechanical Ventilation Less than 24 hours: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 4)
-    a3e0f7sfCode = codeValue("3E0F7SF", "Nasal Cannula: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 5)
-    nonInvasiveVentAbs = abstractValue("NON_INVASIVE_VENTILATION", "Non-Invasive Ventilation '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 6)
-    oxygenTherapyDV = dvOxygenCheck(dict(maindiscreteDic), dvOxygenTherapy, "Oxygen Therapy '[VALUE]' (Result Date: [RESULTDATETIME])", 7)
-    oxygenTherapyAbs = abstractValue("OXYGEN_THERAPY", "Oxygen Therapy '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 8)
+    evidence.define("flowNasalOxygen", multiCodeValue, ["5A0935A", "5A0945A", "5A0955A"], "Flow Nasal Oxygen: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 1)
+    evidence.define("a5a1945zCode", codeValue, "5A1945Z", "Mechanical Ventilation 24 to 96 hours: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 2)
+    evidence.define("a5a1955zCode", codeValue, "5A1955Z", "Mechanical Ventilation Greater than 96 hours: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 3)
+    evidence.define("a5a1935zCode", codeValue, "5A1935Z", "Mechanical Ventilation Less than 24 hours: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 4)
+    evidence.define("a3e0f7sfCode", codeValue, "3E0F7SF", "Nasal Cannula: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 5)
+    evidence.define("nonInvasiveVentAbs", abstractValue, "NON_INVASIVE_VENTILATION", "Non-Invasive Ventilation '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 6)
+    evidence.define("oxygenTherapyDV", dvOxygenCheck, maindiscreteDic, dvOxygenTherapy, "Oxygen Therapy '[VALUE]' (Result Date: [RESULTDATETIME])", 7)
+    evidence.define("oxygenTherapyAbs", abstractValue, "OXYGEN_THERAPY", "Oxygen Therapy '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 8)
     #Vitals
-    elevRightVentricleSyPressureAbs = abstractValue("ELEVATED_RIGHT_VENTRICLE_SYSTOLIC_PRESSUE", "Elevated Right Ventricle Systolic Pressure: [ABSTRACTVALUE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 2)
-    sp02Dv = dvValue(dvSPO2, "Sp02: [VALUE] (Result Date: [RESULTDATETIME])", calcSPO21, 4)
-    highRespRateDv = dvValue(dvRespiratoryRate, "Respiratory Rate: [VALUE] (Result Date: [RESULTDATETIME])", calcRespiratoryRate1, 5)
+    evidence.define("elevRightVentricleSyPressureAbs", abstractValue, "ELEVATED_RIGHT_VENTRICLE_SYSTOLIC_PRESSUE", "Elevated Right Ventricle Systolic Pressure: [ABSTRACTVALUE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 2)
+    evidence.define("sp02Dv", dvValue, dvSPO2, "Sp02: [VALUE] (Result Date: [RESULTDATETIME])", calcSPO21, 4)
+    evidence.define("highRespRateDv", dvValue, dvRespiratoryRate, "Respiratory Rate: [VALUE] (Result Date: [RESULTDATETIME])", calcRespiratoryRate1, 5)
     #Cardiogenic Indicators
     codeValue("I51.1", "Acute Heart Valve Failure Rupture of Chordae Tendineae: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 1, cardiogenic, True)
     prefixCodeValue("^I21\.", "Acute Myocardial Infarction: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 2, cardiogenic, True)
@@ -431,78 +229,78 @@ if validated is False:
     prefixCodeValue("^I47\.2", "Ventricular Tachycardia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 18, cardiogenic, True)
 
     #Determining Clinical Indicators
-    if acuteRespFailure is not None: abs.Links.Add(acuteRespFailure); CI += 1
-    if j80Code is not None: abs.Links.Add(j80Code); CI += 1
-    if r0902Code is not None or sp02Dv is not None or pAO2Dv is not None:
-        if r0902Code is not None: abs.Links.Add(r0902Code)
-        if sp02Dv is not None: vitals.Links.Add(sp02Dv)
-        if pAO2Dv is not None: labs.Links.Add(pAO2Dv)
+    if evidence.acuteRespFailure is not None: abs.Links.Add(evidence.acuteRespFailure); CI += 1
+    if evidence.j80Code is not None: abs.Links.Add(evidence.j80Code); CI += 1
+    if evidence.r0902Code is not None or evidence.sp02Dv is not None or evidence.pAO2Dv is not None:
+        if evidence.r0902Code is not None: abs.Links.Add(evidence.r0902Code)
+        if evidence.sp02Dv is not None: vitals.Links.Add(evidence.sp02Dv)
+        if evidence.pAO2Dv is not None: labs.Links.Add(evidence.pAO2Dv)
         CI += 1
-    if highRespRateDv is not None: vitals.Links.Add(highRespRateDv); CI += 1
-    if r079Code is not None: abs.Links.Add(r079Code); CI += 1
-    if pinkFrothySputumAbs is not None: abs.Links.Add(pinkFrothySputumAbs); CI += 1
-    if elevRightVentricleSyPressureAbs is not None: abs.Links.Add(elevRightVentricleSyPressureAbs); CI += 1
-    if r0600Code is not None: abs.Links.Add(r0600Code); CI += 1
-    if chestTightnessAbs is not None: abs.Links.Add(chestTightnessAbs); CI += 1
-    if cracklesAbs is not None: abs.Links.Add(cracklesAbs); CI += 1
-    if e8740Code is not None: abs.Links.Add(e8740Code); CI += 1
-    if r042Code is not None: abs.Links.Add(r042Code); CI += 1
-    if r062Code is not None: abs.Links.Add(r062Code); CI += 1
+    if evidence.highRespRateDv is not None: vitals.Links.Add(evidence.highRespRateDv); CI += 1
+    if evidence.r079Code is not None: abs.Links.Add(evidence.r079Code); CI += 1
+    if evidence.pinkFrothySputumAbs is not None: abs.Links.Add(evidence.pinkFrothySputumAbs); CI += 1
+    if evidence.elevRightVentricleSyPressureAbs is not None: abs.Links.Add(evidence.elevRightVentricleSyPressureAbs); CI += 1
+    if evidence.r0600Code is not None: abs.Links.Add(evidence.r0600Code); CI += 1
+    if evidence.chestTightnessAbs is not None: abs.Links.Add(evidence.chestTightnessAbs); CI += 1
+    if evidence.cracklesAbs is not None: abs.Links.Add(evidence.cracklesAbs); CI += 1
+    if evidence.e8740Code is not None: abs.Links.Add(evidence.e8740Code); CI += 1
+    if evidence.r042Code is not None: abs.Links.Add(evidence.r042Code); CI += 1
+    if evidence.r062Code is not None: abs.Links.Add(evidence.r062Code); CI += 1
     
     #Treatment Check Count
-    if diureticMed is not None: treatmentCheck += 1
-    if sodiumNitroMed is not None: treatmentCheck += 1
-    if vasodilatorMed is not None: treatmentCheck += 1
-    if flowNasalOxygen is not None: treatmentCheck += 1
-    if a5a1945zCode is not None: treatmentCheck += 1
-    if a5a1955zCode is not None: treatmentCheck += 1
-    if a5a1935zCode is not None: treatmentCheck += 1
-    if a3e0f7sfCode is not None: treatmentCheck += 1
-    if nonInvasiveVentAbs is not None: treatmentCheck += 1
-    if oxygenTherapyDV is not None: treatmentCheck += 1
-    if oxygenTherapyAbs is not None: treatmentCheck += 1
+    if evidence.diureticMed is not None: treatmentCheck += 1
+    if evidence.sodiumNitroMed is not None: treatmentCheck += 1
+    if evidence.vasodilatorMed is not None: treatmentCheck += 1
+    if evidence.flowNasalOxygen is not None: treatmentCheck += 1
+    if evidence.a5a1945zCode is not None: treatmentCheck += 1
+    if evidence.a5a1955zCode is not None: treatmentCheck += 1
+    if evidence.a5a1935zCode is not None: treatmentCheck += 1
+    if evidence.a3e0f7sfCode is not None: treatmentCheck += 1
+    if evidence.nonInvasiveVentAbs is not None: treatmentCheck += 1
+    if evidence.oxygenTherapyDV is not None: treatmentCheck += 1
+    if evidence.oxygenTherapyAbs is not None: treatmentCheck += 1
 
     #Main Algorithm
-    if chronicPulmonaryEdemaAbs is not None or j810Code is not None or i501Code is not None or j681Code is not None or j960Code is not None or acuteHFCodes is not None or cardiogenic.Links:
-        db.LogEvaluationScriptMessage("One specific code was on the chart, alert failed. " + str(account._id), scriptName, scriptInstance, "Debug")
+    if evidence.chronicPulmonaryEdemaAbs is not None or evidence.j810Code is not None or evidence.i501Code is not None or evidence.j681Code is not None or evidence.j960Code is not None or evidence.acuteHFCodes is not None or cardiogenic.Links:
+        scriptLog.debug("One specific code was on the chart, alert failed. %s", account._id)
         if alertTriggered:
-            if chronicPulmonaryEdemaAbs is not None: updateLinkText(chronicPulmonaryEdemaAbs, "Autoresolved Evidence - "); dc.Links.Add(chronicPulmonaryEdemaAbs)
-            if j810Code is not None: updateLinkText(j810Code, "Autoresolved Code - "); dc.Links.Add(j810Code)
-            if i501Code is not None: updateLinkText(i501Code, "Autoresolved Code - "); dc.Links.Add(i501Code)
-            if j681Code is not None: updateLinkText(j681Code, "Autoresolved Code - "); dc.Links.Add(j681Code)
-            if j960Code is not None: updateLinkText(j960Code, "Autoresolved Code - "); dc.Links.Add(j960Code)
-            if acuteHFCodes is not None: updateLinkText(acuteHFCodes, "Autoresolved Code - "); dc.Links.Add(acuteHFCodes)
+            if evidence.chronicPulmonaryEdemaAbs is not None: updateLinkText(evidence.chronicPulmonaryEdemaAbs, "Autoresolved Evidence - "); dc.Links.Add(evidence.chronicPulmonaryEdemaAbs)
+            if evidence.j810Code is not None: updateLinkText(evidence.j810Code, "Autoresolved Code - "); dc.Links.Add(evidence.j810Code)
+            if evidence.i501Code is not None: updateLinkText(evidence.i501Code, "Autoresolved Code - "); dc.Links.Add(evidence.i501Code)
+            if evidence.j681Code is not None: updateLinkText(evidence.j681Code, "Autoresolved Code - "); dc.Links.Add(evidence.j681Code)
+            if evidence.j960Code is not None: updateLinkText(evidence.j960Code, "Autoresolved Code - "); dc.Links.Add(evidence.j960Code)
+            if evidence.acuteHFCodes is not None: updateLinkText(evidence.acuteHFCodes, "Autoresolved Code - "); dc.Links.Add(evidence.acuteHFCodes)
             result.Outcome = "AUTORESOLVED"
             result.Reason = "Autoresolved due to one Specified Code on the Account"
             result.Validated = True
             AlertConditions = True
         else: result.Passed = False
         
-    elif (subtitle == "Possible Acute Pulmonary Edema" or subtitle == "Pulmonary Edema Documented Missing Acuity") and pulmonaryEdemaAbs is not None and acuteHFCodes is not None and j690Code is not None:
-        if pulmonaryEdemaAbs is not None: updateLinkText(pulmonaryEdemaAbs, "Autoresolved Code - "); dc.Links.Add(pulmonaryEdemaAbs)
-        if acuteHFCodes is not None: updateLinkText(acuteHFCodes, "Autoresolved Code - "); dc.Links.Add(acuteHFCodes)
-        if j690Code is not None: updateLinkText(j690Code, "Autoresolved Code - "); dc.Links.Add(j690Code)
+    elif (subtitle == "Possible Acute Pulmonary Edema" or subtitle == "Pulmonary Edema Documented Missing Acuity") and evidence.pulmonaryEdemaAbs is not None and evidence.acuteHFCodes is not None and evidence.j690Code is not None:
+        if evidence.pulmonaryEdemaAbs is not None: updateLinkText(evidence.pulmonaryEdemaAbs, "Autoresolved Code - "); dc.Links.Add(evidence.pulmonaryEdemaAbs)
+        if evidence.acuteHFCodes is not None: updateLinkText(evidence.acuteHFCodes, "Autoresolved Code - "); dc.Links.Add(evidence.acuteHFCodes)
+        if evidence.j690Code is not None: updateLinkText(evidence.j690Code, "Autoresolved Code - "); dc.Links.Add(evidence.j690Code)
         result.Outcome = "AUTORESOLVED"
         result.Reason = "Autoresolved due to specified dx existing now."
         result.Validated = True
         AlertConditions = True
 
-    elif pulmonaryEdemaAbs is not None and codesExist == 0 and CI >= 2 and acuteHFCodes is None and j690Code is None and acuteHFAbs is None and acuteChronicHFAbs is None:
-        dc.Links.Add(pulmonaryEdemaAbs)
+    elif evidence.pulmonaryEdemaAbs is not None and codesExist == 0 and CI >= 2 and evidence.acuteHFCodes is None and evidence.j690Code is None and evidence.acuteHFAbs is None and evidence.acuteChronicHFAbs is None:
+        dc.Links.Add(evidence.pulmonaryEdemaAbs)
         result.Subtitle = "Possible Acute Pulmonary Edema"
         AlertPassed = True
         
-    elif pulmonaryEdemaAbs is not None and CI >= 2 and acuteHFCodes is None and j690Code is None:
-        dc.Links.Add(pulmonaryEdemaAbs)
+    elif evidence.pulmonaryEdemaAbs is not None and CI >= 2 and evidence.acuteHFCodes is None and evidence.j690Code is None:
+        dc.Links.Add(evidence.pulmonaryEdemaAbs)
         result.Subtitle = "Pulmonary Edema Documented Missing Acuity"
         AlertPassed = True
 
     else:
-        db.LogEvaluationScriptMessage("Not enough data to warrent alert, Alert Failed. " + str(account._id), scriptName, scriptInstance, "Debug")
+        scriptLog.debug("Not enough data to warrent alert, Alert Failed. %s", account._id)
         result.Passed = False
 
 else:
-    db.LogEvaluationScriptMessage("Alert Closed; Exiting script run. Outcome: " + str(outcome) + " " + str(account._id), scriptName, scriptInstance, "Debug")
+    scriptLog.debug("Alert Closed; Exiting script run. Outcome: %s %s", outcome, account._id)
 
 #If an alert triggered abstract the following
 if AlertPassed:
@@ -574,19 +372,19 @@ if AlertPassed:
     medValue("Bronchodilator", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 1, meds, True)
     medValue("Bumetanide", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 2, meds, True)
     medValue("Sodium Nitroprusside", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 3, meds, True)
-    if diureticMed is not None: meds.Links.Add(diureticMed) #4
+    if evidence.diureticMed is not None: meds.Links.Add(evidence.diureticMed) #4
     medValue("Furosemide", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 5, meds, True)
-    if sodiumNitroMed is not None: meds.Links.Add(sodiumNitroMed) #6
-    if vasodilatorMed is not None: meds.Links.Add(vasodilatorMed) #7
+    if evidence.sodiumNitroMed is not None: meds.Links.Add(evidence.sodiumNitroMed) #6
+    if evidence.vasodilatorMed is not None: meds.Links.Add(evidence.vasodilatorMed) #7
     #Oxygen
-    if flowNasalOxygen is not None: oxygen.Links.Add(flowNasalOxygen) #1
-    if a5a1945zCode is not None: oxygen.Links.Add(a5a1945zCode) #2
-    if a5a1955zCode is not None: oxygen.Links.Add(a5a1955zCode) #3
-    if a5a1935zCode is not None: oxygen.Links.Add(a5a1935zCode) #4
-    if a3e0f7sfCode is not None: oxygen.Links.Add(a3e0f7sfCode) #5
-    if nonInvasiveVentAbs is not None: oxygen.Links.Add(nonInvasiveVentAbs) #6
-    if oxygenTherapyDV is not None: oxygen.Links.Add(oxygenTherapyDV) #7
-    if oxygenTherapyAbs is not None: oxygen.Links.Add(oxygenTherapyAbs) #8
+    if evidence.flowNasalOxygen is not None: oxygen.Links.Add(evidence.flowNasalOxygen) #1
+    if evidence.a5a1945zCode is not None: oxygen.Links.Add(evidence.a5a1945zCode) #2
+    if evidence.a5a1955zCode is not None: oxygen.Links.Add(evidence.a5a1955zCode) #3
+    if evidence.a5a1935zCode is not None: oxygen.Links.Add(evidence.a5a1935zCode) #4
+    if evidence.a3e0f7sfCode is not None: oxygen.Links.Add(evidence.a3e0f7sfCode) #5
+    if evidence.nonInvasiveVentAbs is not None: oxygen.Links.Add(evidence.nonInvasiveVentAbs) #6
+    if evidence.oxygenTherapyDV is not None: oxygen.Links.Add(evidence.oxygenTherapyDV) #7
+    if evidence.oxygenTherapyAbs is not None: oxygen.Links.Add(evidence.oxygenTherapyAbs) #8
     abstractValue("VENTILATOR_DAYS", "Ventilator Days: [ABSTRACTVALUE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 9, oxygen, True)
     #Vitals
     dvValue(dvDBP, "Diastolic Blood Pressure: [VALUE] (Result Date: [RESULTDATETIME])", calcDBP1, 1, vitals, True)
@@ -609,7 +407,10 @@ if AlertPassed or AlertConditions:
     if ctChestLinks.Links: result.Links.Add(ctChestLinks); docLinksLinks = True
     if contri.Links: result.Links.Add(contri); contriLinks = True
     result.Links.Add(other)
-    db.LogEvaluationScriptMessage("Alert Passed Adding Links. Alert Triggered: " + str(result.Subtitle) + " Autoresolved: " + str(result.Outcome) + "; " +
-        str(result.Validated) + "; Links: Documented Dx- " + str(dcLinks) + ", Abs- " + str(absLinks) + ", labs- " + str(labsLinks) + ", vitals- " + str(vitalsLinks) + ", meds- " + str(medsLinks) + ", oxygen- " + str(oxygenLinks) + ", contri- "
-        + str(contriLinks) + ", docs- " + str(docLinksLinks) + ", cardiogenic- " + str(cardiogenicLinks) + "; Acct: " + str(account._id), scriptName, scriptInstance, "Debug")
+    scriptLog.debug("Alert Passed Adding Links. Alert Triggered: %s Autoresolved: %s; %s; Links: Documented Dx- %s, Abs- %s, labs- %s, vitals- %s, meds- %s, oxygen- %s, contri- %s, docs- %s, cardiogenic- %s; Acct: %s",
+        result.Subtitle, result.Outcome, result.Validated, dcLinks, absLinks, labsLinks, vitalsLinks, medsLinks, oxygenLinks, contriLinks,
+        docLinksLinks, cardiogenicLinks, account._id)
     result.Passed = True
+
+#Write out this run's script messages
+scriptLog.flush()
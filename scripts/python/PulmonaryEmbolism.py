@@ -28,6 +28,7 @@ from System.Data import *
 from System.Configuration import *
 from System.Collections.Generic import *
 clr.ImportExtensions(System.Linq)
+from cdi import DiscreteValueIndex, Evidence, evaluation_context
 from operator import le, ge, gt, lt
 
 #========================================
@@ -46,14 +47,20 @@ autoCodeText = "Autoresolved Code - "
 #  Globals
 #========================================
 db = CACDataRepository()
+#Account data is loaded once and shared by every script run for the account,
+#fetching only the discrete values of the last 7 days
+context = evaluation_context(account, db, System.DateTime.Now.AddDays(-7))
+#Script messages are only formatted when their level is enabled, and are written
+#together at the end of the run
+scriptLog = context.log(db, scriptName, scriptInstance)
 admitDate = account.AdmitDateTime.Date
 birthDate = account.Patient.BirthDate.Date
 gender = account.Patient.Gender
 #Update true = External DV collection False = On Acct Record
-accountContainer = AccountWorkflowContainer(account, True, "Category", 7)
+accountContainer = context.container(AccountWorkflowContainer, True, "Category", 7)
 useSeperateDiscreteCollection = True
 if useSeperateDiscreteCollection == True:
-    discreteValues = db.GetDiscreteValues(account._id)
+    discreteValues = context.discrete_values
 else:
     discreteValues = db.GetAccountField(account._id, "DiscreteValues")
 
@@ -79,218 +86,33 @@ calcRespiratoryRate1 = lambda x: x > 20
 #========================================
 #  Functions
 #========================================
-def datetimeFromUtcToLocal(utc_datetime):
-    if utc_datetime:
-        convertedDate = DateTime.SpecifyKind(utc_datetime, DateTimeKind.Utc)
-        return  convertedDate.ToLocalTime()
-    else:
-        return None
-
-def cleanNumbers(result):
-    result1 = re.sub("[\\<\\>]", "", str(result))
-    if result1.count('.') <= 1 and result1.replace(".", "").isnumeric():
-        return result1
-    else:
-        return None
-
-def dataConversion(datetime, linkText, Result, id, category, sequence, abstract=True, gender=None):
-    if datetime is not None:
-        date_time = datetimeFromUtcToLocal(datetime)
-        date_time = date_time.ToString("MM/dd/yyyy, HH:mm")
-        linkText = linkText.replace("[RESULTDATETIME]", date_time)
-    else: 
-        linkText = linkText.replace("(Result Date: [RESULTDATETIME])", "")
-    if Result is not None:
-        linkText = linkText.replace("[VALUE]", Result)
-    else: linkText = linkText.replace("[VALUE]", "")
-    if gender: linkText = linkText.replace("[GENDER]", gender)
-    else: linkText = linkText.replace("[GENDER]", "")
-    if abstract == True:
-        category.Links.Add(MatchedCriteriaLink(linkText, None, None, id, True, None, None, sequence))
-    elif abstract == False:
-        abstraction = MatchedCriteriaLink(linkText, None, None, id, True, None, None, sequence)
-        return abstraction
-    return
-
-def CodeCount(codes):
-    # Get list of codes on the acct based on CodeDic
-    result = set()
-    for document in account.Documents or []:
-        for codeReference in document.CodeReferences or []:
-            if codeReference.Code in codes:
-                matching_code = codeReference.Code
-                result.add(matching_code)
-    return list(result)
-
-def abstractValue(abstraction_name, link_text, calculation, sequence=0, category=None, abstract=False):
-    # Find abstraction and if abstract is true abstract it to the provided category
-    abstraction = accountContainer.GetFirstLinkMatchingAbstractionValue(abstraction_name, link_text, lambda x: calculation)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def dvValue(dv_name, link_text, calculation, sequence=0, category=None, abstract=False):
-    # Find Discrete Value and if abstract is true abstract it to the provided category
-    for dv in dv_name:
-        abstraction = accountContainer.GetFirstLinkMatchingDiscreteValue(dv, link_text, calculation)
-        if abstraction is not None:
-            break
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def dvValueMulti(dvDic, DV1, linkText, value, sign, sequence=0, category=None, abstract=False, needed=2):
-    # Find Discrete Value and if abstract is true abstract it to the provided category
-    matchedList = []
-    x = 0
-    for dv in dvDic or []:
-        dvr = cleanNumbers(dvDic[dv]['Result'])
-        if dvDic[dv]['Name'] in DV1 and dvr is not None and sign(float(dvr), float(value)):
-            matchedList.append(dataConversion(dvDic[dv]['ResultDate'], linkText, dvDic[dv]['Result'], dvDic[dv]['UniqueId'] or dvDic[dv]['_id'], category, sequence, abstract))
-            x += 1
-            if needed <= x:
-                break
-    if abstract and x > 0:
-        return True
-    elif abstract is False and len(matchedList) > 0 and needed > 0:
-        return matchedList
-    else:
-        return None
-
-def compareValuesMulti(dvDic, DV1, value, value1, linkText, sign, sign1, sequence=0, category=None, abstract=False, needed=2):
-    matchedList = []
-    x = 0
-    for dv in dvDic or []:
-        dvr = cleanNumbers(dvDic[dv]['Result'])
-        if dvDic[dv]['Name'] in DV1 and dvr is not None and sign(float(value), float(dvr)) and sign1(float(dvr), float(value1)):
-            matchedList.append(dataConversion(dvDic[dv]['ResultDate'], linkText, dvDic[dv]['Result'], dvDic[dv]['UniqueId'] or dvDic[dv]['_id'], category, sequence, abstract))
-            x += 1
-            if needed <= x:
-                break
-    if abstract and x > 0:
-        return True
-    elif abstract is False and len(matchedList) > 0 and needed > 0:
-        return matchedList
-    else:
-        return None
-
-def codeValue(code_name, link_text, sequence=0, category=None, abstract=False):
-    # Find code and if abstract is true abstract it to the provided category
-    abstraction = accountContainer.GetFirstCodeLink(code_name, link_text)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def multiCodeValue(code_list, link_text, sequence=0, category=None, abstract=False):
-    # Go through Code List and find first code and if abstract is true abstract it to the provided category
-    abstraction = None
-    for code in code_list:
-        abstraction = accountContainer.GetFirstCodeLink(code, link_text)
-        if abstraction is not None:
-            abstraction.Sequence = sequence
-            if abstract:
-                category.Links.Add(abstraction)
-                return True
-            else:
-                return abstraction
-    if abstract and abstraction is None:
-        return False
-    return abstraction
-
-def prefixCodeValue(prefix, link_text, sequence=0, category=None, abstract=False):
-    # Use prefix to find first code match based on regex search and if abstract is true abstract it to the provided category
-    abstraction = None
-    validCodes = [codes for codes in accountContainer.CodeKeys if re.match(prefix, codes) is not None]
-    for code in validCodes:
-        abstraction = accountContainer.GetFirstCodeLink(code, link_text)
-        if abstraction is not None:
-            abstraction.Sequence = sequence
-            if abstract:
-                category.Links.Add(abstraction)
-                return True
-            else:
-                return abstraction
-    if abstract and abstraction is None:
-        return False
-    return abstraction
-
-def medValue(med_name, link_text, sequence=0, category=None, abstract=False):
-    # Find Medication Value and if abstract is true abstract it to the provided category
-    abstraction = accountContainer.GetFirstMedicationLink(med_name, link_text)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def updateLinkText(value, replacement_text):
-    # Update the link text with the provided text
-    value.LinkText = replacement_text + value.LinkText
-    return value
-
-def documentLink(DocumentType, LinkText, sequence, category, abstract):
-    # Finds a document link and adds it as link so that its a quick reference for the cdi user.
-    abstraction = None
-    abstraction = accountContainer.GetFirstDocumentLink(DocumentType, LinkText)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    return None
+#The helpers every script shares are compiled once per process and bound to this
+#script's globals, see cdi.helpers; a helper defined below replaces the shared one
+context.bind_helpers(globals(), 1)
 
 #========================================
 #  Script Specific Functions
 #========================================
 def dvOxygenCheck(dvDic, discreteValueName, linkText, sequence=0, category=None, abstract=False):
     abstraction = None
-    for dv in dvDic or []:
+    for dv in dvDic.lookup(discreteValueName):
         if (
-            dvDic[dv]['Name'] in discreteValueName and
-            dvDic[dv]['Result'] is not None and
-            not re.search(r'\bRoom Air\b', dvDic[dv]['Result'], re.IGNORECASE) and
-            not re.search(r'\bRA\b', dvDic[dv]['Result'], re.IGNORECASE)
+            dv['Result'] is not None and
+            not re.search(r'\bRoom Air\b', dv['Result'], re.IGNORECASE) and
+            not re.search(r'\bRA\b', dv['Result'], re.IGNORECASE)
         ):
             if abstract:
-                dataConversion(dvDic[dv]['ResultDate'], linkText, dvDic[dv]['Result'], dvDic[dv]['UniqueId'] or dvDic[dv]['_id'], category, sequence, abstract)
+                dataConversion(dv['ResultDate'], linkText, dv['Result'], dv['UniqueId'] or dv['_id'], category, sequence, abstract)
                 return True
             else:
-                abstraction = dataConversion(dvDic[dv]['ResultDate'], linkText, dvDic[dv]['Result'], dvDic[dv]['UniqueId'] or dvDic[dv]['_id'], category, sequence, abstract)
+                abstraction = dataConversion(dv['ResultDate'], linkText, dv['Result'], dv['UniqueId'] or dv['_id'], category, sequence, abstract)
                 return abstraction
     return abstraction
 
 #========================================
 #  Algorithm
 #========================================
-db.LogEvaluationScriptMessage("Script starting " + str(account._id), scriptName, scriptInstance, "Debug")
+scriptLog.debug("Script starting %s", account._id)
 #Determine if if and how many fully spec codes are on the acct
 age = math.floor((admitDate - birthDate).TotalDays/ 365.2425)
 codes = []
@@ -345,20 +167,21 @@ if (
     (outcome == "AUTORESOLVED" and validated and codesExist > 1)
 ):
     #Alert Trigger
-    i2694Code = codeValue("I26.94", "Assigned Multiple Subsegmental Pulmonary Embolism without Acute Cor Pulmonale: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    i2699Code = codeValue("I26.99", "Assigned Pulmonary Embolism without Acute Cor Pulmonale: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    i2692Code = codeValue("I26.92", "Assigned Saddle Embolus without Acute Cor Pulmonale: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    i2690Code = codeValue("I26.90", "Assigned Septic Pulmonary Embolism without Acute Cor Pulmonale: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    i2693Code = codeValue("I26.93", "Assigned Single Subsegmental Pulmonary Embolism without Acute Cor Pulmonale: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    rightVentricleHypertropyAbs = abstractValue("RIGHT_VENTRICLE_HYPERTROPY", "Right Ventricular Hypertrophy '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True)
-    pulEmboAbs = abstractValue("PULMONARY_EMBOLISM", "Pulmonary Embolism '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True)
-    i50810Code = codeValue("I50.810", "Right Heart Failure: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    heartStrainAbs = abstractValue("RIGHT_HEART_STRAIN", "Right Heart Strain '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True)
-    clotBurdenAbs = abstractValue("CLOT_BURDEN", "Clot Burden '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True)
+    evidence = Evidence()
+    evidence.define("i2694Code", codeValue, "I26.94", "Assigned Multiple Subsegmental Pulmonary Embolism without Acute Cor Pulmonale: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("i2699Code", codeValue, "I26.99", "Assigned Pulmonary Embolism without Acute Cor Pulmonale: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("i2692Code", codeValue, "I26.92", "Assigned Saddle Embolus without Acute Cor Pulmonale: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("i2690Code", codeValue, "I26.90", "Assigned Septic Pulmonary Embolism without Acute Cor Pulmonale: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("i2693Code", codeValue, "I26.93", "Assigned Single Subsegmental Pulmonary Embolism without Acute Cor Pulmonale: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("rightVentricleHypertropyAbs", abstractValue, "RIGHT_VENTRICLE_HYPERTROPY", "Right Ventricular Hypertrophy '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True)
+    evidence.define("pulEmboAbs", abstractValue, "PULMONARY_EMBOLISM", "Pulmonary Embolism '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True)
+    evidence.define("i50810Code", codeValue, "I50.810", "Right Heart Failure: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("heartStrainAbs", abstractValue, "RIGHT_HEART_STRAIN", "Right Heart Strain '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True)
+    evidence.define("clotBurdenAbs", abstractValue, "CLOT_BURDEN", "Clot Burden '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True)
     
     #Main Algorithm
     if codesExist == 1:
-        db.LogEvaluationScriptMessage("One specific code was on the chart, alert failed. " + str(account._id), scriptName, scriptInstance, "Debug")
+        scriptLog.debug("One specific code was on the chart, alert failed. %s", account._id)
         if alertTriggered:
             for code in codeList:
                 desc = codeDic[code]
@@ -387,29 +210,29 @@ if (
     elif (
         triggerAlert and
         codesExist == 0 and
-        (i2694Code is not None or i2699Code is not None or i2692Code is not None or i2690Code is not None or i2693Code is not None) and
-        (rightVentricleHypertropyAbs is not None or heartStrainAbs is not None or i50810Code is not None or clotBurdenAbs is not None)
+        (evidence.i2694Code is not None or evidence.i2699Code is not None or evidence.i2692Code is not None or evidence.i2690Code is not None or evidence.i2693Code is not None) and
+        (evidence.rightVentricleHypertropyAbs is not None or evidence.heartStrainAbs is not None or evidence.i50810Code is not None or evidence.clotBurdenAbs is not None)
     ):
-        if heartStrainAbs is not None: dc.Links.Add(heartStrainAbs)
-        if i50810Code is not None: dc.Links.Add(i50810Code)
-        if rightVentricleHypertropyAbs is not None: dc.Links.Add(rightVentricleHypertropyAbs)
-        if i2694Code is not None: dc.Links.Add(i2694Code)
-        if i2699Code is not None: dc.Links.Add(i2699Code)
-        if i2692Code is not None: dc.Links.Add(i2692Code)
-        if i2693Code is not None: dc.Links.Add(i2693Code)
-        if i2690Code is not None: dc.Links.Add(i2690Code)
-        if clotBurdenAbs is not None: dc.Links.Add(clotBurdenAbs)
+        if evidence.heartStrainAbs is not None: dc.Links.Add(evidence.heartStrainAbs)
+        if evidence.i50810Code is not None: dc.Links.Add(evidence.i50810Code)
+        if evidence.rightVentricleHypertropyAbs is not None: dc.Links.Add(evidence.rightVentricleHypertropyAbs)
+        if evidence.i2694Code is not None: dc.Links.Add(evidence.i2694Code)
+        if evidence.i2699Code is not None: dc.Links.Add(evidence.i2699Code)
+        if evidence.i2692Code is not None: dc.Links.Add(evidence.i2692Code)
+        if evidence.i2693Code is not None: dc.Links.Add(evidence.i2693Code)
+        if evidence.i2690Code is not None: dc.Links.Add(evidence.i2690Code)
+        if evidence.clotBurdenAbs is not None: dc.Links.Add(evidence.clotBurdenAbs)
         result.Subtitle = "Pulmonary Embolism Possible Acute Cor Pulmonale"
         AlertPassed = True
         
     elif (
         subtitle == "Pulmonary Embolism found only on Radiology Report" and 
         (codesExist > 0 or 
-        i2699Code is not None or 
-        i2690Code is not None or 
-        i2692Code is not None or 
-        i2693Code is not None or 
-        i2694Code is not None)
+        evidence.i2699Code is not None or 
+        evidence.i2690Code is not None or 
+        evidence.i2692Code is not None or 
+        evidence.i2693Code is not None or 
+        evidence.i2694Code is not None)
     ):
         if codesExist > 0:
             for code in codeList:
@@ -418,11 +241,11 @@ if (
                 if tempCode is not None:
                     dc.Links.Add(tempCode)
                     break
-        if i2699Code is not None: updateLinkText(i2699Code, autoCodeText); dc.Links.Add(i2699Code)
-        if i2690Code is not None: updateLinkText(i2690Code, autoCodeText); dc.Links.Add(i2690Code)
-        if i2692Code is not None: updateLinkText(i2692Code, autoCodeText); dc.Links.Add(i2692Code)
-        if i2693Code is not None: updateLinkText(i2693Code, autoCodeText); dc.Links.Add(i2693Code)
-        if i2694Code is not None: updateLinkText(i2694Code, autoCodeText); dc.Links.Add(i2694Code)
+        if evidence.i2699Code is not None: updateLinkText(evidence.i2699Code, autoCodeText); dc.Links.Add(evidence.i2699Code)
+        if evidence.i2690Code is not None: updateLinkText(evidence.i2690Code, autoCodeText); dc.Links.Add(evidence.i2690Code)
+        if evidence.i2692Code is not None: updateLinkText(evidence.i2692Code, autoCodeText); dc.Links.Add(evidence.i2692Code)
+        if evidence.i2693Code is not None: updateLinkText(evidence.i2693Code, autoCodeText); dc.Links.Add(evidence.i2693Code)
+        if evidence.i2694Code is not None: updateLinkText(evidence.i2694Code, autoCodeText); dc.Links.Add(evidence.i2694Code)
         result.Outcome = "AUTORESOLVED"
         result.Reason = "Autoresolved due to one Specified Code on the Account"
         result.Validated = True
@@ -430,39 +253,30 @@ if (
         
     elif (
         triggerAlert and
-        i2694Code is None and i2699Code is None and i2692Code is None and i2690Code is None and i2693Code is None and
+        evidence.i2694Code is None and evidence.i2699Code is None and evidence.i2692Code is None and evidence.i2690Code is None and evidence.i2693Code is None and
         codesExist == 0 and
-        pulEmboAbs is not None
+        evidence.pulEmboAbs is not None
     ):
-        if pulEmboAbs is not None: dc.Links.Add(pulEmboAbs)
+        if evidence.pulEmboAbs is not None: dc.Links.Add(evidence.pulEmboAbs)
         result.Subtitle = "Pulmonary Embolism found only on Radiology Report"
         AlertPassed = True
         
     else:
-        db.LogEvaluationScriptMessage("Not enough data to warrent alert, Alert Failed. " + str(account._id), scriptName, scriptInstance, "Debug")
+        scriptLog.debug("Not enough data to warrent alert, Alert Failed. %s", account._id)
         result.Passed = False
 
 else:
-    db.LogEvaluationScriptMessage("Alert Closed; Exiting script run. Outcome: " + str(outcome) + " " + str(account._id), scriptName, scriptInstance, "Debug")
+    scriptLog.debug("Alert Closed; Exiting script run. Outcome: %s %s", outcome, account._id)
 
 #If an alert triggered abstract the following
 if AlertPassed:
     #Find all discrete values for custom lookups within the last X days
-    maindiscreteDic = {}
-    unsortedDicsreteDic = {}
-    dvCount = 0
     #Combine all items into one list to search against
     discreteSearchList = [i for j in [dvOxygenTherapy] for i in j]
     #Set datelimit for how far back to 
     dvDateLimit = System.DateTime.Now.AddDays(-7)
-    #Loop through all dvs finding any that match in the combined list adding to a dictionary the matches
-    for dv in discreteValues or []:
-        if dv.ResultDate >= dvDateLimit:
-            if any(item == dv.Name for item in discreteSearchList):
-                dvCount += 1
-                unsortedDicsreteDic[dvCount] = dv
-    #Sort List by latest
-    maindiscreteDic = sorted(unsortedDicsreteDic.items(), key=lambda x: x[1]['ResultDate'], reverse=True)
+    #Index all dvs that match in the combined list by name, sorted by latest
+    maindiscreteDic = DiscreteValueIndex(discreteValues, discreteSearchList, dvDateLimit)
     
     #Abs
     codeValue("D68.51", "Activated Protein C Resistance \"Factor V Liden\": [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 1, abs, True)
@@ -532,7 +346,7 @@ if AlertPassed:
     multiCodeValue(["5A0935A", "5A0945A", "5A0955A"], "Flow Nasal Oxygen: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 1, oxygen, True)
     multiCodeValue(["5A1935Z", "5A1945Z", "5A1955Z"], "Invasive Mechanical Ventilation: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 2, oxygen, True)
     abstractValue("NON_INVASIVE_VENTILATION", "Non-Invasive Ventilation '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 3, oxygen, True)
-    dvOxygenCheck(dict(maindiscreteDic), dvOxygenTherapy, "Oxygen Therapy '[VALUE]' (Result Date: [RESULTDATETIME])", 4, oxygen, True)
+    dvOxygenCheck(maindiscreteDic, dvOxygenTherapy, "Oxygen Therapy '[VALUE]' (Result Date: [RESULTDATETIME])", 4, oxygen, True)
     abstractValue("OXYGEN_THERAPY", "Oxygen Therapy '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 5, oxygen, True)
     #Vitals
     abstractValue("ELEVATED_RIGHT_VENTRICLE_SYSTOLIC_PRESSURE", "Elevated Right Ventricle Systolic Pressure '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 1, vitals, True)
@@ -554,7 +368,10 @@ if AlertPassed or AlertConditions:
     if ctChestLinks.Links: result.Links.Add(ctChestLinks); docLinksLinks = True
     if chestXRayLinks.Links: result.Links.Add(chestXRayLinks); docLinksLinks = True
     result.Links.Add(other)
-    db.LogEvaluationScriptMessage("Alert Passed Adding Links. Alert Triggered: " + str(result.Subtitle) + " Autoresolved: " + str(result.Outcome) + "; " +
-        str(result.Validated) + "; Links: AlertTrigger- " + str(dcLinks) + ", Abs- " + str(absLinks) + ", labs- " + str(labsLinks) + ", vitals- "
-        + str(vitalsLinks) + ", meds- " + str(medsLinks) + ", oxygen- " + str(oxygenLinks) + ", docs- " + str(docLinksLinks) + "; Acct: " + str(account._id), scriptName, scriptInstance, "Debug")
+    scriptLog.debug("Alert Passed Adding Links. Alert Triggered: %s Autoresolved: %s; %s; Links: AlertTrigger- %s, Abs- %s, labs- %s, vitals- %s, meds- %s, oxygen- %s, docs- %s; Acct: %s",
+        result.Subtitle, result.Outcome, result.Validated, dcLinks, absLinks, labsLinks, vitalsLinks, medsLinks, oxygenLinks, docLinksLinks,
+        account._id)
     result.Passed = True
+
+#Write out this run's script messages
+scriptLog.flush()
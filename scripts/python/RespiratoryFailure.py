@@ -28,6 +28,7 @@ from System.Data import *
 from System.Configuration import *
 from System.Collections.Generic import *
 clr.ImportExtensions(System.Linq)
+from cdi import AsOfJoin, DiscreteValueIndex, Evidence, ResultDateJoin, evaluation_context
 from operator import le, ge, gt, lt
 
 #========================================
@@ -58,14 +59,20 @@ autoEvidenceText = "Autoresolved Evidence - "
 #  Globals
 #========================================
 db = CACDataRepository()
+#Account data is loaded once and shared by every script run for the account,
+#fetching only the discrete values of the last 7 days
+context = evaluation_context(account, db, System.DateTime.Now.AddDays(-7))
+#Script messages are only formatted when their level is enabled, and are written
+#together at the end of the run
+scriptLog = context.log(db, scriptName, scriptInstance)
 admitDate = account.AdmitDateTime.Date
 birthDate = account.Patient.BirthDate.Date
 gender = account.Patient.Gender
 #Update true = External DV collection False = On Acct Record
-accountContainer = AccountWorkflowContainer(account, True, "Category", 7)
+accountContainer = context.container(AccountWorkflowContainer, True, "Category", 7)
 useSeperateDiscreteCollection = True
 if useSeperateDiscreteCollection == True:
-    discreteValues = db.GetDiscreteValues(account._id)
+    discreteValues = context.discrete_values
 else:
     discreteValues = db.GetAccountField(account._id, "DiscreteValues")
 
@@ -109,211 +116,26 @@ calcVenousBloodCO2 = lambda x: x > 55
 #========================================
 #  Functions
 #========================================
-def datetimeFromUtcToLocal(utc_datetime):
-    if utc_datetime:
-        convertedDate = DateTime.SpecifyKind(utc_datetime, DateTimeKind.Utc)
-        return  convertedDate.ToLocalTime()
-    else:
-        return None
-
-def cleanNumbers(result):
-    result1 = re.sub("[\\<\\>]", "", str(result))
-    if result1.count('.') <= 1 and result1.replace(".", "").isnumeric():
-        return result1
-    else:
-        return None
-
-def dataConversion(datetime, linkText, Result, id, category, sequence, abstract=True, gender=None):
-    if datetime is not None:
-        date_time = datetimeFromUtcToLocal(datetime)
-        date_time = date_time.ToString("MM/dd/yyyy, HH:mm")
-        linkText = linkText.replace("[RESULTDATETIME]", date_time)
-    else: 
-        linkText = linkText.replace("(Result Date: [RESULTDATETIME])", "")
-    if Result is not None:
-        linkText = linkText.replace("[VALUE]", Result)
-    else: linkText = linkText.replace("[VALUE]", "")
-    if gender: linkText = linkText.replace("[GENDER]", gender)
-    else: linkText = linkText.replace("[GENDER]", "")
-    if abstract == True:
-        category.Links.Add(MatchedCriteriaLink(linkText, None, None, id, True, None, None, sequence))
-    elif abstract == False:
-        abstraction = MatchedCriteriaLink(linkText, None, None, id, True, None, None, sequence)
-        return abstraction
-    return
-
-def CodeCount(codes):
-    # Get list of codes on the acct based on CodeDic
-    result = set()
-    for document in account.Documents or []:
-        for codeReference in document.CodeReferences or []:
-            if codeReference.Code in codes:
-                matching_code = codeReference.Code
-                result.add(matching_code)
-    return list(result)
-
-def abstractValue(abstraction_name, link_text, calculation, sequence=0, category=None, abstract=False):
-    # Find abstraction and if abstract is true abstract it to the provided category
-    abstraction = accountContainer.GetFirstLinkMatchingAbstractionValue(abstraction_name, link_text, lambda x: calculation)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def dvValue(dv_name, link_text, calculation, sequence=0, category=None, abstract=False):
-    # Find Discrete Value and if abstract is true abstract it to the provided category
-    for dv in dv_name:
-        abstraction = accountContainer.GetFirstLinkMatchingDiscreteValue(dv, link_text, calculation)
-        if abstraction is not None:
-            break
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def dvValueMulti(dvDic, DV1, linkText, value, sign, sequence=0, category=None, abstract=False, needed=2):
-    # Find Discrete Value and if abstract is true abstract it to the provided category
-    matchedList = []
-    x = 0
-    for dv in dvDic or []:
-        dvr = cleanNumbers(dvDic[dv]['Result'])
-        if dvDic[dv]['Name'] in DV1 and dvr is not None and sign(float(dvr), float(value)):
-            matchedList.append(dataConversion(dvDic[dv]['ResultDate'], linkText, dvDic[dv]['Result'], dvDic[dv]['UniqueId'] or dvDic[dv]['_id'], category, sequence, abstract))
-            x += 1
-            if needed <= x:
-                break
-    if abstract and x > 0:
-        return True
-    elif abstract is False and len(matchedList) > 0 and needed > 0:
-        return matchedList
-    else:
-        return None
-
-def compareValuesMulti(dvDic, DV1, value, value1, linkText, sign, sign1, sequence=0, category=None, abstract=False, needed=2):
-    matchedList = []
-    x = 0
-    for dv in dvDic or []:
-        dvr = cleanNumbers(dvDic[dv]['Result'])
-        if dvDic[dv]['Name'] in DV1 and dvr is not None and sign(float(value), float(dvr)) and sign1(float(dvr), float(value1)):
-            matchedList.append(dataConversion(dvDic[dv]['ResultDate'], linkText, dvDic[dv]['Result'], dvDic[dv]['UniqueId'] or dvDic[dv]['_id'], category, sequence, abstract))
-            x += 1
-            if needed <= x:
-                break
-    if abstract and x > 0:
-        return True
-    elif abstract is False and len(matchedList) > 0 and needed > 0:
-        return matchedList
-    else:
-        return None
-
-def codeValue(code_name, link_text, sequence=0, category=None, abstract=False):
-    # Find code and if abstract is true abstract it to the provided category
-    abstraction = accountContainer.GetFirstCodeLink(code_name, link_text)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def multiCodeValue(code_list, link_text, sequence=0, category=None, abstract=False):
-    # Go through Code List and find first code and if abstract is true abstract it to the provided category
-    abstraction = None
-    for code in code_list:
-        abstraction = accountContainer.GetFirstCodeLink(code, link_text)
-        if abstraction is not None:
-            abstraction.Sequence = sequence
-            if abstract:
-                category.Links.Add(abstraction)
-                return True
-            else:
-                return abstraction
-    if abstract and abstraction is None:
-        return False
-    return abstraction
-
-def prefixCodeValue(prefix, link_text, sequence=0, category=None, abstract=False):
-    # Use prefix to find first code match based on regex search and if abstract is true abstract it to the provided category
-    abstraction = None
-    validCodes = [codes for codes in accountContainer.CodeKeys if re.match(prefix, codes) is not None]
-    for code in validCodes:
-        abstraction = accountContainer.GetFirstCodeLink(code, link_text)
-        if abstraction is not None:
-            abstraction.Sequence = sequence
-            if abstract:
-                category.Links.Add(abstraction)
-                return True
-            else:
-                return abstraction
-    if abstract and abstraction is None:
-        return False
-    return abstraction
-
-def medValue(med_name, link_text, sequence=0, category=None, abstract=False):
-    # Find Medication Value and if abstract is true abstract it to the provided category
-    abstraction = accountContainer.GetFirstMedicationLink(med_name, link_text)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def updateLinkText(value, replacement_text):
-    # Update the link text with the provided text
-    value.LinkText = replacement_text + value.LinkText
-    return value
-
-def documentLink(DocumentType, LinkText, sequence, category, abstract):
-    # Finds a document link and adds it as link so that its a quick reference for the cdi user.
-    abstraction = None
-    abstraction = accountContainer.GetFirstDocumentLink(DocumentType, LinkText)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    return None
+#The helpers every script shares are compiled once per process and bound to this
+#script's globals, see cdi.helpers; a helper defined below replaces the shared one
+context.bind_helpers(globals(), 1)
 
 #========================================
 #  Script Specific Functions
 #========================================
 def dvOxygenCheck(dvDic, discreteValueName, linkText, sequence=0, category=None, abstract=False):
     abstraction = None
-    for dv in dvDic or []:
+    for dv in dvDic.lookup(discreteValueName):
         if (
-            dvDic[dv]['Name'] in discreteValueName and
-            dvDic[dv]['Result'] is not None and
-            re.search(r'\bRoom Air\b', dvDic[dv].Result, re.IGNORECASE) is None and
-            re.search(r'\bRA\b', dvDic[dv].Result, re.IGNORECASE) is None
+            dv['Result'] is not None and
+            re.search(r'\bRoom Air\b', dv.Result, re.IGNORECASE) is None and
+            re.search(r'\bRA\b', dv.Result, re.IGNORECASE) is None
         ):
             if abstract:
-                dataConversion(dvDic[dv]['ResultDate'], linkText, dvDic[dv]['Result'], dvDic[dv]['UniqueId'] or dvDic[dv]['_id'], category, sequence, abstract)
+                dataConversion(dv['ResultDate'], linkText, dv['Result'], dv['UniqueId'] or dv['_id'], category, sequence, abstract)
                 return True
             else:
-                abstraction = dataConversion(dvDic[dv]['ResultDate'], linkText, dvDic[dv]['Result'], dvDic[dv]['UniqueId'] or dvDic[dv]['_id'], category, sequence, abstract)
+                abstraction = dataConversion(dv['ResultDate'], linkText, dv['Result'], dv['UniqueId'] or dv['_id'], category, sequence, abstract)
                 return abstraction
     return abstraction
 
@@ -395,6 +217,14 @@ def fi02Convert(value):
     value1 = float(value) / float(100)
     return value1
 
+def pfRatio(pao2, percentage):
+    #Estimated PF ratio, None when either reading could not be converted
+    if pao2 is None or pao2 == 'Invalid' or percentage is None or percentage == 'Invalid':
+        return None
+    if float(pao2) <= 0 or float(percentage) <= 0:
+        return None
+    return float(pao2) / float(percentage)
+
 def pao2fio2Calculation(dvDic, DV1, DV2, DV3, DV4, DV5, DV6, DV7, value1, sequence1):
     discreteDic = {}
     discreteDic1 = {}
@@ -412,7 +242,6 @@ def pao2fio2Calculation(dvDic, DV1, DV2, DV3, DV4, DV5, DV6, DV7, value1, sequen
     linkText7 = "Respiratory Rate: [VALUE] (Result Date: [RESULTDATETIME])"
     #Default should be set to -1 day back.
     dateLimit = System.DateTime.Now.AddDays(-1)
-    percentage = None
     w = 0
     x = 0
     y = 0
@@ -420,7 +249,6 @@ def pao2fio2Calculation(dvDic, DV1, DV2, DV3, DV4, DV5, DV6, DV7, value1, sequen
     a = 0
     b = 0
     c = 0
-    rrDV = None
     matchedList = []
     #Pull all values for discrete values we need
     for dv in dvDic or []:
@@ -461,120 +289,48 @@ def pao2fio2Calculation(dvDic, DV1, DV2, DV3, DV4, DV5, DV6, DV7, value1, sequen
         matchedList.append(dataConversion(discreteDic[w].ResultDate, linkText1, discreteDic[w].Result, discreteDic[w].UniqueId or discreteDic[w]._id, "abg", sequence1, False))
         return matchedList
     
+    #Line up every PaO2 and SpO2 reading with the FiO2, oxygen flow rate and oxygen therapy readings
+    # charted within 5 minutes of it, and the respiratory rate charted at the same time.
+    pao2Readings = AsOfJoin(discreteDic2, {'fio2': discreteDic5, 'flow': discreteDic3, 'therapy': discreteDic4}, 5)
+    spo2Readings = AsOfJoin(discreteDic1, {'fio2': discreteDic5, 'flow': discreteDic3, 'therapy': discreteDic4}, 5)
+    respRateRows = ResultDateJoin(discreteDic6, {'rr': DV7})
+
+    #Estimate the PF ratio for every pair, newest reading first, in the order the sources are preferred
+    ratios = []
     #Pa02/Fi02 Ratio Calculation
-    if y > 0 and b > 0:
-        fio2Date1 = discreteDic5[b].ResultDate.AddMinutes(5)
-        fio2Date2 = discreteDic5[b].ResultDate.AddMinutes(-5)
-        if (
-            discreteDic2[y].ResultDate == discreteDic5[b].ResultDate or 
-            fio2Date1 >= discreteDic2[y].ResultDate >= fio2Date2
-        ):
-            percentage = float(fi02Convert(cleanNumbers(discreteDic5[b].Result)))
-            if percentage is not None and percentage > 0:
-                calculation = float(cleanNumbers(discreteDic2[y].Result)) / float(percentage)
-                if float(calculation) <= float(300):
-                    for item in discreteDic6:
-                        if discreteDic6[item].ResultDate == discreteDic2[y].ResultDate:
-                            rrDV = item
-                            break
-                    if rrDV is not None:
-                        respRateDV = discreteDic6[rrDV].Result
-                    else:
-                        respRateDV = "XX"
-                    matchingDate = datetimeFromUtcToLocal(discreteDic2[y].ResultDate)
-                    matchingDate = matchingDate.ToString("MM/dd/yyyy, HH:mm")
-                    matchedList.append(dataConversion(None, matchingDate + " Respiratory Rate: " + str(respRateDV) + ", Pa02: " + str(discreteDic2[y].Result) + ", FIO2: " + str(discreteDic5[b].Result) + ", Estimated PF Ratio- [VALUE]" , str(round(calculation)), discreteDic2[y].UniqueId or discreteDic2[y]._id, calcpo2fio2, 8, False))
-                    db.LogEvaluationScriptMessage("found PF Ratio Match " + str(account._id), scriptName, scriptInstance, "Debug")
-                    return matchedList
-        
+    ratios += [
+        (pfRatio(cleanNumbers(pao2.Result), fi02Convert(cleanNumbers(fio2.Result))), pao2, "Pa02: " + str(pao2.Result) + ", FIO2: " + str(fio2.Result))
+        for pao2, fio2 in pao2Readings.pairs('fio2')
+    ]
     #Pa02/Oxygen Therapy/Oxygen Flow Rate Ratio Calculation
-    if y > 0 and z > 0 and a > 0:   
-        oxygenFlowRateDate1 = discreteDic3[z].ResultDate.AddMinutes(5)
-        oxygenFlowRateDate2 = discreteDic3[z].ResultDate.AddMinutes(-5)
-        oxygenTherapyDate1 = discreteDic4[a].ResultDate.AddMinutes(5)
-        oxygenTherapyDate2 = discreteDic4[a].ResultDate.AddMinutes(-5)
-        if (
-            discreteDic2[y].ResultDate == discreteDic3[z].ResultDate == discreteDic4[a].ResultDate or 
-            (oxygenFlowRateDate1 >= discreteDic2[y].ResultDate >= oxygenFlowRateDate2 and
-            oxygenTherapyDate1 >= discreteDic2[y].ResultDate >= oxygenTherapyDate2)
-        ):
-            percentage = fio2Percentage(cleanNumbers(discreteDic3[z].Result), discreteDic4[a].Result)
-            if percentage == 'Invalid':
-                return None
-            calculation = float(cleanNumbers(discreteDic2[y].Result)) / float(percentage)
-            if float(calculation) <= float(300):
-                for item in discreteDic6:
-                    if discreteDic6[item].ResultDate == discreteDic2[y].ResultDate:
-                        rrDV = item
-                        break
-                if rrDV is not None:
-                    respRateDV = discreteDic6[rrDV].Result
-                else:
-                    respRateDV = "XX"
-                matchingDate = datetimeFromUtcToLocal(discreteDic2[y].ResultDate)
-                matchingDate = matchingDate.ToString("MM/dd/yyyy, HH:mm")
-                matchedList.append(dataConversion(None, matchingDate + " Respiratory Rate: " + str(respRateDV) + ", Pa02: " + str(discreteDic2[y].Result) + ", Oxygen Flow Rate: " + str(discreteDic3[z].Result) + ", Oxygen Therapy: " + str(discreteDic4[a].Result) + ", Estimated PF Ratio- [VALUE]" , str(round(calculation)), discreteDic2[y].UniqueId or discreteDic2[y]._id, calcpo2fio2, 8, False))
-                db.LogEvaluationScriptMessage("found PF Ratio Match " + str(account._id), scriptName, scriptInstance, "Debug")
-                return matchedList
-            
+    ratios += [
+        (pfRatio(cleanNumbers(pao2.Result), fio2Percentage(cleanNumbers(flow.Result), therapy.Result)), pao2, "Pa02: " + str(pao2.Result) + ", Oxygen Flow Rate: " + str(flow.Result) + ", Oxygen Therapy: " + str(therapy.Result))
+        for pao2, flow, therapy in pao2Readings.pairs('flow', 'therapy')
+    ]
     #sp02/Fi02 Ratio Calculation
-    if x > 0 and b > 0:
-        fio2Date1 = discreteDic5[b].ResultDate.AddMinutes(5)
-        fio2Date2 = discreteDic5[b].ResultDate.AddMinutes(-5)
-        if (
-            discreteDic1[x].ResultDate == discreteDic5[b].ResultDate or 
-            fio2Date1 >= discreteDic1[x].ResultDate >= fio2Date2
-        ):    
-            percentage = float(fi02Convert(cleanNumbers(discreteDic5[b].Result)))
-            pO2Converted = pO2Conversion(cleanNumbers(discreteDic1[x].Result))
-            if pO2Converted is not None and pO2Converted > 0 and percentage is not None and percentage > 0:
-                calculation = float(pO2Converted) / float(percentage)
-                if float(calculation) <= float(300):
-                    for item in discreteDic6:
-                        if discreteDic6[item].ResultDate == discreteDic1[x].ResultDate:
-                            rrDV = item
-                            break
-                    if rrDV is not None:
-                        respRateDV = discreteDic6[rrDV].Result
-                    else:
-                        respRateDV = "XX"
-                    matchingDate = datetimeFromUtcToLocal(discreteDic1[x].ResultDate)
-                    matchingDate = matchingDate.ToString("MM/dd/yyyy, HH:mm")
-                    matchedList.append(dataConversion(None, matchingDate + " Respiratory Rate: " + str(respRateDV) + ", Sp02: " + str(discreteDic1[x].Result) + ", FIO2: " + str(discreteDic5[b].Result) + ", Estimated PF Ratio- [VALUE]" , str(round(calculation)), discreteDic1[x].UniqueId or discreteDic1[x]._id, calcpo2fio2, 8, False))
-                    db.LogEvaluationScriptMessage("found PF Ratio Match " + str(account._id), scriptName, scriptInstance, "Debug")
-                    return matchedList
-        
+    ratios += [
+        (pfRatio(pO2Conversion(cleanNumbers(spo2.Result)), fi02Convert(cleanNumbers(fio2.Result))), spo2, "Sp02: " + str(spo2.Result) + ", FIO2: " + str(fio2.Result))
+        for spo2, fio2 in spo2Readings.pairs('fio2')
+    ]
     #sp02/Oxygen Therapy/Oxygen Flow Rate Ratio Calculation
-    if x > 0 and z > 0 and a > 0:   
-        oxygenFlowRateDate1 = discreteDic3[z].ResultDate.AddMinutes(5)
-        oxygenFlowRateDate2 = discreteDic3[z].ResultDate.AddMinutes(-5)
-        oxygenTherapyDate1 = discreteDic4[a].ResultDate.AddMinutes(5)
-        oxygenTherapyDate2 = discreteDic4[a].ResultDate.AddMinutes(-5)
-        if (
-            discreteDic3[z].ResultDate == discreteDic1[x].ResultDate == discreteDic4[a].ResultDate or 
-            (oxygenFlowRateDate1 >= discreteDic1[x].ResultDate >= oxygenFlowRateDate2 and
-            oxygenTherapyDate1 >= discreteDic1[x].ResultDate >= oxygenTherapyDate2)
-        ):    
-            pO2Converted = pO2Conversion(cleanNumbers(discreteDic1[x].Result))
-            percentage = fio2Percentage(cleanNumbers(discreteDic3[z].Result), discreteDic4[a].Result)
-            if percentage == 'Invalid':
-                return None
-            if pO2Converted is not None and pO2Converted > 0:
-                calculation = float(pO2Converted) / float(percentage)
-                if float(calculation) <= float(300):
-                    for item in discreteDic6:
-                        if discreteDic6[item].ResultDate == discreteDic1[x].ResultDate:
-                            rrDV = item
-                            break
-                    if rrDV is not None:
-                        respRateDV = discreteDic6[rrDV].Result
-                    else:
-                        respRateDV = "XX"
-                    matchingDate = datetimeFromUtcToLocal(discreteDic1[x].ResultDate)
-                    matchingDate = matchingDate.ToString("MM/dd/yyyy, HH:mm")
-                    matchedList.append(dataConversion(None, matchingDate + " Respiratory Rate: " + str(respRateDV) + ", Sp02: " + str(discreteDic1[x].Result) + ", Oxygen Flow Rate: " + str(discreteDic3[z].Result) + ", Oxygen Therapy: " + str(discreteDic4[a].Result) + ", Estimated PF Ratio- [VALUE]" , str(round(calculation)), discreteDic1[x].UniqueId or discreteDic1[x]._id, calcpo2fio2, 8, False))
-                    db.LogEvaluationScriptMessage("found PF Ratio Match " + str(account._id), scriptName, scriptInstance, "Debug")
-                    return matchedList
+    ratios += [
+        (pfRatio(pO2Conversion(cleanNumbers(spo2.Result)), fio2Percentage(cleanNumbers(flow.Result), therapy.Result)), spo2, "Sp02: " + str(spo2.Result) + ", Oxygen Flow Rate: " + str(flow.Result) + ", Oxygen Therapy: " + str(therapy.Result))
+        for spo2, flow, therapy in spo2Readings.pairs('flow', 'therapy')
+    ]
+
+    matches = [ratio for ratio in ratios if ratio[0] is not None and float(ratio[0]) <= float(300)]
+    if len(matches) > 0:
+        calculation, reading, readingText = matches[0]
+        respRate = respRateRows.get(reading.ResultDate).first('rr')
+        if respRate is not None:
+            respRateDV = respRate.Result
+        else:
+            respRateDV = "XX"
+        matchingDate = datetimeFromUtcToLocal(reading.ResultDate)
+        matchingDate = matchingDate.ToString("MM/dd/yyyy, HH:mm")
+        matchedList.append(dataConversion(None, matchingDate + " Respiratory Rate: " + str(respRateDV) + ", " + readingText + ", Estimated PF Ratio- [VALUE]" , str(round(calculation)), reading.UniqueId or reading._id, calcpo2fio2, 8, False))
+        scriptLog.debug("found PF Ratio Match %s", account._id)
+        return matchedList
     return None
 
 def sp02pa02Lookup(dvDic, DV1, DV2, DV3, DV4):
@@ -648,9 +404,8 @@ def sp02pa02Lookup(dvDic, DV1, DV2, DV3, DV4):
                 matchedList.append(dataConversion(discreteDic3[otDv].ResultDate, linkText3, discreteDic3[otDv].Result, discreteDic3[otDv].UniqueId or discreteDic3[otDv]._id, oxygenTherapy, 3, False))
             if rrDV is not None:
                 matchedList.append(dataConversion(discreteDic4[rrDV].ResultDate, linkText4, discreteDic4[rrDV].Result, discreteDic4[rrDV].UniqueId or discreteDic4[rrDV]._id, rr, 4, False))
-        db.LogEvaluationScriptMessage("SPO2 log message: SPO2 Found matches" + str(w) + ", PAO2 Found Matches: " + str(x)
-            + ", Oxygen Therapy Found Matches: " + str(y) + ", Respiratory Found Matchs: " + str(z) + ", Matching Date: " + str(matchingDate) + " " 
-            + str(account._id), scriptName, scriptInstance, "Debug")
+        scriptLog.debug("SPO2 log message: SPO2 Found matches%s, PAO2 Found Matches: %s, Oxygen Therapy Found Matches: %s, Respiratory Found Matchs: %s, Matching Date: %s %s",
+            w, x, y, z, matchingDate, account._id)
         return matchedList
     elif w > 0:
         for item in discreteDic1:
@@ -680,30 +435,28 @@ def sp02pa02Lookup(dvDic, DV1, DV2, DV3, DV4):
                 matchedList.append(dataConversion(discreteDic3[otDv].ResultDate, linkText3, discreteDic3[otDv].Result, discreteDic3[otDv].UniqueId or discreteDic3[otDv]._id, oxygenTherapy, 5, False))
             if rrDV is not None:
                 matchedList.append(dataConversion(discreteDic4[rrDV].ResultDate, linkText4, discreteDic4[rrDV].Result, discreteDic4[rrDV].UniqueId or discreteDic4[rrDV]._id, rr, 7, False))
-        db.LogEvaluationScriptMessage("SPO2 log message: SPO2 Found matches" + str(w) + ", PAO2 Found Matches: " + str(x)
-            + ", Oxygen Therapy Found Matches: " + str(y) + ", Respiratory Found Matchs: " + str(z) + ", Matching Date: " + str(matchingDate) + " " 
-            + str(account._id), scriptName, scriptInstance, "Debug")
+        scriptLog.debug("SPO2 log message: SPO2 Found matches%s, PAO2 Found Matches: %s, Oxygen Therapy Found Matches: %s, Respiratory Found Matchs: %s, Matching Date: %s %s",
+            w, x, y, z, matchingDate, account._id)
         return matchedList
     else:
-        db.LogEvaluationScriptMessage("SPO2 log message: SPO2 Found matches" + str(w) + ", PAO2 Found Matches: " + str(x)
-            + ", Oxygen Therapy Found Matches: " + str(y) + ", Respiratory Found Matchs: " + str(z) + ", Matching Date: " + str(matchingDate) + " " 
-            + str(account._id), scriptName, scriptInstance, "Debug")
+        scriptLog.debug("SPO2 log message: SPO2 Found matches%s, PAO2 Found Matches: %s, Oxygen Therapy Found Matches: %s, Respiratory Found Matchs: %s, Matching Date: %s %s",
+            w, x, y, z, matchingDate, account._id)
         return None
     
 #========================================
 #  Algorithm
 #========================================
-db.LogEvaluationScriptMessage("Script starting " + str(account._id), scriptName, scriptInstance, "Debug")
+scriptLog.debug("Script starting %s", account._id)
 #Determine if if and how many fully spec codes are on the acct
 specifiedCodes = []
 specifiedCodes = specCodeDic.keys()
-specCodeList = CodeCount(specifiedCodes)
-specifiedCount = len(specCodeList)
-str1 = ', '.join([str(elem) for elem in specCodeList])
 
 unSpecifiedCodes = []
 unspecifiedCodes = unspecCodeDic.keys()
-unSpecCodeList = CodeCount(unspecifiedCodes)
+specCodeList, unSpecCodeList = CodeCounts(specifiedCodes, unspecifiedCodes)
+specifiedCount = len(specCodeList)
+str1 = ', '.join([str(elem) for elem in specCodeList])
+
 unspecifiedCount = len(unSpecCodeList)
 str2 = ', '.join([str(elem) for elem in unSpecCodeList])
 
@@ -783,124 +536,116 @@ for alert in account.MatchedCriteriaGroups or []:
 #Check if alert was autoresolved or completed.
 if validated is False:
     #Find all discrete values for custom lookups within the last X days
-    maindiscreteDic = {}
-    unsortedDicsreteDic = {}
-    dvCount = 0
     #Combine all items into one list to search against
     discreteSearchList = [i for j in [dvPa02Fi02, dvSPO2, dvPaO2, dvOxygenFlowRate, dvOxygenTherapy, dvFIO2, dvRespiratoryRate,
                 dvArterialBloodC02, dvPaO2] for i in j]
     #Set datelimit for how far back to 
     dvDateLimit = System.DateTime.Now.AddDays(-7)
-    #Loop through all dvs finding any that match in the combined list adding to a dictionary the matches
-    for dv in discreteValues or []:
-        if dv.ResultDate >= dvDateLimit:
-            if any(item == dv.Name for item in discreteSearchList):
-                dvCount += 1
-                unsortedDicsreteDic[dvCount] = dv
-    #Sort List by latest
-    maindiscreteDic = sorted(unsortedDicsreteDic.items(), key=lambda x: x[1]['ResultDate'], reverse=True)
+    #Index all dvs that match in the combined list by name, sorted by latest
+    maindiscreteDic = DiscreteValueIndex(discreteValues, discreteSearchList, dvDateLimit)
     
     #Negations
-    negationAcuteRespiratoryFailure = multiCodeValue(["J96.01", "J96.02", "J96.11", "J96.12", "J96.21", "J96.22", "J96.90", "J96.91", "J96.92", "J96.00", "J96.10", "J96.20"], "Respiratory Failure Fully Specified Code: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence = Evidence()
+    evidence.define("negationAcuteRespiratoryFailure", multiCodeValue, ["J96.01", "J96.02", "J96.11", "J96.12", "J96.21", "J96.22", "J96.90", "J96.91", "J96.92", "J96.00", "J96.10", "J96.20"], "Respiratory Failure Fully Specified Code: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
     #Documented Dx
-    acuteRespiratoryFailureHypox = multiCodeValue(["J96.01", "J96.21"], "Acute Respiratory Failure with Hypoxia Fully Specified Code: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    acuteRespiratoryFailureHyper= multiCodeValue(["J96.02", "J96.22"], "Acute Respiratory Failure with Hypercapnia Fully Specified Code: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    j9600Code = codeValue("J96.00", "Acute Respiratory Failure, Unspecified Whether With Hypoxia Or Hypercapnia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    j9601Code = codeValue("J96.01", "Acute Respiratory Failure With Hypoxia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    j9602Code = codeValue("J96.02", "Acute Respiratory Failure With Hypercapnia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    j9611Code = codeValue("J96.11", "Chronic Respiratory Failure With Hypoxia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    j9612Code = codeValue("J96.12", "Chronic Respiratory Failure With Hypercapnia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    j9621Code = codeValue("J96.21", "Autoresolved Alert Due To Acute and Chronic Respiratory Failure with Hypoxia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    j9622Code = codeValue("J96.22", "Autoresolved Alert Due To Acute on Chronic Respiratory Failure with Hypercapnia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    j9610Code = codeValue("J96.10", "Chronic Respiratory Failure Dx, Unspecified Whether With Hypoxia Or Hypercapnia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    j9620Code = codeValue("J96.20", "Acute And Chronic Respiratory Failure, Unspecified Whether With Hypoxia Or Hypercapnia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    j9690Code = codeValue("J96.90", "Respiratory Failure, Unspecified, Unspecified Whether With Hypoxia Or Hypercapnia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    j9691Code = codeValue("J96.91", "Respiratory Failure, Unspecified With Hypoxia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    j9692Code = codeValue("J96.92", "Respiratory Failure, Unspecified With Hypercapnia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("acuteRespiratoryFailureHypox", multiCodeValue, ["J96.01", "J96.21"], "Acute Respiratory Failure with Hypoxia Fully Specified Code: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("acuteRespiratoryFailureHyper", multiCodeValue, ["J96.02", "J96.22"], "Acute Respiratory Failure with Hypercapnia Fully Specified Code: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("j9600Code", codeValue, "J96.00", "Acute Respiratory Failure, Unspecified Whether With Hypoxia Or Hypercapnia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("j9601Code", codeValue, "J96.01", "Acute Respiratory Failure With Hypoxia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("j9602Code", codeValue, "J96.02", "Acute Respiratory Failure With Hypercapnia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("j9611Code", codeValue, "J96.11", "Chronic Respiratory Failure With Hypoxia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("j9612Code", codeValue, "J96.12", "Chronic Respiratory Failure With Hypercapnia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("j9621Code", codeValue, "J96.21", "Autoresolved Alert Due To Acute and Chronic Respiratory Failure with Hypoxia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("j9622Code", codeValue, "J96.22", "Autoresolved Alert Due To Acute on Chronic Respiratory Failure with Hypercapnia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("j9610Code", codeValue, "J96.10", "Chronic Respiratory Failure Dx, Unspecified Whether With Hypoxia Or Hypercapnia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("j9620Code", codeValue, "J96.20", "Acute And Chronic Respiratory Failure, Unspecified Whether With Hypoxia Or Hypercapnia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("j9690Code", codeValue, "J96.90", "Respiratory Failure, Unspecified, Unspecified Whether With Hypoxia Or Hypercapnia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("j9691Code", codeValue, "J96.91", "Respiratory Failure, Unspecified With Hypoxia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("j9692Code", codeValue, "J96.92", "Respiratory Failure, Unspecified With Hypercapnia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
     z9911Code = codeValue("Z99.11", "Dependence On Ventilator: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    j95821Code = codeValue("J95.821", "Acute Postprocedural Respiratory Failure (MCC): [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    j80Code = codeValue("J80", "Acute Respiratory Distress Syndrome (MCC): [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("j95821Code", codeValue, "J95.821", "Acute Postprocedural Respiratory Failure (MCC): [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("j80Code", codeValue, "J80", "Acute Respiratory Distress Syndrome (MCC): [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
     #Abs
-    nasalFlaringAbs = abstractValue("NASAL_FLARING", "Nasal Flaring '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 31)
-    paradoxicalBreathingAbs = abstractValue("PARADOXICAL_BREATHING", "Paradoxical Breathing '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 33)
-    r092Code = codeValue("R09.2", "Respiratory Arrest: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 38)
-    retractionsAbs = abstractValue("RETRACTIONS", "Retractions '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 39)
-    shortnessOfBreathAbs = abstractValue("SHORTNESS_OF_BREATH", "Shortness of Breath '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 40)
-    r061Code = codeValue("R06.1", "Stridor: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 41)
-    tripodBreathingAbs = abstractValue("TRIPOD_BREATHING ", "Tripod Breathing '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 42)
-    useOfAccessoryMusclesAbs = abstractValue("USE_OF_ACCESSORY_MUSCLES", "Use of Accessory Muscles '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 43)
-    wheezingAbs = codeValue("R06.2", "Wheezing: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 45)
+    evidence.define("nasalFlaringAbs", abstractValue, "NASAL_FLARING", "Nasal Flaring '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 31)
+    evidence.define("paradoxicalBreathingAbs", abstractValue, "PARADOXICAL_BREATHING", "Paradoxical Breathing '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 33)
+    evidence.define("r092Code", codeValue, "R09.2", "Respiratory Arrest: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 38)
+    evidence.define("retractionsAbs", abstractValue, "RETRACTIONS", "Retractions '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 39)
+    evidence.define("shortnessOfBreathAbs", abstractValue, "SHORTNESS_OF_BREATH", "Shortness of Breath '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 40)
+    evidence.define("r061Code", codeValue, "R06.1", "Stridor: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 41)
+    evidence.define("tripodBreathingAbs", abstractValue, "TRIPOD_BREATHING ", "Tripod Breathing '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 42)
+    evidence.define("useOfAccessoryMusclesAbs", abstractValue, "USE_OF_ACCESSORY_MUSCLES", "Use of Accessory Muscles '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 43)
+    evidence.define("wheezingAbs", codeValue, "R06.2", "Wheezing: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 45)
     #Labs
-    highArterialBloodC02Abs = abstractValue("HIGH_BLOOD_C02", "Blood CO2: [ABSTRACTVALUE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 1)
-    lowPulseOximetryAbs = abstractValue("LOW_PULSE_OXIMETRY", "Sp02 '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 4)
+    evidence.define("highArterialBloodC02Abs", abstractValue, "HIGH_BLOOD_C02", "Blood CO2: [ABSTRACTVALUE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 1)
+    evidence.define("lowPulseOximetryAbs", abstractValue, "LOW_PULSE_OXIMETRY", "Sp02 '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 4)
     #abg
-    highArterialBloodC02DV = dvValueMulti(dict(maindiscreteDic), dvArterialBloodC02, "paCO2: [VALUE] (Result Date: [RESULTDATETIME])", calcArterialBloodC021, gt, 0, pC02, False, 10)
-    pA0280DV = dvValueMulti(dict(maindiscreteDic), dvPaO2, "pa02: [VALUE] (Result Date: [RESULTDATETIME])", calcPAO21, lt, 0, paO2, False, 10)
-    venousBloodDV = dvValue(dvVenousBloodCO2, "Venous Blood C02: [VALUE] (Result Date: [RESULTDATETIME])", calcVenousBloodCO2, 3)
+    highArterialBloodC02DV = dvValueMulti(maindiscreteDic, dvArterialBloodC02, "paCO2: [VALUE] (Result Date: [RESULTDATETIME])", calcArterialBloodC021, gt, 0, pC02, False, 10)
+    pA0280DV = dvValueMulti(maindiscreteDic, dvPaO2, "pa02: [VALUE] (Result Date: [RESULTDATETIME])", calcPAO21, lt, 0, paO2, False, 10)
+    evidence.define("venousBloodDV", dvValue, dvVenousBloodCO2, "Venous Blood C02: [VALUE] (Result Date: [RESULTDATETIME])", calcVenousBloodCO2, 3)
     #Oxygen
-    baselineAbs = abstractValue("BASELINE_OXYGEN_USE", "Baseline Oxygen Use '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 1)
-    ecmoCodes = multiCodeValue(["5A1522F", "5A1522G", "5A1522H", "5A15A2F", "5A15A2G", "5A15A2H"], "ECMO: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 2)
-    z9981Code = codeValue("Z99.81", "Dependence On Supplemental Oxygen: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 3)
+    evidence.define("baselineAbs", abstractValue, "BASELINE_OXYGEN_USE", "Baseline Oxygen Use '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 1)
+    evidence.define("ecmoCodes", multiCodeValue, ["5A1522F", "5A1522G", "5A1522H", "5A15A2F", "5A15A2G", "5A15A2H"], "ECMO: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 2)
+    evidence.define("z9981Code", codeValue, "Z99.81", "Dependence On Supplemental Oxygen: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 3)
     z9911Code = codeValue("Z99.11", "Dependence On Ventilator: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 4)
-    highFlowNasalCodes = multiCodeValue(["5A0935A", "5A0945A", "5A0955A"], "High Flow Nasal Oxygen: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 6)
-    intubationCode = codeValue("0BH17EZ", "Intubation: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 7)
-    invasiveMechVentCodes = multiCodeValue(["5A1935Z", "5A1945Z", "5A1955Z"], "Invasive Mechanical Ventilation: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 8)
-    nasalCannulaCode = codeValue("3E0F7SF", "Nasal Cannula: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 9)
-    nonInvasiveMechVentCodes = abstractValue("NON_INVASIVE_VENTILATION", "Non-Invasive Ventilation '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 10)
-    oxygenTherapyDV = dvOxygenCheck(dict(maindiscreteDic), dvOxygenTherapy, "Oxygen Therapy '[VALUE]' (Result Date: [RESULTDATETIME])", 12)
-    oxygenTherapyAbs = abstractValue("OXYGEN_THERAPY", "Oxygen Therapy '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 13)
-    z930Code = codeValue("Z93.0", "Tracheostomy: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 14)
+    evidence.define("highFlowNasalCodes", multiCodeValue, ["5A0935A", "5A0945A", "5A0955A"], "High Flow Nasal Oxygen: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 6)
+    evidence.define("intubationCode", codeValue, "0BH17EZ", "Intubation: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 7)
+    evidence.define("invasiveMechVentCodes", multiCodeValue, ["5A1935Z", "5A1945Z", "5A1955Z"], "Invasive Mechanical Ventilation: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 8)
+    evidence.define("nasalCannulaCode", codeValue, "3E0F7SF", "Nasal Cannula: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 9)
+    evidence.define("nonInvasiveMechVentCodes", abstractValue, "NON_INVASIVE_VENTILATION", "Non-Invasive Ventilation '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 10)
+    oxygenTherapyDV = dvOxygenCheck(maindiscreteDic, dvOxygenTherapy, "Oxygen Therapy '[VALUE]' (Result Date: [RESULTDATETIME])", 12)
+    evidence.define("oxygenTherapyAbs", abstractValue, "OXYGEN_THERAPY", "Oxygen Therapy '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 13)
+    evidence.define("z930Code", codeValue, "Z93.0", "Tracheostomy: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 14)
     #Vitals
-    lackingPa02DV = dvValue(dvPaO2, "pa02: [VALUE] (Result Date: [RESULTDATETIME])", calcPAO22, 3)
-    lackingPa02Fi02DV = dvValue(dvPa02Fi02, "P02(a)/Fi02 Ratio: [VALUE] (Result Date: [RESULTDATETIME])", calcPa02Fi022, 4)
-    highRespiratoryRateDV = dvValue(dvRespiratoryRate, "Respiratory Rate: [VALUE] (Result Date: [RESULTDATETIME])", calcRespiratoryRate1, 5)
-    lowRespiratoryRateDV = dvValue(dvRespiratoryRate, "Respiratory Rate: [VALUE] (Result Date: [RESULTDATETIME])", calcRespiratoryRate2, 6)
-    lackingPulseOximetryDV = dvValue(dvSPO2, "Sp02: [VALUE] (Result Date: [RESULTDATETIME])", calcRespiratoryRate2, 7)
+    evidence.define("lackingPa02DV", dvValue, dvPaO2, "pa02: [VALUE] (Result Date: [RESULTDATETIME])", calcPAO22, 3)
+    evidence.define("lackingPa02Fi02DV", dvValue, dvPa02Fi02, "P02(a)/Fi02 Ratio: [VALUE] (Result Date: [RESULTDATETIME])", calcPa02Fi022, 4)
+    evidence.define("highRespiratoryRateDV", dvValue, dvRespiratoryRate, "Respiratory Rate: [VALUE] (Result Date: [RESULTDATETIME])", calcRespiratoryRate1, 5)
+    evidence.define("lowRespiratoryRateDV", dvValue, dvRespiratoryRate, "Respiratory Rate: [VALUE] (Result Date: [RESULTDATETIME])", calcRespiratoryRate2, 6)
+    evidence.define("lackingPulseOximetryDV", dvValue, dvSPO2, "Sp02: [VALUE] (Result Date: [RESULTDATETIME])", calcRespiratoryRate2, 7)
     #Vitals Subheading
-    lowPulseOximetryDV = dvValueMulti(dict(maindiscreteDic), dvSPO2, "Sp02: [VALUE] (Result Date: [RESULTDATETIME])", calcSPO21, lt, 0, spo2, False, 10)
+    lowPulseOximetryDV = dvValueMulti(maindiscreteDic, dvSPO2, "Sp02: [VALUE] (Result Date: [RESULTDATETIME])", calcSPO21, lt, 0, spo2, False, 10)
     #Calculated Po2/Fio2
     pao2Calc = None
     sp02pao2Dvs = None
-    if z9981Code is None:
-        pao2Calc = pao2fio2Calculation(dict(maindiscreteDic), dvPa02Fi02, dvSPO2, dvPaO2, dvOxygenFlowRate, dvOxygenTherapy, dvFIO2, dvRespiratoryRate, calcPa02Fi021, 2)
+    if evidence.z9981Code is None:
+        pao2Calc = pao2fio2Calculation(maindiscreteDic, dvPa02Fi02, dvSPO2, dvPaO2, dvOxygenFlowRate, dvOxygenTherapy, dvFIO2, dvRespiratoryRate, calcPa02Fi021, 2)
     if pao2Calc is None:
-        sp02pao2Dvs = sp02pa02Lookup(dict(maindiscreteDic), dvSPO2, dvPaO2, dvOxygenTherapy, dvRespiratoryRate)
+        sp02pao2Dvs = sp02pa02Lookup(maindiscreteDic, dvSPO2, dvPaO2, dvOxygenTherapy, dvRespiratoryRate)
  
     #Clinical Indicator Checks
-    if useOfAccessoryMusclesAbs is not None: abs.Links.Add(useOfAccessoryMusclesAbs); CI += 1
-    if wheezingAbs is not None: abs.Links.Add(wheezingAbs); CI += 1
-    if shortnessOfBreathAbs is not None: abs.Links.Add(shortnessOfBreathAbs); CI += 1
+    if evidence.useOfAccessoryMusclesAbs is not None: abs.Links.Add(evidence.useOfAccessoryMusclesAbs); CI += 1
+    if evidence.wheezingAbs is not None: abs.Links.Add(evidence.wheezingAbs); CI += 1
+    if evidence.shortnessOfBreathAbs is not None: abs.Links.Add(evidence.shortnessOfBreathAbs); CI += 1
     if (
-        lowRespiratoryRateDV is not None or 
-        highRespiratoryRateDV is not None
+        evidence.lowRespiratoryRateDV is not None or 
+        evidence.highRespiratoryRateDV is not None
     ):
         CI += 1
-        if highRespiratoryRateDV is not None: vitals.Links.Add(highRespiratoryRateDV)
-        if lowRespiratoryRateDV is not None: vitals.Links.Add(lowRespiratoryRateDV)
-    if r061Code is not None: abs.Links.Add(r061Code); CI += 1
-    if tripodBreathingAbs is not None: abs.Links.Add(tripodBreathingAbs); CI += 1
-    if r092Code is not None: abs.Links.Add(r092Code); CI += 1
-    if paradoxicalBreathingAbs is not None: abs.Links.Add(paradoxicalBreathingAbs); CI += 1
-    if retractionsAbs is not None: abs.Links.Add(retractionsAbs); CI += 1
+        if evidence.highRespiratoryRateDV is not None: vitals.Links.Add(evidence.highRespiratoryRateDV)
+        if evidence.lowRespiratoryRateDV is not None: vitals.Links.Add(evidence.lowRespiratoryRateDV)
+    if evidence.r061Code is not None: abs.Links.Add(evidence.r061Code); CI += 1
+    if evidence.tripodBreathingAbs is not None: abs.Links.Add(evidence.tripodBreathingAbs); CI += 1
+    if evidence.r092Code is not None: abs.Links.Add(evidence.r092Code); CI += 1
+    if evidence.paradoxicalBreathingAbs is not None: abs.Links.Add(evidence.paradoxicalBreathingAbs); CI += 1
+    if evidence.retractionsAbs is not None: abs.Links.Add(evidence.retractionsAbs); CI += 1
     #Oxygen Delivery Check
-    if oxygenTherapyDV is not None or oxygenTherapyAbs is not None: ODC += 1
-    if intubationCode is not None: ODC += 1
-    if nonInvasiveMechVentCodes is not None: ODC += 1
-    if invasiveMechVentCodes is not None: ODC += 1
-    if highFlowNasalCodes is not None: ODC += 1
-    if nasalCannulaCode is not None: ODC += 1
+    if oxygenTherapyDV is not None or evidence.oxygenTherapyAbs is not None: ODC += 1
+    if evidence.intubationCode is not None: ODC += 1
+    if evidence.nonInvasiveMechVentCodes is not None: ODC += 1
+    if evidence.invasiveMechVentCodes is not None: ODC += 1
+    if evidence.highFlowNasalCodes is not None: ODC += 1
+    if evidence.nasalCannulaCode is not None: ODC += 1
     #Oxygenation Check
     if pao2Calc is not None: OC += 1
     if sp02pao2Dvs is not None: OC += 1
     #Hypercapnic check
-    if highArterialBloodC02DV is not None or highArterialBloodC02Abs is not None:
+    if highArterialBloodC02DV is not None or evidence.highArterialBloodC02Abs is not None:
         HC += 1
-        if highArterialBloodC02Abs is not None: labs.Links.Add(highArterialBloodC02Abs)
-    if venousBloodDV is not None: HC += 1
+        if evidence.highArterialBloodC02Abs is not None: labs.Links.Add(evidence.highArterialBloodC02Abs)
+    if evidence.venousBloodDV is not None: HC += 1
     #Lacking Oxygenation Check
-    if lackingPa02DV is not None: LOC += 1
-    if lackingPa02Fi02DV is not None: LOC += 1
-    if lackingPulseOximetryDV is not None: LOC += 1
+    if evidence.lackingPa02DV is not None: LOC += 1
+    if evidence.lackingPa02Fi02DV is not None: LOC += 1
+    if evidence.lackingPulseOximetryDV is not None: LOC += 1
     if pao2Calc is not None: LOC += 1
     
    #Main Algorithm
@@ -917,25 +662,25 @@ if validated is False:
             oxygen.Links.Add(MatchedCriteriaLink(LinkText2, None, None, None, False))
         if message3:
             vitals.Links.Add(MatchedCriteriaLink(LinkText3, None, None, None, False))
-            if lackingPa02DV is not None: vitals.Links.Add(lackingPa02DV)
-            if lackingPa02Fi02DV is not None: vitals.Links.Add(lackingPa02Fi02DV)
-            if lackingPulseOximetryDV is not None: vitals.Links.Add(lackingPulseOximetryDV)
+            if evidence.lackingPa02DV is not None: vitals.Links.Add(evidence.lackingPa02DV)
+            if evidence.lackingPa02Fi02DV is not None: vitals.Links.Add(evidence.lackingPa02Fi02DV)
+            if evidence.lackingPulseOximetryDV is not None: vitals.Links.Add(evidence.lackingPulseOximetryDV)
         result.Outcome = "AUTORESOLVED"
         result.Reason = "Autoresolved due to clinical evidence now existing on the Account"
         result.Validated = True
         AlertPassed = True
     #1
     elif (
-        acuteRespiratoryFailureHypox is not None and
+        evidence.acuteRespiratoryFailureHypox is not None and
         (CI == 0 or ODC == 0 or LOC == 0)
     ):
-        dc.Links.Add(acuteRespiratoryFailureHypox)
+        dc.Links.Add(evidence.acuteRespiratoryFailureHypox)
         if CI < 1: abs.Links.Add(MatchedCriteriaLink(LinkText1, None, None, None))
         if ODC < 1: oxygen.Links.Add(MatchedCriteriaLink(LinkText2, None, None, None))
         if LOC < 1: vitals.Links.Add(MatchedCriteriaLink(LinkText3, None, None, None))
-        if lackingPa02DV is not None: vitals.Links.Add(lackingPa02DV)
-        if lackingPa02Fi02DV is not None: vitals.Links.Add(lackingPa02Fi02DV)
-        if lackingPulseOximetryDV is not None: vitals.Links.Add(lackingPulseOximetryDV)
+        if evidence.lackingPa02DV is not None: vitals.Links.Add(evidence.lackingPa02DV)
+        if evidence.lackingPa02Fi02DV is not None: vitals.Links.Add(evidence.lackingPa02Fi02DV)
+        if evidence.lackingPulseOximetryDV is not None: vitals.Links.Add(evidence.lackingPulseOximetryDV)
         result.Subtitle = "Acute Respiratory Failure With Hypoxia Possibly Lacking Supporting Evidence"
         result.Passed = True
         AlertPassed = True
@@ -958,11 +703,11 @@ if validated is False:
         AlertPassed = True
     #2
     elif (
-        acuteRespiratoryFailureHyper is not None and
+        evidence.acuteRespiratoryFailureHyper is not None and
         (CI == 0 or ODC == 0 or HC == 0)
     ):
         result.Subtitle = "Acute Respiratory Failure With Hypercapnia Possibly Lacking Supporting Evidence"
-        dc.Links.Add(acuteRespiratoryFailureHyper)
+        dc.Links.Add(evidence.acuteRespiratoryFailureHyper)
         if CI < 1: abs.Links.Add(MatchedCriteriaLink(LinkText1, None, None, None))
         if ODC < 1: oxygen.Links.Add(MatchedCriteriaLink(LinkText2, None, None, None))
         if HC < 1: labs.Links.Add(MatchedCriteriaLink(LinkText4, None, None, None))
@@ -973,50 +718,50 @@ if validated is False:
         (subtitle == "Respiratory Failure Dx Missing Acuity and Type" or
         subtitle == "Respiratory Failure with Hypoxia, Acuity Missing" or
         subtitle == "Respiratory Failure with Hypercapnia, Acuity Missing") and
-        (j9601Code is not None or
-         j9602Code is not None or
-         j95821Code is not None or 
-         j80Code is not None)
+        (evidence.j9601Code is not None or
+         evidence.j9602Code is not None or
+         evidence.j95821Code is not None or 
+         evidence.j80Code is not None)
     ):
-        if j9602Code is not None: dc.Links.Add(j9602Code)
-        if j9601Code is not None: dc.Links.Add(j9601Code)
-        if j95821Code is not None: dc.Links.Add(j95821Code)
-        if j80Code is not None: dc.Links.Add(j80Code)
+        if evidence.j9602Code is not None: dc.Links.Add(evidence.j9602Code)
+        if evidence.j9601Code is not None: dc.Links.Add(evidence.j9601Code)
+        if evidence.j95821Code is not None: dc.Links.Add(evidence.j95821Code)
+        if evidence.j80Code is not None: dc.Links.Add(evidence.j80Code)
         result.Outcome = "AUTORESOLVED"
         result.Reason = "Autoresolved due to Specifed Code now existing on the Account"
         result.Validated = True
         AlertConditions = True
     #3
-    elif j9691Code is not None:
-        dc.Links.Add(j9691Code)
+    elif evidence.j9691Code is not None:
+        dc.Links.Add(evidence.j9691Code)
         result.Subtitle = "Respiratory Failure with Hypoxia, Acuity Missing"
         AlertPassed = True
     #4
-    elif j9692Code is not None:
-        dc.Links.Add(j9692Code)
+    elif evidence.j9692Code is not None:
+        dc.Links.Add(evidence.j9692Code)
         result.Subtitle = "Respiratory Failure with Hypercapnia, Acuity Missing"
         AlertPassed = True 
     #5    
-    elif j9690Code is not None:
-        dc.Links.Add(j9690Code)
+    elif evidence.j9690Code is not None:
+        dc.Links.Add(evidence.j9690Code)
         result.Subtitle = "Respiratory Failure Dx Missing Acuity and Type"
         AlertPassed = True
     #6.1
     elif (
         subtitle == "Possible Acute Respiratory Failure" and
-        (j9601Code is not None or
-         j9602Code is not None or
-         j95821Code is not None or 
-         j80Code is not None or
-         j9621Code is not None or 
-         j9622Code is not None)
+        (evidence.j9601Code is not None or
+         evidence.j9602Code is not None or
+         evidence.j95821Code is not None or 
+         evidence.j80Code is not None or
+         evidence.j9621Code is not None or 
+         evidence.j9622Code is not None)
     ):
-        if j9602Code is not None: dc.Links.Add(j9602Code)
-        if j9601Code is not None: dc.Links.Add(j9601Code)
-        if j95821Code is not None: dc.Links.Add(j95821Code)
-        if j80Code is not None: dc.Links.Add(j80Code)
-        if j9621Code is not None: dc.Links.Add(j9621Code)
-        if j9622Code is not None: dc.Links.Add(j9622Code)
+        if evidence.j9602Code is not None: dc.Links.Add(evidence.j9602Code)
+        if evidence.j9601Code is not None: dc.Links.Add(evidence.j9601Code)
+        if evidence.j95821Code is not None: dc.Links.Add(evidence.j95821Code)
+        if evidence.j80Code is not None: dc.Links.Add(evidence.j80Code)
+        if evidence.j9621Code is not None: dc.Links.Add(evidence.j9621Code)
+        if evidence.j9622Code is not None: dc.Links.Add(evidence.j9622Code)
         result.Outcome = "AUTORESOLVED"
         result.Reason = "Autoresolved due to Specifed Code now existing on the Account"
         result.Validated = True
@@ -1028,46 +773,46 @@ if validated is False:
     #7.1/8.1
     elif (
         subtitle == "Possible Chronic Respiratory Failure" and
-        (j9601Code is not None or
-         j9602Code is not None or
-         j95821Code is not None or 
-         j80Code is not None or
-         j9621Code is not None or 
-         j9622Code is not None or 
-         j9611Code is not None or
-         j9612Code is not None)
+        (evidence.j9601Code is not None or
+         evidence.j9602Code is not None or
+         evidence.j95821Code is not None or 
+         evidence.j80Code is not None or
+         evidence.j9621Code is not None or 
+         evidence.j9622Code is not None or 
+         evidence.j9611Code is not None or
+         evidence.j9612Code is not None)
     ):
-        if j9602Code is not None: dc.Links.Add(j9602Code)
-        if j9601Code is not None: dc.Links.Add(j9601Code)
-        if j95821Code is not None: dc.Links.Add(j95821Code)
-        if j80Code is not None: dc.Links.Add(j80Code)
-        if j9621Code is not None: dc.Links.Add(j9621Code)
-        if j9622Code is not None: dc.Links.Add(j9622Code)
-        if j9611Code is not None: dc.Links.Add(j9611Code)
-        if j9612Code is not None: dc.Links.Add(j9612Code)
+        if evidence.j9602Code is not None: dc.Links.Add(evidence.j9602Code)
+        if evidence.j9601Code is not None: dc.Links.Add(evidence.j9601Code)
+        if evidence.j95821Code is not None: dc.Links.Add(evidence.j95821Code)
+        if evidence.j80Code is not None: dc.Links.Add(evidence.j80Code)
+        if evidence.j9621Code is not None: dc.Links.Add(evidence.j9621Code)
+        if evidence.j9622Code is not None: dc.Links.Add(evidence.j9622Code)
+        if evidence.j9611Code is not None: dc.Links.Add(evidence.j9611Code)
+        if evidence.j9612Code is not None: dc.Links.Add(evidence.j9612Code)
         result.Outcome = "AUTORESOLVED"
         result.Reason = "Autoresolved due to Specifed Code now existing on the Account"
         result.Validated = True
         AlertConditions = True   
     #7
     elif (
-        negationAcuteRespiratoryFailure is None and
-        z930Code is not None and
+        evidence.negationAcuteRespiratoryFailure is None and
+        evidence.z930Code is not None and
         (OC >= 1 or HC >= 1)
     ):
         result.Subtitle = "Possible Chronic Respiratory Failure"
         AlertPassed = True
     #8
-    elif z9981Code is not None or z9911Code is not None:
+    elif evidence.z9981Code is not None or z9911Code is not None:
         result.Subtitle = "Possible Chronic Respiratory Failure"
         AlertPassed = True
 
     else:
-        db.LogEvaluationScriptMessage("Not enough data to warrent alert, Alert Failed. " + str(account._id), scriptName, scriptInstance, "Debug")
+        scriptLog.debug("Not enough data to warrent alert, Alert Failed. %s", account._id)
         result.Passed = False
 
 else:
-    db.LogEvaluationScriptMessage("Alert Closed; Exiting script run. Outcome: " + str(outcome) + " " + str(account._id), scriptName, scriptInstance, "Debug")
+    scriptLog.debug("Alert Closed; Exiting script run. Outcome: %s %s", outcome, account._id)
 
 #If an alert triggered abstract the following
 if AlertPassed:
@@ -1144,21 +889,21 @@ if AlertPassed:
     medValue("Vasodilator", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 13, meds, True)
     abstractValue("VASODILATOR", "Vasodilator '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 14, meds, True)
     #Oxygen
-    if baselineAbs is not None: oxygen.Links.Add(baselineAbs) #1
-    if ecmoCodes is not None: oxygen.Links.Add(ecmoCodes) #2
-    if z9981Code is not None: oxygen.Links.Add(z9981Code) #3
+    if evidence.baselineAbs is not None: oxygen.Links.Add(evidence.baselineAbs) #1
+    if evidence.ecmoCodes is not None: oxygen.Links.Add(evidence.ecmoCodes) #2
+    if evidence.z9981Code is not None: oxygen.Links.Add(evidence.z9981Code) #3
     if z9911Code is not None: oxygen.Links.Add(z9911Code) #4
     if pao2Calc is None:
         dvValue(dvFIO2, "Fi02: [VALUE] (Result Date: [RESULTDATETIME])", calcFIO21, 5, oxygen, True)
-    if highFlowNasalCodes is not None: oxygen.Links.Add(highFlowNasalCodes) #6
-    if intubationCode is not None: oxygen.Links.Add(intubationCode) #7
-    if invasiveMechVentCodes is not None: oxygen.Links.Add(invasiveMechVentCodes) #8
-    if nasalCannulaCode is not None: oxygen.Links.Add(nasalCannulaCode) #9
-    if nonInvasiveMechVentCodes is not None: oxygen.Links.Add(nonInvasiveMechVentCodes) #10
+    if evidence.highFlowNasalCodes is not None: oxygen.Links.Add(evidence.highFlowNasalCodes) #6
+    if evidence.intubationCode is not None: oxygen.Links.Add(evidence.intubationCode) #7
+    if evidence.invasiveMechVentCodes is not None: oxygen.Links.Add(evidence.invasiveMechVentCodes) #8
+    if evidence.nasalCannulaCode is not None: oxygen.Links.Add(evidence.nasalCannulaCode) #9
+    if evidence.nonInvasiveMechVentCodes is not None: oxygen.Links.Add(evidence.nonInvasiveMechVentCodes) #10
     dvValue(dvOxygenFlowRate, "Oxygen Flow Rate: [VALUE] (Result Date: [RESULTDATETIME])", calcOxygenFlowRate1, 11, oxygen, True)
     if oxygenTherapyDV is not None: oxygen.Links.Add(oxygenTherapyDV) #12
-    if oxygenTherapyAbs is not None: oxygen.Links.Add(oxygenTherapyAbs) #13
-    if z930Code is not None: oxygen.Links.Add(z930Code) #14
+    if evidence.oxygenTherapyAbs is not None: oxygen.Links.Add(evidence.oxygenTherapyAbs) #13
+    if evidence.z930Code is not None: oxygen.Links.Add(evidence.z930Code) #14
     #Vitals
     dvValue(dvGlasgowComaScale, "Glasgow Coma Score: [VALUE] (Result Date: [RESULTDATETIME])", calcGlasgowComaScale1, 1, vitals, True)
     dvValue(dvHeartRate, "Heart Rate: [VALUE] (Result Date: [RESULTDATETIME])", calcHeartRate1, 2, vitals, True)
@@ -1173,7 +918,7 @@ if AlertPassed:
     if arterialBloodPHDV is not None: abg.Links.Add(arterialBloodPHDV)
     elif arterialBloodPHDV is None:
         dvValue(dvArterialBloodPH, "PH: [VALUE] (Result Date: [RESULTDATETIME])", calcArterialBloodPH2, 2, abg, True)
-    if venousBloodDV is not None: abg.Links.Add(venousBloodDV) #3
+    if evidence.venousBloodDV is not None: abg.Links.Add(evidence.venousBloodDV) #3
     
     #ABG Subheadings
     if highArterialBloodC02DV is not None:
@@ -1224,7 +969,10 @@ if AlertPassed or AlertConditions:
     if meds.Links: medsLinks = True
     if chestXRayLinks.Links: result.Links.Add(chestXRayLinks); docLinksLinks = True
     result.Links.Add(other)
-    db.LogEvaluationScriptMessage("Alert Passed Adding Links. Alert Triggered: " + str(result.Subtitle) + " Autoresolved: " + str(result.Outcome) + "; " +
-        str(result.Validated) + "; Links: Documented Dx- " + str(dcLinks) + ", Abs- " + str(absLinks) + ", labs- " + str(labsLinks) + ", vitals- " + str(vitalsLinks) + ", meds- " + str(medsLinks) + ", oxygen- " + str(oxygenLinks) + ", abg- "
-        + str(abgLinks) + ", calcp02Fio2- " + str(calcpo2fio2Links) + ", docs- " + str(docLinksLinks) + "; Acct: " + str(account._id), scriptName, scriptInstance, "Debug")
+    scriptLog.debug("Alert Passed Adding Links. Alert Triggered: %s Autoresolved: %s; %s; Links: Documented Dx- %s, Abs- %s, labs- %s, vitals- %s, meds- %s, oxygen- %s, abg- %s, calcp02Fio2- %s, docs- %s; Acct: %s",
+        result.Subtitle, result.Outcome, result.Validated, dcLinks, absLinks, labsLinks, vitalsLinks, medsLinks, oxygenLinks, abgLinks,
+        calcpo2fio2Links, docLinksLinks, account._id)
     result.Passed = True
+
+#Write out this run's script messages
+scriptLog.flush()
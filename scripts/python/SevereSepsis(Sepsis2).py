@@ -28,6 +28,7 @@ from System.Data import *
 from System.Configuration import *
 from System.Collections.Generic import *
 clr.ImportExtensions(System.Linq)
+from cdi import DiscreteValueIndex, Evidence, evaluation_context
 from operator import le, ge, gt, lt
 
 #========================================
@@ -72,14 +73,20 @@ autoEvidenceText = "Autoresolved Evidence - "
 #  Globals
 #========================================
 db = CACDataRepository()
+#Account data is loaded once and shared by every script run for the account,
+#fetching only the discrete values of the last 7 days
+context = evaluation_context(account, db, System.DateTime.Now.AddDays(-7))
+#Script messages are only formatted when their level is enabled, and are written
+#together at the end of the run
+scriptLog = context.log(db, scriptName, scriptInstance)
 admitDate = account.AdmitDateTime.Date
 birthDate = account.Patient.BirthDate.Date
 gender = account.Patient.Gender
 #Update true = External DV collection False = On Acct Record
-accountContainer = AccountWorkflowContainer(account, True, "Category", 7)
+accountContainer = context.container(AccountWorkflowContainer, True, "Category", 7)
 useSeperateDiscreteCollection = True
 if useSeperateDiscreteCollection == True:
-    discreteValues = db.GetDiscreteValues(account._id)
+    discreteValues = context.discrete_values
 else:
     discreteValues = db.GetAccountField(account._id, "DiscreteValues")
 
@@ -121,218 +128,13 @@ calcSpO21 = lambda x: x < 90
 #========================================
 #  Functions
 #========================================
-def datetimeFromUtcToLocal(utc_datetime):
-    if utc_datetime:
-        convertedDate = DateTime.SpecifyKind(utc_datetime, DateTimeKind.Utc)
-        return  convertedDate.ToLocalTime()
-    else:
-        return None
-
-def cleanNumbers(result):
-    result1 = re.sub("[\\<\\>]", "", str(result))
-    if result1.count('.') <= 1 and result1.replace(".", "").isnumeric():
-        return result1
-    else:
-        return None
-
-def dataConversion(datetime, linkText, Result, id, category, sequence, abstract=True, gender=None):
-    if datetime is not None:
-        date_time = datetimeFromUtcToLocal(datetime)
-        date_time = date_time.ToString("MM/dd/yyyy, HH:mm")
-        linkText = linkText.replace("[RESULTDATETIME]", date_time)
-    else: 
-        linkText = linkText.replace("(Result Date: [RESULTDATETIME])", "")
-    if Result is not None:
-        linkText = linkText.replace("[VALUE]", Result)
-    else: linkText = linkText.replace("[VALUE]", "")
-    if gender: linkText = linkText.replace("[GENDER]", gender)
-    else: linkText = linkText.replace("[GENDER]", "")
-    if abstract == True:
-        category.Links.Add(MatchedCriteriaLink(linkText, None, None, id, True, None, None, sequence))
-    elif abstract == False:
-        abstraction = MatchedCriteriaLink(linkText, None, None, id, True, None, None, sequence)
-        return abstraction
-    return
-
-def CodeCount(codes):
-    # Get list of codes on the acct based on CodeDic
-    result = set()
-    for document in account.Documents or []:
-        for codeReference in document.CodeReferences or []:
-            if codeReference.Code in codes:
-                matching_code = codeReference.Code
-                result.add(matching_code)
-    return list(result)
-
-def abstractValue(abstraction_name, link_text, calculation, sequence=0, category=None, abstract=False):
-    # Find abstraction and if abstract is true abstract it to the provided category
-    abstraction = accountContainer.GetFirstLinkMatchingAbstractionValue(abstraction_name, link_text, lambda x: calculation)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def dvValue(dv_name, link_text, calculation, sequence=0, category=None, abstract=False):
-    # Find Discrete Value and if abstract is true abstract it to the provided category
-    for dv in dv_name:
-        abstraction = accountContainer.GetFirstLinkMatchingDiscreteValue(dv, link_text, calculation)
-        if abstraction is not None:
-            break
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def dvValueMulti(dvDic, DV1, linkText, value, sign, sequence=0, category=None, abstract=False, needed=2):
-    # Find Discrete Value and if abstract is true abstract it to the provided category
-    matchedList = []
-    x = 0
-    for dv in dvDic or []:
-        dvr = cleanNumbers(dvDic[dv]['Result'])
-        if dvDic[dv]['Name'] in DV1 and dvr is not None and sign(float(dvr), float(value)):
-            matchedList.append(dataConversion(dvDic[dv]['ResultDate'], linkText, dvDic[dv]['Result'], dvDic[dv]['UniqueId'] or dvDic[dv]['_id'], category, sequence, abstract))
-            x += 1
-            if needed <= x:
-                break
-    if abstract and x > 0:
-        return True
-    elif abstract is False and len(matchedList) > 0 and needed > 0:
-        return matchedList
-    else:
-        return None
-
-def compareValuesMulti(dvDic, DV1, value, value1, linkText, sign, sign1, sequence=0, category=None, abstract=False, needed=2):
-    matchedList = []
-    x = 0
-    for dv in dvDic or []:
-        dvr = cleanNumbers(dvDic[dv]['Result'])
-        if dvDic[dv]['Name'] in DV1 and dvr is not None and sign(float(value), float(dvr)) and sign1(float(dvr), float(value1)):
-            matchedList.append(dataConversion(dvDic[dv]['ResultDate'], linkText, dvDic[dv]['Result'], dvDic[dv]['UniqueId'] or dvDic[dv]['_id'], category, sequence, abstract))
-            x += 1
-            if needed <= x:
-                break
-    if abstract and x > 0:
-        return True
-    elif abstract is False and len(matchedList) > 0 and needed > 0:
-        return matchedList
-    else:
-        return None
-
-def codeValue(code_name, link_text, sequence=0, category=None, abstract=False):
-    # Find code and if abstract is true abstract it to the provided category
-    abstraction = accountContainer.GetFirstCodeLink(code_name, link_text)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def multiCodeValue(code_list, link_text, sequence=0, category=None, abstract=False):
-    # Go through Code List and find first code and if abstract is true abstract it to the provided category
-    abstraction = None
-    for code in code_list:
-        abstraction = accountContainer.GetFirstCodeLink(code, link_text)
-        if abstraction is not None:
-            abstraction.Sequence = sequence
-            if abstract:
-                category.Links.Add(abstraction)
-                return True
-            else:
-                return abstraction
-    if abstract and abstraction is None:
-        return False
-    return abstraction
-
-def prefixCodeValue(prefix, link_text, sequence=0, category=None, abstract=False):
-    # Use prefix to find first code match based on regex search and if abstract is true abstract it to the provided category
-    abstraction = None
-    validCodes = [codes for codes in accountContainer.CodeKeys if re.match(prefix, codes) is not None]
-    for code in validCodes:
-        abstraction = accountContainer.GetFirstCodeLink(code, link_text)
-        if abstraction is not None:
-            abstraction.Sequence = sequence
-            if abstract:
-                category.Links.Add(abstraction)
-                return True
-            else:
-                return abstraction
-    if abstract and abstraction is None:
-        return False
-    return abstraction
-
-def medValue(med_name, link_text, sequence=0, category=None, abstract=False):
-    # Find Medication Value and if abstract is true abstract it to the provided category
-    abstraction = accountContainer.GetFirstMedicationLink(med_name, link_text)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def updateLinkText(value, replacement_text):
-    # Update the link text with the provided text
-    value.LinkText = replacement_text + value.LinkText
-    return value
-
-def documentLink(DocumentType, LinkText, sequence, category, abstract):
-    # Finds a document link and adds it as link so that its a quick reference for the cdi user.
-    abstraction = None
-    abstraction = accountContainer.GetFirstDocumentLink(DocumentType, LinkText)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    return None
+#The helpers every script shares are compiled once per process and bound to this
+#script's globals, see cdi.helpers; a helper defined below replaces the shared one
+context.bind_helpers(globals(), 1)
 
 #========================================
 #  Script Specific Functions
 #========================================
-def anesthesiaMedValue(medDic, med_name, link_text, sequence=0, category=None, abstract=False):
-    for mv in medDic or []:
-        if (
-            medDic[mv]['Route'] is not None and
-            medDic[mv]['Dosage'] is not None and
-            medDic[mv]['Category'] == med_name and
-            (re.search(r'\bhr\b', medDic[mv]['Dosage'], re.IGNORECASE) or
-            re.search(r'\bhour\b', medDic[mv]['Dosage'], re.IGNORECASE) or 
-            re.search(r'\bmin\b', medDic[mv]['Dosage'], re.IGNORECASE) or
-            re.search(r'\bminute\b', medDic[mv]['Dosage'], re.IGNORECASE)) and
-            (re.search(r'\bIntravenous\b', medDic[mv]['Route'], re.IGNORECASE) or
-            re.search(r'\bIV Push\b', medDic[mv]['Route'], re.IGNORECASE))
-        ):
-            if abstract == True:
-                medDataConversion(medDic[mv]['StartDate'], link_text, medDic[mv]['Medication'], medDic[mv]['ExternalId'], medDic[mv]['Dosage'], medDic[mv]['Route'], category, sequence)
-                return True
-            elif abstract == False:
-                abstraction = medDataConversion(medDic[mv]['StartDate'], link_text, medDic[mv]['Medication'], medDic[mv]['ExternalId'], medDic[mv]['Dosage'], medDic[mv]['Route'], category, sequence, abstract)
-                return abstraction
-    return None
-
 def medDataConversion(datetime, linkText, med, id, dosage, route, category, sequence, abstract=True):
     date_time = datetimeFromUtcToLocal(datetime)
     date_time = date_time.ToString("MM/dd/yyyy, HH:mm")
@@ -466,7 +268,7 @@ def dvValueMultiMin(dvDic):
 #========================================
 #  Algorithm
 #========================================
-db.LogEvaluationScriptMessage("Script starting " + str(account._id), scriptName, scriptInstance, "Debug")
+scriptLog.debug("Script starting %s", account._id)
 #Determine if if and how many fully spec codes are on the acct
 codes = []
 codes = codeDic.keys()
@@ -527,54 +329,36 @@ for alert in account.MatchedCriteriaGroups or []:
 #Check if alert was autoresolved or completed.
 if validated is False:
     #Find all discrete values for custom lookups within the last 7 days
-    maindiscreteDic = {}
-    unsortedDicsreteDic = {}
-    dvCount = 0
     #Combine all items into one list to search against
     discreteSearchList = [i for j in [dvSBP, dvMAP, dvSerumLactate, dvPOCLactate, dvDBP, dvHeartRate] for i in j]
     #Set datelimit for how far back to 
     dvDateLimit = System.DateTime.Now.AddDays(-7)
-    #Loop through all dvs finding any that match in the combined list adding to a dictionary the matches
-    for dv in discreteValues or []:
-        if dv.ResultDate >= dvDateLimit:
-            if any(item == dv.Name for item in discreteSearchList):
-                dvCount += 1
-                unsortedDicsreteDic[dvCount] = dv
-    #Sort List by latest
-    maindiscreteDic = sorted(unsortedDicsreteDic.items(), key=lambda x: x[1]['ResultDate'], reverse=True)
+    #Index all dvs that match in the combined list by name, sorted by latest
+    maindiscreteDic = DiscreteValueIndex(discreteValues, discreteSearchList, dvDateLimit)
     
     #Get meds within last X days
-    mainMedDic = {}
-    unsortedMedDic = {}
-    medCount = 0
     #Combine all items into one list to search against
     medSearchList = ["Beta Blocker", "Bumetanide", "Furosemide", "Epinephrine", "Levophed", "Vasopressin", "Neosynephrine"]
     #Set datelimit for how far back to 
     medDateLimit = System.DateTime.Now.AddDays(-7)
-    #Loop through all meds finding any that match in the combined list adding to a dictionary the matches
-    if 'Medications' in account:    
-        for med in account.Medications:
-            if med.StartDate >= medDateLimit and 'Category' in med and med.Category is not None:
-                if any(item == med.Category for item in medSearchList):
-                    medCount += 1
-                    unsortedMedDic[medCount] = med
-    #Sort List by latest
-    mainMedDic = sorted(unsortedMedDic.items(), key=lambda x: x[1]['StartDate'], reverse=True)
+    #Collect matching meds, sorted by latest
+    mainMedDic = context.medications(medSearchList, medDateLimit)
     
     #Negations
-    liverCirrhosisCheck = multiCodeValue(["K70.0", "K70.10", "K70.11", "K70.2", "K70.30", "K70.31", "K70.40", "K70.41", "K70.9", "K74.60", "K72.1",
+    evidence = Evidence()
+    evidence.define("liverCirrhosisCheck", multiCodeValue, ["K70.0", "K70.10", "K70.11", "K70.2", "K70.30", "K70.31", "K70.40", "K70.41", "K70.9", "K74.60", "K72.1",
             "K71", "K71.0", "K71.10", "K71.11", "K71.2", "K71.3", "K71.4", "K71.50", "K71.51", "K71.6", "K71.7", "K71.8",
             "K71.9", "K72.10", "K72.11", "K73.0", "K73.1", "K73.2", "K73.8", "K73.9", "R18.0"],
             "Liver Cirrhosis: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    alcoholAndOpioidAbuseCheck = multiCodeValue(["F10.920", "F10.921", "F10.929", "F10.930", "F10.931", "F10.932",
+    evidence.define("alcoholAndOpioidAbuseCheck", multiCodeValue, ["F10.920", "F10.921", "F10.929", "F10.930", "F10.931", "F10.932",
             "F10.939", "F11.120", "F11.121", "F11.122", "F11.129", "F11.13"], "Alcohol and Opioid Abuse: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    chronicKidneyFailureCheck = multiCodeValue(["N18.30", "N18.31", "N18.32", "N18.4", "N18.5", "N18.6", "N18.9"],
+    evidence.define("chronicKidneyFailureCheck", multiCodeValue, ["N18.30", "N18.31", "N18.32", "N18.4", "N18.5", "N18.6", "N18.9"],
             "Chronic Kidney Failure: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
     #Alert Trigger
-    r579Code = codeValue("R57.9", "Shock, unspecified: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    r6520Code = codeValue("R65.20", "Severe Sepsis without Septic Shock: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    r6521Code = codeValue("R65.21", "Severe Sepsis with Septic Shock: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    sepsisCode = multiCodeValue(["A40.0", "A40.1", "A40.3", "A40.8", "A40.9", " A41.01", "A41.02", "A41.1", "A41.2", "A41.3", "A41.4",
+    evidence.define("r579Code", codeValue, "R57.9", "Shock, unspecified: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("r6520Code", codeValue, "R65.20", "Severe Sepsis without Septic Shock: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("r6521Code", codeValue, "R65.21", "Severe Sepsis with Septic Shock: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("sepsisCode", multiCodeValue, ["A40.0", "A40.1", "A40.3", "A40.8", "A40.9", " A41.01", "A41.02", "A41.1", "A41.2", "A41.3", "A41.4",
             "A41.9", "A41.50", "A41.51", "A41.52", "A41.53", "A41.54", "A41.59", "A41.8", "A41.81", "A41.89", "A42.7", "A22.7", "B37.7",
             "A26.7", "A54.86", "B00.7", "A32.7", "A24.1", "A20.7", "T81.44XA", "T81.44XD", "T81.44XS"],
             "Sepsis Dx: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
@@ -585,85 +369,85 @@ if validated is False:
     dopamine = medValue("Dopamine", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 4)
     if dopamine is None:
         dopamine = abstractValue("DOPAMINE", "Dopamine '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 5)
-    epinephrine = anesthesiaMedValue(dict(mainMedDic), "Epinephrine", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 6)
+    epinephrine = anesthesiaMedValue(mainMedDic, "Epinephrine", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 6)
     if epinephrine is None:
         epinephrine = abstractValue("EPINEPHRINE", "Epinephrine '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 7)
-    levophed = anesthesiaMedValue(dict(mainMedDic), "Levophed", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 9)
+    levophed = anesthesiaMedValue(mainMedDic, "Levophed", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 9)
     if levophed is None:        
         levophed = abstractValue("LEVOPHED", "Levophed '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 10)
     milrinone = medValue("Milrinone", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 11)
     if milrinone is None:
         milrinone = abstractValue("MILRINONE", "Milrinone '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 12)
-    neosynephrine = anesthesiaMedValue(dict(mainMedDic), "Neosynephrine", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 13)
+    neosynephrine = anesthesiaMedValue(mainMedDic, "Neosynephrine", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 13)
     if neosynephrine is None:
         neosynephrine = abstractValue("NEOSYNEPHRINE", "Neosynephrine '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 14)
-    vasoactiveMedicationAbs = abstractValue("VASOACTIVE_MEDICATION", "Vasoactive Medication '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 15)
-    vasopressin = anesthesiaMedValue(dict(mainMedDic), "Vasopressin", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 16)
+    evidence.define("vasoactiveMedicationAbs", abstractValue, "VASOACTIVE_MEDICATION", "Vasoactive Medication '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 15)
+    vasopressin = anesthesiaMedValue(mainMedDic, "Vasopressin", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 16)
     if vasopressin is None:        
         vasopressin = abstractValue("VASOPRESSIN", "Vasopressin '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 17)
     #Organ Dysfunction
-    g9341Code = codeValue("G93.41", "Acute Metabolic Encephalopathy: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 1)
-    acuteHeartFailure = multiCodeValue(["I50.21", "I50.31", "I50.41"], "Acute Heart Failure: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 2)
-    acuteKidneyFailure = prefixCodeValue("^N17\.", "Acute Kidney Failure: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 3)
-    acuteLiverFailure = multiCodeValue(["K72.00", "K72.01"], "Acute Liver Failure: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 4)
-    i21aCode = codeValue("I21.A", "Acute MI Type 2: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 5)
-    acuteRespiratroyFailure = multiCodeValue(["J96.00", "J96.01", "J96.02"], "Acute Respiratory Failure: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 6)
-    r4182Code = codeValue("R41.82", "Altered Level of Consciousness: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 7)
-    alteredAbs = abstractValue("ALTERED_LEVEL_OF_CONSCIOUSNESS", "Altered Level Of Consciousness '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 8)
-    lowBloodPressureAbs = abstractValue("LOW_BLOOD_PRESSURE", "Blood Pressure: [ABSTRACTVALUE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 9)
-    r410Code = codeValue("R41.0", "Disorientation: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 10)
-    glasgowComaScoreDV = dvValue(dvGlasgowComaScale, "Glasgow Coma Score: [VALUE] (Result Date: [RESULTDATETIME])", calcGlasgowComaScale2, 11)
-    lowMeanArterialBloodPressureDV = dvValue(dvMAP, "Mean Arterial Blood Pressure: [VALUE] (Result Date: [RESULTDATETIME])", calcMAP1, 12)
-    pa02DV = dvValue(dvArterialBloodOxygen, "pa02: [VALUE] (Result Date: [RESULTDATETIME])", calcArterialBloodOxygen1, 13)
-    p02fio2DV = dvValue(dvP02FIO2, "PaO2/FIO2 Ratio: [VALUE] (Result Date: [RESULTDATETIME])", calcP02FIO21, 14)
-    lowPlateletCountDV = dvValue(dvPlateletCount, "Platelet Count: [VALUE] (Result Date: [RESULTDATETIME])", calcPlateletCountSevereSepsis1, 15)
-    highSerumBilirubinDV = dvValue(dvSerumBilirubin, "Serum Bilirubin: [VALUE] (Result Date: [RESULTDATETIME])", calcSerumBilirubin1, 16)
-    highSerumCreatinineDV = dvValue(dvSerumCreatinine, "Serum Creatinine: [VALUE] (Result Date: [RESULTDATETIME])", calcSerumCreatinine1, 17)
-    highSerumLactate2DV = compareValuesMulti(dict(maindiscreteDic), dvSerumLactate, 2, 4, "Serum Lactate: [VALUE] (Result Date: [RESULTDATETIME])", le, lt, 0, lactateODS, False, 10)
-    highPOCLactate2DV = compareValuesMulti(dict(maindiscreteDic), dvSerumLactate, 2, 4, "Serum Lactate: [VALUE] (Result Date: [RESULTDATETIME])", le, lt, 0, lactateODS, False, 10)
-    spO2DV = dvValue(dvSpO2, "SP02: [VALUE] (Result Date: [RESULTDATETIME])", calcSpO21, 20)
-    lowSystolicBloodPressureDV = dvValue(dvSBP, "Systolic Blood Pressure: [VALUE] (Result Date: [RESULTDATETIME])", calcSBP1, 21)
-    lowUrineOutputAbs = abstractValue("LOW_URINE_OUTPUT", "Urine Output '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 22)
+    evidence.define("g9341Code", codeValue, "G93.41", "Acute Metabolic Encephalopathy: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 1)
+    evidence.define("acuteHeartFailure", multiCodeValue, ["I50.21", "I50.31", "I50.41"], "Acute Heart Failure: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 2)
+    evidence.define("acuteKidneyFailure", prefixCodeValue, "^N17\.", "Acute Kidney Failure: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 3)
+    evidence.define("acuteLiverFailure", multiCodeValue, ["K72.00", "K72.01"], "Acute Liver Failure: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 4)
+    evidence.define("i21aCode", codeValue, "I21.A", "Acute MI Type 2: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 5)
+    evidence.define("acuteRespiratroyFailure", multiCodeValue, ["J96.00", "J96.01", "J96.02"], "Acute Respiratory Failure: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 6)
+    evidence.define("r4182Code", codeValue, "R41.82", "Altered Level of Consciousness: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 7)
+    evidence.define("alteredAbs", abstractValue, "ALTERED_LEVEL_OF_CONSCIOUSNESS", "Altered Level Of Consciousness '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 8)
+    evidence.define("lowBloodPressureAbs", abstractValue, "LOW_BLOOD_PRESSURE", "Blood Pressure: [ABSTRACTVALUE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 9)
+    evidence.define("r410Code", codeValue, "R41.0", "Disorientation: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 10)
+    evidence.define("glasgowComaScoreDV", dvValue, dvGlasgowComaScale, "Glasgow Coma Score: [VALUE] (Result Date: [RESULTDATETIME])", calcGlasgowComaScale2, 11)
+    evidence.define("lowMeanArterialBloodPressureDV", dvValue, dvMAP, "Mean Arterial Blood Pressure: [VALUE] (Result Date: [RESULTDATETIME])", calcMAP1, 12)
+    evidence.define("pa02DV", dvValue, dvArterialBloodOxygen, "pa02: [VALUE] (Result Date: [RESULTDATETIME])", calcArterialBloodOxygen1, 13)
+    evidence.define("p02fio2DV", dvValue, dvP02FIO2, "PaO2/FIO2 Ratio: [VALUE] (Result Date: [RESULTDATETIME])", calcP02FIO21, 14)
+    evidence.define("lowPlateletCountDV", dvValue, dvPlateletCount, "Platelet Count: [VALUE] (Result Date: [RESULTDATETIME])", calcPlateletCountSevereSepsis1, 15)
+    evidence.define("highSerumBilirubinDV", dvValue, dvSerumBilirubin, "Serum Bilirubin: [VALUE] (Result Date: [RESULTDATETIME])", calcSerumBilirubin1, 16)
+    evidence.define("highSerumCreatinineDV", dvValue, dvSerumCreatinine, "Serum Creatinine: [VALUE] (Result Date: [RESULTDATETIME])", calcSerumCreatinine1, 17)
+    highSerumLactate2DV = compareValuesMulti(maindiscreteDic, dvSerumLactate, 2, 4, "Serum Lactate: [VALUE] (Result Date: [RESULTDATETIME])", le, lt, 0, lactateODS, False, 10)
+    highPOCLactate2DV = compareValuesMulti(maindiscreteDic, dvSerumLactate, 2, 4, "Serum Lactate: [VALUE] (Result Date: [RESULTDATETIME])", le, lt, 0, lactateODS, False, 10)
+    evidence.define("spO2DV", dvValue, dvSpO2, "SP02: [VALUE] (Result Date: [RESULTDATETIME])", calcSpO21, 20)
+    evidence.define("lowSystolicBloodPressureDV", dvValue, dvSBP, "Systolic Blood Pressure: [VALUE] (Result Date: [RESULTDATETIME])", calcSBP1, 21)
+    evidence.define("lowUrineOutputAbs", abstractValue, "LOW_URINE_OUTPUT", "Urine Output '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 22)
     #Septic Shock
-    highSerumLactate4DV = dvValueMulti(dict(maindiscreteDic), dvSerumLactate, "Serum Lactate: [VALUE] (Result Date: [RESULTDATETIME])", calcSerumLactate1, ge, 0, lactateSSI, False, 10)
-    highPOCLactate4DV = dvValueMulti(dict(maindiscreteDic), dvPOCLactate, "Serum Lactate: [VALUE] (Result Date: [RESULTDATETIME])", calcPOCLactate2, ge, 0, lactateSSI, False, 10)    #Septic Shock Subheadings
-    multiSBPmapDV = dvValueMultiMin(dict(maindiscreteDic))
+    highSerumLactate4DV = dvValueMulti(maindiscreteDic, dvSerumLactate, "Serum Lactate: [VALUE] (Result Date: [RESULTDATETIME])", calcSerumLactate1, ge, 0, lactateSSI, False, 10)
+    highPOCLactate4DV = dvValueMulti(maindiscreteDic, dvPOCLactate, "Serum Lactate: [VALUE] (Result Date: [RESULTDATETIME])", calcPOCLactate2, ge, 0, lactateSSI, False, 10)    #Septic Shock Subheadings
+    multiSBPmapDV = dvValueMultiMin(maindiscreteDic)
     
     #Organ Dysfunction Sign  
     if (
-        ((g9341Code is not None or glasgowComaScoreDV is not None) and alcoholAndOpioidAbuseCheck is None) or
-        (r4182Code is not None or alteredAbs is not None ) or
-        r410Code is not None
+        ((evidence.g9341Code is not None or evidence.glasgowComaScoreDV is not None) and evidence.alcoholAndOpioidAbuseCheck is None) or
+        (evidence.r4182Code is not None or evidence.alteredAbs is not None ) or
+        evidence.r410Code is not None
     ):
         ODS += 1
 
     if (
-        lowBloodPressureAbs is not None or
-        lowMeanArterialBloodPressureDV is not None or
-        lowSystolicBloodPressureDV is not None
+        evidence.lowBloodPressureAbs is not None or
+        evidence.lowMeanArterialBloodPressureDV is not None or
+        evidence.lowSystolicBloodPressureDV is not None
     ):
         ODS += 1
     
     if (
-        p02fio2DV is not None or
-        acuteRespiratroyFailure is not None or
-        spO2DV is not None or
-        pa02DV is not None
+        evidence.p02fio2DV is not None or
+        evidence.acuteRespiratroyFailure is not None or
+        evidence.spO2DV is not None or
+        evidence.pa02DV is not None
     ):
         ODS += 1 
     
-    if (highSerumBilirubinDV is not None and liverCirrhosisCheck is None) or acuteLiverFailure is not None: ODS += 1
+    if (evidence.highSerumBilirubinDV is not None and evidence.liverCirrhosisCheck is None) or evidence.acuteLiverFailure is not None: ODS += 1
     
     if (
-        (highSerumCreatinineDV is not None and chronicKidneyFailureCheck is None) or 
-        lowUrineOutputAbs is not None or
-        acuteKidneyFailure is not None
+        (evidence.highSerumCreatinineDV is not None and evidence.chronicKidneyFailureCheck is None) or 
+        evidence.lowUrineOutputAbs is not None or
+        evidence.acuteKidneyFailure is not None
     ):
         ODS += 1
-    if acuteHeartFailure is not None: ODS += 1
-    if lowPlateletCountDV is not None: ODS += 1
+    if evidence.acuteHeartFailure is not None: ODS += 1
+    if evidence.lowPlateletCountDV is not None: ODS += 1
     if highSerumLactate2DV is not None or highPOCLactate2DV is not None: ODS += 1
-    if i21aCode is not None: ODS += 1
+    if evidence.i21aCode is not None: ODS += 1
     if multiSBPmapDV[0][0] is not False and len(multiSBPmapDV[0]) == 1:
         ODS += 1
         for entry in multiSBPmapDV[0]:
@@ -687,7 +471,7 @@ if validated is False:
         levophed is not None or
         milrinone is not None or
         neosynephrine is not None or
-        vasoactiveMedicationAbs is not None or
+        evidence.vasoactiveMedicationAbs is not None or
         vasopressin is not None or
         dobutamine is not None or
         dopamine is not None
@@ -705,12 +489,12 @@ if validated is False:
         result.Validated = True
         AlertPassed = True
             
-    elif r6521Code is not None and (ODS == 0 or SSI == 0):
+    elif evidence.r6521Code is not None and (ODS == 0 or SSI == 0):
         if ODS == 0:
             organ.Links.Add(MatchedCriteriaLink(LinkText2, None, None, None, True))
         if SSI == 0:
             septic.Links.Add(MatchedCriteriaLink(LinkText1, None, None, None, True))
-        if r6521Code is not None: dc.Links.Add(r6521Code)
+        if evidence.r6521Code is not None: dc.Links.Add(evidence.r6521Code)
         result.Subtitle = "Severe Sepsis with Septic Shock Possibly Lacking Supporting Evidence"
         AlertPassed = True
         
@@ -722,73 +506,73 @@ if validated is False:
         result.Validated = True
         AlertPassed = True
         
-    elif r6520Code is not None and ODS == 0:
+    elif evidence.r6520Code is not None and ODS == 0:
         organ.Links.Add(MatchedCriteriaLink(LinkText2, None, None, None, True))
-        dc.Links.Add(r6520Code)
+        dc.Links.Add(evidence.r6520Code)
         result.Subtitle = "Severe Sepsis without Septic Shock Possibly Lacking Supporting Evidence"
         AlertPassed = True
     
-    elif subtitle == "Possible Severe Sepsis without Septic Shock present" and (r6520Code is not None or r6521Code is not None):
-        if r6520Code is not None: dc.Links.Add(r6520Code)
-        if r6521Code is not None: dc.Links.Add(r6521Code)
+    elif subtitle == "Possible Severe Sepsis without Septic Shock present" and (evidence.r6520Code is not None or evidence.r6521Code is not None):
+        if evidence.r6520Code is not None: dc.Links.Add(evidence.r6520Code)
+        if evidence.r6521Code is not None: dc.Links.Add(evidence.r6521Code)
         result.Outcome = "AUTORESOLVED"
         result.Reason = "Autoresolved due to specified code now existing on the Account"
         AlertConditions = True
      
-    elif sepsisCode is not None and r6520Code is None and r6521Code is None and ODS >= 2 and SSI == 0:
-        dc.Links.Add(sepsisCode)
+    elif evidence.sepsisCode is not None and evidence.r6520Code is None and evidence.r6521Code is None and ODS >= 2 and SSI == 0:
+        dc.Links.Add(evidence.sepsisCode)
         result.Subtitle = "Possible Severe Sepsis without Septic Shock present"
         AlertPassed = True
         
-    elif subtitle == "Possible Severe Sepsis with Septic Shock present" and r6521Code is not None:
-        dc.Links.Add(r6521Code)
+    elif subtitle == "Possible Severe Sepsis with Septic Shock present" and evidence.r6521Code is not None:
+        dc.Links.Add(evidence.r6521Code)
         result.Outcome = "AUTORESOLVED"
         result.Reason = "Autoresolved due to specified code now existing on the Account"
         AlertConditions = True
         
-    elif (sepsisCode is not None or r6520Code is not None) and r6521Code is None and ODS >= 2 and (SSI >= 1 or r579Code is not None):
-        if sepsisCode is not None: dc.Links.Add(sepsisCode)
-        if r579Code is not None: dc.Links.Add(r579Code)
-        if r6520Code is not None: dc.Links.Add(r6520Code)
+    elif (evidence.sepsisCode is not None or evidence.r6520Code is not None) and evidence.r6521Code is None and ODS >= 2 and (SSI >= 1 or evidence.r579Code is not None):
+        if evidence.sepsisCode is not None: dc.Links.Add(evidence.sepsisCode)
+        if evidence.r579Code is not None: dc.Links.Add(evidence.r579Code)
+        if evidence.r6520Code is not None: dc.Links.Add(evidence.r6520Code)
         result.Subtitle = "Possible Severe Sepsis with Septic Shock present"
         AlertPassed = True
      
     else:
-        db.LogEvaluationScriptMessage("Not enough data to warrent alert, Alert Failed. " + str(account._id), scriptName, scriptInstance, "Debug")
+        scriptLog.debug("Not enough data to warrent alert, Alert Failed. %s", account._id)
         result.Passed = False
 
 else:
-    db.LogEvaluationScriptMessage("Alert Closed; Exiting script run. Outcome: " + str(outcome) + " " + str(account._id), scriptName, scriptInstance, "Debug")
+    scriptLog.debug("Alert Closed; Exiting script run. Outcome: %s %s", outcome, account._id)
 
 #If an alert triggered abstract the following
 if AlertPassed:
     #Organ Dysfunction Sign Abstractions
-    if g9341Code is not None: organ.Links.Add(g9341Code)
-    if acuteHeartFailure is not None: organ.Links.Add(acuteHeartFailure)
-    if acuteKidneyFailure is not None: organ.Links.Add(acuteKidneyFailure)
-    if acuteLiverFailure is not None: organ.Links.Add(acuteLiverFailure)
-    if i21aCode is not None: organ.Links.Add(i21aCode)
-    if acuteRespiratroyFailure is not None: organ.Links.Add(acuteRespiratroyFailure)
-    if r4182Code is not None: organ.Links.Add(r4182Code)
-    if alteredAbs is not None: organ.Links.Add(alteredAbs)
-    if lowBloodPressureAbs is not None: organ.Links.Add(lowBloodPressureAbs)
-    if r410Code is not None: organ.Links.Add(r410Code)
-    if glasgowComaScoreDV is not None: organ.Links.Add(glasgowComaScoreDV)
-    if lowMeanArterialBloodPressureDV is not None: organ.Links.Add(lowMeanArterialBloodPressureDV)
-    if pa02DV is not None: organ.Links.Add(pa02DV)
-    if p02fio2DV is not None: organ.Links.Add(p02fio2DV)
-    if lowPlateletCountDV is not None: organ.Links.Add(lowPlateletCountDV)
-    if highSerumBilirubinDV is not None: organ.Links.Add(highSerumBilirubinDV)
-    if highSerumCreatinineDV is not None: organ.Links.Add(highSerumCreatinineDV)
+    if evidence.g9341Code is not None: organ.Links.Add(evidence.g9341Code)
+    if evidence.acuteHeartFailure is not None: organ.Links.Add(evidence.acuteHeartFailure)
+    if evidence.acuteKidneyFailure is not None: organ.Links.Add(evidence.acuteKidneyFailure)
+    if evidence.acuteLiverFailure is not None: organ.Links.Add(evidence.acuteLiverFailure)
+    if evidence.i21aCode is not None: organ.Links.Add(evidence.i21aCode)
+    if evidence.acuteRespiratroyFailure is not None: organ.Links.Add(evidence.acuteRespiratroyFailure)
+    if evidence.r4182Code is not None: organ.Links.Add(evidence.r4182Code)
+    if evidence.alteredAbs is not None: organ.Links.Add(evidence.alteredAbs)
+    if evidence.lowBloodPressureAbs is not None: organ.Links.Add(evidence.lowBloodPressureAbs)
+    if evidence.r410Code is not None: organ.Links.Add(evidence.r410Code)
+    if evidence.glasgowComaScoreDV is not None: organ.Links.Add(evidence.glasgowComaScoreDV)
+    if evidence.lowMeanArterialBloodPressureDV is not None: organ.Links.Add(evidence.lowMeanArterialBloodPressureDV)
+    if evidence.pa02DV is not None: organ.Links.Add(evidence.pa02DV)
+    if evidence.p02fio2DV is not None: organ.Links.Add(evidence.p02fio2DV)
+    if evidence.lowPlateletCountDV is not None: organ.Links.Add(evidence.lowPlateletCountDV)
+    if evidence.highSerumBilirubinDV is not None: organ.Links.Add(evidence.highSerumBilirubinDV)
+    if evidence.highSerumCreatinineDV is not None: organ.Links.Add(evidence.highSerumCreatinineDV)
     if highSerumLactate2DV is not None: 
         for entry in highSerumLactate2DV:
             lactateODS.Links.Add(entry) #12
     if highPOCLactate2DV is not None: 
         for entry in highPOCLactate2DV:
             lactateODS.Links.Add(entry) #12
-    if spO2DV is not None: organ.Links.Add(spO2DV)
-    if lowSystolicBloodPressureDV is not None: organ.Links.Add(lowSystolicBloodPressureDV)
-    if lowUrineOutputAbs is not None: organ.Links.Add(lowUrineOutputAbs)
+    if evidence.spO2DV is not None: organ.Links.Add(evidence.spO2DV)
+    if evidence.lowSystolicBloodPressureDV is not None: organ.Links.Add(evidence.lowSystolicBloodPressureDV)
+    if evidence.lowUrineOutputAbs is not None: organ.Links.Add(evidence.lowUrineOutputAbs)
     #Septic Shock Indicator abstractions
     if highSerumLactate4DV is not None: 
         for entry in highSerumLactate4DV:
@@ -806,7 +590,7 @@ if AlertPassed:
     if levophed is not None: meds.Links.Add(levophed)
     if milrinone is not None: meds.Links.Add(milrinone)
     if neosynephrine is not None: meds.Links.Add(neosynephrine)
-    if vasoactiveMedicationAbs is not None: meds.Links.Add(vasoactiveMedicationAbs)
+    if evidence.vasoactiveMedicationAbs is not None: meds.Links.Add(evidence.vasoactiveMedicationAbs)
     if vasopressin is not None: meds.Links.Add(vasopressin)
 
 #If alert passed or alert conditions was triggered add categories to result if they have links
@@ -819,7 +603,9 @@ if AlertPassed or AlertConditions:
     if meds.Links: medsLinks = True
     if septic.Links: result.Links.Add(septic); septicLinks = True
     result.Links.Add(other)
-    db.LogEvaluationScriptMessage("Alert Passed Adding Links. Alert Triggered: " + str(result.Subtitle) + " Autoresolved: " + str(result.Outcome) + "; " +
-        str(result.Validated) + "; Links: Documented Dx- " + str(dcLinks) + ", Organ- " + str(organLinks) + ", meds- "
-        + str(medsLinks) + ", septic- " + str(septicLinks) + "; Acct: " + str(account._id), scriptName, scriptInstance, "Debug")
+    scriptLog.debug("Alert Passed Adding Links. Alert Triggered: %s Autoresolved: %s; %s; Links: Documented Dx- %s, Organ- %s, meds- %s, septic- %s; Acct: %s",
+        result.Subtitle, result.Outcome, result.Validated, dcLinks, organLinks, medsLinks, septicLinks, account._id)
     result.Passed = True
+
+#Write out this run's script messages
+scriptLog.flush()
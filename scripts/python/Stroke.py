@@ -28,6 +28,7 @@ from System.Data import *
 from System.Configuration import *
 from System.Collections.Generic import *
 clr.ImportExtensions(System.Linq)
+from cdi import Evidence, evaluation_context
 from operator import le, ge, gt, lt
 
 #========================================
@@ -142,14 +143,20 @@ autoEvidenceText = "Autoresolved Evidence - "
 #  Globals
 #========================================
 db = CACDataRepository()
+#Account data is loaded once and shared by every script run for the account,
+#fetching only the discrete values of the last 7 days
+context = evaluation_context(account, db, System.DateTime.Now.AddDays(-7))
+#Script messages are only formatted when their level is enabled, and are written
+#together at the end of the run
+scriptLog = context.log(db, scriptName, scriptInstance)
 admitDate = account.AdmitDateTime.Date
 birthDate = account.Patient.BirthDate.Date
 gender = account.Patient.Gender
 #Update true = External DV collection False = On Acct Record
-accountContainer = AccountWorkflowContainer(account, False, "Category", 7)
+accountContainer = context.container(AccountWorkflowContainer, False, "Category", 7)
 useSeperateDiscreteCollection = False
 if useSeperateDiscreteCollection == True:
-    discreteValues = db.GetDiscreteValues(account._id)
+    discreteValues = context.discrete_values
 else:
     discreteValues = db.GetAccountField(account._id, "DiscreteValues")
 
@@ -166,19 +173,9 @@ calcSBP1 = lambda x: x > 180
 #========================================
 #  Functions
 #========================================
-def datetimeFromUtcToLocal(utc_datetime):
-    if utc_datetime:
-        convertedDate = DateTime.SpecifyKind(utc_datetime, DateTimeKind.Utc)
-        return  convertedDate.ToLocalTime()
-    else:
-        return None
-
-def cleanNumbers(result):
-    result1 = re.sub("[\\<\\>]", "", str(result))
-    if result1.count('.') <= 1 and result1.replace(".", "").isnumeric():
-        return result1
-    else:
-        return None
+#The helpers every script shares are compiled once per process and bound to this
+#script's globals, see cdi.helpers; a helper defined below replaces the shared one
+context.bind_helpers(globals(), 1)
 
 def dataConversion(datetime, linkText, Result, id, category, sequence, abstract=True, gender=None):
     date_time = datetimeFromUtcToLocal(datetime)
@@ -193,165 +190,10 @@ def dataConversion(datetime, linkText, Result, id, category, sequence, abstract=
         return abstraction
     return
 
-def CodeCount(codes):
-    # Get list of codes on the acct based on CodeDic
-    result = set()
-    for document in account.Documents or []:
-        for codeReference in document.CodeReferences or []:
-            if codeReference.Code in codes:
-                matching_code = codeReference.Code
-                result.add(matching_code)
-    return list(result)
-
-def abstractValue(abstraction_name, link_text, calculation, sequence=0, category=None, abstract=False):
-    # Find abstraction and if abstract is true abstract it to the provided category
-    abstraction = accountContainer.GetFirstLinkMatchingAbstractionValue(abstraction_name, link_text, lambda x: calculation)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def dvValue(dv_name, link_text, calculation, sequence=0, category=None, abstract=False):
-    # Find Discrete Value and if abstract is true abstract it to the provided category
-    for dv in dv_name:
-        abstraction = accountContainer.GetFirstLinkMatchingDiscreteValue(dv, link_text, calculation)
-        if abstraction is not None:
-            break
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def dvValueMulti(dvDic, DV1, linkText, value, sign, sequence=0, category=None, abstract=False, needed=2):
-    # Find Discrete Value and if abstract is true abstract it to the provided category
-    matchedList = []
-    x = 0
-    for dv in dvDic or []:
-        dvr = cleanNumbers(dvDic[dv]['Result'])
-        if dvDic[dv]['Name'] in DV1 and dvr is not None and sign(float(dvr), float(value)):
-            matchedList.append(dataConversion(dvDic[dv]['ResultDate'], linkText, dvDic[dv]['Result'], dvDic[dv]['UniqueId'] or dvDic[dv]['_id'], category, sequence, abstract))
-            x += 1
-            if needed <= x:
-                break
-    if abstract and x > 0:
-        return True
-    elif abstract is False and len(matchedList) > 0 and needed > 0:
-        return matchedList
-    else:
-        return None
-
-def compareValuesMulti(dvDic, DV1, value, value1, linkText, sign, sign1, sequence=0, category=None, abstract=False, needed=2):
-    matchedList = []
-    x = 0
-    for dv in dvDic or []:
-        dvr = cleanNumbers(dvDic[dv]['Result'])
-        if dvDic[dv]['Name'] in DV1 and dvr is not None and sign(float(value), float(dvr)) and sign1(float(dvr), float(value1)):
-            matchedList.append(dataConversion(dvDic[dv]['ResultDate'], linkText, dvDic[dv]['Result'], dvDic[dv]['UniqueId'] or dvDic[dv]['_id'], category, sequence, abstract))
-            x += 1
-            if needed <= x:
-                break
-    if abstract and x > 0:
-        return True
-    elif abstract is False and len(matchedList) > 0 and needed > 0:
-        return matchedList
-    else:
-        return None
-
-def codeValue(code_name, link_text, sequence=0, category=None, abstract=False):
-    # Find code and if abstract is true abstract it to the provided category
-    abstraction = accountContainer.GetFirstCodeLink(code_name, link_text)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def multiCodeValue(code_list, link_text, sequence=0, category=None, abstract=False):
-    # Go through Code List and find first code and if abstract is true abstract it to the provided category
-    abstraction = None
-    for code in code_list:
-        abstraction = accountContainer.GetFirstCodeLink(code, link_text)
-        if abstraction is not None:
-            abstraction.Sequence = sequence
-            if abstract:
-                category.Links.Add(abstraction)
-                return True
-            else:
-                return abstraction
-    if abstract and abstraction is None:
-        return False
-    return abstraction
-
-def prefixCodeValue(prefix, link_text, sequence=0, category=None, abstract=False):
-    # Use prefix to find first code match based on regex search and if abstract is true abstract it to the provided category
-    abstraction = None
-    validCodes = [codes for codes in accountContainer.CodeKeys if re.match(prefix, codes) is not None]
-    for code in validCodes:
-        abstraction = accountContainer.GetFirstCodeLink(code, link_text)
-        if abstraction is not None:
-            abstraction.Sequence = sequence
-            if abstract:
-                category.Links.Add(abstraction)
-                return True
-            else:
-                return abstraction
-    if abstract and abstraction is None:
-        return False
-    return abstraction
-
-def medValue(med_name, link_text, sequence=0, category=None, abstract=False):
-    # Find Medication Value and if abstract is true abstract it to the provided category
-    abstraction = accountContainer.GetFirstMedicationLink(med_name, link_text)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def updateLinkText(value, replacement_text):
-    # Update the link text with the provided text
-    value.LinkText = replacement_text + value.LinkText
-    return value
-
-def documentLink(DocumentType, LinkText, sequence, category, abstract):
-    # Finds a document link and adds it as link so that its a quick reference for the cdi user.
-    abstraction = None
-    abstraction = accountContainer.GetFirstDocumentLink(DocumentType, LinkText)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    return None
-
 #========================================
 #  Algorithm
 #========================================
-db.LogEvaluationScriptMessage("Script starting " + str(account._id), scriptName, scriptInstance, "Debug")
+scriptLog.debug("Script starting %s", account._id)
 #Determine if if and how many fully spec codes are on the acct
 codes = []
 codes = codeDic.keys()
@@ -397,21 +239,22 @@ for alert in account.MatchedCriteriaGroups or []:
 #Check if alert was autoresolved or completed.
 if validated is False:
     #Alert Triggers
-    hemorrhagicStrokeCode = multiCodeValue(["I61.2", "I61.8", "I61.9"], "Unspecified Hemorrhagic Stroke Dx Missing Location: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    cerebralInfarctionCodes = multiCodeValue(["I63.51", "I63.511", "I63.512", "I63.513", "I63.521", "I63.522", "I63.523", "I63.531",
+    evidence = Evidence()
+    evidence.define("hemorrhagicStrokeCode", multiCodeValue, ["I61.2", "I61.8", "I61.9"], "Unspecified Hemorrhagic Stroke Dx Missing Location: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("cerebralInfarctionCodes", multiCodeValue, ["I63.51", "I63.511", "I63.512", "I63.513", "I63.521", "I63.522", "I63.523", "I63.531",
                                         "I63.532", "I63.533", "I63.541", "I63.542", "I63.543", "I63.50", "I63.519", "I63.529", "I63.539", "I63.549", "I63.59", "I63.81",
                                         "I63.81", "I63.89", "I63.9", "I63.00", "I63.019", "I63.039", "I63.30", "I63.319", "I63.329", "I63.339", "I63.349", "I63.39",
                                         "I63.40", "I63.419", "I63.429", "I63.439", "I63.449", "I63.49", "I63.09"],
                                         "Cerebral Infarction Codes: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    g649Code = codeValue("G64.9", "TIA: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    cerebralIschemiaAbs = abstractValue("CEREBRAL_ISCHEMIA", "Cerebral Ischemia: [ABSTRACTVALUE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True)
-    cerebralInfarctionAbs = abstractValue("CEREBRAL_INFARCTION", "Cerebral Infarction: [ABSTRACTVALUE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True)
+    evidence.define("g649Code", codeValue, "G64.9", "TIA: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("cerebralIschemiaAbs", abstractValue, "CEREBRAL_ISCHEMIA", "Cerebral Ischemia: [ABSTRACTVALUE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True)
+    evidence.define("cerebralInfarctionAbs", abstractValue, "CEREBRAL_INFARCTION", "Cerebral Infarction: [ABSTRACTVALUE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True)
     #Abs
-    abortedStrokeAbs = abstractValue("ABORTED_STROKE", "Aborted Stroke: [ABSTRACTVALUE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 1)
+    evidence.define("abortedStrokeAbs", abstractValue, "ABORTED_STROKE", "Aborted Stroke: [ABSTRACTVALUE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 1)
     
     #Starting Main Algorithm
     if codesExist > 0:
-        db.LogEvaluationScriptMessage("One specific code was on the chart, alert failed. " + str(account._id), scriptName, scriptInstance, "Debug")
+        scriptLog.debug("One specific code was on the chart, alert failed. %s", account._id)
         if alertTriggered:
             for code in codeList:
                 desc = codeDic[code]
@@ -425,37 +268,37 @@ if validated is False:
             AlertConditions = True
         else: result.Passed = False
         
-    if cerebralInfarctionCodes is not None and (subtitle == "TIA documented Possible Cerebral Infarction seek Clarification" or subtitle == "Possible Cerebral Infarction"):
-        dc.Links.Add(cerebralInfarctionCodes)
+    if evidence.cerebralInfarctionCodes is not None and (subtitle == "TIA documented Possible Cerebral Infarction seek Clarification" or subtitle == "Possible Cerebral Infarction"):
+        dc.Links.Add(evidence.cerebralInfarctionCodes)
         result.Outcome = "AUTORESOLVED"
         result.Reason = "Autoresolved due to one Specified Code on the Account"
         result.Validated = True
         AlertConditions = True
     
-    elif g649Code is not None and cerebralInfarctionCodes is None and (cerebralInfarctionAbs is not None or cerebralIschemiaAbs is not None or abortedStrokeAbs is not None):
-        dc.Links.Add(g649Code)
-        if cerebralInfarctionAbs is not None: dc.Links.Add(cerebralInfarctionAbs)
-        if cerebralIschemiaAbs is not None: dc.Links.Add(cerebralIschemiaAbs)
+    elif evidence.g649Code is not None and evidence.cerebralInfarctionCodes is None and (evidence.cerebralInfarctionAbs is not None or evidence.cerebralIschemiaAbs is not None or evidence.abortedStrokeAbs is not None):
+        dc.Links.Add(evidence.g649Code)
+        if evidence.cerebralInfarctionAbs is not None: dc.Links.Add(evidence.cerebralInfarctionAbs)
+        if evidence.cerebralIschemiaAbs is not None: dc.Links.Add(evidence.cerebralIschemiaAbs)
         result.Subtitle = "TIA documented Possible Cerebral Infarction seek Clarification"
         AlertPassed = True
     
-    elif cerebralInfarctionCodes is None and (cerebralInfarctionAbs is not None or cerebralIschemiaAbs is not None):
-        if cerebralInfarctionAbs is not None: dc.Links.Add(cerebralInfarctionAbs)
-        if cerebralIschemiaAbs is not None: dc.Links.Add(cerebralIschemiaAbs)
+    elif evidence.cerebralInfarctionCodes is None and (evidence.cerebralInfarctionAbs is not None or evidence.cerebralIschemiaAbs is not None):
+        if evidence.cerebralInfarctionAbs is not None: dc.Links.Add(evidence.cerebralInfarctionAbs)
+        if evidence.cerebralIschemiaAbs is not None: dc.Links.Add(evidence.cerebralIschemiaAbs)
         result.Subtitle = "Possible Cerebral Infarction"
         AlertPassed = True
 
     else:
-        db.LogEvaluationScriptMessage("Not enough data to warrent alert, Alert Failed. " + str(account._id), scriptName, scriptInstance, "Debug")
+        scriptLog.debug("Not enough data to warrent alert, Alert Failed. %s", account._id)
         result.Passed = False
 
 else:
-    db.LogEvaluationScriptMessage("Alert Closed; Exiting script run. Outcome: " + str(outcome) + " " + str(account._id), scriptName, scriptInstance, "Debug")
+    scriptLog.debug("Alert Closed; Exiting script run. Outcome: %s %s", outcome, account._id)
 
 #If an alert triggered abstract the following
 if AlertPassed:
     #Abs
-    if abortedStrokeAbs is not None: abs.Links.Add(abortedStrokeAbs) #1
+    if evidence.abortedStrokeAbs is not None: abs.Links.Add(evidence.abortedStrokeAbs) #1
     codeValue("R47.01", "Aphasia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 2, abs, True)
     abstractValue("ATAXIA", "Ataxia '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 3, abs, True)
     multiCodeValue(["I48.0", "I48.1", "I48.11", "I48.19", "I48.20", "I48.21", "I48.91"], "Atrial Fibrillation: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 4, abs, True)
@@ -609,7 +452,9 @@ if AlertPassed or AlertConditions:
     if mriBrainLinks.Links: result.Links.Add(mriBrainLinks); docLinksLinks = True
     if ctBrainLinks.Links: result.Links.Add(ctBrainLinks); docLinksLinks = True
     result.Links.Add(other)
-    db.LogEvaluationScriptMessage("Alert Passed Adding Links. Alert Triggered: " + str(result.Subtitle) + " Autoresolved: " + str(result.Outcome) + "; " +
-        str(result.Validated) + "; Links: Documentation Dx- " + str(dcLinks) + ", Abs- " + str(absLinks) + ", vitals- " + str(vitalsLinks) + ", meds- " + str(medsLinks) + ", Proc- " + str(procLinks) + ", contri- "
-        + str(contri) + ", docs- " + str(docLinksLinks) + "; Acct: " + str(account._id), scriptName, scriptInstance, "Debug")
+    scriptLog.debug("Alert Passed Adding Links. Alert Triggered: %s Autoresolved: %s; %s; Links: Documentation Dx- %s, Abs- %s, vitals- %s, meds- %s, Proc- %s, contri- %s, docs- %s; Acct: %s",
+        result.Subtitle, result.Outcome, result.Validated, dcLinks, absLinks, vitalsLinks, medsLinks, procLinks, contri, docLinksLinks, account._id)
     result.Passed = True
+
+#Write out this run's script messages
+scriptLog.flush()
@@ -28,6 +28,7 @@ from System.Data import *
 from System.Configuration import *
 from System.Collections.Generic import *
 clr.ImportExtensions(System.Linq)
+from cdi import Evidence, evaluation_context
 from operator import le, ge, gt, lt
 
 #========================================
@@ -76,14 +77,20 @@ autoCodeText = "Autoresolved Code - "
 #  Globals
 #========================================
 db = CACDataRepository()
+#Account data is loaded once and shared by every script run for the account,
+#fetching only the discrete values of the last 7 days
+context = evaluation_context(account, db, System.DateTime.Now.AddDays(-7))
+#Script messages are only formatted when their level is enabled, and are written
+#together at the end of the run
+scriptLog = context.log(db, scriptName, scriptInstance)
 admitDate = account.AdmitDateTime.Date
 birthDate = account.Patient.BirthDate.Date
 gender = account.Patient.Gender
 #Update true = External DV collection False = On Acct Record
-accountContainer = AccountWorkflowContainer(account, True, "Category", 7)
+accountContainer = context.container(AccountWorkflowContainer, True, "Category", 7)
 useSeperateDiscreteCollection = True
 if useSeperateDiscreteCollection == True:
-    discreteValues = db.GetDiscreteValues(account._id)
+    discreteValues = context.discrete_values
 else:
     discreteValues = db.GetAccountField(account._id, "DiscreteValues")
 
@@ -96,193 +103,9 @@ calcCIWAScore1 = lambda x: x > 9
 #========================================
 #  Functions
 #========================================
-def datetimeFromUtcToLocal(utc_datetime):
-    if utc_datetime:
-        convertedDate = DateTime.SpecifyKind(utc_datetime, DateTimeKind.Utc)
-        return  convertedDate.ToLocalTime()
-    else:
-        return None
-
-def cleanNumbers(result):
-    result1 = re.sub("[\\<\\>]", "", str(result))
-    if result1.count('.') <= 1 and result1.replace(".", "").isnumeric():
-        return result1
-    else:
-        return None
-
-def dataConversion(datetime, linkText, Result, id, category, sequence, abstract=True, gender=None):
-    if datetime is not None:
-        date_time = datetimeFromUtcToLocal(datetime)
-        date_time = date_time.ToString("MM/dd/yyyy, HH:mm")
-        linkText = linkText.replace("[RESULTDATETIME]", date_time)
-    else: 
-        linkText = linkText.replace("(Result Date: [RESULTDATETIME])", "")
-    if Result is not None:
-        linkText = linkText.replace("[VALUE]", Result)
-    else: linkText = linkText.replace("[VALUE]", "")
-    if gender: linkText = linkText.replace("[GENDER]", gender)
-    else: linkText = linkText.replace("[GENDER]", "")
-    if abstract == True:
-        category.Links.Add(MatchedCriteriaLink(linkText, None, None, id, True, None, None, sequence))
-    elif abstract == False:
-        abstraction = MatchedCriteriaLink(linkText, None, None, id, True, None, None, sequence)
-        return abstraction
-    return
-
-def CodeCount(codes):
-    # Get list of codes on the acct based on CodeDic
-    result = set()
-    for document in account.Documents or []:
-        for codeReference in document.CodeReferences or []:
-            if codeReference.Code in codes:
-                matching_code = codeReference.Code
-                result.add(matching_code)
-    return list(result)
-
-def abstractValue(abstraction_name, link_text, calculation, sequence=0, category=None, abstract=False):
-    # Find abstraction and if abstract is true abstract it to the provided category
-    abstraction = accountContainer.GetFirstLinkMatchingAbstractionValue(abstraction_name, link_text, lambda x: calculation)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def dvValue(dv_name, link_text, calculation, sequence=0, category=None, abstract=False):
-    # Find Discrete Value and if abstract is true abstract it to the provided category
-    for dv in dv_name:
-        abstraction = accountContainer.GetFirstLinkMatchingDiscreteValue(dv, link_text, calculation)
-        if abstraction is not None:
-            break
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def dvValueMulti(dvDic, DV1, linkText, value, sign, sequence=0, category=None, abstract=False, needed=2):
-    # Find Discrete Value and if abstract is true abstract it to the provided category
-    matchedList = []
-    x = 0
-    for dv in dvDic or []:
-        dvr = cleanNumbers(dvDic[dv]['Result'])
-        if dvDic[dv]['Name'] in DV1 and dvr is not None and sign(float(dvr), float(value)):
-            matchedList.append(dataConversion(dvDic[dv]['ResultDate'], linkText, dvDic[dv]['Result'], dvDic[dv]['UniqueId'] or dvDic[dv]['_id'], category, sequence, abstract))
-            x += 1
-            if needed <= x:
-                break
-    if abstract and x > 0:
-        return True
-    elif abstract is False and len(matchedList) > 0 and needed > 0:
-        return matchedList
-    else:
-        return None
-
-def compareValuesMulti(dvDic, DV1, value, value1, linkText, sign, sign1, sequence=0, category=None, abstract=False, needed=2):
-    matchedList = []
-    x = 0
-    for dv in dvDic or []:
-        dvr = cleanNumbers(dvDic[dv]['Result'])
-        if dvDic[dv]['Name'] in DV1 and dvr is not None and sign(float(value), float(dvr)) and sign1(float(dvr), float(value1)):
-            matchedList.append(dataConversion(dvDic[dv]['ResultDate'], linkText, dvDic[dv]['Result'], dvDic[dv]['UniqueId'] or dvDic[dv]['_id'], category, sequence, abstract))
-            x += 1
-            if needed <= x:
-                break
-    if abstract and x > 0:
-        return True
-    elif abstract is False and len(matchedList) > 0 and needed > 0:
-        return matchedList
-    else:
-        return None
-
-def codeValue(code_name, link_text, sequence=0, category=None, abstract=False):
-    # Find code and if abstract is true abstract it to the provided category
-    abstraction = accountContainer.GetFirstCodeLink(code_name, link_text)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def multiCodeValue(code_list, link_text, sequence=0, category=None, abstract=False):
-    # Go through Code List and find first code and if abstract is true abstract it to the provided category
-    abstraction = None
-    for code in code_list:
-        abstraction = accountContainer.GetFirstCodeLink(code, link_text)
-        if abstraction is not None:
-            abstraction.Sequence = sequence
-            if abstract:
-                category.Links.Add(abstraction)
-                return True
-            else:
-                return abstraction
-    if abstract and abstraction is None:
-        return False
-    return abstraction
-
-def prefixCodeValue(prefix, link_text, sequence=0, category=None, abstract=False):
-    # Use prefix to find first code match based on regex search and if abstract is true abstract it to the provided category
-    abstraction = None
-    validCodes = [codes for codes in accountContainer.CodeKeys if re.match(prefix, codes) is not None]
-    for code in validCodes:
-        abstraction = accountContainer.GetFirstCodeLink(code, link_text)
-        if abstraction is not None:
-            abstraction.Sequence = sequence
-            if abstract:
-                category.Links.Add(abstraction)
-                return True
-            else:
-                return abstraction
-    if abstract and abstraction is None:
-        return False
-    return abstraction
-
-def medValue(med_name, link_text, sequence=0, category=None, abstract=False):
-    # Find Medication Value and if abstract is true abstract it to the provided category
-    abstraction = accountContainer.GetFirstMedicationLink(med_name, link_text)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def updateLinkText(value, replacement_text):
-    # Update the link text with the provided text
-    value.LinkText = replacement_text + value.LinkText
-    return value
-
-def documentLink(DocumentType, LinkText, sequence, category, abstract):
-    # Finds a document link and adds it as link so that its a quick reference for the cdi user.
-    abstraction = None
-    abstraction = accountContainer.GetFirstDocumentLink(DocumentType, LinkText)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    return None
+#The helpers every script shares are compiled once per process and bound to this
+#script's globals, see cdi.helpers; a helper defined below replaces the shared one
+context.bind_helpers(globals(), 1)
 
 #========================================
 #  Script Specific Functions
@@ -329,16 +152,15 @@ def medValueMulti(medDic, DV1, linkText, sequence=0, category=None, abstract=Fal
 #========================================
 #  Algorithm
 #========================================
-db.LogEvaluationScriptMessage("Script starting " + str(account._id), scriptName, scriptInstance, "Debug")
+scriptLog.debug("Script starting %s", account._id)
 #Determine if if and how many fully spec codes are on the acct
 opioidCodes = []
 opioidCodes = opioidCodeDic.keys()
-opioidCodeList = CodeCount(opioidCodes)
-opioidCodesExist = len(opioidCodeList)
-str1 = ', '.join([str(elem) for elem in opioidCodeList])
 alcoholCodes = []
 alcoholCodes = alcoholCodeDic.keys()
-alcoholCodeList = CodeCount(alcoholCodes)
+opioidCodeList, alcoholCodeList = CodeCounts(opioidCodes, alcoholCodes)
+opioidCodesExist = len(opioidCodeList)
+str1 = ', '.join([str(elem) for elem in opioidCodeList])
 alcoholCodesExist = len(alcoholCodeList)
 str1 = ', '.join([str(elem) for elem in alcoholCodeList])
 
@@ -374,42 +196,33 @@ for alert in account.MatchedCriteriaGroups or []:
 #Check if alert was autoresolved or completed.
 if validated is False:
     #Get meds within last X days
-    mainMedDic = {}
-    unsortedMedDic = {}
-    medCount = 0
     #Combine all items into one list to search against
     medSearchList = ["Methadone"]
     #Set datelimit for how far back to 
     medDateLimit = System.DateTime.Now.AddDays(-7)
-    #Loop through all meds finding any that match in the combined list adding to a dictionary the matches
-    if 'Medications' in account:    
-        for med in account.Medications:
-            if med.StartDate >= medDateLimit and 'CDIAlertCategory' in med and med.CDIAlertCategory is not None:
-                if any(item == med.CDIAlertCategory for item in medSearchList):
-                    medCount += 1
-                    unsortedMedDic[medCount] = med
-    #Sort List by latest
-    mainMedDic = sorted(unsortedMedDic.items(), key=lambda x: x[1]['StartDate'], reverse=True)
+    #Collect matching meds, sorted by latest
+    mainMedDic = context.medications(medSearchList, medDateLimit, "CDIAlertCategory")
     
     #General Subtitle Declaration
     opioidSub = "Possible Opioid Dependence"
     alcoholSub = "Possible Alcohol Withdrawal"
     #Negation
-    f1120Code = codeValue("F11.20", "Opioid Dependence: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 0)
+    evidence = Evidence()
+    evidence.define("f1120Code", codeValue, "F11.20", "Opioid Dependence: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 0)
     #Abs
-    ciwaScoreDV = dvValue(dvCIWAScore, "CIWA Score: [VALUE] (Result Date: [RESULTDATETIME])", calcCIWAScore1, 5)
-    ciwaScoreAbs = abstractValue("CIWA_SCORE", "CIWA Score: [ABSTRACTVALUE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 6)
-    ciwaProtocolAbs = abstractValue("CIWA_PROTOCOL", "CIWA Protocol: [ABSTRACTVALUE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 7)
-    methadoneClinicAbs = abstractValue("METHADONE_CLINIC", "Methadone Clinic: [ABSTRACTVALUE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 13)
+    evidence.define("ciwaScoreDV", dvValue, dvCIWAScore, "CIWA Score: [VALUE] (Result Date: [RESULTDATETIME])", calcCIWAScore1, 5)
+    evidence.define("ciwaScoreAbs", abstractValue, "CIWA_SCORE", "CIWA Score: [ABSTRACTVALUE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 6)
+    evidence.define("ciwaProtocolAbs", abstractValue, "CIWA_PROTOCOL", "CIWA Protocol: [ABSTRACTVALUE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 7)
+    evidence.define("methadoneClinicAbs", abstractValue, "METHADONE_CLINIC", "Methadone Clinic: [ABSTRACTVALUE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 13)
     #Meds
-    methadoneMed = medValueMulti(dict(mainMedDic), "Methadone", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 7, meds, False)
-    methadoneAbs = abstractValue("METHADONE", "Methadone: [ABSTRACTVALUE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 8)
-    suboxoneMed = medValue("Suboxone", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 11)
-    suboxoneAbs = abstractValue("SUBOXONE", "Suboxone: [ABSTRACTVALUE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 12)
+    methadoneMed = medValueMulti(mainMedDic, "Methadone", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 7, meds, False)
+    evidence.define("methadoneAbs", abstractValue, "METHADONE", "Methadone: [ABSTRACTVALUE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 8)
+    evidence.define("suboxoneMed", medValue, "Suboxone", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 11)
+    evidence.define("suboxoneAbs", abstractValue, "SUBOXONE", "Suboxone: [ABSTRACTVALUE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 12)
 
     #Algorithm
     if (alcoholCodesExist >= 1 and subtitle == alcoholSub) or (opioidCodesExist >= 1 and subtitle == opioidSub):
-        db.LogEvaluationScriptMessage("One specific code was on the chart, alert failed" + str(account._id), scriptName, scriptInstance, "Debug")
+        scriptLog.debug("One specific code was on the chart, alert failed%s", account._id)
         if alertTriggered:
             if subtitle == alcoholSub:
                 for code in alcoholCodeList:
@@ -431,16 +244,16 @@ if validated is False:
             AlertConditions = True
         else: result.Passed = False
 
-    elif opioidCodesExist == 0 and (len(methadoneMed or noLabs) > 1 or methadoneAbs is not None or suboxoneMed is not None or suboxoneAbs is not None or methadoneClinicAbs is not None):
+    elif opioidCodesExist == 0 and (len(methadoneMed or noLabs) > 1 or evidence.methadoneAbs is not None or evidence.suboxoneMed is not None or evidence.suboxoneAbs is not None or evidence.methadoneClinicAbs is not None):
         result.Subtitle = opioidSub
         AlertPassed = True
 
-    elif alcoholCodesExist == 0 and (ciwaScoreDV is not None or ciwaScoreAbs is not None or ciwaProtocolAbs is not None):
+    elif alcoholCodesExist == 0 and (evidence.ciwaScoreDV is not None or evidence.ciwaScoreAbs is not None or evidence.ciwaProtocolAbs is not None):
         result.Subtitle = alcoholSub
         AlertPassed = True
 
     else:
-        db.LogEvaluationScriptMessage("Not enough data to warrent alert, Alert Failed. " + str(account._id), scriptName, scriptInstance, "Debug")
+        scriptLog.debug("Not enough data to warrent alert, Alert Failed. %s", account._id)
         result.Passed = False
 
 #Alert Passed Abstractions
@@ -457,15 +270,15 @@ if AlertPassed:
     elif r4182Code is None and alteredAbs is not None:
         abs.Links.Add(alteredAbs)
     codeValue("R44.0", "Auditory Hallucinations: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 4, abs, True)
-    if ciwaScoreDV is not None: abs.Links.Add(ciwaScoreDV) #5
-    if ciwaScoreAbs is not None: abs.Links.Add(ciwaScoreAbs) #6
-    if ciwaProtocolAbs is not None: abs.Links.Add(ciwaProtocolAbs) #7
+    if evidence.ciwaScoreDV is not None: abs.Links.Add(evidence.ciwaScoreDV) #5
+    if evidence.ciwaScoreAbs is not None: abs.Links.Add(evidence.ciwaScoreAbs) #6
+    if evidence.ciwaProtocolAbs is not None: abs.Links.Add(evidence.ciwaProtocolAbs) #7
     abstractValue("COMBATIVE", "Combative '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 8, abs, True)
     abstractValue("DELIRIUM", "Delirum '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 9, abs, True)
     codeValue("R44.3", "Hallucinations: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 10, abs, True)
     codeValue("R51.9", "Headache: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 11, abs, True)
     codeValue("R45.4", "Irritability and Anger: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 12, abs, True)
-    if methadoneClinicAbs is not None: abs.Links.Add(methadoneClinicAbs) #13
+    if evidence.methadoneClinicAbs is not None: abs.Links.Add(evidence.methadoneClinicAbs) #13
     codeValue("R11.0", "Nausea: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 14, abs, True)
     codeValue("R45.0", "Nervousness: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 15, abs, True)
     abstractValue("ONE_TO_ONE_SUPERVISION", "One to one supervision: '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 16, abs, True)
@@ -485,11 +298,11 @@ if AlertPassed:
     if methadoneMed is not None:
         for med in methadoneMed:
             meds.Links.Add(med) #7
-    if methadoneAbs is not None: meds.Links.Add(methadoneAbs) #8
+    if evidence.methadoneAbs is not None: meds.Links.Add(evidence.methadoneAbs) #8
     medValue("Propofol", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 9, meds, True)
     abstractValue("PROPOFOL", "Propofol: [ABSTRACTVALUE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 10, meds, True)
-    if suboxoneMed is not None: meds.Links.Add(suboxoneMed) #11
-    if suboxoneAbs is not None: meds.Links.Add(suboxoneAbs) #12
+    if evidence.suboxoneMed is not None: meds.Links.Add(evidence.suboxoneMed) #11
+    if evidence.suboxoneAbs is not None: meds.Links.Add(evidence.suboxoneAbs) #12
     #Document Links
     documentLink("Pain Team Consultation Note", "Pain Team Consultation Note", 0, painLinks, True)
     documentLink("zzPain Team Consultation Note", "zzPain Team Consultation Note", 0, painLinks, True)
@@ -503,7 +316,9 @@ if AlertPassed or AlertConditions:
     if meds.Links: medsLinks = True
     if painLinks.Links: result.Links.Add(painLinks); docLinksLinks = True
     result.Links.Add(other)
-    db.LogEvaluationScriptMessage("Alert Passed Adding Links. Alert Triggered: " + str(result.Subtitle) + " Autoresolved: " + str(result.Outcome) + "; " +
-        str(result.Validated) + "; Links: Documented Dx- " + str(dcLinks) + ", Abs- " + str(absLinks) + ", meds- " + str(medsLinks) + ", docs- " + str(docLinksLinks) +
-        "; Acct: " + str(account._id), scriptName, scriptInstance, "Debug")
+    scriptLog.debug("Alert Passed Adding Links. Alert Triggered: %s Autoresolved: %s; %s; Links: Documented Dx- %s, Abs- %s, meds- %s, docs- %s; Acct: %s",
+        result.Subtitle, result.Outcome, result.Validated, dcLinks, absLinks, medsLinks, docLinksLinks, account._id)
     result.Passed = True
+
+#Write out this run's script messages
+scriptLog.flush()
@@ -0,0 +1,24 @@
+"""
+Shared support code for the Python CDI alert scripts in ``scripts/python``.
+"""
+
+from .context import EvaluationContext, evaluation_context
+from .discrete_values import DiscreteValueIndex
+from .evidence import Evidence
+from .joins import AsOfJoin, JoinRow, ResultDateJoin
+from .numeric import ParsedResult, clean_numbers, parse_result
+from .views import OrderedView
+
+__all__ = [
+    "AsOfJoin",
+    "DiscreteValueIndex",
+    "EvaluationContext",
+    "Evidence",
+    "JoinRow",
+    "OrderedView",
+    "ParsedResult",
+    "ResultDateJoin",
+    "clean_numbers",
+    "evaluation_context",
+    "parse_result",
+]
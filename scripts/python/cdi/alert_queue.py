@@ -0,0 +1,372 @@
+"""
+Local stand-ins for the alert queue and the evaluation results collection.
+
+The workflow script engine queues an account for the CDI alert engine by
+inserting ``{_id: account id, TimeQueued, Source}`` into the ``CdiAlertQueue``
+collection, and the engine saves each account's script results to
+``EvaluationResults``.  ``SQLiteAlertQueue`` and ``SQLiteResultStore`` keep
+the same shape in an SQLite file (or in memory), so the queue workers in
+``cdi.worker`` can be run and measured without Mongo.
+
+Claiming an entry leases it rather than removing it, so several workers can
+share one queue.  ``claim`` stamps the entries it returns with a fresh token
+and an expiry; while the lease lasts no other worker can claim them.  The
+worker keeps its leases alive with ``renew`` (a ``Heartbeat`` does this in
+the background), and once the results are written it ``complete``s the
+entries, which removes them.  A worker that dies simply stops renewing: its
+entries are claimable again when the leases expire, and the stale tokens it
+may still hold are refused by ``renew`` and ``complete``, so it cannot write
+over the work of whoever claimed them next.
+
+Every entry also has a priority class number, lower first; ``claim`` can be
+limited to one class, and ``waiting`` counts the entries of each, which is
+all ``cdi.priority.PriorityScheduler`` needs to share the workers between
+the classes.
+
+A queue is any object with the methods of ``AlertQueue``; a result store any
+object with ``upsert_many``.
+"""
+
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+
+DEFAULT_LEASE_SECONDS = 300
+
+
+class QueueEntry:
+    """
+    One queued account, oldest ``time_queued`` first.
+
+    ``token``, ``owner`` and ``lease_expires`` describe the lease of a
+    claimed entry; they and ``priority`` do not take part in comparisons.
+    """
+
+    __slots__ = ("account_id", "time_queued", "source", "priority", "token", "owner", "lease_expires")
+
+    def __init__(self, account_id, time_queued, source=None, priority=0, token=None, owner=None,
+                 lease_expires=None):
+        self.account_id = account_id
+        self.time_queued = time_queued
+        self.source = source
+        self.priority = priority
+        self.token = token
+        self.owner = owner
+        self.lease_expires = lease_expires
+
+    def __eq__(self, other):
+        if not isinstance(other, QueueEntry):
+            return NotImplemented
+        return (self.account_id, self.time_queued, self.source) == (other.account_id, other.time_queued, other.source)
+
+    def __repr__(self):
+        return "QueueEntry(%r, %r, %r)" % (self.account_id, self.time_queued, self.source)
+
+
+def default_owner():
+    """Return ``host:pid``, naming this worker in the leases it holds."""
+    return "%s:%d" % (socket.gethostname(), os.getpid())
+
+
+class AlertQueue:
+    """
+    The queue interface the workers use.
+
+    Tokens are the ``QueueEntry.token`` of claimed entries; methods taking
+    tokens return those that were still validly leased.
+    """
+
+    def enqueue(self, account_id, source="Workflow", time_queued=None, priority=0):
+        """Queue ``account_id``."""
+        self.enqueue_many([(account_id, source, time_queued, priority)])
+
+    def enqueue_many(self, entries):
+        """
+        Queue ``(account_id, source, time_queued)`` or ``(account_id, source,
+        time_queued, priority)`` entries; ``None`` times mean now and the
+        priority defaults to 0.
+        """
+        raise NotImplementedError
+
+    def claim(self, limit=1, owner=None, lease_seconds=None, priority=None):
+        """Lease and return up to ``limit`` of the oldest unleased entries, of one ``priority`` if given."""
+        raise NotImplementedError
+
+    def waiting(self):
+        """Return ``{priority: (entries, oldest time_queued)}`` of the unleased entries."""
+        raise NotImplementedError
+
+    def renew(self, tokens, lease_seconds=None):
+        """Extend the leases of ``tokens``."""
+        raise NotImplementedError
+
+    def complete(self, tokens):
+        """Finish the entries leased under ``tokens``."""
+        raise NotImplementedError
+
+    def release(self, tokens):
+        """Give up the leases of ``tokens`` without finishing the entries."""
+        raise NotImplementedError
+
+    def __len__(self):
+        raise NotImplementedError
+
+
+class SQLiteAlertQueue(AlertQueue):
+    """
+    The ``CdiAlertQueue`` collection in an SQLite database.
+
+    As in Mongo the account id is the key, so queueing an account that is
+    already waiting keeps the original entry and its place in line.  An
+    account queued again while it is being evaluated may have changed after
+    the evaluation read it, so completing that entry puts it back in line
+    instead of removing it.  Either way the entry keeps the more urgent of
+    its priorities.
+
+    :param path: The database file; ``":memory:"`` keeps the queue in memory.
+        Queues opened on the same file by several processes share it safely.
+    :param lease_seconds: Default lease length.
+    :param clock: Source of the current time in seconds, for tests.
+    """
+
+    def __init__(self, path=":memory:", lease_seconds=DEFAULT_LEASE_SECONDS, clock=time.time):
+        self.lease_seconds = lease_seconds
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS queue ("
+            " account_id TEXT PRIMARY KEY, time_queued REAL NOT NULL, source TEXT,"
+            " priority INTEGER NOT NULL DEFAULT 0,"
+            " token TEXT UNIQUE, owner TEXT, lease_expires REAL, requeued REAL)"
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS queue_time_queued ON queue (time_queued)")
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS queue_priority_time_queued ON queue (priority, time_queued)")
+
+    def enqueue_many(self, entries):
+        now = self.clock()
+        rows = []
+        for entry in entries:
+            account_id, source, time_queued = entry[:3]
+            priority = entry[3] if len(entry) > 3 else 0
+            rows.append((account_id, now if time_queued is None else time_queued, source, priority))
+        with self._transaction():
+            self._connection.executemany(
+                "INSERT INTO queue (account_id, time_queued, source, priority) VALUES (?, ?, ?, ?)"
+                " ON CONFLICT (account_id) DO UPDATE SET priority = MIN(priority, excluded.priority),"
+                " requeued = CASE WHEN token IS NULL THEN requeued ELSE excluded.time_queued END", rows)
+
+    def claim(self, limit=1, owner=None, lease_seconds=None, priority=None):
+        now = self.clock()
+        expires = now + (lease_seconds if lease_seconds is not None else self.lease_seconds)
+        owner = owner or default_owner()
+        query = "SELECT account_id, time_queued, source, priority FROM queue WHERE (token IS NULL OR lease_expires < ?)"
+        parameters = [now]
+        if priority is not None:
+            query += " AND priority = ?"
+            parameters.append(priority)
+        with self._transaction():
+            rows = self._connection.execute(
+                query + " ORDER BY time_queued, account_id LIMIT ?", parameters + [limit]).fetchall()
+            entries = [QueueEntry(account_id, time_queued, source, entry_priority, uuid.uuid4().hex, owner, expires)
+                       for account_id, time_queued, source, entry_priority in rows]
+            self._connection.executemany(
+                "UPDATE queue SET token = ?, owner = ?, lease_expires = ? WHERE account_id = ?",
+                [(entry.token, owner, expires, entry.account_id) for entry in entries])
+        return entries
+
+    def renew(self, tokens, lease_seconds=None):
+        now = self.clock()
+        expires = now + (lease_seconds if lease_seconds is not None else self.lease_seconds)
+        with self._transaction():
+            held = self._held(tokens, now)
+            self._connection.executemany(
+                "UPDATE queue SET lease_expires = ? WHERE token = ?", [(expires, token) for token in held])
+        return held
+
+    def complete(self, tokens):
+        with self._transaction():
+            held = self._held(tokens, self.clock())
+            self._connection.executemany(
+                "DELETE FROM queue WHERE token = ? AND requeued IS NULL", [(token,) for token in held])
+            self._connection.executemany(
+                "UPDATE queue SET time_queued = requeued, requeued = NULL,"
+                " token = NULL, owner = NULL, lease_expires = NULL WHERE token = ?",
+                [(token,) for token in held])
+        return held
+
+    def release(self, tokens):
+        with self._transaction():
+            held = self._held(tokens, self.clock())
+            self._connection.executemany(
+                "UPDATE queue SET time_queued = MIN(time_queued, COALESCE(requeued, time_queued)),"
+                " requeued = NULL, token = NULL, owner = NULL, lease_expires = NULL WHERE token = ?",
+                [(token,) for token in held])
+        return held
+
+    def waiting(self):
+        rows = self._connection.execute(
+            "SELECT priority, COUNT(*), MIN(time_queued) FROM queue"
+            " WHERE token IS NULL OR lease_expires < ? GROUP BY priority", (self.clock(),))
+        return dict((priority, (count, oldest)) for priority, count, oldest in rows.fetchall())
+
+    def leases(self):
+        """Return ``{account_id: (owner, lease_expires)}`` of the leased entries."""
+        rows = self._connection.execute("SELECT account_id, owner, lease_expires FROM queue WHERE token IS NOT NULL")
+        return dict((account_id, (owner, expires)) for account_id, owner, expires in rows.fetchall())
+
+    def _held(self, tokens, now):
+        # The tokens whose lease has not expired (and so was not taken over).
+        held = []
+        for token in tokens:
+            row = self._connection.execute(
+                "SELECT 1 FROM queue WHERE token = ? AND lease_expires >= ?", (token, now)).fetchone()
+            if row is not None:
+                held.append(token)
+        return held
+
+    def _transaction(self):
+        return _Transaction(self._connection, self._lock)
+
+    def close(self):
+        self._connection.close()
+
+    def __len__(self):
+        return self._connection.execute("SELECT COUNT(*) FROM queue").fetchone()[0]
+
+
+class _Transaction:
+    # BEGIN IMMEDIATE takes the write lock up front, so two processes
+    # claiming from one file never read the same rows; the thread lock does
+    # the same for threads sharing one connection.
+    def __init__(self, connection, lock=None):
+        self.connection = connection
+        self.lock = lock
+
+    def __enter__(self):
+        if self.lock is not None:
+            self.lock.acquire()
+        try:
+            self.connection.execute("BEGIN IMMEDIATE")
+        except Exception:
+            if self.lock is not None:
+                self.lock.release()
+            raise
+        return self.connection
+
+    def __exit__(self, kind, value, traceback):
+        try:
+            self.connection.execute("COMMIT" if kind is None else "ROLLBACK")
+        finally:
+            if self.lock is not None:
+                self.lock.release()
+        return False
+
+
+class Heartbeat:
+    """
+    Renews the leases a worker holds from a background thread.
+
+    ``hold`` the tokens of claimed entries and ``drop`` them once completed;
+    every ``interval`` seconds the held tokens are renewed.  Tokens whose
+    lease could not be renewed move to ``lost``: their entries may already
+    be claimed by another worker, so their results must not be written.
+
+    Use it as a context manager, or call ``beat`` yourself.
+    """
+
+    def __init__(self, queue, interval=None, lease_seconds=None):
+        self.queue = queue
+        self.lease_seconds = lease_seconds
+        if interval is None:
+            interval = (lease_seconds or getattr(queue, "lease_seconds", DEFAULT_LEASE_SECONDS)) / 3.0
+        self.interval = interval
+        self.lost = set()
+        self._held = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def hold(self, tokens):
+        with self._lock:
+            self._held.update(tokens)
+
+    def drop(self, tokens):
+        with self._lock:
+            self._held.difference_update(tokens)
+            self.lost.difference_update(tokens)
+
+    def beat(self):
+        """Renew every held token now."""
+        with self._lock:
+            tokens = list(self._held)
+        if not tokens:
+            return
+        renewed = set(self.queue.renew(tokens, self.lease_seconds))
+        with self._lock:
+            for token in tokens:
+                if token not in renewed and token in self._held:
+                    self._held.discard(token)
+                    self.lost.add(token)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.beat()
+
+    def __enter__(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="lease-heartbeat", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, kind, value, traceback):
+        self._stop.set()
+        self._thread.join()
+        return False
+
+
+class SQLiteResultStore:
+    """
+    The ``EvaluationResults`` collection in an SQLite database: one row per
+    account and script holding the result serialized by
+    ``memo.dump_result`` (``NULL`` when the script failed).
+
+    :param path: The database file; ``":memory:"`` keeps the results in memory.
+    :param clock: Source of the ``saved`` time in seconds, for tests.
+    """
+
+    def __init__(self, path=":memory:", clock=time.time):
+        self.clock = clock
+        self.writes = 0
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " account_id TEXT NOT NULL, script TEXT NOT NULL, result TEXT, saved REAL NOT NULL,"
+            " PRIMARY KEY (account_id, script))"
+        )
+
+    def upsert_many(self, rows):
+        """Insert or replace ``(account_id, script, result JSON)`` rows in one transaction."""
+        now = self.clock()
+        with _Transaction(self._connection, self._lock):
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO results (account_id, script, result, saved) VALUES (?, ?, ?, ?)",
+                [(account_id, script, result, now) for account_id, script, result in rows])
+        self.writes += 1
+
+    def results(self, account_id):
+        """Return ``{script: result JSON}`` saved for ``account_id``."""
+        rows = self._connection.execute(
+            "SELECT script, result FROM results WHERE account_id = ? ORDER BY script", (account_id,))
+        return dict(rows.fetchall())
+
+    def close(self):
+        self._connection.close()
+
+    def __len__(self):
+        return self._connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
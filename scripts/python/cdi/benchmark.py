@@ -0,0 +1,268 @@
+"""
+Offline benchmark of the alert scripts.
+
+Evaluates every script against a batch of ``cdi.synthetic`` accounts under
+the ``cdi.host`` stand-ins, the same way ``cdi.runner.run_account`` does, and
+reports throughput and latency distributions: per account (all scripts) and
+per script run.  The clock is pinned for the whole run, so a seed gives the
+same accounts and the same script work every time.
+
+``scaling`` instead runs each script against one account at a series of
+discrete value counts (100 to 100,000 by default, over a 60 day ICU stay)
+and fits how its time grows with the count; ``over_budget`` names the
+scripts growing faster than a given exponent, and those that raised, whose
+times say nothing about their growth.
+
+Run ``python -m cdi.benchmark --accounts 50`` for a table on stdout, with
+``-o report.json`` to keep the full report and ``--compact`` to hold the
+accounts in ``cdi.records`` records.  ``python -m cdi.benchmark
+--scaling --budget 1.3`` exits with status 1 when a script exceeds the
+budget.
+"""
+
+import argparse
+import datetime
+import json
+import math
+import sys
+import time
+
+from . import host
+from .runner import evaluating, load_script, run_logged, script_name, script_paths
+from .records import compact_account
+from .synthetic import FAMILIES, AccountProfile, Catalogue, generate
+from .timing import summarize
+
+
+def run(accounts, scripts, repeat=1, clock=time.perf_counter):
+    """
+    Evaluate ``scripts`` (paths or ``(name, code)`` pairs) for every account
+    ``repeat`` times and return the report.
+
+    :returns: ``{"accounts", "script_runs", "seconds", "throughput",
+        "account_latency", "scripts", "errors"}``; latencies are
+        ``timing.summarize`` dictionaries in seconds, ``errors`` counts the
+        runs of each script that raised.
+    """
+    compiled = [(script_name(script), load_script(script) if isinstance(script, str) else script[1])
+                for script in scripts]
+    per_script = dict((name, []) for name, _ in compiled)
+    errors = dict((name, 0) for name, _ in compiled)
+    per_account = []
+    for _ in range(repeat):
+        for account in accounts:
+            account_start = clock()
+            with evaluating(account) as context:
+                for name, code in compiled:
+                    start = clock()
+                    if run_logged(code, account, name, context.repository) is None:
+                        errors[name] += 1
+                    per_script[name].append(clock() - start)
+            per_account.append(clock() - account_start)
+    seconds = sum(per_account)
+    script_runs = sum(len(durations) for durations in per_script.values())
+    return {
+        "accounts": len(per_account),
+        "script_runs": script_runs,
+        "seconds": seconds,
+        "throughput": {
+            "accounts_per_second": len(per_account) / seconds if seconds else None,
+            "scripts_per_second": script_runs / seconds if seconds else None,
+        },
+        "account_latency": summarize(per_account),
+        "scripts": dict((name, summarize(durations)) for name, durations in per_script.items()),
+        "errors": dict((name, count) for name, count in errors.items() if count),
+    }
+
+
+DEFAULT_SIZES = (100, 1000, 10000, 100000)
+
+
+def fit_exponent(points):
+    """
+    Return the least-squares slope of log(seconds) against log(size) for
+    ``(size, seconds)`` points: about 1 for linear growth, 2 for quadratic.
+    ``None`` with fewer than two distinct sizes.
+    """
+    points = [(math.log(size), math.log(max(seconds, 1e-9))) for size, seconds in points]
+    if len(set(x for x, _ in points)) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    spread = sum((x - mean_x) ** 2 for x, _ in points)
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / spread
+
+
+def scaling(scripts, catalogue, sizes=DEFAULT_SIZES, profile=None, seed=0, repeat=1, clock=time.perf_counter):
+    """
+    Time every script against accounts with each of ``sizes`` discrete values.
+
+    Every script is evaluated with a fresh context, so its time includes
+    loading the account's data.  The accounts share ``seed`` and differ only
+    in ``profile.with_discrete_values(size)``; the dates count back from
+    ``DateTime.Now``, which callers pin for the run.
+
+    :param profile: Defaults to a 60 day stay.
+    :param repeat: Each time is the fastest of this many runs.
+    :returns: ``{"sizes": [...], "scripts": {name: {"seconds": [...],
+        "errors": [...], "exponent", "tail_exponent"}}}``.  ``errors``
+        counts the runs that raised at each size.  ``exponent`` is fitted
+        over every size; ``tail_exponent`` over the two largest only, where
+        fixed costs no longer hide the growth.  Neither is fitted for a
+        script that raised.
+    """
+    if profile is None:
+        profile = AccountProfile(stay_days=60)
+    now = host.DateTime.Now.to_datetime()
+    compiled = [(script_name(script), load_script(script) if isinstance(script, str) else script[1])
+                for script in scripts]
+    seconds = dict((name, []) for name, _ in compiled)
+    errors = dict((name, []) for name, _ in compiled)
+    for size in sizes:
+        account = generate(seed, catalogue, profile.with_discrete_values(size), now)
+        for name, code in compiled:
+            fastest = None
+            failed = 0
+            for _ in range(repeat):
+                with evaluating(account) as context:
+                    start = clock()
+                    if run_logged(code, account, name, context.repository) is None:
+                        failed += 1
+                    elapsed = clock() - start
+                fastest = elapsed if fastest is None else min(fastest, elapsed)
+            seconds[name].append(fastest)
+            errors[name].append(failed)
+    scripts_report = {}
+    for name, times in seconds.items():
+        points = list(zip(sizes, times))
+        fitted = not any(errors[name])
+        scripts_report[name] = {
+            "seconds": times,
+            "errors": errors[name],
+            "exponent": fit_exponent(points) if fitted else None,
+            "tail_exponent": fit_exponent(points[-2:]) if fitted else None,
+        }
+    return {"sizes": list(sizes), "scripts": scripts_report}
+
+
+def _raised(entry):
+    return any(entry.get("errors", ()))
+
+
+def over_budget(report, budget):
+    """
+    Return ``[(script name, tail exponent)]`` of the scripts in a ``scaling``
+    report growing faster than ``budget``, and of those that raised at any
+    size, with ``None`` for their exponent.
+    """
+    return [(name, entry["tail_exponent"]) for name, entry in sorted(report["scripts"].items())
+            if _raised(entry) or (entry["tail_exponent"] is not None and entry["tail_exponent"] > budget)]
+
+
+def format_scaling(report, budget=None):
+    """Return a ``scaling`` report as a plain text table, fastest growing scripts first."""
+    lines = ["%-40s %s %8s %8s" % (
+        "seconds by discrete values", " ".join("%9d" % size for size in report["sizes"]), "fit", "tail")]
+    entries = sorted(report["scripts"].items(), key=lambda item: -(item[1]["tail_exponent"] or 0))
+    for name, entry in entries:
+        line = "%-40s %s %8s %8s" % (
+            name, " ".join("%9.4f" % seconds for seconds in entry["seconds"]),
+            "%.2f" % entry["exponent"] if entry["exponent"] is not None else "-",
+            "%.2f" % entry["tail_exponent"] if entry["tail_exponent"] is not None else "-")
+        if _raised(entry):
+            line += "  errors: %s" % " ".join("%d" % count for count in entry["errors"])
+        elif budget is not None and (entry["tail_exponent"] or 0) > budget:
+            line += "  over budget (%.2f)" % budget
+        lines.append(line)
+    return "\n".join(lines) + "\n"
+
+
+def _milliseconds(seconds):
+    return "%9.2f" % (seconds * 1000.0) if seconds is not None else "%9s" % "-"
+
+
+def format_report(report):
+    """Return ``report`` as a plain text table, slowest scripts first."""
+    throughput = report["throughput"]
+    lines = [
+        "%d accounts, %d script runs in %.2fs: %.1f accounts/s, %.1f scripts/s" % (
+            report["accounts"], report["script_runs"], report["seconds"],
+            throughput["accounts_per_second"] or 0, throughput["scripts_per_second"] or 0),
+        "",
+        "%-40s %9s %9s %9s %9s %7s" % ("latency (ms)", "p50", "p90", "p99", "max", "errors"),
+    ]
+
+    def row(name, summary, errors=""):
+        lines.append("%-40s %s %s %s %s %7s" % (
+            name, _milliseconds(summary["p50"]), _milliseconds(summary["p90"]),
+            _milliseconds(summary["p99"]), _milliseconds(summary["max"]), errors))
+
+    row("account (all scripts)", report["account_latency"])
+    for name, summary in sorted(report["scripts"].items(), key=lambda item: -item[1]["total"]):
+        row(name, summary, report["errors"].get(name, ""))
+    return "\n".join(lines) + "\n"
+
+
+def _family_count(text):
+    family_name, _, count = text.partition("=")
+    if family_name not in FAMILIES or not count.isdigit():
+        raise argparse.ArgumentTypeError("expected FAMILY=COUNT with FAMILY one of %s" % ", ".join(FAMILIES))
+    return family_name, int(count)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m cdi.benchmark", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("scripts", nargs="*", help="scripts to run (default: every script in scripts/python)")
+    parser.add_argument("--accounts", type=int, default=20, help="synthetic accounts to generate")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first account")
+    parser.add_argument("--repeat", type=int, default=1, help="evaluate every account this many times")
+    parser.add_argument("--stay-days", type=float, help="length of stay (default: 5, or 60 with --scaling)")
+    parser.add_argument("--medications", type=int, default=40)
+    parser.add_argument("--documents", type=int, default=20)
+    parser.add_argument("--dvs", type=_family_count, action="append", default=[], metavar="FAMILY=COUNT",
+                        help="discrete values per family (%s); repeatable" % ", ".join(FAMILIES))
+    parser.add_argument("--scaling", action="store_true",
+                        help="time each script over growing discrete value counts instead")
+    parser.add_argument("--sizes", type=lambda text: [int(size) for size in text.split(",")],
+                        default=list(DEFAULT_SIZES), metavar="N,N,...",
+                        help="discrete value counts for --scaling (default: %s)" % ",".join(map(str, DEFAULT_SIZES)))
+    parser.add_argument("--budget", type=float,
+                        help="with --scaling, fail when a script's tail exponent exceeds this or it raises")
+    parser.add_argument("--compact", action="store_true", help="evaluate accounts held in cdi.records records")
+    parser.add_argument("-o", "--output", help="also write the JSON report here")
+    args = parser.parse_args(argv)
+
+    paths = args.scripts or script_paths()
+    stay_days = args.stay_days if args.stay_days is not None else (60 if args.scaling else 5)
+    profile = AccountProfile(medications=args.medications, documents=args.documents, stay_days=stay_days)
+    profile.discrete_values.update(args.dvs)
+    catalogue = Catalogue.from_scripts(paths)
+
+    now = host.DateTime.Now.to_datetime()
+    host.set_clock(lambda: now)
+    try:
+        if args.scaling:
+            report = scaling(paths, catalogue, args.sizes, profile, args.seed, args.repeat)
+        else:
+            accounts = [generate(seed, catalogue, profile, now) for seed in range(args.seed, args.seed + args.accounts)]
+            if args.compact:
+                accounts = [compact_account(account) for account in accounts]
+            report = run(accounts, paths, args.repeat)
+    finally:
+        host.set_clock(datetime.datetime.now)
+
+    if args.scaling:
+        sys.stdout.write(format_scaling(report, args.budget))
+    else:
+        sys.stdout.write(format_report(report))
+    if args.output:
+        with open(args.output, "w") as handle:
+            json.dump(report, handle, indent=2, sort_keys=True)
+            handle.write("\n")
+    if args.scaling and args.budget is not None and over_budget(report, args.budget):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
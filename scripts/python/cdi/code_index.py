@@ -0,0 +1,70 @@
+"""
+Per-account code reference index.
+
+``CodeCount`` walked every document of the account and every code reference
+on it, testing each code against ``codeDic.keys()`` (a linear scan of the
+keys under IronPython), and scripts such as ``SubstanceAbuse.py`` did so once
+per code dictionary.  ``CodeIndex`` walks the documents once per account and
+groups the references by code, so finding which of a script's codes are on
+the account costs one lookup per code, and ``find_many`` answers all of a
+script's code dictionaries in a single intersection with the account's codes.
+"""
+
+
+class CodeIndex:
+    """
+    The code references of one account's documents, grouped by code.
+
+    Codes keep the order they are first seen in, document by document, which
+    is the order ``CodeCount`` found them in.
+
+    :param documents: The account's documents.
+    """
+
+    __slots__ = ("_references", "_ranks")
+
+    def __init__(self, documents):
+        references = {}
+        for document in documents or ():
+            for reference in document.CodeReferences or ():
+                entries = references.get(reference.Code)
+                if entries is None:
+                    entries = references[reference.Code] = []
+                entries.append((document, reference))
+        self._references = references
+        self._ranks = dict((code, rank) for rank, code in enumerate(references))
+
+    def __contains__(self, code):
+        return code in self._ranks
+
+    def __len__(self):
+        return len(self._ranks)
+
+    def codes(self):
+        """Return every code on the account, in first-seen order."""
+        return list(self._references)
+
+    def references(self, code):
+        """Return the ``(document, reference)`` pairs of ``code``, in document order."""
+        return list(self._references.get(code, ()))
+
+    def _present(self, codes):
+        # The codes of the set ``codes`` on the account, in first-seen order,
+        # walking whichever side is smaller.
+        ranks = self._ranks
+        if len(codes) < len(ranks):
+            return sorted((code for code in codes if code in ranks), key=ranks.__getitem__)
+        return [code for code in ranks if code in codes]
+
+    def find(self, codes):
+        """
+        Return the codes of ``codes`` on the account, as ``CodeCount`` does:
+        a list of the set filled in first-seen order.
+        """
+        return list(set(self._present(frozenset(codes))))
+
+    def find_many(self, code_sets):
+        """Return ``find(codes)`` for each of ``code_sets``, intersecting with the account's codes once."""
+        code_sets = [frozenset(codes) for codes in code_sets]
+        present = self._present(frozenset().union(*code_sets))
+        return [list(set(code for code in present if code in codes)) for codes in code_sets]
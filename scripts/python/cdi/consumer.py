@@ -0,0 +1,274 @@
+"""
+An asyncio queue consumer that overlaps fetching with evaluation.
+
+``cdi.worker.drain`` fetches and evaluates an account in one step, so the
+cores wait on every repository round trip.  ``consume`` runs three stages
+concurrently:
+
+- claiming account ids from the queue into a bounded ``asyncio.Queue``;
+- up to ``in_flight`` tasks that each fetch an account snapshot from the
+  repository and hand it to the process pool for evaluation;
+- one writer that coalesces the results into batched upserts.
+
+Every stage blocks when the next one is full: at most ``queue_depth`` claimed
+ids wait for a fetch, ``in_flight`` snapshots are being fetched or evaluated
+and about ``write_batch`` result rows wait for a write, so memory stays bounded
+however far the queue spikes.
+
+Claimed entries are leased (see ``cdi.alert_queue``) and a ``Heartbeat``
+renews them until the writer has saved their results; an entry whose lease
+was lost meanwhile is left to the worker that claimed it next.  An account
+that fails to fetch or evaluate is logged and skipped while the other
+accounts carry on; its lease is no longer renewed and is released when
+``consume`` returns, so the account is tried again but not in a loop by this
+consumer.  However ``consume`` ends, every stage is cancelled and the leases
+of the entries it claimed and did not write are released; a write that fails
+ends it at once, raising the error.
+
+``python -m cdi.consumer --synthetic 500 --latency 0.02`` drains synthetic
+accounts served with a simulated round trip.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from . import host, worker
+from .alert_queue import Heartbeat, SQLiteAlertQueue, SQLiteResultStore
+from .runner import script_paths
+from .synthetic import Catalogue, SyntheticAccounts
+
+log = logging.getLogger(__name__)
+
+
+class AsyncRepository:
+    """
+    Serves account snapshots from a mapping after a simulated round trip,
+    standing in for an asynchronous database client.
+
+    :param latency: Seconds every ``fetch`` takes.
+    """
+
+    def __init__(self, accounts, latency=0.0):
+        self.accounts = accounts
+        self.latency = latency
+        self.fetches = 0
+
+    async def fetch(self, account_id):
+        """Return the account, or ``None`` when it no longer exists."""
+        self.fetches += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self.accounts.get(account_id)
+
+
+async def consume(queue, repository, store, scripts=None, executor=None, workers=None, queue_depth=64,
+                  in_flight=None, claim_size=16, write_batch=200, write_interval=1.0, poll_seconds=None, owner=None,
+                  heartbeat_seconds=None, now=None):
+    """
+    Evaluate queued accounts until the queue is empty, or with
+    ``poll_seconds`` until cancelled.
+
+    :param queue: The queue to claim from (see ``cdi.alert_queue``).
+    :param repository: Has a coroutine ``fetch(account_id)`` returning the
+        ``Account`` or ``None``, like ``AsyncRepository``.
+    :param store: Receives the result rows in ``upsert_many`` calls.  Rows
+        for the same account and script within one write keep only the
+        latest.
+    :param executor: Runs ``worker.evaluate_account``.  By default a
+        ``ProcessPoolExecutor`` of ``workers`` processes (one per core) is
+        made for the call.
+    :param queue_depth: Claimed ids waiting for a fetch.
+    :param in_flight: Accounts being fetched or evaluated at once; twice the
+        workers by default, so the next snapshots are fetched while the
+        current ones are evaluated.
+    :param claim_size: Entries claimed from the queue at a time.
+    :param write_batch: Result rows written at a time.
+    :param write_interval: Seconds a result row may wait for its batch to
+        fill.
+    :param poll_seconds: Wait between claims once the queue is empty;
+        ``None`` returns instead.
+    :param owner: Names this consumer in its leases; ``host:pid`` by default.
+    :param heartbeat_seconds: Seconds between lease renewals; a third of the
+        queue's lease by default.
+    :param now: Pins ``DateTime.Now`` in the processes, for tests.
+    :returns: ``{"accounts", "missing", "failed", "lost", "writes",
+        "seconds"}``; ``failed`` counts the accounts whose fetch or
+        evaluation raised, and ``lost`` the entries whose lease expired
+        before their results were written.
+    """
+    loop = asyncio.get_running_loop()
+    workers = workers or os.cpu_count() or 1
+    in_flight = in_flight or 2 * workers
+    own_executor = executor is None
+    if own_executor:
+        paths = list(scripts) if scripts is not None else script_paths()
+        executor = ProcessPoolExecutor(workers, initializer=worker.initialize, initargs=(paths, None, now))
+    pending = asyncio.Queue(queue_depth)
+    finished = asyncio.Queue(in_flight)
+    stats = {"accounts": 0, "missing": 0, "failed": 0, "lost": 0, "writes": 0, "seconds": 0.0}
+    start = time.perf_counter()
+    heartbeat = Heartbeat(queue, heartbeat_seconds)
+    # Entries claimed and not yet written, by token.
+    claimed = {}
+
+    async def claim():
+        while True:
+            claiming = loop.run_in_executor(None, queue.claim, claim_size, owner)
+            try:
+                entries = await asyncio.shield(claiming)
+            except asyncio.CancelledError:
+                # The claim goes on in its thread: what it leases is still
+                # recorded, to be released on the way out.
+                claimed.update((entry.token, entry) for entry in await claiming)
+                raise
+            if not entries:
+                if poll_seconds is None:
+                    break
+                await asyncio.sleep(poll_seconds)
+                continue
+            heartbeat.hold(entry.token for entry in entries)
+            claimed.update((entry.token, entry) for entry in entries)
+            for entry in entries:
+                await pending.put(entry)
+        for _ in range(in_flight):
+            await pending.put(None)
+
+    async def evaluate():
+        while True:
+            entry = await pending.get()
+            if entry is None:
+                return
+            try:
+                account = await repository.fetch(entry.account_id)
+                if account is None:
+                    rows = None
+                else:
+                    rows = await loop.run_in_executor(executor, worker.evaluate_account, account)
+            except Exception:
+                log.exception("evaluating account %s failed", entry.account_id)
+                stats["failed"] += 1
+                # Released on the way out; until then nobody claims it.
+                heartbeat.drop([entry.token])
+                continue
+            await finished.put((entry, rows))
+
+    async def flush(batch):
+        # Write the rows of the entries still leased, then complete them.
+        tokens = list(batch)
+        heartbeat.drop(tokens)
+        held = set(await loop.run_in_executor(None, queue.renew, tokens))
+        rows = {}
+        for token, (entry, entry_rows) in batch.items():
+            if token not in held:
+                stats["lost"] += 1
+            elif entry_rows is None:
+                stats["missing"] += 1
+            else:
+                stats["accounts"] += 1
+                for row in entry_rows:
+                    rows[row[:2]] = row
+        if rows:
+            await loop.run_in_executor(None, store.upsert_many, list(rows.values()))
+            stats["writes"] += 1
+        await loop.run_in_executor(None, queue.complete, list(held))
+        for token in tokens:
+            del claimed[token]
+
+    async def write():
+        batch = {}
+        size = 0
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - loop.time())
+            try:
+                item = await asyncio.wait_for(finished.get(), timeout)
+            except asyncio.TimeoutError:
+                item = False
+            if item:
+                if not batch:
+                    deadline = loop.time() + write_interval
+                batch[item[0].token] = item
+                size += len(item[1] or ())
+            if batch and (item is None or item is False or size >= write_batch):
+                await flush(batch)
+                batch = {}
+                size = 0
+                deadline = None
+            if item is None:
+                return
+
+    async def alongside(writer, awaitable):
+        # Await ``awaitable``, unless the writer stops first: it only stops
+        # after the end marker, so then it failed and nothing would drain
+        # ``finished`` any more.
+        future = asyncio.ensure_future(awaitable)
+        # Its outcome is read here, or abandoned with the writer's failure.
+        future.add_done_callback(lambda done: done.cancelled() or done.exception())
+        try:
+            await asyncio.wait([future, writer], return_when=asyncio.FIRST_COMPLETED)
+            if not future.done():
+                writer.result()
+                raise RuntimeError("the result writer stopped early")
+            return future.result()
+        finally:
+            future.cancel()
+
+    try:
+        with heartbeat:
+            writer = asyncio.ensure_future(write())
+            tasks = [asyncio.ensure_future(claim())] + [asyncio.ensure_future(evaluate()) for _ in range(in_flight)]
+            try:
+                await alongside(writer, asyncio.gather(*tasks))
+                await alongside(writer, finished.put(None))
+                await writer
+            finally:
+                for task in tasks + [writer]:
+                    task.cancel()
+                await asyncio.gather(writer, *tasks, return_exceptions=True)
+                # Entries claimed but never written go back to the queue.
+                unwritten = list(claimed)
+                if unwritten:
+                    heartbeat.drop(unwritten)
+                    await loop.run_in_executor(None, queue.release, unwritten)
+    finally:
+        if own_executor:
+            executor.shutdown()
+    stats["seconds"] = time.perf_counter() - start
+    return stats
+
+
+def run(queue, repository, store, **options):
+    """Run ``consume`` to completion in a new event loop and return its stats."""
+    return asyncio.run(consume(queue, repository, store, **options))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m cdi.consumer", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--synthetic", type=int, default=100, help="synthetic accounts to queue first")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds every account fetch takes")
+    parser.add_argument("--workers", type=int, help="worker processes (default: one per core)")
+    parser.add_argument("--in-flight", type=int, help="accounts fetched or evaluated at once")
+    parser.add_argument("--queue-depth", type=int, default=64)
+    parser.add_argument("--write-batch", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    now = host.DateTime.Now.to_datetime()
+    accounts = SyntheticAccounts(Catalogue.from_scripts(), now=now, compact=True)
+    queue = SQLiteAlertQueue()
+    queue.enqueue_many((accounts.account_id(seed), "Synthetic", None) for seed in range(args.synthetic))
+    store = SQLiteResultStore()
+    stats = run(queue, AsyncRepository(accounts, args.latency), store, workers=args.workers,
+                in_flight=args.in_flight, queue_depth=args.queue_depth, write_batch=args.write_batch, now=now)
+    sys.stdout.write("%d accounts in %.2fs: %.1f accounts/s, %d writes\n" % (
+        stats["accounts"], stats["seconds"],
+        stats["accounts"] / stats["seconds"] if stats["seconds"] else 0, stats["writes"]))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,298 @@
+"""
+Account-scoped evaluation context.
+
+Every alert script evaluated for an account starts the same way: it creates a
+``CACDataRepository``, pulls every discrete value for the account, builds an
+``AccountWorkflowContainer``, walks all documents to count codes and walks all
+medications to collect a few categories.  With 33 scripts per account that is
+33 copies of the same loading work.  An ``EvaluationContext`` does each piece
+once per account and hands the result to every script that asks for it; only
+the workflow container, whose links the scripts change, is still built per
+script.
+
+Scripts fetch the context with ``evaluation_context(account, db)``.  The host
+(or ``cdi.runner``) activates a fresh context before evaluating an account; a
+script run on its own gets one built on demand, so the scripts behave the same
+with or without a runner.  The active context is kept per thread.
+
+A runner ends its context explicitly.  One a script built on demand has no
+such end, so it is only reused while the account still holds the same
+collections with the same sizes and the previous script asked for it less
+than ``REUSE_SECONDS`` ago; an account object the host fills again or
+evaluates again later gets a fresh context.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+
+from . import helpers
+from .code_index import CodeIndex
+from .discrete_values import DiscreteValueIndex
+from .script_log import MessageBuffer, ScriptLog
+from .views import OrderedView
+
+# The active context of each thread: accounts evaluated on different threads
+# never see each other's.
+_active = threading.local()
+
+# How long a context built on demand stays reusable after the last script
+# asked for it.  The scripts of one account run back to back; a longer gap is
+# a later evaluation, whose data may have changed behind the same objects.
+REUSE_SECONDS = 30.0
+
+# The account collections whose identity and size a reused context must match.
+_SIGNATURE_FIELDS = ("DiscreteValues", "Medications", "Documents", "MatchedCriteriaGroups")
+
+
+def _signature(account):
+    """Return the collections of ``account`` paired with their sizes."""
+    signature = []
+    for field in _SIGNATURE_FIELDS:
+        values = getattr(account, field, None)
+        signature.append((values, -1 if values is None else len(values)))
+    return signature
+
+
+class EvaluationContext:
+    """
+    Data for one account, loaded once and shared between script runs.
+
+    :param account: The account being evaluated.
+    :param repository: The ``CACDataRepository`` to load discrete values from.
+        When ``None`` the values on the account record are used.
+    :param since: Only load discrete values with a ``ResultDate`` at or after
+        this date.  The scripts look back at most seven days, so the rest of a
+        long stay never has to leave a repository that can project
+        (``GetDiscreteValues(account_id, since, names)``); from one that only
+        takes the account id every value is loaded and the rest dropped here.
+    :param names: Only load discrete values with one of these names, e.g. the
+        names every script to be run searches for.  All names when ``None``.
+    :param batch_messages: Hold the scripts' messages until the context is
+        released, so the whole account run is written in one call.  Otherwise
+        each script's messages are written when the script flushes its log.
+    """
+
+    def __init__(self, account, repository=None, since=None, names=None, batch_messages=False):
+        self.account = account
+        self.repository = repository
+        self.since = since
+        self.names = None if names is None else frozenset(names)
+        self.batch_messages = batch_messages
+        self.messages = None
+        self.reads = None
+        self._discrete_values = None
+        self._medications = {}
+        self._code_index = None
+        self.signature = _signature(account)
+        self.on_demand = False
+        self.used = time.time()
+
+    @property
+    def discrete_values(self):
+        """
+        Every discrete value on the account as a ``DiscreteValueIndex``.
+
+        Passing it to ``DiscreteValueIndex`` narrows it to the names and
+        dates a script needs without rereading the repository.
+        """
+        if self._discrete_values is None:
+            if self.repository is None:
+                values = self.account.DiscreteValues
+            elif self.since is None and self.names is None:
+                values = self.repository.GetDiscreteValues(self.account._id)
+            else:
+                try:
+                    values = self.repository.GetDiscreteValues(self.account._id, self.since, self.names)
+                except TypeError:
+                    # The workflow repository only takes the account id; the
+                    # index below then does the filtering.
+                    values = self.repository.GetDiscreteValues(self.account._id)
+            self._discrete_values = DiscreteValueIndex(values, self.names, self.since)
+            self._discrete_values.on_read = self.record
+        return self._discrete_values
+
+    def covers(self, since):
+        """Return whether the loaded discrete values reach back to ``since``."""
+        if self.since is None:
+            return True
+        return since is not None and since >= self.since
+
+    def medications(self, categories, since, field="Category"):
+        """
+        Return the medications in ``categories`` started at or after ``since``.
+
+        The result is the ``mainMedDic`` the scripts used to build by hand:
+        keys count up from 1 in account order and iteration runs newest
+        ``StartDate`` first.
+
+        :param field: The medication field holding the category, ``Category``
+            or ``CDIAlertCategory``.
+        """
+        self.record("medications", categories)
+        by_category = self._medications.get(field)
+        if by_category is None:
+            by_category = self._medications[field] = self._group_medications(field)
+        matches = []
+        for category in set(categories):
+            dates, entries = by_category.get(category, ((), ()))
+            matches.extend(entries[bisect_left(dates, since):])
+        matches.sort(key=lambda entry: entry[0])
+        numbered = [(count, med) for count, (_, med) in enumerate(matches, 1)]
+        return OrderedView(sorted(numbered, key=lambda entry: entry[1].StartDate, reverse=True))
+
+    def _group_medications(self, field):
+        # Per category, (position, medication) sorted by StartDate alongside
+        # the dates themselves, so a date limit is a bisect.
+        grouped = {}
+        if "Medications" in self.account:
+            for position, med in enumerate(self.account.Medications):
+                if field in med and med[field] is not None:
+                    grouped.setdefault(med[field], []).append((med.StartDate, position, med))
+        for category, entries in grouped.items():
+            entries.sort(key=lambda entry: entry[:2])
+            grouped[category] = ([entry[0] for entry in entries], [entry[1:] for entry in entries])
+        return grouped
+
+    @property
+    def code_index(self):
+        """The code references on the account's documents as a ``CodeIndex``."""
+        if self._code_index is None:
+            self._code_index = CodeIndex(self.account.Documents)
+        return self._code_index
+
+    def code_count(self, codes):
+        """Return the codes from ``codes`` found on the account's documents, like ``CodeCount``."""
+        self.record("codes", codes)
+        return self.code_index.find(codes)
+
+    def code_counts(self, code_sets):
+        """Return ``code_count(codes)`` for each of ``code_sets`` in one query."""
+        code_sets = list(code_sets)
+        for codes in code_sets:
+            self.record("codes", codes)
+        return self.code_index.find_many(code_sets)
+
+    def container(self, factory, *args):
+        """
+        Return a new workflow container ``factory(account, *args)``.
+
+        Every script gets its own: the helpers number and rewrite the links
+        a container hands out (``Sequence``, ``updateLinkText``), so one
+        script must not see another's.
+        """
+        container = factory(self.account, *args)
+        if hasattr(container, "on_read"):
+            container.on_read = self.record
+        return container
+
+    def record(self, field, keys):
+        """
+        Note that the running script looked up ``keys`` (one key, an
+        iterable, or ``None`` for every key) of the input ``field``.
+
+        Nothing is kept unless ``reads`` is a dict, ``{field: set of keys}``,
+        as ``cdi.memo`` sets it while a script runs; a ``None`` key stands
+        for the whole field.
+        """
+        reads = self.reads
+        if reads is None:
+            return
+        seen = reads.get(field)
+        if seen is None:
+            seen = reads[field] = set()
+        if keys is None or isinstance(keys, str):
+            seen.add(keys)
+        else:
+            seen.update(keys)
+
+    def bind_helpers(self, namespace, version):
+        """
+        Define the shared helpers of ``version`` in ``namespace``, a script's
+        globals (see ``cdi.helpers``).
+        """
+        helpers.bind(namespace, version)
+
+    def log(self, repository, script_name, script_instance):
+        """
+        Return a ``ScriptLog`` for one script run.
+
+        Messages go to the context's repository, or to ``repository`` (the
+        script's own) when the context has none.
+        """
+        if self.messages is None:
+            self.messages = MessageBuffer(self.repository if self.repository is not None else repository)
+        return ScriptLog(self.messages, script_name, script_instance, self.batch_messages)
+
+    def matches(self, account):
+        """
+        Return whether ``account`` is the object this context was built for,
+        still holding the same collections with the same sizes.
+        """
+        if account is not self.account:
+            return False
+        for (values, size), (current, current_size) in zip(self.signature, _signature(account)):
+            if values is not current or size != current_size:
+                return False
+        return True
+
+    def flush_messages(self):
+        """Write any messages still buffered."""
+        if self.messages is not None:
+            self.messages.flush()
+
+
+def activate(context):
+    """
+    Make ``context`` the one ``evaluation_context`` returns for its account
+    on this thread, writing out the messages still buffered by the context it
+    replaces.
+    """
+    previous = getattr(_active, "context", None)
+    _active.context = context
+    if previous is not None and previous is not context:
+        previous.flush_messages()
+    return context
+
+
+def release():
+    """
+    Forget this thread's active context, e.g. once an account's evaluation is
+    finished, and write out its buffered messages.  The context is forgotten
+    even when writing fails.
+    """
+    context = getattr(_active, "context", None)
+    _active.context = None
+    if context is not None:
+        context.flush_messages()
+
+
+def active():
+    """Return this thread's active context, or ``None``."""
+    return getattr(_active, "context", None)
+
+
+def evaluation_context(account, repository=None, since=None):
+    """
+    Return the context for ``account``.
+
+    The active context is reused while it belongs to the same account object,
+    the account's collections are unchanged (``EvaluationContext.matches``)
+    and its discrete values reach back to ``since``.  A context built here
+    rather than activated by a runner must also have been asked for within
+    ``REUSE_SECONDS``.  Otherwise a new one is built and becomes active.  Each
+    script calls this first, so messages a previous script left unwritten (it
+    raised before flushing its log) are written here rather than with the next
+    script's.
+    """
+    context = getattr(_active, "context", None)
+    now = time.time()
+    if (context is None or not context.matches(account) or not context.covers(since)
+            or (context.on_demand and now - context.used > REUSE_SECONDS)):
+        context = EvaluationContext(account, repository, since)
+        context.on_demand = True
+        activate(context)
+    elif not context.batch_messages:
+        context.flush_messages()
+    context.used = now
+    return context
@@ -0,0 +1,199 @@
+"""
+Per-account discrete value index.
+
+The alert scripts used to collect every discrete value whose name appeared in
+a search list into a dictionary, sort it by result date, and then have every
+helper walk the whole dictionary for each lookup.  ``DiscreteValueIndex`` does
+the collection once and groups the values by name, so that a helper asking for
+one or two names only touches the values it actually needs.
+"""
+
+from bisect import bisect_left
+from operator import itemgetter
+
+try:
+    from collections.abc import Mapping
+except ImportError:
+    # IronPython 2.7, the workflow engine.
+    from collections import Mapping
+
+from .numeric import parse_result
+
+
+class DiscreteValueIndex(Mapping):
+    """
+    Discrete values of one account, grouped by name and sorted newest first.
+
+    As a mapping the index behaves exactly like the ``dict(maindiscreteDic)``
+    the scripts used to build: keys count up from 1 in the order the values
+    were read, and iteration yields them ordered by ``ResultDate`` (newest
+    first, ties in read order).  ``lookup`` is the fast path, returning only
+    the values for the requested names.
+
+    :param discrete_values: The account's discrete values, in repository order,
+        or another index.  Narrowing an existing index (such as the account-wide
+        one an ``EvaluationContext`` keeps) only touches the requested names
+        instead of every value on the account.
+    :param names: Only index values with one of these names.  All names when ``None``.
+    :param since: Only index values with a ``ResultDate`` at or after this date.
+    :param until: Only index values with a ``ResultDate`` before this date.
+
+    ``on_read``, when set, is called as ``on_read("discrete_values", names)``
+    with the names of every ``lookup`` and ``select`` (``None`` for all
+    names, as when the index is iterated); an index narrowed from this one
+    reads through ``select``.
+    """
+
+    on_read = None
+
+    def __init__(self, discrete_values, names=None, since=None, until=None):
+        wanted = None if names is None else frozenset(names)
+        # Per name, parallel lists sorted ascending by (ResultDate, -key) so
+        # that date windows can be found with a bisect and read in reverse.
+        self._keys = {}
+        self._values = {}
+        self._records = {}
+        count = 0
+        if isinstance(discrete_values, DiscreteValueIndex):
+            discrete_values = discrete_values.select(wanted, since, until)
+        for dv in discrete_values or []:
+            if wanted is not None and dv.Name not in wanted:
+                continue
+            if since is not None and not dv.ResultDate >= since:
+                continue
+            if until is not None and not dv.ResultDate < until:
+                continue
+            count += 1
+            self._records[count] = dv
+            self._values.setdefault(dv.Name, []).append((dv.ResultDate, -count, dv))
+        for name, entries in self._values.items():
+            entries.sort(key=lambda entry: entry[:2])
+            self._keys[name] = [entry[:2] for entry in entries]
+            self._values[name] = [entry[2] for entry in entries]
+        self._order = None
+
+    def lookup(self, names, since=None, until=None):
+        """
+        Return the values for any of ``names``, newest first.
+
+        ``since`` is inclusive and ``until`` exclusive, matching the
+        ``ResultDate >= limit`` checks the scripts already make.  A single
+        name may be passed as a plain string.
+        """
+        if isinstance(names, str):
+            names = (names,)
+        if self.on_read is not None:
+            self.on_read("discrete_values", names)
+        runs = []
+        for name in set(names):
+            start, stop = self._window(name, since, until)
+            if start < stop:
+                runs.append((self._keys[name][start:stop], self._values[name][start:stop]))
+        if not runs:
+            return []
+        if len(runs) == 1:
+            return runs[0][1][::-1]
+        # A handful of sorted runs: the sort merges them in linear time.
+        merged = []
+        for keys, values in runs:
+            merged.extend(zip(keys, values))
+        merged.sort(key=itemgetter(0), reverse=True)
+        return [value for _, value in merged]
+
+    def latest(self, names, since=None, until=None):
+        """Return the newest value for any of ``names``, or ``None``."""
+        values = self.lookup(names, since, until)
+        return values[0] if values else None
+
+    def query(self, names, predicates, since=None, until=None):
+        """
+        Test the values for ``names`` against several thresholds in one pass.
+
+        Each predicate is an ``(op, threshold, limit)`` triple, such as
+        ``(lt, 132, 10)``.  A value joins a predicate's bucket when its result
+        is numeric and ``op(value, threshold)`` holds; the bucket stops filling
+        once it holds ``limit`` values (``None`` for no limit).  The pass ends
+        as soon as every bucket is full.
+
+        :returns: One list of values per predicate, newest first, holding the
+            same values the predicates would select if run one at a time.
+        """
+        buckets = [[] for _ in predicates]
+        open_tests = None
+        for dv in self.lookup(names, since, until):
+            if open_tests is not None and not open_tests:
+                break
+            value = parse_result(dv.Result).value
+            if value is None:
+                continue
+            if open_tests is None:
+                # Thresholds are converted at the first numeric value, as the
+                # scripts' loops did, so a bad threshold only fails when used.
+                open_tests = [
+                    (op, float(threshold), limit, bucket)
+                    for (op, threshold, limit), bucket in zip(predicates, buckets)
+                    if limit is None or limit > 0
+                ]
+                if not open_tests:
+                    break
+            for test in list(open_tests):
+                op, threshold, limit, bucket = test
+                if op(value, threshold):
+                    bucket.append(dv)
+                    if limit is not None and len(bucket) >= limit:
+                        open_tests.remove(test)
+        return buckets
+
+    def _window(self, name, since, until):
+        # Positions of the values for ``name`` with since <= ResultDate < until.
+        keys = self._keys.get(name)
+        if not keys:
+            return 0, 0
+        start = 0 if since is None else bisect_left(keys, (since, float("-inf")))
+        stop = len(keys) if until is None else bisect_left(keys, (until, float("-inf")))
+        return start, stop
+
+    def select(self, names=None, since=None, until=None):
+        """
+        Return the values for ``names`` (all names when ``None``) with
+        ``since <= ResultDate < until``, in the order they were read.
+
+        This is the projection a repository query would return, and what a
+        narrower index is built from.
+        """
+        if isinstance(names, str):
+            names = (names,)
+        if self.on_read is not None:
+            self.on_read("discrete_values", names)
+        selected = []
+        for name in self._keys if names is None else set(names):
+            start, stop = self._window(name, since, until)
+            keys = self._keys.get(name)
+            values = self._values.get(name)
+            selected.extend((-keys[i][1], values[i]) for i in range(start, stop))
+        selected.sort(key=lambda entry: entry[0])
+        return [dv for _, dv in selected]
+
+    def names(self):
+        """Return the names that have at least one indexed value."""
+        return list(self._values)
+
+    def _sorted_keys(self):
+        if self._order is None:
+            order = sorted(self._records, key=lambda key: self._records[key].ResultDate, reverse=True)
+            self._order = order
+        return self._order
+
+    def __getitem__(self, key):
+        return self._records[key]
+
+    def __iter__(self):
+        if self.on_read is not None:
+            self.on_read("discrete_values", None)
+        return iter(self._sorted_keys())
+
+    def __len__(self):
+        return len(self._records)
+
+    def __contains__(self, key):
+        return key in self._records
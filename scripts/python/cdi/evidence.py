@@ -0,0 +1,91 @@
+"""
+Evidence computed on first use.
+
+Before its decision chain a script looks up every piece of evidence any
+branch might need: codes, abstractions, medications and discrete value
+scans.  ``AbnormalSerumSodium.py`` makes fourteen such lookups, yet an
+account without a sodium code or abnormal sodium results, which is most
+accounts, fails the chain after reading three of them.
+
+An ``Evidence`` holds the lookups instead of their results::
+
+    evidence = Evidence()
+    evidence.define("e870Code", codeValue, "E87.0", "Hypernatremia: [CODE] ...", 12)
+    ...
+    elif evidence.e870Code is not None and ...
+
+Reading ``evidence.e870Code`` makes the lookup the first time and keeps the
+result as an ordinary attribute, so later reads cost what reading any
+attribute does, and the conditions of the chain short-circuit past the
+evidence they never reach.  Only lookups without side effects may be
+deferred this way: a helper called to add links to a category must still be
+called where it stands.
+
+Every script defines its lookups this way, except those whose helper the
+script replaces with its own and those whose variable the script assigns
+again later.
+"""
+
+
+class Evidence:
+    """
+    Named values, each computed from its definition when first read.
+
+    ``evidence.name`` computes the value defined as ``name`` and keeps it;
+    ``AttributeError`` is raised for a name that was never defined.
+    """
+
+    def __init__(self):
+        self.__dict__["_definitions"] = {}
+
+    def define(self, name, function, *args, **kwargs):
+        """
+        Define ``name`` as ``function(*args, **kwargs)``, called when
+        ``name`` is first read.
+        """
+        self._check(name)
+        self._definitions[name] = (function, args, kwargs, None)
+        return self
+
+    def define_many(self, names, function, *args, **kwargs):
+        """
+        Define ``names`` as the items of the sequence ``function(*args,
+        **kwargs)`` returns, called once when any of them is first read.
+        """
+        names = tuple(names)
+        for name in names:
+            self._check(name)
+            self._definitions[name] = (function, args, kwargs, names)
+        return self
+
+    def _check(self, name):
+        if name.startswith("_") or hasattr(Evidence, name):
+            raise ValueError("%r cannot name evidence" % name)
+        if name in self.__dict__:
+            raise ValueError("%r has already been computed" % name)
+
+    def __getattr__(self, name):
+        try:
+            function, args, kwargs, names = self._definitions[name]
+        except KeyError:
+            raise AttributeError("no evidence named %r" % name)
+        value = function(*args, **kwargs)
+        if names is None:
+            self.__dict__[name] = value
+        else:
+            for item_name, item in zip(names, value):
+                self.__dict__[item_name] = item
+            value = self.__dict__[name]
+        return value
+
+    def __setattr__(self, name, value):
+        raise AttributeError("evidence is defined with define(), not assigned")
+
+    def computed(self):
+        """Return the names whose values have been computed, in order."""
+        return [name for name in self.__dict__ if name != "_definitions"]
+
+    def __repr__(self):
+        return "Evidence(%s)" % ", ".join(
+            "%s=%r" % (name, self.__dict__[name]) if name in self.__dict__ else "%s=<deferred>" % name
+            for name in self._definitions)
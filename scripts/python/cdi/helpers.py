@@ -0,0 +1,359 @@
+"""
+The helper functions the alert scripts share.
+
+Every script used to carry its own copy of the same helpers (``dvValue``,
+``codeValue``, ``dataConversion`` and a dozen more), so each script run
+compiled and executed some 250 lines of definitions before doing any work.
+The helpers now live here, compiled once per process, and a script binds
+them into its globals through its evaluation context::
+
+    context.bind_helpers(globals(), 1)
+
+Binding makes a function object per helper over the script's own globals,
+from the code compiled here.  The helpers therefore see the script's
+``accountContainer`` and ``context`` and call each other through the
+script's globals, exactly as the copies defined in the script did.  A script
+that needs a helper to behave differently defines its own after binding;
+the shared helpers then call that one.
+
+Binding names a ``VERSION``.  A change to what a helper returns for the
+same inputs must bump it, and a script bound to another version is refused
+rather than quietly given different results.  The memoized results' key
+covers the source of this module as well (see ``cdi.memo``).
+
+The functions below are written to run in a script's globals, not in this
+module's, and are not meant to be called from here.
+"""
+
+import types
+
+from .numeric import clean_numbers, parse_result
+
+VERSION = 1
+
+
+def datetimeFromUtcToLocal(utc_datetime):
+    if utc_datetime:
+        convertedDate = DateTime.SpecifyKind(utc_datetime, DateTimeKind.Utc)
+        return  convertedDate.ToLocalTime()
+    else:
+        return None
+
+
+def dataConversion(datetime, linkText, Result, id, category, sequence, abstract=True, gender=None):
+    if datetime is not None:
+        date_time = datetimeFromUtcToLocal(datetime)
+        date_time = date_time.ToString("MM/dd/yyyy, HH:mm")
+        linkText = linkText.replace("[RESULTDATETIME]", date_time)
+    else: 
+        linkText = linkText.replace("(Result Date: [RESULTDATETIME])", "")
+    if Result is not None:
+        linkText = linkText.replace("[VALUE]", Result)
+    else: linkText = linkText.replace("[VALUE]", "")
+    if gender: linkText = linkText.replace("[GENDER]", gender)
+    else: linkText = linkText.replace("[GENDER]", "")
+    if abstract == True:
+        category.Links.Add(MatchedCriteriaLink(linkText, None, None, id, True, None, None, sequence))
+    elif abstract == False:
+        abstraction = MatchedCriteriaLink(linkText, None, None, id, True, None, None, sequence)
+        return abstraction
+    return
+
+
+def medDataConversion(datetime, linkText, med, id, dosage, route, category, sequence, abstract=True):
+    date_time = datetimeFromUtcToLocal(datetime)
+    date_time = date_time.ToString("MM/dd/yyyy, HH:mm")
+    linkText = linkText.replace("[STARTDATE]", date_time)
+    linkText = linkText.replace("[MEDICATION]", med)
+    linkText = linkText.replace("[DOSAGE]", dosage)
+    if route is not None: linkText = linkText.replace("[ROUTE]", route)
+    else: linkText = linkText.replace(", Route [ROUTE]", "")
+    if abstract == True:
+        abstraction = MatchedCriteriaLink(linkText, None, None, None, True, None, None, sequence)
+        abstraction.MedicationId = id
+        category.Links.Add(abstraction)
+    elif abstract == False:
+        abstraction = MatchedCriteriaLink(linkText, None, None, None, True, None, None, sequence)
+        abstraction.MedicationId = id
+        return abstraction
+    return
+
+
+def CodeCount(codes):
+    # Get list of codes on the acct based on CodeDic
+    return context.code_count(codes)
+
+
+def CodeCounts(*codes):
+    # CodeCount of several code lists, answered together
+    return context.code_counts(codes)
+
+
+def abstractValue(abstraction_name, link_text, calculation, sequence=0, category=None, abstract=False):
+    # Find abstraction and if abstract is true abstract it to the provided category
+    abstraction = accountContainer.GetFirstLinkMatchingAbstractionValue(abstraction_name, link_text, lambda x: calculation)
+    if abstraction is not None:
+        abstraction.Sequence = sequence
+        if abstract:
+            category.Links.Add(abstraction)
+            return True
+        else:
+            return abstraction
+    if abstract:
+        return False
+    return abstraction
+
+
+def dvValue(dv_name, link_text, calculation, sequence=0, category=None, abstract=False):
+    # Find Discrete Value and if abstract is true abstract it to the provided category
+    for dv in dv_name:
+        abstraction = accountContainer.GetFirstLinkMatchingDiscreteValue(dv, link_text, calculation)
+        if abstraction is not None:
+            break
+    if abstraction is not None:
+        abstraction.Sequence = sequence
+        if abstract:
+            category.Links.Add(abstraction)
+            return True
+        else:
+            return abstraction
+    if abstract:
+        return False
+    return abstraction
+
+
+def dvValueMultiLinks(matches, linkText, sequence=0, category=None, abstract=False, needed=2):
+    # Turn the discrete values a query matched into links, returning what dvValueMulti returns
+    matchedList = []
+    x = 0
+    for dv in matches:
+        matchedList.append(dataConversion(dv['ResultDate'], linkText, dv['Result'], dv['UniqueId'] or dv['_id'], category, sequence, abstract))
+        x += 1
+    if abstract and x > 0:
+        return True
+    elif abstract is False and len(matchedList) > 0 and needed > 0:
+        return matchedList
+    else:
+        return None
+
+
+def dvValueMulti(dvDic, DV1, linkText, value, sign, sequence=0, category=None, abstract=False, needed=2):
+    # Find Discrete Value and if abstract is true abstract it to the provided category
+    matches = dvDic.query(DV1, [(sign, value, max(needed, 1))])[0]
+    return dvValueMultiLinks(matches, linkText, sequence, category, abstract, needed)
+
+
+def dvValueMultiQuery(dvDic, DV1, linkText, queries, sequence=0, category=None, abstract=False):
+    # Run several dvValueMulti checks over the same discrete values in one pass; each query is an
+    # (op, threshold, limit) triple in DiscreteValueIndex.query order, limit being dvValueMulti's needed
+    buckets = dvDic.query(DV1, [(op, threshold, max(limit, 1)) for op, threshold, limit in queries])
+    matchedLists = []
+    for query, matches in zip(queries, buckets):
+        matchedLists.append(dvValueMultiLinks(matches, linkText, sequence, category, abstract, query[2]))
+    return matchedLists
+
+
+def compareValuesMulti(dvDic, DV1, value, value1, linkText, sign, sign1, sequence=0, category=None, abstract=False, needed=2):
+    matchedList = []
+    x = 0
+    for dv in dvDic.lookup(DV1):
+        dvr = parse_result(dv['Result']).value
+        if dvr is not None and sign(float(value), dvr) and sign1(dvr, float(value1)):
+            matchedList.append(dataConversion(dv['ResultDate'], linkText, dv['Result'], dv['UniqueId'] or dv['_id'], category, sequence, abstract))
+            x += 1
+            if needed <= x:
+                break
+    if abstract and x > 0:
+        return True
+    elif abstract is False and len(matchedList) > 0 and needed > 0:
+        return matchedList
+    else:
+        return None
+
+
+def codeValue(code_name, link_text, sequence=0, category=None, abstract=False):
+    # Find code and if abstract is true abstract it to the provided category
+    abstraction = accountContainer.GetFirstCodeLink(code_name, link_text)
+    if abstraction is not None:
+        abstraction.Sequence = sequence
+        if abstract:
+            category.Links.Add(abstraction)
+            return True
+        else:
+            return abstraction
+    if abstract:
+        return False
+    return abstraction
+
+
+def multiCodeValue(code_list, link_text, sequence=0, category=None, abstract=False):
+    # Go through Code List and find first code and if abstract is true abstract it to the provided category
+    abstraction = None
+    for code in code_list:
+        abstraction = accountContainer.GetFirstCodeLink(code, link_text)
+        if abstraction is not None:
+            abstraction.Sequence = sequence
+            if abstract:
+                category.Links.Add(abstraction)
+                return True
+            else:
+                return abstraction
+    if abstract and abstraction is None:
+        return False
+    return abstraction
+
+
+def prefixCodeValue(prefix, link_text, sequence=0, category=None, abstract=False):
+    # Use prefix to find first code match based on regex search and if abstract is true abstract it to the provided category
+    abstraction = None
+    validCodes = [codes for codes in accountContainer.CodeKeys if re.match(prefix, codes) is not None]
+    for code in validCodes:
+        abstraction = accountContainer.GetFirstCodeLink(code, link_text)
+        if abstraction is not None:
+            abstraction.Sequence = sequence
+            if abstract:
+                category.Links.Add(abstraction)
+                return True
+            else:
+                return abstraction
+    if abstract and abstraction is None:
+        return False
+    return abstraction
+
+
+def medValue(med_name, link_text, sequence=0, category=None, abstract=False):
+    # Find Medication Value and if abstract is true abstract it to the provided category
+    abstraction = accountContainer.GetFirstMedicationLink(med_name, link_text)
+    if abstraction is not None:
+        abstraction.Sequence = sequence
+        if abstract:
+            category.Links.Add(abstraction)
+            return True
+        else:
+            return abstraction
+    if abstract:
+        return False
+    return abstraction
+
+
+def updateLinkText(value, replacement_text):
+    # Update the link text with the provided text
+    value.LinkText = replacement_text + value.LinkText
+    return value
+
+
+def documentLink(DocumentType, LinkText, sequence, category, abstract):
+    # Finds a document link and adds it as link so that its a quick reference for the cdi user.
+    abstraction = None
+    abstraction = accountContainer.GetFirstDocumentLink(DocumentType, LinkText)
+    if abstraction is not None:
+        abstraction.Sequence = sequence
+        if abstract:
+            category.Links.Add(abstraction)
+            return True
+        else:
+            return abstraction
+    return None
+
+
+def dvPositiveCheck(dvDic, discreteValueName, linkText, sequence=0, category=None, abstract=False):
+    abstraction = None
+    for dv in dvDic.lookup(discreteValueName):
+        if (
+            dv['Result'] is not None and
+            (re.search(r'\bpositive\b', dv['Result'], re.IGNORECASE) is not None or
+            re.search(r'\bDetected\b', dv['Result'], re.IGNORECASE) is not None)
+        ):
+            if abstract:
+                dataConversion(dv['ResultDate'], linkText, dv['Result'], dv['UniqueId'] or dv['_id'], category, sequence, True)
+                return True
+            else:
+                abstraction = dataConversion(dv['ResultDate'], linkText, dv['Result'], dv['UniqueId'] or dv['_id'], category, sequence, False)
+                return abstraction
+    return abstraction
+
+
+def dvOxygenCheck(dvDic, discreteValueName, linkText, sequence=0, category=None, abstract=False):
+    abstraction = None
+    for dv in dvDic.lookup(discreteValueName):
+        if (
+            dv['Result'] is not None and
+            not re.search(r'\bRoom Air\b', dv['Result'], re.IGNORECASE) and
+            not re.search(r'\bRA\b', dv['Result'], re.IGNORECASE)
+        ):
+            if abstract:
+                dataConversion(dv['ResultDate'], linkText, dv['Result'], dv['UniqueId'] or dv['_id'], category, sequence, True)
+                return True
+            else:
+                abstraction = dataConversion(dv['ResultDate'], linkText, dv['Result'], dv['UniqueId'] or dv['_id'], category, sequence, False)
+                return abstraction
+    return abstraction
+
+
+def antiboticMedValue(medDic, med_name, link_text, sequence=0, category=None, abstract=False):
+    for mv in medDic or []:
+        if (
+            medDic[mv]['Route'] is not None and
+            medDic[mv]['Category'] == med_name and
+            (re.search(r'\bEye\b', medDic[mv]['Route'], re.IGNORECASE) is None and 
+            re.search(r'\btopical\b', medDic[mv]['Route'], re.IGNORECASE) is None and 
+            re.search(r'\bocular\b', medDic[mv]['Route'], re.IGNORECASE) is None and 
+            re.search(r'\bophthalmic\b', medDic[mv]['Route'], re.IGNORECASE) is None)
+        ):
+            if abstract == True:
+                medDataConversion(medDic[mv]['StartDate'], link_text, medDic[mv]['Medication'], medDic[mv]['ExternalId'], medDic[mv]['Dosage'], medDic[mv]['Route'], category, sequence)
+                return True
+            elif abstract == False:
+                abstraction = medDataConversion(medDic[mv]['StartDate'], link_text, medDic[mv]['Medication'], medDic[mv]['ExternalId'], medDic[mv]['Dosage'], medDic[mv]['Route'], category, sequence, abstract)
+                return abstraction
+    return None
+
+
+def anesthesiaMedValue(medDic, med_name, link_text, sequence=0, category=None, abstract=False):
+    for mv in medDic or []:
+        if (
+            medDic[mv]['Route'] is not None and
+            medDic[mv]['Dosage'] is not None and
+            medDic[mv]['Category'] == med_name and
+            (re.search(r'\bhr\b', medDic[mv]['Dosage'], re.IGNORECASE) or
+            re.search(r'\bhour\b', medDic[mv]['Dosage'], re.IGNORECASE) or 
+            re.search(r'\bmin\b', medDic[mv]['Dosage'], re.IGNORECASE) or
+            re.search(r'\bminute\b', medDic[mv]['Dosage'], re.IGNORECASE)) and
+            (re.search(r'\bIntravenous\b', medDic[mv]['Route'], re.IGNORECASE) or
+            re.search(r'\bIV Push\b', medDic[mv]['Route'], re.IGNORECASE))
+        ):
+            if abstract == True:
+                medDataConversion(medDic[mv]['StartDate'], link_text, medDic[mv]['Medication'], medDic[mv]['ExternalId'], medDic[mv]['Dosage'], medDic[mv]['Route'], category, sequence)
+                return True
+            elif abstract == False:
+                abstraction = medDataConversion(medDic[mv]['StartDate'], link_text, medDic[mv]['Medication'], medDic[mv]['ExternalId'], medDic[mv]['Dosage'], medDic[mv]['Route'], category, sequence, abstract)
+                return abstraction
+    return None
+
+
+# What bind_helpers puts in a script's globals, in definition order.
+_FUNCTIONS = [value for value in list(globals().values())
+              if isinstance(value, types.FunctionType) and value.__module__ == __name__ and value.__name__[0] != "_"]
+
+HELPERS = dict((function.__name__, function) for function in _FUNCTIONS)
+
+
+def bind(namespace, version):
+    """
+    Define the helpers in ``namespace`` (a script's globals), with the
+    ``cleanNumbers`` and ``parse_result`` they call.
+
+    :param version: The ``VERSION`` the script was written against.
+    :raises ValueError: When it is not the version of this library.
+    """
+    if version != VERSION:
+        raise ValueError("the script needs version %r of the shared helpers, not %r" % (version, VERSION))
+    for name, function in HELPERS.items():
+        namespace[name] = types.FunctionType(function.__code__, namespace, name, function.__defaults__)
+    namespace["cleanNumbers"] = clean_numbers
+    namespace["parse_result"] = parse_result
+
+
+def codes():
+    """Return ``{code object: name}`` of the helpers, as ``timing.Profiler`` tracks them."""
+    return dict((function.__code__, name) for name, function in HELPERS.items())
@@ -0,0 +1,634 @@
+"""
+CPython stand-ins for the workflow script host.
+
+The alert scripts in ``scripts/python`` were written for the IronPython script
+engine inside Fusion CAC workflow.  They ``import clr``, pull ``DateTime`` from
+``System`` and construct ``CACDataRepository``/``AccountWorkflowContainer``
+from ``fusion_cac_script_engine``.  ``install()`` registers pure Python
+versions of those modules in ``sys.modules`` so the scripts can be executed
+unmodified by a CPython process.
+
+Only the surface the scripts actually touch is implemented.
+"""
+
+import datetime as _datetime
+import re
+import sys
+import types
+
+from .discrete_values import DiscreteValueIndex
+
+#========================================
+#  System
+#========================================
+_clock = _datetime.datetime.now
+_local_offset = _datetime.timedelta(0)
+_accounts = {}
+
+
+def set_clock(clock):
+    """Replace the source of ``DateTime.Now`` (a callable returning a naive datetime)."""
+    global _clock
+    _clock = clock
+
+
+def set_accounts(accounts):
+    """Set the accounts served by a ``CACDataRepository()`` built without arguments."""
+    global _accounts
+    _accounts = accounts
+
+
+def set_local_offset(offset):
+    """Set the UTC offset used by ``DateTime.ToLocalTime``."""
+    global _local_offset
+    _local_offset = offset
+
+
+class DateTimeKind:
+    Unspecified = 0
+    Utc = 1
+    Local = 2
+
+
+class TimeSpan:
+    __slots__ = ("_delta",)
+
+    def __init__(self, delta):
+        self._delta = delta
+
+    @property
+    def TotalDays(self):
+        return self._delta.total_seconds() / 86400.0
+
+    @property
+    def TotalHours(self):
+        return self._delta.total_seconds() / 3600.0
+
+    @property
+    def TotalMinutes(self):
+        return self._delta.total_seconds() / 60.0
+
+    @property
+    def TotalSeconds(self):
+        return self._delta.total_seconds()
+
+    def __repr__(self):
+        return "TimeSpan(%r)" % self._delta
+
+
+# .NET custom format specifiers used by the scripts, longest first.
+_FORMAT_TOKENS = [
+    ("yyyy", "%Y"), ("MM", "%m"), ("dd", "%d"), ("HH", "%H"),
+    ("mm", "%M"), ("ss", "%S"), ("tt", "%p"), ("hh", "%I"),
+]
+
+
+def _translate_format(fmt):
+    out = []
+    i = 0
+    while i < len(fmt):
+        for token, directive in _FORMAT_TOKENS:
+            if fmt.startswith(token, i):
+                out.append(directive)
+                i += len(token)
+                break
+        else:
+            out.append(fmt[i].replace("%", "%%"))
+            i += 1
+    return "".join(out)
+
+
+class _DateTimeType(type):
+    @property
+    def Now(cls):
+        return cls(_clock(), DateTimeKind.Local)
+
+    @property
+    def UtcNow(cls):
+        return cls(_clock() - _local_offset, DateTimeKind.Utc)
+
+    @property
+    def Today(cls):
+        return cls(_clock(), DateTimeKind.Local).Date
+
+
+class DateTime(metaclass=_DateTimeType):
+    """Immutable wrapper around a naive ``datetime`` with .NET method names."""
+
+    __slots__ = ("_value", "Kind")
+
+    def __init__(self, value, kind=DateTimeKind.Unspecified):
+        self._value = value
+        self.Kind = kind
+
+    @staticmethod
+    def SpecifyKind(value, kind):
+        return DateTime(value._value, kind)
+
+    @property
+    def Date(self):
+        return DateTime(_datetime.datetime.combine(self._value.date(), _datetime.time()), self.Kind)
+
+    @property
+    def Year(self):
+        return self._value.year
+
+    @property
+    def Month(self):
+        return self._value.month
+
+    @property
+    def Day(self):
+        return self._value.day
+
+    @property
+    def Hour(self):
+        return self._value.hour
+
+    @property
+    def Minute(self):
+        return self._value.minute
+
+    @property
+    def Ticks(self):
+        delta = self._value - _datetime.datetime(1, 1, 1)
+        return (delta.days * 86400 + delta.seconds) * 10000000 + delta.microseconds * 10
+
+    def AddDays(self, days):
+        return DateTime(self._value + _datetime.timedelta(days=days), self.Kind)
+
+    def AddHours(self, hours):
+        return DateTime(self._value + _datetime.timedelta(hours=hours), self.Kind)
+
+    def AddMinutes(self, minutes):
+        return DateTime(self._value + _datetime.timedelta(minutes=minutes), self.Kind)
+
+    def AddSeconds(self, seconds):
+        return DateTime(self._value + _datetime.timedelta(seconds=seconds), self.Kind)
+
+    def ToLocalTime(self):
+        if self.Kind == DateTimeKind.Local:
+            return self
+        return DateTime(self._value + _local_offset, DateTimeKind.Local)
+
+    def ToUniversalTime(self):
+        if self.Kind == DateTimeKind.Utc:
+            return self
+        return DateTime(self._value - _local_offset, DateTimeKind.Utc)
+
+    def ToString(self, fmt=None):
+        if fmt is None:
+            return self._value.strftime("%m/%d/%Y %I:%M:%S %p")
+        return self._value.strftime(_translate_format(fmt))
+
+    def to_datetime(self):
+        return self._value
+
+    def __sub__(self, other):
+        if isinstance(other, DateTime):
+            return TimeSpan(self._value - other._value)
+        if isinstance(other, TimeSpan):
+            return DateTime(self._value - other._delta, self.Kind)
+        return NotImplemented
+
+    def __eq__(self, other):
+        return isinstance(other, DateTime) and self._value == other._value
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __lt__(self, other):
+        return self._value < other._value
+
+    def __le__(self, other):
+        return self._value <= other._value
+
+    def __gt__(self, other):
+        return self._value > other._value
+
+    def __ge__(self, other):
+        return self._value >= other._value
+
+    def __hash__(self):
+        return hash(self._value)
+
+    def __str__(self):
+        return self.ToString()
+
+    def __repr__(self):
+        return "DateTime(%r)" % self._value
+
+
+class List(list):
+    """``System.Collections.Generic.List`` as used by the scripts."""
+
+    def Add(self, item):
+        self.append(item)
+
+    def AddRange(self, items):
+        self.extend(items)
+
+    def Contains(self, item):
+        return item in self
+
+    @property
+    def Count(self):
+        return len(self)
+
+
+class Dictionary(dict):
+    """``System.Collections.Generic.Dictionary`` as used by the scripts."""
+
+    def Add(self, key, value):
+        self[key] = value
+
+    def ContainsKey(self, key):
+        return key in self
+
+    @property
+    def Count(self):
+        return len(self)
+
+
+#========================================
+#  fusion_cac_script_engine.Models
+#========================================
+class Record:
+    """
+    Base for host model objects.
+
+    Workflow models allow both ``dv.Result`` and ``dv['Result']``, and the
+    scripts use the two interchangeably.
+    """
+
+    def __init__(self, **fields):
+        for name, value in fields.items():
+            setattr(self, name, value)
+
+    def __getitem__(self, name):
+        return getattr(self, name, None)
+
+    def __setitem__(self, name, value):
+        setattr(self, name, value)
+
+    def __contains__(self, name):
+        return getattr(self, name, None) is not None
+
+    def get(self, name, default=None):
+        value = getattr(self, name, None)
+        return default if value is None else value
+
+    def __repr__(self):
+        return "%s(%s)" % (
+            type(self).__name__,
+            ", ".join("%s=%r" % item for item in sorted(vars(self).items())),
+        )
+
+
+class Patient(Record):
+    def __init__(self, Gender=None, BirthDate=None, MedicalRecordNumber=None, **fields):
+        Record.__init__(self, Gender=Gender, BirthDate=BirthDate,
+                        MedicalRecordNumber=MedicalRecordNumber, **fields)
+
+
+class CodeReference(Record):
+    def __init__(self, Code, Value=None, Description=None, Phrase=None, Start=None, Length=None, **fields):
+        Record.__init__(self, Code=Code, Value=Value, Description=Description,
+                        Phrase=Phrase, Start=Start, Length=Length, **fields)
+
+
+class CACDocument(Record):
+    def __init__(self, DocumentId, DocumentType=None, DocumentDateTime=None,
+                 CodeReferences=None, AbstractionReferences=None, **fields):
+        Record.__init__(self, DocumentId=DocumentId, DocumentType=DocumentType,
+                        DocumentDateTime=DocumentDateTime,
+                        CodeReferences=List(CodeReferences or []),
+                        AbstractionReferences=List(AbstractionReferences or []), **fields)
+
+
+class Medication(Record):
+    def __init__(self, ExternalId, Medication=None, Dosage=None, Route=None, StartDate=None,
+                 EndDate=None, Status=None, Category=None, CDIAlertCategory=None, **fields):
+        Record.__init__(self, ExternalId=ExternalId, Medication=Medication, Dosage=Dosage,
+                        Route=Route, StartDate=StartDate, EndDate=EndDate, Status=Status,
+                        Category=Category, CDIAlertCategory=CDIAlertCategory, **fields)
+
+
+class DiscreteValue(Record):
+    def __init__(self, UniqueId, Name=None, Result=None, ResultDate=None, _id=None, **fields):
+        Record.__init__(self, UniqueId=UniqueId, Name=Name, Result=Result, ResultDate=ResultDate,
+                        _id=_id if _id is not None else UniqueId, **fields)
+
+
+class DiagnosisCode(Record):
+    def __init__(self, Code, Description=None, IsPrincipal=False, **fields):
+        Record.__init__(self, Code=Code, Description=Description, IsPrincipal=IsPrincipal, **fields)
+
+
+class AccountWorkingHistoryEntry(Record):
+    def __init__(self, Diagnoses=None, Procedures=None, AdmitDiagnosis=None, **fields):
+        Record.__init__(self, Diagnoses=List(Diagnoses or []), Procedures=List(Procedures or []),
+                        AdmitDiagnosis=AdmitDiagnosis, **fields)
+
+
+class MatchedCriteriaLink(Record):
+    def __init__(self, LinkText, DocumentId=None, Code=None, DiscreteValueId=None, IsValidated=True,
+                 UserNotes=None, LatestDiscreteValueId=None, Sequence=0):
+        Record.__init__(self, LinkText=LinkText, DocumentId=DocumentId, Code=Code,
+                        DiscreteValueId=DiscreteValueId, IsValidated=IsValidated,
+                        UserNotes=UserNotes, LatestDiscreteValueId=LatestDiscreteValueId,
+                        Sequence=Sequence, MedicationId=None, MedicationName=None,
+                        DiscreteValueName=None, Hidden=False, Links=List())
+
+
+class MatchedCriteriaGroup(Record):
+    def __init__(self, CriteriaGroup, IsValidated=False, Outcome=None, Reason=None, Subtitle=None,
+                 Links=None, **fields):
+        Record.__init__(self, CriteriaGroup=CriteriaGroup, IsValidated=IsValidated, Outcome=Outcome,
+                        Reason=Reason, Subtitle=Subtitle, Links=List(Links or []), **fields)
+
+
+class Account(Record):
+    def __init__(self, _id, AdmitDateTime=None, DischargeDateTime=None, Patient=None, PatientType=None,
+                 AdmitSource=None, Documents=None, Medications=None, DiscreteValues=None,
+                 MatchedCriteriaGroups=None, WorkingHistory=None, **fields):
+        Record.__init__(self, _id=_id, AdmitDateTime=AdmitDateTime, DischargeDateTime=DischargeDateTime,
+                        Patient=Patient, PatientType=PatientType, AdmitSource=AdmitSource,
+                        Documents=List(Documents or []), Medications=List(Medications or []),
+                        DiscreteValues=List(DiscreteValues or []),
+                        MatchedCriteriaGroups=List(MatchedCriteriaGroups or []),
+                        WorkingHistory=WorkingHistory, **fields)
+
+
+class EvaluationResult(Record):
+    """The ``result`` object a script fills in."""
+
+    def __init__(self):
+        Record.__init__(self, Passed=False, Subtitle=None, Outcome=None, Reason=None,
+                        Validated=False, Links=List())
+
+
+#========================================
+#  fusion_cac_script_engine.Lib.Scripting
+#========================================
+def _clean_number(result):
+    value = re.sub("[\\<\\>]", "", str(result))
+    if value.count('.') <= 1 and value.replace(".", "").isnumeric():
+        return float(value)
+    return None
+
+
+def _date_text(value):
+    if value is None:
+        return ""
+    return value.ToString("MM/dd/yyyy")
+
+
+class AccountWorkflowContainer:
+    """
+    Link builder over a single account.
+
+    Mirrors the lookups of the workflow container: the newest matching
+    discrete value or medication within ``days_back`` days, and the first
+    matching code, abstraction or document reference.
+
+    ``on_read``, when set, is called with the input field and the key of
+    every lookup, e.g. ``("discrete_values", "pH")`` (see
+    ``EvaluationContext.record``).
+    """
+
+    on_read = None
+
+    def __init__(self, account, use_discrete_collection=True, medication_category="Category",
+                 days_back=7, repository=None):
+        self.account = account
+        self.medication_category = medication_category
+        self.days_back = days_back
+        self._repository = repository
+        self._discrete_values = None
+        self._code_keys = None
+
+    def _account_discrete_values(self):
+        if self._discrete_values is None:
+            limit = DateTime.Now.AddDays(-self.days_back)
+            if self._repository is not None:
+                values = self._repository.GetDiscreteValues(self.account._id, limit)
+            else:
+                values = self.account.DiscreteValues
+            values = [dv for dv in values or [] if dv.ResultDate is not None and dv.ResultDate >= limit]
+            values.sort(key=lambda dv: dv.ResultDate, reverse=True)
+            self._discrete_values = values
+        return self._discrete_values
+
+    def _code_link(self, document, reference, link_text):
+        text = link_text
+        text = text.replace("[CODE]", reference.Code or "")
+        text = text.replace("[ABSTRACTVALUE]", str(reference.Value) if reference.Value is not None else "")
+        text = text.replace("[PHRASE]", reference.Phrase or "")
+        text = text.replace("[DOCUMENTTYPE]", document.DocumentType or "")
+        text = text.replace("[DOCUMENTDATE]", _date_text(document.DocumentDateTime))
+        return MatchedCriteriaLink(text, document.DocumentId, reference.Code, None, True)
+
+    @property
+    def CodeKeys(self):
+        # Not reported to ``on_read``: the codes a script picks from the keys
+        # are read through ``GetFirstCodeLink``.
+        if self._code_keys is None:
+            keys = []
+            seen = set()
+            for document in self.account.Documents or []:
+                for reference in document.CodeReferences or []:
+                    if reference.Code not in seen:
+                        seen.add(reference.Code)
+                        keys.append(reference.Code)
+            self._code_keys = keys
+        return self._code_keys
+
+    def _read(self, field, key):
+        if self.on_read is not None:
+            self.on_read(field, key)
+
+    def GetFirstCodeLink(self, code, link_text):
+        self._read("codes", code)
+        for document in self.account.Documents or []:
+            for reference in document.CodeReferences or []:
+                if reference.Code == code:
+                    return self._code_link(document, reference, link_text)
+        return None
+
+    def GetCodeLinks(self, code, link_text):
+        self._read("codes", code)
+        links = List()
+        for document in self.account.Documents or []:
+            for reference in document.CodeReferences or []:
+                if reference.Code == code:
+                    links.Add(self._code_link(document, reference, link_text))
+        return links
+
+    def GetFirstLinkMatchingAbstractionValue(self, code, link_text, predicate):
+        self._read("abstractions", code)
+        for document in self.account.Documents or []:
+            for reference in document.AbstractionReferences or []:
+                if reference.Code == code and predicate(reference.Value):
+                    return self._code_link(document, reference, link_text)
+        return None
+
+    def GetFirstLinkMatchingDiscreteValue(self, name, link_text, predicate):
+        self._read("discrete_values", name)
+        for dv in self._account_discrete_values():
+            if dv.Name != name:
+                continue
+            value = _clean_number(dv.Result)
+            try:
+                matched = predicate(value if value is not None else dv.Result)
+            except TypeError:
+                matched = False
+            if matched:
+                text = link_text.replace("[VALUE]", dv.Result or "")
+                text = text.replace("[RESULTDATETIME]", dv.ResultDate.ToString("MM/dd/yyyy, HH:mm"))
+                return MatchedCriteriaLink(text, None, None, dv.UniqueId or dv._id, True)
+        return None
+
+    def GetFirstMedicationLink(self, category, link_text):
+        self._read("medications", category)
+        limit = DateTime.Now.AddDays(-self.days_back)
+        newest = None
+        for medication in self.account.Medications or []:
+            if (
+                medication[self.medication_category] == category and
+                medication.StartDate is not None and
+                medication.StartDate >= limit and
+                (newest is None or medication.StartDate > newest.StartDate)
+            ):
+                newest = medication
+        if newest is None:
+            return None
+        text = link_text.replace("[MEDICATION]", newest.Medication or "")
+        text = text.replace("[DOSAGE]", newest.Dosage or "")
+        text = text.replace("[ROUTE]", newest.Route or "")
+        text = text.replace("[STARTDATE]", _date_text(newest.StartDate))
+        link = MatchedCriteriaLink(text, None, None, None, True)
+        link.MedicationId = newest.ExternalId
+        link.MedicationName = newest.Medication
+        return link
+
+    def GetFirstDocumentLink(self, document_type, link_text):
+        self._read("document_types", document_type)
+        for document in self.account.Documents or []:
+            if document.DocumentType == document_type:
+                text = link_text.replace("[DOCUMENTTYPE]", document.DocumentType or "")
+                text = text.replace("[DOCUMENTDATE]", _date_text(document.DocumentDateTime))
+                return MatchedCriteriaLink(text, document.DocumentId, None, None, True)
+        return None
+
+
+class CACDataRepository:
+    """
+    In-memory repository standing in for the workflow database.
+
+    ``accounts`` maps account ids to ``Account`` objects; a repository built
+    without it (as the scripts build theirs) serves the accounts given to
+    ``set_accounts``.  Discrete values
+    are served from ``Account.DiscreteValues``, matching the separate
+    discrete value collection of the real repository.
+    """
+
+    def __init__(self, accounts=None):
+        self.accounts = accounts if accounts is not None else _accounts
+        self.messages = []
+        self._indexes = {}
+
+    def GetDiscreteValues(self, account_id, since=None, names=None):
+        """
+        Return the discrete values of an account in stored order.
+
+        ``since`` keeps values with a ``ResultDate`` at or after it and
+        ``names`` keeps values with one of those names; both are answered
+        from a per-account index, so rows outside the projection are never
+        copied.
+        """
+        account = self.accounts.get(account_id)
+        if account is None:
+            return List()
+        if since is None and names is None:
+            return List(account.DiscreteValues)
+        return List(self._discrete_value_index(account).select(names, since))
+
+    def _discrete_value_index(self, account):
+        # Built on first query and kept for as long as the account object is.
+        entry = self._indexes.get(account._id)
+        if entry is None or entry[0] is not account:
+            entry = self._indexes[account._id] = (account, DiscreteValueIndex(account.DiscreteValues))
+        return entry[1]
+
+    def GetAccountField(self, account_id, field):
+        account = self.accounts.get(account_id)
+        return account[field] if account is not None else None
+
+    def LogEvaluationScriptMessage(self, message, script_name, script_instance, level):
+        self.messages.append((level, script_name, script_instance, message))
+
+    def LogEvaluationScriptMessages(self, entries):
+        """Write ``(message, script_name, script_instance, level)`` entries in one call."""
+        self.messages.extend((level, name, instance, message) for message, name, instance, level in entries)
+
+
+#========================================
+#  Module registration
+#========================================
+def _module(name, **attributes):
+    module = types.ModuleType(name)
+    module.__dict__.update(attributes)
+    module.__all__ = [key for key in attributes if not key.startswith("_")]
+    return module
+
+
+def _no_op(*args, **kwargs):
+    return None
+
+
+def modules():
+    """Build the stand-in host modules, keyed by import name."""
+    generic = _module("System.Collections.Generic", List=List, Dictionary=Dictionary)
+    collections = _module("System.Collections", Generic=generic)
+    system = _module(
+        "System",
+        DateTime=DateTime, DateTimeKind=DateTimeKind, TimeSpan=TimeSpan,
+        Collections=collections,
+        Linq=_module("System.Linq"), Data=_module("System.Data"),
+        Configuration=_module("System.Configuration"), Core=_module("System.Core"),
+    )
+    models = _module(
+        "fusion_cac_script_engine.Models",
+        Account=Account, Patient=Patient, CACDocument=CACDocument, CodeReference=CodeReference,
+        Medication=Medication, DiscreteValue=DiscreteValue, DiagnosisCode=DiagnosisCode,
+        AccountWorkingHistoryEntry=AccountWorkingHistoryEntry,
+        MatchedCriteriaLink=MatchedCriteriaLink, MatchedCriteriaGroup=MatchedCriteriaGroup,
+    )
+    scripting = _module(
+        "fusion_cac_script_engine.Lib.Scripting",
+        CACDataRepository=CACDataRepository, AccountWorkflowContainer=AccountWorkflowContainer,
+    )
+    lib = _module("fusion_cac_script_engine.Lib", Scripting=scripting)
+    engine = _module("fusion_cac_script_engine", Lib=lib, Models=models)
+    clr = _module("clr", AddReference=_no_op, ImportExtensions=_no_op)
+    return {
+        "clr": clr,
+        "System": system,
+        "System.Collections": collections,
+        "System.Collections.Generic": generic,
+        "System.Linq": system.Linq,
+        "System.Data": system.Data,
+        "System.Configuration": system.Configuration,
+        "System.Core": system.Core,
+        "fusion_cac_script_engine": engine,
+        "fusion_cac_script_engine.Lib": lib,
+        "fusion_cac_script_engine.Lib.Scripting": scripting,
+        "fusion_cac_script_engine.Models": models,
+    }
+
+
+def install():
+    """Register the stand-in host modules in ``sys.modules``."""
+    for name, module in modules().items():
+        sys.modules.setdefault(name, module)
@@ -0,0 +1,204 @@
+"""
+Change-driven evaluation: re-run only the scripts whose inputs changed.
+
+Any change to an account re-queues it, and evaluating it runs every script
+again even when the change was a note none of them reads.  ``run_changed``
+fingerprints the account's inputs, compares them with the fingerprints taken
+at the previous evaluation and re-runs only the scripts whose manifest (see
+``cdi.manifest``) names something that changed.  The other scripts carry
+their previous result forward.
+
+Discrete values and medications are fingerprinted together with their age in
+whole days, so a value that ages past a day boundary (the scripts look back 1,
+2, 3, 4 and 7 days) or out of the window counts as a change even though the
+account itself did not change.
+"""
+
+import hashlib
+
+from .manifest import FIELDS, build
+from .runner import evaluating, load_script, run_logged, script_name
+
+_DAY_SECONDS = 24 * 60 * 60
+
+
+def _digest(items):
+    digest = hashlib.sha1()
+    for item in items:
+        digest.update(repr(item).encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _age_days(now, date):
+    age = now - date
+    total_days = getattr(age, "TotalDays", None)
+    if total_days is None:
+        total_days = age.total_seconds() / _DAY_SECONDS
+    return int(total_days // 1)
+
+
+def _text(value):
+    return None if value is None else str(value)
+
+
+def _grouped(entries):
+    # {key: [item, ...]} -> {key: digest}
+    groups = {}
+    for key, item in entries:
+        if key is not None:
+            groups.setdefault(key, []).append(item)
+    return dict((key, _digest(items)) for key, items in groups.items())
+
+
+class InputSnapshot:
+    """
+    Fingerprints of an account's inputs at one evaluation.
+
+    ``account`` covers the fields every script reads (admission, patient,
+    working history); the other attributes map each discrete value name,
+    medication category, code, abstraction code, document type and criteria
+    group on the account to a digest of everything recorded under it.
+    """
+
+    __slots__ = ("account",) + tuple(field for field in FIELDS if field != "code_patterns")
+
+    def __init__(self, account, **fields):
+        self.account = account
+        for field in self.__slots__[1:]:
+            setattr(self, field, fields.get(field, {}))
+
+    @classmethod
+    def take(cls, account, discrete_values, now, days_back=7):
+        """
+        Fingerprint ``account`` as of ``now``.
+
+        :param discrete_values: The account's discrete values; only those
+            within ``days_back`` days of ``now`` are fingerprinted.
+        """
+        patient = account.Patient
+        history = account["WorkingHistory"] or []
+        account_digest = _digest([
+            _text(account.AdmitDateTime), _text(account.DischargeDateTime),
+            account.PatientType, account.AdmitSource,
+            None if patient is None else (patient.Gender, _text(patient.BirthDate)),
+            [([diagnosis.Code for diagnosis in entry["Diagnoses"] or []],
+              None if entry["AdmitDiagnosis"] is None else entry["AdmitDiagnosis"]["Code"])
+             for entry in history],
+        ])
+
+        values = []
+        for dv in discrete_values or []:
+            age = _age_days(now, dv.ResultDate)
+            if age <= days_back:
+                values.append((dv.Name, (dv.UniqueId, dv.Result, _text(dv.ResultDate), age)))
+
+        medications = []
+        for med in account.Medications or []:
+            age = _age_days(now, med.StartDate)
+            if age <= days_back:
+                item = (med.ExternalId, med.Medication, med.Dosage, med.Route, _text(med.StartDate), med.Status, age)
+                medications.append((med["Category"], item))
+                if med["CDIAlertCategory"] != med["Category"]:
+                    medications.append((med["CDIAlertCategory"], item))
+
+        codes, abstractions, documents = [], [], []
+        for document in account.Documents or []:
+            where = (document.DocumentId, document.DocumentType, _text(document.DocumentDateTime))
+            documents.append((document.DocumentType, where))
+            for reference in document.CodeReferences or []:
+                codes.append((reference.Code, where + (reference.Phrase, _text(reference.Value))))
+            for reference in document.AbstractionReferences or []:
+                abstractions.append((reference.Code, where + (reference.Phrase, _text(reference.Value))))
+
+        groups = []
+        for alert in account.MatchedCriteriaGroups or []:
+            links = [(link.LinkText, [child.LinkText for child in link.Links or []]) for link in alert.Links or []]
+            groups.append((alert.CriteriaGroup, (alert.IsValidated, alert.Outcome, alert.Reason, alert.Subtitle, links)))
+
+        return cls(
+            account_digest,
+            discrete_values=_grouped(values),
+            medications=_grouped(medications),
+            codes=_grouped(codes),
+            abstractions=_grouped(abstractions),
+            document_types=_grouped(documents),
+            criteria_groups=_grouped(groups),
+        )
+
+    def changes(self, previous):
+        """
+        Return ``{field: set of keys}`` that differ from ``previous``, or
+        ``None`` when the account-wide fields changed and every script is
+        affected.
+        """
+        if previous is None or previous.account != self.account:
+            return None
+        changed = {}
+        for field in self.__slots__[1:]:
+            before, after = getattr(previous, field), getattr(self, field)
+            changed[field] = set(key for key in set(before) | set(after) if before.get(key) != after.get(key))
+        return changed
+
+
+def affects(manifest, changes):
+    """Return whether a script with ``manifest`` reads anything in ``changes``."""
+    if changes is None:
+        return True
+    for field, keys in changes.items():
+        if keys and not getattr(manifest, field).isdisjoint(keys):
+            return True
+    return any(manifest.matches_pattern(code) for code in changes.get("codes", ()))
+
+
+class EvaluationState:
+    """
+    What ``run_changed`` remembers about an account between evaluations.
+
+    :ivar snapshot: The ``InputSnapshot`` taken at the last evaluation.
+    :ivar results: ``{script name: EvaluationResult}`` as of the last
+        evaluation, carried forward for scripts that were skipped.
+    :ivar rerun: The scripts actually run by the last evaluation.
+    """
+
+    __slots__ = ("snapshot", "results", "rerun")
+
+    def __init__(self, snapshot=None, results=None, rerun=()):
+        self.snapshot = snapshot
+        self.results = results if results is not None else {}
+        self.rerun = list(rerun)
+
+
+def run_changed(account, scripts, state=None, manifests=None, repository=None, days_back=7):
+    """
+    Evaluate ``scripts`` (paths or ``(name, code)`` pairs) for ``account``,
+    re-running only those affected by changes since ``state``.
+
+    Scripts without a previous result (new, or failed last time) always run.
+
+    :param state: The ``EvaluationState`` returned by the previous call for
+        this account; ``None`` runs every script.
+    :param manifests: ``{script name: ScriptManifest}``.  Built from the
+        scripts when they are paths; a script without a manifest always runs.
+    :returns: A new ``EvaluationState`` whose ``results`` hold every
+        script's current result, run or carried forward.
+    """
+    if manifests is None:
+        manifests = build([script for script in scripts if isinstance(script, str)])
+    with evaluating(account, repository, days_back) as context:
+        now = context.since.AddDays(days_back)
+        snapshot = InputSnapshot.take(account, context.discrete_values.select(), now, days_back)
+        changes = snapshot.changes(state.snapshot) if state is not None else None
+        previous = state.results if state is not None else {}
+        results = {}
+        rerun = []
+        for script in scripts:
+            name = script_name(script)
+            manifest = manifests.get(name)
+            if previous.get(name) is not None and manifest is not None and not affects(manifest, changes):
+                results[name] = previous[name]
+                continue
+            code = load_script(script) if isinstance(script, str) else script[1]
+            rerun.append(name)
+            results[name] = run_logged(code, account, name, context.repository)
+        return EvaluationState(snapshot, results, rerun)
@@ -0,0 +1,207 @@
+"""
+Joins between discrete value series.
+
+Several scripts line readings up with their siblings (temperature with heart
+rate and respiratory rate, systolic with diastolic and MAP, hemoglobin with
+hematocrit) by scanning one list for every entry of another and comparing
+``ResultDate``.  ``ResultDateJoin`` replaces those nested loops with a single
+hash pass over the values.
+
+Readings charted by different devices rarely share a timestamp to the second,
+so the PaO2/FiO2 calculations allow a few minutes either way.  ``AsOfJoin``
+sorts each series once and finds every reading inside that tolerance with a
+bisect, instead of comparing only the last entry of each series.
+"""
+
+from bisect import bisect_left, bisect_right
+from datetime import timedelta
+from itertools import product
+
+try:
+    from collections.abc import Mapping
+except ImportError:
+    # IronPython 2.7, the workflow engine.
+    from collections import Mapping
+
+from .discrete_values import DiscreteValueIndex
+
+
+def _values_for(discrete_values, names):
+    if isinstance(discrete_values, DiscreteValueIndex):
+        return discrete_values.lookup(names)
+    if isinstance(discrete_values, Mapping):
+        return [discrete_values[key] for key in discrete_values]
+    return discrete_values or []
+
+
+def _in_order(values):
+    if isinstance(values, Mapping):
+        return [values[key] for key in values]
+    return list(values or [])
+
+
+def _add_minutes(date, minutes):
+    # .NET DateTime under IronPython, datetime everywhere else.
+    add_minutes = getattr(date, "AddMinutes", None)
+    if add_minutes is not None:
+        return add_minutes(minutes)
+    return date + timedelta(minutes=minutes)
+
+
+class JoinRow:
+    """
+    The values of each family that share one ``ResultDate``.
+
+    ``row[label]`` is the list of matching values in input order, which is
+    newest first (then read order) when the join was built from a
+    ``DiscreteValueIndex``.  Families without a value give an empty list.
+    """
+
+    __slots__ = ("ResultDate", "_families")
+
+    def __init__(self, result_date):
+        self.ResultDate = result_date
+        self._families = {}
+
+    def __getitem__(self, label):
+        return self._families.get(label, [])
+
+    def __contains__(self, label):
+        return label in self._families
+
+    def first(self, label):
+        """Return the first value for ``label``, or ``None``."""
+        values = self._families.get(label)
+        return values[0] if values else None
+
+    def last(self, label):
+        """Return the last value for ``label``, or ``None``."""
+        values = self._families.get(label)
+        return values[-1] if values else None
+
+    def _add(self, label, value):
+        self._families.setdefault(label, []).append(value)
+
+
+class ResultDateJoin:
+    """
+    Discrete values from several name families, grouped by exact ``ResultDate``.
+
+    :param discrete_values: A ``DiscreteValueIndex``, a mapping of values (such
+        as ``dict(maindiscreteDic)``) or any iterable of discrete values.
+    :param families: Maps a label to the discrete value names in that family,
+        e.g. ``{"sbp": dvSBP, "dbp": dvDBP}``.  A name listed under more than
+        one label joins every one of them.
+    :param predicate: Only join values for which this returns true, e.g. a
+        check that the result is numeric.
+    """
+
+    def __init__(self, discrete_values, families, predicate=None):
+        labels_by_name = {}
+        for label, names in families.items():
+            if isinstance(names, str):
+                names = (names,)
+            for name in names:
+                labels_by_name.setdefault(name, []).append(label)
+        self._rows = {}
+        for dv in _values_for(discrete_values, list(labels_by_name)):
+            labels = labels_by_name.get(dv.Name)
+            if labels is None or (predicate is not None and not predicate(dv)):
+                continue
+            row = self._rows.get(dv.ResultDate)
+            if row is None:
+                row = self._rows[dv.ResultDate] = JoinRow(dv.ResultDate)
+            for label in labels:
+                row._add(label, dv)
+
+    def get(self, result_date):
+        """Return the row for ``result_date``; an empty row if nothing matched."""
+        row = self._rows.get(result_date)
+        return row if row is not None else JoinRow(result_date)
+
+    def rows(self):
+        """Return every row, in the order its first value was seen."""
+        return list(self._rows.values())
+
+    def __iter__(self):
+        return iter(self._rows.values())
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __contains__(self, result_date):
+        return result_date in self._rows
+
+
+class _SortedSeries:
+    """One series sorted by ``ResultDate``, remembering the input order."""
+
+    __slots__ = ("_dates", "_entries")
+
+    def __init__(self, values):
+        entries = sorted(enumerate(_in_order(values)), key=lambda entry: (entry[1].ResultDate, entry[0]))
+        self._dates = [value.ResultDate for _, value in entries]
+        self._entries = entries
+
+    def between(self, start, stop):
+        """Values with ``start <= ResultDate <= stop``, in input order."""
+        lo = bisect_left(self._dates, start)
+        hi = bisect_right(self._dates, stop)
+        if lo >= hi:
+            return []
+        return [value for _, value in sorted(self._entries[lo:hi], key=lambda entry: entry[0])]
+
+
+class AsOfJoin:
+    """
+    Values of several series aligned to anchor values within a tolerance.
+
+    Each anchor is matched with every value of every family whose
+    ``ResultDate`` lies within ``tolerance`` minutes of its own, both ends
+    inclusive.  Sorting costs O(n log n) per family and each anchor costs a
+    bisect plus the size of its window.
+
+    :param anchors: The values to align to, e.g. the PaO2 readings.  A mapping
+        (such as the numbered dictionaries the scripts build) is read in
+        iteration order.
+    :param families: Maps a label to the values of that family, e.g.
+        ``{"fio2": discreteDic5}``.
+    :param tolerance: The allowed distance in minutes.
+    """
+
+    def __init__(self, anchors, families, tolerance):
+        series = dict((label, _SortedSeries(values)) for label, values in families.items())
+        self._rows = []
+        for anchor in _in_order(anchors):
+            row = JoinRow(anchor.ResultDate)
+            start = _add_minutes(anchor.ResultDate, -tolerance)
+            stop = _add_minutes(anchor.ResultDate, tolerance)
+            for label, values in series.items():
+                for value in values.between(start, stop):
+                    row._add(label, value)
+            self._rows.append((anchor, row))
+
+    def rows(self):
+        """Return ``(anchor, row)`` for every anchor, in anchor order."""
+        return list(self._rows)
+
+    def pairs(self, *labels):
+        """
+        Return every ``(anchor, value, ...)`` combination with one value from
+        each of ``labels``.
+
+        Anchors keep their input order and so do the values of each family,
+        so with newest-first input the first combination is the newest anchor
+        with the newest reading in its window.
+        """
+        matched = []
+        for anchor, row in self._rows:
+            for values in product(*[row[label] for label in labels]):
+                matched.append((anchor,) + values)
+        return matched
+
+    def __iter__(self):
+        return iter(self._rows)
+
+    def __len__(self):
+        return len(self._rows)
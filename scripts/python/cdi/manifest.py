@@ -0,0 +1,431 @@
+"""
+Static dependency manifests for the alert scripts.
+
+Each script declares what it reads as literals: discrete value name lists
+(``dvSerumSodium = [...]``), code dictionaries (``codeDic = {...}``), and
+string arguments to its lookup helpers (``medValue("Dextrose 5% in Water",
+...)``, ``abstractValue("FLUID_RESTRICTION", ...)``, ``multiCodeValue([...],
+...)``).  ``extract`` reads those literals with ``ast`` without running the
+script, so the manifest can decide what to fetch for an account and which
+scripts a change to the account can affect.  ``closed_gate`` finds the
+scripts that do nothing while their alert is closed, which
+``runner.run_account`` then skips for such accounts.
+
+Run ``python -m cdi.manifest [directory]`` to print the manifests of every
+script in a directory as JSON.
+"""
+
+import argparse
+import ast
+import json
+import os
+import re
+import sys
+import warnings
+
+from .runner import script_paths
+
+FIELDS = (
+    "discrete_values",
+    "medications",
+    "abstractions",
+    "codes",
+    "code_patterns",
+    "document_types",
+    "criteria_groups",
+)
+
+# Module-level literals, by the name they are assigned to.
+_DISCRETE_VALUE_LIST = re.compile(r"(?i)^dv")
+_CODE_DICTIONARY = re.compile(r"[cC]odeDic\d*$")
+_DOCUMENT_LIST = re.compile(r"(Doc|documentList)$")
+_MEDICATION_LIST = re.compile(r"^medSearchList$")
+
+# Helpers and container methods whose first argument names an input.
+_CODE_CALLS = frozenset(["codeValue", "cautionCode", "assignedCode", "GetFirstCodeLink", "GetCodeLinks"])
+_CODE_LIST_CALLS = frozenset(["multiCodeValue"])
+_CODE_PATTERN_CALLS = frozenset(["prefixCodeValue"])
+_ABSTRACTION_CALLS = frozenset(["abstractValue", "GetFirstLinkMatchingAbstractionValue"])
+_DOCUMENT_CALLS = frozenset(["documentLink", "GetFirstDocumentLink"])
+_DISCRETE_VALUE_CALLS = frozenset(["GetFirstLinkMatchingDiscreteValue"])
+_MEDICATION_CALLS = frozenset(["GetFirstMedicationLink", "insulinValue"])
+# medValue, ivMedValue, anesthesiaMedValue, medValueMulti, ...: the medication
+# category is the first string argument, after any dictionaries.
+_MEDICATION_HELPER = re.compile(r"(?i)medvalue(multi)?$")
+# Helpers and index methods, with the position of the argument naming the
+# discrete values they read: a list literal, or a name assigned one.
+_DISCRETE_VALUE_ARGUMENTS = {
+    "dvValue": 0,
+    "dvValueMulti": 1,
+    "dvValueMultiQuery": 1,
+    "compareValuesMulti": 1,
+    "dvPositiveCheck": 1,
+    "dvOxygenCheck": 1,
+    "DiscreteValueIndex": 1,
+    "lookup": 0,
+    "latest": 0,
+    "query": 0,
+    "select": 0,
+}
+# Evidence methods given a helper and its arguments, to call later.
+_DEFERRING_CALLS = frozenset(["define", "define_many"])
+
+
+class ScriptManifest:
+    """
+    The inputs one script reads.
+
+    Every field is a ``frozenset`` of strings: discrete value names,
+    medication categories, abstraction codes, ICD-10 codes, code patterns
+    (regular expressions given to ``prefixCodeValue``), document types and
+    the criteria groups the script raises.
+    """
+
+    __slots__ = ("name",) + FIELDS
+
+    def __init__(self, name, **fields):
+        self.name = name
+        for field in FIELDS:
+            setattr(self, field, frozenset(fields.get(field, ())))
+
+    def matches_pattern(self, code):
+        """Return whether ``code`` matches one of the ``code_patterns``."""
+        return any(re.match(pattern, code) for pattern in self.code_patterns)
+
+    def to_dict(self):
+        """Return the manifest as JSON-ready lists, sorted."""
+        manifest = {"name": self.name}
+        for field in FIELDS:
+            manifest[field] = sorted(getattr(self, field))
+        return manifest
+
+    def __eq__(self, other):
+        if not isinstance(other, ScriptManifest):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        return "ScriptManifest(%r, %s)" % (
+            self.name,
+            ", ".join("%s=%d" % (field, len(getattr(self, field))) for field in FIELDS),
+        )
+
+
+def _strings(node):
+    # The string constants of a list, tuple or set literal, or the keys of a dict.
+    if isinstance(node, ast.Dict):
+        elements = node.keys
+    elif isinstance(node, (ast.List, ast.Tuple, ast.Set)):
+        elements = node.elts
+    else:
+        return []
+    return [element.value for element in elements
+            if isinstance(element, ast.Constant) and isinstance(element.value, str)]
+
+
+def _first_string(arguments):
+    for argument in arguments:
+        if isinstance(argument, ast.Constant) and isinstance(argument.value, str):
+            return argument.value
+    return None
+
+
+def _names(argument, lists):
+    # The strings an argument stands for: a literal, or a name assigned lists.
+    if isinstance(argument, ast.Constant) and isinstance(argument.value, str):
+        return [argument.value]
+    if isinstance(argument, ast.Name):
+        return lists.get(argument.id, [])
+    return _strings(argument)
+
+
+def _call_name(call):
+    if isinstance(call.func, ast.Name):
+        return call.func.id
+    if isinstance(call.func, ast.Attribute):
+        return call.func.attr
+    return None
+
+
+def _called(call):
+    # The helper a call makes and its arguments, seeing through the deferred
+    # lookups of cdi.evidence: evidence.define("name", helper, *arguments).
+    function = _call_name(call)
+    if function in _DEFERRING_CALLS and len(call.args) > 1 and isinstance(call.args[1], ast.Name):
+        return call.args[1].id, call.args[2:]
+    return function, call.args
+
+
+def _parse(source, name):
+    with warnings.catch_warnings():
+        # The scripts write regular expressions such as "^A41\." without raw strings.
+        warnings.simplefilter("ignore", SyntaxWarning)
+        warnings.simplefilter("ignore", DeprecationWarning)
+        return ast.parse(source, name)
+
+
+def extract(source, name="<script>"):
+    """Return the ``ScriptManifest`` of a script's source text."""
+    fields = dict((field, set()) for field in FIELDS)
+    tree = _parse(source, name)
+    lists = {}
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Assign):
+            for target in node.targets:
+                if isinstance(target, ast.Name):
+                    lists.setdefault(target.id, []).extend(_strings(node.value))
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Assign):
+            for target in node.targets:
+                if not isinstance(target, ast.Name):
+                    continue
+                if _DISCRETE_VALUE_LIST.search(target.id):
+                    fields["discrete_values"].update(_strings(node.value))
+                elif _CODE_DICTIONARY.search(target.id):
+                    fields["codes"].update(_strings(node.value))
+                elif _DOCUMENT_LIST.search(target.id):
+                    fields["document_types"].update(_strings(node.value))
+                elif _MEDICATION_LIST.search(target.id):
+                    fields["medications"].update(_strings(node.value))
+        elif isinstance(node, ast.Call) and node.args:
+            function, arguments = _called(node)
+            if not arguments:
+                continue
+            position = _DISCRETE_VALUE_ARGUMENTS.get(function)
+            if position is not None and position < len(arguments):
+                fields["discrete_values"].update(_names(arguments[position], lists))
+            first = arguments[0]
+            literal = first.value if isinstance(first, ast.Constant) and isinstance(first.value, str) else None
+            if function in _CODE_LIST_CALLS:
+                fields["codes"].update(_strings(first))
+            elif literal is None and not (function and _MEDICATION_HELPER.search(function)):
+                continue
+            elif function in _CODE_CALLS:
+                fields["codes"].add(literal)
+            elif function in _CODE_PATTERN_CALLS:
+                fields["code_patterns"].add(literal)
+            elif function in _ABSTRACTION_CALLS:
+                fields["abstractions"].add(literal)
+            elif function in _DOCUMENT_CALLS:
+                fields["document_types"].add(literal)
+            elif function in _DISCRETE_VALUE_CALLS:
+                fields["discrete_values"].add(literal)
+            elif function in _MEDICATION_CALLS:
+                fields["medications"].add(literal)
+            elif function and _MEDICATION_HELPER.search(function):
+                category = _first_string(arguments)
+                if category is not None:
+                    fields["medications"].add(category)
+        elif isinstance(node, ast.Compare) and len(node.ops) == 1 and isinstance(node.ops[0], ast.Eq):
+            # for alert in account.MatchedCriteriaGroups: if alert.CriteriaGroup == 'Anemia':
+            left, right = node.left, node.comparators[0]
+            if isinstance(left, ast.Attribute) and left.attr == "CriteriaGroup":
+                if isinstance(right, ast.Constant) and isinstance(right.value, str):
+                    fields["criteria_groups"].add(right.value)
+    return ScriptManifest(name, **fields)
+
+
+def reads_clock(source, name="<script>"):
+    """
+    Return whether a script uses the current time other than as the anchor of
+    a date window.
+
+    ``DateTime.Now.AddDays(-7)`` only decides which values are inside a
+    window, which the value fingerprints already account for; a bare
+    ``DateTime.Now`` (e.g. formatted into a link) makes the result depend
+    on when the script ran.
+    """
+    tree = _parse(source, name)
+    parents = {}
+    for node in ast.walk(tree):
+        for child in ast.iter_child_nodes(node):
+            parents[child] = node
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Attribute) and node.attr in ("Now", "UtcNow", "Today"):
+            parent = parents.get(node)
+            if not (isinstance(parent, ast.Attribute) and parent.attr.startswith("Add")):
+                return True
+    return False
+
+
+def _is_call_on(node, name):
+    # scriptLog.debug(...), scriptLog.flush(): a call of a method of ``name``.
+    return isinstance(node, ast.Expr) and isinstance(node.value, ast.Call) and \
+        isinstance(node.value.func, ast.Attribute) and isinstance(node.value.func.value, ast.Name) and \
+        node.value.func.value.id == name
+
+
+def _assigned(nodes, name):
+    # The values assigned to ``name`` anywhere in ``nodes``.
+    values = []
+    for statement in nodes:
+        for node in ast.walk(statement):
+            if isinstance(node, ast.Assign):
+                if any(isinstance(target, ast.Name) and target.id == name for target in node.targets):
+                    values.append(node.value)
+            elif isinstance(node, (ast.AugAssign, ast.AnnAssign, ast.For, ast.With)):
+                targets = [getattr(node, "target", None)] + [item.optional_vars for item in getattr(node, "items", ())]
+                if any(isinstance(target, ast.Name) and target.id == name for target in targets):
+                    values.append(None)
+    return values
+
+
+def _is_false(node):
+    return isinstance(node, ast.Constant) and node.value is False
+
+
+def _flags(test):
+    # The names of a test made only of names, ``and``, ``or`` and ``not``.
+    if isinstance(test, ast.Name):
+        return [test.id]
+    if isinstance(test, ast.BoolOp):
+        names = []
+        for value in test.values:
+            inner = _flags(value)
+            if inner is None:
+                return None
+            names.extend(inner)
+        return names
+    return None
+
+
+def _criteria_group(prelude):
+    # The group of a top-level ``for alert in account.MatchedCriteriaGroups``
+    # loop setting ``validated = alert.IsValidated`` for its first match.
+    for statement in prelude:
+        if not (isinstance(statement, ast.For) and isinstance(statement.target, ast.Name)):
+            continue
+        source = statement.iter.values[0] if isinstance(statement.iter, ast.BoolOp) else statement.iter
+        if not (isinstance(source, ast.Attribute) and source.attr == "MatchedCriteriaGroups"):
+            continue
+        alert = statement.target.id
+        for branch in statement.body:
+            test = getattr(branch, "test", None)
+            if not (isinstance(branch, ast.If) and isinstance(test, ast.Compare) and len(test.ops) == 1 and
+                    isinstance(test.ops[0], ast.Eq) and isinstance(test.left, ast.Attribute) and
+                    test.left.attr == "CriteriaGroup" and isinstance(test.comparators[0], ast.Constant)):
+                continue
+            reads_state = any(
+                isinstance(value, ast.Attribute) and value.attr == "IsValidated" and
+                isinstance(value.value, ast.Name) and value.value.id == alert
+                for value in _assigned(branch.body, "validated"))
+            if reads_state and isinstance(branch.body[-1], ast.Break):
+                return test.comparators[0].value
+    return None
+
+
+def closed_gate(source, name="<script>"):
+    """
+    Return the criteria group whose validated alert makes a script return an
+    empty result, or ``None`` when the script cannot be shown to.
+
+    The scripts look up their alert in ``account.MatchedCriteriaGroups`` and
+    do their work under ``if validated is False:``; the ``else`` only logs
+    that the alert is closed.  A script qualifies when nothing outside that
+    ``if`` touches ``result`` or sets ``validated`` other than from its
+    alert, and the statements after it are ``scriptLog`` calls and ``if``
+    blocks testing flags that are only ever ``False`` outside of it.  For
+    such a script an alert whose ``IsValidated`` is not ``False`` decides
+    the result before any of the account's data is read.
+    """
+    body = _parse(source, name).body
+    gates = [index for index, statement in enumerate(body)
+             if isinstance(statement, ast.If) and isinstance(statement.test, ast.Compare) and
+             isinstance(statement.test.left, ast.Name) and statement.test.left.id == "validated" and
+             len(statement.test.ops) == 1 and isinstance(statement.test.ops[0], ast.Is) and
+             _is_false(statement.test.comparators[0])]
+    if len(gates) != 1:
+        return None
+    prelude, gate, after = body[:gates[0]], body[gates[0]], body[gates[0] + 1:]
+    if not all(_is_call_on(statement, "scriptLog") for statement in gate.orelse):
+        return None
+    group = _criteria_group(prelude)
+    if group is None:
+        return None
+    values = _assigned(prelude + after, "validated")
+    states = [value for value in values if isinstance(value, ast.Attribute) and value.attr == "IsValidated"]
+    if len(states) != 1 or not all(_is_false(value) for value in values if value not in states):
+        return None
+    if any(isinstance(node, ast.Name) and node.id == "result"
+           for statement in prelude + gate.orelse for node in ast.walk(statement)):
+        return None
+    for statement in after:
+        if _is_call_on(statement, "scriptLog"):
+            continue
+        flags = _flags(statement.test) if isinstance(statement, ast.If) else None
+        if not flags:
+            return None
+        for flag in flags:
+            # Set to False up front, and to anything else only inside blocks that never run.
+            if not any(isinstance(node, ast.Assign) and _is_false(node.value) and
+                       any(isinstance(target, ast.Name) and target.id == flag for target in node.targets)
+                       for node in prelude):
+                return None
+            if not all(_is_false(value) for value in _assigned(prelude + gate.orelse, flag)):
+                return None
+        if statement.orelse:
+            return None
+    return group
+
+
+def gates(paths):
+    """
+    Return ``{script name: criteria group}`` of the scripts at ``paths``
+    that ``closed_gate`` accepts.  A script that cannot be read or parsed
+    is left out, so it always runs.
+    """
+    found = {}
+    for path in paths:
+        try:
+            with open(path) as handle:
+                group = closed_gate(handle.read(), path)
+        except (OSError, SyntaxError, ValueError):
+            continue
+        if group is not None:
+            found[os.path.basename(path)] = group
+    return found
+
+
+def load(path):
+    """Return the ``ScriptManifest`` of the script at ``path``, named after its file."""
+    with open(path) as handle:
+        return extract(handle.read(), os.path.basename(path))
+
+
+def build(paths):
+    """Return ``{script name: ScriptManifest}`` for the scripts at ``paths``, in order."""
+    manifests = {}
+    for path in paths:
+        manifest = load(path)
+        manifests[manifest.name] = manifest
+    return manifests
+
+
+def combined(manifests, name="*"):
+    """Return one manifest holding everything any of ``manifests`` reads."""
+    fields = dict((field, set()) for field in FIELDS)
+    for manifest in manifests:
+        for field in FIELDS:
+            fields[field].update(getattr(manifest, field))
+    return ScriptManifest(name, **fields)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m cdi.manifest", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("directory", nargs="?", help="script directory (default: scripts/python)")
+    parser.add_argument("-o", "--output", help="write the manifest here instead of stdout")
+    args = parser.parse_args(argv)
+
+    manifests = build(script_paths(args.directory))
+    document = dict((name, manifest.to_dict()) for name, manifest in manifests.items())
+    text = json.dumps(document, indent=2, sort_keys=True) + "\n"
+    if args.output:
+        with open(args.output, "w") as handle:
+            handle.write(text)
+    else:
+        sys.stdout.write(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
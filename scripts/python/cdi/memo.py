@@ -0,0 +1,251 @@
+"""
+Result memoization keyed by script version and input content.
+
+Accounts are often re-queued with exactly the clinical inputs they had before
+(a demographic edit, a workgroup reassignment), and every script then builds
+the same tree of ``MatchedCriteriaLink`` objects again.  ``run_memoized``
+keys each script's result on a hash of the script's compiled code and of the
+fingerprints (see ``cdi.incremental.InputSnapshot``) of just the inputs its
+manifest names, and serves repeat evaluations from a ``ResultCache``.
+
+A key is only sound if the manifest names everything the script reads, and a
+manifest is read off the source.  So while a script runs its context records
+the discrete values, medications, codes, abstractions and document types it
+looks up (see ``EvaluationContext.record``), and a result is cached only when
+the manifest names every one of them.  A script that reads something its
+manifest misses still runs, every time, and its results are never served
+from the cache.
+
+The discrete value and medication fingerprints carry each value's age in
+whole days relative to ``now``, so a key changes as values move across the
+scripts' date windows and a cached result is never served after its window
+has moved on.  Scripts that read the clock for anything else (see
+``manifest.reads_clock``) are never cached.
+"""
+
+import hashlib
+import inspect
+import json
+import marshal
+import sqlite3
+import time
+
+from . import helpers, host
+from .incremental import InputSnapshot
+from .manifest import build, reads_clock
+from .runner import evaluating, load_script, run_logged, script_name
+
+
+# Digest of the shared helpers' source, taken on first use.
+_helpers_digest = None
+
+
+def helpers_digest():
+    """Return a digest of the source of ``cdi.helpers``."""
+    global _helpers_digest
+    if _helpers_digest is None:
+        _helpers_digest = hashlib.sha1(inspect.getsource(helpers).encode("utf-8")).hexdigest()
+    return _helpers_digest
+
+
+def script_version(code):
+    """
+    Return a digest of a compiled script and the shared helpers it binds;
+    any edit to either changes it.
+    """
+    digest = hashlib.sha1(marshal.dumps(code))
+    digest.update(helpers_digest().encode("ascii"))
+    return digest.hexdigest()
+
+
+def input_key(version, manifest, snapshot):
+    """
+    Return the cache key of a script at ``version`` with ``manifest``
+    evaluated over an account with ``snapshot``.
+
+    Only the fingerprints of inputs the manifest names take part, in the
+    order the account holds them, so changes elsewhere on the account keep
+    the key.
+    """
+    digest = hashlib.sha1()
+    digest.update(version.encode("utf-8"))
+    digest.update(snapshot.account.encode("utf-8"))
+    for field in InputSnapshot.__slots__[1:]:
+        wanted = getattr(manifest, field)
+        for key, fingerprint in getattr(snapshot, field).items():
+            if key in wanted or (field == "codes" and manifest.matches_pattern(key)):
+                digest.update(("\0%s\0%s\0%s" % (field, key, fingerprint)).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def undeclared(manifest, reads):
+    """
+    Return the ``(field, key)`` pairs of ``reads`` (``{field: set of keys}``,
+    see ``EvaluationContext.record``) that ``manifest`` does not name, sorted.
+    A ``None`` key, a read of the whole field, is never named.
+    """
+    missing = []
+    for field, keys in reads.items():
+        wanted = getattr(manifest, field)
+        for key in keys:
+            if key is None or not (key in wanted or (field == "codes" and manifest.matches_pattern(key))):
+                missing.append((field, key))
+    return sorted(missing, key=lambda pair: (pair[0], pair[1] or ""))
+
+
+def _dump_link(link):
+    # Helpers that return False instead of a link sometimes get added as one;
+    # such entries are kept as they are.
+    if not hasattr(link, "__dict__"):
+        return link
+    fields = dict((name, value) for name, value in vars(link).items() if name != "Links")
+    fields["Links"] = [_dump_link(child) for child in link.Links or []]
+    return fields
+
+
+def _load_link(fields):
+    if not isinstance(fields, dict):
+        return fields
+    link = host.MatchedCriteriaLink(fields["LinkText"])
+    for name, value in fields.items():
+        if name != "Links":
+            link[name] = value
+    link.Links = host.List(_load_link(child) for child in fields["Links"])
+    return link
+
+
+def dump_result(result):
+    """Serialize an ``EvaluationResult`` and its link tree to JSON."""
+    return json.dumps({
+        "Passed": result.Passed,
+        "Subtitle": result.Subtitle,
+        "Outcome": result.Outcome,
+        "Reason": result.Reason,
+        "Validated": result.Validated,
+        "Links": [_dump_link(link) for link in result.Links or []],
+    }, sort_keys=True)
+
+
+def load_result(text):
+    """Rebuild an ``EvaluationResult`` serialized by ``dump_result``."""
+    fields = json.loads(text)
+    result = host.EvaluationResult()
+    for name in ("Passed", "Subtitle", "Outcome", "Reason", "Validated"):
+        result[name] = fields[name]
+    result.Links = host.List(_load_link(link) for link in fields["Links"])
+    return result
+
+
+class ResultCache:
+    """
+    SQLite store of serialized script results.
+
+    :param path: The database file; ``":memory:"`` keeps the cache in memory.
+    :param max_entries: Least recently used entries beyond this are evicted
+        on every write.
+    :param ttl: Seconds an entry stays valid after it was written; ``None``
+        keeps entries until they are evicted.
+    :param clock: Source of the current time in seconds, for tests.
+    """
+
+    def __init__(self, path=":memory:", max_entries=100000, ttl=None, clock=time.time):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._connection = sqlite3.connect(path)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " key TEXT PRIMARY KEY, script TEXT NOT NULL, result TEXT NOT NULL,"
+            " created REAL NOT NULL, used REAL NOT NULL)"
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS results_used ON results (used)")
+        self._connection.commit()
+
+    def get(self, key):
+        """Return the cached ``EvaluationResult`` for ``key``, or ``None``."""
+        now = self.clock()
+        row = self._connection.execute("SELECT result, created FROM results WHERE key = ?", (key,)).fetchone()
+        if row is not None and self.ttl is not None and now - row[1] > self.ttl:
+            self._connection.execute("DELETE FROM results WHERE key = ?", (key,))
+            self._connection.commit()
+            row = None
+        if row is None:
+            self.misses += 1
+            return None
+        self._connection.execute("UPDATE results SET used = ? WHERE key = ?", (now, key))
+        self._connection.commit()
+        self.hits += 1
+        return load_result(row[0])
+
+    def put(self, key, script, result):
+        """Store ``result`` under ``key`` and evict down to ``max_entries``."""
+        now = self.clock()
+        self._connection.execute(
+            "INSERT OR REPLACE INTO results (key, script, result, created, used) VALUES (?, ?, ?, ?, ?)",
+            (key, script, dump_result(result), now, now),
+        )
+        excess = len(self) - self.max_entries
+        if excess > 0:
+            self._connection.execute(
+                "DELETE FROM results WHERE key IN (SELECT key FROM results ORDER BY used LIMIT ?)", (excess,))
+        self._connection.commit()
+
+    def clear(self):
+        """Drop every entry."""
+        self._connection.execute("DELETE FROM results")
+        self._connection.commit()
+
+    def close(self):
+        self._connection.close()
+
+    def __len__(self):
+        return self._connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+
+def run_memoized(account, scripts, cache, manifests=None, repository=None, days_back=7, uncached=None):
+    """
+    Evaluate ``scripts`` (paths or ``(name, code)`` pairs) for ``account``,
+    serving results whose script and inputs are unchanged from ``cache``.
+
+    :param manifests: ``{script name: ScriptManifest}``.  Built from the
+        scripts when they are paths; a script without a manifest always runs.
+    :param uncached: Names of scripts never served from the cache.  Defaults
+        to the path scripts that read the clock.
+    :returns: ``{script name: EvaluationResult}`` in script order; scripts
+        that raise map to ``None`` and are not cached, nor are results of
+        runs that read inputs the manifest does not name (see ``undeclared``).
+    """
+    paths = [script for script in scripts if isinstance(script, str)]
+    if manifests is None:
+        manifests = build(paths)
+    if uncached is None:
+        uncached = set()
+        for path in paths:
+            with open(path) as handle:
+                if reads_clock(handle.read(), path):
+                    uncached.add(script_name(path))
+    with evaluating(account, repository, days_back) as context:
+        now = context.since.AddDays(days_back)
+        snapshot = InputSnapshot.take(account, context.discrete_values.select(), now, days_back)
+        results = {}
+        for script in scripts:
+            name = script_name(script)
+            code = load_script(script) if isinstance(script, str) else script[1]
+            manifest = manifests.get(name)
+            key = None
+            if manifest is not None and name not in uncached:
+                key = input_key(script_version(code), manifest, snapshot)
+                cached = cache.get(key)
+                if cached is not None:
+                    results[name] = cached
+                    continue
+            context.reads = None if key is None else {}
+            try:
+                result = results[name] = run_logged(code, account, name, context.repository)
+            finally:
+                reads, context.reads = context.reads, None
+            if key is not None and result is not None and not undeclared(manifest, reads):
+                cache.put(key, name, result)
+        return results
@@ -0,0 +1,75 @@
+"""
+Parse-once numeric view of discrete value results.
+
+Every script carries the same ``cleanNumbers`` helper, which strips ``<`` and
+``>`` with a regular expression and checks the rest is a plain decimal.  It is
+called on the same result strings over and over: once when a helper filters
+values, again inside each ``float(cleanNumbers(...))`` comparison, and again in
+every helper that looks at the same discrete value.  ``parse_result`` does the
+work once per distinct result string and keeps the answer.
+"""
+
+_CACHE_LIMIT = 65536
+
+_cache = {}
+
+
+class ParsedResult:
+    """
+    A discrete value result, parsed.
+
+    :ivar text: The result with ``<`` and ``>`` removed, exactly what
+        ``cleanNumbers`` returns, or ``None`` when the result is not numeric.
+    :ivar value: ``text`` as a float, or ``None`` when the result is not numeric.
+    :ivar qualifier: ``"<"`` or ``">"`` when the result carried one, else ``None``.
+    """
+
+    __slots__ = ("text", "value", "qualifier")
+
+    def __init__(self, text, value, qualifier):
+        self.text = text
+        self.value = value
+        self.qualifier = qualifier
+
+    @property
+    def numeric(self):
+        return self.value is not None
+
+    def __repr__(self):
+        return "ParsedResult(%r, %r, %r)" % (self.text, self.value, self.qualifier)
+
+
+def _parse(result):
+    raw = str(result)
+    if "<" in raw:
+        qualifier = "<"
+    elif ">" in raw:
+        qualifier = ">"
+    else:
+        qualifier = None
+    text = raw.replace("<", "").replace(">", "")
+    if text.count(".") <= 1 and text.replace(".", "").isnumeric():
+        try:
+            return ParsedResult(text, float(text), qualifier)
+        except ValueError:
+            # Digits float() does not read, such as superscripts.
+            return ParsedResult(text, None, qualifier)
+    return ParsedResult(None, None, qualifier)
+
+
+def parse_result(result):
+    """Return the ``ParsedResult`` for a discrete value result, parsing each distinct result once."""
+    try:
+        parsed = _cache.get(result)
+    except TypeError:
+        return _parse(result)
+    if parsed is None:
+        if len(_cache) >= _CACHE_LIMIT:
+            _cache.clear()
+        parsed = _cache[result] = _parse(result)
+    return parsed
+
+
+def clean_numbers(result):
+    """Drop-in replacement for the scripts' ``cleanNumbers``, backed by ``parse_result``."""
+    return parse_result(result).text
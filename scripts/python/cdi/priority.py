@@ -0,0 +1,243 @@
+"""
+Priority classes for the alert queue.
+
+The queue is served oldest first, so an inpatient whose labs just came back
+waits behind every account of a bulk requeue after a code set update.
+``PriorityScheduler`` wraps a queue (see ``cdi.alert_queue``) and serves its
+entries by class instead:
+
+- ``fresh_results``: discrete values resulted within the last hour;
+- ``inpatient``: not yet discharged;
+- ``discharged``;
+- ``backfill``: bulk requeues.
+
+``classify`` picks the class of an account when it is queued.  Claims are
+shared between the classes with waiting entries in proportion to their
+weights (stride scheduling), so a backfill never starves and never holds up
+fresh results by more than its share: with the default weights fresh
+results get 8 of every 15 claims however deep the backfill.  A class that
+was empty does not bank its share; it starts level with the classes already
+being served.  Within a class entries stay oldest first.
+
+The scheduler records how long every entry of a class waited to be claimed
+and, once completed, how long it took end to end; ``report`` summarizes them
+and counts the entries that missed their class's target.
+"""
+
+import collections
+import datetime
+import time
+
+from .alert_queue import AlertQueue
+from .timing import summarize
+
+
+class PriorityClass:
+    """
+    A class of queued accounts.
+
+    :param weight: Share of the claims while other classes are waiting.
+    :param target_seconds: End to end latency the class should stay within,
+        or ``None``.
+    """
+
+    __slots__ = ("name", "weight", "target_seconds")
+
+    def __init__(self, name, weight, target_seconds=None):
+        self.name = name
+        self.weight = weight
+        self.target_seconds = target_seconds
+
+    def __repr__(self):
+        return "PriorityClass(%r, %r, %r)" % (self.name, self.weight, self.target_seconds)
+
+
+# Most urgent first; a class's position is its priority number in the queue.
+DEFAULT_CLASSES = (
+    PriorityClass("fresh_results", 8, 5 * 60),
+    PriorityClass("inpatient", 4, 30 * 60),
+    PriorityClass("discharged", 2, 4 * 60 * 60),
+    PriorityClass("backfill", 1),
+)
+
+# Sources of the bulk requeues, such as after a code set update.
+BACKFILL_SOURCES = frozenset(["Backfill", "CodeSetUpdate"])
+
+
+def classify(account, source=None, now=None, fresh_within=datetime.timedelta(hours=1)):
+    """
+    Return the name of the default class of ``account`` queued by ``source``.
+
+    Fresh results win over everything, a backfill included: they are what
+    the sepsis and shock alerts are waiting for.
+
+    :param now: The current ``datetime``; ``DateTime.Now`` by default.
+    """
+    if now is None:
+        from . import host
+        now = host.DateTime.Now.to_datetime()
+    since = now - fresh_within
+    for discrete_value in account.DiscreteValues:
+        result_date = discrete_value.ResultDate
+        if result_date is not None and result_date.to_datetime() >= since:
+            return "fresh_results"
+    if source in BACKFILL_SOURCES:
+        return "backfill"
+    if account.DischargeDateTime is not None:
+        return "discharged"
+    return "inpatient"
+
+
+class PriorityScheduler(AlertQueue):
+    """
+    Serves a queue by weighted fair priority classes.
+
+    Use it wherever a queue is expected: ``worker.drain`` and
+    ``consumer.consume`` claim through it unchanged.
+
+    :param queue: The underlying queue, holding the class position as each
+        entry's priority.
+    :param classes: ``PriorityClass`` es, most urgent first.
+    :param default: Class of entries queued without one.
+    :param history: Latencies kept per class for ``report``.
+    :param clock: Source of the current time in seconds; it should match
+        the queue's.
+    """
+
+    def __init__(self, queue, classes=DEFAULT_CLASSES, default="inpatient", history=10000, clock=time.time):
+        self.queue = queue
+        self.classes = list(classes)
+        self.clock = clock
+        self._numbers = dict((priority_class.name, number) for number, priority_class in enumerate(self.classes))
+        self.default = self._numbers[default]
+        self._passes = [0.0] * len(self.classes)
+        self._virtual = 0.0
+        self._claimed = {}
+        self.waits = [collections.deque(maxlen=history) for _ in self.classes]
+        self.latencies = [collections.deque(maxlen=history) for _ in self.classes]
+        self.late = [0] * len(self.classes)
+
+    @property
+    def lease_seconds(self):
+        return self.queue.lease_seconds
+
+    def number(self, name):
+        """Return the priority number of the class called ``name``."""
+        return self._numbers[name]
+
+    def enqueue(self, account_id, source="Workflow", time_queued=None, priority=None):
+        """Queue ``account_id`` in the class named ``priority``."""
+        self.enqueue_many([(account_id, source, time_queued, priority)])
+
+    def enqueue_many(self, entries):
+        """Queue ``(account_id, source, time_queued[, class name])`` entries."""
+        rows = []
+        for entry in entries:
+            name = entry[3] if len(entry) > 3 else None
+            rows.append(tuple(entry[:3]) + (self.default if name is None else self._numbers[name],))
+        self.queue.enqueue_many(rows)
+
+    def shares(self, limit, waiting):
+        """
+        Split ``limit`` claims between the classes by weight.
+
+        :param waiting: ``{priority: entries}`` waiting in each class.
+        :returns: Claims per priority number.
+        """
+        remaining = dict((number, count) for number, count in waiting.items()
+                         if count and number < len(self.classes))
+        for number in remaining:
+            # A class that was idle starts level with the ones being served.
+            self._passes[number] = max(self._passes[number], self._virtual)
+        shares = dict((number, 0) for number in remaining)
+        for _ in range(limit):
+            if not remaining:
+                break
+            number = min(remaining, key=lambda candidate: (self._passes[candidate], candidate))
+            shares[number] += 1
+            self._virtual = self._passes[number]
+            self._passes[number] += 1.0 / self.classes[number].weight
+            remaining[number] -= 1
+            if not remaining[number]:
+                del remaining[number]
+        return shares
+
+    def claim(self, limit=1, owner=None, lease_seconds=None, priority=None):
+        if priority is not None:
+            return self._record(self.queue.claim(limit, owner, lease_seconds, priority))
+        waiting = dict((number, count) for number, (count, _) in self.queue.waiting().items())
+        entries = []
+        for number, count in sorted(self.shares(limit, waiting).items()):
+            if count:
+                entries.extend(self.queue.claim(count, owner, lease_seconds, number))
+        return self._record(entries)
+
+    def _record(self, entries):
+        now = self.clock()
+        for entry in entries:
+            self.waits[entry.priority].append(now - entry.time_queued)
+            self._claimed[entry.token] = (entry.priority, entry.time_queued)
+        return entries
+
+    def renew(self, tokens, lease_seconds=None):
+        return self.queue.renew(tokens, lease_seconds)
+
+    def complete(self, tokens):
+        done = self.queue.complete(tokens)
+        now = self.clock()
+        for token in done:
+            if token not in self._claimed:
+                continue
+            number, time_queued = self._claimed.pop(token)
+            latency = now - time_queued
+            self.latencies[number].append(latency)
+            target = self.classes[number].target_seconds
+            if target is not None and latency > target:
+                self.late[number] += 1
+        for token in tokens:
+            self._claimed.pop(token, None)
+        return done
+
+    def release(self, tokens):
+        released = self.queue.release(tokens)
+        for token in tokens:
+            self._claimed.pop(token, None)
+        return released
+
+    def waiting(self):
+        return self.queue.waiting()
+
+    def report(self):
+        """
+        Return ``{class name: {"weight", "target_seconds", "waiting", "wait",
+        "latency", "late"}}``: entries waiting now, ``timing.summarize`` of
+        the waits to be claimed and of the end to end latencies (seconds),
+        and the completions that missed the target.
+        """
+        waiting = self.queue.waiting()
+        return dict((priority_class.name, {
+            "weight": priority_class.weight,
+            "target_seconds": priority_class.target_seconds,
+            "waiting": waiting.get(number, (0, None))[0],
+            "wait": summarize(self.waits[number]),
+            "latency": summarize(self.latencies[number]),
+            "late": self.late[number],
+        }) for number, priority_class in enumerate(self.classes))
+
+    def __len__(self):
+        return len(self.queue)
+
+
+def format_report(report):
+    """Return a ``PriorityScheduler.report`` as a plain text table."""
+    lines = ["%-16s %6s %8s %10s %10s %10s %6s" % (
+        "class (seconds)", "weight", "waiting", "wait p90", "total p50", "total p99", "late")]
+
+    def seconds(value):
+        return "%10.1f" % value if value is not None else "%10s" % "-"
+
+    for name, entry in report.items():
+        lines.append("%-16s %6s %8d %s %s %s %6d" % (
+            name, entry["weight"], entry["waiting"], seconds(entry["wait"]["p90"]),
+            seconds(entry["latency"]["p50"]), seconds(entry["latency"]["p99"]), entry["late"]))
+    return "\n".join(lines) + "\n"
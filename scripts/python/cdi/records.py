@@ -0,0 +1,264 @@
+"""
+Compact read-only records for account snapshots.
+
+The ``cdi.host`` models are open objects: any field can be set on them,
+which is what lets the scripts write ``dv.Result`` and ``dv['Result']`` alike,
+and every record owns its own copy of each string and date.  In an account
+snapshot most of those repeat (a few hundred result strings, names and codes;
+whole panels resulted at the same minute), and a worker holding many
+snapshots pays for every copy.
+
+The records here keep the same fields in ``__slots__`` and answer both kinds
+of access, so the scripts and the helpers in ``cdi`` read them unchanged.
+They are immutable: a snapshot is shared between all the scripts run for an
+account, and none of them may change it under the others.  Each also carries
+what the helpers keep deriving from it:
+
+- ``number``: the result (or dosage, or abstraction value) parsed with
+  ``numeric.parse_result``, ``None`` when not numeric;
+- ``timestamp``: the record's date as whole seconds since the epoch, UTC.
+
+Short strings (names, categories, codes, results, dosages) are interned and
+equal dates share one ``DateTime`` and one timestamp, so the repeats of a
+snapshot cost one pointer each.
+
+``compact_account`` converts the records of an ``Account`` in place.
+"""
+
+import datetime
+import sys
+
+from . import host
+from .numeric import parse_result
+
+_EPOCH = datetime.datetime(1970, 1, 1)
+
+_CACHE_LIMIT = 65536
+
+# Strings longer than this (phrases, descriptions) rarely repeat.
+_INTERN_LENGTH = 64
+
+_dates = {}
+
+
+def timestamp(value):
+    """Return a ``DateTime`` as whole seconds since the epoch, UTC, or ``None``."""
+    if value is None:
+        return None
+    moment = value.to_datetime()
+    if value.Kind != host.DateTimeKind.Utc:
+        moment = moment - host._local_offset
+    return int((moment - _EPOCH).total_seconds())
+
+
+def _shared_date(value):
+    # The shared copy of an equal DateTime and its timestamp.
+    if value is None:
+        return None, None
+    key = (value.to_datetime(), value.Kind)
+    shared = _dates.get(key)
+    if shared is None:
+        if len(_dates) >= _CACHE_LIMIT:
+            _dates.clear()
+        shared = _dates[key] = (value, timestamp(value))
+    return shared
+
+
+def _intern(value):
+    if type(value) is str and len(value) <= _INTERN_LENGTH:
+        return sys.intern(value)
+    return value
+
+
+class CompactRecord:
+    """
+    Base of the compact records: ``__slots__`` storage with attribute and
+    subscript access, like ``host.Record``, but no assignment.
+
+    ``_fields`` are the declared fields, ``_interned`` those to intern and
+    ``_dates`` the date fields to share; the first gives ``timestamp``.  A
+    record given other fields as well is made an instance of a subclass
+    with a ``__dict__`` to hold them, so the common case has none.
+    """
+
+    __slots__ = ()
+    _fields = ()
+    _interned = ()
+    _dates = ()
+
+    def __new__(cls, *args, **fields):
+        if any(name not in cls._fields for name in fields):
+            cls = _extended(cls)
+        return object.__new__(cls)
+
+    def __init__(self, **fields):
+        for name in self._fields:
+            value = fields.pop(name, None)
+            if name in self._interned:
+                value = _intern(value)
+            elif name in self._dates:
+                value, stamp = _shared_date(value)
+                if name == self._dates[0]:
+                    object.__setattr__(self, "timestamp", stamp)
+            object.__setattr__(self, name, value)
+        for name, value in fields.items():
+            object.__setattr__(self, name, value)
+
+    @classmethod
+    def from_record(cls, record):
+        """Return a compact copy of a ``host.Record`` (or mapping of fields)."""
+        if isinstance(record, CompactRecord):
+            fields = record.fields()
+        elif hasattr(record, "__dict__"):
+            fields = dict(vars(record))
+        else:
+            fields = dict(record)
+        return cls(**fields)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("%s is read-only" % type(self).__name__)
+
+    def __delattr__(self, name):
+        raise AttributeError("%s is read-only" % type(self).__name__)
+
+    def __getitem__(self, name):
+        return getattr(self, name, None)
+
+    def __contains__(self, name):
+        return getattr(self, name, None) is not None
+
+    def get(self, name, default=None):
+        value = getattr(self, name, None)
+        return default if value is None else value
+
+    def fields(self):
+        """Return the record's fields as a ``dict``, as given to the constructor."""
+        fields = dict((name, getattr(self, name)) for name in self._fields)
+        fields.update(getattr(self, "__dict__", ()))
+        return fields
+
+    def __reduce__(self):
+        return _rebuild, (_BASES.get(type(self), type(self)), self.fields())
+
+    def __repr__(self):
+        return "%s(%s)" % (
+            _BASES.get(type(self), type(self)).__name__,
+            ", ".join("%s=%r" % item for item in sorted(self.fields().items())),
+        )
+
+
+# Each record class with its subclass for records with undeclared fields,
+# and the other way round.
+_EXTENDED = {}
+_BASES = {}
+
+
+def _extended(cls):
+    extended = _EXTENDED.get(cls)
+    if extended is None:
+        extended = _EXTENDED[cls] = type(cls.__name__, (cls,), {"__module__": cls.__module__})
+        _BASES[extended] = cls
+    return extended
+
+
+def _rebuild(cls, fields):
+    return cls(**fields)
+
+
+class DiscreteValue(CompactRecord):
+    """
+    A discrete value, with ``number`` parsed from ``Result`` and
+    ``timestamp`` from ``ResultDate``.
+    """
+
+    __slots__ = ("UniqueId", "Name", "Result", "ResultDate", "_id", "number", "timestamp")
+    _fields = ("UniqueId", "Name", "Result", "ResultDate", "_id")
+    _interned = frozenset(["Name", "Result"])
+    _dates = ("ResultDate",)
+
+    def __init__(self, UniqueId, Name=None, Result=None, ResultDate=None, _id=None, **fields):
+        CompactRecord.__init__(self, UniqueId=UniqueId, Name=Name, Result=Result, ResultDate=ResultDate,
+                               _id=_id if _id is not None else UniqueId, **fields)
+        object.__setattr__(self, "number", None if Result is None else parse_result(Result).value)
+
+
+class Medication(CompactRecord):
+    """
+    A medication, with ``number`` parsed from ``Dosage`` and ``timestamp``
+    from ``StartDate``.
+    """
+
+    __slots__ = ("ExternalId", "Medication", "Dosage", "Route", "StartDate", "EndDate", "Status", "Category",
+                 "CDIAlertCategory", "number", "timestamp")
+    _fields = ("ExternalId", "Medication", "Dosage", "Route", "StartDate", "EndDate", "Status", "Category",
+               "CDIAlertCategory")
+    _interned = frozenset(["Medication", "Dosage", "Route", "Status", "Category", "CDIAlertCategory"])
+    _dates = ("StartDate", "EndDate")
+
+    def __init__(self, ExternalId, Medication=None, Dosage=None, Route=None, StartDate=None, EndDate=None,
+                 Status=None, Category=None, CDIAlertCategory=None, **fields):
+        CompactRecord.__init__(self, ExternalId=ExternalId, Medication=Medication, Dosage=Dosage, Route=Route,
+                               StartDate=StartDate, EndDate=EndDate, Status=Status, Category=Category,
+                               CDIAlertCategory=CDIAlertCategory, **fields)
+        object.__setattr__(self, "number", None if Dosage is None else parse_result(Dosage).value)
+
+
+class CodeReference(CompactRecord):
+    """A code found on a document."""
+
+    __slots__ = ("Code", "Value", "Description", "Phrase", "Start", "Length")
+    _fields = ("Code", "Value", "Description", "Phrase", "Start", "Length")
+    _interned = frozenset(["Code", "Value", "Description"])
+
+    def __init__(self, Code, Value=None, Description=None, Phrase=None, Start=None, Length=None, **fields):
+        CompactRecord.__init__(self, Code=Code, Value=Value, Description=Description, Phrase=Phrase,
+                               Start=Start, Length=Length, **fields)
+
+
+class AbstractionReference(CodeReference):
+    """An abstraction found on a document, with ``number`` parsed from ``Value``."""
+
+    __slots__ = ("number",)
+
+    def __init__(self, Code, Value=None, Description=None, Phrase=None, Start=None, Length=None, **fields):
+        CodeReference.__init__(self, Code, Value, Description, Phrase, Start, Length, **fields)
+        object.__setattr__(self, "number", None if Value is None else parse_result(Value).value)
+
+
+class Document(CompactRecord):
+    """
+    A document, holding its references as tuples of compact records, with
+    ``timestamp`` from ``DocumentDateTime``.
+    """
+
+    __slots__ = ("DocumentId", "DocumentType", "DocumentDateTime", "CodeReferences", "AbstractionReferences",
+                 "timestamp")
+    _fields = ("DocumentId", "DocumentType", "DocumentDateTime", "CodeReferences", "AbstractionReferences")
+    _interned = frozenset(["DocumentType"])
+    _dates = ("DocumentDateTime",)
+
+    def __init__(self, DocumentId, DocumentType=None, DocumentDateTime=None, CodeReferences=None,
+                 AbstractionReferences=None, **fields):
+        CompactRecord.__init__(
+            self, DocumentId=DocumentId, DocumentType=DocumentType, DocumentDateTime=DocumentDateTime,
+            CodeReferences=tuple(_compact(CodeReference, reference) for reference in CodeReferences or ()),
+            AbstractionReferences=tuple(_compact(AbstractionReference, reference)
+                                        for reference in AbstractionReferences or ()),
+            **fields)
+
+
+def _compact(cls, record):
+    if isinstance(record, cls):
+        return record
+    return cls.from_record(record)
+
+
+def compact_account(account):
+    """
+    Replace the discrete values, medications and documents of ``account``
+    with compact records, and return the account.
+    """
+    account.DiscreteValues = host.List(_compact(DiscreteValue, dv) for dv in account.DiscreteValues or ())
+    account.Medications = host.List(_compact(Medication, med) for med in account.Medications or ())
+    account.Documents = host.List(_compact(Document, document) for document in account.Documents or ())
+    return account
@@ -0,0 +1,150 @@
+"""
+Run the alert scripts for an account under CPython.
+
+``run_account`` evaluates a set of scripts against one account with a single
+``EvaluationContext``, so the account's discrete values, medications and code
+references are loaded once for the whole set rather than once per script.
+The workflow host is replaced by the stand-ins in ``cdi.host``.
+"""
+
+import glob
+import os
+from contextlib import contextmanager
+
+from . import host, timing
+from .context import EvaluationContext, activate, active, release
+
+
+def script_paths(directory=None):
+    """Return the alert scripts in ``directory`` (``scripts/python`` by default), sorted by name."""
+    if directory is None:
+        directory = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return sorted(glob.glob(os.path.join(directory, "*.py")))
+
+
+def load_script(path):
+    """
+    Return the compiled script at ``path``; it is compiled again only when
+    it changes (see ``cdi.script_cache``).
+    """
+    from .script_cache import load
+    return load(path)
+
+
+def run_script(code, account, script_name, script_instance=1):
+    """
+    Execute one compiled script against ``account`` and return its
+    ``EvaluationResult``.
+
+    The script picks up whatever context is active for the account, and is
+    timed by the active ``timing.Profiler``, if any.
+    """
+    result = host.EvaluationResult()
+    script_globals = {
+        "__name__": "__script__",
+        "account": account,
+        "result": result,
+        "scriptName": script_name,
+        "scriptInstance": script_instance,
+    }
+    profiler = timing.active()
+    if profiler is None:
+        exec(code, script_globals)
+    else:
+        profiler.run(code, script_globals, script_name, account)
+    return result
+
+
+@contextmanager
+def evaluating(account, repository=None, days_back=7, names=None):
+    """
+    Install the host stand-ins and activate a fresh ``EvaluationContext``
+    for ``account`` while the block runs.
+
+    ``repository`` defaults to an in-memory ``CACDataRepository`` holding
+    just ``account``; ``days_back`` and ``names`` limit the discrete values
+    fetched, as for ``EvaluationContext``.  The scripts' messages are
+    written to ``repository`` in one call when the block ends.
+    """
+    host.install()
+    if repository is None:
+        repository = host.CACDataRepository({account._id: account})
+    host.set_accounts(repository.accounts)
+    since = host.DateTime.Now.AddDays(-days_back)
+    context = activate(EvaluationContext(account, repository, since, names, batch_messages=True))
+    try:
+        yield context
+    finally:
+        release()
+
+
+def run_logged(code, account, name, repository):
+    """
+    Like ``run_script``, but an exception is logged to ``repository`` at
+    ``Error`` level and gives ``None`` instead of a result.  The messages the
+    script buffered before it raised are written first.
+    """
+    try:
+        return run_script(code, account, name)
+    except Exception as error:
+        context = active()
+        if context is not None:
+            context.flush_messages()
+        repository.LogEvaluationScriptMessage(
+            "%s: %s" % (type(error).__name__, error), name, 1, "Error")
+        return None
+
+
+def script_name(script):
+    """Return the name of a script given as a path or a ``(name, code)`` pair."""
+    if isinstance(script, str):
+        return os.path.basename(script)
+    return script[0]
+
+
+def alert_closed(account, criteria_group):
+    """
+    Return whether the alert of ``criteria_group`` on ``account`` is closed,
+    as the scripts decide it: the first alert of the group has an
+    ``IsValidated`` other than ``False``.
+    """
+    for alert in account.MatchedCriteriaGroups or []:
+        if alert.CriteriaGroup == criteria_group:
+            return alert.IsValidated is not False
+    return False
+
+
+def run_account(account, scripts, repository=None, days_back=7, names=None, gates=None):
+    """
+    Evaluate ``scripts`` (paths or ``(name, code)`` pairs) for ``account``.
+
+    The account's data is loaded when the first script asks for it, so an
+    account whose scripts are all skipped is never loaded.
+
+    :param repository: The repository the scripts read from.  Defaults to an
+        in-memory ``CACDataRepository`` holding just ``account``.
+    :param days_back: How many days of discrete values to fetch; the scripts
+        look back seven.
+    :param names: The discrete value names to fetch, e.g. every name the
+        scripts declare, ``manifest.combined(manifest.build(paths).values())
+        .discrete_values``.  All names when ``None``.
+    :param gates: ``{script name: criteria group}`` of the scripts that
+        return an empty result while their alert is closed,
+        ``manifest.gates(paths)``.  Those scripts are skipped, without
+        running or loading anything, for an account whose alert is closed
+        (see ``alert_closed``).
+    :returns: ``{script name: EvaluationResult}`` in script order.  A script
+        that raises is logged to the repository at ``Error`` level and maps
+        to ``None``; the remaining scripts still run.
+    """
+    with evaluating(account, repository, days_back, names) as context:
+        results = {}
+        for script in scripts:
+            name = script_name(script)
+            if gates and name in gates and alert_closed(account, gates[name]):
+                context.log(None, name, 1).debug("Alert Closed; script skipped. %s", account._id)
+                results[name] = host.EvaluationResult()
+                continue
+            code = load_script(script) if isinstance(script, str) else script[1]
+            results[name] = run_logged(code, account, name, context.repository)
+        return results
@@ -0,0 +1,256 @@
+"""
+Compiled scripts, cached and reloaded when their source changes.
+
+Workflow reads each alert script from source and compiles it before every
+run, so the cost of a run grows with the script (``sepsis-SIRS.py`` is some
+1,500 lines) before it has looked at the account at all.  Here each script
+is compiled once and its code object kept; every run executes that code
+against fresh globals (see ``runner.run_script``).
+
+Compiled code is also written to ``__pycache__`` beside the scripts, keyed
+by a digest of the source and of the path it was compiled as, so a new
+worker process unmarshals the code instead of compiling it again.  Entries
+are named after the script and the interpreter's cache tag; writing one
+removes the entries for older versions of the script.  A tree that cannot be
+written to still works, compiling in every process.
+
+``load`` returns the code of one script, compiling it again only when the
+file's modification time or size changed and its digest with them;
+``runner.load_script`` goes through it.  ``ScriptCache`` holds the scripts of
+a directory (or a list of paths): ``refresh`` picks up the scripts that
+changed, were added or were removed, and ``watch`` refreshes from a
+background thread.  Changed scripts are compiled before anything is swapped
+and the whole set is then replaced in one assignment, so a caller sees the
+old set or the new one, and runs already under way finish with the code they
+started with.  A script that no longer compiles keeps its previous version
+and is reported in ``errors``.
+"""
+
+import hashlib
+import marshal
+import os
+import sys
+import threading
+
+from .runner import script_paths
+
+# Cache statistics of this process: scripts compiled, and read from disk.
+stats = {"compiled": 0, "disk": 0}
+
+# Code objects of this process by digest, and the latest CompiledScript of
+# each path ``load`` was given.
+_codes = {}
+_loaded = {}
+
+
+class CompiledScript:
+    """A script's code, and the stamp and digest of the source it came from."""
+
+    __slots__ = ("name", "path", "stamp", "digest", "code")
+
+    def __init__(self, name, path, stamp, digest, code):
+        self.name = name
+        self.path = path
+        self.stamp = stamp
+        self.digest = digest
+        self.code = code
+
+
+def _stamp(path):
+    # A modification time or size other than the last one read means the
+    # source has to be hashed again.
+    status = os.stat(path)
+    return status.st_mtime_ns, status.st_size
+
+
+def source_digest(source, path):
+    """Return the cache key of ``source`` (bytes) compiled as ``path``."""
+    digest = hashlib.sha256(source)
+    digest.update(b"\0" + path.encode("utf-8"))
+    return digest.hexdigest()[:32]
+
+
+def _entry(cache_dir, name, digest):
+    return os.path.join(cache_dir, "%s.%s.%s.code" % (os.path.splitext(name)[0], digest,
+                                                      sys.implementation.cache_tag))
+
+
+def _read(cache_dir, name, digest):
+    try:
+        with open(_entry(cache_dir, name, digest), "rb") as handle:
+            return marshal.load(handle)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+
+
+def _write(cache_dir, name, digest, code):
+    entry = _entry(cache_dir, name, digest)
+    temporary = "%s.%d.tmp" % (entry, os.getpid())
+    prefix = os.path.splitext(name)[0] + "."
+    suffix = ".%s.code" % sys.implementation.cache_tag
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(temporary, "wb") as handle:
+            marshal.dump(code, handle)
+        # Readers in other processes see the whole entry or none of it.
+        os.replace(temporary, entry)
+        for other in os.listdir(cache_dir):
+            if other.startswith(prefix) and other.endswith(suffix) and \
+                    other[len(prefix):-len(suffix)].isalnum() and other != os.path.basename(entry):
+                os.remove(os.path.join(cache_dir, other))
+    except OSError:
+        try:
+            os.remove(temporary)
+        except OSError:
+            pass
+
+
+def compile_script(path, previous=None, cache_dir=None):
+    """
+    Return the ``CompiledScript`` at ``path``.
+
+    :param previous: The script's last ``CompiledScript``, returned as is
+        when the file's stamp has not changed.
+    :param cache_dir: Where compiled code is kept on disk; ``__pycache__``
+        beside the script by default, ``False`` for memory only.
+    """
+    path = os.path.abspath(path)
+    stamp = _stamp(path)
+    if previous is not None and previous.stamp == stamp:
+        return previous
+    with open(path, "rb") as handle:
+        source = handle.read()
+    name = os.path.basename(path)
+    digest = source_digest(source, path)
+    if previous is not None and previous.digest == digest:
+        return CompiledScript(name, path, stamp, digest, previous.code)
+    code = _codes.get(digest)
+    if code is None:
+        if cache_dir is None:
+            cache_dir = os.path.join(os.path.dirname(path), "__pycache__")
+        code = _read(cache_dir, name, digest) if cache_dir else None
+        if code is None:
+            code = compile(source, path, "exec")
+            stats["compiled"] += 1
+            if cache_dir:
+                _write(cache_dir, name, digest, code)
+        else:
+            stats["disk"] += 1
+        _codes[digest] = code
+    return CompiledScript(name, path, stamp, digest, code)
+
+
+def load(path):
+    """Return the code of the script at ``path``, compiled once per version."""
+    key = os.path.abspath(path)
+    script = _loaded[key] = compile_script(key, _loaded.get(key))
+    return script.code
+
+
+class ScriptCache:
+    """
+    The compiled scripts of a directory, or of a list of paths.
+
+    :param directory: Every ``*.py`` in it, including ones added later;
+        ``scripts/python`` by default.
+    :param paths: Just these scripts instead.
+    :param cache_dir: As for ``compile_script``.
+    """
+
+    def __init__(self, directory=None, paths=None, cache_dir=None):
+        self.directory = directory
+        self.paths = None if paths is None else [os.path.abspath(path) for path in paths]
+        self.cache_dir = cache_dir
+        self.errors = {}
+        self._scripts = {}
+        self._snapshot = ()
+        self._lock = threading.Lock()
+        self.refresh()
+
+    def _paths(self):
+        if self.paths is None:
+            return script_paths(self.directory)
+        return [path for path in self.paths if os.path.exists(path)]
+
+    def scripts(self):
+        """Return the current ``(name, code)`` pairs, in path order."""
+        return self._snapshot
+
+    def __len__(self):
+        return len(self._snapshot)
+
+    def refresh(self):
+        """
+        Compile the scripts that changed since the last refresh and swap in
+        the new set.
+
+        :returns: The names of the scripts added, changed or removed.
+        """
+        with self._lock:
+            scripts = {}
+            changed = []
+            for path in self._paths():
+                name = os.path.basename(path)
+                previous = self._scripts.get(name)
+                try:
+                    script = compile_script(path, previous, self.cache_dir)
+                except (OSError, SyntaxError, ValueError) as error:
+                    self.errors[name] = "%s: %s" % (type(error).__name__, error)
+                    if previous is not None:
+                        scripts[name] = previous
+                    continue
+                self.errors.pop(name, None)
+                scripts[name] = script
+                if previous is None or previous.code is not script.code:
+                    changed.append(name)
+            changed.extend(name for name in self._scripts if name not in scripts)
+            self._scripts = scripts
+            if changed:
+                self._snapshot = tuple((name, script.code) for name, script in scripts.items())
+            return changed
+
+    def watch(self, interval=1.0, on_change=None):
+        """
+        Return a ``ScriptWatcher`` refreshing the cache every ``interval``
+        seconds while it runs (use it as a context manager).
+
+        :param on_change: Called with the changed names after each refresh
+            that swapped in new scripts.
+        """
+        return ScriptWatcher(self, interval, on_change)
+
+
+class ScriptWatcher:
+    """Refreshes a ``ScriptCache`` from a background thread."""
+
+    def __init__(self, cache, interval=1.0, on_change=None):
+        self.cache = cache
+        self.interval = interval
+        self.on_change = on_change
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            changed = self.cache.refresh()
+            if changed and self.on_change is not None:
+                self.on_change(changed)
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="script-watcher", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, kind, value, traceback):
+        self.stop()
+        return False
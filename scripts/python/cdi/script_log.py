@@ -0,0 +1,116 @@
+"""
+Level-gated, buffered script messages.
+
+The scripts used to log with ``db.LogEvaluationScriptMessage("..." +
+str(x) + "...", scriptName, scriptInstance, "Debug")``: every message was
+built with ``str()`` concatenation even when Debug logging was off, and each
+one was a separate write to the repository, some of them from inside loops.
+
+A ``ScriptLog`` takes a ``%`` template and its arguments instead.  A message
+below the level set with ``set_level`` is dropped before anything is
+formatted; the rest go to a ``MessageBuffer`` shared by every script run for
+the account, which writes them to the repository in one bulk call.
+"""
+
+LEVELS = ("Debug", "Info", "Warning", "Error")
+
+_RANKS = dict((level, rank) for rank, level in enumerate(LEVELS))
+_DEBUG, _INFO, _WARNING, _ERROR = range(len(LEVELS))
+_threshold = _DEBUG
+
+
+def set_level(level):
+    """Drop messages below ``level`` (one of ``LEVELS``); ``"Debug"`` keeps everything."""
+    global _threshold
+    _threshold = _RANKS[level]
+
+
+def enabled(level):
+    """Return whether messages at ``level`` are kept."""
+    return _RANKS.get(level, _ERROR) >= _threshold
+
+
+def _format(template, args):
+    # Like the standard logging module, a template without arguments is the
+    # message itself, so it may contain a bare "%".
+    return template % args if args else template
+
+
+class MessageBuffer:
+    """
+    Messages waiting to be written to ``repository``.
+
+    ``flush`` writes them with the repository's bulk
+    ``LogEvaluationScriptMessages`` when it has one, and falls back to one
+    ``LogEvaluationScriptMessage`` call per message otherwise.
+    """
+
+    __slots__ = ("repository", "entries")
+
+    def __init__(self, repository):
+        self.repository = repository
+        self.entries = []
+
+    def add(self, message, script_name, script_instance, level):
+        self.entries.append((message, script_name, script_instance, level))
+
+    def flush(self):
+        """Write the buffered messages, in the order they were logged, and empty the buffer."""
+        if not self.entries:
+            return
+        entries, self.entries = self.entries, []
+        write_all = getattr(self.repository, "LogEvaluationScriptMessages", None)
+        if write_all is not None:
+            write_all(entries)
+        else:
+            for entry in entries:
+                self.repository.LogEvaluationScriptMessage(*entry)
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class ScriptLog:
+    """
+    One script run's view of a ``MessageBuffer``.
+
+    ``scriptLog.debug("Alert Closed. Outcome: %s %s", outcome, account._id)``
+    formats the message only when Debug is enabled.  The arguments are still
+    evaluated by the caller, so pass the values themselves rather than
+    ``str()`` of them.
+
+    :param deferred: The buffer belongs to a whole account run and is
+        flushed by whoever runs it, so ``flush`` leaves it alone.
+    """
+
+    __slots__ = ("buffer", "script_name", "script_instance", "deferred")
+
+    def __init__(self, buffer, script_name, script_instance, deferred=False):
+        self.buffer = buffer
+        self.script_name = script_name
+        self.script_instance = script_instance
+        self.deferred = deferred
+
+    def log(self, level, template, *args):
+        if _RANKS.get(level, _ERROR) >= _threshold:
+            self.buffer.add(_format(template, args), self.script_name, self.script_instance, level)
+
+    def debug(self, template, *args):
+        if _threshold <= _DEBUG:
+            self.buffer.add(_format(template, args), self.script_name, self.script_instance, "Debug")
+
+    def info(self, template, *args):
+        if _threshold <= _INFO:
+            self.buffer.add(_format(template, args), self.script_name, self.script_instance, "Info")
+
+    def warning(self, template, *args):
+        if _threshold <= _WARNING:
+            self.buffer.add(_format(template, args), self.script_name, self.script_instance, "Warning")
+
+    def error(self, template, *args):
+        self.buffer.add(_format(template, args), self.script_name, self.script_instance, "Error")
+
+    def flush(self):
+        """Write the buffered messages now, unless the account run will."""
+        if not self.deferred:
+            self.buffer.flush()
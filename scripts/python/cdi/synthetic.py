@@ -0,0 +1,360 @@
+"""
+Seeded synthetic accounts for benchmarking the alert scripts.
+
+``generate`` builds a ``cdi.host.Account`` whose discrete values,
+medications, documents, code and abstraction references and prior alerts are
+drawn from what the scripts actually look for (a ``Catalogue`` read from
+their manifests), with results in plausible clinical ranges and measurement
+times spread over the stay.  The same seed and ``AccountProfile`` always give
+the same account.
+
+Discrete value names are grouped into families (vitals, blood gases, neuro
+scores, urine studies, other labs) so a profile can say how many values of
+each kind an account has; values of a family are recorded in rounds sharing
+one timestamp, the way a set of vitals or a blood gas panel is charted.
+"""
+
+import datetime
+import math
+import random
+import re
+
+from . import host
+from .manifest import build, combined
+from .records import compact_account
+from .runner import script_paths
+
+FAMILIES = ("vitals", "blood_gas", "neuro", "urine", "labs")
+
+# The first family whose pattern matches a name owns it; "labs" takes the rest.
+_FAMILY_PATTERNS = (
+    ("blood_gas", re.compile(r"(?i)^ph\b|po2|pco2|paco2|fi0?2|hco3|bld gas|base excess|o2 device|oxygen flow|o2 delivery")),
+    ("vitals", re.compile(r"(?i)heart rate|pulse|respiratory rate|temperature|\bbp\b|sbp|dbp|\bmap\b|mean|"
+                          r"oximetry|weight|bmi|cvp|icp|cardiac")),
+    ("neuro", re.compile(r"(?i)glasgow|braden|ciwa|activity|mobility")),
+    ("urine", re.compile(r"(?i)\bur\b|urine|/hpf|/lpf|^ua |leuk|ketones")),
+)
+
+# Result ranges (low, high, decimals) or categorical choices, by name; the
+# first match wins.
+_RESULTS = (
+    (r"(?i)o2 device", ["Room Air", "Nasal Cannula", "High Flow Nasal Cannula", "Non-Rebreather Mask", "BiPAP", "Ventilator"]),
+    (r"(?i)\bur\b|urine$|influenza|sars|mrsa|syncytial|leuk esterase|^blood$|bacteria",
+     ["Positive", "Negative", "Detected", "Not Detected"]),
+    (r"(?i)heart rate|pulse", (40, 160, 0)),
+    (r"(?i)respiratory rate", (8, 40, 0)),
+    (r"(?i)temperature", (35.0, 40.5, 1)),
+    (r"(?i)sbp|systolic", (70, 220, 0)),
+    (r"(?i)dbp|diastolic", (40, 130, 0)),
+    (r"(?i)\bmap\b|mean", (45, 130, 0)),
+    (r"(?i)oximetry", (80, 100, 0)),
+    (r"(?i)glasgow eyes", (1, 4, 0)),
+    (r"(?i)glasgow verbal", (1, 5, 0)),
+    (r"(?i)glasgow motor", (1, 6, 0)),
+    (r"(?i)glasgow", (3, 15, 0)),
+    (r"(?i)braden scale total", (6, 23, 0)),
+    (r"(?i)activity|mobility", (1, 4, 0)),
+    (r"(?i)ciwa", (0, 40, 0)),
+    (r"(?i)weight", (40, 200, 1)),
+    (r"(?i)bmi", (15, 60, 1)),
+    (r"(?i)^ph\b", (6.9, 7.7, 2)),
+    (r"(?i)po2/fio2", (80, 500, 0)),
+    (r"(?i)fi0?2", (21, 100, 0)),
+    (r"(?i)po2|o2 \(mmhg", (40, 300, 0)),
+    (r"(?i)pco2|co2 \(mmhg|co2 ven", (20, 90, 0)),
+    (r"(?i)hco3|co2", (10, 40, 0)),
+    (r"(?i)base excess", (-15, 15, 0)),
+    (r"(?i)oxygen flow|o2 delivery", (0, 15, 0)),
+    (r"(?i)sodium", (115, 160, 0)),
+    (r"(?i)potassium", (2.5, 7.0, 1)),
+    (r"(?i)creatinine", (0.4, 8.0, 2)),
+    (r"(?i)bun", (5, 120, 0)),
+    (r"(?i)gfr", (5, 120, 0)),
+    (r"(?i)glucose", (40, 600, 0)),
+    (r"(?i)a1c", (4.5, 14, 1)),
+    (r"(?i)hemoglobin", (5, 18, 1)),
+    (r"(?i)hematocrit", (15, 55, 0)),
+    (r"(?i)platelet", (10, 600, 0)),
+    (r"(?i)wbc|neut|lymph|mono|eos|baso", (0.5, 40, 1)),
+    (r"(?i)lact", (0.5, 10, 1)),
+    (r"(?i)troponin", (2, 2000, 0)),
+    (r"(?i)bnp", (10, 35000, 0)),
+    (r"(?i)inr", (0.8, 6, 1)),
+    (r"(?i)cpk", (20, 30000, 0)),
+)
+_COMPILED_RESULTS = tuple((re.compile(pattern), rule) for pattern, rule in _RESULTS)
+_DEFAULT_RESULT = (0, 200, 1)
+
+_ROUTES = ("Intravenous", "IV Push", "Oral", "Subcutaneous", "Inhalation", None)
+_COMMON_DOCUMENT_TYPES = ("Progress Note", "History and Physical", "Discharge Summary", "Consult Note")
+_DAY_MINUTES = 24 * 60
+
+
+def family(name):
+    """Return the family a discrete value name belongs to."""
+    for family_name, pattern in _FAMILY_PATTERNS:
+        if pattern.search(name):
+            return family_name
+    return "labs"
+
+
+def _result_rule(name):
+    for pattern, rule in _COMPILED_RESULTS:
+        if pattern.search(name):
+            return rule
+    return _DEFAULT_RESULT
+
+
+def _pattern_code(pattern):
+    # "^A41\." -> "A41." and a digit, a code that prefixCodeValue will match.
+    stem = pattern.lstrip("^").replace("\\", "")
+    return stem + "9" if stem.endswith(".") else stem
+
+
+class Catalogue:
+    """
+    The names synthetic accounts are drawn from, each a sorted list.
+
+    :ivar discrete_values: ``{family: [name, ...]}``.
+    """
+
+    __slots__ = ("discrete_values", "medications", "abstractions", "codes", "document_types", "criteria_groups")
+
+    def __init__(self, discrete_values, medications, abstractions, codes, document_types, criteria_groups):
+        self.discrete_values = discrete_values
+        self.medications = medications
+        self.abstractions = abstractions
+        self.codes = codes
+        self.document_types = document_types
+        self.criteria_groups = criteria_groups
+
+    @classmethod
+    def from_manifest(cls, manifest):
+        """Build a catalogue of everything one (usually ``combined``) manifest reads."""
+        families = dict((family_name, []) for family_name in FAMILIES)
+        for name in sorted(manifest.discrete_values):
+            if name.strip():
+                families[family(name)].append(name)
+        codes = set(code.strip() for code in manifest.codes)
+        codes.update(_pattern_code(pattern) for pattern in manifest.code_patterns)
+        return cls(
+            families,
+            sorted(manifest.medications),
+            sorted(manifest.abstractions),
+            sorted(code for code in codes if code),
+            sorted(set(manifest.document_types) | set(_COMMON_DOCUMENT_TYPES)),
+            sorted(manifest.criteria_groups),
+        )
+
+    @classmethod
+    def from_scripts(cls, paths=None):
+        """Build the catalogue of the scripts at ``paths`` (every script by default)."""
+        if paths is None:
+            paths = script_paths()
+        return cls.from_manifest(combined(build(paths).values()))
+
+
+class AccountProfile:
+    """
+    The shape of a synthetic account.
+
+    :param discrete_values: ``{family: count}`` of discrete values; families
+        left out get none.
+    :param medications: Number of medication administrations.
+    :param documents: Number of documents.
+    :param codes_per_document: Mean number of code references per document.
+    :param abstractions_per_document: Mean number of abstraction references
+        per document.
+    :param criteria_groups: Most prior alerts on the account.
+    :param stay_days: Days since admission; everything is spread over them.
+    :param odd_results: Fraction of numeric results written the way some
+        interfaces send them ("<0.5", ">500", "5.0 H").
+    """
+
+    __slots__ = ("discrete_values", "medications", "documents", "codes_per_document",
+                 "abstractions_per_document", "criteria_groups", "stay_days", "odd_results")
+
+    def __init__(self, discrete_values=None, medications=40, documents=20, codes_per_document=2,
+                 abstractions_per_document=2, criteria_groups=3, stay_days=5, odd_results=0.02):
+        if discrete_values is None:
+            discrete_values = {"vitals": 160, "blood_gas": 30, "neuro": 20, "urine": 10, "labs": 80}
+        self.discrete_values = dict(discrete_values)
+        self.medications = medications
+        self.documents = documents
+        self.codes_per_document = codes_per_document
+        self.abstractions_per_document = abstractions_per_document
+        self.criteria_groups = criteria_groups
+        self.stay_days = stay_days
+        self.odd_results = odd_results
+
+    def with_discrete_values(self, total):
+        """Return a copy with ``total`` discrete values in the same family proportions."""
+        current = sum(self.discrete_values.values())
+        profile = AccountProfile(self.discrete_values, self.medications, self.documents,
+                                 self.codes_per_document, self.abstractions_per_document,
+                                 self.criteria_groups, self.stay_days, self.odd_results)
+        if current:
+            profile.discrete_values = dict(
+                (family_name, int(round(total * count / float(current))))
+                for family_name, count in self.discrete_values.items())
+        return profile
+
+
+class _Generator:
+    def __init__(self, seed, catalogue, profile, now):
+        self.random = random.Random(seed)
+        self.catalogue = catalogue
+        self.profile = profile
+        self.now = now
+        self.stay_minutes = max(1, int(profile.stay_days * _DAY_MINUTES))
+
+    def date(self, minutes_ago):
+        return host.DateTime(self.now - datetime.timedelta(minutes=minutes_ago))
+
+    def result(self, name):
+        rule = _result_rule(name)
+        if isinstance(rule, list):
+            return self.random.choice(rule)
+        low, high, decimals = rule
+        value = round(self.random.uniform(low, high), decimals)
+        text = str(int(value)) if decimals == 0 else str(value)
+        if self.random.random() < self.profile.odd_results:
+            text = self.random.choice(["<" + text, ">" + text, text + " H", text + " L"])
+        return text
+
+    def discrete_values(self):
+        values = []
+        for family_name in FAMILIES:
+            names = self.catalogue.discrete_values.get(family_name) or []
+            count = self.profile.discrete_values.get(family_name, 0)
+            if not names or not count:
+                continue
+            per_round = min(len(names), 6)
+            rounds = sorted(self.random.randrange(self.stay_minutes) for _ in range(int(math.ceil(count / float(per_round)))))
+            for index in range(count):
+                name = self.random.choice(names)
+                taken = rounds[index // per_round]
+                values.append(host.DiscreteValue("dv%d" % len(values), name, self.result(name), self.date(taken)))
+        # Interfaces deliver in no particular order.
+        self.random.shuffle(values)
+        return values
+
+    def medications(self):
+        medications = []
+        if not self.catalogue.medications:
+            return medications
+        for index in range(self.profile.medications):
+            category = self.random.choice(self.catalogue.medications)
+            medications.append(host.Medication(
+                "med%d" % index, "%s %d" % (category, self.random.randint(1, 9)),
+                "%d mg" % self.random.randint(1, 500), self.random.choice(_ROUTES),
+                self.date(self.random.randrange(self.stay_minutes)), None, "Active", category, category))
+        return medications
+
+    def references(self, names, mean, phrase):
+        references = []
+        if not names:
+            return references
+        for index in range(self.random.randint(0, 2 * mean)):
+            value = self.random.choice([None, None, str(self.random.randint(1, 200)), "High"])
+            references.append(host.CodeReference(self.random.choice(names), value, None, "%s %d" % (phrase, index)))
+        return references
+
+    def documents(self):
+        documents = []
+        for index in range(self.profile.documents):
+            documents.append(host.CACDocument(
+                "doc%d" % index, self.random.choice(self.catalogue.document_types),
+                self.date(self.random.randrange(self.stay_minutes)),
+                self.references(self.catalogue.codes, self.profile.codes_per_document, "code phrase"),
+                self.references(self.catalogue.abstractions, self.profile.abstractions_per_document, "abstraction phrase")))
+        return documents
+
+    def criteria_groups(self):
+        count = self.random.randint(0, min(self.profile.criteria_groups, len(self.catalogue.criteria_groups)))
+        return [
+            host.MatchedCriteriaGroup(
+                group, self.random.random() < 0.3, self.random.choice([None, None, "AUTORESOLVED"]),
+                self.random.choice([None, "Previously Autoresolved"]), None)
+            for group in self.random.sample(self.catalogue.criteria_groups, count)
+        ]
+
+    def account(self, account_id):
+        random_ = self.random
+        birth = self.now - datetime.timedelta(days=random_.randint(18, 95) * 365)
+        history = host.AccountWorkingHistoryEntry(
+            [host.DiagnosisCode(random_.choice(self.catalogue.codes))
+             for _ in range(random_.randint(0, 3) if self.catalogue.codes else 0)])
+        return host.Account(
+            account_id,
+            self.date(self.stay_minutes),
+            None,
+            host.Patient(random_.choice(["M", "F"]), host.DateTime(birth).Date),
+            "Inpatient",
+            random_.choice(["Home", "Transfer", "Emergency Room"]),
+            self.documents(),
+            self.medications(),
+            self.discrete_values(),
+            self.criteria_groups(),
+            [history],
+        )
+
+
+def generate(seed, catalogue, profile=None, now=None, account_id=None):
+    """
+    Return a synthetic ``Account``.
+
+    :param seed: Seeds every random choice; the same arguments give the same account.
+    :param catalogue: The ``Catalogue`` names are drawn from.
+    :param profile: The ``AccountProfile``; the default is a five day stay.
+    :param now: The naive ``datetime`` the account's dates count back from;
+        defaults to ``DateTime.Now``.
+    :param account_id: Defaults to ``"synthetic<seed>"``.
+    """
+    if profile is None:
+        profile = AccountProfile()
+    if now is None:
+        now = host.DateTime.Now.to_datetime()
+    if account_id is None:
+        account_id = "synthetic%d" % seed
+    return _Generator(seed, catalogue, profile, now).account(account_id)
+
+
+class SyntheticAccounts:
+    """
+    A read-only mapping of ``"synthetic<seed>"`` ids to generated accounts.
+
+    Accounts are generated when looked up, so the mapping pickles to a few
+    hundred bytes and a queue worker process can serve any account from it.
+
+    :param now: The naive ``datetime`` every account counts back from;
+        ``DateTime.Now`` when the mapping is made by default.
+    :param compact: Serve the accounts with ``cdi.records`` records.
+    """
+
+    _PREFIX = "synthetic"
+
+    def __init__(self, catalogue, profile=None, now=None, compact=False):
+        self.catalogue = catalogue
+        self.profile = profile
+        self.now = now if now is not None else host.DateTime.Now.to_datetime()
+        self.compact = compact
+
+    def account_id(self, seed):
+        return "%s%d" % (self._PREFIX, seed)
+
+    def get(self, account_id, default=None):
+        seed = account_id[len(self._PREFIX):] if account_id.startswith(self._PREFIX) else ""
+        if not seed.isdigit():
+            return default
+        account = generate(int(seed), self.catalogue, self.profile, self.now, account_id)
+        return compact_account(account) if self.compact else account
+
+    def __getitem__(self, account_id):
+        account = self.get(account_id)
+        if account is None:
+            raise KeyError(account_id)
+        return account
+
+    def __contains__(self, account_id):
+        return self.get(account_id) is not None
@@ -0,0 +1,183 @@
+"""
+Per-script and per-helper timing.
+
+A ``Profiler`` made active with ``profiling()`` times every script run by
+``cdi.runner`` (wall time, per account, together with the account's number
+of discrete values, medications and documents) and every call the script
+makes to a function it defines itself (``dvValueMulti``,
+``pao2fio2Calculation``, ``CodeCount``, ...) or to a workflow container or
+context lookup (``GetFirstCodeLink``, ``medications``, ...).
+
+``report()`` aggregates the timings into call counts and percentiles, ready
+for ``json.dump``; ``collapsed()`` gives the self time of every call stack in
+the collapsed-stack format flamegraph tools read (``Anemia.py;dvValueMulti
+1234``, in microseconds).
+
+With no profiler active a script run costs one extra global lookup.
+"""
+
+import json
+import sys
+import time
+from contextlib import contextmanager
+
+from . import helpers
+from .context import EvaluationContext
+from .host import AccountWorkflowContainer
+
+_active = None
+
+
+def active():
+    """Return the active ``Profiler``, or ``None``."""
+    return _active
+
+
+@contextmanager
+def profiling(profiler=None):
+    """Make ``profiler`` (a new ``Profiler`` by default) active while the block runs."""
+    global _active
+    if profiler is None:
+        profiler = Profiler()
+    previous, _active = _active, profiler
+    try:
+        yield profiler
+    finally:
+        _active = previous
+
+
+def _codes(cls):
+    # The code objects of a class's public methods, by the name they report under.
+    codes = {}
+    for name, value in vars(cls).items():
+        function = getattr(value, "fget", value)
+        if not name.startswith("_") and hasattr(function, "__code__"):
+            codes[function.__code__] = "%s.%s" % (cls.__name__, name)
+    return codes
+
+
+def percentile(ordered, fraction):
+    """Return the nearest-rank ``fraction`` percentile of the sorted list ``ordered``."""
+    if not ordered:
+        return None
+    rank = int(round(fraction * (len(ordered) - 1)))
+    return ordered[rank]
+
+
+def summarize(durations):
+    """Return call count, total and percentiles (seconds) of ``durations``."""
+    ordered = sorted(durations)
+    return {
+        "calls": len(ordered),
+        "total": sum(ordered),
+        "p50": percentile(ordered, 0.5),
+        "p90": percentile(ordered, 0.9),
+        "p99": percentile(ordered, 0.99),
+        "max": ordered[-1] if ordered else None,
+    }
+
+
+def input_sizes(account):
+    """Return the number of discrete values, medications and documents on ``account``."""
+    return {
+        "discrete_values": len(account["DiscreteValues"] or []),
+        "medications": len(account["Medications"] or []),
+        "documents": len(account["Documents"] or []),
+    }
+
+
+class Profiler:
+    """
+    Collected timings.
+
+    :param clock: Source of the current time in seconds.
+    :param tracked: ``{code object: name}`` of functions outside the scripts
+        to time.  Defaults to the shared helpers (``cdi.helpers``) and the
+        public methods of ``AccountWorkflowContainer`` and
+        ``EvaluationContext``.
+    """
+
+    def __init__(self, clock=time.perf_counter, tracked=None):
+        self.clock = clock
+        if tracked is None:
+            tracked = helpers.codes()
+            tracked.update(_codes(AccountWorkflowContainer))
+            tracked.update(_codes(EvaluationContext))
+        self.tracked = tracked
+        self.scripts = {}
+        self.helpers = {}
+        self.accounts = {}
+        self.stacks = {}
+
+    def run(self, code, script_globals, script_name, account):
+        """Execute a compiled script like ``exec`` and record its timings."""
+        sizes = self.accounts.get(account._id)
+        if sizes is None:
+            sizes = self.accounts[account._id] = dict(input_sizes(account), seconds=0.0, runs=0)
+        # Frames being timed: [stack name, start, time spent in timed callees].
+        frames = [[script_name, 0.0, 0.0]]
+        clock, tracked, helpers, stacks = self.clock, self.tracked, self.helpers, self.stacks
+        filename = code.co_filename
+        active_frames = []
+
+        def hook(frame, event, arg):
+            if event == "call":
+                frame_code = frame.f_code
+                if frame_code.co_filename == filename and frame_code.co_name[0] != "<":
+                    # A function the script defines; not the script body,
+                    # lambdas or generator expressions.
+                    name = frame_code.co_name
+                elif frame_code in tracked:
+                    name = tracked[frame_code]
+                else:
+                    return
+                active_frames.append(frame)
+                frames.append([frames[-1][0] + ";" + name, clock(), 0.0])
+            elif event == "return" and active_frames and active_frames[-1] is frame:
+                active_frames.pop()
+                stack, start, inner = frames.pop()
+                elapsed = clock() - start
+                frames[-1][2] += elapsed
+                helpers.setdefault(script_name + ":" + stack.rsplit(";", 1)[1], []).append(elapsed)
+                stacks[stack] = stacks.get(stack, 0.0) + elapsed - inner
+
+        previous = sys.getprofile()
+        start = clock()
+        sys.setprofile(hook)
+        try:
+            exec(code, script_globals)
+        finally:
+            sys.setprofile(previous)
+            elapsed = clock() - start
+            self.scripts.setdefault(script_name, []).append(elapsed)
+            stacks[script_name] = stacks.get(script_name, 0.0) + elapsed - frames[0][2]
+            sizes["seconds"] += elapsed
+            sizes["runs"] += 1
+
+    def report(self):
+        """
+        Return ``{"scripts": ..., "helpers": ..., "accounts": ...}``:
+        a ``summarize`` of every script and of every helper (as
+        ``"Script.py:helper"``), and the input sizes and total script time of
+        every account.
+        """
+        return {
+            "scripts": dict((name, summarize(durations)) for name, durations in sorted(self.scripts.items())),
+            "helpers": dict((name, summarize(durations)) for name, durations in sorted(self.helpers.items())),
+            "accounts": dict(sorted(self.accounts.items())),
+        }
+
+    def write_report(self, path):
+        """Write ``report()`` to ``path`` as JSON."""
+        with open(path, "w") as handle:
+            json.dump(self.report(), handle, indent=2, sort_keys=True)
+            handle.write("\n")
+
+    def collapsed(self):
+        """Return collapsed-stack lines, self time in whole microseconds, sorted by stack."""
+        return ["%s %d" % (stack, round(seconds * 1e6)) for stack, seconds in sorted(self.stacks.items())]
+
+    def write_collapsed(self, path):
+        """Write ``collapsed()`` to ``path``, one stack per line."""
+        with open(path, "w") as handle:
+            handle.writelines(line + "\n" for line in self.collapsed())
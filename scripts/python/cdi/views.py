@@ -0,0 +1,51 @@
+"""
+Read-only ordered views.
+
+The scripts build their medication list as ``sorted(unsortedMedDic.items())``,
+a list of ``(count, medication)`` pairs, and then hand ``dict(mainMedDic)`` to
+every helper, copying the whole list at each call.  ``OrderedView`` is built
+once from the sorted pairs and handed to the helpers as is.
+"""
+
+try:
+    from collections.abc import Mapping
+except ImportError:
+    # IronPython 2.7, the workflow engine.
+    from collections import Mapping
+
+
+class OrderedView(Mapping):
+    """
+    A read-only mapping that iterates in the order its items were given.
+
+    Behaves like the ``dict`` built from the same pairs: ``view[key]``,
+    ``key in view``, ``len(view)`` and iteration over the keys, but it cannot
+    be changed, so it is safe to share between helpers without copying.
+
+    :param items: ``(key, value)`` pairs, e.g. ``sorted(unsortedMedDic.items(), ...)``.
+    """
+
+    __slots__ = ("_keys", "_values")
+
+    def __init__(self, items=()):
+        self._values = {}
+        self._keys = []
+        for key, value in items:
+            if key not in self._values:
+                self._keys.append(key)
+            self._values[key] = value
+
+    def __getitem__(self, key):
+        return self._values[key]
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, key):
+        return key in self._values
+
+    def __repr__(self):
+        return "OrderedView(%r)" % [(key, self._values[key]) for key in self._keys]
@@ -0,0 +1,212 @@
+"""
+Drain the alert queue across every core.
+
+Inside workflow the scripts evaluate one account at a time.  ``drain``
+instead claims queued accounts in batches, spreads each batch over a
+``ProcessPoolExecutor`` in chunks and writes the batch's results back to the
+result store in one call.  Each worker process compiles the scripts once and
+fetches the accounts of its chunk itself, so only account ids go to the
+workers and only serialized results come back.
+
+Claimed entries are leased (see ``cdi.alert_queue``), so any number of
+``drain`` calls, on one machine or several, can share a queue.  A
+``Heartbeat`` renews the batch's leases while it is evaluated; results are
+written only for the entries whose leases are still held when the batch
+finishes, and then those entries are completed.
+
+``python -m cdi.worker --synthetic 5000`` queues that many synthetic accounts
+in a local SQLite queue and drains it, reporting the throughput; with
+``--backfill 5000`` as many again are queued first as a backfill, and the
+queue is drained through ``cdi.priority.PriorityScheduler``, reporting the
+latency of each priority class.
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from . import host
+from .alert_queue import Heartbeat, SQLiteAlertQueue, SQLiteResultStore
+from .manifest import gates
+from .memo import dump_result
+from .priority import PriorityScheduler, classify, format_report
+from .runner import run_account, script_paths
+from .script_cache import ScriptCache
+from .synthetic import Catalogue, SyntheticAccounts
+
+# Per worker process, set by initialize.
+_scripts = None
+_gates = None
+_reload_seconds = None
+_checked = 0.0
+_accounts = None
+
+
+def initialize(paths, accounts=None, now=None, reload_seconds=1.0):
+    """
+    Prepare a worker process: install the host stand-ins and load the
+    scripts at ``paths``.
+
+    :param accounts: Mapping of account id to ``Account`` that
+        ``evaluate_accounts`` reads from.
+    :param now: Pins ``DateTime.Now``, for tests.
+    :param reload_seconds: Seconds between checks for changed scripts,
+        which are swapped in between accounts; ``None`` never checks.
+    """
+    global _scripts, _gates, _accounts, _reload_seconds, _checked
+    host.install()
+    if now is not None:
+        host.set_clock(lambda: now)
+    _scripts = ScriptCache(paths=paths)
+    _gates = gates(paths)
+    _accounts = accounts
+    _reload_seconds = reload_seconds
+    _checked = time.monotonic()
+
+
+def _current_scripts():
+    global _gates, _checked
+    if _reload_seconds is not None and time.monotonic() - _checked >= _reload_seconds:
+        if _scripts.refresh():
+            _gates = gates(_scripts.paths)
+        _checked = time.monotonic()
+    return _scripts.scripts()
+
+
+def evaluate_accounts(account_ids):
+    """
+    Evaluate every script for ``account_ids`` in a worker process.
+
+    :returns: ``(rows, missing)``: ``(account_id, script, result JSON)``
+        rows, with ``None`` for a script that raised, and the ids of the
+        accounts that no longer exist.
+    """
+    rows = []
+    missing = []
+    for account_id in account_ids:
+        account = _accounts.get(account_id)
+        if account is None:
+            missing.append(account_id)
+        else:
+            rows.extend(evaluate_account(account))
+    return rows, missing
+
+
+def evaluate_account(account):
+    """
+    Evaluate every script for ``account`` in a worker process and return
+    ``(account_id, script, result JSON)`` rows, with ``None`` for a script
+    that raised.
+    """
+    return [(account._id, name, None if result is None else dump_result(result))
+            for name, result in run_account(account, _current_scripts(), gates=_gates).items()]
+
+
+def _chunks(items, size):
+    return [items[start:start + size] for start in range(0, len(items), size)]
+
+
+def drain(queue, accounts, store, scripts=None, workers=None, batch_size=500, chunk_size=None, owner=None,
+          heartbeat_seconds=None, now=None):
+    """
+    Evaluate queued accounts until the queue is empty.
+
+    :param queue: The queue to claim from (see ``cdi.alert_queue``).
+    :param accounts: Mapping of account id to ``Account``, read in the worker
+        processes, so it must pickle (a ``dict`` or
+        ``synthetic.SyntheticAccounts``).
+    :param store: Receives each batch's results in one ``upsert_many`` call.
+    :param scripts: Script paths; every script by default.
+    :param workers: Worker processes; the number of cores by default.
+    :param batch_size: Accounts claimed from the queue at a time.
+    :param chunk_size: Accounts handed to a worker at a time.  By default a
+        batch is cut into four chunks per worker, so a slow account holds up
+        little of it.
+    :param owner: Names this worker in its leases; ``host:pid`` by default.
+    :param heartbeat_seconds: Seconds between lease renewals; a third of the
+        queue's lease by default.
+    :param now: Pins ``DateTime.Now`` in the workers, for tests.
+    :returns: ``{"accounts", "missing", "lost", "batches", "seconds"}``;
+        ``lost`` counts the entries whose lease expired before their results
+        were written, and which were left for another worker.
+
+    When evaluating or writing a batch fails, its leases are released and the
+    error is raised.
+    """
+    paths = list(scripts) if scripts is not None else script_paths()
+    workers = workers or os.cpu_count() or 1
+    stats = {"accounts": 0, "missing": 0, "lost": 0, "batches": 0, "seconds": 0.0}
+    start = time.perf_counter()
+    with ProcessPoolExecutor(workers, initializer=initialize, initargs=(paths, accounts, now)) as executor, \
+            Heartbeat(queue, heartbeat_seconds) as heartbeat:
+        while True:
+            entries = queue.claim(batch_size, owner)
+            if not entries:
+                break
+            tokens = [entry.token for entry in entries]
+            heartbeat.hold(tokens)
+            ids = [entry.account_id for entry in entries]
+            size = chunk_size or max(1, -(-len(ids) // (workers * 4)))
+            rows = []
+            missing = set()
+            try:
+                for chunk_rows, chunk_missing in executor.map(evaluate_accounts, _chunks(ids, size)):
+                    rows.extend(chunk_rows)
+                    missing.update(chunk_missing)
+                heartbeat.drop(tokens)
+                held = set(queue.renew(tokens))
+                kept = set(entry.account_id for entry in entries if entry.token in held)
+                store.upsert_many([row for row in rows if row[0] in kept])
+                queue.complete(held)
+            except BaseException:
+                # Nothing of the batch was written: hand it back at once
+                # rather than leave it leased until the leases expire.
+                heartbeat.drop(tokens)
+                queue.release(tokens)
+                raise
+            stats["accounts"] += len(kept - missing)
+            stats["missing"] += len(kept & missing)
+            stats["lost"] += len(entries) - len(kept)
+            stats["batches"] += 1
+    stats["seconds"] = time.perf_counter() - start
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m cdi.worker", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--queue", default=":memory:", help="SQLite queue file (default: in memory)")
+    parser.add_argument("--results", default=":memory:", help="SQLite result file (default: in memory)")
+    parser.add_argument("--synthetic", type=int, default=100, help="synthetic accounts to queue first")
+    parser.add_argument("--backfill", type=int, default=0,
+                        help="synthetic accounts to queue as a backfill ahead of them, draining by priority")
+    parser.add_argument("--workers", type=int, help="worker processes (default: one per core)")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--chunk-size", type=int)
+    args = parser.parse_args(argv)
+
+    now = host.DateTime.Now.to_datetime()
+    accounts = SyntheticAccounts(Catalogue.from_scripts(), now=now, compact=True)
+    queue = SQLiteAlertQueue(args.queue)
+    if args.backfill:
+        queue = PriorityScheduler(queue)
+        queue.enqueue_many((accounts.account_id(seed), "Backfill", None, "backfill")
+                           for seed in range(args.synthetic, args.synthetic + args.backfill))
+        queue.enqueue_many((account_id, "Synthetic", None, classify(accounts[account_id], now=now))
+                           for account_id in map(accounts.account_id, range(args.synthetic)))
+    else:
+        queue.enqueue_many((accounts.account_id(seed), "Synthetic", None) for seed in range(args.synthetic))
+    store = SQLiteResultStore(args.results)
+    stats = drain(queue, accounts, store, workers=args.workers, batch_size=args.batch_size,
+                  chunk_size=args.chunk_size, now=now)
+    sys.stdout.write("%d accounts in %d batches in %.2fs: %.1f accounts/s\n" % (
+        stats["accounts"], stats["batches"], stats["seconds"],
+        stats["accounts"] / stats["seconds"] if stats["seconds"] else 0))
+    if args.backfill:
+        sys.stdout.write(format_report(queue.report()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -30,6 +30,7 @@ from System.Data import *
 from System.Configuration import *
 from System.Collections.Generic import *
 clr.ImportExtensions(System.Linq)
+from cdi import DiscreteValueIndex, Evidence, ResultDateJoin, evaluation_context
 from operator import le, ge, gt, lt
 
 #========================================
@@ -77,14 +78,20 @@ autoCodeText = "Autoresolved Code - "
 #  Globals
 #========================================
 db = CACDataRepository()
+#Account data is loaded once and shared by every script run for the account,
+#fetching only the discrete values of the last 7 days
+context = evaluation_context(account, db, System.DateTime.Now.AddDays(-7))
+#Script messages are only formatted when their level is enabled, and are written
+#together at the end of the run
+scriptLog = context.log(db, scriptName, scriptInstance)
 admitDate = account.AdmitDateTime.Date
 birthDate = account.Patient.BirthDate.Date
 gender = account.Patient.Gender
 #Update true = External DV collection False = On Acct Record
-accountContainer = AccountWorkflowContainer(account, True, "Category", 7)
+accountContainer = context.container(AccountWorkflowContainer, True, "Category", 7)
 useSeperateDiscreteCollection = True
 if useSeperateDiscreteCollection == True:
-    discreteValues = db.GetDiscreteValues(account._id)
+    discreteValues = context.discrete_values
 else:
     discreteValues = db.GetAccountField(account._id, "DiscreteValues")
 
@@ -169,274 +176,19 @@ calcwbc4 = lambda x: x < 4
 #========================================
 #  Functions
 #========================================
-def datetimeFromUtcToLocal(utc_datetime):
-    if utc_datetime:
-        convertedDate = DateTime.SpecifyKind(utc_datetime, DateTimeKind.Utc)
-        return  convertedDate.ToLocalTime()
-    else:
-        return None
-
-def cleanNumbers(result):
-    result1 = re.sub("[\\<\\>]", "", str(result))
-    if result1.count('.') <= 1 and result1.replace(".", "").isnumeric():
-        return result1
-    else:
-        return None
-
-def dataConversion(datetime, linkText, Result, id, category, sequence, abstract=True, gender=None):
-    if datetime is not None:
-        date_time = datetimeFromUtcToLocal(datetime)
-        date_time = date_time.ToString("MM/dd/yyyy, HH:mm")
-        linkText = linkText.replace("[RESULTDATETIME]", date_time)
-    else: 
-        linkText = linkText.replace("(Result Date: [RESULTDATETIME])", "")
-    if Result is not None:
-        linkText = linkText.replace("[VALUE]", Result)
-    else: linkText = linkText.replace("[VALUE]", "")
-    if gender: linkText = linkText.replace("[GENDER]", gender)
-    else: linkText = linkText.replace("[GENDER]", "")
-    if abstract == True:
-        category.Links.Add(MatchedCriteriaLink(linkText, None, None, id, True, None, None, sequence))
-    elif abstract == False:
-        abstraction = MatchedCriteriaLink(linkText, None, None, id, True, None, None, sequence)
-        return abstraction
-    return
-
-def CodeCount(codes):
-    # Get list of codes on the acct based on CodeDic
-    result = set()
-    for document in account.Documents or []:
-        for codeReference in document.CodeReferences or []:
-            if codeReference.Code in codes:
-                matching_code = codeReference.Code
-                result.add(matching_code)
-    return list(result)
-
-def abstractValue(abstraction_name, link_text, calculation, sequence=0, category=None, abstract=False):
-    # Find abstraction and if abstract is true abstract it to the provided category
-    abstraction = accountContainer.GetFirstLinkMatchingAbstractionValue(abstraction_name, link_text, lambda x: calculation)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def dvValue(dv_name, link_text, calculation, sequence=0, category=None, abstract=False):
-    # Find Discrete Value and if abstract is true abstract it to the provided category
-    for dv in dv_name:
-        abstraction = accountContainer.GetFirstLinkMatchingDiscreteValue(dv, link_text, calculation)
-        if abstraction is not None:
-            break
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def dvValueMulti(dvDic, DV1, linkText, value, sign, sequence=0, category=None, abstract=False, needed=2):
-    # Find Discrete Value and if abstract is true abstract it to the provided category
-    matchedList = []
-    x = 0
-    for dv in dvDic or []:
-        dvr = cleanNumbers(dvDic[dv]['Result'])
-        if dvDic[dv]['Name'] in DV1 and dvr is not None and sign(float(dvr), float(value)):
-            matchedList.append(dataConversion(dvDic[dv]['ResultDate'], linkText, dvDic[dv]['Result'], dvDic[dv]['UniqueId'] or dvDic[dv]['_id'], category, sequence, abstract))
-            x += 1
-            if needed <= x:
-                break
-    if abstract and x > 0:
-        return True
-    elif abstract is False and len(matchedList) > 0 and needed > 0:
-        return matchedList
-    else:
-        return None
-
-def compareValuesMulti(dvDic, DV1, value, value1, linkText, sign, sign1, sequence=0, category=None, abstract=False, needed=2):
-    matchedList = []
-    x = 0
-    for dv in dvDic or []:
-        dvr = cleanNumbers(dvDic[dv]['Result'])
-        if dvDic[dv]['Name'] in DV1 and dvr is not None and sign(float(value), float(dvr)) and sign1(float(dvr), float(value1)):
-            matchedList.append(dataConversion(dvDic[dv]['ResultDate'], linkText, dvDic[dv]['Result'], dvDic[dv]['UniqueId'] or dvDic[dv]['_id'], category, sequence, abstract))
-            x += 1
-            if needed <= x:
-                break
-    if abstract and x > 0:
-        return True
-    elif abstract is False and len(matchedList) > 0 and needed > 0:
-        return matchedList
-    else:
-        return None
-
-def codeValue(code_name, link_text, sequence=0, category=None, abstract=False):
-    # Find code and if abstract is true abstract it to the provided category
-    abstraction = accountContainer.GetFirstCodeLink(code_name, link_text)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def multiCodeValue(code_list, link_text, sequence=0, category=None, abstract=False):
-    # Go through Code List and find first code and if abstract is true abstract it to the provided category
-    abstraction = None
-    for code in code_list:
-        abstraction = accountContainer.GetFirstCodeLink(code, link_text)
-        if abstraction is not None:
-            abstraction.Sequence = sequence
-            if abstract:
-                category.Links.Add(abstraction)
-                return True
-            else:
-                return abstraction
-    if abstract and abstraction is None:
-        return False
-    return abstraction
-
-def prefixCodeValue(prefix, link_text, sequence=0, category=None, abstract=False):
-    # Use prefix to find first code match based on regex search and if abstract is true abstract it to the provided category
-    abstraction = None
-    validCodes = [codes for codes in accountContainer.CodeKeys if re.match(prefix, codes) is not None]
-    for code in validCodes:
-        abstraction = accountContainer.GetFirstCodeLink(code, link_text)
-        if abstraction is not None:
-            abstraction.Sequence = sequence
-            if abstract:
-                category.Links.Add(abstraction)
-                return True
-            else:
-                return abstraction
-    if abstract and abstraction is None:
-        return False
-    return abstraction
-
-def medValue(med_name, link_text, sequence=0, category=None, abstract=False):
-    # Find Medication Value and if abstract is true abstract it to the provided category
-    abstraction = accountContainer.GetFirstMedicationLink(med_name, link_text)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    if abstract:
-        return False
-    return abstraction
-
-def updateLinkText(value, replacement_text):
-    # Update the link text with the provided text
-    value.LinkText = replacement_text + value.LinkText
-    return value
-
-def documentLink(DocumentType, LinkText, sequence, category, abstract):
-    # Finds a document link and adds it as link so that its a quick reference for the cdi user.
-    abstraction = None
-    abstraction = accountContainer.GetFirstDocumentLink(DocumentType, LinkText)
-    if abstraction is not None:
-        abstraction.Sequence = sequence
-        if abstract:
-            category.Links.Add(abstraction)
-            return True
-        else:
-            return abstraction
-    return None
+#The helpers every script shares are compiled once per process and bound to this
+#script's globals, see cdi.helpers; a helper defined below replaces the shared one
+context.bind_helpers(globals(), 1)
 
 #========================================
 #  Script Specific Functions
 #========================================
-def dvPositiveCheck(dvDic, discreteValueName, linkText, sequence=0, category=None, abstract=False):
-    abstraction = None
-    for dv in dvDic or []:
-        if (
-            dvDic[dv]['Name'] in discreteValueName and
-            dvDic[dv]['Result'] is not None and
-            (re.search(r'\bpositive\b', dvDic[dv]['Result'], re.IGNORECASE) is not None or
-            re.search(r'\bDetected\b', dvDic[dv]['Result'], re.IGNORECASE) is not None)
-        ):
-            if abstract:
-                dataConversion(dvDic[dv]['ResultDate'], linkText, dvDic[dv]['Result'], dvDic[dv]['UniqueId'] or dvDic[dv]['_id'], category, sequence, True)
-                return True
-            else:
-                abstraction = dataConversion(dvDic[dv]['ResultDate'], linkText, dvDic[dv]['Result'], dvDic[dv]['UniqueId'] or dvDic[dv]['_id'], category, sequence, False)
-                return abstraction
-    return abstraction
-
-def anesthesiaMedValue(medDic, med_name, link_text, sequence=0, category=None, abstract=False):
-    for mv in medDic or []:
-        if (
-            medDic[mv]['Route'] is not None and
-            medDic[mv]['Dosage'] is not None and
-            medDic[mv]['Category'] == med_name and
-            (re.search(r'\bhr\b', medDic[mv]['Dosage'], re.IGNORECASE) or
-            re.search(r'\bhour\b', medDic[mv]['Dosage'], re.IGNORECASE) or 
-            re.search(r'\bmin\b', medDic[mv]['Dosage'], re.IGNORECASE) or
-            re.search(r'\bminute\b', medDic[mv]['Dosage'], re.IGNORECASE)) and
-            (re.search(r'\bIntravenous\b', medDic[mv]['Route'], re.IGNORECASE) or
-            re.search(r'\bIV Push\b', medDic[mv]['Route'], re.IGNORECASE))
-        ):
-            if abstract == True:
-                medDataConversion(medDic[mv]['StartDate'], link_text, medDic[mv]['Medication'], medDic[mv]['ExternalId'], medDic[mv]['Dosage'], medDic[mv]['Route'], category, sequence)
-                return True
-            elif abstract == False:
-                abstraction = medDataConversion(medDic[mv]['StartDate'], link_text, medDic[mv]['Medication'], medDic[mv]['ExternalId'], medDic[mv]['Dosage'], medDic[mv]['Route'], category, sequence, abstract)
-                return abstraction
-    return None
-
-def antiboticMedValue(medDic, med_name, link_text, sequence=0, category=None, abstract=False):
-    for mv in medDic or []:
-        if (
-            medDic[mv]['Route'] is not None and
-            medDic[mv]['Category'] == med_name and
-            (re.search(r'\bEye\b', medDic[mv]['Route'], re.IGNORECASE) is None and 
-            re.search(r'\btopical\b', medDic[mv]['Route'], re.IGNORECASE) is None and 
-            re.search(r'\bocular\b', medDic[mv]['Route'], re.IGNORECASE) is None and 
-            re.search(r'\bophthalmic\b', medDic[mv]['Route'], re.IGNORECASE) is None)
-        ):
-            if abstract == True:
-                medDataConversion(medDic[mv]['StartDate'], link_text, medDic[mv]['Medication'], medDic[mv]['ExternalId'], medDic[mv]['Dosage'], medDic[mv]['Route'], category, sequence)
-                return True
-            elif abstract == False:
-                abstraction = medDataConversion(medDic[mv]['StartDate'], link_text, medDic[mv]['Medication'], medDic[mv]['ExternalId'], medDic[mv]['Dosage'], medDic[mv]['Route'], category, sequence, abstract)
-                return abstraction
-    return None
-
-def medDataConversion(datetime, linkText, med, id, dosage, route, category, sequence, abstract=True):
-    date_time = datetimeFromUtcToLocal(datetime)
-    date_time = date_time.ToString("MM/dd/yyyy, HH:mm")
-    linkText = linkText.replace("[STARTDATE]", date_time)
-    linkText = linkText.replace("[MEDICATION]", med)
-    linkText = linkText.replace("[DOSAGE]", dosage)
-    if route is not None: linkText = linkText.replace("[ROUTE]", route)
-    else: linkText = linkText.replace(", Route [ROUTE]", "")
-    if abstract == True:
-        abstraction = MatchedCriteriaLink(linkText, None, None, None, True, None, None, sequence)
-        abstraction.MedicationId = id
-        category.Links.Add(abstraction)
-    elif abstract == False:
-        abstraction = MatchedCriteriaLink(linkText, None, None, None, True, None, None, sequence)
-        abstraction.MedicationId = id
-        return abstraction
-    return
-
 def sirsLookup(dvDic, dvSirsMatches):
     matchedList = []
-    dateList = []
+    dateList = set()
+    #Line up all temperature, heart rate and respiratory rate values by result date
+    vitalRows = ResultDateJoin(dvDic, {'temp': dvTemperature, 'hr': dvHeartRate, 'resp': dvRespiratoryRate},
+        lambda dv: cleanNumbers(dv['Result']) is not None)
     #Pull all values for discrete values we need
     for value in dvSirsMatches:
         tempDv = 'XX'
@@ -446,24 +198,23 @@ def sirsLookup(dvDic, dvSirsMatches):
         match = dvSirsMatches[value]['Name']
         id = dvSirsMatches[value]['UniqueId'] or dvSirsMatches[value]['_id']
         if date not in dateList:
-            dateList.append(date)
+            dateList.add(date)
             if match in dvTemperature:
                 tempDv = dvSirsMatches[value]['Result']
             elif match in dvHeartRate:
                 hrDv = dvSirsMatches[value]['Result']
             elif match in dvRespiratoryRate:
                 respDv = dvSirsMatches[value]['Result']
-            for dv in dvDic or []:
-                dvr = cleanNumbers(dvDic[dv]['Result'])
-                if dvDic[dv]['Name'] in dvTemperature and dvr is not None and match not in dvTemperature and dvDic[dv]['ResultDate'] == date:
-                    #Temperature
-                    tempDv = dvDic[dv]['Result']
-                elif dvDic[dv]['Name'] in dvHeartRate and dvr is not None and match not in dvHeartRate and dvDic[dv]['ResultDate'] == date:
-                    #Heart Rate
-                    hrDv = dvDic[dv]['Result']
-                elif dvDic[dv]['Name'] in dvRespiratoryRate and dvr is not None and match not in dvRespiratoryRate and dvDic[dv]['ResultDate'] == date:
-                    #Respiratory Rate
-                    respDv = dvDic[dv]['Result']
+            row = vitalRows.get(date)
+            if match not in dvTemperature and row['temp']:
+                #Temperature
+                tempDv = row.last('temp')['Result']
+            if match not in dvHeartRate and row['hr']:
+                #Heart Rate
+                hrDv = row.last('hr')['Result']
+            if match not in dvRespiratoryRate and row['resp']:
+                #Respiratory Rate
+                respDv = row.last('resp')['Result']
             matchingDate = datetimeFromUtcToLocal(date)
             matchingDate = matchingDate.ToString("MM/dd/yyyy, HH:mm")
             matchedList.append(dataConversion(None, matchingDate + " Temp = " + str(tempDv) + ", HR = " + str(hrDv) + ", RR = " + str(respDv), None, id, vitals, 0, True))
@@ -471,11 +222,9 @@ def sirsLookup(dvDic, dvSirsMatches):
     if matchedList is not None:
         return matchedList
     else:
-        return None     
+        return None
 
 def sirsLookupLacking(dvDic, sirsMatchID):
-    matchedList = []
-    dateList = []
     #Pull all values for discrete values we need
     for value in dvDic:
         if dvDic[value]['UniqueId'] == sirsMatchID:
@@ -485,35 +234,34 @@ def sirsLookupLacking(dvDic, sirsMatchID):
             date = dvDic[value]['ResultDate']
             match = dvDic[value]['Name']
             id = dvDic[value]['UniqueId'] or dvDic[value]['_id']
-            if date not in dateList:
-                dateList.append(date)
-                if match in dvTemperature:
-                    tempDv = dvDic[value]['Result']
-                elif match in dvHeartRate:
-                    hrDv = dvDic[value]['Result']
-                elif match in dvRespiratoryRate:
-                    respDv = dvDic[value]['Result']
-                for dv in dvDic or []:
-                    dvr = cleanNumbers(dvDic[dv]['Result'])
-                    if dvDic[dv]['Name'] in dvTemperature and dvr is not None and match not in dvTemperature and dvDic[dv]['ResultDate'] == date:
-                        #Temperature
-                        tempDv = dvDic[dv]['Result']
-                    elif dvDic[dv]['Name'] in dvHeartRate and dvr is not None and match not in dvHeartRate and dvDic[dv]['ResultDate'] == date:
-                        #Heart Rate
-                        hrDv = dvDic[dv]['Result']
-                    elif dvDic[dv]['Name'] in dvRespiratoryRate and dvr is not None and match not in dvRespiratoryRate and dvDic[dv]['ResultDate'] == date:
-                        #Respiratory Rate
-                        respDv = dvDic[dv]['Result']
-                matchingDate = datetimeFromUtcToLocal(date)
-                matchingDate = matchingDate.ToString("MM/dd/yyyy, HH:mm")
-                matchedList.append(dataConversion(None, matchingDate + " Temp = " + str(tempDv) + ", HR = " + str(hrDv) + ", RR = " + str(respDv), None, id, vitals, 0, True))
-                return True
+            if match in dvTemperature:
+                tempDv = dvDic[value]['Result']
+            elif match in dvHeartRate:
+                hrDv = dvDic[value]['Result']
+            elif match in dvRespiratoryRate:
+                respDv = dvDic[value]['Result']
+            #Line up the temperature, heart rate and respiratory rate values taken at the same time
+            row = ResultDateJoin(dvDic, {'temp': dvTemperature, 'hr': dvHeartRate, 'resp': dvRespiratoryRate},
+                lambda dv: cleanNumbers(dv['Result']) is not None).get(date)
+            if match not in dvTemperature and row['temp']:
+                #Temperature
+                tempDv = row.last('temp')['Result']
+            if match not in dvHeartRate and row['hr']:
+                #Heart Rate
+                hrDv = row.last('hr')['Result']
+            if match not in dvRespiratoryRate and row['resp']:
+                #Respiratory Rate
+                respDv = row.last('resp')['Result']
+            matchingDate = datetimeFromUtcToLocal(date)
+            matchingDate = matchingDate.ToString("MM/dd/yyyy, HH:mm")
+            dataConversion(None, matchingDate + " Temp = " + str(tempDv) + ", HR = " + str(hrDv) + ", RR = " + str(respDv), None, id, vitals, 0, True)
+            return True
     return None
 
 #========================================
 #  Algorithm
 #========================================
-db.LogEvaluationScriptMessage("Script starting " + str(account._id), scriptName, scriptInstance, "Debug")
+scriptLog.debug("Script starting %s", account._id)
 #Calaculate Age
 age = math.floor((admitDate - birthDate).TotalDays/ 365.2425)
 
@@ -591,82 +339,58 @@ for alert in account.MatchedCriteriaGroups or []:
 #Check if alert was autoresolved or completed.
 if validated is False:    
     #Get meds within last X days
-    mainMedDic = {}
-    unsortedMedDic = {}
-    medCount = 0
     #Combine all items into one list to search against
     medSearchList = ["Epinephrine", "Levophed", "Vasopressin", "Neosynephrine", "Antibiotic", "Antibiotic2"]
     #Set datelimit for how far back to 
     medDateLimit = System.DateTime.Now.AddDays(-7)
-    #Loop through all meds finding any that match in the combined list adding to a dictionary the matches
-    if 'Medications' in account:    
-        for med in account.Medications:
-            if med.StartDate >= medDateLimit and 'Category' in med and med.Category is not None:
-                if any(item == med.Category for item in medSearchList):
-                    medCount += 1
-                    unsortedMedDic[medCount] = med
-    #Sort List by latest
-    mainMedDic = sorted(unsortedMedDic.items(), key=lambda x: x[1]['StartDate'], reverse=True)
+    #Collect matching meds, sorted by latest
+    mainMedDic = context.medications(medSearchList, medDateLimit)
     
     #Find all discrete values for custom lookups within the last X days
-    maindiscreteDic = {}
-    unsortedDicsreteDic = {}
-    mainSIRSDVDic = {}
-    unsortedSIRSDVDic = {}
-    dvCount = 0
-    sirsdvCount = 0
     #Combine all items into one list to search against
     discreteSearchList = [i for j in [dvCBlood, dvUrineCulture] for i in j]
     sirsDVSearchList = [i for j in [dvTemperature, dvHeartRate, dvWBC, dvSerumBand, dvRespiratoryRate, dvPCO2] for i in j]
     #Set datelimit for how far back to 
     dvDateLimit = System.DateTime.Now.AddDays(-7)
     sirsDVDateLimit = System.DateTime.Now.AddDays(-1)
-    #Loop through all dvs finding any that match in the combined list adding to a dictionary the matches
-    for dv in discreteValues or []:
-        if dv.ResultDate >= sirsDVDateLimit:
-            if any(item == dv.Name for item in sirsDVSearchList):
-                sirsdvCount += 1
-                unsortedSIRSDVDic[sirsdvCount] = dv
-        elif dv.ResultDate >= dvDateLimit:
-            if any(item == dv.Name for item in discreteSearchList):
-                dvCount += 1
-                unsortedDicsreteDic[dvCount] = dv
-    #Sort List by latest
-    mainSIRSDVDic = dict(sorted(unsortedSIRSDVDic.items(), key=lambda x: x[1]['ResultDate'], reverse=True))
-    maindiscreteDic = sorted(unsortedDicsreteDic.items(), key=lambda x: x[1]['ResultDate'], reverse=True)
+    #Index all dvs that match in the combined lists by name, sorted by latest
+    #SIRS dvs come from the last day only, everything else from the days before that
+    mainSIRSDVDic = DiscreteValueIndex(discreteValues, sirsDVSearchList, sirsDVDateLimit)
+    maindiscreteDic = DiscreteValueIndex(discreteValues, discreteSearchList, dvDateLimit, sirsDVDateLimit)
     
     #Documented Dx
-    r6521Code = codeValue("R65.21", "Severe Sepsis with Septic Shock: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    a419Code = codeValue("A41.9", "Sepsis Dx Unspecified: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 99)
+    evidence = Evidence()
+    evidence.define("r6521Code", codeValue, "R65.21", "Severe Sepsis with Septic Shock: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("a419Code", codeValue, "A41.9", "Sepsis Dx Unspecified: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 99)
     #Negations
-    PulmonaryDCode = codeValue("J44.1", "Chronic Obstructive Pulmonary Disease with (Acute) Exacerbation: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    hypothermiaCheck = multiCodeValue(["T68.0", "T68.XXXA", "T88.51XA", "T88.51"], "Hypothermia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 99)
+    evidence.define("PulmonaryDCode", codeValue, "J44.1", "Chronic Obstructive Pulmonary Disease with (Acute) Exacerbation: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("hypothermiaCheck", multiCodeValue, ["T68.0", "T68.XXXA", "T88.51XA", "T88.51"], "Hypothermia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 99)
     kidneyDiseaseCode = multiCodeValue(["N18.1", "N18.2", "N18.30", "N18.31", "N18.32", "N18.4", "N18.5", "N18.6"], "Kidney Disease: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    FeverCheck = multiCodeValue(["G21.0", "T43.225A", "T43.224A", "T43.221A", "T88.3XXA", "R50.83", "R50.84", "R50.2"], "Fever: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 99)
-    d469Code = codeValue("D46.9", "Myelodysplastic Syndrome: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 99)
-    a3e04305Code = codeValue("3E04305", "Chemotherapy Medication Administration: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 99)
-    currentChemotherapyAbs = abstractValue("CURRENT_CHEMOTHERAPY", "Current Chemotherapy '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 99)
-    acuteHeartFailureCheck = multiCodeValue(["I50.21", "I50.23", "I50.33", "I50.41", "I50.43", "I50.811", "I50.813", "I50.814", "I50.9"], "Acute Heart Failure Codes: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 99)
-    diabetesE10Check = prefixCodeValue("^E10\.", "Diabetes: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 99)
-    diabetesE11Check = prefixCodeValue("^E11\.", "Diabetes: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 99)
-    goutFlareAbs = abstractValue("GOUT_FLARE", "Gout Flare '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 99)
-    hyperhidrosisCode = codeValue("R61", "Hyperhidrosis: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 99)
-    leukemiaCheck = multiCodeValue(["C91", "C91.0", "C91.00", "C91.01", "C91.01", "C91.1", "C91.10", "C91.11",
+    evidence.define("FeverCheck", multiCodeValue, ["G21.0", "T43.225A", "T43.224A", "T43.221A", "T88.3XXA", "R50.83", "R50.84", "R50.2"], "Fever: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 99)
+    evidence.define("d469Code", codeValue, "D46.9", "Myelodysplastic Syndrome: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 99)
+    evidence.define("a3e04305Code", codeValue, "3E04305", "Chemotherapy Medication Administration: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 99)
+    evidence.define("currentChemotherapyAbs", abstractValue, "CURRENT_CHEMOTHERAPY", "Current Chemotherapy '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 99)
+    evidence.define("acuteHeartFailureCheck", multiCodeValue, ["I50.21", "I50.23", "I50.33", "I50.41", "I50.43", "I50.811", "I50.813", "I50.814", "I50.9"], "Acute Heart Failure Codes: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 99)
+    evidence.define("diabetesE10Check", prefixCodeValue, "^E10\.", "Diabetes: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 99)
+    evidence.define("diabetesE11Check", prefixCodeValue, "^E11\.", "Diabetes: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 99)
+    evidence.define("goutFlareAbs", abstractValue, "GOUT_FLARE", "Gout Flare '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 99)
+    evidence.define("hyperhidrosisCode", codeValue, "R61", "Hyperhidrosis: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 99)
+    evidence.define("leukemiaCheck", multiCodeValue, ["C91", "C91.0", "C91.00", "C91.01", "C91.01", "C91.1", "C91.10", "C91.11",
                 "C91.12", "C91.3", "C91.30", "C91.31", "C91.32", "C91.4", "C91.40", "C91.41",
                 "C91.42", "C91.5", "C91.50", "C91.51", "C91.52", "C91.6", "C91.60", "C91.61",
                 "C91.62", "C91.A", "C91.A0", "C91.A1", "C91.A2", "C91.Z", "C91.Z0", "C91.Z1",
                 "C91.Z2", "C91.9", "C91.90", "C91.91", "C91.92", "C92", "C92.0", "C92.00", "C92.01",
                 "C92.02", "C92.1", "C92.11", "C92.12", "C92.2", "C92.20", "C92.21", "C92.22",
                 "D45", "D75.81", "D70.0", "D72.0", "D70.1", "D70.2"], "Leukemia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 99)
-    liverCirrhosisCheck = multiCodeValue(["K70.0", "K70.10", "K70.11", "K70.2", "K70.30", "K70.31", "K70.40", "K70.41", "K70.9",
+    evidence.define("liverCirrhosisCheck", multiCodeValue, ["K70.0", "K70.10", "K70.11", "K70.2", "K70.30", "K70.31", "K70.40", "K70.41", "K70.9",
                                         "K74.60", "K72.1", "K71", "K71.0", "K71.10", "K71.11", "K71.2", "K71.3", "K71.4", "K71.50",
                                         "K71.51", "K71.6", "K71.7", "K71.8", "K71.9", "K72.10", "K72.11", "K73.0", "K73.1", "K73.2",
                                         "K73.8", "K73.9", "R18.0"], "Liver Cirrhosis: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 99)
-    alcoholAndOpioidAbuseCheck = multiCodeValue(["F10.920", "F10.921", "F10.929", "F10.930", "F10.931", "F10.932",
+    evidence.define("alcoholAndOpioidAbuseCheck", multiCodeValue, ["F10.920", "F10.921", "F10.929", "F10.930", "F10.931", "F10.932",
             "F10.939", "F11.120", "F11.121", "F11.122", "F11.129", "F11.13"], "Alcohol and Opioid Abuse: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    chronicKidneyFailureCheck = multiCodeValue(["N18.30", "N18.31", "N18.32", "N18.4", "N18.5", "N18.6", "N18.9"],
+    evidence.define("chronicKidneyFailureCheck", multiCodeValue, ["N18.30", "N18.31", "N18.32", "N18.4", "N18.5", "N18.6", "N18.9"],
             "Chronic Kidney Failure: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    longTermImmunomodulatorsImunosuppCode = codeValue("Z79.69", "Long term use of other immunomodulators and immunosuppressants: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 99)
+    evidence.define("longTermImmunomodulatorsImunosuppCode", codeValue, "Z79.69", "Long term use of other immunomodulators and immunosuppressants: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 99)
     lowHemoglobinDV = None
     lowHematocritDV = None
     if gender == 'F':
@@ -675,120 +399,120 @@ if validated is False:
     if gender == 'M':
         lowHemoglobinDV = dvValue(dvHemoglobin, "Hemoglobin: [VALUE] (Result Date: [RESULTDATETIME])", calcHemoglobin1, 99)
         lowHematocritDV = dvValue(dvHematocrit, "Hematocrit: [VALUE] (Result Date: [RESULTDATETIME])", calcHematocrit2, 99)
-    negationsHeartRateCheck = multiCodeValue(["F15.10", "F15.929", "E05.90", "F41.0", "J44.1", "J45.902", "I48.0", "I48.1", "I48.19", "I48.20", "I48.21",
+    evidence.define("negationsHeartRateCheck", multiCodeValue, ["F15.10", "F15.929", "E05.90", "F41.0", "J44.1", "J45.902", "I48.0", "I48.1", "I48.19", "I48.20", "I48.21",
                 "I48.3", "I48.4", "I48.91", "I48.92"], "Negated for Heart Rate: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 99)
-    negationsRespiratoryCheck = multiCodeValue(["F15.929", "F45.8", "F41.0", "J45.901", "J45.902", "J44.1"],
+    evidence.define("negationsRespiratoryCheck", multiCodeValue, ["F15.929", "F45.8", "F41.0", "J45.901", "J45.902", "J44.1"],
                 "Negations for Respiratory: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 99)
-    pulmonaryEmbolismCheck = prefixCodeValue("^I26\.", "Pulmonary Embolism '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 99)
-    psychogenicHyperventilationAbs = abstractValue("PSYCHOGENIC_HYPERVENTILATION", "Psychogenic Hyperventilation '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 99)
-    steroidsAbs = abstractValue("STEROIDS", "Steroid '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 99)
-    anticoagulantAbs = abstractValue("ANTICOAGULANT", "Anticoagulant '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True)
-    negationAspartate = multiCodeValue(["B18.2", "B19.20", "K72.10", "K72.11", "K73", "K74.60", "K74.69", "Z79.01", "Z86.19"], "Negation Aspartate '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    r6510Code = codeValue("R65.10", "Systemic Inflammatory Response Syndrome (SIRS) of Non-Infectious Origin without Acute Organ Dysfunction: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 99)
-    r6511Code = codeValue("R65.11", "Systemic Inflammatory Response Syndrome (SIRS) of Non-Infectious Origin with Acute Organ Dysfunction: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 99)
+    evidence.define("pulmonaryEmbolismCheck", prefixCodeValue, "^I26\.", "Pulmonary Embolism '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 99)
+    evidence.define("psychogenicHyperventilationAbs", abstractValue, "PSYCHOGENIC_HYPERVENTILATION", "Psychogenic Hyperventilation '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 99)
+    evidence.define("steroidsAbs", abstractValue, "STEROIDS", "Steroid '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 99)
+    evidence.define("anticoagulantAbs", abstractValue, "ANTICOAGULANT", "Anticoagulant '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True)
+    evidence.define("negationAspartate", multiCodeValue, ["B18.2", "B19.20", "K72.10", "K72.11", "K73", "K74.60", "K74.69", "Z79.01", "Z86.19"], "Negation Aspartate '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("r6510Code", codeValue, "R65.10", "Systemic Inflammatory Response Syndrome (SIRS) of Non-Infectious Origin without Acute Organ Dysfunction: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 99)
+    evidence.define("r6511Code", codeValue, "R65.11", "Systemic Inflammatory Response Syndrome (SIRS) of Non-Infectious Origin with Acute Organ Dysfunction: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 99)
     #Abstraction Links
-    abdominalDistentionAbs = abstractValue("ABDOMINAL_DISTENTION", "Abdominal Distention '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 1)
-    abdominalPainAbs = abstractValue("ABDOMINAL_PAIN", "Abdominal Pain '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 2)
-    abnormalSputumAbs = abstractValue("ABNORMAL_SPUTUM", "Abnormal Sputum '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 3)
-    r1114Code = codeValue("R11.14", "Bilious Vomiting: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 4)
-    r6883Code = codeValue("R68.83", "Chills '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 5)
-    cloudyUrineAbs = abstractValue("CLOUDY_URINE", "Cloudy Urine '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 6)
-    if PulmonaryDCode is None: 
+    evidence.define("abdominalDistentionAbs", abstractValue, "ABDOMINAL_DISTENTION", "Abdominal Distention '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 1)
+    evidence.define("abdominalPainAbs", abstractValue, "ABDOMINAL_PAIN", "Abdominal Pain '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 2)
+    evidence.define("abnormalSputumAbs", abstractValue, "ABNORMAL_SPUTUM", "Abnormal Sputum '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 3)
+    evidence.define("r1114Code", codeValue, "R11.14", "Bilious Vomiting: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 4)
+    evidence.define("r6883Code", codeValue, "R68.83", "Chills '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 5)
+    evidence.define("cloudyUrineAbs", abstractValue, "CLOUDY_URINE", "Cloudy Urine '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 6)
+    if evidence.PulmonaryDCode is None: 
         r05Codes = multiCodeValue(["R05.1", "R05.9"], "Cough: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 7)
-    diaphoreticAbs = abstractValue("DIAPHORETIC", "Diaphoretic '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 8)
-    diarrheaAbs = abstractValue("DIARRHEA", "Diarrhea '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 9)
-    r410Code = codeValue("R41.0", "Disorientation: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 10)
-    r60Codes = multiCodeValue(["R60.1", "R60.9"], "Edema: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 11)
-    g934Codes = multiCodeValue(["G93.40", "G93.41", "G93.49"], "Encephalopathy: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 12)
-    foulSmellingDischargeAbs = abstractValue("FOUL_SMELLING_DISCHARGE", "Foul-Smelling Discharge '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 13)
-    glasgowComaScoreDV = dvValue(dvGlasgowComaScale, "Glasgow Coma Score: [VALUE] (Result Date: [RESULTDATETIME])", calcGlasgowComaScale1, 14)
-    inflammationAbs = abstractValue("INFLAMMATION", "Inflammation '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 17)
-    m7910Code = codeValue("M79.10", "Myalgias: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 18)
-    pelvicPainAbs = abstractValue("PELVIC_PAIN", "Pelvic Pain '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 20)
-    photophobiaAbs = abstractValue("PHOTOPHOBIA", "Photophobia '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 22)
-    r1112Code = codeValue("R11.12", "Projectile Vomiting: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 23)
-    purulentDrainageAbs = abstractValue("PURULENT_DRAINAGE", "Purulent Drainage '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 24)
-    r8281Code = codeValue("R82.81", "Pyuria '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 25)
-    soreThroatAbs = abstractValue("SORE_THROAT", "Sore Throat '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 27)
-    stiffNeckAbs = abstractValue("STIFF_NECK", "Stiff Neck '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 28)
-    swollenLymphNodesAbs = abstractValue("SWOLLEN_LYMPH_NODES", "Swollen Lymph Nodes '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 29)
-    urinaryPainAbs = abstractValue("URINARY_PAIN", "Urinary Pain '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 30)
-    r1110Code = codeValue("R11.10", "Vomiting: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 31)
-    vomitingAbs = abstractValue("VOMITING", "Vomiting '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 32)
-    r1113Code = codeValue("R11.13", "Vomiting Fecal Matter: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 33)
+    evidence.define("diaphoreticAbs", abstractValue, "DIAPHORETIC", "Diaphoretic '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 8)
+    evidence.define("diarrheaAbs", abstractValue, "DIARRHEA", "Diarrhea '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 9)
+    evidence.define("r410Code", codeValue, "R41.0", "Disorientation: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 10)
+    evidence.define("r60Codes", multiCodeValue, ["R60.1", "R60.9"], "Edema: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 11)
+    evidence.define("g934Codes", multiCodeValue, ["G93.40", "G93.41", "G93.49"], "Encephalopathy: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 12)
+    evidence.define("foulSmellingDischargeAbs", abstractValue, "FOUL_SMELLING_DISCHARGE", "Foul-Smelling Discharge '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 13)
+    evidence.define("glasgowComaScoreDV", dvValue, dvGlasgowComaScale, "Glasgow Coma Score: [VALUE] (Result Date: [RESULTDATETIME])", calcGlasgowComaScale1, 14)
+    evidence.define("inflammationAbs", abstractValue, "INFLAMMATION", "Inflammation '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 17)
+    evidence.define("m7910Code", codeValue, "M79.10", "Myalgias: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 18)
+    evidence.define("pelvicPainAbs", abstractValue, "PELVIC_PAIN", "Pelvic Pain '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 20)
+    evidence.define("photophobiaAbs", abstractValue, "PHOTOPHOBIA", "Photophobia '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 22)
+    evidence.define("r1112Code", codeValue, "R11.12", "Projectile Vomiting: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 23)
+    evidence.define("purulentDrainageAbs", abstractValue, "PURULENT_DRAINAGE", "Purulent Drainage '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 24)
+    evidence.define("r8281Code", codeValue, "R82.81", "Pyuria '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 25)
+    evidence.define("soreThroatAbs", abstractValue, "SORE_THROAT", "Sore Throat '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 27)
+    evidence.define("stiffNeckAbs", abstractValue, "STIFF_NECK", "Stiff Neck '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 28)
+    evidence.define("swollenLymphNodesAbs", abstractValue, "SWOLLEN_LYMPH_NODES", "Swollen Lymph Nodes '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 29)
+    evidence.define("urinaryPainAbs", abstractValue, "URINARY_PAIN", "Urinary Pain '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 30)
+    evidence.define("r1110Code", codeValue, "R11.10", "Vomiting: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 31)
+    evidence.define("vomitingAbs", abstractValue, "VOMITING", "Vomiting '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 32)
+    evidence.define("r1113Code", codeValue, "R11.13", "Vomiting Fecal Matter: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 33)
     #infection Links
-    aspergillosisCode = prefixCodeValue("^B44\.", "Aspergillosis Infection Code: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 1)
-    bacteremiaCode = codeValue("R78.81", "Bacteremia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 2)
-    bacterialInfectionCode = prefixCodeValue("^A49\.", "Bacterial Infection Of Unspecified Site Code: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 3)
-    bacteriuriaCode = codeValue("R82.71", "Bacteriuria: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 4)
-    blastomycosisCode = prefixCodeValue("^B40\.", "Blastomycosis Infection Code: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 5)
-    chromomycosisPheomycoticAbscessCode = prefixCodeValue("^B43\.", "Chromomycosis And Pheomycotic Abscess Infection Code: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 6)
-    cryptococcosisCode = prefixCodeValue("^B45\.", "Cryptococcosis Infection Code: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 7)
-    cytomegaloviralCode = prefixCodeValue("^B25\.", "Cytomegaloviral Disease Code: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 8)
-    infectionAbs = abstractValue("INFECTION", "Infection '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 10)
-    mycosisCode = prefixCodeValue("^B49\.", "Mycosis Infection Code: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 12)
-    otherBacterialAgentsCode = prefixCodeValue("^B96\.", "Other Bacterial Agents As The Cause Of Diseases Infection Code: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 13)
-    paracoccidioidomycosisCode = prefixCodeValue("^B41\.", "Paracoccidioidomycosis  Infection Code: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 14)
-    positiveCerebrospinalFluidCultureCode = codeValue("R83.5", "Positive Cerebrospinal Fluid Culture: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 15)
-    positiveRespiratoryCultureCode = codeValue("R84.5", "Positive Respiratory Culture: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 16)
-    bacteriaUrinedv = dvValue(dvBacteriaUrine, "Positive Result for Bacteria In Urine: [DISCRETEVALUE]", calcBacteriaUrine1, 0)
-    positiveUrineAnalysisCode = codeValue("R82.998", "Positive Urine Analysis: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 17)
-    positiveUrineCultureCode = codeValue("R82.79", "Positive Urine Culture: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 18)
-    postiveWoundCultureAbs = abstractValue("POSITIVE_WOUND_CULTURE", "Positive Wound Culture '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 19)
-    sporotrichosisCode = prefixCodeValue("^B42\.", "Sporotrichosis Infection Code: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 20)
-    streptococcusStaphylococcusEnterococcusCode = prefixCodeValue("^B95\.", "Streptococcus, Staphylococcus, and Enterococcus Infection Code: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 21)
-    zygomycosisCode = prefixCodeValue("^B46\.", "Zygomycosis Infection Code: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 22)
+    evidence.define("aspergillosisCode", prefixCodeValue, "^B44\.", "Aspergillosis Infection Code: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 1)
+    evidence.define("bacteremiaCode", codeValue, "R78.81", "Bacteremia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 2)
+    evidence.define("bacterialInfectionCode", prefixCodeValue, "^A49\.", "Bacterial Infection Of Unspecified Site Code: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 3)
+    evidence.define("bacteriuriaCode", codeValue, "R82.71", "Bacteriuria: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 4)
+    evidence.define("blastomycosisCode", prefixCodeValue, "^B40\.", "Blastomycosis Infection Code: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 5)
+    evidence.define("chromomycosisPheomycoticAbscessCode", prefixCodeValue, "^B43\.", "Chromomycosis And Pheomycotic Abscess Infection Code: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 6)
+    evidence.define("cryptococcosisCode", prefixCodeValue, "^B45\.", "Cryptococcosis Infection Code: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 7)
+    evidence.define("cytomegaloviralCode", prefixCodeValue, "^B25\.", "Cytomegaloviral Disease Code: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 8)
+    evidence.define("infectionAbs", abstractValue, "INFECTION", "Infection '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 10)
+    evidence.define("mycosisCode", prefixCodeValue, "^B49\.", "Mycosis Infection Code: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 12)
+    evidence.define("otherBacterialAgentsCode", prefixCodeValue, "^B96\.", "Other Bacterial Agents As The Cause Of Diseases Infection Code: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 13)
+    evidence.define("paracoccidioidomycosisCode", prefixCodeValue, "^B41\.", "Paracoccidioidomycosis  Infection Code: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 14)
+    evidence.define("positiveCerebrospinalFluidCultureCode", codeValue, "R83.5", "Positive Cerebrospinal Fluid Culture: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 15)
+    evidence.define("positiveRespiratoryCultureCode", codeValue, "R84.5", "Positive Respiratory Culture: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 16)
+    evidence.define("bacteriaUrinedv", dvValue, dvBacteriaUrine, "Positive Result for Bacteria In Urine: [DISCRETEVALUE]", calcBacteriaUrine1, 0)
+    evidence.define("positiveUrineAnalysisCode", codeValue, "R82.998", "Positive Urine Analysis: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 17)
+    evidence.define("positiveUrineCultureCode", codeValue, "R82.79", "Positive Urine Culture: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 18)
+    evidence.define("postiveWoundCultureAbs", abstractValue, "POSITIVE_WOUND_CULTURE", "Positive Wound Culture '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 19)
+    evidence.define("sporotrichosisCode", prefixCodeValue, "^B42\.", "Sporotrichosis Infection Code: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 20)
+    evidence.define("streptococcusStaphylococcusEnterococcusCode", prefixCodeValue, "^B95\.", "Streptococcus, Staphylococcus, and Enterococcus Infection Code: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 21)
+    evidence.define("zygomycosisCode", prefixCodeValue, "^B46\.", "Zygomycosis Infection Code: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 22)
     #Labs
-    alaTranDV = dvValue(dvAlanineTransaminase, "Alanine Aminotransferase: [VALUE] (Result Date: [RESULTDATETIME])", calcAlanineTransaminase1, 1)
-    cBloodDV = dvPositiveCheck(dict(maindiscreteDic), dvCBlood, "Blood Culture Result: '[VALUE]' (Result Date: [RESULTDATETIME])", 2)
-    urineCultureDV = dvPositiveCheck(dict(maindiscreteDic), dvUrineCulture, "Urine Culture Result: '[VALUE]' (Result Date: [RESULTDATETIME])", 3)
-    aspTranDV = dvValue(dvAspartateTransaminase, "Aspartate Aminotransferase: [VALUE] (Result Date: [RESULTDATETIME])", calcAspartateTransaminase1, 4)
+    evidence.define("alaTranDV", dvValue, dvAlanineTransaminase, "Alanine Aminotransferase: [VALUE] (Result Date: [RESULTDATETIME])", calcAlanineTransaminase1, 1)
+    evidence.define("cBloodDV", dvPositiveCheck, maindiscreteDic, dvCBlood, "Blood Culture Result: '[VALUE]' (Result Date: [RESULTDATETIME])", 2)
+    evidence.define("urineCultureDV", dvPositiveCheck, maindiscreteDic, dvUrineCulture, "Urine Culture Result: '[VALUE]' (Result Date: [RESULTDATETIME])", 3)
+    evidence.define("aspTranDV", dvValue, dvAspartateTransaminase, "Aspartate Aminotransferase: [VALUE] (Result Date: [RESULTDATETIME])", calcAspartateTransaminase1, 4)
     highBloodGlucoseDV = dvValue(dvBloodGlucose, "Blood Glucose: [VALUE] (Result Date: [RESULTDATETIME])", calcBloodGlucose1, 6)
     if highBloodGlucoseDV is None: highBloodGlucoseDV = dvValue(dvBloodGlucosePOC, "Blood Glucose POC: [VALUE] (Result Date: [RESULTDATETIME])", calcBloodGlucosePOC1, 7)
-    highCReactiveProteinDV = dvValue(dvCreactiveProtein, "C-Reactive Protein: [VALUE] (Result Date: [RESULTDATETIME])", calcCreactiveProtein1, 8)
-    pa02DV = dvValue(dvPaO2, "pa02: [VALUE] (Result Date: [RESULTDATETIME])", calcPAO21, 11)
-    proclcitoninDV = dvValue(dvProcalcitonin, "Procalcitonin: [VALUE] (Result Date: [RESULTDATETIME])", calcProcalcitonin1, 13)
-    serumBilirubinDV = dvValue(dvSerumBilirubin, "Serum Bilirubin: [VALUE] (Result Date: [RESULTDATETIME])", calcSerumBilirubin1, 14)
-    serumBunDV = dvValue(dvSerumBun, "Serum BUN: [VALUE] (Result Date: [RESULTDATETIME])", calcSerumBun1, 15)
-    serumCreatinineDV = dvValue(dvSerumCreatinine, "Serum Creatinine: [VALUE] (Result Date: [RESULTDATETIME])", calcSerumCreatinine1, 16)
-    serumLactateDV = dvValue(dvSerumLactate, "Serum Lactate: [VALUE] (Result Date: [RESULTDATETIME])", calcSerumLactate1, 17)
-    pocLactateDV = dvValue(dvPOCLactate, "Serum Lactate: [VALUE] (Result Date: [RESULTDATETIME])", calcPOCLactate1, 17)
+    evidence.define("highCReactiveProteinDV", dvValue, dvCreactiveProtein, "C-Reactive Protein: [VALUE] (Result Date: [RESULTDATETIME])", calcCreactiveProtein1, 8)
+    evidence.define("pa02DV", dvValue, dvPaO2, "pa02: [VALUE] (Result Date: [RESULTDATETIME])", calcPAO21, 11)
+    evidence.define("proclcitoninDV", dvValue, dvProcalcitonin, "Procalcitonin: [VALUE] (Result Date: [RESULTDATETIME])", calcProcalcitonin1, 13)
+    evidence.define("serumBilirubinDV", dvValue, dvSerumBilirubin, "Serum Bilirubin: [VALUE] (Result Date: [RESULTDATETIME])", calcSerumBilirubin1, 14)
+    evidence.define("serumBunDV", dvValue, dvSerumBun, "Serum BUN: [VALUE] (Result Date: [RESULTDATETIME])", calcSerumBun1, 15)
+    evidence.define("serumCreatinineDV", dvValue, dvSerumCreatinine, "Serum Creatinine: [VALUE] (Result Date: [RESULTDATETIME])", calcSerumCreatinine1, 16)
+    evidence.define("serumLactateDV", dvValue, dvSerumLactate, "Serum Lactate: [VALUE] (Result Date: [RESULTDATETIME])", calcSerumLactate1, 17)
+    evidence.define("pocLactateDV", dvValue, dvPOCLactate, "Serum Lactate: [VALUE] (Result Date: [RESULTDATETIME])", calcPOCLactate1, 17)
     #Medication Links
-    antibioticMed = antiboticMedValue(dict(mainMedDic), "Antibiotic", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 2)
-    antibiotic2Med = antiboticMedValue(dict(mainMedDic), "Antibiotic2", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 3)
-    antibioticAbs = abstractValue("ANTIBIOTIC", "Antibiotic '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 4)
-    antibiotic2Abs = abstractValue("ANTIBIOTIC_2", "Antibiotic '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 5)
-    antifungalMed = medValue("Antifungal", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 6)
-    antifungalAbs = abstractValue("ANTIFUNGAL", "Antifungal '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 7)
-    antiviralMed = medValue("Antiviral", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 8)
-    antiviralAbs = abstractValue("ANTIVIRAL", "Antiviral '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 9)
+    evidence.define("antibioticMed", antiboticMedValue, mainMedDic, "Antibiotic", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 2)
+    evidence.define("antibiotic2Med", antiboticMedValue, mainMedDic, "Antibiotic2", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 3)
+    evidence.define("antibioticAbs", abstractValue, "ANTIBIOTIC", "Antibiotic '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 4)
+    evidence.define("antibiotic2Abs", abstractValue, "ANTIBIOTIC_2", "Antibiotic '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 5)
+    evidence.define("antifungalMed", medValue, "Antifungal", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 6)
+    evidence.define("antifungalAbs", abstractValue, "ANTIFUNGAL", "Antifungal '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 7)
+    evidence.define("antiviralMed", medValue, "Antiviral", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 8)
+    evidence.define("antiviralAbs", abstractValue, "ANTIVIRAL", "Antiviral '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 9)
     #Organ Dysfunction Only used for calculation
-    g9341Code = codeValue("G93.41", "Acute Metabolic Encephalopathy: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    acuteHeartFailure = multiCodeValue(["I50.21", "I50.31", "I50.41"], "Acute Heart Failure: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    acuteKidneyFailure = prefixCodeValue("^N17\.", "Acute Kidney Failure: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    acuteLiverFailure2 = multiCodeValue(["K72.00", "K72.01"], "Acute Liver Failure: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    acuteRespiratroyFailure = multiCodeValue(["J96.00", "J96.01", "J96.02"], "Acute Respiratory Failure: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    r4182Code = codeValue("R41.82", "Altered Level of Consciousness: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    alteredAbs = abstractValue("ALTERED_LEVEL_OF_CONSCIOUSNESS", "Altered Level Of Consciousness '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True)
-    p02fio2DV = dvValue(dvPa02Fi02, "PaO2/FIO2 Ratio: [VALUE] (Result Date: [RESULTDATETIME])", calcPa02Fi021)
-    lowBloodPressureAbs = abstractValue("LOW_BLOOD_PRESSURE", "Blood Pressure: [ABSTRACTVALUE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True)
-    lowPlateletCountDV = dvValue(dvPlateletCount, "Platelet Count: [VALUE] (Result Date: [RESULTDATETIME])", calcPlateletCount2)
-    i21aCode = codeValue("I21.A", "Acute MI Type 2: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
-    lowUrineOutputAbs = abstractValue("LOW_URINE_OUTPUT", "Urine Output '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 21)
+    evidence.define("g9341Code", codeValue, "G93.41", "Acute Metabolic Encephalopathy: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("acuteHeartFailure", multiCodeValue, ["I50.21", "I50.31", "I50.41"], "Acute Heart Failure: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("acuteKidneyFailure", prefixCodeValue, "^N17\.", "Acute Kidney Failure: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("acuteLiverFailure2", multiCodeValue, ["K72.00", "K72.01"], "Acute Liver Failure: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("acuteRespiratroyFailure", multiCodeValue, ["J96.00", "J96.01", "J96.02"], "Acute Respiratory Failure: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("r4182Code", codeValue, "R41.82", "Altered Level of Consciousness: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("alteredAbs", abstractValue, "ALTERED_LEVEL_OF_CONSCIOUSNESS", "Altered Level Of Consciousness '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True)
+    evidence.define("p02fio2DV", dvValue, dvPa02Fi02, "PaO2/FIO2 Ratio: [VALUE] (Result Date: [RESULTDATETIME])", calcPa02Fi021)
+    evidence.define("lowBloodPressureAbs", abstractValue, "LOW_BLOOD_PRESSURE", "Blood Pressure: [ABSTRACTVALUE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True)
+    evidence.define("lowPlateletCountDV", dvValue, dvPlateletCount, "Platelet Count: [VALUE] (Result Date: [RESULTDATETIME])", calcPlateletCount2)
+    evidence.define("i21aCode", codeValue, "I21.A", "Acute MI Type 2: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
+    evidence.define("lowUrineOutputAbs", abstractValue, "LOW_URINE_OUTPUT", "Urine Output '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 21)
     #Vitals
-    mapDV = dvValue(dvMAP, "Mean Arterial Blood Pressure: [VALUE] (Result Date: [RESULTDATETIME])", calcMAP1, 6)
-    mapAbs = abstractValue("LOW_MEAN_ARTERIAL_BLOOD_PRESSURE", "Mean Arterial Blood Pressure: [ABSTRACTVALUE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True)
-    sp02DV = dvValue(dvSPO2, "Sp02: [VALUE] (Result Date: [RESULTDATETIME])", calcSPO21, 5)
-    sbpDV = dvValue(dvSBP, "Systolic Blood Pressure: [VALUE] (Result Date: [RESULTDATETIME])", calcSBP1, 6)
-    sbpAbs = abstractValue("LOW_SYSTOLIC_BLOOD_PRESSURE", "Systolic Blood Pressure: [ABSTRACTVALUE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True)
+    evidence.define("mapDV", dvValue, dvMAP, "Mean Arterial Blood Pressure: [VALUE] (Result Date: [RESULTDATETIME])", calcMAP1, 6)
+    evidence.define("mapAbs", abstractValue, "LOW_MEAN_ARTERIAL_BLOOD_PRESSURE", "Mean Arterial Blood Pressure: [ABSTRACTVALUE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True)
+    evidence.define("sp02DV", dvValue, dvSPO2, "Sp02: [VALUE] (Result Date: [RESULTDATETIME])", calcSPO21, 5)
+    evidence.define("sbpDV", dvValue, dvSBP, "Systolic Blood Pressure: [VALUE] (Result Date: [RESULTDATETIME])", calcSBP1, 6)
+    evidence.define("sbpAbs", abstractValue, "LOW_SYSTOLIC_BLOOD_PRESSURE", "Systolic Blood Pressure: [ABSTRACTVALUE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True)
     #Conflicting
-    k5506Prefeix = prefixCodeValue("^K55\.06", "Acute Infarction of Intestine: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 1)
-    k5504Prefix = prefixCodeValue("^K55\.04", "Acute Infarction of Large Intestine: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 2)
-    k5502Prefix = prefixCodeValue("^K55\.02", "Acute Infarction of Small Intestine: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 3)
-    k85Prefix = prefixCodeValue("^K85\.", "Acute Pancreatitis: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 4)
-    aspirationAbs = abstractValue("ASPIRATION", "Aspiration: [ABSTRACTVALUE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 5)
-    j69Prefix = prefixCodeValue("^J69\.", "Aspiration Pneumonitis: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 6)
-    burnCodes = multiCodeValue(["T31.1", "T31.10", "T31.11", "T31.2", "T31.20", "T31.21", "T31.22", "T31.3", "T31.30", "T31.31", "T31.32",
+    evidence.define("k5506Prefeix", prefixCodeValue, "^K55\.06", "Acute Infarction of Intestine: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 1)
+    evidence.define("k5504Prefix", prefixCodeValue, "^K55\.04", "Acute Infarction of Large Intestine: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 2)
+    evidence.define("k5502Prefix", prefixCodeValue, "^K55\.02", "Acute Infarction of Small Intestine: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 3)
+    evidence.define("k85Prefix", prefixCodeValue, "^K85\.", "Acute Pancreatitis: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 4)
+    evidence.define("aspirationAbs", abstractValue, "ASPIRATION", "Aspiration: [ABSTRACTVALUE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 5)
+    evidence.define("j69Prefix", prefixCodeValue, "^J69\.", "Aspiration Pneumonitis: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 6)
+    evidence.define("burnCodes", multiCodeValue, ["T31.1", "T31.10", "T31.11", "T31.2", "T31.20", "T31.21", "T31.22", "T31.3", "T31.30", "T31.31", "T31.32",
         "T31.33", "T31.4", "T31.40", "T31.42", "T31.43", "T31.44", "T31.5", "T31.50", "T31.51", "T31.52", "T31.53", "T31.54", "T31.55", 
         "T31.6", "T31.60", "T31.61", "T31.62", "T31.63", "T31.64", "T31.65", "T31.66", "T31.7", "T31.71", "T31.72", "T31.73", "T31.74", 
         "T31.75", "T31.76", "T31.77", "T31.8", "T31.81", "T31.82", "T31.83", "T31.84", "T31.85", "T31.86", "T31.87", "T31.88", "T31.9", 
@@ -798,50 +522,50 @@ if validated is False:
         "T32.66", "T32.7", "T32.70", "T32.71", "T32.72", "T32.73", "T32.74", "T32.75", "T32.76", "T32.77", "T32.8", "T32.81", "T32.82", 
         "T32.83", "T32.84", "T32.85", "T32.86", "T32.87", "T32.88", "T32.9", "T32.91", "T32.92", "T32.93", "T32.94", "T32.95", "T32.96", 
         "T32.97", "T32.98", "T32.99"], "Burns: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 4)
-    malignantNeoplasmAbs = abstractValue("MALIGNANT_NEOPLASM", "Malignant Neoplasms: [ABSTRACTVALUE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 8)
-    t07Prefix = prefixCodeValue("^T07\.", "Multiple Injuries: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 9)
-    e883Code = codeValue("E88.3", "Tumor lysis Syndrome: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 10)
+    evidence.define("malignantNeoplasmAbs", abstractValue, "MALIGNANT_NEOPLASM", "Malignant Neoplasms: [ABSTRACTVALUE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 8)
+    evidence.define("t07Prefix", prefixCodeValue, "^T07\.", "Multiple Injuries: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 9)
+    evidence.define("e883Code", codeValue, "E88.3", "Tumor lysis Syndrome: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 10)
     
     #Other Inflammatory Response Criteria
-    if proclcitoninDV is not None: OIR += 1
-    if mapDV is not None or mapAbs is not None: OIR += 1
-    if sbpDV is not None or sbpAbs is not None: OIR += 1
-    if highCReactiveProteinDV is not None:  OIR += 1
+    if evidence.proclcitoninDV is not None: OIR += 1
+    if evidence.mapDV is not None or evidence.mapAbs is not None: OIR += 1
+    if evidence.sbpDV is not None or evidence.sbpAbs is not None: OIR += 1
+    if evidence.highCReactiveProteinDV is not None:  OIR += 1
 
     #Minor counts
-    if diabetesE10Check is None and diabetesE11Check is None and steroidsAbs is None:
+    if evidence.diabetesE10Check is None and evidence.diabetesE11Check is None and evidence.steroidsAbs is None:
         if highBloodGlucoseDV is not None: labs.Links.Add(highBloodGlucoseDV); minorCount += 1
-    if cloudyUrineAbs is not None: minorCount += 1; abs.Links.Add(cloudyUrineAbs)
-    if r1110Code is not None or vomitingAbs is not None: 
+    if evidence.cloudyUrineAbs is not None: minorCount += 1; abs.Links.Add(evidence.cloudyUrineAbs)
+    if evidence.r1110Code is not None or evidence.vomitingAbs is not None: 
         minorCount += 1; 
-        if r1110Code is not None: abs.Links.Add(r1110Code)
-        if vomitingAbs is not None: abs.Links.Add(vomitingAbs)
-    if r1112Code is not None: minorCount += 1; abs.Links.Add(r1112Code)
-    if r1113Code is not None: minorCount += 1; abs.Links.Add(r1113Code)
-    if r1114Code is not None: minorCount += 1; abs.Links.Add(r1114Code)
-    if highCReactiveProteinDV is not None: minorCount += 1; labs.Links.Add(highCReactiveProteinDV)
-    if purulentDrainageAbs is not None: minorCount += 1; abs.Links.Add(purulentDrainageAbs)
-    if foulSmellingDischargeAbs is not None: minorCount += 1; abs.Links.Add(foulSmellingDischargeAbs)
-    if liverCirrhosisCheck is None and abdominalDistentionAbs is not None: minorCount += 1; abs.Links.Add(abdominalDistentionAbs)
-    if inflammationAbs is not None: minorCount += 1; abs.Links.Add(inflammationAbs)
-    if swollenLymphNodesAbs is not None: minorCount += 1; abs.Links.Add(swollenLymphNodesAbs)
-    if r6883Code is not None: minorCount += 1; abs.Links.Add(r6883Code)
-    if stiffNeckAbs is not None: minorCount += 1; abs.Links.Add(stiffNeckAbs)
-    if photophobiaAbs is not None: minorCount += 1; abs.Links.Add(photophobiaAbs)
-    if soreThroatAbs is not None: minorCount += 1; abs.Links.Add(soreThroatAbs)
-    if urinaryPainAbs is not None: minorCount += 1; abs.Links.Add(urinaryPainAbs)
-    if diaphoreticAbs is not None and hyperhidrosisCode is None: minorCount += 1; abs.Links.Add(diaphoreticAbs)
-    if abnormalSputumAbs is not None: minorCount += 1; abs.Links.Add(abnormalSputumAbs)
-    if m7910Code is not None: minorCount += 1; abs.Links.Add(m7910Code)
-    if diarrheaAbs is not None: minorCount += 1; abs.Links.Add(diarrheaAbs)
-    if abdominalPainAbs is not None: minorCount += 1; abs.Links.Add(abdominalPainAbs)
-    if pelvicPainAbs is not None: minorCount += 1; abs.Links.Add(pelvicPainAbs)
-    if r8281Code is not None: minorCount += 1; abs.Links.Add(r8281Code)
-    if r60Codes is not None: minorCount += 1; abs.Links.Add(r60Codes)
-    if g934Codes is not None: minorCount += 1; abs.Links.Add(g934Codes)
-    if proclcitoninDV is not None: minorCount += 1
-    if PulmonaryDCode is None and r05Codes is not None: minorCount += 1; abs.Links.Add(r05Codes)
-    if r410Code is not None: minorCount += 1; abs.Links.Add(r410Code)
+        if evidence.r1110Code is not None: abs.Links.Add(evidence.r1110Code)
+        if evidence.vomitingAbs is not None: abs.Links.Add(evidence.vomitingAbs)
+    if evidence.r1112Code is not None: minorCount += 1; abs.Links.Add(evidence.r1112Code)
+    if evidence.r1113Code is not None: minorCount += 1; abs.Links.Add(evidence.r1113Code)
+    if evidence.r1114Code is not None: minorCount += 1; abs.Links.Add(evidence.r1114Code)
+    if evidence.highCReactiveProteinDV is not None: minorCount += 1; labs.Links.Add(evidence.highCReactiveProteinDV)
+    if evidence.purulentDrainageAbs is not None: minorCount += 1; abs.Links.Add(evidence.purulentDrainageAbs)
+    if evidence.foulSmellingDischargeAbs is not None: minorCount += 1; abs.Links.Add(evidence.foulSmellingDischargeAbs)
+    if evidence.liverCirrhosisCheck is None and evidence.abdominalDistentionAbs is not None: minorCount += 1; abs.Links.Add(evidence.abdominalDistentionAbs)
+    if evidence.inflammationAbs is not None: minorCount += 1; abs.Links.Add(evidence.inflammationAbs)
+    if evidence.swollenLymphNodesAbs is not None: minorCount += 1; abs.Links.Add(evidence.swollenLymphNodesAbs)
+    if evidence.r6883Code is not None: minorCount += 1; abs.Links.Add(evidence.r6883Code)
+    if evidence.stiffNeckAbs is not None: minorCount += 1; abs.Links.Add(evidence.stiffNeckAbs)
+    if evidence.photophobiaAbs is not None: minorCount += 1; abs.Links.Add(evidence.photophobiaAbs)
+    if evidence.soreThroatAbs is not None: minorCount += 1; abs.Links.Add(evidence.soreThroatAbs)
+    if evidence.urinaryPainAbs is not None: minorCount += 1; abs.Links.Add(evidence.urinaryPainAbs)
+    if evidence.diaphoreticAbs is not None and evidence.hyperhidrosisCode is None: minorCount += 1; abs.Links.Add(evidence.diaphoreticAbs)
+    if evidence.abnormalSputumAbs is not None: minorCount += 1; abs.Links.Add(evidence.abnormalSputumAbs)
+    if evidence.m7910Code is not None: minorCount += 1; abs.Links.Add(evidence.m7910Code)
+    if evidence.diarrheaAbs is not None: minorCount += 1; abs.Links.Add(evidence.diarrheaAbs)
+    if evidence.abdominalPainAbs is not None: minorCount += 1; abs.Links.Add(evidence.abdominalPainAbs)
+    if evidence.pelvicPainAbs is not None: minorCount += 1; abs.Links.Add(evidence.pelvicPainAbs)
+    if evidence.r8281Code is not None: minorCount += 1; abs.Links.Add(evidence.r8281Code)
+    if evidence.r60Codes is not None: minorCount += 1; abs.Links.Add(evidence.r60Codes)
+    if evidence.g934Codes is not None: minorCount += 1; abs.Links.Add(evidence.g934Codes)
+    if evidence.proclcitoninDV is not None: minorCount += 1
+    if evidence.PulmonaryDCode is None and r05Codes is not None: minorCount += 1; abs.Links.Add(r05Codes)
+    if evidence.r410Code is not None: minorCount += 1; abs.Links.Add(evidence.r410Code)
 
     #SIRS Qualification and algorithm
     respiratoryCheck = False
@@ -851,8 +575,8 @@ if validated is False:
     SirsCheck = False
     if minorCount >= 3:
         countPassed = True
-    db.LogEvaluationScriptMessage("Major infectionCheck " + str(infectionCheck) + " " + str(account._id), scriptName, scriptInstance, "Debug")
-    db.LogEvaluationScriptMessage("Minor Count" + str(minorCount) + " " + str(account._id), scriptName, scriptInstance, "Debug")
+    scriptLog.debug("Major infectionCheck %s %s", infectionCheck, account._id)
+    scriptLog.debug("Minor Count%s %s", minorCount, account._id)
         
     #SIRS Specific Variables
     tempDict = {}
@@ -921,10 +645,10 @@ if validated is False:
     
     if resp > 0:
         if (
-            negationsRespiratoryCheck is None and
-            psychogenicHyperventilationAbs is None and
-            acuteHeartFailureCheck is None and
-            pulmonaryEmbolismCheck is None
+            evidence.negationsRespiratoryCheck is None and
+            evidence.psychogenicHyperventilationAbs is None and
+            evidence.acuteHeartFailureCheck is None and
+            evidence.pulmonaryEmbolismCheck is None
         ):
             sirsCriteriaCounter += 1
             respiratoryCheck = True
@@ -940,9 +664,9 @@ if validated is False:
 
     if heart > 0:
         if (
-            negationsHeartRateCheck is None and
-            acuteHeartFailureCheck is None and
-            pulmonaryEmbolismCheck is None
+            evidence.negationsHeartRateCheck is None and
+            evidence.acuteHeartFailureCheck is None and
+            evidence.pulmonaryEmbolismCheck is None
         ):
             sirsCriteriaCounter += 1
             heartRateCheck = True
@@ -955,10 +679,10 @@ if validated is False:
 
     if temp > 0:
         sirsResult = cleanNumbers(str(tempDict[temp]['Result']))
-        if FeverCheck is None and float(sirsResult) > float(calcTemp1):
+        if evidence.FeverCheck is None and float(sirsResult) > float(calcTemp1):
             tempCheck = True
             sirsCriteriaCounter += 1
-        if hypothermiaCheck is None and float(sirsResult) < float(calcTemp2):
+        if evidence.hypothermiaCheck is None and float(sirsResult) < float(calcTemp2):
             tempCheck = True
             sirsCriteriaCounter += 1
         sirsLacking += 1
@@ -968,13 +692,13 @@ if validated is False:
     else:
         noTemp = MatchedCriteriaLink("The system did not find any Temperature values that match the specified SIRs Criteria range set.", None, None, None)
 
-    if longTermImmunomodulatorsImunosuppCode is None and leukemiaCheck is None:
+    if evidence.longTermImmunomodulatorsImunosuppCode is None and evidence.leukemiaCheck is None:
         if wbc > 0:
             sirsResult = cleanNumbers(str(wbcDict[wbc]['Result']))
-            if goutFlareAbs is None and float(sirsResult) > float(calcwbc1):
+            if evidence.goutFlareAbs is None and float(sirsResult) > float(calcwbc1):
                 wbcCheck = True
                 sirsCriteriaCounter += 1
-            if lowHemoglobinDV is None and d469Code is None and a3e04305Code is None and currentChemotherapyAbs is None and float(sirsResult) < float(calcwbc2):
+            if lowHemoglobinDV is None and evidence.d469Code is None and evidence.a3e04305Code is None and evidence.currentChemotherapyAbs is None and float(sirsResult) < float(calcwbc2):
                 wbcCheck = True
                 sirsCriteriaCounter += 1
             sirsLacking += 1
@@ -986,7 +710,7 @@ if validated is False:
             dataConversion(serumBandDict[serumBand].ResultDate, serumBandLinkText, serumBandDict[serumBand].Result, serumBandDict[serumBand].UniqueId or serumBandDict[serumBand]._id, sirsWBC, 1)
         else:
             noWBC = MatchedCriteriaLink("The system did not find any WBC values that match the specified SIRs Criteria range set.", None, None, None)
-    elif longTermImmunomodulatorsImunosuppCode is not None or leukemiaCheck is not None:
+    elif evidence.longTermImmunomodulatorsImunosuppCode is not None or evidence.leukemiaCheck is not None:
         if wbc > 0:
             sirsLacking += 1
             dataConversion(wbcDict[wbc].ResultDate, wbcLinkText, wbcDict[wbc].Result, wbcDict[wbc].UniqueId or wbcDict[wbc]._id, sirsWBC, 1, True)
@@ -998,26 +722,26 @@ if validated is False:
     
     #Sirs Lacking Check
     sirsLacking2 = 0
-    respRateDV = dvValue(dvRespiratoryRate, "Respiratory Rate: [VALUE] (Result Date: [RESULTDATETIME])", calcRespRate2, 0)
-    heartRateDV = dvValue(dvHeartRate, "Heart Rate: [VALUE] (Result Date: [RESULTDATETIME])", calcHeartRa2, 0)
-    highWBCDV = dvValue(dvWBC, "WBC: [VALUE] (Result Date: [RESULTDATETIME])", calcwbc3, 0)
-    lowWBCDV = dvValue(dvWBC, "WBC: [VALUE] (Result Date: [RESULTDATETIME])", calcwbc4, 0)
-    serumBandDV = dvValue(dvSerumBand, "Serum Band: [VALUE] (Result Date: [RESULTDATETIME])", calcSerumB2, 0)
-    highTempDV = dvValue(dvTemperature, "Temperature: [VALUE] (Result Date: [RESULTDATETIME])", calcTemp3, 0)
-    lowTempDV = dvValue(dvTemperature, "Temperature: [VALUE] (Result Date: [RESULTDATETIME])", calcTemp4, 0)
+    evidence.define("respRateDV", dvValue, dvRespiratoryRate, "Respiratory Rate: [VALUE] (Result Date: [RESULTDATETIME])", calcRespRate2, 0)
+    evidence.define("heartRateDV", dvValue, dvHeartRate, "Heart Rate: [VALUE] (Result Date: [RESULTDATETIME])", calcHeartRa2, 0)
+    evidence.define("highWBCDV", dvValue, dvWBC, "WBC: [VALUE] (Result Date: [RESULTDATETIME])", calcwbc3, 0)
+    evidence.define("lowWBCDV", dvValue, dvWBC, "WBC: [VALUE] (Result Date: [RESULTDATETIME])", calcwbc4, 0)
+    evidence.define("serumBandDV", dvValue, dvSerumBand, "Serum Band: [VALUE] (Result Date: [RESULTDATETIME])", calcSerumB2, 0)
+    evidence.define("highTempDV", dvValue, dvTemperature, "Temperature: [VALUE] (Result Date: [RESULTDATETIME])", calcTemp3, 0)
+    evidence.define("lowTempDV", dvValue, dvTemperature, "Temperature: [VALUE] (Result Date: [RESULTDATETIME])", calcTemp4, 0)
 
-    if respRateDV is not None:
+    if evidence.respRateDV is not None:
         sirsLacking2 += 1
-    if heartRateDV is not None:
+    if evidence.heartRateDV is not None:
         sirsLacking2 += 1
-    if highWBCDV is not None or lowWBCDV is not None or serumBandDV is not None:
+    if evidence.highWBCDV is not None or evidence.lowWBCDV is not None or evidence.serumBandDV is not None:
         sirsLacking2 += 1
-    if highTempDV is not None or lowTempDV is not None:
+    if evidence.highTempDV is not None or evidence.lowTempDV is not None:
         sirsLacking2 += 1
         
     #Sirs Lookup Call
     if sirsX > 0:
-        sirsLookup(dict(mainSIRSDVDic), dict(sirsLookupDict))
+        sirsLookup(mainSIRSDVDic, sirsLookupDict)
 
     #Sirs Disqualification Check
     if sirsCriteriaCounter == 2 and respiratoryCheck and heartRateCheck:
@@ -1025,79 +749,78 @@ if validated is False:
 
     #Infection Check
     if (
-        aspergillosisCode is not None or
-        bacterialInfectionCode is not None or
-        blastomycosisCode is not None or
-        chromomycosisPheomycoticAbscessCode is not None or
-        cryptococcosisCode is not None or
-        cytomegaloviralCode is not None or
-        infectionAbs is not None or
-        mycosisCode is not None or
-        otherBacterialAgentsCode is not None or
-        paracoccidioidomycosisCode is not None or
-        sporotrichosisCode is not None or
-        streptococcusStaphylococcusEnterococcusCode is not None or
-        zygomycosisCode is not None or
-        bacteremiaCode is not None or
-        mycosisCode is not None or
-        positiveCerebrospinalFluidCultureCode is not None or
-        positiveRespiratoryCultureCode is not None or
-        positiveUrineAnalysisCode is not None or
-        positiveUrineCultureCode is not None or
-        postiveWoundCultureAbs is not None or
-        bacteriaUrinedv is not None or
-        bacteriuriaCode is not None or
-        cBloodDV is not None or 
-        urineCultureDV is not None
+        evidence.aspergillosisCode is not None or
+        evidence.bacterialInfectionCode is not None or
+        evidence.blastomycosisCode is not None or
+        evidence.chromomycosisPheomycoticAbscessCode is not None or
+        evidence.cryptococcosisCode is not None or
+        evidence.cytomegaloviralCode is not None or
+        evidence.infectionAbs is not None or
+        evidence.mycosisCode is not None or
+        evidence.otherBacterialAgentsCode is not None or
+        evidence.paracoccidioidomycosisCode is not None or
+        evidence.sporotrichosisCode is not None or
+        evidence.streptococcusStaphylococcusEnterococcusCode is not None or
+        evidence.zygomycosisCode is not None or
+        evidence.bacteremiaCode is not None or
+        evidence.mycosisCode is not None or
+        evidence.positiveCerebrospinalFluidCultureCode is not None or
+        evidence.positiveRespiratoryCultureCode is not None or
+        evidence.positiveUrineAnalysisCode is not None or
+        evidence.positiveUrineCultureCode is not None or
+        evidence.postiveWoundCultureAbs is not None or
+        evidence.bacteriaUrinedv is not None or
+        evidence.bacteriuriaCode is not None or
+        evidence.cBloodDV is not None or 
+        evidence.urineCultureDV is not None
     ):
         infectionCheck = True
         
     #Organ Dysfunction Count
     if (
-        ((g9341Code is not None or glasgowComaScoreDV is not None) and alcoholAndOpioidAbuseCheck is None) or
-        (r4182Code is not None or alteredAbs is not None ) or
-        r410Code is not None
+        ((evidence.g9341Code is not None or evidence.glasgowComaScoreDV is not None) and evidence.alcoholAndOpioidAbuseCheck is None) or
+        (evidence.r4182Code is not None or evidence.alteredAbs is not None ) or
+        evidence.r410Code is not None
     ):
         ODC += 1
         
     if (
-        lowBloodPressureAbs is not None or
-        pa02DV is not None or
-        sbpDV is not None
+        evidence.lowBloodPressureAbs is not None or
+        evidence.pa02DV is not None or
+        evidence.sbpDV is not None
     ):
         ODC += 1
         
     if (
-        p02fio2DV is not None or
-        acuteRespiratroyFailure is not None or
-        sp02DV is not None or
-        pa02DV is not None
+        evidence.p02fio2DV is not None or
+        evidence.acuteRespiratroyFailure is not None or
+        evidence.sp02DV is not None or
+        evidence.pa02DV is not None
     ):
         ODC += 1 
         
     if (
-        (serumCreatinineDV is not None and chronicKidneyFailureCheck is None) or 
-        lowUrineOutputAbs is not None or
-        acuteKidneyFailure is not None
+        (evidence.serumCreatinineDV is not None and evidence.chronicKidneyFailureCheck is None) or 
+        evidence.lowUrineOutputAbs is not None or
+        evidence.acuteKidneyFailure is not None
     ):
         ODC += 1
         
-    if (serumBilirubinDV is not None and liverCirrhosisCheck is None) or acuteLiverFailure2 is not None: ODC += 1
-    if acuteHeartFailure is not None: ODC += 1
-    if lowPlateletCountDV is not None: ODC += 1
-    if i21aCode is not None: ODC += 1
-    if serumLactateDV is not None or pocLactateDV is not None: ODC += 1
+    if (evidence.serumBilirubinDV is not None and evidence.liverCirrhosisCheck is None) or evidence.acuteLiverFailure2 is not None: ODC += 1
+    if evidence.acuteHeartFailure is not None: ODC += 1
+    if evidence.lowPlateletCountDV is not None: ODC += 1
+    if evidence.i21aCode is not None: ODC += 1
+    if evidence.serumLactateDV is not None or evidence.pocLactateDV is not None: ODC += 1
     
-    db.LogEvaluationScriptMessage("SIRS Count " + str(sirsCriteriaCounter) + ", Sirs Lacking Count: " + str(sirsLacking) + ", Secondard Sirs Lacking Count: " + 
-        str(sirsLacking2) + ", Sirs Disqualification Check: " + str(SirsCheck) + ", infection check: " + str(infectionCheck) +
-        ", ODC Count: " + str(ODC) + " " + str(account._id), scriptName, scriptInstance, "Debug")
+    scriptLog.debug("SIRS Count %s, Sirs Lacking Count: %s, Secondard Sirs Lacking Count: %s, Sirs Disqualification Check: %s, infection check: %s, ODC Count: %s %s",
+        sirsCriteriaCounter, sirsLacking, sirsLacking2, SirsCheck, infectionCheck, ODC, account._id)
     
     #SME-1528
     sirsLackingCheck = False
     
     #Main alert Algorithm
     if (
-        (codesExist > 0 or a419Code is not None) and
+        (codesExist > 0 or evidence.a419Code is not None) and
         ((infectionCheck and message2) or 
         (message1 and (sirsLacking > 1 or sirsLacking2 > 1))) and
         subtitle == "Sepsis Dx Documented Possibly Lacking Clinical Evidence"
@@ -1105,26 +828,26 @@ if validated is False:
         if message1: dc.Links.Add(MatchedCriteriaLink("Possible SIRS Criteria Not Met Please Review", None, None, None, False))
         if message2: 
             infection.Links.Add(MatchedCriteriaLink("Possible Infection Not Documented Please Review", None, None, None, False))
-            if bacterialInfectionCode is not None: updateLinkText(bacterialInfectionCode, autoEvidenceText); infection.Links.Add(bacterialInfectionCode)
-            if cytomegaloviralCode is not None: updateLinkText(cytomegaloviralCode, autoEvidenceText); infection.Links.Add(cytomegaloviralCode)
-            if blastomycosisCode is not None: updateLinkText(blastomycosisCode, autoEvidenceText); infection.Links.Add(blastomycosisCode)
-            if paracoccidioidomycosisCode is not None: updateLinkText(paracoccidioidomycosisCode, autoEvidenceText); infection.Links.Add(paracoccidioidomycosisCode)
-            if sporotrichosisCode is not None: updateLinkText(sporotrichosisCode, autoEvidenceText); infection.Links.Add(sporotrichosisCode)
-            if chromomycosisPheomycoticAbscessCode is not None: updateLinkText(chromomycosisPheomycoticAbscessCode, autoEvidenceText); infection.Links.Add(chromomycosisPheomycoticAbscessCode)
-            if aspergillosisCode is not None: updateLinkText(aspergillosisCode, autoEvidenceText); infection.Links.Add(aspergillosisCode)
-            if cryptococcosisCode is not None: updateLinkText(cryptococcosisCode, autoEvidenceText); infection.Links.Add(cryptococcosisCode)
-            if zygomycosisCode is not None: updateLinkText(zygomycosisCode, autoEvidenceText); infection.Links.Add(zygomycosisCode)
-            if mycosisCode is not None: updateLinkText(mycosisCode, autoEvidenceText); infection.Links.Add(mycosisCode)
-            if streptococcusStaphylococcusEnterococcusCode is not None: updateLinkText(streptococcusStaphylococcusEnterococcusCode, autoEvidenceText); infection.Links.Add(streptococcusStaphylococcusEnterococcusCode)
-            if otherBacterialAgentsCode is not None: updateLinkText(otherBacterialAgentsCode, autoEvidenceText); infection.Links.Add(otherBacterialAgentsCode)
-            if infectionAbs is not None: updateLinkText(infectionAbs, autoEvidenceText); infection.Links.Add(infectionAbs)
+            if evidence.bacterialInfectionCode is not None: updateLinkText(evidence.bacterialInfectionCode, autoEvidenceText); infection.Links.Add(evidence.bacterialInfectionCode)
+            if evidence.cytomegaloviralCode is not None: updateLinkText(evidence.cytomegaloviralCode, autoEvidenceText); infection.Links.Add(evidence.cytomegaloviralCode)
+            if evidence.blastomycosisCode is not None: updateLinkText(evidence.blastomycosisCode, autoEvidenceText); infection.Links.Add(evidence.blastomycosisCode)
+            if evidence.paracoccidioidomycosisCode is not None: updateLinkText(evidence.paracoccidioidomycosisCode, autoEvidenceText); infection.Links.Add(evidence.paracoccidioidomycosisCode)
+            if evidence.sporotrichosisCode is not None: updateLinkText(evidence.sporotrichosisCode, autoEvidenceText); infection.Links.Add(evidence.sporotrichosisCode)
+            if evidence.chromomycosisPheomycoticAbscessCode is not None: updateLinkText(evidence.chromomycosisPheomycoticAbscessCode, autoEvidenceText); infection.Links.Add(evidence.chromomycosisPheomycoticAbscessCode)
+            if evidence.aspergillosisCode is not None: updateLinkText(evidence.aspergillosisCode, autoEvidenceText); infection.Links.Add(evidence.aspergillosisCode)
+            if evidence.cryptococcosisCode is not None: updateLinkText(evidence.cryptococcosisCode, autoEvidenceText); infection.Links.Add(evidence.cryptococcosisCode)
+            if evidence.zygomycosisCode is not None: updateLinkText(evidence.zygomycosisCode, autoEvidenceText); infection.Links.Add(evidence.zygomycosisCode)
+            if evidence.mycosisCode is not None: updateLinkText(evidence.mycosisCode, autoEvidenceText); infection.Links.Add(evidence.mycosisCode)
+            if evidence.streptococcusStaphylococcusEnterococcusCode is not None: updateLinkText(evidence.streptococcusStaphylococcusEnterococcusCode, autoEvidenceText); infection.Links.Add(evidence.streptococcusStaphylococcusEnterococcusCode)
+            if evidence.otherBacterialAgentsCode is not None: updateLinkText(evidence.otherBacterialAgentsCode, autoEvidenceText); infection.Links.Add(evidence.otherBacterialAgentsCode)
+            if evidence.infectionAbs is not None: updateLinkText(evidence.infectionAbs, autoEvidenceText); infection.Links.Add(evidence.infectionAbs)
         result.Outcome = "AUTORESOLVED"
         result.Reason = "Autoresolved due to New Evidence that Supports the Sepsis Dx"
         result.Validated = True
         AlertConditions = True
 
     elif (
-        (codesExist > 0 or a419Code is not None) and
+        (codesExist > 0 or evidence.a419Code is not None) and
         (infectionCheck is False or 
         (sirsLacking == 1 and OIR == 0) or
         (sirsLacking == 0 and OIR > 0) or 
@@ -1132,37 +855,37 @@ if validated is False:
         sirsLacking2 < 2
     ):
         if sirsLacking == 0:
-            if respRateDV is not None:
-                sirsResp.Links.Add(respRateDV)
-                sirsLookupLacking(dict(maindiscreteDic), respRateDV.DiscreteValueId)
+            if evidence.respRateDV is not None:
+                sirsResp.Links.Add(evidence.respRateDV)
+                sirsLookupLacking(maindiscreteDic, evidence.respRateDV.DiscreteValueId)
             else:
                 sirsResp.Links.Add(noResp)
-            if heartRateDV is not None:
-                sirsHeart.Links.Add(heartRateDV)
-                sirsLookupLacking(dict(maindiscreteDic), heartRateDV.DiscreteValueId)
+            if evidence.heartRateDV is not None:
+                sirsHeart.Links.Add(evidence.heartRateDV)
+                sirsLookupLacking(maindiscreteDic, evidence.heartRateDV.DiscreteValueId)
             else:
                 sirsHeart.Links.Add(noHeart)
-            if highWBCDV is not None or lowWBCDV is not None or serumBandDV is not None:    
-                if highWBCDV is not None:
-                    sirsWBC.Links.Add(highWBCDV)
-                    sirsLookupLacking(dict(maindiscreteDic), highWBCDV.DiscreteValueId)
-                if lowWBCDV is not None:
-                    sirsWBC.Links.Add(lowWBCDV)
-                    sirsLookupLacking(dict(maindiscreteDic), lowWBCDV.DiscreteValueId)
+            if evidence.highWBCDV is not None or evidence.lowWBCDV is not None or evidence.serumBandDV is not None:    
+                if evidence.highWBCDV is not None:
+                    sirsWBC.Links.Add(evidence.highWBCDV)
+                    sirsLookupLacking(maindiscreteDic, evidence.highWBCDV.DiscreteValueId)
+                if evidence.lowWBCDV is not None:
+                    sirsWBC.Links.Add(evidence.lowWBCDV)
+                    sirsLookupLacking(maindiscreteDic, evidence.lowWBCDV.DiscreteValueId)
                     
-                if serumBandDV is not None:
-                    sirsWBC.Links.Add(serumBandDV)
-                    sirsLookupLacking(dict(maindiscreteDic), serumBandDV.DiscreteValueId)
+                if evidence.serumBandDV is not None:
+                    sirsWBC.Links.Add(evidence.serumBandDV)
+                    sirsLookupLacking(maindiscreteDic, evidence.serumBandDV.DiscreteValueId)
             else:
                 sirsWBC.Links.Add(noWBC)
-            if highTempDV is not None or lowTempDV is not None:
-                if highTempDV is not None:
-                    sirsTemp.Links.Add(highTempDV)
-                    sirsLookupLacking(dict(maindiscreteDic), highTempDV.DiscreteValueId)
+            if evidence.highTempDV is not None or evidence.lowTempDV is not None:
+                if evidence.highTempDV is not None:
+                    sirsTemp.Links.Add(evidence.highTempDV)
+                    sirsLookupLacking(maindiscreteDic, evidence.highTempDV.DiscreteValueId)
                     
-                if lowTempDV is not None:
-                    sirsTemp.Links.Add(lowTempDV)
-                    sirsLookupLacking(dict(maindiscreteDic), lowTempDV.DiscreteValueId)
+                if evidence.lowTempDV is not None:
+                    sirsTemp.Links.Add(evidence.lowTempDV)
+                    sirsLookupLacking(maindiscreteDic, evidence.lowTempDV.DiscreteValueId)
             else: 
                 sirsTemp.Links.Add(noTemp)
         else:
@@ -1177,14 +900,14 @@ if validated is False:
             if tempCode is not None:
                 dc.Links.Add(tempCode)
                 break
-        if a419Code is not None: dc.Links.Add(a419Code)
+        if evidence.a419Code is not None: dc.Links.Add(evidence.a419Code)
         if sirsLacking < 2 or (sirsLacking2 < 2 and sirsLacking == 0): dc.Links.Add(MatchedCriteriaLink(LinkText1, None, None, None))
-        if infectionAbs is None: infection.Links.Add(MatchedCriteriaLink(LinkText2, None, None, None))
+        if evidence.infectionAbs is None: infection.Links.Add(MatchedCriteriaLink(LinkText2, None, None, None))
         result.Subtitle = "Sepsis Dx Documented Possibly Lacking Clinical Evidence"
         AlertConditions = True
     
     elif codesExist == 1:
-        db.LogEvaluationScriptMessage("One specific code was on the chart, alert failed. " + str(account._id), scriptName, scriptInstance, "Debug")
+        scriptLog.debug("One specific code was on the chart, alert failed. %s", account._id)
         if alertTriggered:
             for code in codeList:
                 desc = codeDic[code]
@@ -1198,7 +921,7 @@ if validated is False:
             AlertConditions = True
         else: result.Passed = False
         
-    elif subtitle == "Possible Sepsis Dx" and (a419Code is not None or codesExist > 0):
+    elif subtitle == "Possible Sepsis Dx" and (evidence.a419Code is not None or codesExist > 0):
         if codesExist > 0:
             for code in codeList:
                 desc = codeDic[code]
@@ -1206,14 +929,14 @@ if validated is False:
                 if tempCode is not None:
                     dc.Links.Add(tempCode)
                     break
-        if a419Code is not None: dc.Links.Add(a419Code)
+        if evidence.a419Code is not None: dc.Links.Add(evidence.a419Code)
         result.Outcome = "AUTORESOLVED"
         result.Reason = "Autoresolved due to one Specified Code on the Account"
         result.Validated = True
         AlertConditions = True
         
     elif (
-        a419Code is None and codesExist == 0 and
+        evidence.a419Code is None and codesExist == 0 and
         codesExist == 0 and
         (sirsCriteriaCounter >= 3 or
         (sirsCriteriaCounter == 2 and SirsCheck is False)) and
@@ -1223,7 +946,7 @@ if validated is False:
         AlertPassed = True
     
     elif (
-        a419Code is None and
+        evidence.a419Code is None and
         codesExist == 0 and
         infectionCheck is False and
         countPassed and
@@ -1236,11 +959,11 @@ if validated is False:
     elif (
         (subtitle == "Possible Non-Infectious SIRS without Organ Dysfunction" or
         subtitle == "Possible Non-Infectious SIRS with Organ Dysfunction") and
-        (a419Code is not None or codesExist >= 1 or r6510Code is not None or r6511Code is not None)
+        (evidence.a419Code is not None or codesExist >= 1 or evidence.r6510Code is not None or evidence.r6511Code is not None)
     ):
-        if r6510Code is not None: updateLinkText(r6510Code, autoCodeText); dc.Links.Add(r6510Code)
-        if r6511Code is not None: updateLinkText(r6511Code, autoCodeText); dc.Links.Add(r6511Code)
-        if a419Code is not None: updateLinkText(a419Code, autoCodeText); dc.Links.Add(a419Code)
+        if evidence.r6510Code is not None: updateLinkText(evidence.r6510Code, autoCodeText); dc.Links.Add(evidence.r6510Code)
+        if evidence.r6511Code is not None: updateLinkText(evidence.r6511Code, autoCodeText); dc.Links.Add(evidence.r6511Code)
+        if evidence.a419Code is not None: updateLinkText(evidence.a419Code, autoCodeText); dc.Links.Add(evidence.a419Code)
         if codesExist >= 1:
             for code in codeList:
                 desc = codeDic[code]
@@ -1257,31 +980,31 @@ if validated is False:
         codesExist == 0 and
         (sirsCriteriaCounter >= 3 or
         (sirsCriteriaCounter == 2 and SirsCheck is False))  and
-        a419Code is None and
+        evidence.a419Code is None and
         infectionCheck == False and
         ODC == 0 and
-        cBloodDV is None and
-        urineCultureDV is None and
-        antibioticMed is None and
-        antibiotic2Med is None and
-        antibioticAbs is None and
-        antibiotic2Abs is None and 
-        antifungalMed is None and
-        antifungalAbs is None and
-        antiviralMed is None and
-        antiviralAbs is None and
-        (k5506Prefeix is not None or
-        k5504Prefix is not None or
-        k5502Prefix is not None or
-        k85Prefix is not None or
-        aspirationAbs is not None or
-        burnCodes is not None or 
-        j69Prefix is not None or
-        malignantNeoplasmAbs is not None or
-        t07Prefix is not None or
-        e883Code is not None) and
-        r6510Code is None and
-        r6511Code is None
+        evidence.cBloodDV is None and
+        evidence.urineCultureDV is None and
+        evidence.antibioticMed is None and
+        evidence.antibiotic2Med is None and
+        evidence.antibioticAbs is None and
+        evidence.antibiotic2Abs is None and 
+        evidence.antifungalMed is None and
+        evidence.antifungalAbs is None and
+        evidence.antiviralMed is None and
+        evidence.antiviralAbs is None and
+        (evidence.k5506Prefeix is not None or
+        evidence.k5504Prefix is not None or
+        evidence.k5502Prefix is not None or
+        evidence.k85Prefix is not None or
+        evidence.aspirationAbs is not None or
+        evidence.burnCodes is not None or 
+        evidence.j69Prefix is not None or
+        evidence.malignantNeoplasmAbs is not None or
+        evidence.t07Prefix is not None or
+        evidence.e883Code is not None) and
+        evidence.r6510Code is None and
+        evidence.r6511Code is None
     ):
         result.Subtitle = "Possible Non-Infectious SIRS without Organ Dysfunction"
         SIRSContri = True
@@ -1291,42 +1014,42 @@ if validated is False:
         codesExist == 0 and
         (sirsCriteriaCounter >= 3 or
         (sirsCriteriaCounter == 2 and SirsCheck is False)) and
-        a419Code is None and
+        evidence.a419Code is None and
         infectionCheck == False and
         ODC >= 1 and
-        cBloodDV is None and
-        urineCultureDV is None and
-        antibioticMed is None and
-        antibiotic2Med is None and
-        antibioticAbs is None and
-        antibiotic2Abs is None and 
-        antifungalMed is None and
-        antifungalAbs is None and
-        antiviralMed is None and
-        antiviralAbs is None and
-        (k5506Prefeix is not None or
-        k5504Prefix is not None or
-        k5502Prefix is not None or
-        k85Prefix is not None or
-        burnCodes is not None or 
-        aspirationAbs is not None or
-        j69Prefix is not None or
-        malignantNeoplasmAbs is not None or
-        t07Prefix is not None or
-        e883Code is not None) and
-        r6510Code is None and
-        r6511Code is None
+        evidence.cBloodDV is None and
+        evidence.urineCultureDV is None and
+        evidence.antibioticMed is None and
+        evidence.antibiotic2Med is None and
+        evidence.antibioticAbs is None and
+        evidence.antibiotic2Abs is None and 
+        evidence.antifungalMed is None and
+        evidence.antifungalAbs is None and
+        evidence.antiviralMed is None and
+        evidence.antiviralAbs is None and
+        (evidence.k5506Prefeix is not None or
+        evidence.k5504Prefix is not None or
+        evidence.k5502Prefix is not None or
+        evidence.k85Prefix is not None or
+        evidence.burnCodes is not None or 
+        evidence.aspirationAbs is not None or
+        evidence.j69Prefix is not None or
+        evidence.malignantNeoplasmAbs is not None or
+        evidence.t07Prefix is not None or
+        evidence.e883Code is not None) and
+        evidence.r6510Code is None and
+        evidence.r6511Code is None
     ):
         result.Subtitle = "Possible Non-Infectious SIRS with Organ Dysfunction"
         SIRSContri = True
         AlertPassed = True
 
     else:
-        db.LogEvaluationScriptMessage("Not enough data to warrent alert, Alert Failed. " + str(account._id), scriptName, scriptInstance, "Debug")
+        scriptLog.debug("Not enough data to warrent alert, Alert Failed. %s", account._id)
         result.Passed = False
 
 else:
-    db.LogEvaluationScriptMessage("Alert Closed; Exiting script run. Outcome: " + str(outcome) + " " + str(account._id), scriptName, scriptInstance, "Debug")
+    scriptLog.debug("Alert Closed; Exiting script run. Outcome: %s %s", outcome, account._id)
 
 #If an alert triggered abstract the following
 if AlertPassed:
@@ -1343,7 +1066,7 @@ if AlertPassed:
     i9589Code = codeValue("I95.89", "Chronic Hypotension: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])")
     #Abs
     #1-13
-    if glasgowComaScoreDV is not None: abs.Links.Add(glasgowComaScoreDV) #14
+    if evidence.glasgowComaScoreDV is not None: abs.Links.Add(evidence.glasgowComaScoreDV) #14
     abstractValue("LOW_GLASGOW_COMA_SCORE", "Glasgow Coma Score: [ABSTRACTVALUE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 15, abs, True)
     codeValue("R09.02", "Hypoxemia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 16, abs, True)
     #17-18
@@ -1354,88 +1077,88 @@ if AlertPassed:
     abstractValue("RESPIRATORY_DISTRESS", "Respiratory Distress '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 26, abs, True)
     #27-33
     #Infection
-    if bacteremiaCode is not None: infection.Links.Add(bacteremiaCode)
-    if mycosisCode is not None: infection.Links.Add(mycosisCode)
-    if positiveCerebrospinalFluidCultureCode is not None: infection.Links.Add(positiveCerebrospinalFluidCultureCode)
-    if positiveRespiratoryCultureCode is not None: infection.Links.Add(positiveRespiratoryCultureCode)
-    if positiveUrineAnalysisCode is not None: infection.Links.Add(positiveUrineAnalysisCode)
-    if positiveUrineCultureCode is not None: infection.Links.Add(positiveUrineCultureCode)
-    if postiveWoundCultureAbs is not None: infection.Links.Add(postiveWoundCultureAbs)
-    if bacteriaUrinedv is not None: infection.Links.Add(bacteriaUrinedv)
-    if bacteriuriaCode is not None: infection.Links.Add(bacteriuriaCode)
-    if aspergillosisCode is not None: infection.Links.Add(aspergillosisCode)
-    if bacterialInfectionCode is not None: infection.Links.Add(bacterialInfectionCode)
-    if blastomycosisCode is not None: infection.Links.Add(blastomycosisCode)
-    if chromomycosisPheomycoticAbscessCode is not None: infection.Links.Add(chromomycosisPheomycoticAbscessCode)
-    if cryptococcosisCode is not None: infection.Links.Add(cryptococcosisCode)
-    if cytomegaloviralCode is not None: infection.Links.Add(cytomegaloviralCode)
-    if infectionAbs is not None: infection.Links.Add(infectionAbs)
+    if evidence.bacteremiaCode is not None: infection.Links.Add(evidence.bacteremiaCode)
+    if evidence.mycosisCode is not None: infection.Links.Add(evidence.mycosisCode)
+    if evidence.positiveCerebrospinalFluidCultureCode is not None: infection.Links.Add(evidence.positiveCerebrospinalFluidCultureCode)
+    if evidence.positiveRespiratoryCultureCode is not None: infection.Links.Add(evidence.positiveRespiratoryCultureCode)
+    if evidence.positiveUrineAnalysisCode is not None: infection.Links.Add(evidence.positiveUrineAnalysisCode)
+    if evidence.positiveUrineCultureCode is not None: infection.Links.Add(evidence.positiveUrineCultureCode)
+    if evidence.postiveWoundCultureAbs is not None: infection.Links.Add(evidence.postiveWoundCultureAbs)
+    if evidence.bacteriaUrinedv is not None: infection.Links.Add(evidence.bacteriaUrinedv)
+    if evidence.bacteriuriaCode is not None: infection.Links.Add(evidence.bacteriuriaCode)
+    if evidence.aspergillosisCode is not None: infection.Links.Add(evidence.aspergillosisCode)
+    if evidence.bacterialInfectionCode is not None: infection.Links.Add(evidence.bacterialInfectionCode)
+    if evidence.blastomycosisCode is not None: infection.Links.Add(evidence.blastomycosisCode)
+    if evidence.chromomycosisPheomycoticAbscessCode is not None: infection.Links.Add(evidence.chromomycosisPheomycoticAbscessCode)
+    if evidence.cryptococcosisCode is not None: infection.Links.Add(evidence.cryptococcosisCode)
+    if evidence.cytomegaloviralCode is not None: infection.Links.Add(evidence.cytomegaloviralCode)
+    if evidence.infectionAbs is not None: infection.Links.Add(evidence.infectionAbs)
     codeValue("T81.42XA", "Infection Following a Procedure, Deep Incisional Surgical Site: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 11, infection, True)
-    if mycosisCode is not None: infection.Links.Add(mycosisCode)
-    if otherBacterialAgentsCode is not None: infection.Links.Add(otherBacterialAgentsCode)
-    if paracoccidioidomycosisCode is not None: infection.Links.Add(paracoccidioidomycosisCode)
-    if sporotrichosisCode is not None: infection.Links.Add(sporotrichosisCode)
-    if streptococcusStaphylococcusEnterococcusCode is not None: infection.Links.Add(streptococcusStaphylococcusEnterococcusCode)
-    if zygomycosisCode is not None: infection.Links.Add(zygomycosisCode)
+    if evidence.mycosisCode is not None: infection.Links.Add(evidence.mycosisCode)
+    if evidence.otherBacterialAgentsCode is not None: infection.Links.Add(evidence.otherBacterialAgentsCode)
+    if evidence.paracoccidioidomycosisCode is not None: infection.Links.Add(evidence.paracoccidioidomycosisCode)
+    if evidence.sporotrichosisCode is not None: infection.Links.Add(evidence.sporotrichosisCode)
+    if evidence.streptococcusStaphylococcusEnterococcusCode is not None: infection.Links.Add(evidence.streptococcusStaphylococcusEnterococcusCode)
+    if evidence.zygomycosisCode is not None: infection.Links.Add(evidence.zygomycosisCode)
     #Labs
     if negationAlanine is None:
-        if alaTranDV is not None: labs.Links.Add(alaTranDV) #1      
+        if evidence.alaTranDV is not None: labs.Links.Add(evidence.alaTranDV) #1      
     elif negationAlanine is not None:
-        if alaTranDV is not None: alaTranDV.Hidden = True; labs.Links.Add(alaTranDV)
+        if evidence.alaTranDV is not None: evidence.alaTranDV.Hidden = True; labs.Links.Add(evidence.alaTranDV)
     #2-3
-    if negationAspartate is None:
-        if aspTranDV is not None: labs.Links.Add(aspTranDV) #4
-    elif negationAspartate is not None:
-        if aspTranDV is not None: aspTranDV.Hidden = True; labs.Links.Add(aspTranDV) #4
+    if evidence.negationAspartate is None:
+        if evidence.aspTranDV is not None: labs.Links.Add(evidence.aspTranDV) #4
+    elif evidence.negationAspartate is not None:
+        if evidence.aspTranDV is not None: evidence.aspTranDV.Hidden = True; labs.Links.Add(evidence.aspTranDV) #4
     codeValue("D72.825", "Bandemia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 5, labs, True)
     #6-8
-    if anticoagulantAbs is None:
+    if evidence.anticoagulantAbs is None:
         dvValue(dvInr, "INR: [VALUE] (Result Date: [RESULTDATETIME])", calcInr1, 9, labs, True)
-    elif anticoagulantAbs is not None:
+    elif evidence.anticoagulantAbs is not None:
         inrDV = dvValue(dvInr, "INR: [VALUE] (Result Date: [RESULTDATETIME])", calcInr1, 9)
         if inrDV is not None: inrDV.Hidden = True; labs.Links.Add(inrDV)
     dvValue(dvInterleukin6, "Interleukin 6: [VALUE] (Result Date: [RESULTDATETIME])", calcInterleukin1, 10, labs, True)
-    if pa02DV is not None: labs.Links.Add(pa02DV) #11
+    if evidence.pa02DV is not None: labs.Links.Add(evidence.pa02DV) #11
     dvValue(dvPlateletCount, "Platelet Count: [VALUE] (Result Date: [RESULTDATETIME])", calcPlateletCount1, 12, labs, True)
-    if proclcitoninDV is not None: labs.Links.Add(proclcitoninDV) #13
-    if serumBilirubinDV is not None: labs.Links.Add(serumBilirubinDV) #14
+    if evidence.proclcitoninDV is not None: labs.Links.Add(evidence.proclcitoninDV) #13
+    if evidence.serumBilirubinDV is not None: labs.Links.Add(evidence.serumBilirubinDV) #14
     if kidneyDiseaseCode is None:
-        if serumBunDV is not None: labs.Links.Add(serumBunDV) #15
-        if serumCreatinineDV is not None: labs.Links.Add(serumCreatinineDV) #16
+        if evidence.serumBunDV is not None: labs.Links.Add(evidence.serumBunDV) #15
+        if evidence.serumCreatinineDV is not None: labs.Links.Add(evidence.serumCreatinineDV) #16
     elif kidneyDiseaseCode is not None:
-        if serumBunDV is not None: serumBunDV.Hidden = True; labs.Links.Add(serumBunDV)
-        if serumCreatinineDV is not None: serumCreatinineDV.Hidden = True; labs.Links.Add(serumCreatinineDV)
-    if serumLactateDV is not None: labs.Links.Add(serumLactateDV) #17
+        if evidence.serumBunDV is not None: evidence.serumBunDV.Hidden = True; labs.Links.Add(evidence.serumBunDV)
+        if evidence.serumCreatinineDV is not None: evidence.serumCreatinineDV.Hidden = True; labs.Links.Add(evidence.serumCreatinineDV)
+    if evidence.serumLactateDV is not None: labs.Links.Add(evidence.serumLactateDV) #17
     codeValue("D69.6", "Thrombocytopenia: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 18, labs, True)
     #Medications
-    if antibioticMed is not None: meds.Links.Add(antibioticMed) #1
-    if antibiotic2Med is not None: meds.Links.Add(antibiotic2Med) #2
-    if antibioticAbs is not None: meds.Links.Add(antibioticAbs) #3
-    if antibiotic2Abs is not None: meds.Links.Add(antibiotic2Abs) #4
-    if antifungalMed is not None: meds.Links.Add(antifungalMed) #5
-    if antifungalAbs is not None: meds.Links.Add(antifungalAbs) #6
-    if antiviralMed is not None: meds.Links.Add(antiviralMed) #7
-    if antiviralAbs is not None: meds.Links.Add(antiviralAbs) #8
+    if evidence.antibioticMed is not None: meds.Links.Add(evidence.antibioticMed) #1
+    if evidence.antibiotic2Med is not None: meds.Links.Add(evidence.antibiotic2Med) #2
+    if evidence.antibioticAbs is not None: meds.Links.Add(evidence.antibioticAbs) #3
+    if evidence.antibiotic2Abs is not None: meds.Links.Add(evidence.antibiotic2Abs) #4
+    if evidence.antifungalMed is not None: meds.Links.Add(evidence.antifungalMed) #5
+    if evidence.antifungalAbs is not None: meds.Links.Add(evidence.antifungalAbs) #6
+    if evidence.antiviralMed is not None: meds.Links.Add(evidence.antiviralMed) #7
+    if evidence.antiviralAbs is not None: meds.Links.Add(evidence.antiviralAbs) #8
     medValue("Dobutamine", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 9, meds, True)
     abstractValue("DOBUTAMINE", "Dobutamine '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 10, meds, True)
     medValue("Dopamine", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 11, meds, True)
     abstractValue("DOPAMINE", "Dopamine '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 12, meds, True)
-    anesthesiaMedValue(dict(mainMedDic), "Epinephrine", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 13, meds, True)
+    anesthesiaMedValue(mainMedDic, "Epinephrine", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 13, meds, True)
     abstractValue("EPINEPHRINE", "Epinephrine '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 14, meds, True)
     medValue("Fluid Bolus", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 15, meds, True)
     abstractValue("FLUID_BOLUS", "Fluid Bolus '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 16, meds, True)
-    anesthesiaMedValue(dict(mainMedDic), "Levophed", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 17, meds, True)
+    anesthesiaMedValue(mainMedDic, "Levophed", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 17, meds, True)
     abstractValue("LEVOPHED", "Levophed '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 18, meds, True)
     medValue("Methylprednisolone", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 19, meds, True)
     abstractValue("METHYLPREDNISOLONE", "Methylprednisolone '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 20, meds, True)
     medValue("Milrinone", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 21, meds, True)
     abstractValue("MILRINONE", "Milrinone '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 22, meds, True)
-    anesthesiaMedValue(dict(mainMedDic), "Neosynephrine", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 23, meds, True)
+    anesthesiaMedValue(mainMedDic, "Neosynephrine", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 23, meds, True)
     abstractValue("NEOSYNEPHRINE", "Neosynephrine '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 24, meds, True)
     medValue("Steroid", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 25, meds, True)
     abstractValue("STEROIDS", "Steroid '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 26, meds, True)
     abstractValue("VASOACTIVE_MEDICATION", "Vasoactive Medication '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 27, meds, True)
-    anesthesiaMedValue(dict(mainMedDic), "Vasopressin", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 28, meds, True)
+    anesthesiaMedValue(mainMedDic, "Vasopressin", "[MEDICATION], Dosage [DOSAGE], Route [ROUTE] ([STARTDATE])", 28, meds, True)
     abstractValue("VASOPRESSIN", "Vasopressin '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 29, meds, True)
     #Oxygen
     codeValue("Z99.1", "Dependence on Ventilator: [CODE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", 1, oxygen, True)
@@ -1448,22 +1171,22 @@ if AlertPassed:
     abstractValue("VENTILATOR_DAYS", "Ventilator Days: [ABSTRACTVALUE] '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 9, oxygen, True)
     #Vitals
     if i9581Code is None and i9589Code is None:
-        if lowBloodPressureAbs is not None: vitals.Links.Add(lowBloodPressureAbs)
+        if evidence.lowBloodPressureAbs is not None: vitals.Links.Add(evidence.lowBloodPressureAbs)
     abstractValue("DELAYED_CAPILLARY_REFILL", "Delayed Capillary Refill '[PHRASE]' ([DOCUMENTTYPE], [DOCUMENTDATE])", True, 2, vitals, True)
     dvValue(dvUrinary, "Urine Output: [VALUE] (Result Date: [RESULTDATETIME])", calcUrinary1, 3, vitals, True)
-    if sp02DV is not None: vitals.Links.Add(sp02DV) #4
+    if evidence.sp02DV is not None: vitals.Links.Add(evidence.sp02DV) #4
     #Contributing
     if SIRSContri == True:
-        if k5506Prefeix is not None: contri.Links.Add(k5506Prefeix)
-        if k5504Prefix is not None: contri.Links.Add(k5504Prefix)
-        if k5502Prefix is not None: contri.Links.Add(k5502Prefix)
-        if k85Prefix is not None: contri.Links.Add(k85Prefix)
-        if burnCodes is not None: contri.Links.Add(burnCodes)
-        if aspirationAbs is not None: contri.Links.Add(aspirationAbs)
-        if j69Prefix is not None: contri.Links.Add(j69Prefix)
-        if malignantNeoplasmAbs is not None: contri.Links.Add(malignantNeoplasmAbs)
-        if t07Prefix is not None: contri.Links.Add(t07Prefix)
-        if e883Code is not None: contri.Links.Add(e883Code)
+        if evidence.k5506Prefeix is not None: contri.Links.Add(evidence.k5506Prefeix)
+        if evidence.k5504Prefix is not None: contri.Links.Add(evidence.k5504Prefix)
+        if evidence.k5502Prefix is not None: contri.Links.Add(evidence.k5502Prefix)
+        if evidence.k85Prefix is not None: contri.Links.Add(evidence.k85Prefix)
+        if evidence.burnCodes is not None: contri.Links.Add(evidence.burnCodes)
+        if evidence.aspirationAbs is not None: contri.Links.Add(evidence.aspirationAbs)
+        if evidence.j69Prefix is not None: contri.Links.Add(evidence.j69Prefix)
+        if evidence.malignantNeoplasmAbs is not None: contri.Links.Add(evidence.malignantNeoplasmAbs)
+        if evidence.t07Prefix is not None: contri.Links.Add(evidence.t07Prefix)
+        if evidence.e883Code is not None: contri.Links.Add(evidence.e883Code)
 
 #If alert passed or alert conditions was triggered add categories to result if they have links
 if AlertPassed or AlertConditions:
@@ -1482,7 +1205,10 @@ if AlertPassed or AlertConditions:
     result.Links.Add(meds)
     if meds.Links: medsLinks = True
     result.Links.Add(other)
-    db.LogEvaluationScriptMessage("Alert Passed Adding Links. Alert Triggered: " + str(result.Subtitle) + " Autoresolved: " + str(result.Outcome) + "; " +
-        str(result.Validated) + "; Links: AlertTrigger- " + str(dcLinks) + ", Abs- " + str(absLinks) + ", labs- " + str(labsLinks) + ", vitals- " + str(vitalsLinks) + ", meds- " + str(medsLinks) + ", oxygen- " + str(oxygenLinks) + ", contri- "
-        + str(contriLinks) + ", Sirs- " + str(sirsLinks) + ", Infection- " + str(infectionLinks) + "; Acct: " + str(account._id), scriptName, scriptInstance, "Debug")
+    scriptLog.debug("Alert Passed Adding Links. Alert Triggered: %s Autoresolved: %s; %s; Links: AlertTrigger- %s, Abs- %s, labs- %s, vitals- %s, meds- %s, oxygen- %s, contri- %s, Sirs- %s, Infection- %s; Acct: %s",
+        result.Subtitle, result.Outcome, result.Validated, dcLinks, absLinks, labsLinks, vitalsLinks, medsLinks, oxygenLinks, contriLinks, sirsLinks,
+        infectionLinks, account._id)
     result.Passed = True
+
+#Write out this run's script messages
+scriptLog.flush()
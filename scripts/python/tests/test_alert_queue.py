@@ -0,0 +1,80 @@
+from cdi.alert_queue import Heartbeat, QueueEntry, SQLiteAlertQueue, SQLiteResultStore
+
+
+class Clock:
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_queue_claims_oldest_first_and_keeps_the_first_entry_per_account():
+    queue = SQLiteAlertQueue(clock=lambda: 50.0)
+    queue.enqueue("acct2", time_queued=20.0)
+    queue.enqueue_many([("acct1", "Workflow", 10.0), ("acct3", "Requeue", None)])
+    queue.enqueue("acct2", "Requeue", 5.0)
+
+    assert len(queue) == 3
+    first = queue.claim(2)
+    assert first == [QueueEntry("acct1", 10.0, "Workflow"), QueueEntry("acct2", 20.0, "Workflow")]
+    assert queue.claim(5) == [QueueEntry("acct3", 50.0, "Requeue")]
+    assert queue.claim(5) == [] and len(queue) == 3
+    assert queue.complete([entry.token for entry in first]) == [entry.token for entry in first]
+    assert len(queue) == 1
+
+
+def test_leases_split_a_shared_queue_and_expire_to_other_workers(tmp_path):
+    clock = Clock(100.0)
+    path = str(tmp_path / "queue.db")
+    node1 = SQLiteAlertQueue(path, lease_seconds=30, clock=clock)
+    node2 = SQLiteAlertQueue(path, lease_seconds=30, clock=clock)
+    node1.enqueue_many(("acct%d" % number, "Workflow", float(number)) for number in range(4))
+
+    mine = node1.claim(2, "node1")
+    theirs = node2.claim(5, "node2")
+    assert [entry.account_id for entry in mine] == ["acct0", "acct1"]
+    assert [entry.account_id for entry in theirs] == ["acct2", "acct3"]
+    assert node1.leases()["acct2"] == ("node2", 130.0)
+
+    # node1 stalls past its lease and node2 takes acct0 over.
+    heartbeat = Heartbeat(node1, lease_seconds=30)
+    heartbeat.hold([mine[1].token])
+    clock.now = 125.0
+    heartbeat.beat()
+    node2.renew([entry.token for entry in theirs])
+    clock.now = 140.0
+    taken = node2.claim(5, "node2")
+    assert [entry.account_id for entry in taken] == ["acct0"]
+    assert node1.renew([entry.token for entry in mine]) == [mine[1].token]
+    assert node1.complete([mine[0].token]) == []
+    assert node2.complete([taken[0].token]) == [taken[0].token]
+
+    # The lease ran out without a heartbeat, so the token is refused.
+    clock.now = 200.0
+    heartbeat.beat()
+    assert heartbeat.lost == set([mine[1].token])
+    assert node1.complete([mine[1].token]) == []
+    assert [entry.account_id for entry in node2.claim(5, "node2")] == ["acct1", "acct2", "acct3"]
+
+
+def test_an_account_queued_again_while_leased_is_evaluated_again():
+    clock = Clock(10.0)
+    queue = SQLiteAlertQueue(clock=clock)
+    queue.enqueue("acct1")
+    entry, = queue.claim()
+    clock.now = 20.0
+    queue.enqueue("acct1", "Requeue")
+    assert queue.claim() == []
+
+    assert queue.complete([entry.token]) == [entry.token]
+    assert queue.claim() == [QueueEntry("acct1", 20.0, "Workflow")]
+
+
+def test_result_store_upserts_a_batch_in_one_write(tmp_path):
+    store = SQLiteResultStore(str(tmp_path / "results.db"))
+    store.upsert_many([("acct1", "Anemia.py", '{"Passed": false}'), ("acct1", "Shock.py", None)])
+    store.upsert_many([("acct1", "Anemia.py", '{"Passed": true}')])
+
+    assert store.writes == 2 and len(store) == 2
+    assert store.results("acct1") == {"Anemia.py": '{"Passed": true}', "Shock.py": None}
@@ -0,0 +1,66 @@
+from datetime import datetime
+
+from cdi import benchmark, host, manifest, synthetic
+
+SCRIPT = '''
+if account.Fail:
+    raise ValueError("bad account")
+result.Passed = True
+'''
+
+
+def test_run_reports_latencies_throughput_and_errors():
+    accounts = [host.Account("acct1", Fail=False), host.Account("acct2", Fail=True)]
+    ticks = iter(range(1000))
+
+    report = benchmark.run(accounts, [("Script.py", compile(SCRIPT, "Script.py", "exec"))], repeat=2,
+                           clock=lambda: next(ticks))
+
+    assert (report["accounts"], report["script_runs"]) == (4, 4)
+    assert report["scripts"]["Script.py"]["calls"] == 4
+    assert report["errors"] == {"Script.py": 2}
+    # Each account takes three ticks, the script run inside it one.
+    assert report["seconds"] == 12 and report["throughput"]["accounts_per_second"] == 4 / 12.0
+    assert "Script.py" in benchmark.format_report(report)
+
+
+def test_fit_exponent_recovers_polynomial_growth():
+    assert abs(benchmark.fit_exponent([(n, 3e-6 * n) for n in (100, 1000, 10000)]) - 1) < 1e-9
+    assert abs(benchmark.fit_exponent([(n, 1e-9 * n * n) for n in (100, 1000, 10000)]) - 2) < 1e-9
+    assert benchmark.fit_exponent([(100, 1.0)]) is None
+
+
+def test_scaling_fits_each_script_and_flags_growth_over_budget():
+    catalogue = synthetic.Catalogue.from_manifest(manifest.ScriptManifest("*", discrete_values=["pH"]))
+    code = compile("result.Passed = len(account.DiscreteValues) > 0", "Count.py", "exec")
+    now = datetime(2024, 10, 20, 12, 0)
+    host.set_clock(lambda: now)
+    try:
+        report = benchmark.scaling([("Count.py", code)], catalogue, sizes=(10, 40))
+    finally:
+        host.set_clock(datetime.now)
+
+    assert report["sizes"] == [10, 40]
+    assert len(report["scripts"]["Count.py"]["seconds"]) == 2
+    assert report["scripts"]["Count.py"]["errors"] == [0, 0]
+    quadratic = {"sizes": [10, 100], "scripts": {"Slow.py": {"seconds": [1, 100], "exponent": 2.0, "tail_exponent": 2.0}}}
+    assert benchmark.over_budget(quadratic, 1.5) == [("Slow.py", 2.0)]
+    assert benchmark.over_budget(quadratic, 2.5) == []
+    assert "over budget" in benchmark.format_scaling(quadratic, 1.5)
+
+
+def test_scaling_fails_scripts_that_raise_instead_of_fitting_them():
+    catalogue = synthetic.Catalogue.from_manifest(manifest.ScriptManifest("*", discrete_values=["pH"]))
+    code = compile("if len(account.DiscreteValues) > 2:\n    raise ValueError('too many')\n", "Big.py", "exec")
+    now = datetime(2024, 10, 20, 12, 0)
+    host.set_clock(lambda: now)
+    try:
+        report = benchmark.scaling([("Big.py", code)], catalogue, sizes=(10, 40), repeat=2)
+    finally:
+        host.set_clock(datetime.now)
+
+    entry = report["scripts"]["Big.py"]
+    assert entry["errors"] == [0, 2]
+    assert entry["exponent"] is None and entry["tail_exponent"] is None
+    assert benchmark.over_budget(report, 10.0) == [("Big.py", None)]
+    assert "errors: 0 2" in benchmark.format_scaling(report, 10.0)
@@ -0,0 +1,48 @@
+from cdi import host
+from cdi.code_index import CodeIndex
+from cdi.records import compact_account
+
+
+def code_count(documents, codes):
+    # CodeCount as the scripts used to define it.
+    result = set()
+    for document in documents:
+        for reference in document.CodeReferences or []:
+            if reference.Code in codes:
+                result.add(reference.Code)
+    return list(result)
+
+
+def documents():
+    codes = ["E87.%d" % digit for digit in range(10)] + ["N17.9", "I10", "J96.0"]
+    return [host.CACDocument("doc%d" % number,
+                             CodeReferences=[host.CodeReference(codes[(number * 7 + offset) % len(codes)], Phrase=str(offset))
+                                             for offset in range(number % 4)])
+            for number in range(12)] + [host.CACDocument("empty")]
+
+
+def test_find_matches_the_document_scan():
+    docs = documents()
+    index = CodeIndex(docs)
+    code_dicts = [
+        dict.fromkeys(["E87.1", "E87.0", "E87.2", "N17.9", "Z99.9"]),
+        dict.fromkeys(["I10", "J96.0", "E87.3"] + ["A%02d" % number for number in range(40)]),
+        dict.fromkeys(["Z99.9"]),
+        {},
+    ]
+    for codes in code_dicts:
+        assert index.find(codes.keys()) == code_count(docs, codes.keys())
+    assert index.find_many([codes.keys() for codes in code_dicts]) == \
+        [code_count(docs, codes.keys()) for codes in code_dicts]
+    assert len(index) == len(index.codes()) and "I10" in index and "Z99.9" not in index
+
+
+def test_references_are_grouped_by_code_in_document_order():
+    account = compact_account(host.Account("acct1", Documents=documents()))
+    index = CodeIndex(account.Documents)
+
+    pairs = [(document.DocumentId, reference.Phrase) for document in account.Documents
+             for reference in document.CodeReferences if reference.Code == "E87.1"]
+    assert [(document.DocumentId, reference.Phrase) for document, reference in index.references("E87.1")] == pairs
+    assert index.references("Z99.9") == []
+    assert index.codes()[0] == account.Documents[1].CodeReferences[0].Code
@@ -0,0 +1,41 @@
+import os
+import subprocess
+
+import pytest
+
+from cdi import runner
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Imports the package the way a script does and compiles every script, under
+# the Python 2.7 language the workflow engine's IronPython speaks.
+CHECK = '''
+import sys
+sys.path.insert(0, sys.argv[1])
+import cdi
+for path in sys.argv[2:]:
+    with open(path) as handle:
+        compile(handle.read(), path, "exec")
+'''
+
+
+def _python27():
+    for name in ("ipy", "python2.7", "python2"):
+        try:
+            output = subprocess.run([name, "-c", "import sys; print(sys.version_info[:2])"],
+                                    capture_output=True, text=True, timeout=60)
+        except OSError:
+            continue
+        if output.returncode == 0 and output.stdout.strip() == "(2, 7)":
+            return name
+    return None
+
+
+def test_package_and_scripts_load_under_python_27():
+    interpreter = _python27()
+    if interpreter is None:
+        pytest.skip("no IronPython or Python 2.7 interpreter")
+    environment = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    checked = subprocess.run([interpreter, "-c", CHECK, ROOT] + runner.script_paths(),
+                             capture_output=True, text=True, timeout=300, env=environment)
+    assert checked.returncode == 0, checked.stderr
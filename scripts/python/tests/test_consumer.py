@@ -0,0 +1,99 @@
+import asyncio
+import json
+import time
+from datetime import datetime
+
+import pytest
+
+from cdi import consumer, host
+from cdi.alert_queue import SQLiteAlertQueue, SQLiteResultStore
+
+SCRIPT = '''
+result.Passed = account.Fail is False
+result.Subtitle = account._id
+'''
+
+
+class WatchedRepository(consumer.AsyncRepository):
+    def __init__(self, accounts, queue):
+        consumer.AsyncRepository.__init__(self, accounts, latency=0.01)
+        self.queue = queue
+        self.still_queued = []
+
+    async def fetch(self, account_id):
+        self.still_queued.append(len(self.queue) - len(self.queue.leases()))
+        return await consumer.AsyncRepository.fetch(self, account_id)
+
+
+def test_consume_bounds_claims_and_batches_writes(tmp_path):
+    path = tmp_path / "Script.py"
+    path.write_text(SCRIPT)
+    accounts = dict(("acct%02d" % number, host.Account("acct%02d" % number, Fail=False)) for number in range(20))
+    queue = SQLiteAlertQueue()
+    queue.enqueue_many((account_id, "Workflow", None) for account_id in sorted(accounts) + ["gone"])
+    repository = WatchedRepository(accounts, queue)
+    store = SQLiteResultStore()
+
+    stats = consumer.run(queue, repository, store, scripts=[str(path)], workers=1, queue_depth=2, in_flight=1,
+                         claim_size=1, write_batch=8, now=datetime(2024, 10, 20, 12, 0))
+
+    assert (stats["accounts"], stats["missing"]) == (20, 1)
+    # One account fetching, two waiting and one more being claimed.
+    assert repository.still_queued[0] >= 21 - 4
+    assert stats["writes"] == store.writes == 3
+    assert json.loads(store.results("acct07")["Script.py"])["Subtitle"] == "acct07"
+    assert len(store) == 20 and len(queue) == 0
+
+
+class FailingRepository(consumer.AsyncRepository):
+    async def fetch(self, account_id):
+        if account_id == "acct03":
+            raise IOError("connection reset")
+        return await consumer.AsyncRepository.fetch(self, account_id)
+
+
+def test_consume_releases_the_lease_of_a_failed_account_and_carries_on(tmp_path):
+    path = tmp_path / "Script.py"
+    path.write_text(SCRIPT)
+    accounts = dict(("acct%02d" % number, host.Account("acct%02d" % number, Fail=False)) for number in range(8))
+    queue = SQLiteAlertQueue()
+    queue.enqueue_many((account_id, "Workflow", None) for account_id in sorted(accounts))
+    store = SQLiteResultStore()
+
+    stats = consumer.run(queue, FailingRepository(accounts), store, scripts=[str(path)], workers=1,
+                         queue_depth=2, in_flight=2, claim_size=2, now=datetime(2024, 10, 20, 12, 0))
+
+    assert (stats["accounts"], stats["failed"]) == (7, 1)
+    assert len(store) == 7 and "Script.py" not in store.results("acct03")
+    # The failed account is queued again, unleased.
+    assert len(queue) == 1 and queue.leases() == {}
+    assert [entry.account_id for entry in queue.claim(8)] == ["acct03"]
+
+
+class FailingStore(SQLiteResultStore):
+    def upsert_many(self, rows):
+        raise IOError("disk full")
+
+
+class SlowClaimQueue(SQLiteAlertQueue):
+    # Keeps a claim running in its thread when the write fails, and leasing
+    # what it claims after consume has stopped waiting for it.
+    def claim(self, limit=1, owner=None, lease_seconds=None, priority=None):
+        time.sleep(0.05)
+        return SQLiteAlertQueue.claim(self, limit, owner, lease_seconds, priority)
+
+
+def test_consume_stops_and_releases_every_lease_when_writing_fails(tmp_path):
+    path = tmp_path / "Script.py"
+    path.write_text(SCRIPT)
+    accounts = dict(("acct%02d" % number, host.Account("acct%02d" % number, Fail=False)) for number in range(12))
+    queue = SlowClaimQueue()
+    queue.enqueue_many((account_id, "Workflow", None) for account_id in sorted(accounts))
+
+    consuming = consumer.consume(queue, consumer.AsyncRepository(accounts), FailingStore(), scripts=[str(path)],
+                                 workers=1, queue_depth=2, in_flight=2, claim_size=2, write_batch=1,
+                                 now=datetime(2024, 10, 20, 12, 0))
+    with pytest.raises(IOError):
+        asyncio.run(asyncio.wait_for(consuming, 60))
+
+    assert len(queue) == 12 and queue.leases() == {}
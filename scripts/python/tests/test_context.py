@@ -0,0 +1,227 @@
+import threading
+from datetime import datetime, timedelta
+
+from cdi import DiscreteValueIndex, EvaluationContext, evaluation_context
+from cdi import context as context_module
+from cdi import host, runner
+
+NOW = datetime(2024, 10, 20, 12, 0)
+
+
+def at(hours_ago):
+    return host.DateTime(NOW - timedelta(hours=hours_ago))
+
+
+class CountingRepository(host.CACDataRepository):
+    def __init__(self, accounts):
+        host.CACDataRepository.__init__(self, accounts)
+        self.loads = 0
+
+    def GetDiscreteValues(self, account_id, since=None, names=None):
+        self.loads += 1
+        return host.CACDataRepository.GetDiscreteValues(self, account_id, since, names)
+
+
+def sample_account():
+    values = [
+        host.DiscreteValue("a", "SODIUM", "130", at(5)),
+        host.DiscreteValue("b", "POTASSIUM", "4.1", at(1)),
+        host.DiscreteValue("c", "SODIUM", "128", at(1)),
+        host.DiscreteValue("d", "SODIUM", "140", at(300)),
+    ]
+    medications = [
+        host.Medication("m1", "Insulin A", StartDate=at(30), Category="Insulin"),
+        host.Medication("m2", "Heparin", StartDate=at(2), Category="Anticoagulant"),
+        host.Medication("m3", "Insulin B", StartDate=at(3), Category="Insulin"),
+        host.Medication("m4", "Insulin C", StartDate=at(400), Category="Insulin"),
+        host.Medication("m5", "Methadone", StartDate=at(1), CDIAlertCategory="Methadone"),
+    ]
+    documents = [
+        host.CACDocument("doc1", CodeReferences=[host.CodeReference("E87.1"), host.CodeReference("I10")]),
+        host.CACDocument("doc2", CodeReferences=[host.CodeReference("E87.1"), host.CodeReference("N17.9")]),
+    ]
+    return host.Account("acct1", Documents=documents, Medications=medications, DiscreteValues=values)
+
+
+def test_discrete_values_load_once_and_narrow_like_a_fresh_index():
+    account = sample_account()
+    repository = CountingRepository({"acct1": account})
+    context = EvaluationContext(account, repository)
+    since = at(24 * 7)
+
+    narrowed = DiscreteValueIndex(context.discrete_values, ["SODIUM", "POTASSIUM"], since)
+    again = DiscreteValueIndex(context.discrete_values, ["SODIUM"])
+    direct = DiscreteValueIndex(account.DiscreteValues, ["SODIUM", "POTASSIUM"], since)
+
+    assert repository.loads == 1
+    assert list(narrowed.items()) == list(direct.items())
+    assert [x.UniqueId for x in again.lookup("SODIUM")] == ["c", "a", "d"]
+
+
+def test_repository_projects_by_date_and_name():
+    account = sample_account()
+    repository = host.CACDataRepository({"acct1": account})
+
+    recent = repository.GetDiscreteValues("acct1", at(24))
+    sodium = repository.GetDiscreteValues("acct1", names=["SODIUM"])
+
+    assert [x.UniqueId for x in recent] == ["a", "b", "c"]
+    assert [x.UniqueId for x in sodium] == ["a", "c", "d"]
+    assert len(repository.GetDiscreteValues("acct1")) == 4
+    assert len(repository.GetDiscreteValues("missing", at(24))) == 0
+
+
+class AccountIdRepository(host.CACDataRepository):
+    # The workflow repository's signature: no projection.
+    def GetDiscreteValues(self, account_id):
+        return host.CACDataRepository.GetDiscreteValues(self, account_id)
+
+
+def test_context_filters_values_from_a_repository_without_projection():
+    account = sample_account()
+    context = EvaluationContext(account, AccountIdRepository({"acct1": account}), at(24), ["SODIUM"])
+
+    assert [x.UniqueId for x in context.discrete_values.lookup(["SODIUM", "POTASSIUM"])] == ["c", "a"]
+    assert context.discrete_values.names() == ["SODIUM"]
+
+
+def test_context_fetches_only_its_window():
+    account = sample_account()
+    context = EvaluationContext(account, host.CACDataRepository({"acct1": account}), at(24), ["SODIUM"])
+
+    assert [x.UniqueId for x in context.discrete_values.lookup(["SODIUM", "POTASSIUM"])] == ["c", "a"]
+    assert context.covers(at(12))
+    assert not context.covers(at(48))
+    assert not context.covers(None)
+
+
+def test_medications_match_the_script_loop():
+    account = sample_account()
+    context = EvaluationContext(account)
+    since = at(24 * 7)
+
+    meds = context.medications(["Insulin", "Anticoagulant"], since)
+    assert [(key, meds[key].ExternalId) for key in meds] == [(2, "m2"), (3, "m3"), (1, "m1")]
+    methadone = context.medications(["Methadone"], since, "CDIAlertCategory")
+    assert [methadone[key].ExternalId for key in methadone] == ["m5"]
+    assert len(context.medications(["Missing"], since)) == 0
+
+
+def test_code_count_is_shared_and_containers_are_not():
+    account = sample_account()
+    context = EvaluationContext(account)
+
+    assert sorted(context.code_count({"E87.1": "", "N17.9": "", "J96.0": ""})) == ["E87.1", "N17.9"]
+    assert context.code_count(["J96.0"]) == []
+    assert context.code_counts([["I10"], ["J96.0"]]) == [["I10"], []]
+    assert context.code_index is context.code_index
+    container = context.container(host.AccountWorkflowContainer, True, "Category", 7)
+    assert context.container(host.AccountWorkflowContainer, True, "Category", 7) is not container
+    assert container.account is account and container.days_back == 7
+
+
+def test_each_thread_has_its_own_active_context():
+    first, second = sample_account(), sample_account()
+    seen = []
+
+    def evaluate():
+        seen.append(evaluation_context(second))
+        context_module.release()
+
+    try:
+        context = evaluation_context(first)
+        thread = threading.Thread(target=evaluate)
+        thread.start()
+        thread.join()
+        assert seen[0].account is second
+        assert evaluation_context(first) is context
+    finally:
+        context_module.release()
+    assert evaluation_context(first) is not context
+    context_module.release()
+
+
+def test_evaluation_context_follows_the_account():
+    first, second = sample_account(), sample_account()
+    try:
+        context = evaluation_context(first)
+        assert evaluation_context(first) is context
+        assert evaluation_context(second) is not context
+        narrow = evaluation_context(first, None, at(24))
+        assert evaluation_context(first, None, at(12)) is narrow
+        assert evaluation_context(first, None, at(48)) is not narrow
+    finally:
+        context_module.release()
+
+
+def test_evaluation_context_is_rebuilt_when_the_account_data_changes():
+    account = sample_account()
+    try:
+        context = evaluation_context(account)
+        account.DiscreteValues.Add(host.DiscreteValue("e", "SODIUM", "125", at(0)))
+        grown = evaluation_context(account)
+        assert grown is not context and len(grown.discrete_values) == 5
+        account.Medications = host.List(account.Medications)
+        assert evaluation_context(account) is not grown
+    finally:
+        context_module.release()
+
+
+def test_a_context_built_on_demand_expires_but_a_runner_context_does_not(monkeypatch):
+    account = sample_account()
+    clock = [1000.0]
+    monkeypatch.setattr(context_module.time, "time", lambda: clock[0])
+    try:
+        context = evaluation_context(account)
+        clock[0] += context_module.REUSE_SECONDS / 2
+        assert evaluation_context(account) is context
+        clock[0] += context_module.REUSE_SECONDS + 1
+        assert evaluation_context(account) is not context
+        activated = context_module.activate(EvaluationContext(account))
+        clock[0] += context_module.REUSE_SECONDS * 10
+        assert evaluation_context(account) is activated
+    finally:
+        context_module.release()
+
+
+def test_run_account_shares_one_context(tmp_path):
+    script = (
+        "from System import DateTime\n"
+        "from cdi import evaluation_context\n"
+        "context = evaluation_context(account, None, DateTime.Now.AddDays(-7))\n"
+        "result.Subtitle = str(id(context.discrete_values))\n"
+    )
+    for name in ("First.py", "Second.py"):
+        (tmp_path / name).write_text(script)
+    account = sample_account()
+    repository = CountingRepository({"acct1": account})
+
+    results = runner.run_account(account, runner.script_paths(str(tmp_path)), repository)
+
+    assert list(results) == ["First.py", "Second.py"]
+    assert results["First.py"].Subtitle is not None
+    assert results["First.py"].Subtitle == results["Second.py"].Subtitle
+    assert repository.loads == 1
+
+
+def test_run_account_skips_gated_scripts_of_closed_alerts(tmp_path):
+    (tmp_path / "Sodium.py").write_text(
+        "from System import DateTime\n"
+        "from cdi import evaluation_context\n"
+        "context = evaluation_context(account, None, DateTime.Now.AddDays(-7))\n"
+        "if context.discrete_values is not None:\n"
+        "    result.Subtitle = 'loaded'\n"
+    )
+    paths = runner.script_paths(str(tmp_path))
+    gates = {"Sodium.py": "Hyponatremia"}
+    account = sample_account()
+    repository = CountingRepository({"acct1": account})
+
+    assert runner.run_account(account, paths, repository, gates=gates)["Sodium.py"].Subtitle == "loaded"
+    account.MatchedCriteriaGroups = [host.MatchedCriteriaGroup("Hyponatremia", True)]
+    assert runner.alert_closed(account, "Hyponatremia")
+    results = runner.run_account(account, paths, repository, gates=gates)
+    assert results["Sodium.py"].Subtitle is None and not results["Sodium.py"].Passed
+    assert repository.loads == 1
+    account.MatchedCriteriaGroups = [host.MatchedCriteriaGroup("Hyponatremia", False)]
+    assert runner.run_account(account, paths, repository, gates=gates)["Sodium.py"].Subtitle == "loaded"
@@ -0,0 +1,71 @@
+from collections import namedtuple
+from datetime import datetime, timedelta
+from operator import gt, lt
+
+from cdi import DiscreteValueIndex
+
+DV = namedtuple("DV", "UniqueId Name Result ResultDate")
+
+NOW = datetime(2024, 10, 20, 12, 0)
+
+
+def dv(unique_id, name, hours_ago, result="1"):
+    return DV(unique_id, name, result, NOW - timedelta(hours=hours_ago))
+
+
+def sample():
+    return [
+        dv("a", "SODIUM", 5),
+        dv("b", "POTASSIUM", 1),
+        dv("c", "SODIUM", 1),
+        dv("d", "SODIUM", 300),
+        dv("e", "CHLORIDE", 2),
+        dv("f", "POTASSIUM", 5),
+    ]
+
+
+def test_mapping_matches_sorted_dict():
+    values = sample()
+    names = ["SODIUM", "POTASSIUM"]
+    since = NOW - timedelta(days=7)
+    unsorted = {}
+    count = 0
+    for value in values:
+        if value.ResultDate >= since and value.Name in names:
+            count += 1
+            unsorted[count] = value
+    expected = dict(sorted(unsorted.items(), key=lambda x: x[1].ResultDate, reverse=True))
+
+    index = DiscreteValueIndex(values, names, since)
+
+    assert list(index.items()) == list(expected.items())
+    assert len(index) == 4
+
+
+def test_lookup_merges_names_newest_first():
+    index = DiscreteValueIndex(sample())
+
+    assert [x.UniqueId for x in index.lookup(["SODIUM", "POTASSIUM"])] == ["b", "c", "a", "f", "d"]
+    assert [x.UniqueId for x in index.lookup("SODIUM")] == ["c", "a", "d"]
+    assert index.lookup(["MISSING"]) == []
+
+
+def test_lookup_date_window():
+    index = DiscreteValueIndex(sample())
+
+    window = index.lookup(["SODIUM", "POTASSIUM"], since=NOW - timedelta(hours=5), until=NOW - timedelta(hours=1))
+    assert [x.UniqueId for x in window] == ["a", "f"]
+    assert index.latest(["SODIUM"], until=NOW - timedelta(hours=2)).UniqueId == "a"
+    assert index.latest(["SODIUM"], since=NOW) is None
+
+
+def test_query_fills_every_bucket_in_one_pass():
+    values = [dv("a", "SODIUM", 1, "130"), dv("b", "SODIUM", 2, "<128"), dv("c", "SODIUM", 3, "150"), dv("d", "SODIUM", 4, "bad"), dv("e", "SODIUM", 5, "129")]
+    index = DiscreteValueIndex(values)
+
+    low, high, lowest = index.query("SODIUM", [(lt, 132, 10), (gt, 145, None), (lt, 131, 2)])
+
+    assert [x.UniqueId for x in low] == ["a", "b", "e"]
+    assert [x.UniqueId for x in high] == ["c"]
+    assert [x.UniqueId for x in lowest] == ["a", "b"]
+    assert index.query("SODIUM", [(lt, 132, 0)]) == [[]]
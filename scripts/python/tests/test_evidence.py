@@ -0,0 +1,43 @@
+import pytest
+
+from cdi import Evidence
+
+
+def test_evidence_is_computed_on_first_read_and_kept():
+    calls = []
+
+    def lookup(name, sequence=0):
+        calls.append(name)
+        return None if name == "E87.0" else "%s #%d" % (name, sequence)
+
+    def query(values):
+        calls.append("query")
+        return [value * 2 for value in values]
+
+    evidence = Evidence()
+    evidence.define("e870Code", lookup, "E87.0")
+    evidence.define("e871Code", lookup, "E87.1", sequence=14)
+    evidence.define_many(["low", "high"], query, [1, 2])
+
+    assert calls == [] and evidence.computed() == []
+    # The chain stops at the first condition it can decide.
+    assert not (evidence.e870Code is not None and evidence.e871Code is not None)
+    assert calls == ["E87.0"]
+    assert evidence.e871Code == evidence.e871Code == "E87.1 #14"
+    assert (evidence.high, evidence.low) == (4, 2)
+    assert calls == ["E87.0", "E87.1", "query"]
+    assert evidence.computed() == ["e870Code", "e871Code", "low", "high"]
+
+
+def test_evidence_names_are_defined_not_assigned():
+    evidence = Evidence().define("e870Code", lambda: 1)
+
+    with pytest.raises(AttributeError):
+        evidence.missing
+    with pytest.raises(AttributeError):
+        evidence.e870Code = 2
+    with pytest.raises(ValueError):
+        evidence.define("define", lambda: 1)
+    assert evidence.e870Code == 1
+    with pytest.raises(ValueError):
+        evidence.define("e870Code", lambda: 3)
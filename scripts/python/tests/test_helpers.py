@@ -0,0 +1,61 @@
+from datetime import datetime
+
+import pytest
+
+from cdi import helpers, host, parse_result, runner
+
+NOW = datetime(2024, 10, 20, 12, 0)
+
+SCRIPT = '''
+from fusion_cac_script_engine.Models import *
+from System import *
+from cdi import DiscreteValueIndex, evaluation_context
+from operator import gt, lt
+import re
+
+context = evaluation_context(account, None)
+context.bind_helpers(globals(), 1)
+%s
+index = DiscreteValueIndex(account.DiscreteValues)
+links = dvValueMulti(index, ["SODIUM"], "Sodium: [VALUE]", 135, gt, 0, None, False, 2)
+result.Subtitle = " | ".join(link.LinkText for link in links)
+result.Passed = dvValueMulti(index, ["POTASSIUM"], "", lambda x: x > 5, gt) is None
+high, low = dvValueMultiQuery(index, ["SODIUM"], "[VALUE]", [(gt, 135, 1), (lt, 145, 2)])
+result.Reason = ", ".join(link.LinkText for link in high) + " / " + ", ".join(link.LinkText for link in low)
+'''
+
+OVERRIDE = '''
+def dataConversion(datetime, linkText, Result, id, category, sequence, abstract=True, gender=None):
+    return MatchedCriteriaLink(linkText.replace("[VALUE]", Result + "!"), None, None, id, True)
+'''
+
+
+def run(script):
+    account = host.Account("acct1", DiscreteValues=[
+        host.DiscreteValue("a", "SODIUM", "140", host.DateTime(NOW)),
+        host.DiscreteValue("b", "SODIUM", "150", host.DateTime(NOW)),
+        host.DiscreteValue("c", "POTASSIUM", "high", host.DateTime(NOW))])
+    code = compile(script, "Helpers.py", "exec")
+    return runner.run_account(account, [("Helpers.py", code)])["Helpers.py"]
+
+
+def test_bound_helpers_call_the_scripts_own_definitions():
+    shared = run(SCRIPT % "")
+    overridden = run(SCRIPT % OVERRIDE)
+
+    assert shared.Subtitle == "Sodium: 140 | Sodium: 150"
+    # Queries are (op, threshold, limit), as DiscreteValueIndex.query takes them.
+    assert shared.Reason == "140 / 140"
+    assert overridden.Subtitle == "Sodium: 140! | Sodium: 150!"
+    # A threshold that is never compared is never converted, as before.
+    assert shared.Passed and overridden.Passed
+
+
+def test_binding_another_version_is_refused():
+    namespace = {}
+    helpers.bind(namespace, helpers.VERSION)
+    assert namespace["dvValue"].__code__ is helpers.HELPERS["dvValue"].__code__
+    assert namespace["dvValue"].__globals__ is namespace
+    assert namespace["parse_result"] is parse_result
+    with pytest.raises(ValueError):
+        helpers.bind({}, helpers.VERSION + 1)
@@ -0,0 +1,109 @@
+from datetime import datetime, timedelta
+
+from cdi import host, incremental, manifest, runner, synthetic
+
+NOW = datetime(2024, 10, 20, 12, 0)
+
+SODIUM_SCRIPT = '''
+dvSerumSodium = ["SODIUM"]
+codeDic = {"E87.1": "Hyponatremia"}
+result.Subtitle = str(len([dv for dv in account.DiscreteValues if dv.Name == "SODIUM"]))
+'''
+
+CODE_SCRIPT = '''
+def prefixCodeValue(prefix, link_text):
+    return None
+
+codeDic = {"I10": "Hypertension"}
+prefixCodeValue("^N17\\\\.", "Acute Kidney Failure: [CODE]")
+result.Subtitle = str(sum(len(document.CodeReferences) for document in account.Documents))
+'''
+
+
+def at(hours_ago):
+    return host.DateTime(NOW - timedelta(hours=hours_ago))
+
+
+def sample_account():
+    return host.Account(
+        "acct1",
+        AdmitDateTime=at(100),
+        Patient=host.Patient("F", at(24 * 365 * 70)),
+        DiscreteValues=[host.DiscreteValue("a", "SODIUM", "130", at(5))],
+        Documents=[host.CACDocument("doc1", "Progress Note", at(3), [host.CodeReference("I10")])],
+    )
+
+
+def scripts():
+    sources = {"Sodium.py": SODIUM_SCRIPT, "Codes.py": CODE_SCRIPT}
+    manifests = dict((name, manifest.extract(source, name)) for name, source in sources.items())
+    return [(name, compile(source, name, "exec")) for name, source in sources.items()], manifests
+
+
+def test_snapshot_changes_by_key_and_by_age():
+    account = sample_account()
+    before = incremental.InputSnapshot.take(account, account.DiscreteValues, at(0))
+
+    account.Documents.append(host.CACDocument("doc2", "Progress Note", at(1), [host.CodeReference("N17.9")]))
+    after = incremental.InputSnapshot.take(account, account.DiscreteValues, at(0))
+    changes = after.changes(before)
+    assert changes["codes"] == {"N17.9"}
+    assert changes["document_types"] == {"Progress Note"}
+    assert changes["discrete_values"] == set()
+
+    a_day_later = incremental.InputSnapshot.take(account, account.DiscreteValues, at(-24))
+    assert a_day_later.changes(after)["discrete_values"] == {"SODIUM"}
+
+    account.Patient.Gender = "M"
+    assert incremental.InputSnapshot.take(account, account.DiscreteValues, at(0)).changes(after) is None
+
+
+def test_affects_matches_fields_and_code_patterns():
+    sodium = manifest.extract(SODIUM_SCRIPT, "Sodium.py")
+    codes = manifest.extract(CODE_SCRIPT, "Codes.py")
+    changes = dict((field, set()) for field in incremental.InputSnapshot.__slots__[1:])
+
+    assert not incremental.affects(sodium, changes)
+    changes["codes"] = {"N17.9"}
+    assert incremental.affects(codes, changes)
+    assert not incremental.affects(sodium, changes)
+    assert incremental.affects(sodium, None)
+
+
+def test_run_changed_reruns_only_affected_scripts():
+    host.set_clock(lambda: NOW)
+    try:
+        account = sample_account()
+        pairs, manifests = scripts()
+
+        first = incremental.run_changed(account, pairs, None, manifests)
+        assert first.rerun == ["Sodium.py", "Codes.py"]
+
+        unchanged = incremental.run_changed(account, pairs, first, manifests)
+        assert unchanged.rerun == []
+        assert unchanged.results["Sodium.py"] is first.results["Sodium.py"]
+
+        account.DiscreteValues.append(host.DiscreteValue("b", "SODIUM", "128", at(1)))
+        changed = incremental.run_changed(account, pairs, unchanged, manifests)
+        assert changed.rerun == ["Sodium.py"]
+        assert changed.results["Sodium.py"].Subtitle == "2"
+        assert changed.results["Codes.py"] is first.results["Codes.py"]
+    finally:
+        host.set_clock(datetime.now)
+
+
+def test_run_changed_reruns_shipped_scripts_reading_a_changed_value():
+    host.set_clock(lambda: NOW)
+    try:
+        paths = [path for path in runner.script_paths()
+                 if runner.script_name(path) in ("Immunocompromised.py", "AbnormalSerumSodium.py")]
+        manifests = manifest.build(paths)
+        account = synthetic.generate(3, synthetic.Catalogue.from_manifest(manifest.combined(manifests.values())),
+                                     synthetic.AccountProfile(criteria_groups=0), NOW)
+        first = incremental.run_changed(account, paths, None, manifests)
+
+        account.DiscreteValues.append(host.DiscreteValue("hba1c", "HEMOGLOBIN A1C (%)", "11.2", at(2)))
+        changed = incremental.run_changed(account, paths, first, manifests)
+        assert changed.rerun == ["Immunocompromised.py"]
+    finally:
+        host.set_clock(datetime.now)
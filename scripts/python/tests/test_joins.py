@@ -0,0 +1,79 @@
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+from cdi import AsOfJoin, DiscreteValueIndex, ResultDateJoin
+
+DV = namedtuple("DV", "UniqueId Name Result ResultDate")
+
+NOW = datetime(2024, 10, 20, 12, 0)
+
+
+def dv(unique_id, name, hours_ago, result="1"):
+    return DV(unique_id, name, result, NOW - timedelta(hours=hours_ago))
+
+
+def reading(unique_id, minutes_ago):
+    return DV(unique_id, "READING", "1", NOW - timedelta(minutes=minutes_ago))
+
+
+def sample():
+    return [
+        dv("t1", "TEMP", 1, "38.5"),
+        dv("h1", "HR", 1, "101"),
+        dv("h2", "PULSE", 1, "99"),
+        dv("r1", "RR", 1, "bad"),
+        dv("t2", "TEMP", 2, "37.0"),
+        dv("r2", "RR", 3, "22"),
+    ]
+
+
+def numeric(value):
+    return value.Result.replace(".", "").isnumeric()
+
+
+def test_rows_group_families_by_result_date():
+    join = ResultDateJoin(DiscreteValueIndex(sample()), {"temp": ["TEMP"], "hr": ["HR", "PULSE"], "resp": "RR"}, numeric)
+
+    row = join.get(NOW - timedelta(hours=1))
+    assert [x.UniqueId for x in row["hr"]] == ["h1", "h2"]
+    assert row.first("temp").UniqueId == "t1"
+    assert row.last("hr").UniqueId == "h2"
+    assert row["resp"] == [] and row.first("resp") is None
+    assert "resp" not in row
+    assert len(join) == 3
+
+
+def test_missing_date_gives_empty_row():
+    join = ResultDateJoin(sample(), {"temp": ["TEMP"]})
+
+    assert NOW not in join
+    assert join.get(NOW).first("temp") is None
+    assert [row.ResultDate for row in join] == [NOW - timedelta(hours=1), NOW - timedelta(hours=2)]
+
+
+def test_mapping_input_keeps_mapping_order():
+    values = {1: dv("a", "SBP", 1), 2: dv("b", "SBP", 1), 3: dv("c", "DBP", 1)}
+    join = ResultDateJoin(values, {"sbp": ["SBP"], "bp": ["SBP", "DBP"]})
+
+    row = join.get(NOW - timedelta(hours=1))
+    assert [x.UniqueId for x in row["sbp"]] == ["a", "b"]
+    assert [x.UniqueId for x in row["bp"]] == ["a", "b", "c"]
+
+
+def test_as_of_join_finds_every_value_within_tolerance():
+    pao2 = {1: reading("p1", 0), 2: reading("p2", 60)}
+    fio2 = {1: reading("f1", -5), 2: reading("f2", 3), 3: reading("f3", 6), 4: reading("f4", 65)}
+    join = AsOfJoin(pao2, {"fio2": fio2}, 5)
+
+    assert [(a.UniqueId, b.UniqueId) for a, b in join.pairs("fio2")] == [("p1", "f1"), ("p1", "f2"), ("p2", "f4")]
+    assert len(join) == 2
+
+
+def test_as_of_join_pairs_need_every_family():
+    anchors = [reading("p1", 0), reading("p2", 30)]
+    flow = [reading("l1", 2), reading("l2", 31)]
+    therapy = [reading("t1", -1), reading("t2", 1)]
+    join = AsOfJoin(anchors, {"flow": flow, "therapy": therapy}, 5)
+
+    assert [tuple(x.UniqueId for x in pair) for pair in join.pairs("flow", "therapy")] == [("p1", "l1", "t1"), ("p1", "l1", "t2")]
+    assert [row.first("flow").UniqueId for _, row in join] == ["l1", "l2"]
@@ -0,0 +1,120 @@
+from datetime import datetime, timedelta
+
+from cdi import host, manifest, memo, runner, synthetic
+
+NOW = datetime(2024, 10, 20, 12, 0)
+
+SCRIPT = '''
+dvSerumSodium = ["SODIUM"]
+account.Runs.append(scriptName)
+recent = [dv for dv in account.DiscreteValues if dv.Name == "SODIUM" and dv.ResultDate >= System.DateTime.Now.AddDays(-1)]
+result.Passed = bool(recent)
+result.Links.Add(MatchedCriteriaLink("Sodium: %d" % len(recent), None, None, "dv1"))
+'''
+
+
+def at(hours_ago):
+    return host.DateTime(NOW - timedelta(hours=hours_ago))
+
+
+def sample_result():
+    result = host.EvaluationResult()
+    result.Passed = True
+    result.Subtitle = "Hyponatremia"
+    parent = host.MatchedCriteriaLink("Laboratory Studies", None, None, None, True, Sequence=3)
+    child = host.MatchedCriteriaLink("Sodium: 128", None, None, "dv1")
+    child.Hidden = True
+    parent.Links.Add(child)
+    parent.Links.Add(False)
+    result.Links.Add(parent)
+    return result
+
+
+def test_results_round_trip_through_json():
+    text = memo.dump_result(sample_result())
+    result = memo.load_result(text)
+
+    assert result.Passed and result.Subtitle == "Hyponatremia"
+    parent = result.Links[0]
+    assert (parent.LinkText, parent.Sequence) == ("Laboratory Studies", 3)
+    assert parent.Links[0].DiscreteValueId == "dv1" and parent.Links[0].Hidden
+    assert parent.Links[1] is False
+    assert memo.dump_result(result) == text
+
+
+def test_cache_evicts_least_recently_used_and_expires():
+    now = [0.0]
+    cache = memo.ResultCache(max_entries=2, ttl=60, clock=lambda: now[0])
+    for key in ("a", "b"):
+        cache.put(key, "Script.py", sample_result())
+    now[0] = 10
+    assert cache.get("a") is not None
+    now[0] = 20
+    cache.put("c", "Script.py", sample_result())
+
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    now[0] = 100
+    assert cache.get("a") is None
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_run_memoized_serves_repeats_until_inputs_or_window_change():
+    clock = [NOW]
+    host.set_clock(lambda: clock[0])
+    try:
+        runs = []
+        host.install()
+        account = host.Account("acct1", DiscreteValues=[host.DiscreteValue("a", "SODIUM", "128", at(20))], Runs=runs)
+        source = "import System\nfrom fusion_cac_script_engine.Models import *\n" + SCRIPT
+        scripts = [("Sodium.py", compile(source, "Sodium.py", "exec"))]
+        manifests = {"Sodium.py": manifest.extract(source, "Sodium.py")}
+        cache = memo.ResultCache()
+
+        first = memo.run_memoized(account, scripts, cache, manifests)
+        again = memo.run_memoized(account, scripts, cache, manifests)
+        assert runs == ["Sodium.py"]
+        assert again["Sodium.py"].Passed and again["Sodium.py"].Links[0].LinkText == "Sodium: 1"
+
+        account.Documents.append(host.CACDocument("doc1", "Progress Note", at(1)))
+        memo.run_memoized(account, scripts, cache, manifests)
+        assert runs == ["Sodium.py"]
+
+        clock[0] = NOW + timedelta(hours=6)
+        later = memo.run_memoized(account, scripts, cache, manifests)
+        assert runs == ["Sodium.py", "Sodium.py"]
+        assert not later["Sodium.py"].Passed
+        assert first["Sodium.py"].Passed
+    finally:
+        host.set_clock(datetime.now)
+
+
+def test_run_memoized_keys_on_every_value_a_script_reads():
+    host.set_clock(lambda: NOW)
+    try:
+        paths = [path for path in runner.script_paths() if runner.script_name(path) == "Immunocompromised.py"]
+        manifests = manifest.build(paths)
+        catalogue = synthetic.Catalogue.from_manifest(manifest.combined(manifests.values()))
+        account = synthetic.generate(3, catalogue, synthetic.AccountProfile(criteria_groups=0), NOW)
+        account.DiscreteValues.append(host.DiscreteValue("hba1c", "HEMOGLOBIN A1C (%)", "6.1", at(30)))
+        cache = memo.ResultCache()
+
+        memo.run_memoized(account, paths, cache, manifests)
+        memo.run_memoized(account, paths, cache, manifests)
+        assert (cache.hits, cache.misses) == (1, 1)
+
+        account.DiscreteValues[-1].Result = "11.2"
+        memo.run_memoized(account, paths, cache, manifests)
+        assert (cache.hits, cache.misses) == (1, 2)
+
+        # A manifest missing a name the script looks up never gets a result
+        # cached; the medication trigger reads Antimetabolite on every run.
+        missing = dict(manifests)
+        missing["Immunocompromised.py"] = manifest.ScriptManifest("Immunocompromised.py", **dict(
+            (field, getattr(manifests["Immunocompromised.py"], field) - {"Antimetabolite"})
+            for field in manifest.FIELDS))
+        cache.clear()
+        memo.run_memoized(account, paths, cache, missing)
+        assert len(cache) == 0
+    finally:
+        host.set_clock(datetime.now)
@@ -0,0 +1,30 @@
+import re
+
+from cdi import clean_numbers, parse_result
+
+
+def clean_numbers_regex(result):
+    result1 = re.sub("[\\<\\>]", "", str(result))
+    if result1.count('.') <= 1 and result1.replace(".", "").isnumeric():
+        return result1
+    else:
+        return None
+
+
+def test_clean_numbers_matches_the_script_helper():
+    for result in ["12", "12.5", "<0.5", ">1000", "1.2.3", "", "Positive", None, "-4", "1.", ".5", "< 5", "12>"]:
+        assert clean_numbers(result) == clean_numbers_regex(result)
+
+
+def test_parse_result_value_and_qualifier():
+    parsed = parse_result("<0.5")
+    assert parsed.text == "0.5" and parsed.value == 0.5 and parsed.qualifier == "<"
+    assert parse_result(">60").qualifier == ">"
+    assert parse_result("7").qualifier is None
+    assert not parse_result("Negative").numeric
+    assert parse_result("Negative").text is None
+
+
+def test_parse_result_is_cached_per_distinct_result():
+    assert parse_result("98.6") is parse_result("98.6")
+    assert parse_result(["unhashable"]).value is None
@@ -0,0 +1,51 @@
+from datetime import datetime, timedelta
+
+from cdi import host
+from cdi.alert_queue import SQLiteAlertQueue
+from cdi.priority import PriorityScheduler, classify
+
+NOW = datetime(2024, 10, 20, 12, 0)
+
+
+class Clock:
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_classify_puts_fresh_results_ahead_of_a_backfill():
+    fresh = host.Account("acct1", DiscreteValues=[
+        host.DiscreteValue("a", "SODIUM", "130", host.DateTime(NOW - timedelta(minutes=20)))])
+    stale = host.Account("acct2", DiscreteValues=[
+        host.DiscreteValue("b", "SODIUM", "130", host.DateTime(NOW - timedelta(hours=3)))])
+    discharged = host.Account("acct3", DischargeDateTime=host.DateTime(NOW))
+
+    assert classify(fresh, "Backfill", NOW) == "fresh_results"
+    assert classify(stale, "Backfill", NOW) == "backfill"
+    assert classify(stale, "Workflow", NOW) == "inpatient"
+    assert classify(discharged, "Workflow", NOW) == "discharged"
+
+
+def test_claims_are_shared_by_weight_and_an_idle_class_banks_nothing():
+    clock = Clock(1000.0)
+    scheduler = PriorityScheduler(SQLiteAlertQueue(clock=clock), clock=clock)
+    scheduler.enqueue_many(("backfill%03d" % number, "Backfill", float(number), "backfill") for number in range(100))
+    scheduler.enqueue_many(("inpatient%02d" % number, "Workflow", 500.0, None) for number in range(10))
+
+    first = scheduler.claim(10)
+    assert [entry.account_id[:-2] for entry in first].count("inpatient") == 8
+    assert scheduler.claim(10)[0].account_id == "inpatient08"
+
+    # Fresh results queued behind the backfill still get most of the next claims.
+    scheduler.enqueue_many(("fresh%d" % number, "Workflow", 900.0, "fresh_results") for number in range(4))
+    claimed = scheduler.claim(5)
+    assert sorted(entry.account_id for entry in claimed)[-4:] == ["fresh0", "fresh1", "fresh2", "fresh3"]
+
+    clock.now = 1060.0
+    assert sorted(scheduler.complete([entry.token for entry in claimed])) == sorted(entry.token for entry in claimed)
+    report = scheduler.report()
+    assert report["fresh_results"]["latency"]["p50"] == 160.0 and report["fresh_results"]["late"] == 0
+    assert report["inpatient"]["wait"]["calls"] == 10 and report["inpatient"]["waiting"] == 0
+    assert report["backfill"]["waiting"] == 100 - 2 - 8 - 1
@@ -0,0 +1,56 @@
+import pickle
+from datetime import datetime, timedelta
+
+import pytest
+
+from cdi import host, records, runner
+
+NOW = datetime(2024, 10, 20, 12, 0)
+
+SCRIPT = '''
+values = [dv for dv in account.DiscreteValues if dv['Name'] == "SODIUM" and dv.Result.isdigit() and float(dv.Result) < 135]
+codes = [reference.Code for document in account.Documents for reference in document.CodeReferences]
+result.Passed = len(values) == 1 and "E87.1" in codes and account.Medications[0]['Category'] == "Saline"
+'''
+
+
+def account():
+    return host.Account(
+        "acct1",
+        DiscreteValues=[host.DiscreteValue("dv1", "SODIUM", "130", host.DateTime(NOW)),
+                        host.DiscreteValue("dv2", "SODIUM", ">150", host.DateTime(NOW), Unit="mmol/L")],
+        Medications=[host.Medication("med1", "Saline", "1000 mL", "IV", host.DateTime(NOW - timedelta(hours=2)),
+                                     Category="Saline")],
+        Documents=[host.CACDocument("doc1", "Progress Note", host.DateTime(NOW), [host.CodeReference("E87.1")],
+                                    [host.CodeReference("GLASGOW_COMA_SCALE", "8")])])
+
+
+def test_records_read_like_host_records_and_carry_parsed_fields():
+    compact = records.compact_account(account())
+    dv, odd = compact.DiscreteValues
+
+    assert dv.Result == dv["Result"] == "130" and dv["Missing"] is None and "Result" in dv
+    assert (dv.number, odd.number) == (130.0, 150.0)
+    assert dv.timestamp == records.timestamp(host.DateTime(NOW)) == 1729425600
+    assert dv.ResultDate is odd.ResultDate
+    assert dv.Name is odd.Name and odd.Unit == odd["Unit"] == "mmol/L"
+    assert compact.Medications[0].timestamp == dv.timestamp - 7200
+    assert compact.Documents[0].AbstractionReferences[0].number == 8.0
+    with pytest.raises(AttributeError):
+        dv.Result = "140"
+
+    copy = pickle.loads(pickle.dumps(odd))
+    assert type(copy) is type(odd) and copy.fields() == odd.fields() and copy.number == 150.0
+
+
+def test_a_few_fields_with_an_undeclared_one_still_extend_the_record():
+    dv = records.DiscreteValue("x", Unit="mg")
+
+    assert dv.Unit == dv["Unit"] == "mg" and dv.UniqueId == dv._id == "x"
+    assert records.DiscreteValue("y").__class__ is records.DiscreteValue
+
+
+def test_scripts_see_the_same_account():
+    code = compile(SCRIPT, "Records.py", "exec")
+    for subject in (account(), records.compact_account(account())):
+        assert runner.run_account(subject, [("Records.py", code)])["Records.py"].Passed
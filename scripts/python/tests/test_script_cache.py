@@ -0,0 +1,68 @@
+import os
+
+from cdi import host, runner, script_cache
+
+
+def _write(path, text, mtime):
+    path.write_text(text)
+    os.utime(str(path), ns=(mtime, mtime))
+
+
+def test_scripts_compile_once_and_reuse_the_disk_cache(tmp_path):
+    path = tmp_path / "Script.py"
+    _write(path, "result.Passed = account.Flag\n", 1000000000)
+    compiled = script_cache.stats["compiled"]
+
+    code = runner.load_script(str(path))
+    assert runner.load_script(str(path)) is code
+    assert script_cache.stats["compiled"] == compiled + 1
+    entries = os.listdir(str(tmp_path / "__pycache__"))
+    assert len(entries) == 1 and entries[0].startswith("Script.")
+
+    # A new process finds the compiled code on disk.
+    script_cache._codes.clear()
+    script_cache._loaded.clear()
+    disk = script_cache.stats["disk"]
+    assert runner.load_script(str(path)).co_code == code.co_code
+    assert (script_cache.stats["compiled"], script_cache.stats["disk"]) == (compiled + 1, disk + 1)
+
+    # Every run gets fresh globals.
+    host.install()
+    for flag in (True, False):
+        assert runner.run_script(code, host.Account("acct1", Flag=flag), "Script.py").Passed is flag
+
+    # A new version replaces the old entry.
+    _write(path, "result.Passed = not account.Flag\n", 2000000000)
+    assert runner.load_script(str(path)) is not code
+    assert len(os.listdir(str(tmp_path / "__pycache__"))) == 1
+
+
+def test_refresh_swaps_in_changed_added_and_removed_scripts(tmp_path):
+    first = tmp_path / "A.py"
+    second = tmp_path / "B.py"
+    _write(first, "result.Subtitle = 'a1'\n", 1000000000)
+    _write(second, "result.Subtitle = 'b1'\n", 1000000000)
+    cache = script_cache.ScriptCache(str(tmp_path), cache_dir=False)
+    before = cache.scripts()
+    assert [name for name, _ in before] == ["A.py", "B.py"]
+    assert cache.refresh() == [] and cache.scripts() is before
+
+    # Touched but unchanged: nothing to swap.
+    os.utime(str(first), ns=(3000000000, 3000000000))
+    assert cache.refresh() == [] and cache.scripts() is before
+
+    _write(first, "result.Subtitle = 'a2'\n", 4000000000)
+    _write(tmp_path / "C.py", "result.Subtitle = 'c1'\n", 4000000000)
+    second.unlink()
+    assert sorted(cache.refresh()) == ["A.py", "B.py", "C.py"]
+    after = cache.scripts()
+    assert [name for name, _ in after] == ["A.py", "C.py"]
+    # The old set is left intact for the runs holding it.
+    assert [name for name, _ in before] == ["A.py", "B.py"]
+
+    # A script that no longer compiles keeps its last version.
+    _write(first, "result.Subtitle = (\n", 5000000000)
+    assert cache.refresh() == [] and cache.scripts() is after
+    assert cache.errors["A.py"].startswith("SyntaxError")
+    _write(first, "result.Subtitle = 'a3'\n", 6000000000)
+    assert cache.refresh() == ["A.py"] and cache.errors == {}
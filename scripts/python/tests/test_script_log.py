@@ -0,0 +1,108 @@
+from cdi import EvaluationContext, evaluation_context, host, runner, script_log
+from cdi import context as context_module
+
+SCRIPT = '''
+import System
+from fusion_cac_script_engine.Lib.Scripting import *
+from cdi import evaluation_context
+
+db = CACDataRepository()
+context = evaluation_context(account, db, System.DateTime.Now.AddDays(-7))
+scriptLog = context.log(db, scriptName, scriptInstance)
+scriptLog.debug("Script starting %s", account._id)
+scriptLog.warning("100%% of %s", "values")
+scriptLog.flush()
+'''
+
+
+class BulkRepository(host.CACDataRepository):
+    def __init__(self, accounts=None):
+        host.CACDataRepository.__init__(self, accounts)
+        self.writes = 0
+
+    def LogEvaluationScriptMessages(self, entries):
+        self.writes += 1
+        host.CACDataRepository.LogEvaluationScriptMessages(self, entries)
+
+
+class Unformattable:
+    def __str__(self):
+        raise AssertionError("formatted a disabled message")
+
+
+def test_disabled_levels_are_dropped_before_formatting():
+    repository = BulkRepository()
+    log = EvaluationContext(host.Account("acct1")).log(repository, "Script.py", 1)
+    script_log.set_level("Info")
+    try:
+        log.debug("value %s", Unformattable())
+        log.info("kept %s", 1)
+        log.log("Debug", "value %s", Unformattable())
+        assert not script_log.enabled("Debug") and script_log.enabled("Error")
+    finally:
+        script_log.set_level("Debug")
+    log.flush()
+
+    assert repository.messages == [("Info", "Script.py", 1, "kept 1")]
+
+
+def test_messages_without_a_bulk_write_fall_back_to_single_writes():
+    class Repository:
+        def __init__(self):
+            self.messages = []
+
+        def LogEvaluationScriptMessage(self, message, script_name, script_instance, level):
+            self.messages.append(message)
+
+    repository = Repository()
+    log = EvaluationContext(host.Account("acct1")).log(repository, "Script.py", 1)
+    log.debug("a %s", 1)
+    log.error("100%")
+    log.flush()
+
+    assert repository.messages == ["a 1", "100%"]
+
+
+def test_account_run_writes_every_script_message_once_at_the_end():
+    account = host.Account("acct1")
+    repository = BulkRepository({"acct1": account})
+    code = compile(SCRIPT, "Log.py", "exec")
+
+    runner.run_account(account, [("One.py", code), ("Two.py", code)], repository)
+
+    assert repository.writes == 1
+    assert repository.messages == [
+        ("Debug", "One.py", 1, "Script starting acct1"),
+        ("Warning", "One.py", 1, "100% of values"),
+        ("Debug", "Two.py", 1, "Script starting acct1"),
+        ("Warning", "Two.py", 1, "100% of values"),
+    ]
+
+
+def test_messages_of_a_failed_script_are_written_before_its_error():
+    account = host.Account("acct1")
+    repository = BulkRepository({"acct1": account})
+    failing = compile(SCRIPT.replace("scriptLog.flush()", "raise ValueError('bad value')"), "Fail.py", "exec")
+    code = compile(SCRIPT, "Log.py", "exec")
+
+    runner.run_account(account, [("Fail.py", failing), ("One.py", code)], repository)
+
+    assert [(level, name) for level, name, _, _ in repository.messages] == [
+        ("Debug", "Fail.py"), ("Warning", "Fail.py"), ("Error", "Fail.py"),
+        ("Debug", "One.py"), ("Warning", "One.py")]
+    assert repository.messages[2][3] == "ValueError: bad value"
+
+
+def test_unflushed_messages_are_written_before_the_next_script_starts():
+    account = host.Account("acct1")
+    repository = BulkRepository({"acct1": account})
+    context = EvaluationContext(account, repository)
+    context_module.activate(context)
+    try:
+        context.log(repository, "Fail.py", 1).debug("never flushed")
+        assert evaluation_context(account) is context
+        assert repository.messages == [("Debug", "Fail.py", 1, "never flushed")]
+        context.log(repository, "Next.py", 1).debug("pending")
+    finally:
+        context_module.release()
+    assert repository.messages[-1] == ("Debug", "Next.py", 1, "pending")
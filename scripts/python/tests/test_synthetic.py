@@ -0,0 +1,51 @@
+from datetime import datetime
+
+from cdi import manifest, synthetic
+
+NOW = datetime(2024, 10, 20, 12, 0)
+
+CATALOGUE = synthetic.Catalogue.from_manifest(manifest.ScriptManifest(
+    "*",
+    discrete_values=["Heart Rate cc (bpm)", "pH", "SODIUM (mmol/L)", "3.5 Neuro Glasgow Score", ""],
+    medications=["Insulin"],
+    abstractions=["ALTERED_LEVEL_OF_CONSCIOUSNESS"],
+    codes=["E87.1", " A41.01"],
+    code_patterns=["^A41\\."],
+    document_types=["ECG"],
+    criteria_groups=["Anemia", "Sepsis"],
+))
+
+
+def fingerprint(account):
+    return (
+        [(dv.Name, dv.Result, str(dv.ResultDate)) for dv in account.DiscreteValues],
+        [(med.Category, str(med.StartDate)) for med in account.Medications],
+        [(doc.DocumentType, [ref.Code for ref in doc.CodeReferences]) for doc in account.Documents],
+        [group.CriteriaGroup for group in account.MatchedCriteriaGroups],
+    )
+
+
+def test_catalogue_groups_names_into_families():
+    assert CATALOGUE.discrete_values["vitals"] == ["Heart Rate cc (bpm)"]
+    assert CATALOGUE.discrete_values["blood_gas"] == ["pH"]
+    assert CATALOGUE.discrete_values["neuro"] == ["3.5 Neuro Glasgow Score"]
+    assert CATALOGUE.discrete_values["labs"] == ["SODIUM (mmol/L)"]
+    assert CATALOGUE.codes == ["A41.01", "A41.9", "E87.1"]
+
+
+def test_generate_is_seeded_and_follows_the_profile():
+    profile = synthetic.AccountProfile({"vitals": 12, "labs": 3}, medications=4, documents=2, stay_days=2)
+    account = synthetic.generate(7, CATALOGUE, profile, NOW)
+
+    assert fingerprint(account) == fingerprint(synthetic.generate(7, CATALOGUE, profile, NOW))
+    assert fingerprint(account) != fingerprint(synthetic.generate(8, CATALOGUE, profile, NOW))
+    assert account._id == "synthetic7"
+    names = [dv.Name for dv in account.DiscreteValues]
+    assert (names.count("Heart Rate cc (bpm)"), names.count("SODIUM (mmol/L)")) == (12, 3)
+    assert len(account.Medications) == 4 and len(account.Documents) == 2
+    assert all(account.AdmitDateTime <= dv.ResultDate for dv in account.DiscreteValues)
+
+
+def test_profile_scales_discrete_values_in_proportion():
+    profile = synthetic.AccountProfile({"vitals": 30, "labs": 10}).with_discrete_values(1000)
+    assert profile.discrete_values == {"vitals": 750, "labs": 250}
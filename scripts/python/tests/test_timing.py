@@ -0,0 +1,52 @@
+from cdi import host, runner, timing
+
+SCRIPT = '''
+def lookUp(name):
+    return account.Patient
+
+def CodeCount(codes):
+    lookUp("x")
+    return []
+
+CodeCount([])
+CodeCount([])
+values = list(map(lambda value: value, [1, 2]))
+'''
+
+
+class Ticks:
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        self.now += 1
+        return self.now
+
+
+def test_percentiles_use_nearest_rank():
+    summary = timing.summarize([4, 1, 3, 2, 5])
+    assert (summary["calls"], summary["total"]) == (5, 15)
+    assert (summary["p50"], summary["p90"], summary["max"]) == (3, 5, 5)
+    assert timing.summarize([])["p50"] is None
+
+
+def test_profiler_times_scripts_helpers_and_stacks():
+    account = host.Account("acct1", DiscreteValues=[host.DiscreteValue("a", "SODIUM", "130")])
+    code = compile(SCRIPT, "Timed.py", "exec")
+
+    with timing.profiling(timing.Profiler(clock=Ticks())) as profiler:
+        runner.run_account(account, [("Timed.py", code)])
+    assert timing.active() is None
+
+    report = profiler.report()
+    assert report["scripts"]["Timed.py"]["calls"] == 1
+    assert report["helpers"]["Timed.py:CodeCount"]["calls"] == 2
+    assert report["helpers"]["Timed.py:lookUp"]["calls"] == 2
+    assert not [name for name in report["helpers"] if "<" in name]
+    assert report["accounts"]["acct1"]["discrete_values"] == 1
+    assert report["accounts"]["acct1"]["runs"] == 1
+
+    # lookUp takes one tick; CodeCount three, one of them inside lookUp.
+    stacks = dict(line.rsplit(" ", 1) for line in profiler.collapsed())
+    assert stacks["Timed.py;CodeCount;lookUp"] == "2000000"
+    assert stacks["Timed.py;CodeCount"] == "4000000"
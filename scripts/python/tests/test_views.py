@@ -0,0 +1,21 @@
+import pytest
+
+from cdi import OrderedView
+
+
+def test_view_matches_dict_of_sorted_items():
+    items = sorted({1: "b", 2: "c", 3: "a"}.items(), key=lambda x: x[1], reverse=True)
+    view = OrderedView(items)
+
+    assert list(view) == list(dict(items)) == [2, 1, 3]
+    assert view[3] == "a" and 2 in view and 4 not in view
+    assert len(view) == 3
+    assert dict(view) == dict(items)
+
+
+def test_view_is_read_only():
+    view = OrderedView([(1, "a")])
+
+    with pytest.raises(TypeError):
+        view[2] = "b"
+    assert not OrderedView()
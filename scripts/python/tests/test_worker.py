@@ -0,0 +1,53 @@
+import json
+from datetime import datetime
+
+import pytest
+
+from cdi import host, worker
+from cdi.alert_queue import SQLiteAlertQueue, SQLiteResultStore
+
+SCRIPT = '''
+import System
+if account.Fail:
+    raise ValueError("bad account")
+result.Passed = True
+result.Subtitle = str(System.DateTime.Now)
+'''
+
+
+def test_drain_evaluates_every_queued_account_in_worker_processes(tmp_path):
+    path = tmp_path / "Script.py"
+    path.write_text(SCRIPT)
+    accounts = dict((account_id, host.Account(account_id, Fail=account_id == "acct3"))
+                    for account_id in ("acct1", "acct2", "acct3", "acct4", "acct5"))
+    queue = SQLiteAlertQueue()
+    queue.enqueue_many((account_id, "Workflow", None) for account_id in sorted(accounts) + ["gone"])
+    store = SQLiteResultStore()
+
+    stats = worker.drain(queue, accounts, store, [str(path)], workers=2, batch_size=4, chunk_size=1,
+                         now=datetime(2024, 10, 20, 12, 0))
+
+    assert (stats["accounts"], stats["missing"], stats["batches"]) == (5, 1, 2)
+    assert len(queue) == 0 and store.writes == 2
+    assert store.results("acct3") == {"Script.py": None}
+    result = json.loads(store.results("acct1")["Script.py"])
+    assert result["Passed"] and result["Subtitle"] == "10/20/2024 12:00:00 PM"
+
+
+class FailingStore(SQLiteResultStore):
+    def upsert_many(self, rows):
+        raise IOError("disk full")
+
+
+def test_drain_releases_the_batch_it_could_not_write(tmp_path):
+    path = tmp_path / "Script.py"
+    path.write_text(SCRIPT)
+    accounts = dict((account_id, host.Account(account_id, Fail=False)) for account_id in ("acct1", "acct2"))
+    queue = SQLiteAlertQueue()
+    queue.enqueue_many((account_id, "Workflow", None) for account_id in sorted(accounts))
+
+    with pytest.raises(IOError):
+        worker.drain(queue, accounts, FailingStore(), [str(path)], workers=1, batch_size=2)
+
+    assert len(queue) == 2 and queue.leases() == {}
+    assert [entry.account_id for entry in queue.claim(2, "next")] == ["acct1", "acct2"]